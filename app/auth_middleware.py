@@ -13,6 +13,7 @@ from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from app.supabase_client import instrument_database_client
 
 # Load environment variables
 load_dotenv(override=True)
@@ -30,6 +31,7 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
 
 # Create Supabase client
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+instrument_database_client(supabase)
 
 # Security scheme
 security = HTTPBearer()
@@ -1,15 +1,17 @@
 from typing import Dict, List, Any
+import os
 import json
 import asyncio
+from app.utils.bounded_cache import BoundedTTLCache
 
 # Try to import Redis, but don't fail if it's not available
 try:
-    from app.redis_client import redis_client
+    from app.redis_client import async_redis
     REDIS_AVAILABLE = True
 except ImportError:
     print("⚠️ [CACHE] Redis not available - using in-memory fallback")
     REDIS_AVAILABLE = False
-    redis_client = None
+    async_redis = None
 
 # In-memory cache for content hierarchy
 # This will be populated on application startup to reduce DB calls
@@ -18,52 +20,80 @@ content_cache: Dict[str, List[Dict[str, Any]]] = {
     "exercises": []
 }
 
-# In-memory cache for API responses (fallback when Redis is not available)
-memory_cache: Dict[str, Any] = {}
+# Bounded in-memory caches for API responses (values are stored as JSON strings):
+# - memory_cache: fallback when Redis is not available (honours each key's TTL)
+# - near_cache: short-lived copy in front of Redis, so hot keys skip the round trip
+CACHE_MEMORY_MAX_ENTRIES = int(os.getenv("CACHE_MEMORY_MAX_ENTRIES", "10000"))
+CACHE_MEMORY_MAX_BYTES = int(os.getenv("CACHE_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_NEAR_TTL = float(os.getenv("CACHE_NEAR_TTL", "5"))
+CACHE_NEAR_MAX_ENTRIES = int(os.getenv("CACHE_NEAR_MAX_ENTRIES", "2000"))
+CACHE_NEAR_MAX_BYTES = int(os.getenv("CACHE_NEAR_MAX_BYTES", str(16 * 1024 * 1024)))
+
+memory_cache = BoundedTTLCache(CACHE_MEMORY_MAX_ENTRIES, CACHE_MEMORY_MAX_BYTES)
 
 class CacheManager:
-    """Cache manager with Redis backend and in-memory fallback"""
+    """Cache manager with async Redis backend, a near-cache in front of it and a bounded in-memory fallback"""
+    
+    def __init__(self):
+        self.near_cache = BoundedTTLCache(CACHE_NEAR_MAX_ENTRIES, CACHE_NEAR_MAX_BYTES, default_ttl=CACHE_NEAR_TTL)
     
-    async def get(self, key: str) -> Any:
-        """Get cached value by key"""
+    async def get(self, key: str, use_near_cache: bool = True) -> Any:
+        """Get cached value by key (use_near_cache=False for values other workers update, e.g. job status)"""
+        if use_near_cache and CACHE_NEAR_TTL > 0:
+            raw = self.near_cache.get(key)
+            if raw is not None:
+                return json.loads(raw)
         if REDIS_AVAILABLE:
             try:
-                value = redis_client.get(key)
-                if value:
-                    return json.loads(value)
-                return None
+                raw = await async_redis.get(key)
+                if raw and CACHE_NEAR_TTL > 0:
+                    self.near_cache.set(key, raw)
             except Exception as e:
                 print(f"⚠️ [CACHE] Redis error, falling back to memory: {str(e)}")
-                return memory_cache.get(key)
+                raw = memory_cache.get(key)
         else:
-            return memory_cache.get(key)
+            raw = memory_cache.get(key)
+        return json.loads(raw) if raw else None
     
     async def set(self, key: str, value: Any, ttl: int = 300) -> bool:
         """Set cached value with TTL in seconds"""
+        raw = json.dumps(value)
+        if CACHE_NEAR_TTL > 0:
+            self.near_cache.set(key, raw, ttl=min(ttl, CACHE_NEAR_TTL))
         if REDIS_AVAILABLE:
             try:
-                redis_client.setex(key, ttl, json.dumps(value))
+                # Falls back to the async layer's bounded memory store if Redis is down
+                await async_redis.set(key, raw, ex=ttl)
                 return True
             except Exception as e:
                 print(f"⚠️ [CACHE] Redis error, using memory fallback: {str(e)}")
-                memory_cache[key] = value
+                memory_cache.set(key, raw, ttl=ttl)
                 return True
         else:
-            memory_cache[key] = value
+            memory_cache.set(key, raw, ttl=ttl)
             return True
     
     async def delete(self, key: str) -> bool:
         """Delete cached value"""
+        self.near_cache.delete(key)
         if REDIS_AVAILABLE:
             try:
-                redis_client.delete(key)
+                await async_redis.delete(key)
                 return True
             except Exception as e:
                 print(f"⚠️ [CACHE] Redis error: {str(e)}")
                 return False
         else:
-            memory_cache.pop(key, None)
+            memory_cache.delete(key)
             return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Near-cache and memory fallback statistics"""
+        return {
+            "near_cache": self.near_cache.stats(),
+            "memory_fallback": memory_cache.stats(),
+            "redis_fallback": async_redis.fallback.stats() if REDIS_AVAILABLE else None,
+        }
 
 # Global cache manager instance
 cache_manager = CacheManager()
@@ -14,6 +14,12 @@ ELEVEN_VOICE_ID = os.getenv("ELEVEN_VOICE_ID", "MzqUf1HbJ8UmQ0wUsx2p")
 # Voice ID specifically for OpenAI Realtime feature
 ELEVEN_REALTIME_VOICE_ID = os.getenv("ELEVEN_REALTIME_VOICE_ID", "MzqUf1HbJ8UmQ0wUsx2p") 
 ELEVEN_REALTIME_MODEL_ID = os.getenv("ELEVEN_REALTIME_MODEL_ID", "eleven_flash_v2_5")
+
+# Vendor endpoints; override to point at a proxy or the load-test stand-ins (app/loadtest)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+ELEVENLABS_BASE_URL = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io").rstrip("/")
+# host:port of a plaintext gRPC server for Google Speech and Text-to-Speech (no credentials used)
+GOOGLE_EMULATOR_HOST = os.getenv("GOOGLE_EMULATOR_HOST")
 # General Config
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
@@ -0,0 +1,17 @@
+"""
+Load-Test Suite
+
+Boots the app against local stand-ins for every vendor and drives the main
+user journeys at a target concurrency, so latency and throughput can be
+measured offline and compared between commits:
+- fakes.py: OpenAI (chat completions, realtime websocket), ElevenLabs (TTS,
+  STT, stream-input websocket), Supabase (PostgREST, auth) and Google Speech /
+  Text-to-Speech (gRPC) servers with configurable latency distributions
+- postgrest.py: in-memory PostgREST behind the Supabase stand-in
+- seed.py: users, tokens and content the scenarios rely on
+- scenarios.py: exercise submissions, English-only and realtime websocket
+  sessions, dashboards and messaging, with p50/p95/p99 and throughput per
+  operation
+
+Run it with app/scripts/load_test.py.
+"""
@@ -0,0 +1,426 @@
+"""
+Vendor Stand-ins
+
+One process serving every external API the app calls, with delays drawn
+from the latency models (latency.py) so runs are comparable offline:
+- /openai/v1: chat completions (plain, json_object, json_schema, streamed)
+  and the realtime websocket (session, audio buffer, text-only responses)
+- /elevenlabs: text-to-speech (+ /stream), speech-to-text and the
+  stream-input websocket
+- /supabase: PostgREST (postgrest.py) and auth /user for the seeded tokens
+- gRPC on a second port: Google Speech (Recognize, StreamingRecognize) and
+  Text-to-Speech (SynthesizeSpeech)
+- /_fake/stats: calls, injected errors and in-flight peak per endpoint
+
+Point the app at it with OPENAI_BASE_URL, ELEVENLABS_BASE_URL, SUPABASE_URL
+and GOOGLE_EMULATOR_HOST (see env_for()).
+
+Usage: python -m app.loadtest.fakes [--port=8910] [--grpc-port=8911] [--latency=openai.chat=600:1800] [--seed=0]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+from collections import Counter
+from concurrent import futures
+from typing import Any, Dict, List, Optional
+
+import grpc
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from google.cloud import speech, texttospeech
+
+from app.loadtest.latency import LatencyModel, build_models
+from app.loadtest.postgrest import PostgrestStore, parse_query
+from app.loadtest.seed import TRANSCRIPT, Dataset, build_dataset
+
+CHAT_REPLY = "Great effort! Keep practising your English every day."
+REALTIME_REPLY = "That sounds wonderful! Tell me more about your day. What did you enjoy the most?"
+# json_object replies: the union of keys the tutor prompts ask for
+JSON_OBJECT_REPLY = {
+    "conversation_text": "Well done! Let's practise one more sentence together. Tell me about your favourite food.",
+    "next_stage": "option_selection",
+    "needs_correction": False,
+    "corrected_sentence": "",
+    "correction_type": "none",
+    "current_topic": "food",
+    "learning_activity": "conversation",
+    "session_progress": "good",
+    "is_english": True,
+    "score": 78,
+    "feedback": "Clear and well structured.",
+}
+MP3_BYTES_PER_CHAR = 1100      # ~128 kbps at ~14 spoken characters per second
+PCM_BYTES_PER_CHAR = 3400      # 24 kHz 16-bit mono
+STREAM_CHUNK_BYTES = 4800      # 100 ms of pcm_24000
+GENERATION_SPEEDUP = 4.0       # audio is generated this many times faster than real time
+
+
+class FakeVendors:
+    """Shared state of the stand-ins: latency models, the Supabase store and call counters"""
+
+    def __init__(self, models: Dict[str, LatencyModel], dataset: Dataset):
+        self.models = models
+        self.dataset = dataset
+        self.store = PostgrestStore(dataset.tables, dataset.functions)
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.in_flight: Counter = Counter()
+        self.peak_in_flight: Counter = Counter()
+
+    def begin(self, endpoint: str, model: Optional[str] = None) -> bool:
+        """Count a call; False when the endpoint's model (or the named one) injects a failure"""
+        self.calls[endpoint] += 1
+        if self.models[model or endpoint].fails():
+            self.errors[endpoint] += 1
+            return False
+        return True
+
+    async def delay(self, endpoint: str, scale: float = 1.0):
+        self.in_flight[endpoint] += 1
+        self.peak_in_flight[endpoint] = max(self.peak_in_flight[endpoint], self.in_flight[endpoint])
+        try:
+            await asyncio.sleep(self.models[endpoint].sample() * scale)
+        finally:
+            self.in_flight[endpoint] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            endpoint: {"calls": self.calls[endpoint], "errors": self.errors[endpoint],
+                       "peak_in_flight": self.peak_in_flight[endpoint]}
+            for endpoint in sorted(self.calls)
+        }
+
+
+def example_from_schema(schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None, name: str = "") -> Any:
+    """A valid instance of a (strict) JSON schema, for structured-output requests"""
+    root = root or schema
+    if "$ref" in schema:
+        target = root
+        for part in schema["$ref"].lstrip("#/").split("/"):
+            target = target[part]
+        return example_from_schema(target, root, name)
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"] or schema["anyOf"]
+        return example_from_schema(options[0], root, name)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        return {key: example_from_schema(value, root, key) for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [example_from_schema(schema.get("items", {}), root, name)]
+    if kind in ("integer", "number"):
+        value = min(max(78, schema.get("minimum", 78)), schema.get("maximum", 78))
+        return int(value) if kind == "integer" else float(value)
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return f"Good {name.replace('_', ' ')}".strip() if name else "Good effort"
+
+
+def _chat_content(body: Dict[str, Any]) -> str:
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        return json.dumps(example_from_schema(response_format["json_schema"]["schema"]))
+    if response_format.get("type") == "json_object":
+        return json.dumps(JSON_OBJECT_REPLY)
+    return CHAT_REPLY
+
+
+def _completion(body: Dict[str, Any], content: str) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-fake-{time.time_ns()}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 200, "completion_tokens": len(content) // 4, "total_tokens": 200 + len(content) // 4},
+    }
+
+
+def _pieces(text: str, size: int = 12) -> List[str]:
+    """Token-sized slices of text, as a streamed completion would deliver it"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _vendor_error(vendor: str) -> JSONResponse:
+    return JSONResponse({"error": {"message": f"injected {vendor} failure", "type": "server_error"}}, status_code=503)
+
+
+def create_app(vendors: FakeVendors) -> FastAPI:
+    app = FastAPI(title="Vendor stand-ins")
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return vendors.stats()
+
+    # --- OpenAI ---
+
+    @app.get("/openai/v1/models")
+    async def openai_models():
+        return {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "owned_by": "openai"}]}
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if not vendors.begin("openai.chat"):
+            return _vendor_error("openai")
+        content = _chat_content(body)
+        await vendors.delay("openai.chat")
+        if not body.get("stream"):
+            return _completion(body, content)
+
+        async def events():
+            chunk_id = f"chatcmpl-fake-{time.time_ns()}"
+            for piece in _pieces(content):
+                chunk = {"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": body.get("model", "gpt-4o"),
+                         "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(vendors.models["openai.token"].sample())
+            done = {"id": chunk_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": body.get("model", "gpt-4o"), "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+            yield f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.websocket("/openai/v1/realtime")
+    async def realtime(websocket: WebSocket):
+        await websocket.accept()
+        vendors.calls["openai.realtime.session"] += 1
+        await websocket.send_json({"type": "session.created", "session": {"id": f"sess_fake_{time.time_ns()}"}})
+        buffered = 0
+        try:
+            while True:
+                event = json.loads(await websocket.receive_text())
+                kind = event.get("type")
+                if kind == "session.update":
+                    await websocket.send_json({"type": "session.updated", "session": event.get("session", {})})
+                elif kind == "input_audio_buffer.append":
+                    buffered += len(event.get("audio", ""))
+                elif kind == "input_audio_buffer.commit":
+                    if not buffered:
+                        await websocket.send_json({"type": "error", "error": {
+                            "code": "input_audio_buffer_commit_empty", "message": "buffer is empty"}})
+                        continue
+                    buffered = 0
+                    await websocket.send_json({"type": "input_audio_buffer.committed"})
+                elif kind == "response.create":
+                    if not vendors.begin("openai.realtime"):
+                        await websocket.send_json({"type": "error", "error": {
+                            "code": "server_error", "message": "injected openai failure"}})
+                        continue
+                    await vendors.delay("openai.realtime")
+                    await websocket.send_json({"type": "response.created"})
+                    for word in REALTIME_REPLY.split(" "):
+                        await websocket.send_json({"type": "response.text.delta", "delta": word + " "})
+                        await asyncio.sleep(vendors.models["openai.token"].sample())
+                    await websocket.send_json({"type": "response.text.done", "text": REALTIME_REPLY})
+                    await websocket.send_json({"type": "response.done", "response": {"status": "completed"}})
+        except WebSocketDisconnect:
+            pass
+
+    # --- ElevenLabs ---
+
+    @app.get("/elevenlabs/v1/models")
+    async def elevenlabs_models():
+        return [{"model_id": "eleven_flash_v2_5", "name": "Eleven Flash v2.5"}]
+
+    @app.post("/elevenlabs/v1/text-to-speech/{voice_id}")
+    @app.post("/elevenlabs/v1/text-to-speech/{voice_id}/stream")
+    async def text_to_speech(voice_id: str, request: Request):
+        body = await request.json()
+        if not vendors.begin("elevenlabs.tts"):
+            return _vendor_error("elevenlabs")
+        size = max(len(body.get("text", "")), 1) * MP3_BYTES_PER_CHAR
+        await vendors.delay("elevenlabs.tts")
+
+        async def audio():
+            chunk_seconds = 16384 / 16000 / GENERATION_SPEEDUP  # 16 KB of 128 kbps audio
+            for offset in range(0, size, 16384):
+                yield bytes(min(16384, size - offset))
+                await asyncio.sleep(chunk_seconds)
+
+        return StreamingResponse(audio(), media_type="audio/mpeg")
+
+    @app.post("/elevenlabs/v1/speech-to-text")
+    async def speech_to_text(request: Request):
+        await request.body()
+        if not vendors.begin("elevenlabs.stt"):
+            return _vendor_error("elevenlabs")
+        await vendors.delay("elevenlabs.stt")
+        return {"language_code": "eng", "language_probability": 0.98, "text": TRANSCRIPT,
+                "words": [{"text": word, "type": "word", "start": i * 0.4, "end": i * 0.4 + 0.35, "logprob": -0.1}
+                          for i, word in enumerate(TRANSCRIPT.split())]}
+
+    @app.websocket("/elevenlabs/v1/text-to-speech/{voice_id}/stream-input")
+    async def stream_input(websocket: WebSocket, voice_id: str):
+        await websocket.accept()
+        failed = not vendors.begin("elevenlabs.stream", model="elevenlabs.tts")
+        pending: List[asyncio.Task] = []
+        send_lock = asyncio.Lock()
+
+        async def speak(text: str, previous: Optional[asyncio.Task]):
+            await vendors.delay("elevenlabs.tts")
+            if previous is not None:
+                await previous  # audio goes out in text order
+            size = len(text) * PCM_BYTES_PER_CHAR
+            for offset in range(0, size, STREAM_CHUNK_BYTES):
+                chunk = bytes(min(STREAM_CHUNK_BYTES, size - offset))
+                async with send_lock:
+                    await websocket.send_json({"audio": base64.b64encode(chunk).decode(), "isFinal": False})
+                await asyncio.sleep(0.1 / GENERATION_SPEEDUP)
+
+        try:
+            while True:
+                message = json.loads(await websocket.receive_text())
+                text = message.get("text")
+                if failed:
+                    await websocket.send_json({"error": "injected elevenlabs failure"})
+                    break
+                if text == "":
+                    if pending:
+                        await pending[-1]
+                    await websocket.send_json({"isFinal": True})
+                    break
+                if text and text.strip():
+                    pending.append(asyncio.create_task(speak(text, pending[-1] if pending else None)))
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+        await websocket.close()
+
+    # --- Supabase ---
+
+    @app.get("/supabase/auth/v1/user")
+    async def auth_user(request: Request):
+        vendors.calls["supabase.auth"] += 1
+        await vendors.delay("supabase.auth")
+        token = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        user = vendors.dataset.user_for_token(token)
+        if user is None:
+            return JSONResponse({"code": 401, "error_code": "bad_jwt", "msg": "invalid JWT"}, status_code=401)
+        return {"id": user.id, "aud": "authenticated", "role": "authenticated", "email": user.email,
+                "app_metadata": {"provider": "email"},
+                "user_metadata": {"role": user.role, "first_name": user.first_name, "last_name": user.last_name},
+                "created_at": "2025-01-01T00:00:00+00:00"}
+
+    @app.post("/supabase/rest/v1/rpc/{function}")
+    async def rpc(function: str, request: Request):
+        vendors.calls["supabase.rest"] += 1
+        body = await request.body()
+        await vendors.delay("supabase.rest")
+        status, data = vendors.store.rpc(function, json.loads(body) if body else {})
+        return JSONResponse(data, status_code=status)
+
+    @app.api_route("/supabase/rest/v1/{table}", methods=["GET", "HEAD", "POST", "PATCH", "DELETE"])
+    async def rest(table: str, request: Request):
+        if not vendors.begin("supabase.rest"):
+            return JSONResponse({"code": "57014", "message": "injected database failure",
+                                 "hint": None, "details": None}, status_code=503)
+        body = await request.body()
+        await vendors.delay("supabase.rest")
+        status, headers, data = vendors.store.handle(
+            request.method, table, parse_query(request.url.query),
+            {key.lower(): value for key, value in request.headers.items()},
+            json.loads(body) if body else None,
+        )
+        if data is None:
+            return Response(status_code=status, headers=headers)
+        return JSONResponse(data, status_code=status, headers=headers)
+
+    return app
+
+
+# --- Google (gRPC) ---
+
+def create_grpc_server(vendors: FakeVendors, port: int) -> grpc.Server:
+    """Google Speech and Text-to-Speech on a plaintext port; handlers sleep on worker threads"""
+
+    def wait(endpoint: str, context):
+        if not vendors.begin(endpoint):
+            context.abort(grpc.StatusCode.UNAVAILABLE, f"injected {endpoint} failure")
+        time.sleep(vendors.models[endpoint].sample())
+
+    def alternative():
+        return speech.SpeechRecognitionAlternative(transcript=TRANSCRIPT, confidence=0.93)
+
+    def recognize(request, context):
+        wait("google.stt", context)
+        return speech.RecognizeResponse(results=[
+            speech.SpeechRecognitionResult(alternatives=[alternative()], language_code="en-us")])
+
+    def streaming_recognize(requests, context):
+        for _ in requests:  # config first, then audio until the client half-closes
+            pass
+        wait("google.stt", context)
+        yield speech.StreamingRecognizeResponse(results=[
+            speech.StreamingRecognitionResult(alternatives=[alternative()], is_final=True, language_code="en-us")])
+
+    def synthesize(request, context):
+        wait("google.tts", context)
+        return texttospeech.SynthesizeSpeechResponse(
+            audio_content=bytes(max(len(request.input.text), 1) * MP3_BYTES_PER_CHAR))
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=64))
+    server.add_generic_rpc_handlers([
+        grpc.method_handlers_generic_handler("google.cloud.speech.v1.Speech", {
+            "Recognize": grpc.unary_unary_rpc_method_handler(
+                recognize, speech.RecognizeRequest.deserialize, speech.RecognizeResponse.serialize),
+            "StreamingRecognize": grpc.stream_stream_rpc_method_handler(
+                streaming_recognize, speech.StreamingRecognizeRequest.deserialize,
+                speech.StreamingRecognizeResponse.serialize),
+        }),
+        grpc.method_handlers_generic_handler("google.cloud.texttospeech.v1.TextToSpeech", {
+            "SynthesizeSpeech": grpc.unary_unary_rpc_method_handler(
+                synthesize, texttospeech.SynthesizeSpeechRequest.deserialize,
+                texttospeech.SynthesizeSpeechResponse.serialize),
+        }),
+    ])
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    return server
+
+
+def env_for(port: int, grpc_port: int) -> Dict[str, str]:
+    """Environment that points the app at the stand-ins"""
+    base = f"http://127.0.0.1:{port}"
+    return {
+        "OPENAI_BASE_URL": f"{base}/openai/v1",
+        "ELEVENLABS_BASE_URL": f"{base}/elevenlabs",
+        "SUPABASE_URL": f"{base}/supabase",
+        "GOOGLE_EMULATOR_HOST": f"127.0.0.1:{grpc_port}",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake OpenAI, ElevenLabs, Supabase and Google APIs")
+    parser.add_argument("--port", type=int, default=8910, help="HTTP/websocket port")
+    parser.add_argument("--grpc-port", type=int, default=8911, help="gRPC port for Google Speech/TTS")
+    parser.add_argument("--latency", default=os.getenv("FAKE_LATENCY", ""), help="name=median_ms:p95_ms[:error_rate],... (see latency.py)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the latency models")
+    parser.add_argument("--students", type=int, default=200, help="Seeded students (must match the load generator)")
+    args = parser.parse_args()
+
+    vendors = FakeVendors(build_models(args.latency, args.seed), build_dataset(students=args.students))
+    grpc_server = create_grpc_server(vendors, args.grpc_port)
+    grpc_server.start()
+    print(f"🎭 [FAKES] HTTP on :{args.port}, gRPC on :{args.grpc_port}")
+    try:
+        uvicorn.run(create_app(vendors), host="127.0.0.1", port=args.port, log_level="warning")
+    finally:
+        grpc_server.stop(grace=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Latency Models for the Vendor Stand-ins
+
+Each stand-in endpoint draws its delay from a log-normal distribution given
+by its median and p95 (vendor latencies are long-tailed), plus an optional
+error rate. Models are seeded, so the same seed replays the same delays.
+
+Spec format (FAKE_LATENCY or --latency): "openai.chat=600:1800,elevenlabs.tts=300:800:0.01"
+i.e. name=median_ms:p95_ms[:error_rate], comma separated; unnamed endpoints
+keep DEFAULT_LATENCY.
+"""
+
+import math
+import random
+from typing import Dict, Optional
+
+# name -> (median ms, p95 ms, error rate); figures in line with what the vendors show in production
+DEFAULT_LATENCY = {
+    "openai.chat": (600.0, 1800.0, 0.0),       # full response / time to first streamed token
+    "openai.token": (12.0, 35.0, 0.0),         # gap between streamed deltas
+    "openai.realtime": (350.0, 900.0, 0.0),    # response.create -> first text delta
+    "elevenlabs.tts": (300.0, 800.0, 0.0),     # time to first audio byte
+    "elevenlabs.stt": (450.0, 1200.0, 0.0),
+    "google.stt": (300.0, 900.0, 0.0),
+    "google.tts": (150.0, 400.0, 0.0),
+    "supabase.rest": (25.0, 80.0, 0.0),
+    "supabase.auth": (30.0, 90.0, 0.0),
+}
+
+Z_95 = 1.6449  # standard normal quantile at 0.95
+
+
+class LatencyModel:
+    """Log-normal delay with the given median and p95, and a failure probability"""
+
+    def __init__(self, median_ms: float, p95_ms: float, error_rate: float = 0.0,
+                 rng: Optional[random.Random] = None):
+        if median_ms < 0 or p95_ms < median_ms:
+            raise ValueError(f"need 0 <= median <= p95, got {median_ms}:{p95_ms}")
+        self.median_ms = median_ms
+        self.p95_ms = p95_ms
+        self.error_rate = error_rate
+        self._mu = math.log(median_ms) if median_ms > 0 else 0.0
+        self._sigma = math.log(p95_ms / median_ms) / Z_95 if median_ms > 0 else 0.0
+        self._rng = rng or random.Random()
+
+    def sample(self) -> float:
+        """Delay in seconds"""
+        if self.median_ms == 0:
+            return 0.0
+        return self._rng.lognormvariate(self._mu, self._sigma) / 1000
+
+    def fails(self) -> bool:
+        return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def __repr__(self) -> str:
+        return f"LatencyModel({self.median_ms:g}:{self.p95_ms:g}:{self.error_rate:g})"
+
+
+def parse_latency_spec(spec: str) -> Dict[str, tuple]:
+    """"a=100:300,b=50:90:0.01" -> {"a": (100.0, 300.0, 0.0), "b": (50.0, 90.0, 0.01)}"""
+    parsed = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, values = entry.partition("=")
+        parts = values.split(":")
+        if name.strip() not in DEFAULT_LATENCY or len(parts) not in (2, 3):
+            raise ValueError(f"bad latency entry '{entry}' (known: {', '.join(DEFAULT_LATENCY)})")
+        median, p95 = float(parts[0]), float(parts[1])
+        parsed[name.strip()] = (median, p95, float(parts[2]) if len(parts) == 3 else 0.0)
+    return parsed
+
+
+def build_models(spec: str = "", seed: int = 0) -> Dict[str, LatencyModel]:
+    """One model per endpoint, each with its own RNG derived from seed"""
+    settings = {**DEFAULT_LATENCY, **parse_latency_spec(spec)}
+    return {
+        name: LatencyModel(median, p95, error_rate, random.Random(f"{seed}:{name}"))
+        for name, (median, p95, error_rate) in settings.items()
+    }
@@ -0,0 +1,274 @@
+"""
+In-Memory PostgREST
+
+Enough of the PostgREST protocol for the queries this app builds with
+supabase-py, served from Python dicts:
+- Filters: eq, neq, gt, gte, lt, lte, like, ilike, is, in, cs and their not.
+  forms, plus or=(...) groups
+- select= column lists with embedded resources (e.g. "*, profiles(first_name)"),
+  order=, limit=, offset=
+- Prefer: count=exact (Content-Range), return=representation,
+  resolution=merge-duplicates with on_conflict=
+- Accept: application/vnd.pgrst.object+json (single / maybe_single)
+- rpc/<function> calls answered by registered Python callables
+
+Rows without a column behave like NULL; inserts fill in id, created_at and
+updated_at.
+"""
+
+import fnmatch
+import itertools
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+SINGLE_OBJECT = "application/vnd.pgrst.object+json"
+# Tables keyed by uuid; all others get serial integer ids
+UUID_TABLES = {"profiles", "conversations", "conversation_participants", "messages", "message_status", "user_status"}
+# Many-to-one embeds whose foreign key isn't <table>_id
+EMBED_KEYS = {"profiles": ("user_id", "sender_id", "student_id", "teacher_id", "created_by")}
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+Row = Dict[str, Any]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _singular(table: str) -> str:
+    return table[:-1] if table.endswith("s") else table
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if current:
+        parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def _coerce(row_value: Any, text: str) -> Tuple[Any, Any]:
+    """Make a row value and a query string comparable"""
+    if isinstance(row_value, bool):
+        return row_value, text.lower() == "true"
+    if isinstance(row_value, (int, float)):
+        try:
+            return row_value, float(text)
+        except ValueError:
+            return str(row_value), text
+    return ("" if row_value is None else str(row_value)), text
+
+
+def _compare(op: str, value: Any, arg: str) -> bool:
+    if op == "is":
+        return {"null": value is None, "true": value is True, "false": value is False}.get(arg.lower(), False)
+    if op == "in":
+        options = [option.strip().strip('"') for option in arg.strip("()").split(",") if option.strip()]
+        return any(_compare("eq", value, option) for option in options)
+    if op == "cs":
+        wanted = json.loads(arg) if arg.startswith(("[", "{")) else arg.strip("{}").split(",")
+        if isinstance(value, dict):
+            return all(value.get(key) == item for key, item in wanted.items())
+        return isinstance(value, list) and all(item in value for item in wanted)
+    if value is None:
+        return False
+    if op in ("like", "ilike"):
+        pattern = arg.replace("*", "%").replace("%", "*")
+        if op == "ilike":
+            return fnmatch.fnmatchcase(str(value).lower(), pattern.lower())
+        return fnmatch.fnmatchcase(str(value), pattern)
+    left, right = _coerce(value, arg)
+    return {
+        "eq": left == right, "neq": left != right,
+        "gt": left > right, "gte": left >= right,
+        "lt": left < right, "lte": left <= right,
+    }[op]
+
+
+def _matches(row: Row, column: str, expression: str) -> bool:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, arg = expression.partition(".")
+    result = _compare(op, row.get(column), arg)
+    return not result if negate else result
+
+
+def _matches_or(row: Row, group: str) -> bool:
+    for condition in _split_top_level(group.strip("()")):
+        column, _, expression = condition.partition(".")
+        if _matches(row, column, expression):
+            return True
+    return False
+
+
+class PostgrestStore:
+    """Tables of rows plus rpc functions, queried the way PostgREST would"""
+
+    def __init__(self, tables: Optional[Dict[str, List[Row]]] = None,
+                 functions: Optional[Dict[str, Callable[["PostgrestStore", Dict[str, Any]], Any]]] = None):
+        self._serial = itertools.count(1_000_000)
+        self.tables: Dict[str, List[Row]] = {name: [self._new_row(name, row) for row in rows]
+                                             for name, rows in (tables or {}).items()}
+        self.functions = dict(functions or {})
+
+    # --- helpers ---
+
+    def _filter(self, table: str, params: List[Tuple[str, str]]) -> List[Row]:
+        rows = self.tables.get(table, [])
+        for key, value in params:
+            if key in RESERVED_PARAMS or "." in key:  # foreign-table modifiers are ignored
+                continue
+            if key == "or":
+                rows = [row for row in rows if _matches_or(row, value)]
+            else:
+                rows = [row for row in rows if _matches(row, key, value)]
+        return rows
+
+    @staticmethod
+    def _order(rows: List[Row], spec: Optional[str]) -> List[Row]:
+        for term in reversed(_split_top_level(spec or "")):
+            column, *modifiers = term.split(".")
+            descending = "desc" in modifiers
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: row[column], reverse=descending)
+            rows = missing + present if "nullsfirst" in modifiers else present + missing
+        return rows
+
+    def _project(self, table: str, row: Row, select: str) -> Row:
+        items = _split_top_level(select or "*")
+        result: Row = {}
+        for item in items:
+            if "(" in item:
+                name, _, inner = item.partition("(")
+                alias, _, target = name.partition(":") if ":" in name else (name, "", name)
+                target = target.split("!")[0].strip()
+                result[alias.split("!")[0].strip()] = self._embed(table, row, target, inner.rstrip(")"))
+            elif item == "*":
+                result.update(row)
+            else:
+                alias, _, column = item.partition(":") if ":" in item else (item, "", item)
+                column = column.split("::")[0].strip()
+                result[alias.strip()] = row.get(column)
+        return result
+
+    def _embed(self, parent: str, row: Row, table: str, select: str) -> Any:
+        # Many-to-one: this row holds the foreign key
+        for key in (f"{_singular(table)}_id",) + EMBED_KEYS.get(table, ()):
+            if row.get(key) is not None:
+                target = next((other for other in self.tables.get(table, []) if other.get("id") == row[key]), None)
+                return self._project(table, target, select) if target is not None else None
+        # One-to-many: rows in `table` pointing back at this row
+        back_key = f"{_singular(parent)}_id"
+        return [self._project(table, other, select) for other in self.tables.get(table, [])
+                if row.get("id") is not None and other.get(back_key) == row["id"]]
+
+    def _new_row(self, table: str, values: Row) -> Row:
+        row = dict(values)
+        if "id" not in row:
+            row["id"] = str(uuid.uuid4()) if table in UUID_TABLES else next(self._serial)
+        row.setdefault("created_at", _now())
+        row.setdefault("updated_at", row["created_at"])
+        return row
+
+    # --- request handling ---
+
+    def handle(self, method: str, table: str, params: List[Tuple[str, str]], headers: Dict[str, str],
+               body: Any) -> Tuple[int, Dict[str, str], Any]:
+        """Returns (status, headers, JSON body or None)"""
+        query = dict(params)
+        prefer = headers.get("prefer", "")
+        if method in ("GET", "HEAD"):
+            matched = self._order(self._filter(table, params), query.get("order"))
+            rows = matched
+        elif method == "POST":
+            rows = self._insert(table, body, prefer, query.get("on_conflict"))
+            matched = rows
+        elif method == "PATCH":
+            matched = rows = self._filter(table, params)
+            for row in rows:
+                row.update(body or {})
+        elif method == "DELETE":
+            matched = rows = self._filter(table, params)
+            doomed = {id(row) for row in rows}
+            self.tables[table] = [row for row in self.tables.get(table, []) if id(row) not in doomed]
+        else:
+            return 405, {}, {"message": f"method {method} not supported"}
+
+        total = len(matched)
+        offset = int(query.get("offset", 0))
+        if "limit" in query:
+            rows = rows[offset:offset + int(query["limit"])]
+        elif offset:
+            rows = rows[offset:]
+
+        response_headers = {}
+        if "count=" in prefer:
+            span = f"{offset}-{offset + len(rows) - 1}" if rows else "*"
+            response_headers["content-range"] = f"{span}/{total}"
+        if method == "HEAD":
+            return 200, response_headers, None
+        if method != "GET" and "return=representation" not in prefer:
+            return 201 if method == "POST" else 204, response_headers, None
+
+        data = [self._project(table, row, query.get("select", "*")) for row in rows]
+        if SINGLE_OBJECT in headers.get("accept", ""):
+            if len(data) != 1:
+                return 406, response_headers, {
+                    "code": "PGRST116",
+                    "details": f"The result contains {len(data)} rows",
+                    "hint": None,
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                }
+            return 200, response_headers, data[0]
+        return 201 if method == "POST" else 200, response_headers, data
+
+    def _insert(self, table: str, body: Any, prefer: str, on_conflict: Optional[str]) -> List[Row]:
+        records = body if isinstance(body, list) else [body or {}]
+        rows = self.tables.setdefault(table, [])
+        merge = "resolution=merge-duplicates" in prefer
+        ignore = "resolution=ignore-duplicates" in prefer
+        keys = [key.strip() for key in (on_conflict or "id").split(",")]
+        written = []
+        for record in records:
+            existing = None
+            if merge or ignore:
+                existing = next((row for row in rows
+                                 if all(key in record and row.get(key) == record[key] for key in keys)), None)
+            if existing is not None:
+                if merge:
+                    existing.update(record)
+                written.append(existing)
+            else:
+                row = self._new_row(table, record)
+                rows.append(row)
+                written.append(row)
+        return written
+
+    def rpc(self, name: str, args: Dict[str, Any]) -> Tuple[int, Any]:
+        function = self.functions.get(name)
+        if function is None:
+            return 404, {"code": "PGRST202", "message": f"Could not find the function public.{name}",
+                         "hint": None, "details": None}
+        return 200, function(self, args or {})
+
+
+def parse_query(raw: str) -> List[Tuple[str, str]]:
+    """Query string -> ordered (key, value) pairs, keeping repeated keys (e.g. gte and lte on one column)"""
+    return parse_qsl(raw, keep_blank_values=True)
@@ -0,0 +1,264 @@
+"""
+Load-Test Scenarios
+
+Each scenario is one iteration of a user journey against a running app; a
+run starts `concurrency` virtual users that each repeat it `iterations`
+times. Every request or websocket turn is timed under its own operation
+name, so a report row is e.g. "english_only.turn" rather than the whole
+session:
+- exercise: Repeat After Me submissions (POST /api/evaluate-audio)
+- english_only: greeting plus spoken turns on /api/ws/english-only
+- realtime: greeting plus committed audio turns on /api/ws/openai-realtime
+- dashboards: admin and teacher overview pages
+- messaging: list conversations, send a message, read the thread
+
+Report rows carry count, errors, p50/p95/p99/mean in ms and throughput in
+completed operations per second of wall time.
+"""
+
+import asyncio
+import base64
+import io
+import json
+import math
+import random
+import statistics
+import time
+import wave
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import websockets
+
+from app.loadtest.seed import PHRASES, Dataset
+
+TURN_TIMEOUT = 60.0  # seconds to wait for a websocket reply before counting the turn as failed
+
+
+def wav_bytes(seconds: float = 1.5, rate: int = 16000, seed: int = 0) -> bytes:
+    """Mono 16-bit WAV with a quiet tone and a little noise, so it isn't all silence"""
+    rng = random.Random(seed)
+    frames = bytearray()
+    for i in range(int(seconds * rate)):
+        sample = int(3000 * math.sin(2 * math.pi * 220 * i / rate) + rng.randint(-300, 300))
+        frames += sample.to_bytes(2, "little", signed=True)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class Recorder:
+    """Latencies and failures per operation name"""
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, List[str]] = field(default_factory=dict)
+
+    def record(self, operation: str, seconds: float, error: Optional[str] = None):
+        self.latencies.setdefault(operation, [])
+        self.errors.setdefault(operation, [])
+        if error is None:
+            self.latencies[operation].append(seconds)
+        else:
+            self.errors[operation].append(error)
+
+    async def timed(self, operation: str, call: Awaitable[Any], check: Callable[[Any], Optional[str]]) -> Any:
+        """Await call, then record it as failed if check(result) returns a reason or it raises"""
+        started = time.perf_counter()
+        try:
+            result = await call
+        except Exception as e:
+            self.record(operation, time.perf_counter() - started, f"{type(e).__name__}: {e}")
+            return None
+        self.record(operation, time.perf_counter() - started, check(result))
+        return result
+
+    def summary(self, wall_seconds: float) -> Dict[str, Dict[str, float]]:
+        rows = {}
+        for operation in sorted(self.latencies):
+            values = sorted(self.latencies[operation])
+            rows[operation] = {
+                "count": len(values) + len(self.errors[operation]),
+                "errors": len(self.errors[operation]),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 1),
+                "mean_ms": round(statistics.fmean(values) * 1000, 1) if values else 0.0,
+                "throughput": round(len(values) / wall_seconds, 2) if wall_seconds else 0.0,
+            }
+        return rows
+
+    def sample_errors(self, limit: int = 3) -> Dict[str, List[str]]:
+        return {operation: sorted(set(errors))[:limit] for operation, errors in self.errors.items() if errors}
+
+
+@dataclass
+class Context:
+    http: httpx.AsyncClient
+    ws_url: str
+    dataset: Dataset
+    recorder: Recorder
+    audio: bytes
+    turns: int = 2  # spoken turns per websocket session
+
+
+def _http_check(response: httpx.Response) -> Optional[str]:
+    if response.status_code >= 400:
+        return f"HTTP {response.status_code}: {response.text[:120]}"
+    return None
+
+
+def _auth(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _next_json(ws, done: Callable[[Dict[str, Any]], bool]) -> Dict[str, Any]:
+    """Read frames (skipping audio) until done(message) holds; error messages end the wait too"""
+    while True:
+        frame = await ws.recv()
+        if isinstance(frame, bytes):
+            continue
+        message = json.loads(frame)
+        if done(message) or message.get("step") == "error" or message.get("type") == "error":
+            return message
+
+
+def _ws_check(message: Optional[Dict[str, Any]]) -> Optional[str]:
+    if message is None:
+        return "no reply"
+    if message.get("step") in ("error", "no_speech_detected_after_processing") or message.get("type") == "error":
+        return f"{message.get('error_type') or message.get('code') or 'error'}: " \
+               f"{str(message.get('response') or message.get('message'))[:120]}"
+    return None
+
+
+# --- scenarios ---
+
+async def exercise(ctx: Context, user_index: int, rng: random.Random):
+    student = ctx.dataset.by_role("student")[user_index % len(ctx.dataset.by_role("student"))]
+    phrase_id = rng.randint(1, len(PHRASES))
+    payload = {
+        "audio_base64": base64.b64encode(ctx.audio).decode(),
+        "phrase_id": phrase_id,
+        "filename": f"phrase_{phrase_id}.wav",
+        "user_id": student.id,
+        "time_spent_seconds": rng.randint(5, 40),
+        "urdu_used": False,
+    }
+
+    def check(response: httpx.Response) -> Optional[str]:
+        if response.status_code >= 400:
+            return _http_check(response)
+        body = response.json()
+        return None if body.get("success") else f"success=false: {str(body.get('feedback') or body)[:120]}"
+
+    await ctx.recorder.timed("exercise.evaluate_audio", ctx.http.post(
+        "/api/evaluate-audio", json=payload, headers=_auth(student.token)), check)
+
+
+async def english_only(ctx: Context, user_index: int, rng: random.Random):
+    name = f"Student{user_index}"
+    audio = base64.b64encode(ctx.audio).decode()
+    async with websockets.connect(f"{ctx.ws_url}/api/ws/english-only", max_size=None) as ws:
+        greeting = await ctx.recorder.timed("english_only.greeting", _send_and_wait(
+            ws, {"type": "greeting", "user_name": name}, lambda m: m.get("step") == "greeting"), _ws_check)
+        if greeting is None:
+            return
+        for _ in range(ctx.turns):
+            reply = await ctx.recorder.timed("english_only.turn", _send_and_wait(
+                ws, {"type": "audio", "audio_base64": audio, "user_name": name},
+                lambda m: m.get("final") is True or m.get("step") == "no_speech_detected_after_processing"), _ws_check)
+            if _ws_check(reply):
+                return
+
+
+async def realtime(ctx: Context, user_index: int, rng: random.Random):
+    async with websockets.connect(f"{ctx.ws_url}/api/ws/openai-realtime", max_size=None) as ws:
+        await _next_json(ws, lambda m: m.get("type") == "connected")
+        greeting = await ctx.recorder.timed("realtime.greeting", _send_and_wait(
+            ws, {"type": "greeting", "user_name": f"Student{user_index}", "mode": "general"},
+            lambda m: m.get("type") == "greeting_done"), _ws_check)
+        if _ws_check(greeting):
+            return
+        for _ in range(ctx.turns):
+            reply = await ctx.recorder.timed("realtime.turn", _send_audio_turn(ws, ctx.audio), _ws_check)
+            if _ws_check(reply):
+                return
+        await ws.send(json.dumps({"type": "close"}))
+
+
+async def dashboards(ctx: Context, user_index: int, rng: random.Random):
+    admins, teachers = ctx.dataset.by_role("admin"), ctx.dataset.by_role("teacher")
+    admin, teacher = admins[user_index % len(admins)], teachers[user_index % len(teachers)]
+    for operation, path, token in (
+        ("dashboards.admin_overview", "/admin/dashboard/overview", admin.token),
+        ("dashboards.admin_key_metrics", "/admin/dashboard/key-metrics", admin.token),
+        ("dashboards.teacher_overview", "/teacher/dashboard/overview", teacher.token),
+        ("dashboards.teacher_progress", "/teacher/dashboard/progress-overview", teacher.token),
+    ):
+        await ctx.recorder.timed(operation, ctx.http.get(path, headers=_auth(token)), _http_check)
+
+
+async def messaging(ctx: Context, user_index: int, rng: random.Random):
+    students = ctx.dataset.by_role("student")
+    student = students[user_index % len(students)]
+    conversation_id = ctx.dataset.conversations[student.id]
+    headers = _auth(student.token)
+    await ctx.recorder.timed("messaging.list_conversations", ctx.http.get(
+        "/api/conversations", headers=headers), _http_check)
+    await ctx.recorder.timed("messaging.send_message", ctx.http.post(
+        f"/api/conversations/{conversation_id}/messages",
+        json={"content": f"Question {rng.randint(1, 1000)} about today's lesson"}, headers=headers), _http_check)
+    await ctx.recorder.timed("messaging.read_messages", ctx.http.get(
+        f"/api/conversations/{conversation_id}/messages", headers=headers), _http_check)
+
+
+async def _send_and_wait(ws, message: Dict[str, Any], done: Callable[[Dict[str, Any]], bool]):
+    await ws.send(json.dumps(message))
+    return await asyncio.wait_for(_next_json(ws, done), TURN_TIMEOUT)
+
+
+async def _send_audio_turn(ws, audio: bytes):
+    await ws.send(audio)
+    await ws.send(json.dumps({"type": "audio_commit"}))
+    return await asyncio.wait_for(_next_json(ws, lambda m: m.get("type") == "response_done"), TURN_TIMEOUT)
+
+
+SCENARIOS: Dict[str, Callable[[Context, int, random.Random], Awaitable[None]]] = {
+    "exercise": exercise,
+    "english_only": english_only,
+    "realtime": realtime,
+    "dashboards": dashboards,
+    "messaging": messaging,
+}
+
+
+async def run_scenario(name: str, ctx: Context, concurrency: int, iterations: int, seed: int = 0):
+    """Run `concurrency` virtual users through `iterations` of a scenario; returns (report rows, wall seconds)"""
+    scenario = SCENARIOS[name]
+
+    async def virtual_user(index: int):
+        rng = random.Random(f"{seed}:{name}:{index}")
+        await asyncio.sleep(rng.random() * 0.5)  # stagger the ramp-up
+        for _ in range(iterations):
+            try:
+                await scenario(ctx, index, rng)
+            except Exception as e:  # connection-level failures of a whole session
+                ctx.recorder.record(f"{name}.session", 0.0, f"{type(e).__name__}: {e}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+    return ctx.recorder.summary(wall), wall
@@ -0,0 +1,172 @@
+"""
+Load-Test Dataset
+
+Deterministic users, content and activity for the Supabase stand-in. The
+fake servers and the load generator run in different processes and both
+call build_dataset() with the same arguments, so they agree on user ids,
+bearer tokens and conversation ids without talking to each other.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+_NAMESPACE = uuid.UUID("6f1c2d4e-8a7b-4c3d-9e2f-1a0b9c8d7e6f")
+
+STAGES = 6
+EXERCISES_PER_STAGE = 3
+REPEAT_AFTER_ME_EXERCISE_ID = 7  # parent_id of the Stage 1, Exercise 1 topics
+PHRASES = [
+    ("Hello, how are you?", "ہیلو، آپ کیسے ہیں؟"),
+    ("My name is Ali.", "میرا نام علی ہے۔"),
+    ("I like to play cricket.", "مجھے کرکٹ کھیلنا پسند ہے۔"),
+    ("Please open the window.", "براہ کرم کھڑکی کھولیں۔"),
+    ("Where is the library?", "لائبریری کہاں ہے؟"),
+    ("I am going to school.", "میں سکول جا رہا ہوں۔"),
+    ("Can you help me, please?", "کیا آپ میری مدد کر سکتے ہیں؟"),
+    ("Thank you very much.", "آپ کا بہت شکریہ۔"),
+]
+# What the STT stand-ins hear: an exact match for phrase 1, so scoring takes both the local and the GPT path
+TRANSCRIPT = PHRASES[0][0]
+
+
+@dataclass
+class LoadTestUser:
+    id: str
+    role: str
+    token: str
+    email: str
+    first_name: str
+    last_name: str
+
+
+@dataclass
+class Dataset:
+    users: List[LoadTestUser]
+    tables: Dict[str, List[Dict[str, Any]]]
+    conversations: Dict[str, str] = field(default_factory=dict)  # student id -> conversation id
+    functions: Dict[str, Any] = field(default_factory=dict)  # rpc name -> callable(store, args)
+
+    def by_role(self, role: str) -> List[LoadTestUser]:
+        return [user for user in self.users if user.role == role]
+
+    def user_for_token(self, token: str):
+        return next((user for user in self.users if user.token == token), None)
+
+
+def _id(name: str) -> str:
+    return str(uuid.uuid5(_NAMESPACE, name))
+
+
+def _content_rows() -> List[Dict[str, Any]]:
+    rows = []
+    for stage in range(1, STAGES + 1):
+        rows.append({"id": stage, "level": "stage", "parent_id": None, "stage_number": stage,
+                     "title": f"Stage {stage}", "title_urdu": f"مرحلہ {stage}", "difficulty_level": "A1"})
+        for exercise in range(1, EXERCISES_PER_STAGE + 1):
+            rows.append({"id": STAGES + (stage - 1) * EXERCISES_PER_STAGE + exercise, "level": "exercise",
+                         "parent_id": stage, "stage_number": stage, "exercise_number": exercise,
+                         "title": f"Stage {stage} Exercise {exercise}", "title_urdu": ""})
+    for number, (phrase, urdu) in enumerate(PHRASES, start=1):
+        rows.append({"id": 100 + number, "level": "topic", "parent_id": REPEAT_AFTER_ME_EXERCISE_ID,
+                     "stage_number": 1, "exercise_number": 1, "topic_number": number,
+                     "title": phrase, "title_urdu": urdu})
+    return rows
+
+
+def _rpc_functions() -> Dict[str, Any]:
+    def stages(store, args):
+        return [{"stage_number": row["stage_number"], "title": row["title"], "title_urdu": row["title_urdu"],
+                 "difficulty_level": row["difficulty_level"], "exercise_count": EXERCISES_PER_STAGE}
+                for row in store.tables["ai_tutor_content_hierarchy"] if row["level"] == "stage"]
+
+    def exercises(store, args):
+        return [{**row, "topic_count": len(topics(store, {"stage_num": row["stage_number"],
+                                                          "exercise_num": row["exercise_number"]}))}
+                for row in store.tables["ai_tutor_content_hierarchy"] if row["level"] == "exercise"
+                and (args.get("stage_num") is None or row["stage_number"] == args["stage_num"])]
+
+    def topics(store, args):
+        return [row for row in store.tables["ai_tutor_content_hierarchy"] if row["level"] == "topic"
+                and row["stage_number"] == args.get("stage_num") and row["exercise_number"] == args.get("exercise_num")]
+
+    return {
+        "get_all_stages_with_counts": stages,
+        "get_exercises_for_stage_with_counts": exercises,
+        "get_all_exercises_with_details": exercises,
+        "get_topics_for_exercise_full": topics,
+    }
+
+
+def build_dataset(students: int = 200, teachers: int = 10, admins: int = 2) -> Dataset:
+    """Users of every role, content hierarchy, two weeks of activity and one conversation per student"""
+    now = datetime.now(timezone.utc)
+    today = date.today()
+    users = [
+        LoadTestUser(id=_id(f"{role}-{i}"), role=role, token=f"loadtest-{role}-{i}",
+                     email=f"{role}{i}@loadtest.local", first_name=role.title(), last_name=str(i))
+        for role, count in (("student", students), ("teacher", teachers), ("admin", admins))
+        for i in range(count)
+    ]
+    tables: Dict[str, List[Dict[str, Any]]] = {
+        "profiles": [{"id": user.id, "email": user.email, "role": user.role, "first_name": user.first_name,
+                      "last_name": user.last_name, "grade": "8", "created_at": now.isoformat()} for user in users],
+        "ai_tutor_content_hierarchy": _content_rows(),
+        "ai_tutor_user_progress_summary": [],
+        "ai_tutor_daily_learning_analytics": [],
+        "ai_tutor_user_topic_progress": [],
+        "teacher_student_assignments": [],
+        "conversations": [],
+        "conversation_participants": [],
+        "messages": [],
+    }
+    conversations = {}
+    teacher_list = [user for user in users if user.role == "teacher"]
+    for index, student in enumerate(user for user in users if user.role == "student"):
+        stage = index % STAGES + 1
+        tables["ai_tutor_user_progress_summary"].append({
+            "user_id": student.id, "current_stage": stage, "current_exercise": 1,
+            "overall_progress_percentage": float(stage * 15), "total_time_spent_minutes": 30 + index % 120,
+            "streak_days": index % 9, "longest_streak": index % 15, "total_exercises_completed": stage * 2,
+            "unlocked_stages": list(range(1, stage + 1)), "unlocked_exercises": {},
+            "last_activity_date": (today - timedelta(days=index % 10)).isoformat(),
+            "first_activity_date": (today - timedelta(days=60)).isoformat(),
+        })
+        for day in range(0, 14, 1 + index % 3):
+            tables["ai_tutor_daily_learning_analytics"].append({
+                "user_id": student.id, "analytics_date": (today - timedelta(days=day)).isoformat(),
+                "sessions_count": 1 + day % 3, "total_time_minutes": 10 + day, "average_session_duration_minutes": 8,
+                "exercises_completed": day % 2, "average_score": 60.0 + day, "urdu_usage_count": day % 4,
+            })
+        for topic in range(1, 4):
+            tables["ai_tutor_user_topic_progress"].append({
+                "user_id": student.id, "stage_id": 1, "exercise_id": 1, "topic_id": topic,
+                "attempt_num": 1, "score": 55.0 + topic * 10, "urdu_used": False, "completed": topic < 3,
+                "total_time_seconds": 40, "started_at": now.isoformat(), "completed_at": now.isoformat(),
+            })
+        if teacher_list:
+            teacher = teacher_list[index % len(teacher_list)]
+            tables["teacher_student_assignments"].append({
+                "teacher_id": teacher.id, "student_id": student.id, "status": "active",
+            })
+            conversation_id = _id(f"conversation-{student.id}")
+            conversations[student.id] = conversation_id
+            tables["conversations"].append({
+                "id": conversation_id, "title": None, "type": "direct", "created_by": teacher.id,
+                "created_at": now.isoformat(), "updated_at": now.isoformat(), "last_message_at": now.isoformat(),
+                "is_archived": False,
+            })
+            for member, role in ((teacher, "admin"), (student, "participant")):
+                tables["conversation_participants"].append({
+                    "id": _id(f"participant-{conversation_id}-{member.id}"), "conversation_id": conversation_id,
+                    "user_id": member.id, "role": role, "joined_at": now.isoformat(), "left_at": None,
+                    "is_muted": False, "is_pinned": False,
+                })
+            tables["messages"].append({
+                "id": _id(f"message-{conversation_id}"), "conversation_id": conversation_id,
+                "sender_id": teacher.id, "content": "Welcome! Ask me anything about your lessons.",
+                "message_type": "text", "reply_to_id": None, "metadata": {}, "is_edited": False,
+                "is_deleted": False, "created_at": now.isoformat(), "updated_at": now.isoformat(),
+            })
+    return Dataset(users=users, tables=tables, conversations=conversations, functions=_rpc_functions())
@@ -15,8 +15,8 @@ Author: AI Tutor Development Team
 Version: 1.0.0
 """
 
-import logging
 import asyncio
+from functools import partial
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -60,12 +60,24 @@ from .services.safety_manager import get_ai_safety_settings
 from .supabase_client import progress_tracker, warmup_database_connections
 from .cache import load_content_cache
 from .services.connection_pool import connection_pool
-
-
-from fastapi import FastAPI
-from fastapi.responses import StreamingResponse
+from .services.speech_client import close_speech_clients
+from .services.translation import translation_service
+from .services.pdf_quiz_pipeline import pdf_quiz_pipeline
+from .redis_client import async_redis, initialize_redis
+from .services.settings_service import start_settings_listener, stop_settings_listener
+from .services.startup import STARTUP_WARM_WHISPER, startup_state
+from .services.tts_facade import TTSUnavailableError, tts_facade
+from .services.vendor_clients import warm_vendor_clients
+from .middleware.rate_limiter import RATE_LIMIT_ENABLED, RateLimitMiddleware
+from .services.admission import admission_controller
+from .utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, METRICS_ENABLED, metrics_registry
+from .utils.tracing import tracer
+from .utils.logging_config import configure_logging, shutdown_logging
+
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel  
-from gtts import gTTS
 import io
 from datetime import datetime
 
@@ -81,6 +93,10 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Rate limiting is registered before CORS so that 429 responses still carry CORS headers
+if RATE_LIMIT_ENABLED:
+    app.middleware("http")(RateLimitMiddleware())
+
 origins = [
     "*",
 ]
@@ -93,15 +109,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging to suppress WebSocket debug logs
-logging.getLogger("websockets").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.protocols.websockets").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.protocols.http.h11_impl").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.protocols.websocket").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.protocols.http").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.lifespan").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.error").setLevel(logging.WARNING)
-logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+# Queue-backed structured logging with per-module levels; also quiets WebSocket debug logs
+configure_logging()
 
 # Application lifecycle events
 @app.on_event("startup")
@@ -114,9 +123,7 @@ async def startup_event():
     from dotenv import load_dotenv
     load_dotenv()
 
-    # Initialize pre-warmed connection pools
-    print("🔥 [STARTUP] Initializing connection pools...")
-    await connection_pool.initialize()
+    async_redis.start_health_checks()
     
     api_key = os.getenv('OPENAI_API_KEY')
     if api_key:
@@ -124,17 +131,29 @@ async def startup_event():
     else:
         print("❌ [STARTUP] OPENAI_API_KEY not found in environment variables!")
 
-    # OPTIMIZATION: Warm up database connections first
-    print("🔥 [STARTUP] Warming up database connections...")
-    await warmup_database_connections()
-    
-    # OPTIMIZATION: Parallel initialization of all startup tasks
-    print("⚙️ [STARTUP] Initializing all services in parallel...")
+    # Only what every request needs is loaded before accepting traffic
+    print("⚙️ [STARTUP] Loading settings and content...")
     await asyncio.gather(
         get_ai_settings(),
         get_ai_safety_settings(), 
         load_content_cache(progress_tracker)
     )
+    # Admin edits are pushed to every worker (see /admin/settings/refresh)
+    start_settings_listener()
+    startup_state.mark_accepting()
+
+    # Everything else initializes on first use; warm it in the background (see /ready)
+    print("🔥 [STARTUP] Warming connections, clients and tables in the background...")
+    startup_state.warm_in_background("connection_pools", connection_pool.initialize)
+    startup_state.warm_in_background("database", warmup_database_connections)
+    startup_state.warm_in_background("redis_sync", initialize_redis)
+    startup_state.warm_in_background("vendor_clients", warm_vendor_clients)
+    startup_state.warm_in_background(
+        "translation_table", partial(translation_service.load_translation_table, progress_tracker)
+    )
+    if STARTUP_WARM_WHISPER:
+        from .services.whisper_scoring import whisper_engine
+        startup_state.warm_in_background("whisper", whisper_engine.warm_up)
     
     print("📊 [STARTUP] Features enabled:")
     print("   - Progress Tracking System")
@@ -147,9 +166,17 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
+    await startup_state.shutdown()
     await connection_pool.close()
+    await stop_settings_listener()
+    await async_redis.close()
+    await close_speech_clients()
+    tts_facade.shutdown()
+    pdf_quiz_pipeline.shutdown()
+    await asyncio.to_thread(tracer.shutdown)  # flush queued spans
     print("🛑 [SHUTDOWN] AI English Tutor Backend shutting down...")
     print("✅ [SHUTDOWN] Application shutdown complete")
+    shutdown_logging()  # write out queued records
 
 # Include all API routers with proper organization
 print("🚀 [MAIN] Initializing AI English Tutor API...")
@@ -212,13 +239,15 @@ print("✅ [MAIN] All routers included successfully")
 
 @app.post("/tts")
 async def tts_generate_audio(data: TextRequest):
-    # Generate the audio in memory
-    tts = gTTS(text=data.text, lang='en')
-    audio_buffer = io.BytesIO()
-    tts.write_to_fp(audio_buffer)
-    audio_buffer.seek(0)
+    # Cached, off the event loop, best available provider (see services/tts_facade.py)
+    try:
+        audio = await tts_facade.synthesize(data.text)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except TTSUnavailableError:
+        raise HTTPException(status_code=503, detail="Text-to-speech is temporarily unavailable")
 
-    return StreamingResponse(audio_buffer, media_type="audio/mpeg")
+    return StreamingResponse(io.BytesIO(audio), media_type="audio/mpeg")
 
 @app.get("/api/healthcheck")
 async def health_check():
@@ -247,6 +276,24 @@ async def root_health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check(warm: bool = False):
+    """
+    Readiness probe: 200 once the worker accepts traffic, 503 while starting.
+    With ?warm=true, 503 until every background warm-up has finished.
+    """
+    ready = startup_state.warm if warm else startup_state.accepting
+    return JSONResponse(status_code=200 if ready else 503, content=startup_state.readiness())
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint: pipeline latency histograms, cache hits/misses, in-flight and vendor errors"""
+    if not METRICS_ENABLED:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/api/status")
 async def api_status():
     """Comprehensive API status endpoint"""
@@ -262,8 +309,17 @@ async def api_status():
             "english_only_tutor": "enabled",
             "database": "connected"
         },
+        "startup": startup_state.readiness(),
+        "connections": {
+            "vendors": connection_pool.status(),
+            "admission": admission_controller.status(),
+            "tts": tts_facade.status(),
+            "redis": async_redis.status()
+        },
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
+            "metrics": "/metrics",
             "api_health": "/api/healthcheck",
             "db_check": "/api/db-check",
             "docs": "/docs",
@@ -1,294 +1,470 @@
 """
-Rate Limiting Middleware for Messaging System
+Rate Limiting Middleware
 
-This module provides rate limiting functionality to prevent spam and abuse
-in the messaging system. It uses Redis for distributed rate limiting.
+This module provides rate limiting to prevent spam and abuse of the API and
+of the expensive websocket pipelines (STT -> GPT -> TTS). Limits are
+enforced with GCRA (the generic cell rate algorithm, equivalent to a token
+bucket that refills continuously):
+- One atomic Lua script per check: a single round trip through the shared
+  async layer in app/redis_client.py (pooled, circuit-broken), using the
+  Redis server clock so all workers agree
+- A local pre-check bucket with the same parameters sheds obvious abuse
+  without touching Redis; a client over its limit on one worker is over it
+  globally too. It is also the decision of last resort while Redis is down
+- Per-role limits from RateLimitConfig
+- RateLimitMiddleware for HTTP routes and WebSocketRateLimiter for
+  per-message limits inside the websocket handlers
+
+Environment:
+- RATE_LIMIT_ENABLED: register the HTTP middleware (default: true)
+- RATE_LIMIT_LOCAL_MAX_KEYS: clients tracked by the local pre-check (default: 50000)
+- RATE_LIMIT_TRUSTED_PROXIES: proxies in front of the app that append to
+  X-Forwarded-For; the client IP is the entry the outermost of them added
+  (default: 1, 0 uses the socket peer)
+- SUPABASE_JWT_SECRET: verifies token signatures locally so a token can
+  pick a per-user bucket and role; without it (or for a bad signature)
+  requests are bucketed by IP
 """
 
+import os
 import time
-import asyncio
-from typing import Dict, Optional, Callable
-from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
-import redis.asyncio as redis
-import json
 import logging
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Dict, Optional, Callable, Tuple
+from fastapi import Request, WebSocket, status
+from fastapi.responses import JSONResponse
+from app.redis_client import AsyncRedis, RedisUnavailable, async_redis
+from app.utils.bounded_cache import BoundedTTLCache
 
 logger = logging.getLogger(__name__)
 
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_LOCAL_MAX_KEYS = int(os.getenv("RATE_LIMIT_LOCAL_MAX_KEYS", "50000"))
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "1"))
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+
+# Probes and status pages must never be throttled
+EXEMPT_PATHS = {"/health", "/ready", "/metrics", "/api/healthcheck", "/api/status"}
+
+# GCRA in one round trip. Stores the bucket's theoretical arrival time (TAT, ms).
+# KEYS[1]: bucket key. ARGV[1]: emission interval in ms (window / requests),
+# ARGV[2]: burst (requests per window), ARGV[3]: cost (0 peeks without consuming).
+# Returns {limited, remaining, retry_after_ms, reset_after_ms}.
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval * cost
+local allow_at = new_tat - interval * burst
+if allow_at > now then
+  return {1, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+if cost > 0 then
+  redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+end
+return {0, math.floor((now - allow_at) / interval), 0, math.ceil(new_tat - now)}
+"""
+
+
+class RateLimitConfig:
+    """Configuration for rate limiting"""
+
+    def __init__(self):
+        # Default limits
+        self.default_limits = {
+            'message_send': {'requests': 10, 'window': 60},
+            'conversation_create': {'requests': 5, 'window': 300},
+            'file_upload': {'requests': 3, 'window': 60},
+            'websocket_connect': {'requests': 10, 'window': 60},
+            'api_general': {'requests': 100, 'window': 60},
+            # Any message on the messaging websocket (read receipts, joins, status)
+            'ws_message': {'requests': 60, 'window': 60},
+            # One spoken turn costs an STT, a GPT and a TTS call
+            'ws_turn': {'requests': 20, 'window': 60},
+        }
+
+        # User role specific limits
+        self.role_limits = {
+            'admin': {
+                'message_send': {'requests': 50, 'window': 60},
+                'conversation_create': {'requests': 20, 'window': 300},
+                'file_upload': {'requests': 10, 'window': 60},
+                'api_general': {'requests': 300, 'window': 60},
+            },
+            'moderator': {
+                'message_send': {'requests': 30, 'window': 60},
+                'conversation_create': {'requests': 10, 'window': 300},
+                'file_upload': {'requests': 5, 'window': 60},
+            },
+            'teacher': {
+                'message_send': {'requests': 20, 'window': 60},
+                'conversation_create': {'requests': 8, 'window': 300},
+                'file_upload': {'requests': 4, 'window': 60},
+                'api_general': {'requests': 200, 'window': 60},
+            },
+            'student': {
+                'message_send': {'requests': 10, 'window': 60},
+                'conversation_create': {'requests': 5, 'window': 300},
+                'file_upload': {'requests': 3, 'window': 60},
+            }
+        }
+
+    def get_limits_for_user(self, user_role: str = 'student') -> Dict:
+        """Get rate limits for specific user role"""
+        limits = self.default_limits.copy()
+
+        if user_role in self.role_limits:
+            limits.update(self.role_limits[user_role])
+
+        return limits
+
+    def get_limit(self, limit_type: str, user_role: Optional[str] = None) -> Optional[Dict]:
+        """Limit for one type, with the role's override if it has one"""
+        role_limit = self.role_limits.get((user_role or 'student').lower(), {}).get(limit_type)
+        return role_limit or self.default_limits.get(limit_type)
+
+
+class LocalGCRA:
+    """In-process GCRA buckets (one per key), bounded by key count"""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_LOCAL_MAX_KEYS):
+        self._tats = BoundedTTLCache(max_entries=max_keys, max_bytes=max_keys * 64)
+
+    def check(self, key: str, requests: int, window: float, cost: int = 1) -> Tuple[bool, int, float, float]:
+        """(limited, remaining, retry_after, reset_after) in seconds; consumes `cost` when allowed."""
+        now = time.monotonic()
+        interval = window / requests
+        tat = max(self._tats.get(key, now), now)
+        new_tat = tat + interval * cost
+        allow_at = new_tat - interval * requests
+        if allow_at > now:
+            return True, 0, allow_at - now, tat - now
+        if cost > 0:
+            self._tats.set(key, new_tat, ttl=new_tat - now, size=64)
+        return False, int((now - allow_at) / interval), 0.0, new_tat - now
+
+    def refund(self, key: str, requests: int, window: float, cost: int = 1):
+        """Give back a request the global limiter turned down, so local state doesn't run ahead of it."""
+        tat = self._tats.get(key)
+        if tat is not None:
+            now = time.monotonic()
+            new_tat = tat - (window / requests) * cost
+            if new_tat > now:
+                self._tats.set(key, new_tat, ttl=new_tat - now, size=64)
+            else:
+                self._tats.delete(key)
+
+    def stats(self) -> Dict:
+        return self._tats.stats()
+
+
 class RateLimiter:
-    """Rate limiter using Redis for distributed rate limiting"""
-    
-    def __init__(self, redis_client: redis.Redis):
-        self.redis = redis_client
-        
-        # Rate limit configurations
-        self.limits = {
-            'message_send': {'requests': 10, 'window': 60},  # 10 messages per minute
-            'conversation_create': {'requests': 5, 'window': 300},  # 5 conversations per 5 minutes
-            'file_upload': {'requests': 3, 'window': 60},  # 3 files per minute
-            'websocket_connect': {'requests': 10, 'window': 60},  # 10 connections per minute
-            'api_general': {'requests': 100, 'window': 60},  # 100 API calls per minute
+    """Distributed GCRA rate limiter: local pre-check, then one atomic Redis script"""
+
+    def __init__(self, redis_client: Optional[AsyncRedis] = None, config: Optional[RateLimitConfig] = None,
+                 local_precheck: bool = True):
+        self.redis = redis_client or async_redis
+        self.config = config or rate_limit_config
+        self.limits = self.config.default_limits
+        self.local = LocalGCRA() if local_precheck else None
+        self._script = None
+        self._script_client = None
+        self.stats = {"checks": 0, "limited": 0, "shed_locally": 0, "redis_errors": 0}
+
+    def _gcra(self, client):
+        # Script objects are bound to a client; re-register if the pool was recreated
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(GCRA_SCRIPT)
+            self._script_client = client
+        return self._script
+
+    async def _check_redis(self, redis_key: str, limit_config: Dict, cost: int) -> Tuple[int, int, int, int]:
+        interval_ms = limit_config['window'] * 1000 / limit_config['requests']
+        result = await self.redis.call(lambda client: self._gcra(client)(
+            keys=[redis_key], args=[interval_ms, limit_config['requests'], cost]
+        ))
+        limited, remaining, retry_after_ms, reset_after_ms = (int(v) for v in result)
+        return limited, remaining, retry_after_ms / 1000, reset_after_ms / 1000
+
+    def _info(self, limit_type: str, limit_config: Dict, remaining: int, retry_after: float,
+              reset_after: float, source: str) -> Dict:
+        now = time.time()
+        return {
+            'limit_type': limit_type,
+            'current_count': limit_config['requests'] - remaining,
+            'limit': limit_config['requests'],
+            'window': limit_config['window'],
+            'reset_time': int(now + reset_after + 0.999),
+            'remaining': remaining,
+            'retry_after': round(retry_after, 3),
+            'source': source,
         }
-    
-    async def is_rate_limited(self, key: str, limit_type: str) -> tuple[bool, Dict]:
+
+    async def is_rate_limited(self, key: str, limit_type: str, user_role: Optional[str] = None,
+                              cost: int = 1) -> tuple[bool, Dict]:
         """
-        Check if request is rate limited
-        
+        Check if request is rate limited (and count it if it isn't)
+
         Args:
             key: Unique identifier (usually user_id or IP)
             limit_type: Type of rate limit to apply
-            
+            user_role: Role whose limits apply (defaults to the student limits)
+            cost: Requests this call counts as (0 only inspects the bucket)
+
         Returns:
             tuple: (is_limited, rate_limit_info)
         """
-        if limit_type not in self.limits:
+        limit_config = self.config.get_limit(limit_type, user_role)
+        if not limit_config:
             return False, {}
-        
-        limit_config = self.limits[limit_type]
-        current_time = int(time.time())
-        window_start = current_time - limit_config['window']
-        
-        # Create Redis key
+
+        self.stats["checks"] += 1
         redis_key = f"rate_limit:{limit_type}:{key}"
-        
+        requests, window = limit_config['requests'], limit_config['window']
+
+        if self.local is not None:
+            limited, remaining, retry_after, reset_after = self.local.check(redis_key, requests, window, cost)
+            if limited:
+                self.stats["limited"] += 1
+                self.stats["shed_locally"] += 1
+                return True, self._info(limit_type, limit_config, 0, retry_after, reset_after, 'local')
+
         try:
-            # Get current requests in window
-            async with self.redis.pipeline() as pipe:
-                # Remove old entries
-                await pipe.zremrangebyscore(redis_key, 0, window_start)
-                # Add current request
-                await pipe.zadd(redis_key, {str(current_time): current_time})
-                # Set expiry
-                await pipe.expire(redis_key, limit_config['window'])
-                # Get count
-                await pipe.zcard(redis_key)
-                results = await pipe.execute()
-            
-            current_count = results[3]  # zcard result
-            is_limited = current_count > limit_config['requests']
-            
-            rate_limit_info = {
-                'limit_type': limit_type,
-                'current_count': current_count,
-                'limit': limit_config['requests'],
-                'window': limit_config['window'],
-                'reset_time': current_time + limit_config['window'],
-                'remaining': max(0, limit_config['requests'] - current_count)
-            }
-            
-            return is_limited, rate_limit_info
-            
+            limited, remaining, retry_after, reset_after = await self._check_redis(redis_key, limit_config, cost)
         except Exception as e:
-            logger.error(f"Rate limiting error: {str(e)}")
-            # On Redis error, allow request but log
-            return False, {}
-    
-    async def get_rate_limit_info(self, key: str, limit_type: str) -> Dict:
+            self.stats["redis_errors"] += 1
+            if not isinstance(e, RedisUnavailable):
+                logger.error(f"Rate limiting error: {str(e)}")
+            if self.local is None:
+                # Without a local bucket, allow the request but log
+                return False, {}
+            # The local bucket already counted the request: enforce the per-worker limit
+            return False, self._info(limit_type, limit_config, remaining, 0.0, reset_after, 'local')
+
+        if limited:
+            self.stats["limited"] += 1
+            if self.local is not None:
+                self.local.refund(redis_key, requests, window, cost)
+        return bool(limited), self._info(limit_type, limit_config, remaining, retry_after, reset_after, 'redis')
+
+    async def get_rate_limit_info(self, key: str, limit_type: str, user_role: Optional[str] = None) -> Dict:
         """Get current rate limit information without incrementing"""
-        if limit_type not in self.limits:
+        limit_config = self.config.get_limit(limit_type, user_role)
+        if not limit_config:
             return {}
-        
-        limit_config = self.limits[limit_type]
-        current_time = int(time.time())
-        window_start = current_time - limit_config['window']
-        
+
         redis_key = f"rate_limit:{limit_type}:{key}"
-        
         try:
-            async with self.redis.pipeline() as pipe:
-                await pipe.zremrangebyscore(redis_key, 0, window_start)
-                await pipe.zcard(redis_key)
-                results = await pipe.execute()
-            
-            current_count = results[1]  # zcard result
-            
-            return {
-                'limit_type': limit_type,
-                'current_count': current_count,
-                'limit': limit_config['requests'],
-                'window': limit_config['window'],
-                'reset_time': current_time + limit_config['window'],
-                'remaining': max(0, limit_config['requests'] - current_count)
-            }
-            
+            _, remaining, retry_after, reset_after = await self._check_redis(redis_key, limit_config, 0)
+            return self._info(limit_type, limit_config, remaining, retry_after, reset_after, 'redis')
         except Exception as e:
             logger.error(f"Rate limit info error: {str(e)}")
             return {}
 
+    def status(self) -> Dict:
+        return {**self.stats, "local": self.local.stats() if self.local is not None else None}
+
+
+def client_ip(forwarded_for: Optional[str], host: Optional[str]) -> str:
+    """
+    Client address as seen by the outermost trusted proxy. Entries left of it
+    in X-Forwarded-For were written by the client and can't be trusted.
+    """
+    hops = [hop.strip() for hop in (forwarded_for or "").split(',') if hop.strip()]
+    if RATE_LIMIT_TRUSTED_PROXIES <= 0 or not hops:
+        return host or 'unknown'
+    return hops[-min(RATE_LIMIT_TRUSTED_PROXIES, len(hops))]
+
+
+def verified_claims(token: str) -> Optional[Dict[str, Any]]:
+    """Claims of a token whose signature checks out against SUPABASE_JWT_SECRET, else None"""
+    if not SUPABASE_JWT_SECRET:
+        return None
+    try:
+        import jwt
+        return jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=["HS256"], options={"verify_aud": False})
+    except Exception:
+        return None
+
+
+def client_identity(token: Optional[str], forwarded_for: Optional[str], host: Optional[str]) -> Tuple[str, str]:
+    """
+    (client_id, role) for bucketing. Only a verified token picks a per-user
+    bucket and role ("user:<id>"); anything else is bucketed by client IP.
+    """
+    claims = verified_claims(token) if token else None
+    if claims and claims.get('sub'):
+        metadata = claims.get('user_metadata') or {}
+        return f"user:{claims['sub']}", str(metadata.get('role') or 'student').lower()
+    return f"ip:{client_ip(forwarded_for, host)}", 'student'
+
+
+def rate_limited_content(rate_limit_info: Dict) -> Dict:
+    return {
+        'error': 'Rate limit exceeded',
+        'message': f'Too many {rate_limit_info.get("limit_type", "requests")} requests',
+        'rate_limit_info': rate_limit_info,
+        'retry_after': rate_limit_info.get('retry_after', 0),
+    }
+
+
+def rate_limit_headers(rate_limit_info: Dict) -> Dict[str, str]:
+    headers = {
+        'X-RateLimit-Limit': str(rate_limit_info.get('limit', 0)),
+        'X-RateLimit-Remaining': str(rate_limit_info.get('remaining', 0)),
+        'X-RateLimit-Reset': str(rate_limit_info.get('reset_time', 0)),
+    }
+    if rate_limit_info.get('retry_after'):
+        headers['Retry-After'] = str(max(1, int(rate_limit_info['retry_after'] + 0.999)))
+    return headers
+
+
 class RateLimitMiddleware:
     """FastAPI middleware for rate limiting"""
-    
-    def __init__(self, redis_client: redis.Redis):
-        self.rate_limiter = RateLimiter(redis_client)
-    
+
+    def __init__(self, redis_client: Optional[AsyncRedis] = None, config: Optional[RateLimitConfig] = None):
+        self.rate_limiter = RateLimiter(redis_client, config)
+
     async def __call__(self, request: Request, call_next: Callable):
         """Process request with rate limiting"""
-        
-        # Get client identifier (user_id or IP)
-        client_id = await self._get_client_id(request)
-        
+
         # Determine rate limit type based on endpoint
         limit_type = self._get_limit_type(request)
-        
-        if limit_type:
-            # Check rate limit
-            is_limited, rate_limit_info = await self.rate_limiter.is_rate_limited(
-                client_id, limit_type
+        if not limit_type:
+            return await call_next(request)
+
+        # Get client identifier (user_id or IP) and role
+        client_id, role = await self._get_client_id(request)
+        is_limited, rate_limit_info = await self.rate_limiter.is_rate_limited(client_id, limit_type, role)
+
+        if is_limited:
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content=rate_limited_content(rate_limit_info),
+                headers=rate_limit_headers(rate_limit_info)
             )
-            
-            if is_limited:
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        'error': 'Rate limit exceeded',
-                        'message': f'Too many {limit_type} requests',
-                        'rate_limit_info': rate_limit_info,
-                        'retry_after': rate_limit_info.get('reset_time', 0) - int(time.time())
-                    },
-                    headers={
-                        'X-RateLimit-Limit': str(rate_limit_info.get('limit', 0)),
-                        'X-RateLimit-Remaining': str(rate_limit_info.get('remaining', 0)),
-                        'X-RateLimit-Reset': str(rate_limit_info.get('reset_time', 0)),
-                        'Retry-After': str(rate_limit_info.get('reset_time', 0) - int(time.time()))
-                    }
-                )
-            
-            # Add rate limit headers to response
-            response = await call_next(request)
-            response.headers['X-RateLimit-Limit'] = str(rate_limit_info.get('limit', 0))
-            response.headers['X-RateLimit-Remaining'] = str(rate_limit_info.get('remaining', 0))
-            response.headers['X-RateLimit-Reset'] = str(rate_limit_info.get('reset_time', 0))
-            return response
-        
-        return await call_next(request)
-    
-    async def _get_client_id(self, request: Request) -> str:
-        """Get unique client identifier"""
-        # Try to get user_id from token first
-        try:
-            # Extract token from query params or headers
-            token = request.query_params.get('token') or request.headers.get('authorization', '').replace('Bearer ', '')
-            if token:
-                # In a real implementation, you'd decode the JWT to get user_id
-                # For now, we'll use a hash of the token
-                import hashlib
-                return hashlib.md5(token.encode()).hexdigest()
-        except Exception:
-            pass
-        
-        # Fallback to IP address
-        forwarded_for = request.headers.get('X-Forwarded-For')
-        if forwarded_for:
-            return forwarded_for.split(',')[0].strip()
-        
-        return request.client.host if request.client else 'unknown'
-    
+
+        # Add rate limit headers to response
+        response = await call_next(request)
+        if rate_limit_info:
+            response.headers.update(rate_limit_headers(rate_limit_info))
+        return response
+
+    async def _get_client_id(self, request: Request) -> Tuple[str, str]:
+        """Get unique client identifier and role"""
+        token = request.query_params.get('token') or request.headers.get('authorization', '').replace('Bearer ', '')
+        return client_identity(
+            token or None,
+            request.headers.get('X-Forwarded-For'),
+            request.client.host if request.client else None,
+        )
+
     def _get_limit_type(self, request: Request) -> Optional[str]:
         """Determine rate limit type based on request path and method"""
         path = request.url.path
         method = request.method
-        
+
+        if path in EXEMPT_PATHS or method == 'OPTIONS':
+            return None
+
         # Message sending
         if path.endswith('/messages') and method == 'POST':
             return 'message_send'
-        
+
         # Conversation creation
         if path.endswith('/conversations') and method == 'POST':
             return 'conversation_create'
-        
+
         # File upload
         if path.endswith('/upload') and method == 'POST':
             return 'file_upload'
-        
+
         # WebSocket connections
         if path.startswith('/ws/') and method == 'GET':
             return 'websocket_connect'
-        
+
         # General API calls
         if path.startswith('/api/'):
             return 'api_general'
-        
+
         return None
 
 class WebSocketRateLimiter:
     """Rate limiter specifically for WebSocket connections"""
-    
-    def __init__(self, redis_client: redis.Redis):
-        self.rate_limiter = RateLimiter(redis_client)
+
+    def __init__(self, redis_client: Optional[AsyncRedis] = None, config: Optional[RateLimitConfig] = None):
+        self.rate_limiter = RateLimiter(redis_client, config)
         self.connection_limits = {
             'max_connections_per_user': 5,
             'max_messages_per_minute': 60,
             'max_typing_events_per_minute': 30
         }
-    
-    async def check_connection_limit(self, user_id: str) -> tuple[bool, Dict]:
+
+    async def check_connection_limit(self, user_id: str, user_role: Optional[str] = None) -> tuple[bool, Dict]:
         """Check if user can establish new WebSocket connection"""
-        return await self.rate_limiter.is_rate_limited(user_id, 'websocket_connect')
-    
-    async def check_message_limit(self, user_id: str) -> tuple[bool, Dict]:
+        return await self.rate_limiter.is_rate_limited(user_id, 'websocket_connect', user_role)
+
+    async def check_message_limit(self, user_id: str, user_role: Optional[str] = None) -> tuple[bool, Dict]:
         """Check if user can send message via WebSocket"""
-        return await self.rate_limiter.is_rate_limited(user_id, 'message_send')
-    
+        return await self.rate_limiter.is_rate_limited(user_id, 'message_send', user_role)
+
     async def check_typing_limit(self, user_id: str) -> tuple[bool, Dict]:
         """Check if user can send typing indicator"""
         return await self.rate_limiter.is_rate_limited(f"{user_id}:typing", 'api_general')
 
-class RateLimitConfig:
-    """Configuration for rate limiting"""
-    
-    def __init__(self):
-        # Default limits
-        self.default_limits = {
-            'message_send': {'requests': 10, 'window': 60},
-            'conversation_create': {'requests': 5, 'window': 300},
-            'file_upload': {'requests': 3, 'window': 60},
-            'websocket_connect': {'requests': 10, 'window': 60},
-            'api_general': {'requests': 100, 'window': 60},
-        }
-        
-        # User role specific limits
-        self.role_limits = {
-            'admin': {
-                'message_send': {'requests': 50, 'window': 60},
-                'conversation_create': {'requests': 20, 'window': 300},
-                'file_upload': {'requests': 10, 'window': 60},
-            },
-            'moderator': {
-                'message_send': {'requests': 30, 'window': 60},
-                'conversation_create': {'requests': 10, 'window': 300},
-                'file_upload': {'requests': 5, 'window': 60},
-            },
-            'teacher': {
-                'message_send': {'requests': 20, 'window': 60},
-                'conversation_create': {'requests': 8, 'window': 300},
-                'file_upload': {'requests': 4, 'window': 60},
-            },
-            'student': {
-                'message_send': {'requests': 10, 'window': 60},
-                'conversation_create': {'requests': 5, 'window': 300},
-                'file_upload': {'requests': 3, 'window': 60},
-            }
-        }
-    
-    def get_limits_for_user(self, user_role: str = 'student') -> Dict:
-        """Get rate limits for specific user role"""
-        limits = self.default_limits.copy()
-        
-        if user_role in self.role_limits:
-            limits.update(self.role_limits[user_role])
-        
-        return limits
+    async def check_ws_message_limit(self, user_id: str) -> tuple[bool, Dict]:
+        """Check if user can send another (non-chat) message over the messaging WebSocket"""
+        return await self.rate_limiter.is_rate_limited(user_id, 'ws_message')
+
+    async def check_turn_limit(self, websocket: WebSocket) -> tuple[bool, Dict]:
+        """Check if the client behind this tutor websocket may start another STT/GPT/TTS turn"""
+        client_id, role = websocket_client_identity(websocket)
+        return await self.rate_limiter.is_rate_limited(client_id, 'ws_turn', role)
+
+    async def allow_turn(self, websocket: WebSocket,
+                         send: Optional[Callable[[Dict], Awaitable[Any]]] = None) -> bool:
+        """
+        Per-message gate for the tutor websockets: True to go ahead, otherwise the
+        client is told to slow down (through `send`, default websocket.send_json)
+        and the message is dropped before any vendor call is made.
+        """
+        limited, rate_limit_info = await self.check_turn_limit(websocket)
+        if limited:
+            await (send or websocket.send_json)(rate_limited_ws_message(rate_limit_info))
+        return not limited
+
+
+def websocket_client_identity(websocket: WebSocket) -> Tuple[str, str]:
+    """(client_id, role) for a websocket, from its token query param or Authorization header, else its IP"""
+    token = websocket.query_params.get('token') or websocket.headers.get('authorization', '').replace('Bearer ', '')
+    return client_identity(
+        token or None,
+        websocket.headers.get('x-forwarded-for'),
+        websocket.client.host if websocket.client else None,
+    )
+
+
+def rate_limited_ws_message(rate_limit_info: Dict) -> Dict:
+    """Payload sent to a websocket client whose message was turned down"""
+    return {
+        "type": "error",
+        "response": "You're going a little fast! Please wait a moment before trying again.",
+        "step": "error",
+        "error_type": "rate_limited",
+        "retry_after": rate_limit_info.get('retry_after', 0),
+    }
 
 # Utility functions for rate limiting
 
-async def check_rate_limit(redis_client: redis.Redis, key: str, limit_type: str) -> tuple[bool, Dict]:
+async def check_rate_limit(redis_client: Optional[AsyncRedis], key: str, limit_type: str) -> tuple[bool, Dict]:
     """Utility function to check rate limit"""
     rate_limiter = RateLimiter(redis_client)
     return await rate_limiter.is_rate_limited(key, limit_type)
 
-async def get_rate_limit_info(redis_client: redis.Redis, key: str, limit_type: str) -> Dict:
+async def get_rate_limit_info(redis_client: Optional[AsyncRedis], key: str, limit_type: str) -> Dict:
     """Utility function to get rate limit information"""
     rate_limiter = RateLimiter(redis_client)
     return await rate_limiter.get_rate_limit_info(key, limit_type)
@@ -297,16 +473,11 @@ def create_rate_limit_response(rate_limit_info: Dict) -> JSONResponse:
     """Create standardized rate limit response"""
     return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={
-            'error': 'Rate limit exceeded',
-            'message': f'Too many {rate_limit_info.get("limit_type", "requests")}',
-            'rate_limit_info': rate_limit_info,
-            'retry_after': rate_limit_info.get('reset_time', 0) - int(time.time())
-        },
-        headers={
-            'X-RateLimit-Limit': str(rate_limit_info.get('limit', 0)),
-            'X-RateLimit-Remaining': str(rate_limit_info.get('remaining', 0)),
-            'X-RateLimit-Reset': str(rate_limit_info.get('reset_time', 0)),
-            'Retry-After': str(rate_limit_info.get('reset_time', 0) - int(time.time()))
-        }
-    ) 
\ No newline at end of file
+        content=rate_limited_content(rate_limit_info),
+        headers=rate_limit_headers(rate_limit_info)
+    )
+
+
+# Global instances
+rate_limit_config = RateLimitConfig()
+websocket_rate_limiter = WebSocketRateLimiter()
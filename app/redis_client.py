@@ -1,6 +1,31 @@
+"""
+Redis clients
+
+- redis_client: synchronous client, for code that runs in worker threads
+  (connected by initialize_redis() during startup warm-up, not at import)
+- async_redis: shared redis.asyncio layer for everything on the event loop,
+  with a sized connection pool, periodic health checks, pipelining helpers,
+  a circuit breaker and a small in-memory fallback while Redis is down
+
+Environment:
+- REDIS_HOST, REDIS_PORT, REDIS_USERNAME, REDIS_PASSWORD, REDIS_USE_TLS
+- REDIS_MAX_CONNECTIONS: async pool size (default: 50)
+- REDIS_OP_TIMEOUT: seconds per async operation before it counts as a failure (default: 1.0)
+- REDIS_BREAKER_THRESHOLD: consecutive failures that open the breaker (default: 5)
+- REDIS_BREAKER_COOLDOWN: seconds before a half-open retry (default: 15)
+- REDIS_FALLBACK_MAX_KEYS / REDIS_FALLBACK_MAX_BYTES: memory fallback bounds (default: 10000 / 32 MB)
+"""
+
 import os
+import json
+import time
+import asyncio
 import redis
+import redis.asyncio as aioredis
 import logging
+from typing import Any, Callable, Dict, List, Optional
+from app.utils.bounded_cache import BoundedTTLCache
+from app.utils.tracing import tracer
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -9,6 +34,48 @@ logger = logging.getLogger(__name__)
 redis_client = None
 REDIS_AVAILABLE = False
 
+def _build_redis_config() -> dict:
+    """Connection settings shared by the sync client and the async pool"""
+    redis_host = os.getenv("REDIS_HOST", "localhost")
+    redis_port = int(os.getenv("REDIS_PORT", 6379))
+    redis_username = os.getenv("REDIS_USERNAME", "")
+    redis_password = os.getenv("REDIS_PASSWORD", "")
+    redis_use_tls = os.getenv("REDIS_USE_TLS", "false").lower() == "true"
+    
+    print(f"🔧 [REDIS] Connecting to {redis_host}:{redis_port}")
+    logger.info(f"🔧 [REDIS] Connecting to {redis_host}:{redis_port}")
+    
+    # Configure Redis connection with authentication if provided
+    redis_config = {
+        "host": redis_host,
+        "port": redis_port,
+        "db": 0,
+        "decode_responses": True,
+        "socket_connect_timeout": 10,  # Increased timeout for MemoryDB
+        "socket_timeout": 10,
+        "retry_on_timeout": True,
+        "health_check_interval": 30
+    }
+    
+    # Add TLS configuration for MemoryDB
+    if redis_use_tls:
+        import ssl
+        redis_config.update({
+            "ssl": True,  # Enable TLS for MemoryDB
+            "ssl_check_hostname": False,  # AWS MemoryDB certificates
+            "ssl_cert_reqs": ssl.CERT_NONE  # Don't verify SSL certificates for AWS MemoryDB
+        })
+        print("🔧 [REDIS] Using TLS connection for MemoryDB")
+        logger.info("🔧 [REDIS] Using TLS connection for MemoryDB")
+    
+    # Add authentication if username/password are provided
+    if redis_username and redis_password:
+        redis_config["username"] = redis_username
+        redis_config["password"] = redis_password
+        print(f"🔧 [REDIS] Using authentication with username: {redis_username}")
+        logger.info(f"🔧 [REDIS] Using authentication with username: {redis_username}")
+    return redis_config
+
 def initialize_redis():
     """Initialize Redis connection with proper error handling"""
     global redis_client, REDIS_AVAILABLE
@@ -16,45 +83,7 @@ def initialize_redis():
     try:
         print("🔧 [REDIS] Initializing Redis connection...")
         logger.info("🔧 [REDIS] Initializing Redis connection...")
-        
-        redis_host = os.getenv("REDIS_HOST", "localhost")
-        redis_port = int(os.getenv("REDIS_PORT", 6379))
-        redis_username = os.getenv("REDIS_USERNAME", "")
-        redis_password = os.getenv("REDIS_PASSWORD", "")
-        redis_use_tls = os.getenv("REDIS_USE_TLS", "false").lower() == "true"
-        
-        print(f"🔧 [REDIS] Connecting to {redis_host}:{redis_port}")
-        logger.info(f"🔧 [REDIS] Connecting to {redis_host}:{redis_port}")
-        
-        # Configure Redis connection with authentication if provided
-        redis_config = {
-            "host": redis_host,
-            "port": redis_port,
-            "db": 0,
-            "decode_responses": True,
-            "socket_connect_timeout": 10,  # Increased timeout for MemoryDB
-            "socket_timeout": 10,
-            "retry_on_timeout": True,
-            "health_check_interval": 30
-        }
-        
-        # Add TLS configuration for MemoryDB
-        if redis_use_tls:
-            import ssl
-            redis_config.update({
-                "ssl": True,  # Enable TLS for MemoryDB
-                "ssl_check_hostname": False,  # AWS MemoryDB certificates
-                "ssl_cert_reqs": ssl.CERT_NONE  # Don't verify SSL certificates for AWS MemoryDB
-            })
-            print("🔧 [REDIS] Using TLS connection for MemoryDB")
-            logger.info("🔧 [REDIS] Using TLS connection for MemoryDB")
-        
-        # Add authentication if username/password are provided
-        if redis_username and redis_password:
-            redis_config["username"] = redis_username
-            redis_config["password"] = redis_password
-            print(f"🔧 [REDIS] Using authentication with username: {redis_username}")
-            logger.info(f"🔧 [REDIS] Using authentication with username: {redis_username}")
+        redis_config = _build_redis_config()
         
         redis_client = redis.Redis(**redis_config)
         
@@ -88,5 +117,190 @@ def is_redis_available():
     """Check if Redis is available"""
     return REDIS_AVAILABLE
 
-# Initialize Redis connection (non-blocking)
-initialize_redis()
+
+# --- Async Redis layer ---
+
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_OP_TIMEOUT = float(os.getenv("REDIS_OP_TIMEOUT", "1.0"))
+REDIS_BREAKER_THRESHOLD = int(os.getenv("REDIS_BREAKER_THRESHOLD", "5"))
+REDIS_BREAKER_COOLDOWN = float(os.getenv("REDIS_BREAKER_COOLDOWN", "15"))
+REDIS_HEALTH_CHECK_INTERVAL = 30
+REDIS_FALLBACK_MAX_KEYS = int(os.getenv("REDIS_FALLBACK_MAX_KEYS", "10000"))
+REDIS_FALLBACK_MAX_BYTES = int(os.getenv("REDIS_FALLBACK_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class RedisUnavailable(Exception):
+    """Raised instead of calling Redis while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; allows one trial call after `cooldown` seconds"""
+
+    def __init__(self, threshold: int = REDIS_BREAKER_THRESHOLD, cooldown: float = REDIS_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print("✅ [REDIS] Circuit breaker closed, Redis is back")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.threshold:
+            if self.opened_at is None:
+                print(f"⚠️ [REDIS] Circuit breaker opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class AsyncRedis:
+    """
+    Shared redis.asyncio client with a sized pool, per-operation timeout and circuit breaker.
+    get/set/delete (and their _json variants) fall back to memory when Redis fails;
+    call()/pipeline() raise so callers with richer data can choose their own fallback.
+    """
+
+    def __init__(self, max_connections: int = REDIS_MAX_CONNECTIONS, op_timeout: float = REDIS_OP_TIMEOUT,
+                 breaker: Optional[CircuitBreaker] = None, fallback: Optional[BoundedTTLCache] = None):
+        self.max_connections = max_connections
+        self.op_timeout = op_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.fallback = fallback or BoundedTTLCache(REDIS_FALLBACK_MAX_KEYS, REDIS_FALLBACK_MAX_BYTES)
+        self._client: Optional[aioredis.Redis] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self.stats = {"calls": 0, "errors": 0, "rejected": 0, "fallback_reads": 0, "fallback_writes": 0}
+
+    @property
+    def client(self) -> aioredis.Redis:
+        if self._client is None:
+            self._client = aioredis.Redis(max_connections=self.max_connections, **_build_redis_config())
+            print(f"🔧 [REDIS] Async pool created (max {self.max_connections} connections)")
+        return self._client
+
+    async def call(self, operation: Callable[[aioredis.Redis], Any]) -> Any:
+        """Run operation(client) under the breaker and timeout."""
+        if not self.breaker.allow():
+            self.stats["rejected"] += 1
+            raise RedisUnavailable("Redis circuit breaker is open")
+        self.stats["calls"] += 1
+        try:
+            with tracer.span("redis"):
+                result = await asyncio.wait_for(operation(self.client), self.op_timeout)
+        except Exception:
+            self.stats["errors"] += 1
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def pipeline(self, build: Callable[[Any], None], transaction: bool = False) -> List[Any]:
+        """Queue commands with build(pipe) and send them in one round trip."""
+        async def run(client: aioredis.Redis):
+            async with client.pipeline(transaction=transaction) as pipe:
+                build(pipe)
+                return await pipe.execute()
+        return await self.call(run)
+
+    # --- Key/value helpers with in-memory fallback ---
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self.call(lambda client: client.get(key))
+        except Exception as e:
+            self._log_fallback("get", e)
+            self.stats["fallback_reads"] += 1
+            return self.fallback.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        try:
+            await self.call(lambda client: client.set(key, value, ex=ex))
+            return True
+        except Exception as e:
+            self._log_fallback("set", e)
+            self.stats["fallback_writes"] += 1
+            self.fallback.set(key, value, ex)
+            return False
+
+    async def delete(self, *keys: str) -> int:
+        for key in keys:
+            self.fallback.delete(key)
+        try:
+            return await self.call(lambda client: client.delete(*keys))
+        except Exception as e:
+            self._log_fallback("delete", e)
+            return 0
+
+    async def get_json(self, key: str) -> Any:
+        value = await self.get(key)
+        return json.loads(value) if value else None
+
+    async def set_json(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        return await self.set(key, json.dumps(value), ex=ex)
+
+    def _log_fallback(self, operation: str, error: Exception):
+        if not isinstance(error, RedisUnavailable):
+            print(f"⚠️ [REDIS] Async {operation} failed, using memory fallback: {error}")
+
+    # --- Health ---
+
+    async def ping(self) -> bool:
+        try:
+            return bool(await self.call(lambda client: client.ping()))
+        except Exception:
+            return False
+
+    async def _health_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            healthy = await self.ping()
+            if not healthy:
+                print(f"⚠️ [REDIS] Health check failed (breaker: {self.breaker.state})")
+
+    def start_health_checks(self, interval: float = REDIS_HEALTH_CHECK_INTERVAL):
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_loop(interval))
+
+    def status(self) -> Dict[str, Any]:
+        pool = self._client.connection_pool if self._client is not None else None
+        return {
+            "breaker": self.breaker.state,
+            "pool_max_connections": self.max_connections,
+            "pool_in_use": len(getattr(pool, "_in_use_connections", ())) if pool else 0,
+            "fallback": self.fallback.stats(),
+            **self.stats,
+        }
+
+    async def close(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global async instance (the pool is created on first use, inside the running event loop)
+async_redis = AsyncRedis()
@@ -12,6 +12,7 @@ from app.services.stt import transcribe_audio_bytes_eng_only
 from app.services.feedback import evaluate_response_ex2_stage5
 from app.supabase_client import supabase, progress_tracker
 from app.auth_middleware import get_current_user, require_student,require_admin_or_teacher_or_student
+from app.services.admission import admit_evaluation
 
 router = APIRouter()
 
@@ -253,7 +254,8 @@ keywords, and academic presentation criteria. It performs speech-to-text convers
 comprehensive feedback on the presentation quality, argument structure, and academic tone.
 Also records progress tracking data in Supabase database.
 """,
-    tags=["Stage 5 - Exercise 2 (Academic Presentation)"]
+    tags=["Stage 5 - Exercise 2 (Academic Presentation)"],
+    dependencies=[Depends(admit_evaluation)]
 )
 async def evaluate_academic_presentation(
     request: AudioEvaluationRequest,
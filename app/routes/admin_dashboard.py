@@ -4,9 +4,10 @@ from typing import Optional, List, Dict, Any
 import logging
 from datetime import date, datetime, timedelta
 from app.supabase_client import supabase, progress_tracker
-from app.auth_middleware import get_current_user, require_admin_or_teacher
+from app.auth_middleware import get_current_user, require_admin, require_admin_or_teacher
 import json
 from app.cache import get_all_stages_from_cache, get_exercise_by_ids, get_stage_by_id
+from app.services.settings_service import publish_settings_change, refresh_local_settings, settings_status
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["Admin Dashboard"])
@@ -98,9 +99,9 @@ async def get_admin_dashboard_overview(
     """
     Get comprehensive admin dashboard overview with all key metrics
     """
-    print(f"🔄 [ADMIN] GET /admin/dashboard/overview called")
-    print(f"📝 [ADMIN] Time range: {time_range}")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /admin/dashboard/overview called")
+    logger.debug(f"Time range: {time_range}")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         # Get all required metrics with time range filtering
@@ -115,7 +116,7 @@ async def get_admin_dashboard_overview(
             "last_updated": datetime.now().isoformat()
         }
         
-        print(f"✅ [ADMIN] Dashboard data retrieved successfully")
+        logger.debug("Dashboard data retrieved successfully")
         return AdminDashboardResponse(
             success=True,
             data=dashboard_data,
@@ -123,7 +124,6 @@ async def get_admin_dashboard_overview(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_admin_dashboard_overview: {str(e)}")
         logger.error(f"Error in get_admin_dashboard_overview: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -134,8 +134,8 @@ async def get_key_metrics(
     """
     Get key metrics for admin dashboard (Total Users, Students, Teachers, Active Today)
     """
-    print(f"🔄 [ADMIN] GET /admin/dashboard/key-metrics called")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /admin/dashboard/key-metrics called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         metrics = await _get_key_metrics()
@@ -147,7 +147,6 @@ async def get_key_metrics(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_key_metrics: {str(e)}")
         logger.error(f"Error in get_key_metrics: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -158,8 +157,8 @@ async def get_learn_feature_usage(
     """
     Get Learn feature usage summary (Today's Access, This Week's engagement)
     """
-    print(f"🔄 [ADMIN] GET /admin/dashboard/learn-usage called")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /admin/dashboard/learn-usage called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         usage_data = await _get_learn_feature_usage()
@@ -171,7 +170,6 @@ async def get_learn_feature_usage(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_learn_feature_usage: {str(e)}")
         logger.error(f"Error in get_learn_feature_usage: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -183,9 +181,9 @@ async def get_most_accessed_lessons(
     """
     Get most accessed practice lessons with their stages and access counts
     """
-    print(f"🔄 [ADMIN] GET /admin/dashboard/most-accessed-lessons called")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [ADMIN] Limit: {limit}")
+    logger.debug("GET /admin/dashboard/most-accessed-lessons called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Limit: {limit}")
     
     try:
         lessons = await _get_most_accessed_lessons(limit)
@@ -197,7 +195,6 @@ async def get_most_accessed_lessons(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_most_accessed_lessons: {str(e)}")
         logger.error(f"Error in get_most_accessed_lessons: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -211,9 +208,9 @@ async def get_practice_stage_performance(
     """
     Get practice stage performance data for bar chart
     """
-    print(f"🔄 [ADMIN] GET /admin/reports/practice-stage-performance called")
-    print(f"📝 [ADMIN] Time range: {time_range}")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /admin/reports/practice-stage-performance called")
+    logger.debug(f"Time range: {time_range}")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         stage_performance = await _get_practice_stage_performance(time_range)
@@ -225,7 +222,6 @@ async def get_practice_stage_performance(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_practice_stage_performance: {str(e)}")
         logger.error(f"Error in get_practice_stage_performance: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -237,9 +233,9 @@ async def get_user_engagement_overview(
     """
     Get user engagement overview data for donut chart
     """
-    print(f"🔄 [ADMIN] GET /admin/reports/user-engagement-overview called")
-    print(f"📝 [ADMIN] Time range: {time_range}")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /admin/reports/user-engagement-overview called")
+    logger.debug(f"Time range: {time_range}")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         engagement_data = await _get_user_engagement_overview(time_range)
@@ -251,7 +247,6 @@ async def get_user_engagement_overview(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_user_engagement_overview: {str(e)}")
         logger.error(f"Error in get_user_engagement_overview: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -263,9 +258,9 @@ async def get_time_usage_patterns(
     """
     Get time of day usage patterns for line chart
     """
-    print(f"🔄 [ADMIN] GET /admin/reports/time-usage-patterns called")
-    print(f"📝 [ADMIN] Time range: {time_range}")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /admin/reports/time-usage-patterns called")
+    logger.debug(f"Time range: {time_range}")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         time_patterns = await _get_time_usage_patterns(time_range)
@@ -277,7 +272,6 @@ async def get_time_usage_patterns(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_time_usage_patterns: {str(e)}")
         logger.error(f"Error in get_time_usage_patterns: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -290,10 +284,10 @@ async def get_top_content_accessed(
     """
     Get top content accessed with views, scores, and trends
     """
-    print(f"🔄 [ADMIN] GET /admin/reports/top-content-accessed called")
-    print(f"📝 [ADMIN] Time range: {time_range}")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [ADMIN] Limit: {limit}")
+    logger.debug("GET /admin/reports/top-content-accessed called")
+    logger.debug(f"Time range: {time_range}")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Limit: {limit}")
     
     try:
         top_content = await _get_top_content_accessed(limit, time_range)
@@ -305,7 +299,6 @@ async def get_top_content_accessed(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_top_content_accessed: {str(e)}")
         logger.error(f"Error in get_top_content_accessed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -317,9 +310,9 @@ async def get_analytics_overview(
     """
     Get comprehensive analytics overview for Reports & Analytics page
     """
-    print(f"🔄 [ADMIN] GET /admin/reports/analytics-overview called")
-    print(f"📝 [ADMIN] Time range: {time_range}")
-    print(f"👤 [ADMIN] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /admin/reports/analytics-overview called")
+    logger.debug(f"Time range: {time_range}")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         # Get all analytics data
@@ -343,7 +336,6 @@ async def get_analytics_overview(
         )
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in get_analytics_overview: {str(e)}")
         logger.error(f"Error in get_analytics_overview: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -352,7 +344,7 @@ async def _get_key_metrics(time_range: str = "all_time") -> Dict[str, Any]:
     Get key metrics for admin dashboard with time range filtering
     """
     try:
-        print(f"🔄 [ADMIN] Calculating key metrics for time range: {time_range}...")
+        logger.debug(f"Calculating key metrics for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -361,7 +353,7 @@ async def _get_key_metrics(time_range: str = "all_time") -> Dict[str, Any]:
             total_users_result = supabase.table('auth.users').select('id', count='exact').execute()
             total_users = total_users_result.count if total_users_result.count is not None else 0
         except Exception as e:
-            print(f"⚠️ [ADMIN] Error getting total users, using fallback: {str(e)}")
+            logger.warning(f"Error getting total users, using fallback: {str(e)}")
             # Fallback: count from progress summary table
             total_users_result = supabase.table('ai_tutor_user_progress_summary').select('user_id', count='exact').execute()
             total_users = total_users_result.count if total_users_result.count is not None else 0
@@ -411,16 +403,11 @@ async def _get_key_metrics(time_range: str = "all_time") -> Dict[str, Any]:
             "active_today": active_users
         }
         
-        print(f"📊 [ADMIN] Key metrics calculated for {time_range}:")
-        print(f"   - Total Users: {total_users}")
-        print(f"   - Students: {students_count} ({students_percentage}%)")
-        print(f"   - Teachers: {teachers_count} ({teachers_percentage}%)")
-        print(f"   - Active Users: {active_users}")
+        logger.debug(f"Key metrics calculated for {time_range}: Total Users: {total_users}, Students: {students_count} ({students_percentage}%), Teachers: {teachers_count} ({teachers_percentage}%), Active Users: {active_users}")
         
         return metrics
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error calculating key metrics: {str(e)}")
         logger.error(f"Error calculating key metrics: {str(e)}")
         raise
 
@@ -429,7 +416,7 @@ async def _get_learn_feature_usage(time_range: str = "all_time") -> Dict[str, An
     Get Learn feature usage summary with time range filtering
     """
     try:
-        print(f"🔄 [ADMIN] Calculating Learn feature usage for time range: {time_range}...")
+        logger.debug(f"Calculating Learn feature usage for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -472,14 +459,11 @@ async def _get_learn_feature_usage(time_range: str = "all_time") -> Dict[str, An
             "this_week": this_week
         }
         
-        print(f"📊 [ADMIN] Learn feature usage calculated:")
-        print(f"   - Today's Access: {today_access}")
-        print(f"   - This Week: {this_week}")
+        logger.debug(f"Learn feature usage calculated: Today's Access: {today_access}, This Week: {this_week}")
         
         return usage_data
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error calculating Learn feature usage: {str(e)}")
         logger.error(f"Error calculating Learn feature usage: {str(e)}")
         raise
 
@@ -488,7 +472,7 @@ async def _get_most_accessed_lessons(limit: int = 5, time_range: str = "all_time
     Get most accessed practice lessons with time range filtering
     """
     try:
-        print(f"🔄 [ADMIN] Calculating most accessed lessons for time range: {time_range}...")
+        logger.debug(f"Calculating most accessed lessons for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -503,7 +487,7 @@ async def _get_most_accessed_lessons(limit: int = 5, time_range: str = "all_time
             ).execute()
         
         if not lessons_result.data:
-            print(f"ℹ️ [ADMIN] No lesson access data found")
+            logger.debug("No lesson access data found")
             return []
         
         # Count accesses per lesson
@@ -554,11 +538,10 @@ async def _get_most_accessed_lessons(limit: int = 5, time_range: str = "all_time
                 "icon": icon
             })
         
-        print(f"✅ [ADMIN] Most accessed lessons calculated successfully")
+        logger.debug("Most accessed lessons calculated successfully")
         return formatted_lessons
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error in _get_most_accessed_lessons: {str(e)}")
         logger.error(f"Error in _get_most_accessed_lessons: {str(e)}")
         return []
 
@@ -576,7 +559,7 @@ async def _get_practice_stage_performance(time_range: str = "all_time") -> List[
     - Exercise mastery
     """
     try:
-        print(f"🔄 [ADMIN] Calculating REAL practice stage performance for time range: {time_range}...")
+        logger.debug(f"Calculating REAL practice stage performance for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -856,15 +839,14 @@ async def _get_practice_stage_performance(time_range: str = "all_time") -> List[
         # Sort by performance percentage descending (stages with 0% will be at the end)
         sorted_stages = sorted(stage_performance, key=lambda x: x['performance_percentage'], reverse=True)
         
-        print(f"📊 [ADMIN] REAL Practice stage performance calculated: {len(sorted_stages)} stages")
-        print(f"📊 [ADMIN] Performance calculation uses: completion, progress, scores, engagement, maturity")
-        for stage in sorted_stages:
-            print(f"   - Stage {stage['stage_id']} ({stage['stage_name']}): {stage['performance_percentage']}% ({stage['user_count']} users)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"REAL Practice stage performance calculated: {len(sorted_stages)} stages: " + ", ".join(
+                f"Stage {stage['stage_id']} {stage['performance_percentage']}% ({stage['user_count']} users)"
+                for stage in sorted_stages))
         
         return sorted_stages
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error calculating practice stage performance: {str(e)}")
         logger.error(f"Error calculating practice stage performance: {str(e)}")
         raise
 
@@ -873,7 +855,7 @@ async def _get_user_engagement_overview(time_range: str = "all_time") -> List[Di
     Get user engagement overview data for donut chart (Practice vs Learn) with time range filtering
     """
     try:
-        print(f"🔄 [ADMIN] Calculating user engagement overview for time range: {time_range}...")
+        logger.debug(f"Calculating user engagement overview for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -926,14 +908,11 @@ async def _get_user_engagement_overview(time_range: str = "all_time") -> List[Di
             }
         ]
         
-        print(f"📊 [ADMIN] User engagement overview calculated for {time_range}:")
-        print(f"   - Practice Users: {practice_users} ({practice_percentage}%)")
-        print(f"   - Learn Users: {learn_users} ({learn_percentage}%)")
+        logger.debug(f"User engagement overview calculated for {time_range}: Practice Users: {practice_users} ({practice_percentage}%), Learn Users: {learn_users} ({learn_percentage}%)")
         
         return engagement_data
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error calculating user engagement overview: {str(e)}")
         logger.error(f"Error calculating user engagement overview: {str(e)}")
         raise
 
@@ -942,7 +921,7 @@ async def _get_time_usage_patterns(time_range: str = "all_time") -> List[Dict[st
     Get time of day usage patterns for line chart with time range filtering
     """
     try:
-        print(f"🔄 [ADMIN] Calculating time usage patterns for time range: {time_range}...")
+        logger.debug(f"Calculating time usage patterns for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -964,7 +943,7 @@ async def _get_time_usage_patterns(time_range: str = "all_time") -> List[Dict[st
             ).gte('analytics_date', week_start).execute()
         
         if not daily_analytics_result.data:
-            print(f"ℹ️ [ADMIN] No daily analytics data found for {time_range}")
+            logger.debug(f"No daily analytics data found for {time_range}")
             # Return mock data for demonstration
             return _get_mock_time_patterns()
         
@@ -1034,7 +1013,7 @@ async def _get_time_usage_patterns(time_range: str = "all_time") -> List[Dict[st
                 hour_counts[hour] = max(1, int(round(hour_counts[hour])))
         else:
             # No valid usage data found, return mock data
-            print(f"⚠️ [ADMIN] No valid usage data found (total_usage_units=0), returning mock data")
+            logger.warning("No valid usage data found (total_usage_units=0), returning mock data")
             return _get_mock_time_patterns()
         
         # Format for line chart
@@ -1047,14 +1026,11 @@ async def _get_time_usage_patterns(time_range: str = "all_time") -> List[Dict[st
                 'formatted_hour': f"{hour:02d}:00"
             })
         
-        print(f"📊 [ADMIN] Time usage patterns calculated: {len(time_patterns)} hours")
-        print(f"📊 [ADMIN] Total usage units processed: {total_usage_units}")
-        print(f"📊 [ADMIN] Peak hour usage: {max([p['usage_count'] for p in time_patterns]) if time_patterns else 0}")
-        print(f"📊 [ADMIN] Records processed: {len(daily_analytics_result.data)}")
+        logger.debug("Time usage patterns calculated: %s hours, %s usage units, %s records",
+                     len(time_patterns), total_usage_units, len(daily_analytics_result.data))
         return time_patterns
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error calculating time usage patterns: {str(e)}")
         logger.error(f"Error calculating time usage patterns: {str(e)}")
         raise
 
@@ -1063,7 +1039,7 @@ async def _get_top_content_accessed(limit: int = 5, time_range: str = "all_time"
     Get top content accessed with views, scores, and trends with time range filtering
     """
     try:
-        print(f"🔄 [ADMIN] Calculating top content accessed for time range: {time_range}...")
+        logger.debug(f"Calculating top content accessed for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -1078,7 +1054,7 @@ async def _get_top_content_accessed(limit: int = 5, time_range: str = "all_time"
             ).execute()
         
         if not topic_progress_result.data:
-            print(f"ℹ️ [ADMIN] No topic progress data found")
+            logger.debug("No topic progress data found")
             return []
         
         # Aggregate data by content
@@ -1138,11 +1114,10 @@ async def _get_top_content_accessed(limit: int = 5, time_range: str = "all_time"
         # Sort by views descending and limit
         sorted_content = sorted(top_content, key=lambda x: x['views'], reverse=True)[:limit]
         
-        print(f"📊 [ADMIN] Top content accessed calculated: {len(sorted_content)} items")
+        logger.debug(f"Top content accessed calculated: {len(sorted_content)} items")
         return sorted_content
         
     except Exception as e:
-        print(f"❌ [ADMIN] Error calculating top content accessed: {str(e)}")
         logger.error(f"Error calculating top content accessed: {str(e)}")
         raise
 
@@ -1233,6 +1208,21 @@ def _get_mock_time_patterns() -> List[Dict[str, Any]]:
         {'hour': 23, 'usage_count': 30, 'formatted_hour': '23:00'}
     ]
 
+@router.post("/settings/refresh")
+async def refresh_settings(
+    name: Optional[str] = None,
+    current_user: Dict[str, Any] = Depends(require_admin)
+):
+    """
+    Apply edited AI/safety settings on every worker now (name: ai_settings, ai_safety or all)
+    """
+    logger.debug(f"POST /admin/settings/refresh called by {current_user['id']} (name: {name or 'all'})")
+    published = await publish_settings_change(name)
+    if not published:
+        # No pub/sub: refresh this worker; the others pick the change up on their next refresh
+        await refresh_local_settings(name)
+    return {"success": True, "published": published, "settings": settings_status()}
+
 @router.get("/health")
 async def admin_health_check():
     """
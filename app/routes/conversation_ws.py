@@ -1,13 +1,29 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from app.services.translation import translate_urdu_to_english, translate_to_urdu
+from app.services.translation import translate_urdu_to_english_async, translate_to_urdu_async
 from app.services.tts import synthesize_speech_bytes
 from app.services.feedback import evaluate_response, evaluate_response_eng
 from app.services import stt
+from app.services.speech_client import GoogleStreamingSession
+from app.services.session_store import session_store
 from app.utils.profiler import Profiler
+from app.middleware.rate_limiter import websocket_rate_limiter
+from app.services.admission import CONVERSATION_VENDORS, admit_websocket_turn
+from app.utils.metrics import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    GPT_SECONDS,
+    IN_FLIGHT,
+    STT_SECONDS,
+    TTS_SECONDS,
+    WS_TURN_SECONDS,
+)
+from app.utils.tracing import tracer
+from functools import partial
+from typing import Optional
 import json
+import time
 import base64
 import asyncio
-from functools import lru_cache
 import httpx
 from concurrent.futures import ThreadPoolExecutor
 import threading
@@ -17,11 +33,13 @@ router = APIRouter()
 # Global thread pool for CPU-intensive tasks
 thread_pool = ThreadPoolExecutor(max_workers=4)
 
-# Global cache for frequently used translations and TTS
-translation_cache = {}
+# Global cache for frequently used TTS (translations are cached by the translation service)
 tts_cache = {}
 _tts_cache_initialized = False
 
+# Resumable session state (see session_store.py): the sentence being practiced
+SESSION_NAMESPACE = "learn"
+
 # Connection pool for HTTP clients
 http_client = None
 
@@ -50,45 +68,84 @@ async def safe_send_bytes(websocket: WebSocket, data: bytes):
     except Exception as e:
         print(f"Failed to send binary: {e}")
 
-# Cached translation function
-@lru_cache(maxsize=1000)
-def cached_translate_urdu_to_english(text: str) -> str:
-    """Cached version of translation to avoid repeated API calls"""
-    return translate_urdu_to_english(text)
-
-@lru_cache(maxsize=1000)
-def cached_translate_to_urdu(text: str) -> str:
-    """Cached version of translation to avoid repeated API calls"""
-    return translate_to_urdu(text)
-
 # Async wrapper for CPU-intensive STT
 async def async_transcribe_audio(audio_bytes: bytes):
     """Run STT in thread pool to avoid blocking"""
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        thread_pool, 
-        stt.transcribe_audio_bytes_eng, 
-        audio_bytes
+    with STT_SECONDS.time(route="conversation", vendor="elevenlabs"), tracer.span("stt", vendor="elevenlabs"):
+        return await loop.run_in_executor(
+            thread_pool, 
+            stt.transcribe_audio_bytes_eng, 
+            audio_bytes
+        )
+
+async def get_cached_tts(text: str) -> bytes:
+    """TTS for phrases that repeat across sessions (prompts, feedback), cached in-process"""
+    if text in tts_cache:
+        CACHE_HITS.inc(cache="conversation_tts", level="memory")
+        return tts_cache[text]
+    CACHE_MISSES.inc(cache="conversation_tts")
+    with TTS_SECONDS.time(route="conversation", vendor="elevenlabs"), \
+            tracer.span("tts", vendor="elevenlabs", characters=len(text)):
+        audio = await synthesize_speech_bytes(text)
+    tts_cache[text] = audio
+    return audio
+
+# Streaming STT: transcribe audio frames as they arrive instead of after the full upload
+async def stream_transcribe_turn(websocket: WebSocket, start_message: dict) -> dict:
+    """
+    Feed websocket audio frames into a Google streaming recognizer until the client
+    sends {"type": "audio_stream_end"}, pushing interim transcripts back as they arrive.
+
+    Frames can be binary websocket messages or {"type": "audio_chunk", "audio_base64": ...}.
+    Audio must be raw 16-bit mono PCM at `sample_rate` (default 16000).
+    """
+    language_mode = start_message.get("language_mode", "english")
+
+    async def send_partial(text: str):
+        await safe_send_json(websocket, {
+            "response": text,
+            "step": "partial_transcript"
+        })
+
+    session = GoogleStreamingSession(
+        language_code=start_message.get("language_code", "ur-PK"),
+        sample_rate_hertz=int(start_message.get("sample_rate", 16000)),
+        # Lets Google report English speech so the English edge case still works
+        alternative_language_codes=["en-US"],
+        on_interim=send_partial,
     )
+    await session.start()
 
-# Async wrapper for translation
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame.get("type") == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            if frame.get("bytes"):
+                await session.push_audio(frame["bytes"])
+                continue
+
+            chunk_message = json.loads(frame.get("text") or "{}")
+            chunk_type = chunk_message.get("type")
+            if chunk_type == "audio_chunk" and chunk_message.get("audio_base64"):
+                await session.push_audio(base64.b64decode(chunk_message["audio_base64"]))
+            elif chunk_type == "audio_stream_end":
+                break
+    except BaseException:
+        await session.abort()
+        raise
+
+    result = await session.finish()
+    print(f"📝 Streaming STT ({language_mode}) received {session.bytes_received} bytes: {result['text']}")
+    return result
+
+# Translation goes through the shared async service (content table, LRU + Redis cache, coalescing)
 async def async_translate_urdu_to_english(text: str):
-    """Run translation in thread pool"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        thread_pool,
-        cached_translate_urdu_to_english,
-        text
-    )
+    return await translate_urdu_to_english_async(text)
 
 async def async_translate_to_urdu(text: str):
-    """Run translation in thread pool"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        thread_pool,
-        cached_translate_to_urdu,
-        text
-    )
+    return await translate_to_urdu_async(text)
 
 # Pre-generate common TTS responses
 async def pre_generate_common_tts():
@@ -138,21 +195,243 @@ async def pre_generate_common_tts():
     print(f"✅ [TTS] Successfully cached {success_count}/{len(uncached_texts)} common texts")
     _tts_cache_initialized = True
 
+async def _practice_sentence(websocket: WebSocket, translated_en: str, transcribed_urdu: str,
+                             words: list, language_mode: str, profiler: Profiler) -> str:
+    """Repeat-the-sentence loop: evaluate attempts until correct. Returns the latest language_mode."""
+    # Optimized feedback loop
+    while True:
+        user_repeat_msg = await websocket.receive_text()
+        if not await websocket_rate_limiter.allow_turn(websocket, partial(safe_send_json, websocket)):
+            continue
+        user_repeat_data = json.loads(user_repeat_msg)
+        language_mode = user_repeat_data.get("language_mode", language_mode)
+        user_audio_base64 = user_repeat_data.get("audio_base64")
+
+        if not user_audio_base64:
+            await safe_send_json(websocket, {
+                "response": "No valid audio found in user response." if language_mode == "english" else "صارف کے جواب میں کوئی درست آڈیو نہیں ملی۔",
+                "step": "error"
+            })
+            continue
+
+        # A retry is part of a conversation in progress: admitted ahead of new ones
+        ticket = await admit_websocket_turn(websocket, CONVERSATION_VENDORS, True, partial(safe_send_json, websocket))
+        if ticket is None:
+            continue
+        turn_started = time.perf_counter()
+        IN_FLIGHT.inc(route="conversation")
+        turn_span = tracer.start_span("ws.turn", route="conversation", stage="practice")
+        span_token = tracer.attach(turn_span)
+        try:
+            # Move base64 decoding to thread pool for better performance
+            with tracer.span("audio.decode", encoded_bytes=len(user_audio_base64)):
+                user_audio_bytes = await asyncio.get_event_loop().run_in_executor(
+                    thread_pool,
+                    base64.b64decode,
+                    user_audio_base64
+                )
+        
+            # Parallel STT and feedback evaluation
+            with STT_SECONDS.time(route="conversation", vendor="elevenlabs"), tracer.span("stt", vendor="elevenlabs"):
+                user_transcription_result = await asyncio.get_event_loop().run_in_executor(
+                    thread_pool,
+                    stt.transcribe_audio_bytes_user_repeat,
+                    user_audio_bytes
+                )
+
+            # Extract only the cleaned transcription text
+            user_transcription = user_transcription_result["text"]
+
+            print("user_transcription from elevenlab: ",user_transcription)
+
+            # Check if user_transcription is null or empty
+            if not user_transcription or not user_transcription.strip():
+                await safe_send_json(websocket, {
+                    "response": "No speech detected." if language_mode == "english" else "کوئی آواز نہیں ملی۔",
+                    "step": "no_speech"
+                })
+                continue
+        
+            profiler.mark("🎤 User repeat STT completed")
+            with GPT_SECONDS.time(route="conversation", stage="practice"), \
+                    tracer.span("gpt.evaluation", stage="practice"):
+                if language_mode == "english":
+                    feedback = await asyncio.get_event_loop().run_in_executor(
+                        thread_pool,
+                        evaluate_response_eng,
+                        translated_en,
+                        user_transcription
+                    )
+                else:
+                    feedback = await asyncio.get_event_loop().run_in_executor(
+                        thread_pool,
+                        evaluate_response,
+                        translated_en,
+                        user_transcription
+                    )
+            profiler.mark("🔍 Feedback evaluation completed")
+        finally:
+            ticket.release()
+            IN_FLIGHT.dec(route="conversation")
+            WS_TURN_SECONDS.observe(time.perf_counter() - turn_started, route="conversation", stage="practice")
+            tracer.detach(span_token)
+            turn_span.end()
+        feedback_text = feedback["feedback_text"]
+        # if language_mode == "english":
+        #     # Simple English feedback (customize as needed)
+        #     if feedback["is_correct"]:
+        #         feedback_text = "Great job! Let's try the next sentence."
+        #     else:
+        #         feedback_text = "Let's try again. Speak the sentence clearly."
+        if feedback["is_correct"]:
+            feedback_audio = await get_cached_tts(feedback_text)
+            profiler.mark("🏆 Feedback (correct) TTS completed")
+            await safe_send_json(websocket, {
+                "response": feedback_text,
+                "step": "await_next",
+                "is_true": True
+            })
+            await safe_send_bytes(websocket, feedback_audio)
+            break
+        # if not correct:
+        feedback_audio = await get_cached_tts(feedback_text)
+        # feedback_audio = await synthesize_speech_bytes(feedback_text)
+        # tts_cache[feedback_text] = feedback_audio
+        profiler.mark("🔁 Feedback (retry) TTS completed")
+        await safe_send_json(websocket, {
+            "response": feedback_text,
+            "step": "feedback_step",
+            "is_true": False
+        })
+        await safe_send_bytes(websocket, feedback_audio)
+        # Wait for "feedback_complete"
+        while True:
+            next_msg = await websocket.receive_text()
+            next_data = json.loads(next_msg)
+            language_mode = next_data.get("language_mode", language_mode)
+            if next_data.get("type") == "feedback_complete":
+                break
+        # Word-by-word again
+        if language_mode == "english":
+            word_by_word_text = f"Let's practice word-by-word: {translated_en}"
+        else:
+            word_by_word_text = f"آئیے لفظ بہ لفظ مشق کریں: {translated_en}"
+        await safe_send_json(websocket, {
+            "response": word_by_word_text,
+            "step": "word_by_word",
+            "english_sentence": translated_en,
+            "urdu_sentence": transcribed_urdu,
+            "words": words
+        })
+        while True:
+            next_msg = await websocket.receive_text()
+            next_data = json.loads(next_msg)
+            language_mode = next_data.get("language_mode", language_mode)
+            if next_data.get("type") == "word_by_word_complete":
+                break
+        # Full sentence again - use cached TTS if available
+        if language_mode == "english":
+            full_sentence_text = f"Now repeat the full sentence: {translated_en}."
+        else:
+            full_sentence_text = f"اب دوہرائیں:{translated_en}."
+        full_sentence_audio = await get_cached_tts(full_sentence_text)
+        await safe_send_json(websocket, {
+            "response": full_sentence_text,
+            "step": "full_sentence_audio",
+            "english_sentence": translated_en
+        })
+        try:
+            print("Type of audio to send:", type(full_sentence_audio))  # Should be <class 'bytes'>
+            await safe_send_bytes(websocket, full_sentence_audio)
+            print("Full sentence audio sent successfully")
+        except Exception as e:
+            print("Error sending full sentence audio:", e)
+    return language_mode
+
+
+def _snapshot_learn_session(session_token: Optional[str], step: str, english_sentence: Optional[str],
+                            urdu_sentence: Optional[str], words: Optional[list], language_mode: str):
+    """Persist the sentence being practiced so a reconnect can resume it (no-op without a token)."""
+    if session_token:
+        session_store.snapshot(SESSION_NAMESPACE, session_token, {
+            "step": step,
+            "english_sentence": english_sentence,
+            "urdu_sentence": urdu_sentence,
+            "words": words,
+            "language_mode": language_mode,
+        })
+
+
+async def _resume_learn_session(websocket: WebSocket, profiler: Profiler) -> Optional[str]:
+    """
+    Opt-in resumable sessions: connect with ?resumable=true to get a token, or with
+    ?session_token=<token> to go straight back to the sentence that was being practiced.
+    """
+    token = websocket.query_params.get("session_token")
+    if not token and websocket.query_params.get("resumable", "").lower() != "true":
+        return None
+
+    snapshot = await session_store.load(SESSION_NAMESPACE, token) if token else None
+    if not snapshot:
+        token = session_store.new_token()
+    resumable = bool(snapshot) and snapshot.get("step") in ("you_said", "practice") and snapshot.get("english_sentence")
+    await safe_send_json(websocket, {
+        "step": "session",
+        "session_token": token,
+        "resumed": bool(resumable),
+        "english_sentence": snapshot.get("english_sentence") if resumable else None,
+    })
+    if not resumable:
+        return token
+
+    print(f"♻️ [SESSION] Resuming practice of: {snapshot['english_sentence']}")
+    translated_en = snapshot["english_sentence"]
+    transcribed_urdu = snapshot.get("urdu_sentence") or ""
+    words = snapshot.get("words") or translated_en.split()
+    language_mode = snapshot.get("language_mode") or "english"
+
+    # Skip the you-said/word-by-word warm-up and ask for the full sentence again
+    if language_mode == "english":
+        full_sentence_text = f"Now repeat the full sentence: {translated_en}."
+    else:
+        full_sentence_text = f"اب دوہرائیں:{translated_en}."
+    full_sentence_audio = await get_cached_tts(full_sentence_text)
+    await safe_send_json(websocket, {
+        "response": full_sentence_text,
+        "step": "full_sentence_audio",
+        "english_sentence": translated_en,
+        "urdu_sentence": transcribed_urdu,
+        "words": words,
+        "resumed": True
+    })
+    await safe_send_bytes(websocket, full_sentence_audio)
+
+    _snapshot_learn_session(token, "practice", translated_en, transcribed_urdu, words, language_mode)
+    language_mode = await _practice_sentence(websocket, translated_en, transcribed_urdu, words, language_mode, profiler)
+    _snapshot_learn_session(token, "await_next", None, None, None, language_mode)
+    profiler.summary()
+    return token
+
+
 # Optimized conversation handler
 @router.websocket("/ws/learn")
 async def learn_conversation(websocket: WebSocket):
     await websocket.accept()
-    profiler = Profiler()
+    profiler = Profiler("conversation")
     
     # Ensure TTS cache is initialized (only once globally)
     if not _tts_cache_initialized:
         await pre_generate_common_tts()
 
     try:
+        session_token = await _resume_learn_session(websocket, profiler)
+        completed_turns = 0
         while True:
             # Step 1: Receive base64 audio as JSON
             data = await websocket.receive_text()
             profiler.mark("📥 Received audio JSON")
+            if not await websocket_rate_limiter.allow_turn(websocket, partial(safe_send_json, websocket)):
+                continue
 
             try:
                 message = json.loads(data)
@@ -166,94 +445,131 @@ async def learn_conversation(websocket: WebSocket):
                 })
                 continue
 
-            if not audio_base64:
-                await safe_send_json(websocket, {
-                    "response": "No audio_base64 found.",
-                    "step": "error"
-                })
-                continue
-
-            try:
-                # Move base64 decoding to thread pool for better performance
-                audio_bytes = await asyncio.get_event_loop().run_in_executor(
-                    thread_pool,
-                    base64.b64decode,
-                    audio_base64
-                )
-                profiler.mark("🎙️ Audio decoded from base64")
-            except Exception as e:
-                print("Error decoding audio:", e)
-                await safe_send_json(websocket, {
-                    "response": "Failed to decode audio.",
-                    "step": "error"
-                })
-                continue
-
-            # Parallel STT processing
-            transcription_task = async_transcribe_audio(audio_bytes)
-            transcription_result = await transcription_task
-            transcribed_text = transcription_result["text"]
-            detected_language = transcription_result["language_code"]
-            is_english = transcription_result["is_english"]
-            profiler.mark("📝 STT completed")
+            transcription_result = None
+            if message.get("type") == "audio_stream_start":
+                # Streaming mode: partial transcripts while the learner is still talking.
+                # This happens before admission so no slot is held while they speak
+                try:
+                    with tracer.span("stt", vendor="google", streaming=True, turn=completed_turns + 1):
+                        transcription_result = await stream_transcribe_turn(websocket, message)
+                except WebSocketDisconnect:
+                    raise
+                except Exception as e:
+                    print("Error in streaming STT:", e)
+                    await safe_send_json(websocket, {
+                        "response": "Failed to transcribe audio.",
+                        "step": "error"
+                    })
+                    continue
+                profiler.mark("🎙️ Streaming audio received")
 
-            if not transcribed_text.strip():
-                await safe_send_json(websocket, {
-                    "response": "No speech detected." if language_mode == "english" else "کوئی آواز نہیں ملی۔",
-                    "step": "no_speech"
-                })
+            # Translation, the first TTS and (for uploads) STT run under admission control;
+            # the slots are given back before waiting on the learner for the rest of the exercise
+            ticket = await admit_websocket_turn(websocket, CONVERSATION_VENDORS, completed_turns > 0,
+                                                partial(safe_send_json, websocket))
+            if ticket is None:
                 continue
+            turn_started = time.perf_counter()
+            IN_FLIGHT.inc(route="conversation")
+            turn_span = tracer.start_span("ws.turn", route="conversation", stage="translate",
+                                          turn=completed_turns + 1)
+            span_token = tracer.attach(turn_span)
+            try:
+                if transcription_result is None:
+                    if not audio_base64:
+                        await safe_send_json(websocket, {
+                            "response": "No audio_base64 found.",
+                            "step": "error"
+                        })
+                        continue
+
+                    try:
+                        # Move base64 decoding to thread pool for better performance
+                        with tracer.span("audio.decode", encoded_bytes=len(audio_base64)):
+                            audio_bytes = await asyncio.get_event_loop().run_in_executor(
+                                thread_pool,
+                                base64.b64decode,
+                                audio_base64
+                            )
+                        profiler.mark("🎙️ Audio decoded from base64")
+                    except Exception as e:
+                        print("Error decoding audio:", e)
+                        await safe_send_json(websocket, {
+                            "response": "Failed to decode audio.",
+                            "step": "error"
+                        })
+                        continue
+
+                    # Parallel STT processing
+                    transcription_task = async_transcribe_audio(audio_bytes)
+                    transcription_result = await transcription_task
+
+                transcribed_text = transcription_result["text"]
+                detected_language = transcription_result["language_code"]
+                is_english = transcription_result["is_english"]
+                profiler.mark("📝 STT completed")
+
+                if not transcribed_text.strip():
+                    await safe_send_json(websocket, {
+                        "response": "No speech detected." if language_mode == "english" else "کوئی آواز نہیں ملی۔",
+                        "step": "no_speech"
+                    })
+                    continue
 
-            if is_english:
-                english_feedback = "Great job speaking English! However, please say the Urdu sentence to proceed." if language_mode == "english" else "زبردست! لیکن براہ کرم اردو بولیں تاکہ ہم آگے بڑھ سکیں۔"
-                # Use cached TTS if available
-                if english_feedback in tts_cache:
-                    feedback_audio = tts_cache[english_feedback]
-                else:
-                    feedback_audio = await synthesize_speech_bytes(english_feedback)
-                    tts_cache[english_feedback] = feedback_audio
+                if is_english:
+                    english_feedback = "Great job speaking English! However, please say the Urdu sentence to proceed." if language_mode == "english" else "زبردست! لیکن براہ کرم اردو بولیں تاکہ ہم آگے بڑھ سکیں۔"
+                    # Use cached TTS if available
+                    feedback_audio = await get_cached_tts(english_feedback)
                 
-                profiler.mark("⚠️ English input handled")
+                    profiler.mark("⚠️ English input handled")
 
-                await safe_send_json(websocket, {
-                    "response": english_feedback,
-                    "step": "english_input_edge_case",
-                    "detected_language": detected_language
-                })
-                await safe_send_bytes(websocket, feedback_audio)
-                continue
+                    await safe_send_json(websocket, {
+                        "response": english_feedback,
+                        "step": "english_input_edge_case",
+                        "detected_language": detected_language
+                    })
+                    await safe_send_bytes(websocket, feedback_audio)
+                    continue
 
-            # Parallel translation processing
-            urdu_translation_task = async_translate_to_urdu(transcribed_text)
-            english_translation_task = async_translate_urdu_to_english(transcribed_text.strip())
-            transcribed_urdu, translated_en = await asyncio.gather(
-                urdu_translation_task, 
-                english_translation_task
-            )
-            profiler.mark("🔄 Translations completed")
+                # Parallel translation processing
+                urdu_translation_task = async_translate_to_urdu(transcribed_text)
+                english_translation_task = async_translate_urdu_to_english(transcribed_text.strip())
+                transcribed_urdu, translated_en = await asyncio.gather(
+                    urdu_translation_task, 
+                    english_translation_task
+                )
+                profiler.mark("🔄 Translations completed")
 
-            # Branch for you_said_text
-            if language_mode == "english":
-                you_said_text = f'You said: {transcribed_urdu}. Now repeat after me.'
-            else:
-                you_said_text = f"آپ نے کہا، {transcribed_urdu}۔ اب میرے بعد دوہرائیں۔"
+                # Branch for you_said_text
+                if language_mode == "english":
+                    you_said_text = f'You said: {transcribed_urdu}. Now repeat after me.'
+                else:
+                    you_said_text = f"آپ نے کہا، {transcribed_urdu}۔ اب میرے بعد دوہرائیں۔"
 
-            tts_task = synthesize_speech_bytes(you_said_text)
-            words = translated_en.split()
+                tts_task = synthesize_speech_bytes(you_said_text)
+                words = translated_en.split()
 
-            # Send JSON immediately
-            await safe_send_json(websocket, {
-                "response": you_said_text,
-                "step": "you_said_audio",
-                "english_sentence": translated_en,
-                "urdu_sentence": transcribed_urdu,
-                "words": words
-            })
+                _snapshot_learn_session(session_token, "you_said", translated_en, transcribed_urdu, words, language_mode)
+
+                # Send JSON immediately
+                await safe_send_json(websocket, {
+                    "response": you_said_text,
+                    "step": "you_said_audio",
+                    "english_sentence": translated_en,
+                    "urdu_sentence": transcribed_urdu,
+                    "words": words
+                })
             
-            # Wait for TTS and send audio
-            you_said_audio = await tts_task
-            profiler.mark("🔊 TTS you_said completed")
-            await safe_send_bytes(websocket, you_said_audio)
+                # Wait for TTS and send audio
+                you_said_audio = await tts_task
+                profiler.mark("🔊 TTS you_said completed")
+                await safe_send_bytes(websocket, you_said_audio)
+            finally:
+                ticket.release()
+                IN_FLIGHT.dec(route="conversation")
+                WS_TURN_SECONDS.observe(time.perf_counter() - turn_started, route="conversation", stage="translate")
+                tracer.detach(span_token)
+                turn_span.end()
 
             # Wait for "you_said_complete"
             while True:
@@ -304,145 +620,12 @@ async def learn_conversation(websocket: WebSocket):
             profiler.mark("🔊 TTS full sentence completed")
             await safe_send_bytes(websocket, full_sentence_audio)
 
-            # Optimized feedback loop
-            while True:
-                user_repeat_msg = await websocket.receive_text()
-                user_repeat_data = json.loads(user_repeat_msg)
-                language_mode = user_repeat_data.get("language_mode", language_mode)
-                user_audio_base64 = user_repeat_data.get("audio_base64")
-
-                if not user_audio_base64:
-                    await safe_send_json(websocket, {
-                        "response": "No valid audio found in user response." if language_mode == "english" else "صارف کے جواب میں کوئی درست آڈیو نہیں ملی۔",
-                        "step": "error"
-                    })
-                    continue
-
-                # Move base64 decoding to thread pool for better performance
-                user_audio_bytes = await asyncio.get_event_loop().run_in_executor(
-                    thread_pool,
-                    base64.b64decode,
-                    user_audio_base64
-                )
-                
-                # Parallel STT and feedback evaluation
-                user_transcription_result = await asyncio.get_event_loop().run_in_executor(
-                    thread_pool,
-                    stt.transcribe_audio_bytes_user_repeat,
-                    user_audio_bytes
-                )
-
-                # Extract only the cleaned transcription text
-                user_transcription = user_transcription_result["text"]
-
-                print("user_transcription from elevenlab: ",user_transcription)
-
-                # Check if user_transcription is null or empty
-                if not user_transcription or not user_transcription.strip():
-                    await safe_send_json(websocket, {
-                        "response": "No speech detected." if language_mode == "english" else "کوئی آواز نہیں ملی۔",
-                        "step": "no_speech"
-                    })
-                    continue
-                
-                profiler.mark("🎤 User repeat STT completed")
-                if language_mode == "english":
-                    feedback = await asyncio.get_event_loop().run_in_executor(
-                        thread_pool,
-                        evaluate_response_eng,
-                        translated_en,
-                        user_transcription
-                    )
-                else:
-                    feedback = await asyncio.get_event_loop().run_in_executor(
-                        thread_pool,
-                        evaluate_response,
-                        translated_en,
-                        user_transcription
-                    )
-                profiler.mark("🔍 Feedback evaluation completed")
-                feedback_text = feedback["feedback_text"]
-                # if language_mode == "english":
-                #     # Simple English feedback (customize as needed)
-                #     if feedback["is_correct"]:
-                #         feedback_text = "Great job! Let's try the next sentence."
-                #     else:
-                #         feedback_text = "Let's try again. Speak the sentence clearly."
-                if feedback["is_correct"]:
-                    if feedback_text in tts_cache:
-                        feedback_audio = tts_cache[feedback_text]
-                    else:
-                        feedback_audio = await synthesize_speech_bytes(feedback_text)
-                        tts_cache[feedback_text] = feedback_audio
-                    profiler.mark("🏆 Feedback (correct) TTS completed")
-                    await safe_send_json(websocket, {
-                        "response": feedback_text,
-                        "step": "await_next",
-                        "is_true": True
-                    })
-                    await safe_send_bytes(websocket, feedback_audio)
-                    break
-                # if not correct:
-                if feedback_text in tts_cache:
-                    feedback_audio = tts_cache[feedback_text]
-                else:
-                    feedback_audio = await synthesize_speech_bytes(feedback_text)
-                    tts_cache[feedback_text] = feedback_audio
-                # feedback_audio = await synthesize_speech_bytes(feedback_text)
-                # tts_cache[feedback_text] = feedback_audio
-                profiler.mark("🔁 Feedback (retry) TTS completed")
-                await safe_send_json(websocket, {
-                    "response": feedback_text,
-                    "step": "feedback_step",
-                    "is_true": False
-                })
-                await safe_send_bytes(websocket, feedback_audio)
-                # Wait for "feedback_complete"
-                while True:
-                    next_msg = await websocket.receive_text()
-                    next_data = json.loads(next_msg)
-                    language_mode = next_data.get("language_mode", language_mode)
-                    if next_data.get("type") == "feedback_complete":
-                        break
-                # Word-by-word again
-                if language_mode == "english":
-                    word_by_word_text = f"Let's practice word-by-word: {translated_en}"
-                else:
-                    word_by_word_text = f"آئیے لفظ بہ لفظ مشق کریں: {translated_en}"
-                await safe_send_json(websocket, {
-                    "response": word_by_word_text,
-                    "step": "word_by_word",
-                    "english_sentence": translated_en,
-                    "urdu_sentence": transcribed_urdu,
-                    "words": words
-                })
-                while True:
-                    next_msg = await websocket.receive_text()
-                    next_data = json.loads(next_msg)
-                    language_mode = next_data.get("language_mode", language_mode)
-                    if next_data.get("type") == "word_by_word_complete":
-                        break
-                # Full sentence again - use cached TTS if available
-                if language_mode == "english":
-                    full_sentence_text = f"Now repeat the full sentence: {translated_en}."
-                else:
-                    full_sentence_text = f"اب دوہرائیں:{translated_en}."
-                if full_sentence_text in tts_cache:
-                    full_sentence_audio = tts_cache[full_sentence_text]
-                else:
-                    full_sentence_audio = await synthesize_speech_bytes(full_sentence_text)
-                    tts_cache[full_sentence_text] = full_sentence_audio
-                await safe_send_json(websocket, {
-                    "response": full_sentence_text,
-                    "step": "full_sentence_audio",
-                    "english_sentence": translated_en
-                })
-                try:
-                    print("Type of audio to send:", type(full_sentence_audio))  # Should be <class 'bytes'>
-                    await safe_send_bytes(websocket, full_sentence_audio)
-                    print("Full sentence audio sent successfully")
-                except Exception as e:
-                    print("Error sending full sentence audio:", e)
+            _snapshot_learn_session(session_token, "practice", translated_en, transcribed_urdu, words, language_mode)
+            language_mode = await _practice_sentence(
+                websocket, translated_en, transcribed_urdu, words, language_mode, profiler
+            )
+            _snapshot_learn_session(session_token, "await_next", None, None, None, language_mode)
+            completed_turns += 1
             profiler.summary()
     except WebSocketDisconnect:
         print("Client disconnected")
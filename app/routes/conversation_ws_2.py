@@ -8,6 +8,8 @@ from pydub import AudioSegment
 import websockets
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.services.audio_utils import validate_and_convert_audio
+from app.middleware.rate_limiter import websocket_rate_limiter
+from app.services.admission import admit_websocket_turn
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -116,9 +118,12 @@ async def talk_to_openai(audio_bytes: bytes) -> bytes:
 @router.websocket("/ws/learn_gpt")
 async def learn_gpt_conversation(websocket: WebSocket):
     await websocket.accept()
+    completed_turns = 0
     try:
         while True:
             data = await websocket.receive_text()
+            if not await websocket_rate_limiter.allow_turn(websocket):
+                continue
             try:
                 message = json.loads(data)
                 audio_base64 = message.get("audio_base64")
@@ -147,7 +152,10 @@ async def learn_gpt_conversation(websocket: WebSocket):
                 })
                 continue
 
-            # 🔷 Call OpenAI
+            # 🔷 Call OpenAI (admission control: ongoing conversations first)
+            ticket = await admit_websocket_turn(websocket, ("openai",), completed_turns > 0)
+            if ticket is None:
+                continue
             try:
                 response_audio = await talk_to_openai(converted_audio_bytes)
                 print("✅ Received response from OpenAI")
@@ -158,6 +166,9 @@ async def learn_gpt_conversation(websocket: WebSocket):
                     "step": "error"
                 })
                 continue
+            finally:
+                ticket.release()
+            completed_turns += 1
 
             # Send back the audio response
             await websocket.send_bytes(response_audio)
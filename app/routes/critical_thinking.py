@@ -12,6 +12,7 @@ from app.services.stt import transcribe_audio_bytes_eng_only
 from app.services.feedback import evaluate_response_ex1_stage5
 from app.supabase_client import supabase, progress_tracker
 from app.auth_middleware import get_current_user, require_student,require_admin_or_teacher_or_student
+from app.services.admission import admit_evaluation
 
 router = APIRouter()
 
@@ -270,7 +271,8 @@ This endpoint evaluates the user's recorded audio against the expected critical
 It performs speech-to-text conversion and provides comprehensive feedback on the response quality.
 Also records progress tracking data in Supabase database.
 """,
-    tags=["Stage 5 - Exercise 1 (Critical Thinking Dialogues)"]
+    tags=["Stage 5 - Exercise 1 (Critical Thinking Dialogues)"],
+    dependencies=[Depends(admit_evaluation)]
 )
 async def evaluate_critical_thinking(
     request: AudioEvaluationRequest,
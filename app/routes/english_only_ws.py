@@ -7,23 +7,44 @@ This module provides a ChatGPT-like voice mode experience for English learning w
 - Fallback to normal NLP conversation outside learning areas
 - Professional error handling and edge case management
 - Multi-stage conversation management with intelligent routing
+- Resumable sessions: state is snapshotted after each turn (see session_store.py)
+  so a reconnect with ?session_token=... continues on any worker without
+  replaying the greeting
 """
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.services.tts import synthesize_speech_bytes, synthesize_speech_bytes_slow
 from app.services.feedback import analyze_english_input_eng_only
 from app.services import stt
+from app.services.language_guard import split_completed_sentences
 from app.utils.profiler import Profiler
+import os
 import json
 import base64
 import asyncio
 import contextlib
 from concurrent.futures import ThreadPoolExecutor
 import httpx
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List
 from app.services.predictive_cache import StageAwareCache, PredictiveResult
 from app.services.multi_level_cache import MultiLevelCache, CachedResponse
 from app.utils.performance_monitor import performance_monitor
+from app.services.session_store import session_store
+from app.services.settings_service import settings_cache_version
+from app.utils.single_flight import SingleFlight
+from app.middleware.rate_limiter import websocket_rate_limiter
+from app.services.admission import CONVERSATION_VENDORS, admit_websocket_turn
+from app.utils.metrics import (
+    CACHE_HITS,
+    CACHE_MISSES,
+    GPT_SECONDS,
+    IN_FLIGHT,
+    STT_SECONDS,
+    TTS_SECONDS,
+    WS_TURN_SECONDS,
+)
+from app.utils.tracing import tracer
+from functools import partial
 
 
 router = APIRouter()
@@ -33,10 +54,27 @@ thread_pool = ThreadPoolExecutor(max_workers=10)
 
 # Enhanced TTS cache with metadata
 tts_cache: Dict[str, Dict[str, Any]] = {}
+# Sessions asking for the same phrase at once share one synthesis
+tts_flight = SingleFlight("english_only_tts")
+
+# Speak tutor replies sentence by sentence while GPT is still generating them.
+# Streamed turns send one JSON + audio message per sentence, then a final JSON without audio.
+# Off by default: clients must understand the per-sentence protocol before it is enabled.
+ENGLISH_ONLY_STREAM_REPLIES = os.getenv("ENGLISH_ONLY_STREAM_REPLIES", "false").lower() == "true"
+
+# Resumable session state: what survives a reconnect (loop timestamps and pending
+# binary metadata are per-connection and are not persisted)
+SESSION_NAMESPACE = "english_only"
+SESSION_FIELDS = (
+    "stage", "topic", "user_name", "interaction_count", "learning_path",
+    "skill_level", "preferred_language", "recent_messages", "stage_history",
+)
+MAX_RECENT_MESSAGES = 10
+MAX_STAGE_HISTORY = 10
 
 # Connection pool for HTTP clients
 http_client = None
-predictive_cache = StageAwareCache()
+predictive_cache = StageAwareCache(name="english_only")
 
 # Multi-level cache with pre-generated audio
 multi_level_cache = MultiLevelCache(
@@ -45,6 +83,8 @@ multi_level_cache = MultiLevelCache(
     max_l2_entries=1000,
     l1_audio_cache_size=200,
     l2_audio_cache_size=500,
+    version_fn=settings_cache_version,  # tutor settings edits invalidate cached replies
+    name="english_only",
 )
 
 def get_http_client():
@@ -73,24 +113,44 @@ async def safe_send_bytes(websocket: WebSocket, data: bytes):
 async def async_transcribe_audio_eng_only(audio_bytes: bytes):
     """Run English-Only STT in thread pool to avoid blocking"""
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        thread_pool, 
-        stt.transcribe_audio_bytes_eng_only, 
-        audio_bytes
-    )
+    with STT_SECONDS.time(route="english_only", vendor="elevenlabs"), tracer.span("stt", vendor="elevenlabs"):
+        return await loop.run_in_executor(
+            thread_pool, 
+            stt.transcribe_audio_bytes_eng_only, 
+            audio_bytes
+        )
 
 # Async wrapper for English feedback analysis with enhanced stage management
-async def async_analyze_english_input(user_text: str, stage: str, topic: Optional[str] = None):
+async def async_analyze_english_input(user_text: str, stage: str, topic: Optional[str] = None,
+                                     on_text_delta: Optional[Callable[[str], None]] = None):
     """Run English analysis in thread pool with enhanced stage management"""
     loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        thread_pool,
-        analyze_english_input_eng_only,
-        user_text,
-        stage,
-        topic,
-        loop  # Pass the running event loop to the thread
-    )
+    with GPT_SECONDS.time(route="english_only", stage=stage), tracer.span("gpt.analysis", stage=stage):
+        return await loop.run_in_executor(
+            thread_pool,
+            analyze_english_input_eng_only,
+            user_text,
+            stage,
+            topic,
+            loop,  # Pass the running event loop to the thread
+            on_text_delta
+        )
+
+# Generic replies from feedback.analyze_english_input_eng_only when the analysis came back empty
+FALLBACK_REPLIES = frozenset({"Let's continue.", "Let's continue our conversation!"})
+
+def _is_cacheable_reply(analysis_result: dict, conversation_text: str) -> bool:
+    """
+    Only real tutor replies go into the L2 cache, which is shared by all learners
+    and matched by similarity: a failed analysis returns a fallback that may quote
+    the learner's own words.
+    """
+    return not analysis_result.get("error_occurred") and conversation_text not in FALLBACK_REPLIES
+
+def _threadsafe_delta_writer(delta_queue: asyncio.Queue) -> Callable[[str], None]:
+    """Callback for the analysis thread that hands conversation_text deltas to the event loop."""
+    loop = asyncio.get_event_loop()
+    return lambda text: loop.call_soon_threadsafe(delta_queue.put_nowait, text)
 
 # Lightweight context snapshot loader
 async def _load_conversation_context(conversation_state: dict) -> Dict[str, Any]:
@@ -134,46 +194,52 @@ async def get_cached_or_generate_tts(text: str, use_slow_tts: bool = False) -> b
     cache_key = f"{text}_{'slow' if use_slow_tts else 'normal'}"
     
     if cache_key in tts_cache:
+        CACHE_HITS.inc(cache="english_only_tts", level="memory")
         print(f"🎵 [TTS] Using cached audio for: '{text[:50]}...'")
         return tts_cache[cache_key]['audio']
     
+    CACHE_MISSES.inc(cache="english_only_tts")
     try:
-        print(f"🎵 [TTS] Generating new audio for: '{text[:50]}...'")
-        if use_slow_tts:
-            audio = await synthesize_speech_bytes_slow(text)
-        else:
-            audio = await synthesize_speech_bytes(text)
-        
-        # Cache with metadata
-        tts_cache[cache_key] = {
-            'audio': audio,
-            'text': text,
-            'tts_type': 'slow' if use_slow_tts else 'normal',
-            'cache_time': asyncio.get_event_loop().time(),
-            'size_bytes': len(audio)
-        }
-        
-        # Limit cache size to prevent memory issues
-        if len(tts_cache) > 100:
-            # Remove oldest entries
-            oldest_keys = sorted(tts_cache.keys(), 
-                               key=lambda k: tts_cache[k]['cache_time'])[:20]
-            for key in oldest_keys:
-                del tts_cache[key]
-            print(f"🧹 [TTS] Cache cleaned, removed 20 oldest entries")
-        
-        return audio
-        
+        return await tts_flight.do(cache_key, lambda: _generate_and_cache_tts(cache_key, text, use_slow_tts))
     except Exception as e:
         print(f"❌ [TTS] Error generating audio: {e}")
         # Return empty audio as fallback
         return b''
 
+async def _generate_and_cache_tts(cache_key: str, text: str, use_slow_tts: bool) -> bytes:
+    print(f"🎵 [TTS] Generating new audio for: '{text[:50]}...'")
+    with TTS_SECONDS.time(route="english_only", vendor="elevenlabs"), \
+            tracer.span("tts", vendor="elevenlabs", characters=len(text)):
+        if use_slow_tts:
+            audio = await synthesize_speech_bytes_slow(text)
+        else:
+            audio = await synthesize_speech_bytes(text)
+    
+    # Cache with metadata
+    tts_cache[cache_key] = {
+        'audio': audio,
+        'text': text,
+        'tts_type': 'slow' if use_slow_tts else 'normal',
+        'cache_time': asyncio.get_event_loop().time(),
+        'size_bytes': len(audio)
+    }
+    
+    # Limit cache size to prevent memory issues
+    if len(tts_cache) > 100:
+        # Remove oldest entries
+        oldest_keys = sorted(tts_cache.keys(), 
+                           key=lambda k: tts_cache[k]['cache_time'])[:20]
+        for key in oldest_keys:
+            del tts_cache[key]
+        print(f"🧹 [TTS] Cache cleaned, removed 20 oldest entries")
+    
+    return audio
+
 @router.websocket("/ws/english-only")
 async def english_only_conversation(websocket: WebSocket):
     """Enhanced WebSocket handler with multi-stage conversation management"""
     await websocket.accept()
-    profiler = Profiler()
+    profiler = Profiler("english_only")
     
     # Enhanced state management
     conversation_state = {
@@ -185,9 +251,12 @@ async def english_only_conversation(websocket: WebSocket):
         "last_stage_change": asyncio.get_event_loop().time(),
         "learning_path": None,
         "skill_level": "unknown",
-        "preferred_language": "english"
+        "preferred_language": "english",
+        "recent_messages": [],
+        "stage_history": [],
     }
     
+    await _resume_session(websocket, conversation_state)
     print(f"🚀 [WEBSOCKET] New English-Only session started for user: {conversation_state['user_name']}")
 
     try:
@@ -211,13 +280,18 @@ async def english_only_conversation(websocket: WebSocket):
                     if "pending_binary_size" in conversation_state:
                         del conversation_state["pending_binary_size"]
                     
+                    # Each turn runs STT, GPT and TTS: check the per-client limit before any of them
+                    if not await websocket_rate_limiter.allow_turn(websocket, partial(safe_send_json, websocket)):
+                        continue
+
                     # Create a message dict for binary audio
                     message = {
                         "type": "audio_binary",
                         "audio_bytes": audio_bytes,
                         "user_name": user_name
                     }
-                    await _handle_binary_audio_processing(websocket, message, conversation_state, profiler)
+                    await _run_admitted_turn(websocket, conversation_state,
+                                             _handle_binary_audio_processing(websocket, message, conversation_state, profiler))
                     continue
                 elif "text" in message_data:
                     data = message_data["text"]
@@ -255,6 +329,11 @@ async def english_only_conversation(websocket: WebSocket):
                     "error_type": "json_decode"
                 })
                 continue
+
+            # Metadata and acks are free; everything else triggers vendor calls
+            if message_type not in ("audio_binary_metadata", "processing_started"):
+                if not await websocket_rate_limiter.allow_turn(websocket, partial(safe_send_json, websocket)):
+                    continue
             
             # Handle different message types with enhanced logic
             if message_type == "greeting":
@@ -285,7 +364,8 @@ async def english_only_conversation(websocket: WebSocket):
                 continue
 
             # Main audio processing block (Base64 fallback)
-            await _handle_audio_processing(websocket, message, conversation_state, profiler)
+            await _run_admitted_turn(websocket, conversation_state,
+                                     _handle_audio_processing(websocket, message, conversation_state, profiler))
             
     except WebSocketDisconnect:
         print(f"🔌 [WEBSOCKET] Client disconnected: {conversation_state['user_name']}")
@@ -310,11 +390,68 @@ async def english_only_conversation(websocket: WebSocket):
         print(f"📊 Session stats: {conversation_state['interaction_count']} interactions, "
               f"duration: {asyncio.get_event_loop().time() - conversation_state['session_start']:.1f}s")
 
+async def _run_admitted_turn(websocket: WebSocket, conversation_state: dict, turn):
+    """Run one STT/GPT/TTS turn under admission control; ongoing conversations are admitted first."""
+    ongoing = conversation_state["interaction_count"] > 1 or conversation_state.get("resumed", False)
+    ticket = await admit_websocket_turn(websocket, CONVERSATION_VENDORS, ongoing, partial(safe_send_json, websocket))
+    if ticket is None:
+        turn.close()  # never started
+        return
+    try:
+        stage = conversation_state.get("stage", "unknown")
+        with IN_FLIGHT.track_inprogress(route="english_only"), \
+                WS_TURN_SECONDS.time(route="english_only", stage=stage), \
+                tracer.span("ws.turn", route="english_only", stage=stage,
+                            interaction=conversation_state["interaction_count"]):
+            await turn
+    finally:
+        ticket.release()
+
+async def _resume_session(websocket: WebSocket, conversation_state: dict):
+    """
+    Opt-in resumable sessions: connect with ?resumable=true to get a token, or with
+    ?session_token=<token> to restore the snapshot saved by any worker.
+    Unknown or expired tokens start a fresh session with a new token.
+    """
+    token = websocket.query_params.get("session_token")
+    if not token and websocket.query_params.get("resumable", "").lower() != "true":
+        return
+
+    snapshot = await session_store.load(SESSION_NAMESPACE, token) if token else None
+    if snapshot:
+        conversation_state.update({k: v for k, v in snapshot.items() if k in SESSION_FIELDS})
+        print(f"♻️ [SESSION] Resumed session at stage {conversation_state['stage']} "
+              f"after {conversation_state['interaction_count']} interactions")
+    else:
+        token = session_store.new_token()
+    conversation_state["session_token"] = token
+    conversation_state["resumed"] = bool(snapshot)
+
+    await safe_send_json(websocket, {
+        "step": "session",
+        "session_token": token,
+        "resumed": bool(snapshot),
+        "conversation_stage": conversation_state["stage"],
+        "current_topic": conversation_state["topic"],
+        "learning_path": conversation_state["learning_path"],
+        "skill_level": conversation_state["skill_level"],
+    })
+
+def _snapshot_session(conversation_state: dict):
+    """Persist the resumable part of the state in the background (no-op without a token)."""
+    token = conversation_state.get("session_token")
+    if token:
+        session_store.snapshot(SESSION_NAMESPACE, token, conversation_state, SESSION_FIELDS)
+
 async def _handle_greeting_message(websocket: WebSocket, message: dict, 
                                  conversation_state: dict, profiler: Profiler):
     """Handle greeting message with enhanced stage management"""
     print(f"👋 [GREETING] Processing greeting for user: {conversation_state['user_name']}")
     
+    if conversation_state.get("resumed") and conversation_state["stage"] != "greeting":
+        await _handle_resumed_greeting(websocket, message, conversation_state, profiler)
+        return
+    
     # Update conversation state
     conversation_state["stage"] = "intent_detection"
     conversation_state["last_stage_change"] = asyncio.get_event_loop().time()
@@ -339,6 +476,33 @@ async def _handle_greeting_message(websocket: WebSocket, message: dict,
     })
     
     await safe_send_bytes(websocket, greeting_audio)
+    _snapshot_session(conversation_state)
+
+async def _handle_resumed_greeting(websocket: WebSocket, message: dict,
+                                   conversation_state: dict, profiler: Profiler):
+    """Reconnected mid-session: a short welcome back instead of restarting from the greeting"""
+    conversation_state["resumed"] = False
+    conversation_state["last_stage_change"] = asyncio.get_event_loop().time()
+    user_name = message.get("user_name", conversation_state["user_name"])
+    if conversation_state["topic"]:
+        resume_text = f"Welcome back, {user_name}! Let's continue with {conversation_state['topic']}."
+    else:
+        resume_text = f"Welcome back, {user_name}! Let's continue where we left off."
+
+    resume_audio = await get_cached_or_generate_tts(resume_text)
+    profiler.mark("♻️ Resume greeting generated")
+
+    await safe_send_json(websocket, {
+        "response": resume_text,
+        "step": "session_resumed",
+        "user_name": user_name,
+        "conversation_stage": conversation_state["stage"],
+        "current_topic": conversation_state["topic"],
+        "learning_path": conversation_state["learning_path"],
+        "skill_level": conversation_state["skill_level"],
+        "session_id": id(websocket)
+    })
+    await safe_send_bytes(websocket, resume_audio)
 
 async def _handle_prolonged_pause_message(websocket: WebSocket, message: dict, 
                                         conversation_state: dict, profiler: Profiler):
@@ -425,9 +589,10 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
 
     try:
         # Step 1: Decode audio (required first step)
-        audio_bytes = await asyncio.get_event_loop().run_in_executor(
-            thread_pool, base64.b64decode, audio_base64
-        )
+        with tracer.span("audio.decode", encoded_bytes=len(audio_base64)):
+            audio_bytes = await asyncio.get_event_loop().run_in_executor(
+                thread_pool, base64.b64decode, audio_base64
+            )
         profiler.mark("🎙️ Audio decoded")
 
         # Step 2: Run STT and context snapshot in parallel
@@ -446,6 +611,8 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
             return
         
         print(f"🔍 [ENGLISH_ONLY] Processing: '{transcribed_text}' at stage: {conversation_state['stage']}")
+        # Cached replies are keyed by the state the learner spoke in, not the one the turn leads to
+        lookup_stage, lookup_topic = conversation_state["stage"], conversation_state["topic"]
 
         # Step 3: Start ALL operations in parallel (cache lookup + analysis + warmup)
         # This ensures maximum parallelism and no blocking
@@ -455,17 +622,19 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
         # Start cache lookup, analysis, and warmup ALL in parallel
         cache_task = asyncio.create_task(
             multi_level_cache.get_cached_response_fast(
-                stage=conversation_state["stage"],
+                stage=lookup_stage,
                 user_input=transcribed_text,
-                topic=conversation_state["topic"],
+                topic=lookup_topic,
             )
         )
         
+        delta_queue: asyncio.Queue = asyncio.Queue()
         analysis_task = asyncio.create_task(
             async_analyze_english_input(
                 user_text=transcribed_text,
                 stage=conversation_state["stage"],
-                topic=conversation_state["topic"]
+                topic=conversation_state["topic"],
+                on_text_delta=_threadsafe_delta_writer(delta_queue) if ENGLISH_ONLY_STREAM_REPLIES else None
             )
         )
         
@@ -479,11 +648,9 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
             print(f"⚡ [MULTI_CACHE] {cached_response.source.upper()} cache HIT! Instant response ready")
             profiler.mark(f"🎯 {cached_response.source.upper()} cache hit")
             
-            # Cancel analysis and warmup tasks (we don't need them)
-            analysis_task.cancel()
-            warmup_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await asyncio.gather(analysis_task, warmup_task, return_exceptions=True)
+            # Cancel analysis and warmup tasks (we don't need them) and replay the cached turn's state change
+            await _take_cache_hit(conversation_state, cached_response, transcribed_text,
+                                  analysis_task, warmup_task)
             
             # Send response immediately with pre-generated audio
             await safe_send_json(websocket, {
@@ -494,7 +661,7 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
                 "original_text": transcribed_text,
                 "user_name": user_name,
                 "conversation_stage": conversation_state["stage"],
-                "current_topic": cached_response.topic,
+                "current_topic": conversation_state["topic"],
                 "cache_level": cached_response.source,
                 "cache_confidence": cached_response.confidence,
             })
@@ -508,7 +675,7 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
                 "original_text": transcribed_text,
                 "user_name": user_name,
                 "conversation_stage": conversation_state["stage"],
-                "current_topic": cached_response.topic,
+                "current_topic": conversation_state["topic"],
                 "cache_level": cached_response.source,
                 "cache_confidence": cached_response.confidence,
             })
@@ -546,6 +713,14 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
                 "needs_correction": False,
                 "correction_type": "none",
             }
+        elif ENGLISH_ONLY_STREAM_REPLIES:
+            # Cache miss - speak the reply sentence by sentence as it streams in
+            await _stream_analysis_reply(
+                websocket, analysis_task, delta_queue, warmup_task,
+                conversation_state, transcribed_text, user_name, profiler
+            )
+            profiler.summary()
+            return
         else:
             # Cache miss - wait for analysis (already started in parallel)
             analysis_result = await analysis_task
@@ -555,7 +730,8 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
             await _update_conversation_state(conversation_state, analysis_result, transcribed_text)
             conversation_text = analysis_result.get("conversation_text", "Let's continue.")
             
-            # Generate TTS in parallel with cache storage
+            cacheable = _is_cacheable_reply(analysis_result, conversation_text)
+            
             # Generate TTS in parallel with cache storage (with performance monitoring)
             tts_task = performance_monitor.time_step(
                 "tts",
@@ -565,29 +741,33 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
             )
             
             # Cache the response asynchronously (non-blocking)
-            asyncio.create_task(
-                multi_level_cache.cache_response(
-                    stage=conversation_state["stage"],
-                    user_input=transcribed_text,
-                    response_text=conversation_text,
-                    audio=None,  # Will be set after TTS completes
-                    topic=conversation_state["topic"],
-                    cache_level="l2",
+            if cacheable:
+                asyncio.create_task(
+                    multi_level_cache.cache_response(
+                        stage=lookup_stage,
+                        user_input=transcribed_text,
+                        response_text=conversation_text,
+                        audio=None,  # Will be set after TTS completes
+                        topic=lookup_topic,
+                        cache_level="l2",
+                        next_stage=conversation_state["stage"],
+                        next_topic=conversation_state["topic"],
+                    )
                 )
-            )
             
             response_audio = await tts_task
             profiler.mark("🔊 TTS response generated")
             
             # Update cache with audio (non-blocking)
-            asyncio.create_task(
-                multi_level_cache.update_cached_audio(
-                    stage=conversation_state["stage"],
-                    user_input=transcribed_text,
-                    audio=response_audio,
-                    topic=conversation_state["topic"],
+            if cacheable:
+                asyncio.create_task(
+                    multi_level_cache.update_cached_audio(
+                        stage=lookup_stage,
+                        user_input=transcribed_text,
+                        audio=response_audio,
+                        topic=lookup_topic,
+                    )
                 )
-            )
         
         cache_metadata = {
             "level": cached_response.source if cached_response else "miss",
@@ -649,6 +829,135 @@ async def _handle_audio_processing(websocket: WebSocket, message: dict,
         print(f"❌ [AUDIO] Error processing audio: {e}")
         await _handle_audio_processing_error(websocket, user_name, conversation_state, e)
 
+async def _stream_analysis_reply(websocket: WebSocket, analysis_task: asyncio.Task,
+                                 delta_queue: asyncio.Queue, warmup_task: asyncio.Task,
+                                 conversation_state: dict, transcribed_text: str,
+                                 user_name: str, profiler: Profiler):
+    """
+    Turn streamed conversation_text deltas into per-sentence TTS and send each
+    sentence (JSON, then audio) in order as soon as its audio is ready, so the
+    learner hears the first sentence while the rest is still being generated.
+    """
+    stream_stage = conversation_state["stage"]
+    stream_topic = conversation_state["topic"]
+    send_queue: asyncio.Queue = asyncio.Queue()
+    spoken_sentences: List[str] = []
+    spoken_audio: List[bytes] = []
+
+    # Deltas queued by the worker thread are delivered before the task's completion callback
+    analysis_task.add_done_callback(lambda _: delta_queue.put_nowait(None))
+
+    async def send_in_order():
+        index = 0
+        while True:
+            item = await send_queue.get()
+            if item is None:
+                return
+            sentence, tts_task = item
+            audio = await tts_task
+            if index == 0:
+                profiler.mark("🔊 First sentence audio ready")
+            await safe_send_json(websocket, {
+                "partial": True,
+                "streaming": True,
+                "chunk_index": index,
+                "response": sentence,
+                "conversation_text": sentence,
+                "step": stream_stage,
+                "original_text": transcribed_text,
+                "user_name": user_name,
+                "conversation_stage": stream_stage,
+            })
+            if audio:
+                await safe_send_bytes(websocket, audio)
+                spoken_audio.append(audio)
+            index += 1
+
+    def speak(sentence: str):
+        # TTS for each sentence starts immediately; sending stays in sentence order
+        tts_task = asyncio.create_task(get_cached_or_generate_tts(sentence, use_slow_tts=True))
+        send_queue.put_nowait((sentence, tts_task))
+        spoken_sentences.append(sentence)
+
+    sender_task = asyncio.create_task(send_in_order())
+    sentence_count = 0
+    buffer = ""
+    while True:
+        delta = await delta_queue.get()
+        if delta is None:
+            break
+        buffer += delta
+        sentences, buffer = split_completed_sentences(buffer)
+        for sentence in sentences:
+            speak(sentence)
+            sentence_count += 1
+
+    analysis_result = await analysis_task
+    profiler.mark("🧠 AI analysis completed")
+    await asyncio.gather(warmup_task, return_exceptions=True)
+
+    if buffer.strip():
+        speak(buffer.strip())
+        sentence_count += 1
+    if sentence_count == 0:
+        # Nothing was streamed (e.g. an error fallback) - speak the full reply in one piece
+        speak(analysis_result.get("conversation_text", "Let's continue."))
+    send_queue.put_nowait(None)
+    await sender_task
+    profiler.mark("🔊 Streamed TTS response sent")
+
+    # If the streamed JSON failed to parse after sentences were spoken, the analysis
+    # returns a fallback the learner never heard; report what was actually said
+    conversation_text = analysis_result.get("conversation_text", "Let's continue.")
+    spoken_text = " ".join(spoken_sentences)
+    heard_as_sent = " ".join(conversation_text.split()) == " ".join(spoken_text.split())
+    if not heard_as_sent:
+        conversation_text = spoken_text
+        analysis_result = {**analysis_result, "conversation_text": spoken_text}
+    await _update_conversation_state(conversation_state, analysis_result, transcribed_text)
+
+    # Cache the full reply with the joined sentence audio (MP3 frames concatenate cleanly),
+    # only when that audio is exactly the reply text
+    if (heard_as_sent and len(spoken_audio) == len(spoken_sentences)
+            and _is_cacheable_reply(analysis_result, conversation_text)):
+        asyncio.create_task(
+            multi_level_cache.cache_response(
+                stage=stream_stage,
+                user_input=transcribed_text,
+                response_text=conversation_text,
+                audio=b"".join(spoken_audio) or None,
+                topic=stream_topic,
+                cache_level="l2",
+                next_stage=conversation_state["stage"],
+                next_topic=conversation_state["topic"],
+            )
+        )
+
+    await safe_send_json(websocket, {
+        "partial": False,
+        "final": True,
+        "streamed": True,
+        "audio_chunks": len(spoken_audio),
+        "response": conversation_text,
+        "conversation_text": conversation_text,
+        "step": conversation_state["stage"],
+        "original_text": transcribed_text,
+        "user_name": user_name,
+        "conversation_stage": conversation_state["stage"],
+        "current_topic": conversation_state["topic"],
+        "learning_path": conversation_state["learning_path"],
+        "skill_level": conversation_state["skill_level"],
+        "analysis": {
+            "next_stage": analysis_result.get("next_stage"),
+            "current_topic": conversation_state["topic"],
+            "needs_correction": analysis_result.get("needs_correction", False),
+            "correction_type": analysis_result.get("correction_type", "none"),
+            "learning_activity": analysis_result.get("learning_activity"),
+            "session_progress": analysis_result.get("session_progress")
+        },
+        "cache": {"level": "miss", "confidence": 0.0, "hit": False}
+    })
+
 async def _handle_empty_transcription(websocket: WebSocket, user_name: str, 
                                     conversation_state: dict, profiler: Profiler):
     """Handle empty transcription with context-aware response"""
@@ -662,6 +971,50 @@ async def _handle_empty_transcription(websocket: WebSocket, user_name: str,
     })
     await safe_send_bytes(websocket, no_speech_audio)
 
+async def _take_cache_hit(conversation_state: dict, cached_response: CachedResponse,
+                          transcribed_text: str, analysis_task: asyncio.Task,
+                          warmup_task: asyncio.Task) -> dict:
+    """
+    Serve a cached reply in place of the running analysis and replay the stage
+    and topic change of the turn that produced it. A sampled share of
+    similarity hits lets the analysis finish in the background to check them.
+    """
+    warmup_task.cancel()
+    pending = [warmup_task]
+    if multi_level_cache.should_verify(cached_response):
+        asyncio.create_task(_verify_cache_hit(
+            analysis_task, cached_response, conversation_state["stage"], conversation_state["topic"]
+        ))
+    else:
+        analysis_task.cancel()
+        pending.append(analysis_task)
+    with contextlib.suppress(asyncio.CancelledError):
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    analysis_result = {
+        "conversation_text": cached_response.text,
+        "next_stage": cached_response.next_stage or conversation_state["stage"],
+        "extracted_topic": cached_response.next_topic,
+        "needs_correction": False,
+        "correction_type": "none",
+    }
+    await _update_conversation_state(conversation_state, analysis_result, transcribed_text)
+    return analysis_result
+
+async def _verify_cache_hit(analysis_task: asyncio.Task, cached_response: CachedResponse,
+                            stage: str, topic: Optional[str]):
+    """Compare a similarity hit with where GPT takes the same utterance"""
+    try:
+        analysis_result = await analysis_task
+    except Exception as e:
+        print(f"⚠️ [MULTI_CACHE] Verification analysis failed: {e}")
+        return
+    await multi_level_cache.record_verification(
+        cached_response,
+        next_stage=analysis_result.get("next_stage") or stage,
+        next_topic=analysis_result.get("extracted_topic") or topic,
+    )
+
 async def _update_conversation_state(conversation_state: dict, analysis_result: dict, 
                                    original_text: str):
     """Update conversation state based on AI analysis"""
@@ -690,9 +1043,20 @@ async def _update_conversation_state(conversation_state: dict, analysis_result:
         conversation_state["skill_level"] = skill_assessment
         print(f"📊 [STATE] Skill level assessed: {skill_assessment}")
     
+    # Bounded history for context and for resuming after a reconnect
+    recent_messages = conversation_state.setdefault("recent_messages", [])
+    recent_messages.append({"role": "user", "content": original_text})
+    recent_messages.append({"role": "assistant", "content": analysis_result.get("conversation_text", "")})
+    del recent_messages[:-MAX_RECENT_MESSAGES]
+    stage_history = conversation_state.setdefault("stage_history", [])
+    if not stage_history or stage_history[-1] != conversation_state["stage"]:
+        stage_history.append(conversation_state["stage"])
+        del stage_history[:-MAX_STAGE_HISTORY]
+    
     # Log state update
     print(f"📝 [STATE] Updated state: stage={conversation_state['stage']}, "
           f"topic={conversation_state['topic']}, path={conversation_state['learning_path']}")
+    _snapshot_session(conversation_state)
 
 async def _handle_binary_audio_processing(websocket: WebSocket, message: dict,
                                          conversation_state: dict, profiler: Profiler):
@@ -726,6 +1090,7 @@ async def _handle_binary_audio_processing(websocket: WebSocket, message: dict,
             return
         
         print(f"🔍 [ENGLISH_ONLY] Processing binary audio: '{transcribed_text}' at stage: {conversation_state['stage']}")
+        lookup_stage, lookup_topic = conversation_state["stage"], conversation_state["topic"]
 
         # Start ALL operations in parallel (cache lookup + analysis + warmup)
         word_count = len(transcribed_text.split())
@@ -734,17 +1099,19 @@ async def _handle_binary_audio_processing(websocket: WebSocket, message: dict,
         # Start cache lookup, analysis, and warmup ALL in parallel
         cache_task = asyncio.create_task(
             multi_level_cache.get_cached_response_fast(
-                stage=conversation_state["stage"],
+                stage=lookup_stage,
                 user_input=transcribed_text,
-                topic=conversation_state["topic"],
+                topic=lookup_topic,
             )
         )
         
+        delta_queue: asyncio.Queue = asyncio.Queue()
         analysis_task = asyncio.create_task(
             async_analyze_english_input(
                 user_text=transcribed_text,
                 stage=conversation_state["stage"],
-                topic=conversation_state["topic"]
+                topic=conversation_state["topic"],
+                on_text_delta=_threadsafe_delta_writer(delta_queue) if ENGLISH_ONLY_STREAM_REPLIES else None
             )
         )
         
@@ -764,24 +1131,22 @@ async def _handle_binary_audio_processing(websocket: WebSocket, message: dict,
 
         # Handle cache hits (L1/L2 only)
         if cached_response and cached_response.source in ["l1", "l2"]:
-            # Cancel analysis task since we have cached response
-            analysis_task.cancel()
-            warmup_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await asyncio.gather(analysis_task, warmup_task, return_exceptions=True)
+            # Cancel analysis task since we have cached response, and replay its state change
+            analysis_result = await _take_cache_hit(conversation_state, cached_response, transcribed_text,
+                                                    analysis_task, warmup_task)
             
             # Use cached response immediately
             conversation_text = cached_response.text
             response_audio = cached_response.audio
             profiler.mark(f"🎯 {cached_response.source.upper()} cache hit - instant response")
-            
-            # Create minimal analysis result for state update
-            analysis_result = {
-                "conversation_text": conversation_text,
-                "next_stage": conversation_state["stage"],
-                "needs_correction": False,
-                "correction_type": "none",
-            }
+        elif ENGLISH_ONLY_STREAM_REPLIES:
+            # Cache miss - speak the reply sentence by sentence as it streams in
+            await _stream_analysis_reply(
+                websocket, analysis_task, delta_queue, warmup_task,
+                conversation_state, transcribed_text, user_name, profiler
+            )
+            profiler.summary()
+            return
         else:
             # Cache miss - wait for analysis (already started in parallel)
             analysis_result = await analysis_task
@@ -799,16 +1164,19 @@ async def _handle_binary_audio_processing(websocket: WebSocket, message: dict,
             profiler.mark("🔊 TTS response generated")
             
             # Cache the response asynchronously (non-blocking)
-            asyncio.create_task(
-                multi_level_cache.cache_response(
-                    stage=conversation_state["stage"],
-                    user_input=transcribed_text,
-                    response_text=conversation_text,
-                    audio=response_audio,
-                    topic=conversation_state["topic"],
-                    cache_level="l2",
+            if _is_cacheable_reply(analysis_result, conversation_text):
+                asyncio.create_task(
+                    multi_level_cache.cache_response(
+                        stage=lookup_stage,
+                        user_input=transcribed_text,
+                        response_text=conversation_text,
+                        audio=response_audio,
+                        topic=lookup_topic,
+                        cache_level="l2",
+                        next_stage=conversation_state["stage"],
+                        next_topic=conversation_state["topic"],
+                    )
                 )
-            )
         
         cache_metadata = {
             "level": cached_response.source if cached_response else "miss",
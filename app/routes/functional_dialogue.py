@@ -3,6 +3,7 @@ from fastapi.responses import StreamingResponse
 from io import BytesIO
 from app.services.dialogue_manager import get_prompt_by_id, get_next_prompt_id
 from app.services.tts import synthesize_speech_with_elevenlabs_exercises
+from app.services.tts_facade import TTSUnavailableError
 from app.services.stt_english import transcribe_english_audio
 from app.services.dialogue_evaluator import evaluate_dialogue_with_gpt
 
@@ -21,7 +22,10 @@ async def get_dialogue_prompt_audio(dialogue_id: int):
     if not prompt_data:
         raise HTTPException(status_code=404, detail="Dialogue prompt not found")
 
-    return synthesize_speech_with_elevenlabs_exercises(prompt_data['ai_prompt']) 
+    try:
+        return await synthesize_speech_with_elevenlabs_exercises(prompt_data['ai_prompt'])
+    except TTSUnavailableError:
+        raise HTTPException(status_code=503, detail="Text-to-speech is temporarily unavailable")
 
 @router.post(
     "/dialogue/{dialogue_id}/evaluate",
@@ -1,20 +1,9 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from app.services.gpt_parser import extract_quiz_from_text_using_gpt
-from app.schemas.pdf_quiz import PDFUrlRequest, QuizResponse
-import fitz  # PyMuPDF
-import requests
-import tempfile
-import os
+from app.services.pdf_quiz_pipeline import pdf_quiz_pipeline, PDFQuizError
+from app.schemas.pdf_quiz import PDFUrlRequest, QuizResponse, QuizJobResponse, QuizJobStatusResponse
 
 router = APIRouter()
 
-def extract_text_by_page(file_path: str) -> str:
-    doc = fitz.open(file_path)
-    full_text = ""
-    for page in doc:
-        full_text += page.get_text() + "\n"
-    return full_text.strip()
-
 
 @router.post(
     "/ai-based-quiz-from-pdf-upload",
@@ -24,18 +13,12 @@ def extract_text_by_page(file_path: str) -> str:
     tags=["AI Based Quiz Parser"]
 )
 async def upload_pdf_for_gpt_quiz(file: UploadFile = File(...)):
-    temp_file_path = f"temp_{file.filename}"
-    with open(temp_file_path, "wb") as f:
-        f.write(await file.read())
-
-    text = extract_text_by_page(temp_file_path)
-
-    # Print the extracted text
-    print("Extracted PDF Text:\n", text)
-
-    result = extract_quiz_from_text_using_gpt(text)
+    pdf_bytes = await file.read()
+    try:
+        return await pdf_quiz_pipeline.extract_quiz(pdf_bytes)
+    except PDFQuizError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return result
 
 @router.post(
     "/ai-based-quiz-from-url",
@@ -46,24 +29,46 @@ async def upload_pdf_for_gpt_quiz(file: UploadFile = File(...)):
 )
 async def upload_pdf_from_url_for_gpt_quiz(request: PDFUrlRequest):
     try:
-        response = requests.get(request.url, stream=True)
-        if response.status_code != 200:
-            raise HTTPException(status_code=400, detail="Failed to download the PDF file from the URL.")
+        return await pdf_quiz_pipeline.extract_quiz_from_url(request.url)
+    except PDFQuizError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            for chunk in response.iter_content(chunk_size=8192):
-                tmp.write(chunk)
-            tmp_path = tmp.name
 
-        text = extract_text_by_page(tmp_path)
-        print("Extracted PDF Text from URL:\n", text)
+@router.post(
+    "/ai-based-quiz-jobs/upload",
+    response_model=QuizJobResponse,
+    summary="Start a background quiz extraction from an uploaded PDF",
+    description="Accepts a PDF file and starts quiz extraction in the background. Poll /ai-based-quiz-jobs/{job_id} for progress and the result; use this for large PDFs that would outlive a request timeout.",
+    tags=["AI Based Quiz Parser"]
+)
+async def submit_pdf_upload_quiz_job(file: UploadFile = File(...)):
+    job_id = await pdf_quiz_pipeline.submit_job(pdf_bytes=await file.read())
+    return QuizJobResponse(job_id=job_id, status="queued")
+
 
-        result = extract_quiz_from_text_using_gpt(text)
-        return result
+@router.post(
+    "/ai-based-quiz-jobs/from-url",
+    response_model=QuizJobResponse,
+    summary="Start a background quiz extraction from a PDF URL",
+    description="Accepts a PDF link, then downloads it and extracts the quiz in the background. Poll /ai-based-quiz-jobs/{job_id} for progress and the result.",
+    tags=["AI Based Quiz Parser"]
+)
+async def submit_pdf_url_quiz_job(request: PDFUrlRequest):
+    job_id = await pdf_quiz_pipeline.submit_job(url=request.url)
+    return QuizJobResponse(job_id=job_id, status="queued")
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
-    finally:
-        if 'tmp_path' in locals() and os.path.exists(tmp_path):
-            os.remove(tmp_path)
+@router.get(
+    "/ai-based-quiz-jobs/{job_id}",
+    response_model=QuizJobStatusResponse,
+    summary="Get the status of a quiz extraction job",
+    description="Returns the job status, chunk progress and, once completed, the extracted quiz.",
+    tags=["AI Based Quiz Parser"]
+)
+async def get_quiz_job_status(job_id: str):
+    job = await pdf_quiz_pipeline.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Quiz job not found")
+    return job
@@ -22,9 +22,11 @@ import traceback
 from uuid import UUID, uuid4
 import httpx
 from app.config import SUPABASE_URL, SUPABASE_SERVICE_KEY
+from app.middleware.rate_limiter import websocket_rate_limiter
 import jwt
 from functools import wraps
 from supabase import create_client, Client
+from app.supabase_client import instrument_database_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +35,7 @@ logger = logging.getLogger(__name__)
 # Create Supabase client for messaging
 try:
     supabase_client: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    instrument_database_client(supabase_client)
 except Exception as e:
     logger.error(f"Failed to initialize Supabase client: {str(e)}")
     raise
@@ -1581,6 +1584,20 @@ async def websocket_endpoint(websocket: WebSocket, token: str):
 async def handle_websocket_message(websocket: WebSocket, user_id: str, data: dict):
     """Handle incoming WebSocket messages"""
     message_type = data.get('type')
+
+    if message_type != 'ping':
+        if message_type in ('typing_start', 'typing_stop'):
+            is_limited, rate_limit_info = await websocket_rate_limiter.check_typing_limit(user_id)
+        else:
+            is_limited, rate_limit_info = await websocket_rate_limiter.check_ws_message_limit(user_id)
+        if is_limited:
+            await websocket.send_json({
+                'type': 'error',
+                'message': 'Rate limit exceeded',
+                'code': 'rate_limited',
+                'rate_limit_info': rate_limit_info
+            })
+            return
     
     try:
         if message_type == 'join_conversation':
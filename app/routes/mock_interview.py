@@ -10,6 +10,7 @@ from app.services.feedback import evaluate_response_ex2_stage4
 from app.supabase_client import supabase, progress_tracker
 from app.services.stt import transcribe_audio_bytes_eng_only
 from app.auth_middleware import get_current_user, require_student, require_admin_or_teacher_or_student
+from app.services.admission import admit_evaluation
 import os
 
 router = APIRouter(tags=["Stage 4 - Exercise 2 (Mock Interview)"])
@@ -281,7 +282,8 @@ This endpoint evaluates the user's recorded audio against the mock interview que
 It performs speech-to-text conversion and provides comprehensive feedback on the response quality.
 Also records progress tracking data in Supabase database.
 """,
-    tags=["Stage 4 - Exercise 2 (Mock Interview)"]
+    tags=["Stage 4 - Exercise 2 (Mock Interview)"],
+    dependencies=[Depends(admit_evaluation)]
 )
 async def evaluate_mock_interview(
     request: AudioEvaluationRequest,
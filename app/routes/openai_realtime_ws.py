@@ -6,9 +6,9 @@ Implements high-speed bidirectional audio streaming for real-time conversation
 import asyncio
 import json
 import base64
+import logging
 import os
 import io
-import re
 import time
 from contextlib import suppress
 from typing import Optional, Dict, Any, Tuple, Awaitable, Callable
@@ -19,17 +19,26 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
 from app.config import (
     OPENAI_API_KEY,
+    OPENAI_BASE_URL,
     ELEVEN_API_KEY,
+    ELEVENLABS_BASE_URL,
     ELEVEN_REALTIME_VOICE_ID,
     ELEVEN_REALTIME_MODEL_ID,
 )
+from app.middleware.rate_limiter import websocket_rate_limiter
+from app.services.admission import REALTIME_VENDORS, admit_websocket_turn
+from app.utils.logging_config import get_logger
+from app.utils.tracing import Span, tracer
+from app.services.language_guard import (
+    contains_non_english_script,
+    is_english_sentence,
+    split_completed_sentences,
+)
 
 router = APIRouter()
+logger = get_logger(__name__)
 
-NON_ENGLISH_SCRIPT_PATTERN = re.compile(
-    r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF\u0900-\u097F]"
-)
-OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+OPENAI_CHAT_COMPLETIONS_URL = f"{OPENAI_BASE_URL}/chat/completions"
 TRANSLATION_MODEL = os.getenv("OPENAI_TRANSLATION_MODEL", "gpt-4o-mini")
 ENGLISH_ENFORCEMENT_SYSTEM_PROMPT = (
     "You convert tutor replies into English-only messages for Pakistani students. "
@@ -39,6 +48,12 @@ ENGLISH_ENFORCEMENT_SYSTEM_PROMPT = (
     "Ask the learner to repeat the sentence in English.\n"
     "Keep tone warm, encouraging, and concise. Never include non-English text."
 )
+SENTENCE_ENFORCEMENT_SYSTEM_PROMPT = (
+    "You rewrite ONE sentence from an English tutor's spoken reply to Pakistani students. "
+    "If any part is in Urdu, Roman Urdu, Hindi or another language, translate it into natural English. "
+    "Keep the meaning, tone and length of the original sentence. "
+    "Output ONLY the rewritten English sentence, with no quotes, notes or non-English text."
+)
 ENGLISH_FALLBACK_MESSAGE = (
     "In English you say this: Let's keep speaking in English only. "
     "Remember to translate your sentence, then repeat it in English for me."
@@ -189,7 +204,8 @@ MODE_GREETINGS = {
 
 # OpenAI Realtime API configuration
 # Using the same model version as the working example
-OPENAI_REALTIME_URI = "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-12-17"
+# https -> wss (http -> ws for local stand-ins)
+OPENAI_REALTIME_URI = f"{OPENAI_BASE_URL.replace('http', 'ws', 1)}/realtime?model=gpt-4o-realtime-preview-2024-12-17"
 OPENAI_HEADERS = {
     "Authorization": f"Bearer {OPENAI_API_KEY}",
     "OpenAI-Beta": "realtime=v1"
@@ -201,10 +217,9 @@ OUTPUT_AUDIO_FORMAT = "pcm16"
 SAMPLE_RATE = 24000  # OpenAI Realtime API uses 24kHz
 
 # ElevenLabs TTS configuration
-ELEVENLABS_WS_BASE = "wss://api.elevenlabs.io/v1"
+ELEVENLABS_WS_BASE = f"{ELEVENLABS_BASE_URL.replace('http', 'ws', 1)}/v1"
 ELEVENLABS_OUTPUT_FORMAT = "pcm_24000"
 ELEVENLABS_CHUNK_SCHEDULE = [50]  # Minimum 50ms for fastest response
-ELEVENLABS_MIN_PARTIAL_CHARS = 60
 ELEVENLABS_DEFAULT_VOICE_SETTINGS = {
     "stability": 0.7,
     "similarity_boost": 0.8,
@@ -219,10 +234,10 @@ async def convert_audio_to_pcm16(audio_bytes: bytes) -> bytes:
     Convert audio bytes to 24kHz mono 16-bit PCM format required by OpenAI Realtime API.
     """
     try:
-        print(f"🔄 Loading audio from {len(audio_bytes)} bytes...")
+        logger.debug(f"Loading audio from {len(audio_bytes)} bytes...")
         audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
         
-        print(f"📊 Original audio: {audio.frame_rate}Hz, {audio.channels} channels, {audio.sample_width * 8}-bit, {len(audio.raw_data)} bytes")
+        logger.debug(f"Original audio: {audio.frame_rate}Hz, {audio.channels} channels, {audio.sample_width * 8}-bit, {len(audio.raw_data)} bytes")
         
         # Convert to 24kHz (OpenAI Realtime API requirement)
         audio = audio.set_frame_rate(SAMPLE_RATE)
@@ -243,17 +258,15 @@ async def convert_audio_to_pcm16(audio_bytes: bytes) -> bytes:
         duration_seconds = len(pcm16_data) / (SAMPLE_RATE * 2)  # 2 bytes per sample
         duration_ms = duration_seconds * 1000
         
-        print(f"✅ Converted to PCM16: {SAMPLE_RATE}Hz, mono, 16-bit, {len(pcm16_data)} bytes ({duration_ms:.1f}ms)")
+        logger.debug(f"Converted to PCM16: {SAMPLE_RATE}Hz, mono, 16-bit, {len(pcm16_data)} bytes ({duration_ms:.1f}ms)")
         
         # Validate minimum duration
         if duration_ms < 100:
-            print(f"⚠️ Warning: Audio duration ({duration_ms:.1f}ms) is less than 100ms minimum")
+            logger.warning(f"Audio duration ({duration_ms:.1f}ms) is less than 100ms minimum")
         
         return pcm16_data
     except Exception as e:
-        print(f"❌ Error converting audio to PCM16: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error converting audio to PCM16: {e}")
         raise
 
 
@@ -274,7 +287,7 @@ async def convert_pcm16_to_wav(pcm_data: bytes) -> bytes:
         
         return wav_buffer.getvalue()
     except Exception as e:
-        print(f"❌ Error converting PCM16 to WAV: {e}")
+        logger.error(f"Error converting PCM16 to WAV: {e}")
         raise
 
 
@@ -295,11 +308,15 @@ class OpenAIRealtimeBridge:
         self.response_audio_chunks: list = []
         self.response_text: str = ""
         self.raw_response_text: str = ""
-        self.non_english_detected: bool = False
-        self.non_english_buffer: str = ""
         self.response_done = True  # Start as True so first commit can proceed
         self.partial_text_buffer: str = ""
-        self.min_partial_segment_chars = ELEVENLABS_MIN_PARTIAL_CHARS
+        # Sentence-level English guard: each completed sentence is queued (in order) as an
+        # awaitable resolving to the text to speak. Clean sentences resolve immediately,
+        # offending ones resolve when their concurrent rewrite finishes.
+        self.segment_queue: Optional[asyncio.Queue] = None
+        self.segment_worker_task: Optional[asyncio.Task] = None
+        self.rewrite_tasks: set[asyncio.Task] = set()
+        self.rewritten_sentence_count: int = 0
         self.ws_send_lock = asyncio.Lock()
         # Track audio buffer to ensure we have enough before committing
         self.audio_buffer_size_bytes: int = 0
@@ -324,6 +341,27 @@ class OpenAIRealtimeBridge:
         self.append_errors: list = []
         # ElevenLabs streaming session
         self.tts_stream: Optional["ElevenLabsStreamSession"] = None
+        # Trace of the turn in progress: commit -> first text -> first audio byte -> response_done
+        self.turn_span: Optional[Span] = None
+        self._turn_events: set[str] = set()
+
+    def _start_turn_span(self, audio_bytes: int):
+        self._end_turn_span()  # a previous turn that never finished
+        self.turn_span = tracer.start_span("ws.turn", route="realtime", mode=self.mode, audio_bytes=audio_bytes)
+        self._turn_events = set()
+
+    def _turn_event(self, name: str):
+        """Record the first occurrence of name in the current turn (first text delta, first audio byte)."""
+        if self.turn_span is not None and name not in self._turn_events:
+            self._turn_events.add(name)
+            self.turn_span.add_event(name)
+
+    def _end_turn_span(self, error: Optional[BaseException] = None):
+        if self.turn_span is not None:
+            if error is not None:
+                self.turn_span.record_exception(error)
+            self.turn_span.end()
+            self.turn_span = None
         
     async def connect_to_openai(self):
         """Establish connection to OpenAI Realtime API"""
@@ -338,7 +376,7 @@ class OpenAIRealtimeBridge:
             # We'll manually commit when ready
             # Get mode-specific system prompt
             system_prompt = MODE_PROMPTS.get(self.mode, SYSTEM_PROMPT)
-            print(f"📝 Using system prompt for mode: {self.mode}")
+            logger.debug(f"Using system prompt for mode: {self.mode}")
             
             session_config = {
                 "type": "session.update",
@@ -352,12 +390,12 @@ class OpenAIRealtimeBridge:
                 }
             }
             
-            print(f"📤 Sending session configuration (TEXT-ONLY output, VAD disabled for manual commit)...")
+            logger.debug("Sending session configuration (TEXT-ONLY output, VAD disabled for manual commit)...")
             await self.openai_ws.send(json.dumps(session_config))
             
             self.is_connected = True
             self.session_ready = False  # Will be set to True when session.updated is received
-            print("✅ Connected to OpenAI Realtime API, waiting for session confirmation...")
+            logger.debug("Connected to OpenAI Realtime API, waiting for session confirmation...")
             
             # Start listening for OpenAI messages
             asyncio.create_task(self._listen_to_openai())
@@ -366,7 +404,7 @@ class OpenAIRealtimeBridge:
             await asyncio.sleep(0.5)
             
         except Exception as e:
-            print(f"❌ Error connecting to OpenAI Realtime API: {e}")
+            logger.error(f"Error connecting to OpenAI Realtime API: {e}")
             self.is_connected = False
             raise
     
@@ -379,10 +417,10 @@ class OpenAIRealtimeBridge:
                 
                 if message_type == "session.created":
                     self.session_id = data.get("session", {}).get("id")
-                    print(f"✅ OpenAI session created: {self.session_id}")
+                    logger.debug(f"OpenAI session created: {self.session_id}")
                     
                 elif message_type == "session.updated":
-                    print("✅ OpenAI session updated")
+                    logger.debug("OpenAI session updated")
                     self.session_ready = True  # Session is now ready to receive audio
                     
                     # If mode was set before session was ready, update instructions now
@@ -395,30 +433,31 @@ class OpenAIRealtimeBridge:
                                 "instructions": system_prompt,
                             }
                         }
-                        print(f"📝 Applying pending mode update: {mode}")
+                        logger.debug(f"Applying pending mode update: {mode}")
                         await self.openai_ws.send(json.dumps(update_config))
                         delattr(self, '_pending_mode_update')
                     
                 elif message_type == "input_audio_buffer.speech_started":
-                    print("🎤 Speech detected in audio buffer")
+                    logger.debug("Speech detected in audio buffer")
                     
                 elif message_type == "input_audio_buffer.speech_stopped":
-                    print("🔇 Speech stopped in audio buffer")
+                    logger.debug("Speech stopped in audio buffer")
                     
                 elif message_type == "input_audio_buffer.commit":
                     # Confirmation that commit was received
-                    print("✅ Input audio buffer commit confirmed by OpenAI")
+                    logger.debug("Input audio buffer commit confirmed by OpenAI")
                     
                 elif message_type == "response.audio.delta":
                     # OpenAI audio output - IGNORE (we use ElevenLabs instead)
                     # This should not happen if we configured text-only, but handle gracefully
-                    print("⚠️ Received audio delta from OpenAI (unexpected - using ElevenLabs TTS)")
+                    logger.warning("Received audio delta from OpenAI (unexpected - using ElevenLabs TTS)")
                     
                 elif message_type in {
                     "response.output_text.delta",
                     "response.text.delta",
                     "response.audio_transcript.delta",
                 }:
+                    self._turn_event("gpt.first_text")
                     # Normalize delta payloads - OpenAI can send str, dict, or list segments
                     delta_payload = data.get("delta", "")
                     delta_text = ""
@@ -436,28 +475,11 @@ class OpenAIRealtimeBridge:
 
                     if delta_text:
                         self.raw_response_text += delta_text
-                        if self._contains_non_english_script(delta_text):
-                            if not self.non_english_detected:
-                                print("⚠️ Detected non-English script in OpenAI response, enforcing English-only fallback")
-                            self.non_english_detected = True
-                            self.non_english_buffer += delta_text
-                            # Clear any partial English so we can regenerate later
-                            self.response_text = ""
-                            self.partial_text_buffer = ""
-                            continue
-                        
-                        if self.non_english_detected:
-                            self.non_english_buffer += delta_text
-                            continue
-                        
-                        self.response_text += delta_text
                         self.partial_text_buffer += delta_text
                         await self._try_flush_partial_segment()
-                        print(f"📝 Text delta received ({len(delta_text)} chars) | total so far {len(self.response_text)} chars")
-                        await self._send_json({
-                            "type": "transcript_delta",
-                            "text": self.response_text
-                        })
+                        logger.throttled(logging.DEBUG, "realtime.gpt.text_delta", chars=len(delta_text),
+                                         total_chars=len(self.raw_response_text))
+                        await self._send_transcript_delta()
                         
                 elif message_type in {
                     "response.audio_transcript.done",
@@ -477,26 +499,22 @@ class OpenAIRealtimeBridge:
                         raw_final_text = str(text_payload or "")
 
                     self.raw_response_text = raw_final_text
-                    needs_enforcement = self.non_english_detected or self._contains_non_english_script(raw_final_text)
-                    final_text = raw_final_text
-
-                    if needs_enforcement:
-                        print("⚠️ Final response contained non-English text. Regenerating with enforcement...")
-                        translated = await self._rewrite_text_to_english(raw_final_text)
-                        if translated:
-                            final_text = translated
-                            print("✅ English enforcement succeeded for final response")
-                        else:
-                            final_text = ENGLISH_FALLBACK_MESSAGE
-                            print("⚠️ English enforcement failed, using fallback message")
-                        # Reset buffers to the enforced English output
-                        self.non_english_detected = False
-                        self.non_english_buffer = ""
-                        self.partial_text_buffer = final_text
-                    # When no enforcement is needed we leave the partial buffer untouched
+
+                    # Flush the trailing sentence and wait for any in-flight sentence rewrites,
+                    # so the final transcript matches exactly what was spoken
+                    await self._try_flush_partial_segment(force=True)
+                    await self._drain_segment_queue()
+
+                    final_text = self.response_text.strip()
+                    if not final_text and raw_final_text.strip():
+                        logger.warning("English enforcement produced no speakable text, using fallback message")
+                        final_text = ENGLISH_FALLBACK_MESSAGE
+                        await self._send_tts_text(final_text)
+                    elif self.rewritten_sentence_count:
+                        logger.debug(f"English enforcement rewrote {self.rewritten_sentence_count} sentence(s)")
 
                     self.response_text = final_text
-                    print(f"✅ Text response complete ({len(final_text)} chars)")
+                    logger.debug(f"Text response complete ({len(final_text)} chars)")
                     
                     # Send final transcript to client
                     await self._send_json({
@@ -504,19 +522,17 @@ class OpenAIRealtimeBridge:
                         "text": final_text
                     })
                     
-                    # Flush remaining buffered text to ElevenLabs stream (but don't finalize yet)
-                    await self._try_flush_partial_segment(force=True)
-                    
                 elif message_type == "response.done":
                     # Response complete - NOW finalize the ElevenLabs stream
-                    print("✅ OpenAI response done - finalizing ElevenLabs TTS stream")
+                    logger.debug("OpenAI response done - finalizing ElevenLabs TTS stream")
+                    self._turn_event("gpt.done")
                     await self._finalize_tts_stream(force=True)
 
                 elif message_type == "error":
                     error_details = data.get("error", {})
                     error_msg = error_details.get("message", "Unknown error")
                     error_code = error_details.get("code", "unknown")
-                    print(f"❌ OpenAI Error: {error_msg} (Code: {error_code})")
+                    logger.error(f"OpenAI Error: {error_msg} (Code: {error_code})")
                     
                     # Track append errors
                     if "input_audio_buffer" in error_code.lower() or "append" in error_msg.lower():
@@ -525,21 +541,21 @@ class OpenAIRealtimeBridge:
                             "message": error_msg,
                             "timestamp": asyncio.get_event_loop().time()
                         })
-                        print(f"⚠️ Append error tracked: {error_code}")
+                        logger.warning(f"Append error tracked: {error_code}")
                     
                     # Handle specific errors
                     if error_code == "input_audio_buffer_commit_empty":
                         # Buffer was cleared or not properly set - reset our tracking
-                        print("⚠️ OpenAI buffer was empty - resetting our buffer tracking")
-                        print(f"   Recent append errors: {len(self.append_errors)}")
+                        logger.warning("OpenAI buffer was empty - resetting our buffer tracking")
+                        logger.debug(f"Recent append errors: {len(self.append_errors)}")
                         if self.append_errors:
-                            print(f"   Last append error: {self.append_errors[-1]}")
+                            logger.debug(f"Last append error: {self.append_errors[-1]}")
                         self.audio_buffer_size_bytes = 0
                         self.audio_chunks_count = 0
                         self.append_errors.clear()
                     elif error_code == "conversation_already_has_active_response":
                         # Response in progress - mark as such
-                        print("⚠️ Response already in progress - marking response_done as False")
+                        logger.warning("Response already in progress - marking response_done as False")
                         self.response_done = False
                     
                     await self._send_json({
@@ -551,16 +567,14 @@ class OpenAIRealtimeBridge:
                         await self._finalize_tts_stream(force=True)
                 else:
                     # Log any unexpected message types for debugging
-                    print(f"ℹ️ Unhandled OpenAI message type: {message_type} | payload keys: {list(data.keys())}")
+                    logger.debug(f"Unhandled OpenAI message type: {message_type} | payload keys: {list(data.keys())}")
                     
         except websockets.exceptions.ConnectionClosed:
-            print("⚠️ OpenAI WebSocket connection closed")
+            logger.warning("OpenAI WebSocket connection closed")
             self.is_connected = False
             self.session_ready = False
         except Exception as e:
-            print(f"❌ Error listening to OpenAI: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error listening to OpenAI: {e}")
             self.is_connected = False
             self.session_ready = False
             try:
@@ -578,22 +592,20 @@ class OpenAIRealtimeBridge:
         
         # Wait for session to be ready (max 5 seconds)
         if not self.session_ready:
-            print("⏳ Waiting for session to be ready...")
+            logger.debug("realtime.audio.waiting_for_session")
             for _ in range(50):  # Wait up to 5 seconds (50 * 0.1s)
                 await asyncio.sleep(0.1)
                 if self.session_ready:
                     break
             if not self.session_ready:
-                print("⚠️ Session not ready after waiting, proceeding anyway...")
+                logger.warning("realtime.audio.session_not_ready")
         
         try:
-            print(f"🔄 Converting {len(audio_bytes)} bytes of audio to PCM16...")
-            
             # Convert audio to PCM16 format
             pcm16_audio = await convert_audio_to_pcm16(audio_bytes)
             
             if not pcm16_audio or len(pcm16_audio) == 0:
-                print("⚠️ Audio conversion resulted in empty PCM16 data")
+                logger.warning("realtime.audio.empty_pcm16", input_bytes=len(audio_bytes))
                 return False
             
             # Encode entire audio to base64
@@ -605,9 +617,6 @@ class OpenAIRealtimeBridge:
             # 24kHz, 16-bit, mono: 1 second = 24,000 samples * 2 bytes = 48,000 bytes
             duration_ms = (len(pcm16_audio) / 48000) * 1000
             
-            print(f"📤 Sending {len(pcm16_audio)} bytes PCM16 ({duration_ms:.1f}ms) as single append")
-            print(f"   Base64 length: {len(audio_base64)} chars")
-            
             # Clear any previous append errors
             self.append_errors.clear()
             
@@ -618,35 +627,29 @@ class OpenAIRealtimeBridge:
                 "audio": audio_base64
             }
             
-            print(f"📤 Sending append message to OpenAI...")
             await self.openai_ws.send(json.dumps(append_message))
             
-            print(f"✅ Audio append message sent to OpenAI")
-            
             # Wait a bit and check for errors
             await asyncio.sleep(0.08)  # Short delay keeps end-to-end latency under 3s
             
             # Check if we received any errors during the wait
             if self.append_errors:
                 last_error = self.append_errors[-1]
-                print(f"⚠️ Received error after append: {last_error['code']} - {last_error['message']}")
+                logger.warning("realtime.audio.append_failed", code=last_error["code"], error=last_error["message"])
                 # Don't track this audio in buffer if there was an error
                 return False
             
-            print(f"✅ No errors received, audio should be in buffer")
-            
             # Track buffer size ONLY after successful send
             self.audio_buffer_size_bytes += len(pcm16_audio)
             self.audio_chunks_count += 1
             
-            print(f"📊 Audio buffer: {self.audio_buffer_size_bytes} bytes ({self.audio_chunks_count} chunks) - Total PCM16: {len(pcm16_audio)} bytes")
-            print(f"✅ Successfully appended {len(pcm16_audio)} bytes to OpenAI buffer")
+            logger.debug("realtime.audio.appended", input_bytes=len(audio_bytes), pcm16_bytes=len(pcm16_audio),
+                         duration_ms=round(duration_ms, 1), buffer_bytes=self.audio_buffer_size_bytes,
+                         chunks=self.audio_chunks_count)
             return True
             
-        except Exception as e:
-            print(f"❌ Error sending audio to OpenAI: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("realtime.audio.send_failed", input_bytes=len(audio_bytes))
             # Don't increment buffer size if conversion/send failed
             return False
     
@@ -659,7 +662,7 @@ class OpenAIRealtimeBridge:
             # Check if there's already a response in progress
             if not self.response_done:
                 error_msg = "A response is already in progress. Please wait for it to complete."
-                print(f"⚠️ {error_msg}")
+                logger.warning(error_msg)
                 await self._send_json({
                     "type": "error",
                     "message": error_msg,
@@ -670,7 +673,7 @@ class OpenAIRealtimeBridge:
             # Check if we have enough audio before committing
             if self.audio_buffer_size_bytes < self.MIN_AUDIO_BYTES:
                 error_msg = f"Not enough audio to commit. Have {self.audio_buffer_size_bytes} bytes, need at least {self.MIN_AUDIO_BYTES} bytes (~100ms)"
-                print(f"⚠️ {error_msg}")
+                logger.warning(error_msg)
                 await self._send_json({
                     "type": "error",
                     "message": error_msg,
@@ -681,15 +684,15 @@ class OpenAIRealtimeBridge:
                 self.audio_chunks_count = 0
                 return
             
-            print(f"✅ Committing {self.audio_buffer_size_bytes} bytes ({self.audio_chunks_count} chunks) of audio")
+            logger.debug(f"Committing {self.audio_buffer_size_bytes} bytes ({self.audio_chunks_count} chunks) of audio")
             
             # Reset response state BEFORE committing (mark as in progress)
             self.response_audio_chunks = []
             self.response_text = ""
             self.raw_response_text = ""
-            self.non_english_detected = False
-            self.non_english_buffer = ""
             self.partial_text_buffer = ""
+            self.rewritten_sentence_count = 0
+            await self._cancel_segment_pipeline()
             self.response_done = False  # Mark that we're waiting for a response
             self.tts_finalized = False
             
@@ -700,13 +703,14 @@ class OpenAIRealtimeBridge:
             
             # Abort any existing TTS stream from previous response (shouldn't happen, but safety check)
             if self.tts_stream:
-                print("⚠️ Aborting previous TTS stream before starting new response")
+                logger.warning("Aborting previous TTS stream before starting new response")
                 await self.tts_stream.abort()
                 self.tts_stream = None
             
             # Store buffer info for logging
             buffer_size = self.audio_buffer_size_bytes
             chunk_count = self.audio_chunks_count
+            self._start_turn_span(buffer_size)
             
             # DON'T reset buffer tracking yet - keep it until after successful commit
             # This way if commit fails, we still know how much audio we tried to send
@@ -717,7 +721,7 @@ class OpenAIRealtimeBridge:
                 "type": "input_audio_buffer.commit"
             }
             
-            print(f"📤 Committing buffer with {buffer_size} bytes ({chunk_count} chunks)...")
+            logger.debug(f"Committing buffer with {buffer_size} bytes ({chunk_count} chunks)...")
             await self.openai_ws.send(json.dumps(commit_message))
             
             # Small delay to allow OpenAI to process the commit
@@ -727,7 +731,7 @@ class OpenAIRealtimeBridge:
             self.audio_buffer_size_bytes = 0
             self.audio_chunks_count = 0
             
-            print("📤 Audio buffer committed, requesting response...")
+            logger.debug("Audio buffer committed, requesting response...")
             
             # Request response immediately after commit - TEXT ONLY (no audio)
             response_message = {
@@ -740,17 +744,16 @@ class OpenAIRealtimeBridge:
             
             await self.openai_ws.send(json.dumps(response_message))
             
-            print("✅ Response creation requested")
+            logger.debug("Response creation requested")
             
         except Exception as e:
-            print(f"❌ Error committing audio: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error committing audio: {e}")
             # Reset buffer tracking on error
             self.audio_buffer_size_bytes = 0
             self.audio_chunks_count = 0
             # Reset response state on error
             self.response_done = True
+            self._end_turn_span(e)
             raise
     
     
@@ -759,16 +762,18 @@ class OpenAIRealtimeBridge:
         try:
             if self.openai_ws:
                 await self.openai_ws.close()
+            await self._cancel_segment_pipeline()
             if self.tts_stream:
                 await self.tts_stream.abort()
                 self.tts_stream = None
             self.is_connected = False
+            self._end_turn_span()
         except Exception as e:
-            print(f"⚠️ Error closing connections: {e}")
+            logger.warning(f"Error closing connections: {e}")
 
     async def _ensure_tts_stream(self):
         if self.tts_stream is None:
-            print("🎧 Starting ElevenLabs realtime stream session")
+            logger.debug("Starting ElevenLabs realtime stream session")
             self.tts_stream = ElevenLabsStreamSession(
                 api_key=ELEVEN_API_KEY,
                 voice_id=ELEVEN_REALTIME_VOICE_ID,
@@ -782,7 +787,7 @@ class OpenAIRealtimeBridge:
 
     async def _handle_elevenlabs_audio_chunk(self, pcm_chunk: bytes):
         """Buffer PCM chunks and send as larger WAV files to reduce gaps."""
-        print(f"🎵 Received PCM chunk from ElevenLabs: {len(pcm_chunk)} bytes")
+        self._turn_event("tts.first_byte")
         current_time = time.time()
         
         # Prepare data to flush (if needed) while holding lock
@@ -796,7 +801,6 @@ class OpenAIRealtimeBridge:
             # Initialize last flush time if this is the first chunk
             if not self.pcm_audio_buffer:
                 self.pcm_buffer_last_flush_time = current_time
-                print(f"🎧 Initializing PCM buffer (first chunk)")
             
             self.pcm_audio_buffer.append(pcm_chunk)
             self.pcm_buffer_size_bytes += len(pcm_chunk)
@@ -810,10 +814,10 @@ class OpenAIRealtimeBridge:
             
             should_flush = size_based or timeout_based
             
-            print(f"🎧 PCM buffer: {self.pcm_buffer_size_bytes} bytes, {len(self.pcm_audio_buffer)} chunks, {time_since_flush_ms:.0f}ms since last flush (size={size_based}, timeout={timeout_based})")
+            logger.throttled(logging.DEBUG, "realtime.tts.pcm_buffer", buffer_bytes=self.pcm_buffer_size_bytes,
+                             chunks=len(self.pcm_audio_buffer), since_flush_ms=round(time_since_flush_ms))
             
             if should_flush:
-                print(f"🔄 Flushing PCM buffer ({'size' if size_based else 'timeout'})")
                 # Check if we should actually flush
                 if not timeout_based and self.pcm_buffer_size_bytes < self.MIN_PCM_BUFFER_BYTES:
                     should_flush = False
@@ -831,17 +835,33 @@ class OpenAIRealtimeBridge:
         
         # Now do async operations outside the lock
         if should_flush and combined_pcm:
-            print(f"🔄 Converting {buffer_size} bytes PCM ({chunk_count} chunks) to WAV...")
+            logger.debug(f"Converting {buffer_size} bytes PCM ({chunk_count} chunks) to WAV...")
             wav_chunk = await convert_pcm16_to_wav(combined_pcm)
             await self._send_bytes(wav_chunk)
-            print(f"📤 Sent buffered WAV chunk: {buffer_size} bytes PCM → {len(wav_chunk)} bytes WAV")
+            logger.debug(f"Sent buffered WAV chunk: {buffer_size} bytes PCM → {len(wav_chunk)} bytes WAV")
 
     def _contains_non_english_script(self, text: str) -> bool:
-        if not text:
-            return False
-        return bool(NON_ENGLISH_SCRIPT_PATTERN.search(text))
+        return contains_non_english_script(text)
 
-    async def _rewrite_text_to_english(self, original_text: str) -> Optional[str]:
+    async def _rewrite_sentence_to_english(self, sentence: str) -> Optional[str]:
+        """Rewrite a single offending sentence; returns None if no clean English came back."""
+        english_text = await self._rewrite_text_to_english(
+            sentence,
+            system_prompt=SENTENCE_ENFORCEMENT_SYSTEM_PROMPT,
+            instruction="Rewrite this sentence in English only:\n",
+        )
+        if english_text and not self._contains_non_english_script(english_text):
+            self.rewritten_sentence_count += 1
+            return english_text
+        logger.warning(f"Dropping sentence that could not be rewritten to English ({len(sentence)} chars)")
+        return None
+
+    async def _rewrite_text_to_english(
+        self,
+        original_text: str,
+        system_prompt: str = ENGLISH_ENFORCEMENT_SYSTEM_PROMPT,
+        instruction: str = "Rewrite the tutor reply below so it strictly follows the rules.\nOriginal tutor reply:\n",
+    ) -> Optional[str]:
         cleaned = (original_text or "").strip()
         if not cleaned:
             return None
@@ -853,15 +873,11 @@ class OpenAIRealtimeBridge:
                 "messages": [
                     {
                         "role": "system",
-                        "content": ENGLISH_ENFORCEMENT_SYSTEM_PROMPT,
+                        "content": system_prompt,
                     },
                     {
                         "role": "user",
-                        "content": (
-                            "Rewrite the tutor reply below so it strictly follows the rules.\n"
-                            "Original tutor reply:\n"
-                            f"{cleaned}"
-                        ),
+                        "content": f"{instruction}{cleaned}",
                     },
                 ],
                 "max_tokens": min(512, max(160, len(cleaned) // 2 + 60)),
@@ -886,18 +902,18 @@ class OpenAIRealtimeBridge:
                             .strip())
             return english_text or None
         except Exception as exc:
-            print(f"⚠️ English enforcement failed: {exc}")
+            logger.warning(f"English enforcement failed: {exc}")
             return None
     
     def _flush_pcm_buffer_internal(self, force: bool = False):
         """Internal flush function - assumes lock is already held. Returns data to process."""
         if not self.pcm_audio_buffer:
-            print("⚠️ Flush requested but buffer is empty")
+            logger.warning("Flush requested but buffer is empty")
             return None, 0, 0
         
         # Only flush if we have enough data OR if forced (timeout or final flush)
         if not force and self.pcm_buffer_size_bytes < self.MIN_PCM_BUFFER_BYTES:
-            print(f"⚠️ Buffer too small ({self.pcm_buffer_size_bytes} < {self.MIN_PCM_BUFFER_BYTES}), not flushing")
+            logger.warning(f"Buffer too small ({self.pcm_buffer_size_bytes} < {self.MIN_PCM_BUFFER_BYTES}), not flushing")
             return None, 0, 0
         
         # Concatenate all PCM chunks
@@ -923,10 +939,10 @@ class OpenAIRealtimeBridge:
         
         # Do async operations outside the lock
         if combined_pcm:
-            print(f"🔄 Converting {buffer_size} bytes PCM ({chunk_count} chunks) to WAV...")
+            logger.debug(f"Converting {buffer_size} bytes PCM ({chunk_count} chunks) to WAV...")
             wav_chunk = await convert_pcm16_to_wav(combined_pcm)
             await self._send_bytes(wav_chunk)
-            print(f"📤 Sent buffered WAV chunk: {buffer_size} bytes PCM → {len(wav_chunk)} bytes WAV")
+            logger.debug(f"Sent buffered WAV chunk: {buffer_size} bytes PCM → {len(wav_chunk)} bytes WAV")
 
     async def _send_tts_text(self, text: str):
         cleaned = text.strip()
@@ -938,33 +954,96 @@ class OpenAIRealtimeBridge:
         await self.tts_stream.send_text(payload_text)
 
     async def _try_flush_partial_segment(self, force: bool = False):
-        """Flush buffered sentences to ElevenLabs as soon as possible."""
-        if self.non_english_detected and not force:
-            print("⏸️ Skipping TTS flush due to pending English enforcement")
-            return
+        """Queue each completed sentence for TTS as soon as it arrives."""
         buffer = self.partial_text_buffer
         if not buffer.strip():
             return
-        if not force:
-            if len(buffer.strip()) < self.min_partial_segment_chars:
-                return
-            last_sentence_idx = max(buffer.rfind("."), buffer.rfind("!"), buffer.rfind("?"))
-            if last_sentence_idx == -1:
-                return
-            segment = buffer[: last_sentence_idx + 1].strip()
-            self.partial_text_buffer = buffer[last_sentence_idx + 1 :]
-        else:
-            segment = buffer.strip()
+        if force:
+            sentences = [buffer.strip()]
             self.partial_text_buffer = ""
+        else:
+            sentences, self.partial_text_buffer = split_completed_sentences(buffer)
+
+        for sentence in sentences:
+            self._enqueue_sentence(sentence)
 
-        if segment:
-            print(f"🔊 Flushing TTS segment ({len(segment)} chars, force={force})")
-            await self._send_tts_text(segment)
+    def _enqueue_sentence(self, sentence: str):
+        """Classify a sentence locally and queue it, rewriting offending ones concurrently."""
+        if self.segment_queue is None:
+            self.segment_queue = asyncio.Queue()
+            self.segment_worker_task = asyncio.create_task(self._segment_worker())
+
+        if is_english_sentence(sentence):
+            pending = asyncio.get_running_loop().create_future()
+            pending.set_result(sentence)
+        else:
+            logger.warning(f"Non-English sentence detected ({len(sentence)} chars), rewriting it concurrently")
+            pending = asyncio.create_task(self._rewrite_sentence_to_english(sentence))
+            self.rewrite_tasks.add(pending)
+            pending.add_done_callback(self.rewrite_tasks.discard)
+        self.segment_queue.put_nowait(pending)
+
+    async def _segment_worker(self):
+        """Speak queued sentences in order; only sentences behind a rewrite wait for it."""
+        queue = self.segment_queue
+        while True:
+            pending = await queue.get()
+            if pending is None:
+                break
+            try:
+                sentence = await pending
+            except Exception as e:
+                logger.warning(f"Sentence rewrite failed: {e}")
+                sentence = None
+            if not sentence:
+                continue
+            self.response_text = f"{self.response_text} {sentence}".strip()
+            logger.debug(f"Flushing TTS segment ({len(sentence)} chars)")
+            await self._send_tts_text(sentence)
+            await self._send_transcript_delta()
+
+    async def _drain_segment_queue(self):
+        """Wait until every queued sentence has been rewritten (if needed) and sent to TTS."""
+        if self.segment_queue is None:
+            return
+        self.segment_queue.put_nowait(None)
+        worker = self.segment_worker_task
+        self.segment_queue = None
+        self.segment_worker_task = None
+        if worker:
+            try:
+                await worker
+            except Exception as e:
+                logger.warning(f"Error draining TTS sentence queue: {e}")
+
+    async def _cancel_segment_pipeline(self):
+        """Drop queued sentences and in-flight rewrites (new turn or shutdown)."""
+        for task in list(self.rewrite_tasks):
+            task.cancel()
+        self.rewrite_tasks.clear()
+        worker = self.segment_worker_task
+        self.segment_queue = None
+        self.segment_worker_task = None
+        if worker:
+            worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await worker
+
+    async def _send_transcript_delta(self):
+        """Send the spoken English so far plus the in-progress sentence if it is clean."""
+        text = self.response_text
+        tail = self.partial_text_buffer.strip()
+        if tail and is_english_sentence(tail):
+            text = f"{text} {tail}".strip()
+        await self._send_json({
+            "type": "transcript_delta",
+            "text": text
+        })
 
     async def send_greeting(self, greeting_text: str):
         """Send greeting message through ElevenLabs TTS stream."""
         try:
-            print(f"👋 [GREETING] Sending greeting text: '{greeting_text}'")
+            logger.debug(f"Sending greeting text: '{greeting_text}'")
             
             # Ensure TTS stream is ready
             await self._ensure_tts_stream()
@@ -981,11 +1060,9 @@ class OpenAIRealtimeBridge:
                 "text": greeting_text
             })
             
-            print("✅ [GREETING] Greeting sent successfully")
+            logger.debug("Greeting sent successfully")
         except Exception as e:
-            print(f"❌ [GREETING] Error sending greeting: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error sending greeting: {e}")
             await self._send_json({
                 "type": "error",
                 "message": f"Failed to send greeting: {str(e)}",
@@ -996,6 +1073,7 @@ class OpenAIRealtimeBridge:
         """Finalize ElevenLabs stream and notify client."""
         try:
             await self._try_flush_partial_segment(force=force)
+            await self._drain_segment_queue()
             if self.tts_stream:
                 await self.tts_stream.finalize()
                 self.tts_stream = None
@@ -1010,10 +1088,12 @@ class OpenAIRealtimeBridge:
                     await self._send_json({
                         "type": "response_done"
                     })
+                self._end_turn_span()  # last audio byte sent
         except Exception as e:
-            print(f"⚠️ Error finalizing TTS stream: {e}")
+            logger.warning(f"Error finalizing TTS stream: {e}")
             # Mark as done even if we can't send the message
             self.response_done = True
+            self._end_turn_span(e)
 
     async def _send_json(self, payload: Dict[str, Any]):
         try:
@@ -1022,13 +1102,13 @@ class OpenAIRealtimeBridge:
         except RuntimeError as e:
             # Connection already closed - this is expected when client disconnects
             if "websocket.send" in str(e) or "websocket.close" in str(e):
-                print("⚠️ Client WebSocket closed, skipping send_json")
+                logger.warning("Client WebSocket closed, skipping send_json")
             else:
-                print(f"⚠️ RuntimeError sending JSON: {e}")
+                logger.warning(f"RuntimeError sending JSON: {e}")
             self.is_connected = False
         except Exception as e:
             # Other connection errors
-            print(f"⚠️ Error sending JSON (connection may be closed): {e}")
+            logger.warning(f"Error sending JSON (connection may be closed): {e}")
             self.is_connected = False
 
     async def _send_bytes(self, payload: bytes):
@@ -1038,13 +1118,13 @@ class OpenAIRealtimeBridge:
         except RuntimeError as e:
             # Connection already closed - this is expected when client disconnects
             if "websocket.send" in str(e) or "websocket.close" in str(e):
-                print("⚠️ Client WebSocket closed, skipping send_bytes")
+                logger.warning("Client WebSocket closed, skipping send_bytes")
             else:
-                print(f"⚠️ RuntimeError sending bytes: {e}")
+                logger.warning(f"RuntimeError sending bytes: {e}")
             self.is_connected = False
         except Exception as e:
             # Other connection errors
-            print(f"⚠️ Error sending bytes (connection may be closed): {e}")
+            logger.warning(f"Error sending bytes (connection may be closed): {e}")
             self.is_connected = False
 
 
@@ -1129,8 +1209,7 @@ class ElevenLabsStreamSession:
                 
                 # Handle error messages from ElevenLabs
                 if "error" in data:
-                    error_msg = data.get("error", {})
-                    print(f"❌ ElevenLabs error: {error_msg}")
+                    logger.error("elevenlabs.stream.error", error=data.get("error", {}))
                     self.closed = True
                     break
                 
@@ -1138,19 +1217,20 @@ class ElevenLabsStreamSession:
                 audio_b64 = data.get("audio")
                 if audio_b64:
                     chunk = base64.b64decode(audio_b64)
-                    print(f"🎵 Received audio from ElevenLabs: {len(chunk)} bytes PCM")
+                    # Dozens of chunks per reply: one sampled record per second at most
+                    logger.throttled(logging.DEBUG, "elevenlabs.stream.audio_chunk", bytes=len(chunk))
                     await self.audio_callback(chunk)
                 else:
                     # Log other message types for debugging
                     msg_type = data.get("type", "unknown")
                     if msg_type != "pong":  # Ignore pong messages
-                        print(f"ℹ️ ElevenLabs message: {msg_type} | keys: {list(data.keys())}")
+                        logger.debug("elevenlabs.stream.message", type=msg_type, keys=list(data.keys()))
         except ConnectionClosedError as exc:
-            print(f"⚠️ ElevenLabs stream closed unexpectedly: {exc}")
+            logger.warning("elevenlabs.stream.closed", error=str(exc))
         except ConnectionClosedOK:
             pass
         except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse ElevenLabs message: {e}")
+            logger.error("elevenlabs.stream.invalid_json", error=str(e))
         finally:
             self.closed = True
 
@@ -1162,10 +1242,11 @@ async def openai_realtime_conversation(websocket: WebSocket):
     Handles bidirectional audio streaming for ultra-low latency.
     """
     await websocket.accept()
-    print("✅ Client connected to OpenAI Realtime endpoint")
+    logger.info("Client connected to OpenAI Realtime endpoint")
     
     bridge: Optional[OpenAIRealtimeBridge] = None
     mode_initialized = False  # Track if mode has been set and OpenAI connected
+    session_ticket = None  # Admission for the realtime session, held until disconnect
     
     try:
         # Send connection confirmation immediately
@@ -1184,7 +1265,7 @@ async def openai_realtime_conversation(websocket: WebSocket):
                 if "bytes" in message_data:
                     # Check if bridge is initialized (should have been initialized by greeting)
                     if not mode_initialized or bridge is None:
-                        print("⚠️ Bridge not initialized yet. Please send greeting first.")
+                        logger.warning("Bridge not initialized yet. Please send greeting first.")
                         await websocket.send_json({
                             "type": "error",
                             "message": "Please send greeting message first to initialize the session.",
@@ -1193,11 +1274,11 @@ async def openai_realtime_conversation(websocket: WebSocket):
                         continue
                     
                     audio_bytes = message_data["bytes"]
-                    print(f"📥 Received binary audio: {len(audio_bytes)} bytes")
+                    logger.debug(f"Received binary audio: {len(audio_bytes)} bytes")
                     
                     # Check if connection is still valid
                     if not bridge.is_connected or not bridge.openai_ws:
-                        print("⚠️ OpenAI connection lost, cannot send audio")
+                        logger.warning("OpenAI connection lost, cannot send audio")
                         await websocket.send_json({
                             "type": "error",
                             "message": "OpenAI connection lost. Please reconnect.",
@@ -1208,7 +1289,7 @@ async def openai_realtime_conversation(websocket: WebSocket):
                     # Send audio to OpenAI immediately for streaming
                     success = await bridge.send_audio_to_openai(audio_bytes)
                     if not success:
-                        print("⚠️ Failed to send audio to OpenAI, but continuing...")
+                        logger.warning("Failed to send audio to OpenAI, but continuing...")
                         # Don't send error to client - they can retry by sending more audio
                     
                 # Handle text messages (JSON)
@@ -1217,10 +1298,15 @@ async def openai_realtime_conversation(websocket: WebSocket):
                         message = json.loads(message_data["text"])
                         message_type = message.get("type")
                         
+                        # Audio frames stream freely; commits and greetings each start a paid response
+                        if message_type in ("audio_commit", "greeting"):
+                            if not await websocket_rate_limiter.allow_turn(websocket):
+                                continue
+
                         if message_type == "audio_commit":
                             # Check if bridge is initialized
                             if not mode_initialized or bridge is None:
-                                print("⚠️ Bridge not initialized yet. Please send greeting first.")
+                                logger.warning("Bridge not initialized yet. Please send greeting first.")
                                 await websocket.send_json({
                                     "type": "error",
                                     "message": "Please send greeting message first to initialize the session.",
@@ -1229,7 +1315,7 @@ async def openai_realtime_conversation(websocket: WebSocket):
                                 continue
                             
                             # Client is done sending audio, commit and get response
-                            print("📤 Committing audio and requesting response")
+                            logger.debug("Committing audio and requesting response")
                             await bridge.commit_audio_and_get_response()
                             
                         elif message_type == "greeting":
@@ -1239,15 +1325,19 @@ async def openai_realtime_conversation(websocket: WebSocket):
                             
                             # Initialize bridge with correct mode if not already initialized
                             if not mode_initialized:
-                                print(f"🎯 Initializing bridge with mode: {mode}")
+                                # Each realtime session keeps OpenAI and ElevenLabs streams open
+                                session_ticket = await admit_websocket_turn(websocket, REALTIME_VENDORS, ongoing=False)
+                                if session_ticket is None:
+                                    continue
+                                logger.debug(f"Initializing bridge with mode: {mode}")
                                 bridge = OpenAIRealtimeBridge(websocket, mode=mode)
                                 await bridge.connect_to_openai()  # Connect with correct mode from start
                                 mode_initialized = True
-                                print(f"✅ Bridge initialized and OpenAI connected with mode: {mode}")
+                                logger.debug(f"Bridge initialized and OpenAI connected with mode: {mode}")
                             else:
                                 # Bridge already initialized, update mode if different
                                 if mode != bridge.mode:
-                                    print(f"🔄 Updating bridge mode from {bridge.mode} to {mode}")
+                                    logger.debug(f"Updating bridge mode from {bridge.mode} to {mode}")
                                     bridge.mode = mode
                                     
                                     # Update system prompt in OpenAI session if connected and ready
@@ -1261,14 +1351,14 @@ async def openai_realtime_conversation(websocket: WebSocket):
                                                     "instructions": system_prompt,
                                                 }
                                             }
-                                            print(f"📝 Updating OpenAI session with new system prompt for mode: {mode}")
+                                            logger.debug(f"Updating OpenAI session with new system prompt for mode: {mode}")
                                             await bridge.openai_ws.send(json.dumps(update_config))
                                         else:
                                             # Session not ready yet, store for later
                                             bridge._pending_mode_update = mode
-                                            print(f"📝 Storing mode update for when session is ready: {mode}")
+                                            logger.debug(f"Storing mode update for when session is ready: {mode}")
                             
-                            print(f"👋 [GREETING] Processing greeting for user: {user_name}, mode: {mode}")
+                            logger.debug(f"Processing greeting for user: {user_name}, mode: {mode}")
                             
                             # Get mode-specific greeting
                             greeting_template = MODE_GREETINGS.get(mode, MODE_GREETINGS["general"])
@@ -1286,24 +1376,24 @@ async def openai_realtime_conversation(websocket: WebSocket):
                             break
                             
                     except json.JSONDecodeError:
-                        print("⚠️ Invalid JSON received")
+                        logger.warning("Invalid JSON received")
                         await websocket.send_json({
                             "type": "error",
                             "message": "Invalid JSON format"
                         })
                         
             except WebSocketDisconnect:
-                print("⚠️ Client disconnected")
+                logger.info("Client disconnected")
                 break
             except Exception as e:
-                print(f"❌ Error processing message: {e}")
+                logger.error(f"Error processing message: {e}")
                 await websocket.send_json({
                     "type": "error",
                     "message": f"Processing error: {str(e)}"
                 })
                 
     except Exception as e:
-        print(f"❌ Unexpected error in OpenAI Realtime endpoint: {e}")
+        logger.error(f"Unexpected error in OpenAI Realtime endpoint: {e}")
         try:
             await websocket.send_json({
                 "type": "error",
@@ -1315,4 +1405,6 @@ async def openai_realtime_conversation(websocket: WebSocket):
         # Cleanup
         if bridge:
             await bridge.close()
-        print("🔌 OpenAI Realtime connection closed")
+        if session_ticket:
+            session_ticket.release()
+        logger.info("OpenAI Realtime connection closed")
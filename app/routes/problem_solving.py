@@ -9,6 +9,7 @@ from app.services.stt import transcribe_audio_bytes_eng_only
 from app.services.tts import synthesize_speech_exercises
 from app.supabase_client import supabase, progress_tracker
 from app.auth_middleware import get_current_user, require_student, require_admin_or_teacher_or_student
+from app.services.admission import admit_evaluation
 import os
 
 router = APIRouter()
@@ -299,7 +300,8 @@ This endpoint evaluates the user's recorded audio against the problem-solving sc
 It performs speech-to-text conversion and provides comprehensive feedback on the response quality.
 Also records progress tracking data in Supabase database.
 """,
-    tags=["Stage 3 - Exercise 3 (Problem-Solving)"]
+    tags=["Stage 3 - Exercise 3 (Problem-Solving)"],
+    dependencies=[Depends(admit_evaluation)]
 )
 async def evaluate_problem_solving(
     request: AudioEvaluationRequest,
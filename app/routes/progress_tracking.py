@@ -1,12 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-import logging
 from app.supabase_client import progress_tracker
 from app.auth_middleware import get_current_user, require_student,require_admin_or_teacher_or_student
 from datetime import date
+from app.utils.logging_config import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 router = APIRouter()
 
 # Pydantic models for request/response
@@ -51,17 +51,13 @@ async def initialize_user_progress(
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
 ):
     """Initialize user progress when they first start using the app"""
-    print(f"🔄 [API] POST /initialize-progress called")
-    print(f"📝 [API] Request data: {request}")
-    print(f"👤 [API] Authenticated user: {current_user['email']}")
-    
     # Verify user is accessing their own data
     if request.user_id != current_user['id']:
-        print(f"❌ [API] Unauthorized access attempt: {current_user['email']} tried to access user {request.user_id}")
+        logger.warning("progress_api.unauthorized", endpoint="initialize", user_id=current_user['id'], target_user_id=request.user_id)
         raise HTTPException(status_code=403, detail="Unauthorized access to user data")
     
     try:
-        print(f"🔄 [API] Starting progress initialization for user: {request.user_id}")
+        logger.debug("progress_api.request", endpoint="initialize", user_id=request.user_id)
         
         # Get assigned_start_stage from user metadata
         assigned_stage = 1  # Default fallback
@@ -75,33 +71,30 @@ async def initialize_user_progress(
                 user_metadata = user_response.user.user_metadata or {}
                 assigned_stage = user_metadata.get('assigned_start_stage', 1)
                 english_proficiency_text = user_metadata.get('english_proficiency_text')
-                print(f"📊 [API] Retrieved assigned_start_stage from user metadata: {assigned_stage}")
+                logger.debug("progress_api.start_stage", user_id=request.user_id, stage=assigned_stage)
             else:
-                print(f"⚠️ [API] Could not retrieve user metadata, using default stage: {assigned_stage}")
+                logger.warning("progress_api.metadata_missing", user_id=request.user_id, stage=assigned_stage)
         except Exception as e:
-            print(f"⚠️ [API] Error retrieving user metadata: {str(e)}, using default stage: {assigned_stage}")
+            logger.warning("progress_api.metadata_failed", user_id=request.user_id, stage=assigned_stage, error=str(e))
         
         result = await progress_tracker.initialize_user_progress(
             request.user_id, 
             assigned_start_stage=assigned_stage,
             english_proficiency_text=english_proficiency_text
         )
-        print(f"📊 [API] Progress initialization result: {result}")
         
         if result["success"]:
-            print(f"✅ [API] Progress initialization successful")
             return ProgressResponse(
                 success=True,
                 data=result.get("data"),
                 message=result.get("message", "Progress initialized successfully")
             )
         else:
-            print(f"❌ [API] Progress initialization failed: {result.get('error')}")
+            logger.error("progress_api.unsuccessful", endpoint="initialize", user_id=request.user_id, error=result.get('error'))
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to initialize progress"))
             
     except Exception as e:
-        print(f"❌ [API] Error in initialize_user_progress: {str(e)}")
-        logger.error(f"Error in initialize_user_progress: {str(e)}")
+        logger.exception("progress_api.failed", endpoint="initialize", user_id=request.user_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/record-topic-attempt", response_model=ProgressResponse)
@@ -110,27 +103,14 @@ async def record_topic_attempt(
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
 ):
     """Record a topic attempt with detailed metrics"""
-    print(f"🔄 [API] POST /record-topic-attempt called")
-    print(f"📝 [API] Request data: {request}")
-    print(f"👤 [API] Authenticated user: {current_user['email']}")
-    print(f"📊 [API] Topic attempt details:")
-    print(f"   - User ID: {request.user_id}")
-    print(f"   - Stage: {request.stage_id}")
-    print(f"   - Exercise: {request.exercise_id}")
-    print(f"   - Topic: {request.topic_id}")
-    print(f"   - Score: {request.score}")
-    print(f"   - Urdu Used: {request.urdu_used}")
-    print(f"   - Time Spent: {request.time_spent_seconds}s")
-    print(f"   - Completed: {request.completed}")
+    # The attempt itself is logged by progress_tracker.record_topic_attempt
     
     # Verify user is accessing their own data
     if request.user_id != current_user['id']:
-        print(f"❌ [API] Unauthorized access attempt: {current_user['email']} tried to access user {request.user_id}")
+        logger.warning("Unauthorized access attempt: %s tried to access user %s", current_user['id'], request.user_id)
         raise HTTPException(status_code=403, detail="Unauthorized access to user data")
     
     try:
-        print(f"🔄 [API] Recording topic attempt...")
-        
         result = await progress_tracker.record_topic_attempt(
             user_id=request.user_id,
             stage_id=request.stage_id,
@@ -142,19 +122,14 @@ async def record_topic_attempt(
             completed=request.completed
         )
         
-        print(f"📊 [API] Topic attempt recording result: {result}")
-        
         if result["success"]:
-            print(f"🔄 [API] Checking for content unlocks...")
             # Check for content unlocks after recording attempt
             unlock_result = await progress_tracker.check_and_unlock_content(request.user_id)
-            print(f"📊 [API] Content unlock check result: {unlock_result}")
             
             unlocked_content = unlock_result.get("unlocked_content", [])
             if unlocked_content:
-                print(f"🎉 [API] Unlocked content: {unlocked_content}")
+                logger.info("Unlocked content for %s: %s", request.user_id, unlocked_content)
             
-            print(f"✅ [API] Topic attempt recorded successfully")
             return ProgressResponse(
                 success=True,
                 data={
@@ -164,12 +139,10 @@ async def record_topic_attempt(
                 message="Topic attempt recorded successfully"
             )
         else:
-            print(f"❌ [API] Topic attempt recording failed: {result.get('error')}")
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to record topic attempt"))
             
     except Exception as e:
-        print(f"❌ [API] Error in record_topic_attempt: {str(e)}")
-        logger.error(f"Error in record_topic_attempt: {str(e)}")
+        logger.exception("progress_api.failed", endpoint="topic_attempt", user_id=request.user_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/complete-lesson", response_model=ProgressResponse)
@@ -178,7 +151,7 @@ async def complete_lesson(
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
 ):
     """Records the completion of a Stage 0 lesson."""
-    print(f"🔄 [API] POST /complete-lesson called for user {request.user_id}, stage {request.stage_id}, lesson {request.exercise_id}")
+    logger.debug("progress_api.request", endpoint="complete_lesson", user_id=request.user_id, stage=request.stage_id, exercise=request.exercise_id)
     
     # Verify user is accessing their own data
     if request.user_id != current_user['id']:
@@ -205,7 +178,7 @@ async def complete_lesson(
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to complete lesson."))
 
     except Exception as e:
-        logger.error(f"Error in /complete-lesson endpoint: {str(e)}")
+        logger.exception("progress_api.failed", endpoint="complete_lesson", user_id=request.user_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/user-progress/{user_id}", response_model=ProgressResponse)
@@ -214,41 +187,32 @@ async def get_user_progress(
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
 ):
     """Get comprehensive user progress data"""
-    print(f"🔄 [API] GET /user-progress/{user_id} called")
-    print(f"👤 [API] Authenticated user: {current_user['email']}")
-    
     # Verify user is accessing their own data
     if user_id != current_user['id']:
-        print(f"❌ [API] Unauthorized access attempt: {current_user['email']} tried to access user {user_id}")
+        logger.warning("progress_api.unauthorized", endpoint="user_progress", user_id=current_user['id'], target_user_id=user_id)
         raise HTTPException(status_code=403, detail="Unauthorized access to user data")
     
     try:
-        print(f"🔄 [API] Getting user progress for: {user_id}")
+        logger.debug("progress_api.request", endpoint="user_progress", user_id=user_id)
         
         result = await progress_tracker.get_user_progress(user_id)
-        print(f"📊 [API] User progress result: {result}")
         
         if result["success"]:
             data = result.get("data", {})
-            print(f"📊 [API] Progress data summary:")
-            print(f"   - Summary exists: {data.get('summary') is not None}")
-            print(f"   - Stages count: {len(data.get('stages', []))}")
-            print(f"   - Exercises count: {len(data.get('exercises', []))}")
-            print(f"   - Unlocks count: {len(data.get('unlocks', []))}")
             
-            print(f"✅ [API] User progress retrieved successfully")
+            logger.debug("progress_api.user_progress", user_id=user_id, stages=len(data.get('stages', [])),
+                         exercises=len(data.get('exercises', [])), unlocks=len(data.get('unlocks', [])))
             return ProgressResponse(
                 success=True,
                 data=result.get("data"),
                 message="User progress retrieved successfully"
             )
         else:
-            print(f"❌ [API] User progress retrieval failed: {result.get('error')}")
+            logger.error("progress_api.unsuccessful", endpoint="user_progress", user_id=user_id, error=result.get('error'))
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to get user progress"))
             
     except Exception as e:
-        print(f"❌ [API] Error in get_user_progress: {str(e)}")
-        logger.error(f"Error in get_user_progress: {str(e)}")
+        logger.exception("progress_api.failed", endpoint="user_progress", user_id=user_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/check-unlocks/{user_id}", response_model=ProgressResponse)
@@ -257,40 +221,32 @@ async def check_content_unlocks(
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
 ):
     """Check if user should unlock new content based on progress"""
-    print(f"🔄 [API] POST /check-unlocks/{user_id} called")
-    print(f"👤 [API] Authenticated user: {current_user['email']}")
-    
     # Verify user is accessing their own data
     if user_id != current_user['id']:
-        print(f"❌ [API] Unauthorized access attempt: {current_user['email']} tried to access user {user_id}")
+        logger.warning("progress_api.unauthorized", endpoint="check_unlocks", user_id=current_user['id'], target_user_id=user_id)
         raise HTTPException(status_code=403, detail="Unauthorized access to user data")
     
     try:
-        print(f"🔄 [API] Checking content unlocks for user: {user_id}")
+        logger.debug("progress_api.request", endpoint="check_unlocks", user_id=user_id)
         
         result = await progress_tracker.check_and_unlock_content(user_id)
-        print(f"📊 [API] Content unlock check result: {result}")
         
         if result["success"]:
             unlocked_content = result.get("unlocked_content", [])
             if unlocked_content:
-                print(f"🎉 [API] Unlocked content: {unlocked_content}")
-            else:
-                print(f"ℹ️ [API] No new content unlocked")
+                logger.info("progress_api.unlocked", user_id=user_id, unlocked=len(unlocked_content))
             
-            print(f"✅ [API] Content unlock check completed")
             return ProgressResponse(
                 success=True,
                 data={"unlocked_content": unlocked_content},
                 message="Content unlock check completed"
             )
         else:
-            print(f"❌ [API] Content unlock check failed: {result.get('error')}")
+            logger.error("progress_api.unsuccessful", endpoint="check_unlocks", user_id=user_id, error=result.get('error'))
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to check content unlocks"))
             
     except Exception as e:
-        print(f"❌ [API] Error in check_content_unlocks: {str(e)}")
-        logger.error(f"Error in check_content_unlocks: {str(e)}")
+        logger.exception("progress_api.failed", endpoint="check_unlocks", user_id=user_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/get-current-topic", response_model=ProgressResponse)
@@ -299,17 +255,13 @@ async def get_current_topic_for_exercise(
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
 ):
     """Get the current topic_id for a specific exercise"""
-    print(f"🔄 [API] POST /get-current-topic called")
-    print(f"📝 [API] Request data: {request}")
-    print(f"👤 [API] Authenticated user: {current_user['email']}")
-    
     # Verify user is accessing their own data
     if request.user_id != current_user['id']:
-        print(f"❌ [API] Unauthorized access attempt: {current_user['email']} tried to access user {request.user_id}")
+        logger.warning("progress_api.unauthorized", endpoint="current_topic", user_id=current_user['id'], target_user_id=request.user_id)
         raise HTTPException(status_code=403, detail="Unauthorized access to user data")
     
     try:
-        print(f"🔄 [API] Getting current topic for user: {request.user_id}, stage: {request.stage_id}, exercise: {request.exercise_id}")
+        logger.debug("progress_api.request", endpoint="current_topic", user_id=request.user_id, stage=request.stage_id, exercise=request.exercise_id)
         
         result = await progress_tracker.get_current_topic_for_exercise(
             user_id=request.user_id,
@@ -317,22 +269,18 @@ async def get_current_topic_for_exercise(
             exercise_id=request.exercise_id
         )
         
-        print(f"📊 [API] Get current topic result: {result}")
-        
         if result["success"]:
-            print(f"✅ [API] Current topic retrieved successfully")
             return ProgressResponse(
                 success=True,
                 data=result,
                 message="Current topic retrieved successfully"
             )
         else:
-            print(f"❌ [API] Get current topic failed: {result.get('error')}")
+            logger.error("progress_api.unsuccessful", endpoint="current_topic", user_id=request.user_id, error=result.get('error'))
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to get current topic"))
             
     except Exception as e:
-        print(f"❌ [API] Error in get_current_topic_for_exercise: {str(e)}")
-        logger.error(f"Error in get_current_topic_for_exercise: {str(e)}")
+        logger.exception("progress_api.failed", endpoint="current_topic", user_id=request.user_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.post("/comprehensive-progress", response_model=ProgressResponse)
@@ -341,24 +289,20 @@ async def get_comprehensive_progress(
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
 ):
     """Get comprehensive progress data for the beautiful progress page"""
-    print(f"🔄 [API] POST /comprehensive-progress called")
-    print(f"📝 [API] Request data: {request}")
-    print(f"👤 [API] Authenticated user: {current_user['email']}")
-    
     # Verify user is accessing their own data
     if request.user_id != current_user['id']:
-        print(f"❌ [API] Unauthorized access attempt: {current_user['email']} tried to access user {request.user_id}")
+        logger.warning("progress_api.unauthorized", endpoint="comprehensive", user_id=current_user['id'], target_user_id=request.user_id)
         raise HTTPException(status_code=403, detail="Unauthorized access to user data")
     
     try:
-        print(f"🔄 [API] Getting comprehensive progress for user: {request.user_id}")
+        logger.debug("progress_api.request", endpoint="comprehensive", user_id=request.user_id)
         
         # Get all progress data
         progress_result = await progress_tracker.get_user_progress(request.user_id)
         
         # If no summary exists, the user is likely new. Initialize them.
         if not progress_result.get("data") or not progress_result.get("data").get("summary"):
-            print(f"⚠️ [API] No progress found for user {request.user_id}. Initializing now.")
+            logger.info("progress_api.initializing", user_id=request.user_id)
             
             # Get assigned_start_stage from user metadata
             assigned_stage = 1  # Default fallback
@@ -372,11 +316,11 @@ async def get_comprehensive_progress(
                     user_metadata = user_response.user.user_metadata or {}
                     assigned_stage = user_metadata.get('assigned_start_stage', 1)
                     english_proficiency_text = user_metadata.get('english_proficiency_text')
-                    print(f"📊 [API] Retrieved assigned_start_stage from user metadata: {assigned_stage}")
+                    logger.debug("progress_api.start_stage", user_id=request.user_id, stage=assigned_stage)
                 else:
-                    print(f"⚠️ [API] Could not retrieve user metadata, using default stage: {assigned_stage}")
+                    logger.warning("progress_api.metadata_missing", user_id=request.user_id, stage=assigned_stage)
             except Exception as e:
-                print(f"⚠️ [API] Error retrieving user metadata: {str(e)}, using default stage: {assigned_stage}")
+                logger.warning("progress_api.metadata_failed", user_id=request.user_id, stage=assigned_stage, error=str(e))
             
             # Initialize with the retrieved assigned_start_stage
             init_result = await progress_tracker.initialize_user_progress(
@@ -389,13 +333,10 @@ async def get_comprehensive_progress(
                 raise HTTPException(status_code=500, detail="Failed to initialize user progress.")
             
             # Re-fetch progress data after initialization
-            print(f"🔄 [API] Re-fetching progress data after initialization.")
             progress_result = await progress_tracker.get_user_progress(request.user_id)
-
-        print(f"📊 [API] Progress result: {progress_result}")
         
         if not progress_result["success"]:
-            print(f"❌ [API] Failed to get progress data: {progress_result.get('error')}")
+            logger.error("progress_api.unsuccessful", endpoint="comprehensive", user_id=request.user_id, error=progress_result.get('error'))
             raise HTTPException(status_code=500, detail=progress_result.get("error", "Failed to get progress data"))
         
         progress_data = progress_result.get("data", {})
@@ -405,23 +346,16 @@ async def get_comprehensive_progress(
         unlocks = progress_data.get("unlocks", [])
         
         # ADDED: Fetch detailed topic progress
-        print(f"🔄 [API] Fetching detailed topic progress for user: {request.user_id}")
         topic_progress_result = await progress_tracker.get_user_topic_progress_all(request.user_id)
         if not topic_progress_result["success"]:
             raise HTTPException(status_code=500, detail="Failed to get topic progress.")
         topic_progress = topic_progress_result.get("data", [])
-        print(f"📊 [API] Found {len(topic_progress)} completed topic records.")
-        
-        print(f"📊 [API] Data summary:")
-        print(f"   - Summary exists: {summary is not None}")
-        print(f"   - Stages count: {len(stages)}")
-        print(f"   - Exercises count: {len(exercises)}")
-        print(f"   - Unlocks count: {len(unlocks)}")
+        logger.debug("progress_api.comprehensive_data", user_id=request.user_id, stages=len(stages), exercises=len(exercises),
+                     unlocks=len(unlocks), topics=len(topic_progress))
         
         # Process and structure the data for frontend
         processed_data = await _process_progress_data_for_frontend(summary, stages, exercises, unlocks, topic_progress)
         
-        print(f"✅ [API] Comprehensive progress data processed successfully")
         return ProgressResponse(
             success=True,
             data=processed_data,
@@ -429,8 +363,7 @@ async def get_comprehensive_progress(
         )
         
     except Exception as e:
-        print(f"❌ [API] Error in get_comprehensive_progress: {str(e)}")
-        logger.error(f"Error in get_comprehensive_progress: {str(e)}")
+        logger.exception("progress_api.failed", endpoint="comprehensive", user_id=request.user_id)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 async def _process_progress_data_for_frontend(summary: dict, stages: list, exercises: list, unlocks: list, topic_progress: list) -> dict:
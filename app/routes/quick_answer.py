@@ -9,6 +9,7 @@ from app.services.stt import transcribe_audio_bytes_eng_only
 from app.services.feedback import evaluate_response_ex2_stage2
 from app.supabase_client import supabase, progress_tracker
 from app.auth_middleware import get_current_user, require_student, require_admin_or_teacher_or_student
+from app.services.admission import admit_evaluation
 import base64
 
 router = APIRouter(tags=["quick-answer"])
@@ -266,7 +267,7 @@ async def generate_question_audio(question_id: int, current_user: Dict[str, Any]
         print(f"❌ [QUICK_ANSWER] Error generating TTS for question {question_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate audio")
 
-@router.post("/evaluate-quick-answer")
+@router.post("/evaluate-quick-answer", dependencies=[Depends(admit_evaluation)])
 async def evaluate_quick_answer_audio(
     request: AudioEvaluationRequest,
     current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)
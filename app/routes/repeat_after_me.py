@@ -12,6 +12,7 @@ from app.services.stt import transcribe_audio_bytes_eng_only
 from app.services.feedback import evaluate_response_ex1_stage1
 from app.supabase_client import supabase, progress_tracker
 from app.auth_middleware import get_current_user, require_student,require_admin_or_teacher_or_student
+from app.services.admission import admit_evaluation
 router = APIRouter()
 
 class AudioEvaluationRequest(BaseModel):
@@ -263,7 +264,8 @@ This endpoint evaluates the user's recorded audio against the expected phrase.
 It performs speech-to-text conversion and provides pronunciation feedback.
 Also records progress tracking data in Supabase database.
 """,
-    tags=["Stage 1 - Exercise 1 (Repeat After Me)"]
+    tags=["Stage 1 - Exercise 1 (Repeat After Me)"],
+    dependencies=[Depends(admit_evaluation)]
 )
 async def evaluate_audio(
     request: AudioEvaluationRequest,
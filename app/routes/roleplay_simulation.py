@@ -14,7 +14,7 @@ from app.services.roleplay_agent import roleplay_agent
 from app.services.feedback import evaluate_response_ex3_stage2
 from app.services.stt import transcribe_audio_bytes_eng_only
 from app.supabase_client import supabase, progress_tracker
-from app.redis_client import redis_client
+from app.redis_client import async_redis
 from app.auth_middleware import get_current_user, require_student,require_admin_or_teacher_or_student
 import json
 import base64
@@ -320,7 +320,7 @@ async def start_roleplay(
             raise HTTPException(status_code=404, detail="Scenario not found")
         
         # Create session
-        session_id, initial_prompt = roleplay_agent.create_session(scenario)
+        session_id, initial_prompt = await roleplay_agent.create_session(scenario)
         
         # Generate audio for initial prompt
         audio_base64 = None
@@ -393,7 +393,7 @@ async def continue_roleplay(
                 raise HTTPException(status_code=400, detail=f"Failed to process audio: {str(e)}")
         
         # Update session with user input
-        ai_response, status, error = roleplay_agent.update_session(reply.session_id, user_input)
+        ai_response, status, error = await roleplay_agent.update_session(reply.session_id, user_input)
         
         if error:
             raise HTTPException(status_code=400, detail=error)
@@ -436,11 +436,10 @@ async def get_roleplay_history(session_id: str, current_user: Dict[str, Any] = D
     
     try:
         # Get session data from Redis
-        session_data_json = redis_client.get(session_id)
-        if not session_data_json:
+        session_data = await async_redis.get_json(session_id)
+        if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        session_data = json.loads(session_data_json)
         history = session_data.get("history", [])
         
         # Get scenario info
@@ -490,11 +489,10 @@ async def evaluate_roleplay_session(
     
     try:
         # Get session data from Redis
-        session_data_json = redis_client.get(request.session_id)
-        if not session_data_json:
+        session_data = await async_redis.get_json(request.session_id)
+        if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        session_data = json.loads(session_data_json)
         history = session_data.get("history", [])
         
         if not history:
@@ -513,7 +511,8 @@ async def evaluate_roleplay_session(
             conversation_history=history,
             scenario_context=scenario["scenario_context"],
             expected_keywords=scenario["expected_keywords"],
-            ai_character=scenario["ai_character"]
+            ai_character=scenario["ai_character"],
+            memory_state=await roleplay_agent.get_memory_state(request.session_id)
         )
         
         # Record progress in Supabase
@@ -578,7 +577,7 @@ async def evaluate_roleplay_session(
         
         # Clean up session from Redis
         try:
-            roleplay_agent.delete_session(request.session_id)
+            await roleplay_agent.delete_session(request.session_id)
             print(f"✅ [ROLEPLAY] Session cleaned up from Redis")
         except Exception as e:
             print(f"⚠️ [ROLEPLAY] Error cleaning up session: {str(e)}")
@@ -161,9 +161,9 @@ async def get_teacher_dashboard_overview(
     Get comprehensive teacher dashboard overview (OPTIMIZED with caching)
     Now includes teacher filtering - only shows assigned students
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/overview called")
-    print(f"📝 [TEACHER] Time range: {time_range}")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /teacher/dashboard/overview called")
+    logger.debug(f"Time range: {time_range}")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -176,10 +176,10 @@ async def get_teacher_dashboard_overview(
         try:
             cached_result = await cache_manager.get(cache_key)
         except Exception as cache_error:
-            print(f"⚠️ [TEACHER] Cache error (continuing without cache): {str(cache_error)}")
+            logger.warning(f"Cache error (continuing without cache): {str(cache_error)}")
         
         if cached_result:
-            print(f"✅ [TEACHER] Using cached overview data for {time_range}")
+            logger.debug(f"Using cached overview data for {time_range}")
             return TeacherDashboardResponse(
                 success=True,
                 data=cached_result,
@@ -202,9 +202,9 @@ async def get_teacher_dashboard_overview(
         try:
             await cache_manager.set(cache_key, dashboard_data, ttl=180)
         except Exception as cache_error:
-            print(f"⚠️ [TEACHER] Cache set error (continuing): {str(cache_error)}")
+            logger.warning(f"Cache set error (continuing): {str(cache_error)}")
         
-        print(f"✅ [TEACHER] Dashboard data retrieved successfully")
+        logger.debug("Dashboard data retrieved successfully")
         return TeacherDashboardResponse(
             success=True,
             data=dashboard_data,
@@ -212,7 +212,6 @@ async def get_teacher_dashboard_overview(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_teacher_dashboard_overview: {str(e)}")
         logger.error(f"Error in get_teacher_dashboard_overview: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -225,8 +224,8 @@ async def get_learn_feature_engagement_summary(
     Get learn feature engagement summary for teacher dashboard
     Now includes teacher filtering - only shows assigned students
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/learn-engagement-summary called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /teacher/dashboard/learn-engagement-summary called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -241,7 +240,6 @@ async def get_learn_feature_engagement_summary(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_learn_feature_engagement_summary: {str(e)}")
         logger.error(f"Error in get_learn_feature_engagement_summary: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -255,9 +253,9 @@ async def get_top_used_practice_lessons(
     Get top used practice lessons for teacher dashboard
     Now includes teacher filtering - only shows assigned students
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/top-used-lessons called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Limit: {limit}")
+    logger.debug("GET /teacher/dashboard/top-used-lessons called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Limit: {limit}")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -272,7 +270,6 @@ async def get_top_used_practice_lessons(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_top_used_practice_lessons: {str(e)}")
         logger.error(f"Error in get_top_used_practice_lessons: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -281,7 +278,7 @@ async def _get_learn_feature_engagement_summary(time_range: str = "all_time", te
     Get learn feature engagement summary with time range filtering and teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Calculating learn feature engagement summary for time range: {time_range}...")
+        logger.debug(f"Calculating learn feature engagement summary for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -382,17 +379,11 @@ async def _get_learn_feature_engagement_summary(time_range: str = "all_time", te
             "engagement_change": engagement_change
         }
         
-        print(f"📊 [TEACHER] Learn feature engagement summary calculated:")
-        print(f"   - Total Students Engaged: {total_students_engaged}")
-        print(f"   - Active Today: {active_today}")
-        print(f"   - Total Time Spent: {total_time_spent_hours}h ({time_period})")
-        print(f"   - Avg Responses per Student: {avg_responses_per_student} ({responses_period})")
-        print(f"   - Engagement Rate: {engagement_rate}% ({engagement_change})")
+        logger.debug(f"Learn feature engagement summary calculated: Total Students Engaged: {total_students_engaged}, Active Today: {active_today}, Total Time Spent: {total_time_spent_hours}h ({time_period}), Avg Responses per Student: {avg_responses_per_student} ({responses_period}), Engagement Rate: {engagement_rate}% ({engagement_change})")
         
         return engagement_summary
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error calculating learn feature engagement summary: {str(e)}")
         logger.error(f"Error calculating learn feature engagement summary: {str(e)}")
         raise
 
@@ -401,7 +392,7 @@ async def _get_top_used_practice_lessons(limit: int = 5, time_range: str = "all_
     Get top used practice lessons with time range filtering and teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Calculating top used practice lessons for time range: {time_range}...")
+        logger.debug(f"Calculating top used practice lessons for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -425,7 +416,7 @@ async def _get_top_used_practice_lessons(limit: int = 5, time_range: str = "all_
         lessons_result = lessons_query.execute()
         
         if not lessons_result.data:
-            print(f"ℹ️ [TEACHER] No lesson access data found")
+            logger.debug("No lesson access data found")
             return []
         
         # Count accesses per lesson
@@ -509,11 +500,10 @@ async def _get_top_used_practice_lessons(limit: int = 5, time_range: str = "all_
                 "trend": trend
             })
         
-        print(f"✅ [TEACHER] Top used practice lessons calculated successfully")
+        logger.debug("Top used practice lessons calculated successfully")
         return formatted_lessons
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in _get_top_used_practice_lessons: {str(e)}")
         logger.error(f"Error in _get_top_used_practice_lessons: {str(e)}")
         return []
 
@@ -578,7 +568,7 @@ async def _calculate_engagement_change(time_range: str, current_engagement: floa
         return change_text
         
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error calculating engagement change: {str(e)}")
+        logger.warning(f"Error calculating engagement change: {str(e)}")
         return "+0% from last week"
 
 async def _get_low_engagement_student_details(
@@ -591,7 +581,7 @@ async def _get_low_engagement_student_details(
     Get detailed information about students with low engagement (OPTIMIZED)
     """
     try:
-        print(f"🔄 [TEACHER] Getting low engagement student details...")
+        logger.debug("Getting low engagement student details...")
         
         # Create set of active user IDs for quick lookup
         active_user_ids = set([record['user_id'] for record in recent_activity_data]) if recent_activity_data else set()
@@ -664,11 +654,10 @@ async def _get_low_engagement_student_details(
         # Sort by days inactive (highest first) and then by progress percentage (lowest first)
         low_engagement_students.sort(key=lambda x: (x['days_inactive'], -x['progress_percentage']), reverse=True)
         
-        print(f"✅ [TEACHER] Found {len(low_engagement_students)} low engagement students with details")
+        logger.debug(f"Found {len(low_engagement_students)} low engagement students with details")
         return low_engagement_students
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting low engagement student details: {str(e)}")
         logger.error(f"Error getting low engagement student details: {str(e)}")
         return []
 
@@ -716,8 +705,8 @@ async def get_behavior_insights(
     Get behavior insights for teacher dashboard (OPTIMIZED with caching)
     Now includes teacher filtering - only shows assigned students
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/behavior-insights called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /teacher/dashboard/behavior-insights called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -730,10 +719,10 @@ async def get_behavior_insights(
         try:
             cached_result = await cache_manager.get(cache_key)
         except Exception as cache_error:
-            print(f"⚠️ [TEACHER] Cache error (continuing without cache): {str(cache_error)}")
+            logger.warning(f"Cache error (continuing without cache): {str(cache_error)}")
         
         if cached_result:
-            print(f"✅ [TEACHER] Using cached behavior insights for {time_range}")
+            logger.debug(f"Using cached behavior insights for {time_range}")
             return TeacherDashboardResponse(
                 success=True,
                 data=cached_result,
@@ -747,7 +736,7 @@ async def get_behavior_insights(
         try:
             await cache_manager.set(cache_key, behavior_insights, ttl=300)
         except Exception as cache_error:
-            print(f"⚠️ [TEACHER] Cache set error (continuing): {str(cache_error)}")
+            logger.warning(f"Cache set error (continuing): {str(cache_error)}")
         
         return TeacherDashboardResponse(
             success=True,
@@ -756,7 +745,6 @@ async def get_behavior_insights(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_behavior_insights: {str(e)}")
         logger.error(f"Error in get_behavior_insights: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -770,9 +758,9 @@ async def get_high_retry_students(
     """
     Get students with high retry rates (excessive retries)
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/high-retry-students called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Stage ID: {stage_id}, Retry Threshold: {retry_threshold}")
+    logger.debug("GET /teacher/dashboard/high-retry-students called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Stage ID: {stage_id}, Retry Threshold: {retry_threshold}")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -787,7 +775,6 @@ async def get_high_retry_students(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_high_retry_students: {str(e)}")
         logger.error(f"Error in get_high_retry_students: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -801,9 +788,9 @@ async def get_stuck_students(
     """
     Get students who are stuck at their current stage for a specified number of days
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/stuck-students called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Stage ID: {stage_id}, Days Threshold: {days_threshold}")
+    logger.debug("GET /teacher/dashboard/stuck-students called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Stage ID: {stage_id}, Days Threshold: {days_threshold}")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -818,7 +805,6 @@ async def get_stuck_students(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_stuck_students: {str(e)}")
         logger.error(f"Error in get_stuck_students: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -832,9 +818,9 @@ async def get_inactive_students(
     """
     Get students who have been inactive for a specified number of days
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/inactive-students called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Stage ID: {stage_id}, Days Threshold: {days_threshold}")
+    logger.debug("GET /teacher/dashboard/inactive-students called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Stage ID: {stage_id}, Days Threshold: {days_threshold}")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -849,7 +835,6 @@ async def get_inactive_students(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_inactive_students: {str(e)}")
         logger.error(f"Error in get_inactive_students: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -865,9 +850,9 @@ async def get_student_progress_overview(
     Get comprehensive student progress overview for the Progress tab
     Now includes teacher filtering - only shows assigned students
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/progress-overview called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Search: {search_query}, Stage: {stage_id}, Lesson: {lesson_id}")
+    logger.debug("GET /teacher/dashboard/progress-overview called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Search: {search_query}, Stage: {stage_id}, Lesson: {lesson_id}")
     
     try:
         # Extract teacher_id if user is a teacher (admins see all students)
@@ -882,7 +867,6 @@ async def get_student_progress_overview(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_student_progress_overview: {str(e)}")
         logger.error(f"Error in get_student_progress_overview: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -895,9 +879,9 @@ async def get_progress_metrics(
     """
     Get key progress metrics (Total Students, Average Completion, Average Score, Students at Risk)
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/progress-metrics called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Stage ID: {stage_id}, Time Range: {time_range}")
+    logger.debug("GET /teacher/dashboard/progress-metrics called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Stage ID: {stage_id}, Time Range: {time_range}")
     
     try:
         metrics_data = await _get_progress_metrics(stage_id, time_range)
@@ -909,7 +893,6 @@ async def get_progress_metrics(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_progress_metrics: {str(e)}")
         logger.error(f"Error in get_progress_metrics: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -920,8 +903,8 @@ async def get_available_stages(
     """
     Get all available stages for filtering
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/stages called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug("GET /teacher/dashboard/stages called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
     
     try:
         stages_data = _get_available_stages()
@@ -933,7 +916,6 @@ async def get_available_stages(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_available_stages: {str(e)}")
         logger.error(f"Error in get_available_stages: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -945,9 +927,9 @@ async def get_lessons_by_stage(
     """
     Get lessons available for a specific stage
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/lessons/{stage_id} called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Stage ID: {stage_id}")
+    logger.debug(f"GET /teacher/dashboard/lessons/{stage_id} called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Stage ID: {stage_id}")
     
     try:
         lessons_data = _get_lessons_by_stage(stage_id)
@@ -959,7 +941,6 @@ async def get_lessons_by_stage(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_lessons_by_stage: {str(e)}")
         logger.error(f"Error in get_lessons_by_stage: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -975,9 +956,9 @@ async def export_progress_data(
     """
     Export progress data in CSV or PDF format
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/export-progress called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"📊 [TEACHER] Format: {format_type}, Search: {search_query}, Stage: {stage_id}")
+    logger.debug("GET /teacher/dashboard/export-progress called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Format: {format_type}, Search: {search_query}, Stage: {stage_id}")
     
     try:
         export_data = await _export_progress_data(format_type, search_query, stage_id, lesson_id, time_range)
@@ -989,7 +970,6 @@ async def export_progress_data(
         )
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in export_progress_data: {str(e)}")
         logger.error(f"Error in export_progress_data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -998,7 +978,7 @@ async def _get_behavior_insights(time_range: str = "all_time", teacher_id: Optio
     Get behavior insights (OPTIMIZED with parallel execution) with teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Calculating behavior insights for time range: {time_range}...")
+        logger.debug(f"Calculating behavior insights for time range: {time_range}...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -1026,11 +1006,10 @@ async def _get_behavior_insights(time_range: str = "all_time", teacher_id: Optio
             ])
         }
         
-        print(f"✅ [TEACHER] Behavior insights calculated successfully")
+        logger.debug("Behavior insights calculated successfully")
         return behavior_insights
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error calculating behavior insights: {str(e)}")
         logger.error(f"Error calculating behavior insights: {str(e)}")
         raise
 
@@ -1110,7 +1089,7 @@ async def _get_high_retry_insight(start_date: Optional[date], end_date: Optional
         }
         
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error calculating high retry insight: {str(e)}")
+        logger.warning(f"Error calculating high retry insight: {str(e)}")
         return {
             "has_alert": False,
             "message": "Error calculating retry insight",
@@ -1122,7 +1101,7 @@ async def _get_high_retry_students(stage_id: Optional[int], retry_threshold: int
     Get detailed list of students with high retry rates (POSSIBLE - using attempt_num) with teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Getting high retry students with threshold: {retry_threshold}")
+        logger.debug(f"Getting high retry students with threshold: {retry_threshold}")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -1203,7 +1182,6 @@ async def _get_high_retry_students(stage_id: Optional[int], retry_threshold: int
         }
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in _get_high_retry_students: {str(e)}")
         logger.error(f"Error in _get_high_retry_students: {str(e)}")
         return {
             "students": [],
@@ -1216,7 +1194,7 @@ async def _get_low_engagement_insight(start_date: Optional[date], end_date: Opti
     Get low engagement insight with detailed student information (POSSIBLE - using daily learning analytics) with teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Calculating low engagement insight...")
+        logger.debug("Calculating low engagement insight...")
         
         # Get students with low engagement (no activity in last 7 days)
         seven_days_ago = (date.today() - timedelta(days=7)).isoformat()
@@ -1281,7 +1259,7 @@ async def _get_low_engagement_insight(start_date: Optional[date], end_date: Opti
             }
             
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error calculating low engagement insight: {str(e)}")
+        logger.warning(f"Error calculating low engagement insight: {str(e)}")
         logger.error(f"Error calculating low engagement insight: {str(e)}")
         return {
             "has_alert": False,
@@ -1294,7 +1272,7 @@ async def _get_inactivity_insight(start_date: Optional[date], end_date: Optional
     Get inactivity insight (POSSIBLE - using daily learning analytics and progress summary) with teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Calculating inactivity insight...")
+        logger.debug("Calculating inactivity insight...")
         
         # Get inactive students data using the helper function
         # We pass None as teacher_id and let _get_inactive_students handle the filtering via teacher_student_ids
@@ -1346,7 +1324,7 @@ async def _get_inactivity_insight(start_date: Optional[date], end_date: Optional
             }
             
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error calculating inactivity insight: {str(e)}")
+        logger.warning(f"Error calculating inactivity insight: {str(e)}")
         return {
             "has_alert": False,
             "message": "Error calculating inactivity insight",
@@ -1467,7 +1445,7 @@ async def _get_stuck_students_insight(start_date: Optional[date], end_date: Opti
         }
         
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error calculating stuck students insight: {str(e)}")
+        logger.warning(f"Error calculating stuck students insight: {str(e)}")
         return {
             "has_alert": False,
             "message": "Error calculating stuck students insight",
@@ -1479,7 +1457,7 @@ async def _get_stuck_students(stage_id: Optional[int], days_threshold: int, time
     Get detailed list of students stuck at stages (POSSIBLE - using progress summary and activity data) with teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Getting stuck students with threshold: {days_threshold} days")
+        logger.debug(f"Getting stuck students with threshold: {days_threshold} days")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -1580,7 +1558,6 @@ async def _get_stuck_students(stage_id: Optional[int], days_threshold: int, time
         }
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in _get_stuck_students: {str(e)}")
         logger.error(f"Error in _get_stuck_students: {str(e)}")
         return {
             "students": [],
@@ -1593,7 +1570,7 @@ async def _get_inactive_students(stage_id: Optional[int], days_threshold: int, t
     Get detailed list of students who have been inactive for a specified number of days with teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Getting inactive students with threshold: {days_threshold} days")
+        logger.debug(f"Getting inactive students with threshold: {days_threshold} days")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -1709,7 +1686,6 @@ async def _get_inactive_students(stage_id: Optional[int], days_threshold: int, t
         }
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in _get_inactive_students: {str(e)}")
         logger.error(f"Error in _get_inactive_students: {str(e)}")
         return {
             "students": [],
@@ -1722,7 +1698,7 @@ async def _get_student_progress_overview(search_query: Optional[str], stage_id:
     Get comprehensive student progress overview with detailed student data and teacher filtering
     """
     try:
-        print(f"🔄 [TEACHER] Getting student progress overview...")
+        logger.debug("Getting student progress overview...")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -1846,7 +1822,6 @@ async def _get_student_progress_overview(search_query: Optional[str], stage_id:
         }
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in _get_student_progress_overview: {str(e)}")
         logger.error(f"Error in _get_student_progress_overview: {str(e)}")
         raise
 
@@ -1863,7 +1838,7 @@ async def _get_student_email(user_id: str) -> str:
         return 'No email'
         
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error getting email for {user_id}: {str(e)}")
+        logger.warning(f"Error getting email for {user_id}: {str(e)}")
         return 'No email'
 
 async def _get_student_average_score(user_id: str, stage_id: int) -> float:
@@ -1893,7 +1868,7 @@ async def _get_student_average_score(user_id: str, stage_id: int) -> float:
         return round(sum(scores) / len(scores), 1)
         
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error getting average score for {user_id}: {str(e)}")
+        logger.warning(f"Error getting average score for {user_id}: {str(e)}")
         return 0.0
 
 async def _generate_ai_feedback(progress_record: Dict[str, Any], avg_score: float) -> Dict[str, Any]:
@@ -1957,7 +1932,7 @@ async def _generate_ai_feedback(progress_record: Dict[str, Any], avg_score: floa
         }
         
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error generating AI feedback: {str(e)}")
+        logger.warning(f"Error generating AI feedback: {str(e)}")
         return {
             "text": "Progress data analysis in progress. Continue with current learning path.",
             "sentiment": "neutral",
@@ -1969,7 +1944,7 @@ async def _get_progress_metrics(stage_id: Optional[int], time_range: str) -> Dic
     Get key progress metrics (Total Students, Average Completion, Average Score, Students at Risk)
     """
     try:
-        print(f"🔄 [TEACHER] Getting progress metrics for stage: {stage_id}, time_range: {time_range}")
+        logger.debug(f"Getting progress metrics for stage: {stage_id}, time_range: {time_range}")
         
         start_date, end_date = _get_date_range(time_range)
         
@@ -2028,17 +2003,11 @@ async def _get_progress_metrics(stage_id: Optional[int], time_range: str) -> Dic
             "time_range": time_range
         }
         
-        print(f"📊 [TEACHER] Progress metrics calculated:")
-        print(f"   - Total Students: {total_students}")
-        print(f"   - Avg Completion: {avg_completion}%")
-        print(f"   - Avg Score: {avg_score}%")
-        print(f"   - Students at Risk: {len(at_risk_students)}")
-        print(f"   - Time Range: {time_range}")
+        logger.debug(f"Progress metrics calculated: Total Students: {total_students}, Avg Completion: {avg_completion}%, Avg Score: {avg_score}%, Students at Risk: {len(at_risk_students)}, Time Range: {time_range}")
         
         return metrics_data
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error in _get_progress_metrics: {str(e)}")
         logger.error(f"Error in _get_progress_metrics: {str(e)}")
         raise
 
@@ -2104,7 +2073,7 @@ async def _export_progress_data(format_type: str, search_query: Optional[str], s
     """
     Export real progress data in CSV or PDF format
     """
-    print(f"🔄 [TEACHER] Exporting progress data in {format_type.upper()} format...")
+    logger.debug(f"Exporting progress data in {format_type.upper()} format...")
     
     try:
         # Fetch real student progress data using the existing helper function
@@ -2135,11 +2104,7 @@ async def _export_progress_data(format_type: str, search_query: Optional[str], s
             }
             data_to_export.append(export_record)
         
-        print(f"   - Exporting {len(data_to_export)} real student records")
-        print(f"   - Search Query: {search_query}")
-        print(f"   - Stage Filter: {stage_id}")
-        print(f"   - Lesson Filter: {lesson_id}")
-        print(f"   - Time Range: {time_range}")
+        logger.debug(f"Exporting {len(data_to_export)} real student records Search Query: {search_query}, Stage Filter: {stage_id}, Lesson Filter: {lesson_id}, Time Range: {time_range}")
         
         if format_type == "csv":
             # In a real app, you'd use a library like pandas or a CSV generation library
@@ -2153,7 +2118,6 @@ async def _export_progress_data(format_type: str, search_query: Optional[str], s
             raise HTTPException(status_code=400, detail=f"Unsupported format: {format_type}")
             
     except Exception as e:
-        print(f"❌ [TEACHER] Error in _export_progress_data: {str(e)}")
         logger.error(f"Error in _export_progress_data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error exporting progress data: {str(e)}")
 
@@ -2198,14 +2162,13 @@ async def _get_teacher_student_ids(teacher_id: Optional[str]) -> List[str]:
         
         if result.data:
             student_ids = [record['student_id'] for record in result.data]
-            print(f"✅ [TEACHER] Found {len(student_ids)} assigned students for teacher {teacher_id}")
+            logger.debug(f"Found {len(student_ids)} assigned students for teacher {teacher_id}")
             return student_ids
         
-        print(f"⚠️ [TEACHER] No assigned students found for teacher {teacher_id}")
+        logger.warning(f"No assigned students found for teacher {teacher_id}")
         return []
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting teacher students: {str(e)}")
         logger.error(f"Error getting teacher students: {str(e)}")
         # Return empty list on error - this will cause functions to return empty data
         # which is safer than showing all students
@@ -2244,7 +2207,7 @@ async def _get_batch_student_names(user_ids: List[str]) -> Dict[str, str]:
         return student_names
         
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error in batch student names: {str(e)}")
+        logger.warning(f"Error in batch student names: {str(e)}")
         # Fallback: return user IDs as names
         return {user_id: f"Student {user_id[:8]}" for user_id in user_ids}
 
@@ -2266,28 +2229,28 @@ async def _get_student_name(user_id: str) -> str:
                 # Priority: first_name + last_name > first_name only > last_name only > email
                 if profile.get('first_name') and profile.get('last_name') and profile['first_name'].strip() and profile['last_name'].strip():
                     full_name = f"{profile['first_name']} {profile['last_name']}"
-                    print(f"✅ [TEACHER] Found full name for {user_id}: {full_name}")
+                    logger.debug(f"Found full name for {user_id}: {full_name}")
                     return full_name
                 elif profile.get('first_name') and profile['first_name'].strip():
-                    print(f"✅ [TEACHER] Found first name for {user_id}: {profile['first_name']}")
+                    logger.debug(f"Found first name for {user_id}: {profile['first_name']}")
                     return profile['first_name']
                 elif profile.get('last_name') and profile['last_name'].strip():
-                    print(f"✅ [TEACHER] Found last name for {user_id}: {profile['last_name']}")
+                    logger.debug(f"Found last name for {user_id}: {profile['last_name']}")
                     return profile['last_name']
                 elif profile.get('email') and profile['email'].strip():
-                    print(f"⚠️ [TEACHER] Using email as name for {user_id}: {profile['email']}")
+                    logger.warning(f"Using email as name for {user_id}: {profile['email']}")
                     return profile['email']
             
         except Exception as profile_error:
-            print(f"❌ [TEACHER] Profiles table error for {user_id}: {str(profile_error)}")
+            logger.error(f"Profiles table error for {user_id}: {str(profile_error)}")
         
         # Fallback to meaningful display name from progress data
         fallback_name = await _create_fallback_student_name(user_id)
-        print(f"⚠️ [TEACHER] Using fallback name for {user_id}: {fallback_name}")
+        logger.warning(f"Using fallback name for {user_id}: {fallback_name}")
         return fallback_name
             
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student name for {user_id}: {str(e)}")
+        logger.error(f"Error getting student name for {user_id}: {str(e)}")
         return f"Student {user_id[:8]}..."
 
 async def _create_fallback_student_name(user_id: str) -> str:
@@ -2319,7 +2282,7 @@ async def _create_fallback_student_name(user_id: str) -> str:
             return f"Student {short_id}"
             
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error creating fallback name for {user_id}: {str(e)}")
+        logger.warning(f"Error creating fallback name for {user_id}: {str(e)}")
         return f"Student {user_id[:8]}..."
 
 def _get_stage_name(stage_id: int) -> str:
@@ -2350,9 +2313,9 @@ async def get_student_details(
     Get comprehensive details of a particular student by user_id
     This API fetches all available data for the student from various tables
     """
-    print(f"🔄 [TEACHER] GET /teacher/dashboard/student/{user_id} called")
-    print(f"👤 [TEACHER] Authenticated user: {current_user['email']} (Role: {current_user.get('role', 'unknown')})")
-    print(f"🎯 [TEACHER] Requesting details for student: {user_id}")
+    logger.debug(f"GET /teacher/dashboard/student/{user_id} called")
+    logger.debug(f"Authenticated user: {current_user['id']} (Role: {current_user.get('role', 'unknown')})")
+    logger.debug(f"Requesting details for student: {user_id}")
     
     try:
         # Validate UUID format
@@ -2374,7 +2337,6 @@ async def get_student_details(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ [TEACHER] Error in get_student_details: {str(e)}")
         logger.error(f"Error in get_student_details: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -2384,12 +2346,12 @@ async def _get_comprehensive_student_details(user_id: str) -> Optional[Dict[str,
     Get comprehensive student details from all available tables
     """
     try:
-        print(f"🔍 [TEACHER] Fetching comprehensive details for student: {user_id}")
+        logger.debug(f"Fetching comprehensive details for student: {user_id}")
         
         # 1. Basic student information
         basic_info = await _get_student_basic_info(user_id)
         if not basic_info:
-            print(f"❌ [TEACHER] No basic info found for student: {user_id}")
+            logger.error(f"No basic info found for student: {user_id}")
             return None
         
         # 2. Progress overview
@@ -2433,11 +2395,11 @@ async def _get_comprehensive_student_details(user_id: str) -> Optional[Dict[str,
             "last_updated": datetime.now().isoformat()
         }
         
-        print(f"✅ [TEACHER] Comprehensive details compiled for student: {user_id}")
+        logger.debug(f"Comprehensive details compiled for student: {user_id}")
         return comprehensive_data
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting comprehensive student details: {str(e)}")
+        logger.error(f"Error getting comprehensive student details: {str(e)}")
         raise
 
 async def _get_student_basic_info(user_id: str) -> Optional[Dict[str, Any]]:
@@ -2453,7 +2415,7 @@ async def _get_student_basic_info(user_id: str) -> Optional[Dict[str, Any]]:
             
             if profile_result.data and len(profile_result.data) > 0:
                 profile = profile_result.data[0]
-                print(f"✅ [TEACHER] Found profile for {user_id}: {profile}")
+                logger.debug(f"Found profile for {user_id}: {profile}")
                 
                 # Get progress data for activity dates
                 progress_result = supabase.table('ai_tutor_user_progress_summary').select(
@@ -2465,16 +2427,16 @@ async def _get_student_basic_info(user_id: str) -> Optional[Dict[str, Any]]:
                 # Create student name from first_name and last_name
                 if profile.get('first_name') and profile.get('last_name') and profile['first_name'].strip() and profile['last_name'].strip():
                     student_name = f"{profile['first_name']} {profile['last_name']}"
-                    print(f"✅ [TEACHER] Using full name: {student_name}")
+                    logger.debug(f"Using full name: {student_name}")
                 elif profile.get('first_name') and profile['first_name'].strip():
                     student_name = profile['first_name']
-                    print(f"✅ [TEACHER] Using first name only: {student_name}")
+                    logger.debug(f"Using first name only: {student_name}")
                 elif profile.get('last_name') and profile['last_name'].strip():
                     student_name = profile['last_name']
-                    print(f"✅ [TEACHER] Using last name only: {student_name}")
+                    logger.debug(f"Using last name only: {student_name}")
                 else:
                     student_name = profile.get('email', f"Student {user_id[:8]}...")
-                    print(f"⚠️ [TEACHER] Using fallback name: {student_name}")
+                    logger.warning(f"Using fallback name: {student_name}")
 
                 # Handle date formatting safely
                 first_activity = progress_data.get('first_activity_date')
@@ -2493,24 +2455,24 @@ async def _get_student_basic_info(user_id: str) -> Optional[Dict[str, Any]]:
                     "last_activity_date": last_activity_str
                 }
             else:
-                print(f"⚠️ [TEACHER] No profile data found for {user_id}")
+                logger.warning(f"No profile data found for {user_id}")
                 
         except Exception as profile_error:
-            print(f"⚠️ [TEACHER] Profiles table error for {user_id}: {str(profile_error)}")
+            logger.warning(f"Profiles table error for {user_id}: {str(profile_error)}")
         
         # Fallback: get from progress summary only
-        print(f"🔄 [TEACHER] Using fallback method for {user_id}")
+        logger.debug(f"Using fallback method for {user_id}")
         progress_result = supabase.table('ai_tutor_user_progress_summary').select(
             'user_id, first_activity_date, last_activity_date'
         ).eq('user_id', user_id).execute()
         
         if progress_result.data and len(progress_result.data) > 0:
             progress_data = progress_result.data[0]
-            print(f"✅ [TEACHER] Found progress data for {user_id}: {progress_data}")
+            logger.debug(f"Found progress data for {user_id}: {progress_data}")
             
             # Create fallback name
             fallback_name = await _create_fallback_student_name(user_id)
-            print(f"✅ [TEACHER] Created fallback name: {fallback_name}")
+            logger.debug(f"Created fallback name: {fallback_name}")
 
             # Handle date formatting safely for fallback
             first_activity = progress_data.get('first_activity_date')
@@ -2530,12 +2492,12 @@ async def _get_student_basic_info(user_id: str) -> Optional[Dict[str, Any]]:
                 "last_activity_date": last_activity_str
             }
         else:
-            print(f"⚠️ [TEACHER] No progress data found for {user_id}")
+            logger.warning(f"No progress data found for {user_id}")
         
         return None
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student basic info: {str(e)}")
+        logger.error(f"Error getting student basic info: {str(e)}")
         return None
 
 async def _get_single_student_progress_overview(user_id: str) -> Optional[Dict[str, Any]]:
@@ -2563,7 +2525,7 @@ async def _get_single_student_progress_overview(user_id: str) -> Optional[Dict[s
         return None
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student progress overview: {str(e)}")
+        logger.error(f"Error getting student progress overview: {str(e)}")
         return None
 
 async def _get_student_stage_progress(user_id: str) -> List[Dict[str, Any]]:
@@ -2595,7 +2557,7 @@ async def _get_student_stage_progress(user_id: str) -> List[Dict[str, Any]]:
         return stage_progress
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student stage progress: {str(e)}")
+        logger.error(f"Error getting student stage progress: {str(e)}")
         return []
 
 async def _get_student_exercise_progress(user_id: str) -> List[Dict[str, Any]]:
@@ -2625,7 +2587,7 @@ async def _get_student_exercise_progress(user_id: str) -> List[Dict[str, Any]]:
         return exercise_progress
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student exercise progress: {str(e)}")
+        logger.error(f"Error getting student exercise progress: {str(e)}")
         return []
 
 async def _get_student_learning_milestones(user_id: str) -> List[Dict[str, Any]]:
@@ -2649,7 +2611,7 @@ async def _get_student_learning_milestones(user_id: str) -> List[Dict[str, Any]]
         return milestones
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student learning milestones: {str(e)}")
+        logger.error(f"Error getting student learning milestones: {str(e)}")
         return []
 
 async def _get_student_weekly_progress(user_id: str) -> List[Dict[str, Any]]:
@@ -2678,7 +2640,7 @@ async def _get_student_weekly_progress(user_id: str) -> List[Dict[str, Any]]:
         return weekly_progress
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student weekly progress: {str(e)}")
+        logger.error(f"Error getting student weekly progress: {str(e)}")
         return []
 
 async def _get_student_daily_analytics(user_id: str) -> List[Dict[str, Any]]:
@@ -2708,7 +2670,7 @@ async def _get_student_daily_analytics(user_id: str) -> List[Dict[str, Any]]:
         return daily_analytics
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student daily analytics: {str(e)}")
+        logger.error(f"Error getting student daily analytics: {str(e)}")
         return []
 
 async def _get_student_learning_unlocks(user_id: str) -> List[Dict[str, Any]]:
@@ -2733,7 +2695,7 @@ async def _get_student_learning_unlocks(user_id: str) -> List[Dict[str, Any]]:
         return unlocks
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student learning unlocks: {str(e)}")
+        logger.error(f"Error getting student learning unlocks: {str(e)}")
         return []
 
 async def _get_student_topic_progress(user_id: str) -> List[Dict[str, Any]]:
@@ -2762,7 +2724,7 @@ async def _get_student_topic_progress(user_id: str) -> List[Dict[str, Any]]:
         return topic_progress
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student topic progress: {str(e)}")
+        logger.error(f"Error getting student topic progress: {str(e)}")
         return []
 
 async def _get_student_performance_insights(user_id: str) -> Dict[str, Any]:
@@ -2840,7 +2802,7 @@ async def _get_student_performance_insights(user_id: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        print(f"❌ [TEACHER] Error getting student performance insights: {str(e)}")
+        logger.error(f"Error getting student performance insights: {str(e)}")
         return {}
 
 def _identify_strength_areas(user_id: str) -> List[str]:
@@ -2852,7 +2814,7 @@ def _identify_strength_areas(user_id: str) -> List[str]:
         # For now, return basic strengths
         return ["Consistent Learning", "Regular Practice"]
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error identifying strength areas: {str(e)}")
+        logger.warning(f"Error identifying strength areas: {str(e)}")
         return []
 
 def _identify_improvement_areas(user_id: str) -> List[str]:
@@ -2864,7 +2826,7 @@ def _identify_improvement_areas(user_id: str) -> List[str]:
         # For now, return basic improvement areas
         return ["Score Consistency", "Time Management"]
     except Exception as e:
-        print(f"⚠️ [TEACHER] Error identifying improvement areas: {str(e)}")
+        logger.warning(f"Error identifying improvement areas: {str(e)}")
         return []
 
 def _get_exercise_name(stage_id: int, exercise_id: int) -> str:
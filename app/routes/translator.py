@@ -21,13 +21,13 @@ async def speak_urdu_to_english_metadata(file: UploadFile = File(...)):
     audio_bytes = await file.read()
     
     # Step 2: Convert Urdu audio to text
-    urdu_text = stt.transcribe_audio_bytes(audio_bytes)
+    urdu_text = await stt.transcribe_audio_bytes_async(audio_bytes)
     print("🔍 Urdu Text:", urdu_text)
     if not urdu_text.strip():
         raise HTTPException(status_code=400, detail="Failed to transcribe Urdu audio.")
 
     # Step 3: Translate Urdu to English
-    english_translation = translation.translate_urdu_to_english(urdu_text)
+    english_translation = await translation.translate_urdu_to_english_async(urdu_text)
     print("🔍 English Translation:", english_translation)
     if not english_translation.strip():
         raise HTTPException(status_code=400, detail="Failed to translate Urdu text.")
@@ -53,19 +53,19 @@ async def speak_urdu_to_english_audio(file: UploadFile = File(...)):
     audio_bytes = await file.read()
 
     # Step 2: Convert to Urdu text
-    urdu_text = stt.transcribe_audio_bytes(audio_bytes)
+    urdu_text = await stt.transcribe_audio_bytes_async(audio_bytes)
     print("🔍 Urdu Text:", urdu_text)
     if not urdu_text.strip():
         raise HTTPException(status_code=400, detail="Failed to transcribe audio.")
 
     # Step 3: Translate Urdu to English
-    english_translation = translation.translate_urdu_to_english(urdu_text)
+    english_translation = await translation.translate_urdu_to_english_async(urdu_text)
     print("🔍 English Translation:", english_translation)
     if not english_translation.strip():
         raise HTTPException(status_code=400, detail="Failed to translate Urdu.")
 
     # Step 4: Generate English audio
-    english_audio_bytes = tts.synthesize_speech(english_translation)
+    english_audio_bytes = await tts.synthesize_speech(english_translation)
     print("Length of the english audio bytes: ",len(english_audio_bytes))
     if not english_audio_bytes:
         raise HTTPException(status_code=500, detail="Generated audio is empty")
@@ -114,14 +114,12 @@ async def get_english_feedback(
         if not audio_bytes:
             raise HTTPException(status_code=400, detail="Decoded audio for feedback is empty.")
 
-        # Step 2: Transcribe using Whisper
-        # Assuming whisper_scoring.transcribe_with_whisper expects audio_bytes
-        user_text = whisper_scoring.transcribe_with_whisper(audio_bytes)
+        # Step 2 + 3: Transcribe once with local Whisper (batched with concurrent requests)
+        # and score pronunciation by word alignment against the expected text
+        scoring = await whisper_scoring.whisper_engine.score(audio_bytes, expected_text)
+        user_text = scoring["transcript"]
+        score = scoring["score"]
         print(f"Whisper transcription for feedback: {user_text}")
-
-        # Step 3: Pronunciation accuracy score
-        # Assuming whisper_scoring.score_pronunciation expects audio_bytes and expected_text
-        score = whisper_scoring.score_pronunciation(audio_bytes, expected_text)
         print(f"Pronunciation score: {score}")
 
         # Step 4: GPT-4 feedback on fluency, grammar, etc.
@@ -172,7 +170,7 @@ async def transcribe_audio_direct(
         if not audio_bytes:
             raise HTTPException(status_code=400, detail="Decoded audio is empty.")
 
-        transcribed_text = stt.transcribe_audio_bytes(audio_bytes, language_code="en-US") # Ensure correct language_code for English
+        transcribed_text = await stt.transcribe_audio_bytes_async(audio_bytes, language_code="en-US") # Ensure correct language_code for English
 
         if not transcribed_text.strip():
             raise HTTPException(status_code=400, detail="Audio transcribed to empty text.")
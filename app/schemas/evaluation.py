@@ -0,0 +1,390 @@
+# app/schemas/evaluation.py
+# Structured outputs of the GPT feedback evaluators (see app/services/structured_output.py)
+
+from pydantic import BaseModel, BeforeValidator
+from typing import Annotated, Any, List, Literal
+
+
+def _clamp_score(value: Any) -> Any:
+    """Round and clamp numeric scores to 0-100; anything else is left to validation."""
+    if isinstance(value, str):
+        try:
+            value = float(value.strip().rstrip("%"))
+        except ValueError:
+            return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return min(100, max(0, int(round(value))))
+    return value
+
+
+Score = Annotated[int, BeforeValidator(_clamp_score)]
+
+
+class BaseEvaluation(BaseModel):
+    feedback: str
+    score: Score
+    is_correct: bool
+    urdu_used: bool
+    completed: bool
+
+
+# Stage 1 - Exercise 1 (Repeat After Me)
+class RepeatAfterMeEvaluation(BaseEvaluation):
+    pass
+
+
+# Stage 1 - Exercise 2 (Quick Response)
+class QuickResponseEvaluation(BaseEvaluation):
+    suggested_improvement: str
+
+
+# Stage 1 - Exercise 3 (Listen and Reply)
+class ListenAndReplyEvaluation(QuickResponseEvaluation):
+    keyword_matches: int
+    total_keywords: int
+
+
+# Stage 2 - Exercise 1 (Daily Routine Narration)
+class DailyRoutineNarrationEvaluation(ListenAndReplyEvaluation):
+    fluency_score: Score
+    grammar_score: Score
+
+
+# Stage 2 - Exercise 2 (Quick Answer)
+class QuickAnswerEvaluation(QuickResponseEvaluation):
+    answer_accuracy: Score
+    grammar_score: Score
+    fluency_score: Score
+
+
+# Stage 2 - Exercise 3 (Roleplay Simulation)
+class RoleplayEvaluation(BaseModel):
+    overall_score: Score
+    is_correct: bool
+    completed: bool
+    conversation_flow_score: Score
+    keyword_usage_score: Score
+    grammar_fluency_score: Score
+    cultural_appropriateness_score: Score
+    engagement_score: Score
+    keyword_matches: List[str]
+    total_keywords_expected: int
+    keywords_used_count: int
+    grammar_errors: List[str]
+    fluency_issues: List[str]
+    strengths: List[str]
+    areas_for_improvement: List[str]
+    suggested_improvement: str
+    conversation_quality: Literal["excellent", "good", "fair", "needs_improvement"]
+    learning_progress: Literal["significant", "moderate", "minimal", "none"]
+    recommendations: List[str]
+
+
+# Stage 3 - Exercise 1 (Storytelling)
+class StorytellingFeedback(BaseModel):
+    past_tense_usage: str
+    narrative_structure: str
+    keyword_integration: str
+    fluency_coherence: str
+    descriptive_language: str
+
+
+class StorytellingEvaluation(BaseModel):
+    score: Score
+    is_correct: bool
+    completed: bool
+    keyword_matches: int
+    total_keywords: int
+    fluency_score: Score
+    grammar_score: Score
+    detailed_feedback: StorytellingFeedback
+    suggested_improvement: str
+    strengths: List[str]
+    areas_for_improvement: List[str]
+
+
+# Stage 3 - Exercise 2 (Group Dialogue)
+class GroupDialogueFeedback(BaseModel):
+    relevance_feedback: str
+    expressions_feedback: str
+    fluency_feedback: str
+    timing_feedback: str
+    decision_language_feedback: str
+
+
+class GroupDialogueEvaluation(BaseModel):
+    overall_score: Score
+    relevance_score: int
+    expressions_score: int
+    fluency_score: int
+    timing_score: int
+    decision_language_score: int
+    keyword_matches: List[str]
+    total_keywords: int
+    matched_keywords_count: int
+    response_type_detected: str
+    detailed_feedback: GroupDialogueFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 3 - Exercise 3 (Problem-Solving Simulation)
+class ProblemSolvingFeedback(BaseModel):
+    clarity_feedback: str
+    politeness_feedback: str
+    request_structure_feedback: str
+    specificity_feedback: str
+    solution_orientation_feedback: str
+
+
+class ProblemSolvingEvaluation(BaseModel):
+    overall_score: Score
+    clarity_score: int
+    politeness_score: int
+    request_structure_score: int
+    specificity_score: int
+    solution_orientation_score: int
+    keyword_matches: List[str]
+    total_keywords: int
+    matched_keywords_count: int
+    response_type_detected: Literal["apology", "request", "complaint", "notification"]
+    detailed_feedback: ProblemSolvingFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 4 - Exercise 1 (Abstract Topic Monologue)
+class AbstractTopicFeedback(BaseModel):
+    opinion_clarity_feedback: str
+    connector_feedback: str
+    fluency_feedback: str
+    grammar_feedback: str
+    lexical_feedback: str
+    structure_feedback: str
+
+
+class AbstractTopicEvaluation(BaseModel):
+    overall_score: Score
+    opinion_clarity_score: int
+    connector_usage_score: int
+    fluency_score: int
+    grammar_score: int
+    lexical_richness_score: int
+    connector_matches: List[str]
+    vocabulary_matches: List[str]
+    total_connectors: int
+    matched_connectors_count: int
+    total_vocabulary: int
+    matched_vocabulary_count: int
+    response_type_detected: Literal["opinion_essay", "balanced_argument", "personal_reflection"]
+    detailed_feedback: AbstractTopicFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 4 - Exercise 2 (Mock Interview)
+class MockInterviewFeedback(BaseModel):
+    relevance_feedback: str
+    confidence_feedback: str
+    grammar_feedback: str
+    vocabulary_feedback: str
+    structure_feedback: str
+
+
+class MockInterviewEvaluation(BaseModel):
+    overall_score: Score
+    answer_relevance_score: int
+    confidence_tone_score: int
+    grammar_fluency_score: int
+    interview_vocabulary_score: int
+    keyword_matches: List[str]
+    vocabulary_matches: List[str]
+    total_keywords: int
+    matched_keywords_count: int
+    total_vocabulary: int
+    matched_vocabulary_count: int
+    response_type_detected: Literal["self_introduction", "motivation", "strengths_weaknesses",
+                                    "problem_solving", "career_planning"]
+    detailed_feedback: MockInterviewFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 4 - Exercise 3 (News Summary)
+class NewsSummaryFeedback(BaseModel):
+    main_points_feedback: str
+    grammar_feedback: str
+    paraphrasing_feedback: str
+    tone_feedback: str
+
+
+class NewsSummaryEvaluation(BaseModel):
+    overall_score: Score
+    main_points_coverage_score: int
+    grammar_structure_score: int
+    paraphrasing_skills_score: int
+    neutral_tone_score: int
+    keyword_matches: List[str]
+    total_keywords: int
+    matched_keywords_count: int
+    summary_type_detected: Literal["summary", "paraphrase", "copy"]
+    detailed_feedback: NewsSummaryFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 5 - Exercise 1 (Critical Thinking Dialogue)
+class CriticalThinkingFeedback(BaseModel):
+    argument_structure_feedback: str
+    critical_thinking_feedback: str
+    vocabulary_feedback: str
+    fluency_feedback: str
+    discourse_feedback: str
+
+
+class CriticalThinkingEvaluation(BaseModel):
+    overall_score: Score
+    argument_structure_score: int
+    critical_thinking_score: int
+    vocabulary_range_score: int
+    fluency_grammar_score: int
+    discourse_markers_score: int
+    keyword_matches: List[str]
+    total_keywords: int
+    matched_keywords_count: int
+    vocabulary_matches: List[str]
+    total_vocabulary: int
+    matched_vocabulary_count: int
+    argument_type_detected: Literal["balanced", "one-sided", "undeveloped"]
+    detailed_feedback: CriticalThinkingFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 5 - Exercise 2 (Academic Presentation)
+class AcademicPresentationFeedback(BaseModel):
+    argument_structure_feedback: str
+    evidence_usage_feedback: str
+    academic_tone_feedback: str
+    fluency_feedback: str
+    vocabulary_feedback: str
+
+
+class AcademicPresentationEvaluation(BaseModel):
+    overall_score: Score
+    argument_structure_score: int
+    evidence_usage_score: int
+    academic_tone_score: int
+    fluency_pacing_score: int
+    vocabulary_range_score: int
+    keyword_matches: List[str]
+    matched_keywords_count: int
+    vocabulary_matches: List[str]
+    matched_vocabulary_count: int
+    structure_followed: bool
+    evidence_provided: bool
+    academic_tone_maintained: bool
+    detailed_feedback: AcademicPresentationFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 5 - Exercise 3 (In-Depth Interview)
+class InDepthInterviewFeedback(BaseModel):
+    star_method_feedback: str
+    professional_communication_feedback: str
+    vocabulary_feedback: str
+    fluency_feedback: str
+    content_feedback: str
+
+
+class InDepthInterviewEvaluation(BaseModel):
+    overall_score: Score
+    star_method_score: int
+    professional_communication_score: int
+    vocabulary_sophistication_score: int
+    fluency_articulation_score: int
+    content_relevance_score: int
+    keyword_matches: List[str]
+    matched_keywords_count: int
+    vocabulary_matches: List[str]
+    matched_vocabulary_count: int
+    star_structure_followed: bool
+    professional_tone_maintained: bool
+    relevant_examples_provided: bool
+    detailed_feedback: InDepthInterviewFeedback
+    suggested_improvements: List[str]
+    encouragement: str
+    next_steps: str
+
+
+# Stage 6 - Exercise 1 (Spontaneous Speech)
+class SpontaneousSpeechEvaluation(BaseModel):
+    spontaneous_fluency_score: Score
+    depth_of_thought_score: Score
+    advanced_vocabulary_score: Score
+    structural_coherence_score: Score
+    keyword_matches: int
+    total_keywords: int
+    fluency_analysis: str
+    thought_analysis: str
+    vocabulary_analysis: str
+    coherence_analysis: str
+    strengths: List[str]
+    areas_for_improvement: List[str]
+    suggested_improvement: str
+
+
+# Stage 6 - Exercise 2 (Sensitive Scenario Roleplay)
+class SensitiveScenarioEvaluation(BaseModel):
+    tone_control_score: Score
+    empathy_authority_balance_score: Score
+    clarity_communication_score: Score
+    conflict_resolution_score: Score
+    keyword_matches: int
+    total_keywords: int
+    tone_analysis: str
+    empathy_authority_analysis: str
+    clarity_analysis: str
+    conflict_resolution_analysis: str
+    strengths: List[str]
+    areas_for_improvement: List[str]
+    suggested_improvement: str
+
+
+# Stage 6 - Exercise 3 (Critical Opinion Builder)
+class CriticalOpinionFeedback(BaseModel):
+    argument_structure: str
+    logical_flow: str
+    academic_expressions: str
+    critical_thinking: str
+    vocabulary_usage: str
+
+
+class ArgumentStructureAnalysis(BaseModel):
+    thesis_present: bool
+    supporting_arguments: int
+    counterpoint_addressed: bool
+    conclusion_present: bool
+
+
+class CriticalOpinionEvaluation(BaseModel):
+    score: Score
+    is_correct: bool
+    completed: bool
+    keyword_matches: int
+    total_keywords: int
+    academic_expressions_used: int
+    total_academic_expressions: int
+    detailed_feedback: CriticalOpinionFeedback
+    suggested_improvement: str
+    strengths: List[str]
+    areas_for_improvement: List[str]
+    structure_analysis: ArgumentStructureAnalysis
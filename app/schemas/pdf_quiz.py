@@ -24,4 +24,16 @@ class QuizResponse(BaseModel):
     questions: List[QuizItem]
 
 class PDFUrlRequest(BaseModel):
-    url: str
\ No newline at end of file
+    url: str
+
+class QuizJobResponse(BaseModel):
+    job_id: str
+    status: str
+
+class QuizJobStatusResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    chunks_total: int = 0
+    chunks_done: int = 0
+    result: Optional[QuizResponse] = None
+    error: Optional[str] = None
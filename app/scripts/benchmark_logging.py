@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Logging Overhead Benchmark
+Runs simulated websocket turns concurrently on one event loop, each emitting
+what a realtime turn logs (turn start/end, a GPT output summary, one record
+per TTS audio chunk), and reports turn latency percentiles for:
+- print: the old synchronous print() per event
+- off: structured logger with logging disabled
+- info: structured logger at INFO (per-chunk debug records skipped)
+- debug: structured logger at DEBUG (per-chunk records throttled)
+
+The sink simulates the stdout consumer (container log driver, shipper);
+--sink-delay-ms makes every write stall that long, as when the pipe is full.
+
+Usage: python benchmark_logging.py [--turns=200] [--concurrency=50] [--chunks=40] [--sink-delay-ms=0.2]
+"""
+
+import os
+import io
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from statistics import quantiles
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.utils.logging_config import configure_logging, get_logger, logging_status, shutdown_logging
+
+GPT_OUTPUT = '{"conversation_text": "' + "Great job! Let's keep practicing. " * 30 + '"}'
+
+
+class SlowSink(io.TextIOBase):
+    """Discards output, blocking the writer for delay seconds per write"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return len(text)
+
+
+async def print_turn(turn_id: int, chunks: int, sink: SlowSink) -> float:
+    started = time.perf_counter()
+    print(f"🤖 [ENGLISH_ONLY] Executing AI analysis for turn {turn_id}", file=sink)
+    await asyncio.sleep(0)
+    print(f"✅ [ENGLISH_ONLY] GPT Raw Output: {GPT_OUTPUT}", file=sink)
+    for chunk in range(chunks):
+        print(f"🎵 Received audio from ElevenLabs: {3200 + chunk} bytes PCM", file=sink)
+        await asyncio.sleep(0)
+    print(f"✅ [ENGLISH_ONLY] Turn {turn_id} done", file=sink)
+    return time.perf_counter() - started
+
+
+async def structured_turn(turn_id: int, chunks: int, log) -> float:
+    started = time.perf_counter()
+    log.info("gpt.analysis.start", turn=turn_id)
+    await asyncio.sleep(0)
+    log.debug("gpt.analysis.output", turn=turn_id, output_chars=len(GPT_OUTPUT))
+    for chunk in range(chunks):
+        log.throttled(logging.DEBUG, "elevenlabs.stream.audio_chunk", bytes=3200 + chunk)
+        await asyncio.sleep(0)
+    log.info("ws.turn.done", turn=turn_id)
+    return time.perf_counter() - started
+
+
+async def run_mode(mode: str, args) -> dict:
+    sink = SlowSink(args.sink_delay_ms / 1000)
+    log = get_logger(f"benchmark.{mode}")
+    if mode != "print":
+        level = {"off": "CRITICAL", "info": "INFO", "debug": "DEBUG"}[mode]
+        configure_logging(level=level, stream=sink)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(turn_id: int) -> float:
+        async with semaphore:
+            if mode == "print":
+                return await print_turn(turn_id, args.chunks, sink)
+            return await structured_turn(turn_id, args.chunks, log)
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(one(i) for i in range(args.turns)))
+    elapsed = time.perf_counter() - started
+    dropped = logging_status().get("dropped", 0)
+    if mode != "print":
+        shutdown_logging()  # drain the queue before the next mode
+    p50, p95, p99 = (quantiles(latencies, n=100)[i] * 1000 for i in (49, 94, 98))
+    return {"mode": mode, "p50": p50, "p95": p95, "p99": p99, "elapsed": elapsed,
+            "writes": sink.writes, "dropped": dropped}
+
+
+async def run(args):
+    print(f"🚀 {args.turns} turns, {args.concurrency} concurrent, {args.chunks} audio chunks per turn, "
+          f"sink delay {args.sink_delay_ms} ms/write...")
+    await run_mode("off", argparse.Namespace(**{**vars(args), "turns": 10}))  # warm-up
+    results = [await run_mode(mode, args) for mode in ("print", "off", "info", "debug")]
+
+    print(f"\n{'mode':<8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'total s':>10}{'writes':>9}{'dropped':>9}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['p50']:>10.2f}{r['p95']:>10.2f}{r['p99']:>10.2f}{r['elapsed']:>10.2f}"
+              f"{r['writes']:>9}{r['dropped']:>9}")
+
+    baseline = results[0]["p95"]
+    for r in results[1:]:
+        print(f"   {r['mode']}: p95 {r['p95']:.2f} ms vs print {baseline:.2f} ms "
+              f"({(1 - r['p95'] / baseline) * 100 if baseline else 0:.0f}% lower)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark turn latency with logging on and off")
+    parser.add_argument("--turns", type=int, default=200, help="Simulated turns per mode")
+    parser.add_argument("--concurrency", type=int, default=50, help="Turns in flight at once")
+    parser.add_argument("--chunks", type=int, default=40, help="TTS audio chunks per turn")
+    parser.add_argument("--sink-delay-ms", type=float, default=0.2, help="Stall per write to the log sink")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Memory Cache Benchmark
+Measures get/set throughput of the bounded in-process cache (used as the
+Redis fallback and near-cache) against a plain dict
+
+Runs a warm read-heavy mix and a write-heavy run under eviction pressure
+(more distinct keys than the cache may hold), reporting ops/sec and the
+cache's own hit/eviction statistics.
+
+Usage: python benchmark_memory_cache.py [--operations=200000] [--max-entries=10000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.utils.bounded_cache import BoundedTTLCache
+
+VALUE = '{"feedback": "Great job!", "score": 85, "is_correct": true}'
+
+
+def ops_per_sec(fn, operations: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return operations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bounded memory cache")
+    parser.add_argument("--operations", type=int, default=200000)
+    parser.add_argument("--max-entries", type=int, default=10000)
+    args = parser.parse_args()
+
+    n, size = args.operations, args.max_entries
+    rng = random.Random(42)
+    hot_keys = [f"key:{rng.randrange(size)}" for _ in range(n)]
+    wide_keys = [f"key:{rng.randrange(size * 5)}" for _ in range(n)]
+
+    plain = {}
+    cache = BoundedTTLCache(max_entries=size, default_ttl=300)
+
+    def fill(store_set):
+        for i in range(size):
+            store_set(f"key:{i}", VALUE)
+
+    def plain_get():
+        for key in hot_keys:
+            plain.get(key)
+
+    def cache_get():
+        for key in hot_keys:
+            cache.get(key)
+
+    def plain_set():
+        for key in wide_keys:
+            plain[key] = VALUE
+
+    def cache_set():
+        for key in wide_keys:
+            cache.set(key, VALUE)
+
+    fill(plain.__setitem__)
+    fill(cache.set)
+
+    print(f"{'operation':28} {'dict ops/s':>14} {'bounded ops/s':>14}")
+    print(f"{'get (warm, in-range keys)':28} {ops_per_sec(plain_get, n):14,.0f} {ops_per_sec(cache_get, n):14,.0f}")
+    print(f"{'set (5x key space, evicting)':28} {ops_per_sec(plain_set, n):14,.0f} {ops_per_sec(cache_set, n):14,.0f}")
+    print(f"\nPlain dict grew to {len(plain):,} keys; bounded cache holds {len(cache):,}")
+    print(f"Bounded cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Prompt Build Benchmark
+Measures prompt-build time and tokens sent per evaluation for the prompt
+registry versus the f-string prompts the evaluators used to build per call
+
+Reports, per template: mean build time (legacy f-string vs compiled registry),
+total prompt tokens, how many of them sit in the static system prefix, and
+the share of the prompt that can be cached before the first learner input
+appears (legacy vs registry). Templates whose legacy builder is not kept here
+show "-" in the legacy columns. Either way a build costs microseconds next to
+a model call; what the registry changes is the cacheable share.
+Tokens are counted with tiktoken when available, otherwise estimated (chars / 4).
+
+Usage: python benchmark_prompt_build.py [--iterations=2000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.schemas.settings import AISettings
+from app.schemas.safety import AISafetyEthicsSettings
+from app.services import feedback
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("o200k_base")
+except Exception:
+    # Not installed, or the encoding file can't be downloaded (offline)
+    _encoding = None
+
+# Substituted for every learner input to find where the per-call part of a prompt starts
+SENTINEL = "␟LEARNER_INPUT␟"
+
+
+def count_tokens(text: str) -> int:
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4)
+
+
+SAMPLE_INPUTS = {
+    "english_only": {"user_text": "Main vocabulary seekhna chahta hoon", "conversation_stage": "vocabulary_learning", "topic": "Travel"},
+    (1, 1): {"expected_phrase": "Could you please help me?", "user_response": "could you help me"},
+    (1, 2): {"expected_answers": ["I am fine, thank you.", "I'm good."], "user_response": "I am fine"},
+    (1, 3): {"ai_prompt": "What do you do on weekends?", "expected_keywords": ["weekend", "play", "family"], "user_response": "I play cricket with my family"},
+    (2, 1): {"phrase": "Describe your morning", "example": "I wake up at 7.", "expected_keywords": ["wake", "breakfast"], "user_response": "I wake up and eat breakfast"},
+    (2, 2): {"question": "Where do you live?", "question_urdu": "آپ کہاں رہتے ہیں؟", "expected_answers": ["I live in Lahore."], "user_response": "I live in Karachi"},
+    (2, 3): {"scenario_context": "Ordering food at a restaurant", "ai_character": "Waiter", "expected_keywords": ["menu", "order", "bill"],
+             "conversation_text": "AI (Waiter): Welcome! Here is the menu.\nUser: I would like to order biryani, please."},
+    (3, 1): {"prompt": "Tell me about a memorable trip.", "user_response": "Last year I went to Murree with my family and it was snowing.",
+             "model_answer": "Last summer I visited Hunza with my friends.", "expected_keywords": ["went", "visited", "felt"]},
+    (3, 2): {"conversation_context": "**Initial Prompt:** Where should we go for the class trip?\n\n**Ali:** I think the museum is best.",
+             "user_response": "I agree with Ali, the museum sounds interesting.", "expected_types": ["agreement"], "all_keywords": ["agree", "think"]},
+    (3, 3): {"problem_description": "Your hotel room is too noisy.", "context": "Hotel reception", "user_response": "Excuse me, could I change my room?",
+             "expected_keywords": "room, noisy, change", "polite_phrases": "Excuse me, Could you please", "sample_responses": "Could I move to a quieter room?"},
+    (4, 1): {"topic": "Is social media good for society?", "user_response": "Although social media connects people, it also spreads misinformation.",
+             "key_connectors": ["however", "although"], "vocabulary_focus": ["misinformation", "connectivity"], "model_response": "Social media has both benefits and drawbacks."},
+    (4, 2): {"question": "Tell me about yourself.", "user_response": "I am a software engineer with three years of experience.",
+             "expected_keywords": ["experience", "skills"], "vocabulary_focus": ["collaborate", "initiative"], "model_response": "I am a motivated professional."},
+    (4, 3): {"news_title": "City opens new metro line", "summary_text": "The city opened a new metro line on Monday, cutting travel times.",
+             "user_response": "A new metro line opened and travel is faster now.", "model_summary": "A new metro line opened on Monday.",
+             "expected_keywords": "metro, opened", "vocabulary_focus": "commute, infrastructure"},
+    (5, 1): {"topic": "Should AI make medical decisions?", "ai_position": "AI should assist, not decide.", "user_response": "I believe AI can support doctors but not replace them.",
+             "model_response": "While AI offers precision, accountability remains human.", "expected_keywords": "accountability, precision", "vocabulary_focus": "nuanced, ethical"},
+    (5, 2): {"topic": "Renewable energy in Pakistan", "user_response": "Today I will argue that solar power is essential for Pakistan.",
+             "expected_keywords": ["solar", "sustainable"], "expected_structure": "Introduction, evidence, conclusion",
+             "vocabulary_focus": ["infrastructure", "investment"], "model_response": "Renewable energy offers Pakistan a path to energy security."},
+    (5, 3): {"question": "Describe a time you led a team.", "user_response": "In my last job I led a team of five to launch an app.",
+             "expected_keywords": ["led", "result"], "vocabulary_focus": ["delegated", "stakeholders"], "expected_structure": "STAR",
+             "model_answer": "In 2022, I led a project team that delivered ahead of schedule."},
+    (6, 1): {"topic_text": "The role of tradition in modern life", "user_text": "Tradition anchors identity, yet it must evolve.",
+             "expected_keywords": "identity, evolve", "model_response": "Traditions provide continuity while adapting to change.",
+             "spontaneous_fluency_weight": 30, "depth_of_thought_weight": 25, "advanced_vocabulary_weight": 25, "structural_coherence_weight": 20},
+    (6, 2): {"scenario_text": "A colleague missed a deadline again.", "user_text": "I understand things are busy, but we need a plan.",
+             "expected_keywords": "understand, plan", "model_response": "I appreciate your workload; let's agree on a realistic timeline.",
+             "tone_control_weight": 30, "empathy_authority_balance_weight": 25, "clarity_communication_weight": 25, "conflict_resolution_weight": 20},
+    (6, 3): {"topic": "Should university education be free?", "user_response": "Free education promotes equity; however, funding is a concern.",
+             "model_response": "Tuition-free universities widen access but strain budgets.", "expected_structure": "Thesis, arguments, counterpoint, conclusion",
+             "expected_keywords": ["equity", "funding"], "vocabulary_focus": ["accessibility"], "academic_expressions": ["On the other hand", "It could be argued"]},
+}
+
+
+# --- Legacy builders: the per-call f-string prompts, verbatim from the evaluators before the registry ---
+
+def legacy_ex1_stage1(expected_phrase, user_response):
+    prompt = f"""
+You are an expert English evaluator for a language learning app.
+
+Your task is to compare the student's response with the expected phrase and return feedback in JSON format only.
+
+📥 Inputs:
+- Expected: "{expected_phrase}"
+- Student: "{user_response}"
+
+🎯 Evaluate on:
+- Accuracy (match in meaning/form)
+- Grammar & fluency
+- Relevance
+
+🎯 Output JSON format:
+{{
+  "feedback": "Constructive 1-line feedback",
+  "score": integer (0–100),
+  "is_correct": true if score >= 80 else false,
+  "urdu_used": false,
+  "completed": true if score >= 80 else false
+}}
+
+📌 Rules:
+- Respond ONLY with valid JSON (no commentary or explanation).
+- Score ≥ 80 → is_correct: true, completed: true
+- Feedback must be helpful and 1 line only.
+"""
+    return [{"role": "user", "content": prompt}]
+
+
+def legacy_ex3_stage2(scenario_context, ai_character, expected_keywords, conversation_text):
+    evaluation_prompt = f"""
+You are an expert English language tutor evaluating a roleplay simulation conversation.
+The student is practicing English through a realistic scenario: {scenario_context}
+
+CONVERSATION HISTORY:
+{conversation_text}
+
+EVALUATION CRITERIA:
+1. **Conversation Flow**: Natural dialogue progression, appropriate responses
+2. **Keyword Usage**: Student should use expected keywords: {', '.join(expected_keywords)}
+3. **Grammar & Fluency**: Correct sentence structure, natural expression
+4. **Cultural Appropriateness**: Responses fit the scenario context
+5. **Learning Engagement**: Active participation, meaningful interaction
+
+EXPECTED KEYWORDS: {expected_keywords}
+AI CHARACTER: {ai_character}
+SCENARIO: {scenario_context}
+
+Please provide a detailed evaluation in the following JSON format:
+{{
+    "overall_score": <score_0_100>,
+    "is_correct": <true_if_score_above_70>,
+    "completed": <true_if_conversation_has_natural_ending>,
+    "conversation_flow_score": <score_0_100>,
+    "keyword_usage_score": <score_0_100>,
+    "grammar_fluency_score": <score_0_100>,
+    "cultural_appropriateness_score": <score_0_100>,
+    "engagement_score": <score_0_100>,
+    "keyword_matches": <list_of_used_keywords>,
+    "total_keywords_expected": <number>,
+    "keywords_used_count": <number>,
+    "grammar_errors": <list_of_grammar_issues>,
+    "fluency_issues": <list_of_fluency_problems>,
+    "strengths": <list_of_positive_aspects>,
+    "areas_for_improvement": <list_of_improvement_suggestions>,
+    "suggested_improvement": <specific_improvement_advice>,
+    "conversation_quality": <"excellent"|"good"|"fair"|"needs_improvement">,
+    "learning_progress": <"significant"|"moderate"|"minimal"|"none">,
+    "recommendations": <list_of_next_steps>
+}}
+
+Focus on:
+- Natural conversation flow and appropriate responses
+- Usage of expected keywords in context
+- Grammar accuracy and fluency
+- Cultural appropriateness for the scenario
+- Overall learning engagement and progress
+"""
+    return [
+        {"role": "system", "content": "You are an expert English language tutor specializing in roleplay simulations and conversation evaluation. Provide detailed, constructive feedback in the exact JSON format requested."},
+        {"role": "user", "content": evaluation_prompt},
+    ]
+
+
+def legacy_ex1_stage3(prompt, user_response, model_answer, expected_keywords):
+    evaluation_prompt = f"""
+You are an expert English language tutor evaluating a student's storytelling response. The student is learning to tell personal stories in English.
+
+**STUDENT'S PROMPT:** {prompt}
+**STUDENT'S RESPONSE:** "{user_response}"
+**MODEL ANSWER FOR REFERENCE:** "{model_answer}"
+**EXPECTED KEYWORDS TO INCLUDE:** {expected_keywords}
+
+**EVALUATION CRITERIA:**
+1. **Past Tense Usage (25 points):** Check if the student correctly uses past tense verbs (was, were, had, went, felt, etc.)
+2. **Narrative Structure (25 points):** Evaluate if the story has a clear beginning, middle, and end with proper transitions
+3. **Keyword Integration (20 points):** Assess how well the student incorporates the expected keywords naturally
+4. **Fluency & Coherence (20 points):** Check for smooth flow, logical progression, and clear expression
+5. **Descriptive Language (10 points):** Evaluate use of descriptive words and emotional expression
+
+**SCORING GUIDELINES:**
+- 90-100: Excellent storytelling with all criteria met
+- 80-89: Very good with minor issues
+- 70-79: Good with some areas for improvement
+- 60-69: Satisfactory but needs work
+- Below 60: Needs significant improvement
+
+**TASK:** Provide a comprehensive evaluation with specific feedback and suggestions for improvement.
+
+**REQUIRED JSON OUTPUT FORMAT:**
+{{
+    "score": <number between 0-100>,
+    "is_correct": <boolean - true if score >= 35>,
+    "completed": <boolean - true if score >= 35>,
+    "keyword_matches": <number of expected keywords found>,
+    "total_keywords": <total number of expected keywords>,
+    "fluency_score": <number between 0-100>,
+    "grammar_score": <number between 0-100>,
+    "detailed_feedback": {{
+        "past_tense_usage": "<specific feedback on past tense usage>",
+        "narrative_structure": "<feedback on story structure and flow>",
+        "keyword_integration": "<feedback on keyword usage>",
+        "fluency_coherence": "<feedback on overall fluency>",
+        "descriptive_language": "<feedback on descriptive elements>"
+    }},
+    "suggested_improvement": "<specific suggestions for improvement>",
+    "strengths": ["<list of strengths in the response>"],
+    "areas_for_improvement": ["<list of areas that need work>"]
+}}
+"""
+    return [
+        {"role": "system", "content": "You are an expert English language tutor specializing in storytelling and narrative skills. Provide detailed, constructive feedback in JSON format."},
+        {"role": "user", "content": evaluation_prompt},
+    ]
+
+
+LEGACY_BUILDERS = {
+    (1, 1): legacy_ex1_stage1,
+    (2, 3): legacy_ex3_stage2,
+    (3, 1): legacy_ex1_stage3,
+}
+
+
+def time_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def cacheable_share(build, fields: dict) -> float:
+    """Share of the prompt's tokens before the first learner input, i.e. what a provider can cache"""
+    sentinel_fields = {name: [SENTINEL] if isinstance(value, list) else SENTINEL for name, value in fields.items()}
+    text = "\n".join(message["content"] for message in build(**sentinel_fields))
+    full = "\n".join(message["content"] for message in build(**fields))
+    return count_tokens(text[:text.find(SENTINEL)]) / count_tokens(full)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt building")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    settings, safety = AISettings(), AISafetyEthicsSettings()
+    registry = feedback.prompt_registry
+    rows = []
+
+    stage = "vocabulary_learning"
+    fields = SAMPLE_INPUTS["english_only"]
+    task = feedback.ENGLISH_ONLY_BASE_INSTRUCTIONS + "\n" + feedback.ENGLISH_ONLY_STAGE_TASKS[stage]
+
+    def legacy_english_only(**key_fields):
+        # Full rebuild per message: stage prompt + settings + safety + learner text
+        prompt = task + feedback.ENGLISH_ONLY_LEARNER_CONTEXT.format(**key_fields)
+        return [{"role": "system", "content": feedback._decorate_with_tutor_settings(prompt, settings, safety)}]
+
+    def compiled_english_only(**key_fields):
+        return registry.get(stage, "english_only", settings, safety).messages(**key_fields)
+
+    rows.append(("english_only/" + stage, legacy_english_only, compiled_english_only,
+                 registry.get(stage, "english_only", settings, safety), fields))
+
+    for key in [k for k in SAMPLE_INPUTS if isinstance(k, tuple)]:
+        def compiled_call(key=key, **key_fields):
+            return registry.get(*key).messages(**key_fields)
+
+        rows.append((f"stage{key[0]}/ex{key[1]}", LEGACY_BUILDERS.get(key), compiled_call,
+                     registry.get(*key), SAMPLE_INPUTS[key]))
+
+    print(f"{'template':32} {'legacy µs':>10} {'compiled µs':>12} {'tokens':>7} {'static':>7} "
+          f"{'legacy cacheable':>17} {'cacheable':>10}")
+    for name, legacy_fn, compiled_fn, compiled, key_fields in rows:
+        compiled_us = time_call(lambda: compiled_fn(**key_fields), args.iterations)
+        static_tokens = count_tokens(compiled.system_prompt)
+        total_tokens = static_tokens + count_tokens(compiled.render_suffix(**key_fields))
+        cacheable = cacheable_share(compiled_fn, key_fields)
+        if legacy_fn is None:
+            legacy_us, legacy_cacheable = "-", "-"
+        else:
+            legacy_us = f"{time_call(lambda: legacy_fn(**key_fields), args.iterations):.1f}"
+            legacy_cacheable = f"{cacheable_share(legacy_fn, key_fields):.0%}"
+        print(f"{name:32} {legacy_us:>10} {compiled_us:12.1f} {total_tokens:7d} {static_tokens:7d} "
+              f"{legacy_cacheable:>17} {cacheable:10.0%}")
+
+    print(f"\nRegistry stats: {registry.stats}")
+    print("Note: providers only cache prefixes above a minimum length (1024 tokens for OpenAI).")
+
+
+if __name__ == "__main__":
+    main()
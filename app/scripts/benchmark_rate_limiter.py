@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Load Benchmark
+Drives the GCRA rate limiter with a mix of well-behaved clients and abusive
+ones hammering the same limit, concurrently, and reports decision
+throughput, check latency percentiles, how much abuse was shed by the local
+pre-check (no Redis round trip) and whether any well-behaved client was
+wrongly limited
+
+Uses the Redis configured in the environment (REDIS_HOST, ...). With
+--local-only, or when Redis is unreachable, only the in-process buckets
+decide.
+
+Usage: python benchmark_rate_limiter.py [--clients=200] [--abusers=20] [--duration=10] [--local-only]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from statistics import quantiles
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.middleware.rate_limiter import RateLimitConfig, RateLimiter
+from app.redis_client import AsyncRedis, CircuitBreaker
+
+LIMIT_TYPE = "ws_turn"
+
+
+async def client_loop(limiter: RateLimiter, client_id: str, rate_per_second: float, deadline: float,
+                      latencies: list, outcomes: dict):
+    interval = 1.0 / rate_per_second
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        is_limited, _ = await limiter.is_rate_limited(client_id, LIMIT_TYPE)
+        latencies.append(time.perf_counter() - start)
+        outcomes["limited" if is_limited else "allowed"] += 1
+        await asyncio.sleep(min(interval, max(0.0, deadline - time.perf_counter())))
+
+
+async def run(args):
+    if args.local_only:
+        breaker = CircuitBreaker(threshold=1, cooldown=3600)
+        breaker.record_failure()
+        redis = AsyncRedis(breaker=breaker)
+    else:
+        redis = AsyncRedis()
+        if not await redis.ping():
+            print("⚠️ Redis unreachable, benchmarking the local buckets only")
+
+    limiter = RateLimiter(redis)
+    limit = RateLimitConfig().default_limits[LIMIT_TYPE]
+    fair_rate = limit["requests"] / limit["window"] * 0.5  # half the allowed rate
+    deadline = time.perf_counter() + args.duration
+
+    fair = {"allowed": 0, "limited": 0}
+    abusive = {"allowed": 0, "limited": 0}
+    latencies: list = []
+    tasks = [client_loop(limiter, f"bench:fair:{i}", fair_rate, deadline, latencies, fair)
+             for i in range(args.clients)]
+    tasks += [client_loop(limiter, f"bench:abuse:{i}", args.abuse_rate, deadline, latencies, abusive)
+              for i in range(args.abusers)]
+
+    print(f"🚀 {args.clients} fair clients at {fair_rate:.2f}/s, {args.abusers} abusers at "
+          f"{args.abuse_rate:.0f}/s, limit {limit['requests']}/{limit['window']}s, {args.duration}s...")
+    started = time.perf_counter()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    await redis.close()
+
+    total = len(latencies)
+    p50, p95, p99 = (quantiles(latencies, n=100)[i] * 1000 for i in (49, 94, 98)) if total > 1 else (0, 0, 0)
+    stats = limiter.status()
+
+    print(f"\n📊 {total} checks in {elapsed:.1f}s ({total / elapsed:,.0f} checks/sec)")
+    print(f"   Latency: p50 {p50:.3f} ms, p95 {p95:.3f} ms, p99 {p99:.3f} ms")
+    print(f"   Fair clients:    {fair['allowed']} allowed, {fair['limited']} limited")
+    print(f"   Abusive clients: {abusive['allowed']} allowed, {abusive['limited']} limited")
+    print(f"   Shed locally (no Redis round trip): {stats['shed_locally']} of {stats['limited']} limited")
+    print(f"   Redis errors/unavailable: {stats['redis_errors']}")
+
+    if fair["limited"]:
+        print("\n❌ Well-behaved clients were rate limited")
+        sys.exit(1)
+    print("\n✅ No well-behaved client was limited")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rate limiter under load")
+    parser.add_argument("--clients", type=int, default=200, help="Well-behaved clients")
+    parser.add_argument("--abusers", type=int, default=20, help="Abusive clients")
+    parser.add_argument("--abuse-rate", type=float, default=50.0, help="Requests per second per abuser")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--local-only", action="store_true", help="Skip Redis, use the in-process buckets")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Local vs GPT Scoring Comparison
+Replays recorded stage 1 attempts through the local fast-path scorer and the
+GPT evaluator to check agreement and tune the thresholds in local_scoring.py
+
+Input is a JSONL file, one attempt per line:
+    {"exercise": "ex1", "expected": "Good morning", "response": "good morning"}
+    {"exercise": "ex2", "expected": ["I am fine.", "I'm good."], "response": "i am fine"}
+
+Usage: python compare_local_scoring.py attempts.jsonl [--limit=200] [--concurrency=4] [--local-only]
+"""
+
+import os
+import sys
+import json
+import argparse
+import asyncio
+from typing import Any, Dict, List, Optional
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.local_scoring import (
+    DECISION_AMBIGUOUS, score_repeat_after_me, score_quick_response,
+)
+from app.services.feedback import evaluate_response_ex1_stage1, evaluate_response_ex2_stage1
+
+# Pass marks used by the GPT prompts
+GPT_PASS_SCORE = {"ex1": 80, "ex2": 70}
+
+
+def load_attempts(path: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+    attempts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            attempt = json.loads(line)
+            if attempt.get("exercise") not in GPT_PASS_SCORE:
+                continue
+            attempts.append(attempt)
+            if limit and len(attempts) >= limit:
+                break
+    return attempts
+
+
+def score_locally(attempt: Dict[str, Any]):
+    if attempt["exercise"] == "ex1":
+        return score_repeat_after_me(attempt["expected"], attempt["response"])
+    expected = attempt["expected"] if isinstance(attempt["expected"], list) else [attempt["expected"]]
+    return score_quick_response(expected, attempt["response"])
+
+
+def score_with_gpt(attempt: Dict[str, Any]) -> dict:
+    if attempt["exercise"] == "ex1":
+        return evaluate_response_ex1_stage1(attempt["expected"], attempt["response"], use_local_scorer=False)
+    expected = attempt["expected"] if isinstance(attempt["expected"], list) else [attempt["expected"]]
+    return evaluate_response_ex2_stage1(expected, attempt["response"], use_local_scorer=False)
+
+
+async def compare(attempts: List[Dict[str, Any]], concurrency: int, local_only: bool) -> List[Dict[str, Any]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(attempt: Dict[str, Any]) -> Dict[str, Any]:
+        local = score_locally(attempt)
+        row = {"exercise": attempt["exercise"], "local_score": local.score, "decision": local.decision}
+        if not local_only:
+            async with semaphore:
+                gpt = await asyncio.to_thread(score_with_gpt, attempt)
+            row["gpt_score"] = int(gpt.get("score", 0))
+            row["gpt_pass"] = row["gpt_score"] >= GPT_PASS_SCORE[attempt["exercise"]]
+        return row
+
+    return await asyncio.gather(*(run(attempt) for attempt in attempts))
+
+
+def summarize(rows: List[Dict[str, Any]], local_only: bool):
+    for exercise in sorted({row["exercise"] for row in rows}):
+        subset = [row for row in rows if row["exercise"] == exercise]
+        decisive = [row for row in subset if row["decision"] != DECISION_AMBIGUOUS]
+        print(f"\n=== {exercise}: {len(subset)} attempts ===")
+        print(f"Answered locally: {len(decisive)} ({len(decisive) / len(subset):.0%})")
+        if local_only:
+            continue
+
+        agree = sum(1 for row in decisive if (row["decision"] == "pass") == row["gpt_pass"])
+        false_pass = sum(1 for row in decisive if row["decision"] == "pass" and not row["gpt_pass"])
+        false_fail = sum(1 for row in decisive if row["decision"] == "fail" and row["gpt_pass"])
+        if decisive:
+            print(f"Agreement with GPT on local decisions: {agree / len(decisive):.1%} "
+                  f"(false pass {false_pass}, false fail {false_fail})")
+            mean_diff = sum(abs(row["local_score"] - row["gpt_score"]) for row in decisive) / len(decisive)
+            print(f"Mean |local - GPT| score on local decisions: {mean_diff:.1f}")
+
+        # Threshold sweep: how a different local pass mark would trade coverage for false passes
+        print("Pass threshold sweep (local_score >= t):")
+        for threshold in range(70, 101, 5):
+            passed = [row for row in subset if row["local_score"] >= threshold]
+            wrong = sum(1 for row in passed if not row["gpt_pass"])
+            print(f"  t={threshold:3d}: {len(passed):4d} local passes, {wrong:3d} disagree with GPT")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare local fast-path scores with GPT scores")
+    parser.add_argument("attempts", help="JSONL file of recorded attempts")
+    parser.add_argument("--limit", type=int, default=None, help="Max attempts to replay")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent GPT evaluations")
+    parser.add_argument("--local-only", action="store_true", help="Skip GPT and only report local coverage")
+    args = parser.parse_args()
+
+    attempts = load_attempts(args.attempts, args.limit)
+    print(f"Loaded {len(attempts)} attempts from {args.attempts}")
+    rows = await compare(attempts, args.concurrency, args.local_only)
+    summarize(rows, args.local_only)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
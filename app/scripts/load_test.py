@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Offline Load Test
+Starts the vendor stand-ins (app/loadtest/fakes.py) and the app pointed at
+them, waits for /ready, then drives each scenario at the target concurrency
+and prints p50/p95/p99 and throughput per operation. Results are compared
+with app/loadtest/baseline.json; an operation regresses when its p95 grows
+or its throughput drops by more than --tolerance, or its error rate rises
+by more than one point. Exits 1 on any regression.
+
+Baselines are only comparable between runs with the same scenarios,
+concurrency, iterations, latency spec and seed, on the same machine, so none
+is committed: run once with --save-baseline (all scenarios, which needs
+ffmpeg for the audio ones) before comparing. It records those settings and
+overwrites the stored figures for the scenarios run.
+
+Usage: python load_test.py [--scenarios=exercise,english_only,realtime,dashboards,messaging] [--concurrency=20] [--iterations=5] [--latency=openai.chat=600:1800] [--seed=0] [--save-baseline]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import subprocess
+
+import httpx
+
+# Add the parent directory to the path so we can import from app
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(ROOT)
+
+from app.loadtest.fakes import env_for
+from app.loadtest.scenarios import SCENARIOS, Context, Recorder, run_scenario, wav_bytes
+from app.loadtest.seed import build_dataset
+
+BASELINE_PATH = os.path.join(ROOT, "app", "loadtest", "baseline.json")
+STUDENTS = 200
+
+
+def start_processes(args):
+    fake_env = env_for(args.fake_port, args.fake_port + 1)
+    app_env = {
+        **os.environ,
+        **fake_env,
+        "OPENAI_API_KEY": "sk-loadtest",
+        "ELEVEN_API_KEY": "loadtest",
+        "SUPABASE_SERVICE_KEY": "loadtest",
+        "GOOGLE_APPLICATION_CREDENTIALS": os.environ.get("GOOGLE_APPLICATION_CREDENTIALS", "/dev/null"),
+        "LOG_LEVEL": "WARNING",
+    }
+    output = None if args.verbose else subprocess.DEVNULL
+    fakes = subprocess.Popen(
+        [sys.executable, "-m", "app.loadtest.fakes", f"--port={args.fake_port}", f"--grpc-port={args.fake_port + 1}",
+         f"--latency={args.latency}", f"--seed={args.seed}", f"--students={STUDENTS}"],
+        cwd=ROOT, stdout=output, stderr=output,
+    )
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host=127.0.0.1", f"--port={args.port}",
+         f"--workers={args.workers}", "--log-level=warning"],
+        cwd=ROOT, env=app_env, stdout=output, stderr=output,
+    )
+    return [fakes, app]
+
+
+async def wait_until_ready(url: str, timeout: float):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"{url} not ready after {timeout:.0f}s")
+
+
+def print_report(rows):
+    print(f"\n{'operation':<32}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>9}")
+    for operation, row in rows.items():
+        print(f"{operation:<32}{row['count']:>7}{row['errors']:>8}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+              f"{row['p99_ms']:>10.1f}{row['throughput']:>9.2f}")
+
+
+def compare(rows, baseline, tolerance):
+    """Regression messages for operations present in both runs"""
+    regressions = []
+    for operation, row in rows.items():
+        base = baseline.get(operation)
+        if not base:
+            continue
+        if base["p95_ms"] and row["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{operation}: p95 {row['p95_ms']:.1f} ms vs {base['p95_ms']:.1f} ms")
+        if base["throughput"] and row["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{operation}: throughput {row['throughput']:.2f}/s vs {base['throughput']:.2f}/s")
+        error_rate = row["errors"] / row["count"] if row["count"] else 0.0
+        base_error_rate = base["errors"] / base["count"] if base["count"] else 0.0
+        if error_rate > base_error_rate + 0.01:
+            regressions.append(f"{operation}: error rate {error_rate:.1%} vs {base_error_rate:.1%}")
+    return regressions
+
+
+async def run(args):
+    dataset = build_dataset(students=STUDENTS)
+    base_url = f"http://127.0.0.1:{args.port}"
+    await wait_until_ready(f"http://127.0.0.1:{args.fake_port}/_fake/stats", 30)
+    await wait_until_ready(f"{base_url}/ready", args.startup_timeout)
+    print(f"✅ App ready at {base_url}")
+
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as http:
+        for name in args.scenarios:
+            ctx = Context(http=http, ws_url=base_url.replace("http", "ws", 1), dataset=dataset,
+                          recorder=Recorder(), audio=wav_bytes(seed=args.seed), turns=args.turns)
+            print(f"🚀 {name}: {args.concurrency} virtual users x {args.iterations} iterations...")
+            rows, wall = await run_scenario(name, ctx, args.concurrency, args.iterations, args.seed)
+            print(f"   done in {wall:.1f}s")
+            for operation, samples in ctx.recorder.sample_errors().items():
+                print(f"   ⚠️ {operation}: {' | '.join(samples)}")
+            results.update(rows)
+        async with httpx.AsyncClient() as client:
+            vendor_calls = (await client.get(f"http://127.0.0.1:{args.fake_port}/_fake/stats")).json()
+    return results, vendor_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the app against local vendor stand-ins")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users per scenario")
+    parser.add_argument("--iterations", type=int, default=5, help="Iterations per virtual user")
+    parser.add_argument("--turns", type=int, default=2, help="Spoken turns per websocket session")
+    parser.add_argument("--latency", default="", help="Stand-in latency overrides, name=median_ms:p95_ms[:error_rate],...")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for stand-in latencies and scenario choices")
+    parser.add_argument("--port", type=int, default=8900, help="App port")
+    parser.add_argument("--fake-port", type=int, default=8910, help="Stand-in HTTP port (gRPC uses the next one)")
+    parser.add_argument("--workers", type=int, default=1, help="Uvicorn workers for the app")
+    parser.add_argument("--startup-timeout", type=float, default=120, help="Seconds to wait for /ready")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95/throughput change")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--verbose", action="store_true", help="Show app and stand-in output")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    processes = start_processes(args)
+    try:
+        results, vendor_calls = asyncio.run(run(args))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=15)
+
+    print_report(results)
+    print("\n📞 Vendor calls: " + ", ".join(f"{name}={stats['calls']}" for name, stats in vendor_calls.items()))
+
+    settings = {key: getattr(args, key) for key in ("concurrency", "iterations", "turns", "latency", "seed", "workers")}
+    stored = {"settings": {}, "operations": {}}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            stored = json.load(f)
+
+    if args.save_baseline:
+        stored["settings"] = settings
+        stored["operations"] = {
+            **{op: row for op, row in stored["operations"].items() if op.split(".")[0] not in args.scenarios},
+            **results,
+        }
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"💾 Baseline saved to {BASELINE_PATH}")
+        return
+
+    if stored["settings"] and stored["settings"] != settings:
+        print(f"⚠️ Baseline was recorded with {stored['settings']}; figures may not be comparable")
+    regressions = compare(results, stored["operations"], args.tolerance)
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for message in regressions:
+            print(f"   {message}")
+        sys.exit(1)
+    print("\n✅ No regressions against baseline" if stored["operations"] else "\nℹ️ No baseline stored yet (--save-baseline)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Import-Time Profiler
+Measures how long a cold `import app.main` takes and which modules account
+for it, using the interpreter's own `-X importtime` instrumentation in a
+fresh subprocess (so nothing is already cached in sys.modules)
+
+Reports the total, the slowest modules by cumulative time (including their
+own imports) and the slowest by self time. With --budget, exits non-zero
+when the cold import exceeds the given number of seconds.
+
+Usage: python profile_imports.py [--module=app.main] [--top=25] [--runs=3] [--budget=3.0]
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+from statistics import median
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Placeholder credentials so config modules import without a real .env
+DUMMY_ENV = {
+    "OPENAI_API_KEY": "profile-imports",
+    "ELEVEN_API_KEY": "profile-imports",
+    "SUPABASE_URL": "http://localhost",
+    "SUPABASE_SERVICE_KEY": "profile-imports",
+}
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(module: str) -> List[Tuple[str, int, int, int]]:
+    """Import `module` in a fresh interpreter; returns (name, self_us, cumulative_us, depth) rows."""
+    env = {**DUMMY_ENV, **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def top_level_packages(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """Self time summed per top-level package (e.g. everything under `google`)."""
+    totals: Dict[str, int] = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile cold import time")
+    parser.add_argument("--module", default="app.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to list")
+    parser.add_argument("--runs", type=int, default=3, help="Cold imports to run (median total is reported)")
+    parser.add_argument("--budget", type=float, default=None, help="Fail if the median total exceeds this many seconds")
+    args = parser.parse_args()
+
+    print(f"⏱️ Profiling cold import of {args.module} ({args.runs} runs)...")
+    runs = [run_importtime(args.module) for _ in range(args.runs)]
+    totals = [next(cum for name, _, cum, _ in rows if name == args.module) / 1e6 for rows in runs]
+    total = median(totals)
+    rows = runs[totals.index(total)] if total in totals else runs[-1]
+
+    print(f"\n📦 Total: {total:.3f}s (runs: {', '.join(f'{t:.3f}s' for t in totals)})")
+
+    print(f"\n🐢 Slowest by cumulative time (top {args.top}, top-level imports only):")
+    top_level = [r for r in rows if r[3] <= 2 and r[0] != args.module]
+    for name, _, cumulative_us, depth in sorted(top_level, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"   {cumulative_us / 1000:9.1f} ms  {'  ' * (depth - 1)}{name}")
+
+    print(f"\n🔥 Slowest by self time (top {args.top}):")
+    for name, self_us, _, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"   {self_us / 1000:9.1f} ms  {name}")
+
+    print("\n📊 Self time per top-level package:")
+    for package, self_us in sorted(top_level_packages(rows).items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"   {self_us / 1000:9.1f} ms  {package}")
+
+    if args.budget is not None:
+        if total > args.budget:
+            print(f"\n❌ Cold import took {total:.3f}s, over the {args.budget:.3f}s budget")
+            sys.exit(1)
+        print(f"\n✅ Cold import within the {args.budget:.3f}s budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Admission Control for AI Pipelines
+
+Bounds how many STT -> GPT -> TTS pipelines run at once, so a traffic spike
+queues briefly or is turned away fast instead of piling onto the vendors
+until everything times out:
+- Global slots per vendor: a pipeline holds one slot on every vendor it
+  uses for as long as it runs (connection_pool caps the individual HTTP
+  requests underneath)
+- Per-user caps per vendor: a learner can't run more than a couple of
+  pipelines at once (e.g. from several tabs); extra ones are rejected
+  immediately. Only verified user ids are capped: clients known only by
+  IP (a whole classroom behind one NAT) share the global slots instead
+- A bounded wait queue with a deadline: when a vendor is full, requests
+  wait up to ADMISSION_QUEUE_TIMEOUT seconds and are then rejected
+- Priorities: turns of conversations already in progress are admitted
+  before new conversations and one-off exercise evaluations
+
+Rejections raise AdmissionRejected; websocket handlers turn it into a
+"busy" message and HTTP routes into 429 (this user) / 503 (server busy).
+
+Environment:
+- ADMISSION_MAX_OPENAI / _ELEVENLABS / _GOOGLE: concurrent pipelines per vendor (default: twice the vendor's connection cap)
+- ADMISSION_PER_USER: concurrent pipelines per user and vendor (default: 2)
+- ADMISSION_MAX_QUEUE: waiting pipelines per vendor before rejecting outright (default: 200)
+- ADMISSION_QUEUE_TIMEOUT: seconds a pipeline may wait for a slot (default: 5)
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, WebSocket
+
+from app.auth_middleware import require_admin_or_teacher_or_student
+from app.services.connection_pool import VENDOR_MAX_CONCURRENCY
+from app.utils.metrics import (
+    ADMISSION_IN_USE,
+    ADMISSION_WAITING,
+    EVALUATION_SECONDS,
+    IN_FLIGHT,
+    metrics_registry,
+)
+
+ADMISSION_MAX = {
+    vendor: int(os.getenv(f"ADMISSION_MAX_{vendor.upper()}", str(cap * 2)))
+    for vendor, cap in VENDOR_MAX_CONCURRENCY.items()
+}
+ADMISSION_PER_USER = int(os.getenv("ADMISSION_PER_USER", "2"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "200"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))
+
+# Lower is admitted first
+PRIORITY_ONGOING = 0
+PRIORITY_NEW = 1
+
+# Vendors each pipeline calls
+CONVERSATION_VENDORS = ("google", "openai", "elevenlabs")
+REALTIME_VENDORS = ("openai", "elevenlabs")
+EVALUATION_VENDORS = ("google", "openai")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a pipeline can't be admitted; `reason` is user_busy, queue_full or timeout"""
+
+    def __init__(self, reason: str, vendor: str, retry_after: float = 1.0):
+        super().__init__(f"{vendor}: {reason}")
+        self.reason = reason
+        self.vendor = vendor
+        self.retry_after = retry_after
+
+    @property
+    def user_limited(self) -> bool:
+        return self.reason == "user_busy"
+
+
+class PrioritySlots:
+    """Counting semaphore whose waiters are served by priority (then arrival), with a bounded queue"""
+
+    def __init__(self, name: str, capacity: int, max_queue: int = ADMISSION_MAX_QUEUE):
+        self.name = name
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.in_use = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = PRIORITY_NEW, timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        if self.in_use < self.capacity and not self.waiting:
+            self.in_use += 1
+            return
+        if self.waiting >= self.max_queue:
+            raise AdmissionRejected("queue_full", self.name)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._give_back_if_granted(future)
+            raise AdmissionRejected("timeout", self.name, retry_after=timeout)
+        except asyncio.CancelledError:
+            self._give_back_if_granted(future)
+            raise
+
+    def _give_back_if_granted(self, future: asyncio.Future):
+        # The slot may have been handed over just as the wait ended
+        if future.done() and not future.cancelled():
+            self.release()
+
+    def release(self):
+        # Hand the slot straight to the best waiter so newcomers can't jump the queue
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_use -= 1
+
+    def status(self) -> Dict[str, int]:
+        return {"capacity": self.capacity, "in_use": self.in_use, "waiting": self.waiting}
+
+
+class AdmissionTicket:
+    """Slots held by one admitted pipeline; release() is idempotent"""
+
+    def __init__(self, controller: "AdmissionController", user_key: Optional[str], vendors: Tuple[str, ...]):
+        self._controller = controller
+        self.user_key = user_key
+        self.vendors = vendors
+        self.admitted_at = time.perf_counter()
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """Global per-vendor slots, per-user caps and prioritized waiting for AI pipelines"""
+
+    def __init__(self, max_per_vendor: Optional[Dict[str, int]] = None, per_user: int = ADMISSION_PER_USER,
+                 max_queue: int = ADMISSION_MAX_QUEUE, queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.per_user = per_user
+        self.queue_timeout = queue_timeout
+        self.slots = {vendor: PrioritySlots(vendor, cap, max_queue)
+                      for vendor, cap in (max_per_vendor or ADMISSION_MAX).items()}
+        self._user_counts: Dict[Tuple[str, str], int] = {}
+        self.stats = {"admitted": 0, "queued": 0, "user_busy": 0, "queue_full": 0, "timeout": 0,
+                      "wait_ms_total": 0.0}
+
+    def _user_limited_vendor(self, user_key: Optional[str], vendors: Iterable[str]) -> Optional[str]:
+        if user_key is None:
+            return None
+        for vendor in vendors:
+            if self._user_counts.get((user_key, vendor), 0) >= self.per_user:
+                return vendor
+        return None
+
+    def _count_user(self, user_key: Optional[str], vendors: Iterable[str], delta: int):
+        if user_key is None:
+            return
+        for vendor in vendors:
+            key = (user_key, vendor)
+            count = self._user_counts.get(key, 0) + delta
+            if count > 0:
+                self._user_counts[key] = count
+            else:
+                self._user_counts.pop(key, None)
+
+    async def acquire(self, user_key: Optional[str], vendors: Iterable[str], priority: int = PRIORITY_NEW,
+                      timeout: Optional[float] = None) -> AdmissionTicket:
+        """
+        Admit one pipeline or raise AdmissionRejected; release the returned ticket
+        when done. user_key None (no verified user) skips the per-user cap.
+        """
+        vendors = tuple(sorted(v for v in set(vendors) if v in self.slots))  # fixed order: no deadlocks
+        busy_vendor = self._user_limited_vendor(user_key, vendors)
+        if busy_vendor:
+            self.stats["user_busy"] += 1
+            raise AdmissionRejected("user_busy", busy_vendor)
+
+        # Count the user first so their concurrent requests can't all slip into the queue
+        self._count_user(user_key, vendors, 1)
+        queued_at = time.perf_counter()
+        deadline = queued_at + (self.queue_timeout if timeout is None else timeout)
+        acquired: List[str] = []
+        try:
+            for vendor in vendors:
+                slots = self.slots[vendor]
+                if slots.in_use >= slots.capacity:
+                    self.stats["queued"] += 1
+                await slots.acquire(priority, max(0.0, deadline - time.perf_counter()))
+                acquired.append(vendor)
+        except BaseException as e:
+            for vendor in acquired:
+                self.slots[vendor].release()
+            self._count_user(user_key, vendors, -1)
+            if isinstance(e, AdmissionRejected):
+                self.stats[e.reason] += 1
+            raise
+
+        self.stats["admitted"] += 1
+        self.stats["wait_ms_total"] += (time.perf_counter() - queued_at) * 1000
+        return AdmissionTicket(self, user_key, vendors)
+
+    def _release(self, ticket: AdmissionTicket):
+        for vendor in ticket.vendors:
+            self.slots[vendor].release()
+        self._count_user(ticket.user_key, ticket.vendors, -1)
+
+    @asynccontextmanager
+    async def admit(self, user_key: str, vendors: Iterable[str], priority: int = PRIORITY_NEW,
+                    timeout: Optional[float] = None):
+        ticket = await self.acquire(user_key, vendors, priority, timeout)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def export_metrics(self):
+        """Scrape-time collector for the admission gauges"""
+        for vendor, slots in self.slots.items():
+            ADMISSION_IN_USE.set(slots.in_use, vendor=vendor)
+            ADMISSION_WAITING.set(slots.waiting, vendor=vendor)
+
+    def status(self) -> Dict[str, Any]:
+        rejected = self.stats["user_busy"] + self.stats["queue_full"] + self.stats["timeout"]
+        return {
+            "vendors": {vendor: slots.status() for vendor, slots in self.slots.items()},
+            "active_users": len({user for user, _ in self._user_counts}),
+            "rejected": rejected,
+            "avg_wait_ms": round(self.stats["wait_ms_total"] / max(1, self.stats["admitted"]), 2),
+            **{k: v for k, v in self.stats.items() if k != "wait_ms_total"},
+        }
+
+
+def busy_ws_message(error: AdmissionRejected) -> Dict[str, Any]:
+    """Payload sent to a websocket client whose turn wasn't admitted"""
+    if error.user_limited:
+        text = "I'm still working on your last message. Please wait for my reply."
+    else:
+        text = "Lots of learners are practicing right now. Please try again in a moment."
+    return {
+        "type": "error",
+        "response": text,
+        "step": "error",
+        "error_type": "busy",
+        "retry_after": error.retry_after,
+    }
+
+
+async def admit_websocket_turn(websocket: WebSocket, vendors: Iterable[str], ongoing: bool,
+                               send: Optional[Callable[[Dict], Awaitable[Any]]] = None) -> Optional[AdmissionTicket]:
+    """
+    Admit one websocket turn. Returns the ticket to release once the pipeline's
+    vendor calls are done, or None after telling the client (through `send`,
+    default websocket.send_json) that the server is busy.
+    """
+    from app.middleware.rate_limiter import websocket_client_identity
+
+    client_id, _ = websocket_client_identity(websocket)
+    # IP-derived ids are shared (NAT) and spoofable: only verified users get a per-user cap
+    user_key = client_id if client_id.startswith("user:") else None
+    try:
+        return await admission_controller.acquire(user_key, vendors, PRIORITY_ONGOING if ongoing else PRIORITY_NEW)
+    except AdmissionRejected as e:
+        print(f"🚦 [ADMISSION] Turn rejected for {client_id}: {e.reason} ({e.vendor})")
+        await (send or websocket.send_json)(busy_ws_message(e))
+        return None
+
+
+async def admit_evaluation(request: Request,
+                           current_user: Dict[str, Any] = Depends(require_admin_or_teacher_or_student)):
+    """
+    Route dependency for the exercise evaluation endpoints: holds an admission
+    ticket for the duration of the request, or answers 429 (this user already
+    has evaluations running) / 503 (server busy) without calling any vendor.
+    Admitted requests are timed per exercise route for /metrics.
+    """
+    try:
+        ticket = await admission_controller.acquire(f"user:{current_user['id']}", EVALUATION_VENDORS)
+    except AdmissionRejected as e:
+        retry_after = str(max(1, int(e.retry_after + 0.999)))
+        if e.user_limited:
+            raise HTTPException(status_code=429, detail="Your previous evaluation is still running",
+                                headers={"Retry-After": retry_after})
+        raise HTTPException(status_code=503, detail="Server busy, please try again shortly",
+                            headers={"Retry-After": retry_after})
+    route = request.scope.get("route")
+    exercise = getattr(route, "path", "unknown")  # the route template, never the raw URL
+    try:
+        with IN_FLIGHT.track_inprogress(route="evaluation"), EVALUATION_SECONDS.time(exercise=exercise):
+            yield ticket
+    finally:
+        ticket.release()
+
+
+# Global instance
+admission_controller = AdmissionController()
+metrics_registry.add_collector(admission_controller.export_metrics)
@@ -1,8 +1,8 @@
-from openai import OpenAI
 from fastapi import HTTPException
-from app.config import OPENAI_API_KEY
+from app.services.vendor_clients import LazyClient, get_openai_client
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
 
 def evaluate_cefr_level(writing_sample: str) -> str:
     try:
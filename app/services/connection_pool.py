@@ -2,119 +2,486 @@
 Connection Pool Manager for Pre-warmed HTTP Connections
 
 Maintains persistent HTTP/2 connections to external services
-to eliminate connection establishment overhead (200-500ms per request).
+to eliminate connection establishment overhead (200-500ms per request):
+- One shared pool per vendor (OpenAI, ElevenLabs), for async and sync callers;
+  vendor SDK clients are built on top of these (see vendor_clients.py)
+- Per-vendor concurrency caps: one budget per vendor shared by async and
+  thread callers; requests beyond the cap wait (FIFO) for a slot instead of
+  opening more connections (streamed bodies hold their slot until closed)
+- Keep-alive tuned per vendor and periodic re-warming of idle pools
+- In-flight, peak, queued, error and latency counters per vendor (see status()),
+  also exported to /metrics
+
+Environment:
+- VENDOR_MAX_CONCURRENCY_OPENAI / _ELEVENLABS / _GOOGLE: concurrent requests per vendor (default: 64 / 16 / 32)
+- VENDOR_KEEPALIVE_SECONDS: idle time before pooled connections are closed (default: 300)
+- VENDOR_REWARM_INTERVAL: seconds between re-warming idle pools, 0 disables (default: 240)
 """
 
-import aiohttp
 import asyncio
-from typing import Optional
-from app.config import ELEVEN_API_KEY, OPENAI_API_KEY
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional
+from app.config import ELEVEN_API_KEY, ELEVENLABS_BASE_URL, OPENAI_API_KEY, OPENAI_BASE_URL
+from app.utils.metrics import (
+    VENDOR_ERRORS,
+    VENDOR_IN_FLIGHT,
+    VENDOR_REQUEST_SECONDS,
+    VENDOR_WAITING,
+    metrics_registry,
+)
 import httpx
 
+VENDOR_MAX_CONCURRENCY = {
+    "openai": int(os.getenv("VENDOR_MAX_CONCURRENCY_OPENAI", "64")),
+    "elevenlabs": int(os.getenv("VENDOR_MAX_CONCURRENCY_ELEVENLABS", "16")),
+    "google": int(os.getenv("VENDOR_MAX_CONCURRENCY_GOOGLE", "32")),
+}
+VENDOR_KEEPALIVE_SECONDS = float(os.getenv("VENDOR_KEEPALIVE_SECONDS", "300"))
+VENDOR_REWARM_INTERVAL = float(os.getenv("VENDOR_REWARM_INTERVAL", "240"))
+
+# HTTP vendors: pooled connections (Google uses gRPC channels, capped via limiter only)
+HTTP_VENDORS = {
+    "openai": {
+        "warm_url": f"{OPENAI_BASE_URL}/models",
+        "warm_headers": {"Authorization": f"Bearer {OPENAI_API_KEY}"},
+        "http2": True,
+    },
+    "elevenlabs": {
+        "warm_url": f"{ELEVENLABS_BASE_URL}/v1/models",
+        "warm_headers": {"xi-api-key": ELEVEN_API_KEY or ""},
+        "http2": False,
+    },
+}
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+class _SlotWaiter:
+    """A queued caller; wake() is called once a slot has been handed to it"""
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake):
+        self.wake = wake
+        self.granted = False
+
+
+class VendorLimiter:
+    """Concurrency cap and counters for one vendor, shared by async and thread callers"""
+
+    def __init__(self, name: str, max_concurrency: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        # One slot budget for threads and every event loop; asyncio primitives
+        # belong to one loop, so waiters are woken through their own callback
+        self._held = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.errors = 0
+        self.saturated = 0  # requests that had to wait for a slot
+        self.wait_ms_total = 0.0
+        self.latency_ms_total = 0.0
+        self.last_used = 0.0
+
+    def _take_slot(self, wake) -> Optional[_SlotWaiter]:
+        """Take a free slot (None) or queue behind earlier callers (the waiter to block on)"""
+        with self._lock:
+            if self._held < self.max_concurrency and not self._waiters:
+                self._held += 1
+                return None
+            waiter = _SlotWaiter(wake)
+            self._waiters.append(waiter)
+            return waiter
+
+    def _give_slot(self):
+        """Hand the slot to the oldest waiter, or free it"""
+        with self._lock:
+            if not self._waiters:
+                self._held -= 1
+                return
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+        waiter.wake()
+
+    def _abandon(self, waiter: _SlotWaiter):
+        """A queued caller gave up (cancelled); pass on the slot if it already got one"""
+        with self._lock:
+            self.waiting -= 1
+            granted = waiter.granted
+            if not granted:
+                self._waiters.remove(waiter)
+        if granted:
+            self._give_slot()
+
+    def _started(self, queued_at: float, waited: bool) -> float:
+        now = time.perf_counter()
+        with self._lock:
+            self.waiting -= 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.requests += 1
+            self.saturated += int(waited)
+            self.wait_ms_total += (now - queued_at) * 1000
+        return now
+
+    def _finished(self, started_at: float, failed: bool):
+        latency = time.perf_counter() - started_at
+        with self._lock:
+            self.in_flight -= 1
+            self.errors += int(failed)
+            self.latency_ms_total += latency * 1000
+            self.last_used = time.monotonic()
+        VENDOR_REQUEST_SECONDS.observe(latency, vendor=self.name)
+        if failed:
+            VENDOR_ERRORS.inc(vendor=self.name)
+
+    def _queued(self) -> float:
+        with self._lock:
+            self.waiting += 1
+        return time.perf_counter()
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the start time to pass to release()."""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+            except RuntimeError:  # loop already closed: nobody is left to use the slot
+                self._give_slot()
+
+        queued_at = self._queued()
+        waiter = self._take_slot(wake)
+        if waiter is not None:
+            try:
+                await granted
+            except BaseException:
+                self._abandon(waiter)
+                raise
+        return self._started(queued_at, waiter is not None)
+
+    def release(self, started_at: float, failed: bool = False):
+        self._finished(started_at, failed)
+        self._give_slot()
+
+    def acquire_sync(self) -> float:
+        granted = threading.Event()
+        queued_at = self._queued()
+        waiter = self._take_slot(granted.set)
+        if waiter is not None:
+            granted.wait()
+        return self._started(queued_at, waiter is not None)
+
+    def release_sync(self, started_at: float, failed: bool = False):
+        self.release(started_at, failed)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one slot for a non-HTTP call (e.g. a Google gRPC request)."""
+        started_at = await self.acquire()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.release(started_at, failed)
+
+    @contextmanager
+    def sync_slot(self):
+        started_at = self.acquire_sync()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.release_sync(started_at, failed)
+
+    def status(self) -> Dict[str, Any]:
+        completed = max(1, self.requests - self.in_flight)
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "errors": self.errors,
+            "saturated": self.saturated,
+            "avg_wait_ms": round(self.wait_ms_total / max(1, self.requests), 2),
+            "avg_latency_ms": round(self.latency_ms_total / completed, 2),
+        }
+
+
+class _ReleasingAsyncStream(httpx.AsyncByteStream):
+    """Response body that gives the slot back once it is fully read or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._on_close()
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class LimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async transport that holds a vendor slot for the lifetime of each request."""
+
+    def __init__(self, limiter: VendorLimiter, transport: httpx.AsyncBaseTransport):
+        self.limiter = limiter
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = await self.limiter.acquire()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self.limiter.release(started_at, failed=True)
+            raise
+        failed = response.status_code >= 500 or response.status_code == 429
+        released = False
+
+        def on_close():
+            nonlocal released
+            if not released:
+                released = True
+                self.limiter.release(started_at, failed)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingAsyncStream(response.stream, on_close),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class LimitedTransport(httpx.BaseTransport):
+    """Sync counterpart of LimitedAsyncTransport for thread-pool callers."""
+
+    def __init__(self, limiter: VendorLimiter, transport: httpx.BaseTransport):
+        self.limiter = limiter
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = self.limiter.acquire_sync()
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            self.limiter.release_sync(started_at, failed=True)
+            raise
+        failed = response.status_code >= 500 or response.status_code == 429
+        released = False
+
+        def on_close():
+            nonlocal released
+            if not released:
+                released = True
+                self.limiter.release_sync(started_at, failed)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, on_close),
+            extensions=response.extensions,
+        )
+
+    def close(self):
+        self.transport.close()
+
+
 class PreWarmedConnections:
     """
     Manages persistent connections to external services.
     Eliminates connection overhead (200-500ms per request).
-    
-    Note: ElevenLabs SDK already handles connection pooling internally,
-    but this provides additional optimization for direct HTTP calls.
+
+    Pools are created on first use (async pools per event loop, since they
+    cannot be shared across loops) and warmed at startup; vendor SDK
+    clients are bound to them in vendor_clients.py.
     """
-    
+
     def __init__(self):
-        self.elevenlabs_client: Optional[aiohttp.ClientSession] = None
-        self.openai_client: Optional[httpx.AsyncClient] = None
+        self.limiters: Dict[str, VendorLimiter] = {
+            name: VendorLimiter(name, cap) for name, cap in VENDOR_MAX_CONCURRENCY.items()
+        }
+        self._async_clients: Dict[str, Dict[int, httpx.AsyncClient]] = {name: {} for name in HTTP_VENDORS}
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self._sync_lock = threading.Lock()
         self._initialized = False
         self._lock = asyncio.Lock()
-    
+        self._rewarm_task: Optional[asyncio.Task] = None
+        self.warmups = 0
+
+    @staticmethod
+    def _limits(vendor: str) -> httpx.Limits:
+        cap = VENDOR_MAX_CONCURRENCY[vendor]
+        return httpx.Limits(
+            max_connections=cap,
+            max_keepalive_connections=cap,
+            keepalive_expiry=VENDOR_KEEPALIVE_SECONDS,
+        )
+
+    def get_async_http_client(self, vendor: str) -> httpx.AsyncClient:
+        """Shared async pool for vendor on the running event loop."""
+        loop_id = id(asyncio.get_running_loop())
+        clients = self._async_clients[vendor]
+        client = clients.get(loop_id)
+        if client is None or client.is_closed:
+            transport = httpx.AsyncHTTPTransport(http2=HTTP_VENDORS[vendor]["http2"], limits=self._limits(vendor))
+            client = httpx.AsyncClient(
+                transport=LimitedAsyncTransport(self.limiters[vendor], transport),
+                timeout=HTTP_TIMEOUT,
+            )
+            clients[loop_id] = client
+        return client
+
+    def get_http_client(self, vendor: str) -> httpx.Client:
+        """Shared sync pool for vendor (thread-safe, for SDK calls made from worker threads)."""
+        client = self._sync_clients.get(vendor)
+        if client is None:
+            with self._sync_lock:
+                client = self._sync_clients.get(vendor)
+                if client is None:
+                    transport = httpx.HTTPTransport(http2=HTTP_VENDORS[vendor]["http2"], limits=self._limits(vendor))
+                    client = httpx.Client(
+                        transport=LimitedTransport(self.limiters[vendor], transport),
+                        timeout=HTTP_TIMEOUT,
+                    )
+                    self._sync_clients[vendor] = client
+        return client
+
+    def get_limiter(self, vendor: str) -> VendorLimiter:
+        return self.limiters[vendor]
+
     async def initialize(self):
         """Initialize all connection pools (call on server startup)"""
         if self._initialized:
             return
-        
+
         async with self._lock:
             if self._initialized:
                 return
-            
+
             print("🔥 [CONN_POOL] Initializing pre-warmed connections...")
-            
+
             try:
-                # ElevenLabs connection pool (for direct HTTP calls if needed)
-                connector = aiohttp.TCPConnector(
-                    limit=100,  # Max 100 connections
-                    limit_per_host=20,  # Max 20 per host
-                    keepalive_timeout=300,  # 5 minutes
-                    enable_cleanup_closed=True,
-                    ttl_dns_cache=300,  # DNS cache for 5 minutes
-                )
-                
-                timeout = aiohttp.ClientTimeout(total=30, connect=5)
-                self.elevenlabs_client = aiohttp.ClientSession(
-                    connector=connector,
-                    timeout=timeout,
-                    headers={
-                        "xi-api-key": ELEVEN_API_KEY,
-                    }
-                )
-                
-                # OpenAI connection pool (if using OpenAI directly)
-                if OPENAI_API_KEY:
-                    self.openai_client = httpx.AsyncClient(
-                        http2=True,  # HTTP/2 for better performance
-                        limits=httpx.Limits(
-                            max_keepalive_connections=20,
-                            max_connections=100,
-                            keepalive_expiry=300,
-                        ),
-                        timeout=httpx.Timeout(30.0, connect=5.0),
-                        headers={
-                            "Authorization": f"Bearer {OPENAI_API_KEY}",
-                        }
-                    )
-                
                 # Warm connections with a test request
                 await self._warm_connections()
-                
+
                 self._initialized = True
+                self.start_rewarming()
                 print("✅ [CONN_POOL] Pre-warmed connections ready")
             except Exception as e:
                 print(f"⚠️ [CONN_POOL] Warning: Connection pool initialization failed: {e}")
                 # Continue anyway - connections will be established on first use
-    
-    async def _warm_connections(self):
+
+    async def _warm_vendor(self, vendor: str):
+        config = HTTP_VENDORS[vendor]
+        # The response status doesn't matter, only the open TLS connection
+        response = await self.get_async_http_client(vendor).head(config["warm_url"], headers=config["warm_headers"])
+        await response.aclose()
+        # Thread callers use their own pool; warm it too
+        await asyncio.to_thread(
+            lambda: self.get_http_client(vendor).head(config["warm_url"], headers=config["warm_headers"]).close()
+        )
+
+    async def _warm_connections(self, vendors=None):
         """Send test requests to warm up connections"""
-        try:
-            # Warm ElevenLabs (lightweight HEAD request)
-            if self.elevenlabs_client:
-                async with self.elevenlabs_client.head("https://api.elevenlabs.io/v1/models") as resp:
-                    await resp.read()  # Read response to complete connection
-                print("🔥 [CONN_POOL] ElevenLabs connection warmed")
-            
-            # Warm OpenAI (if configured)
-            if self.openai_client:
-                await self.openai_client.get("https://api.openai.com/v1/models", params={"limit": 1})
-                print("🔥 [CONN_POOL] OpenAI connection warmed")
-                
-        except Exception as e:
-            print(f"⚠️ [CONN_POOL] Warning: Connection warmup failed: {e}")
-            # Continue anyway - connections will be established on first use
-    
-    def get_elevenlabs_client(self) -> Optional[aiohttp.ClientSession]:
-        """Get pre-warmed ElevenLabs client (for direct HTTP calls)"""
-        return self.elevenlabs_client
-    
-    def get_openai_client(self) -> Optional[httpx.AsyncClient]:
-        """Get pre-warmed OpenAI client"""
-        return self.openai_client
-    
+        results = await asyncio.gather(
+            *(self._warm_vendor(vendor) for vendor in (vendors or HTTP_VENDORS)),
+            return_exceptions=True,
+        )
+        for vendor, result in zip(vendors or HTTP_VENDORS, results):
+            if isinstance(result, Exception):
+                # Continue anyway - connections will be established on first use
+                print(f"⚠️ [CONN_POOL] Warning: {vendor} connection warmup failed: {result}")
+            else:
+                self.warmups += 1
+                print(f"🔥 [CONN_POOL] {vendor} connection warmed")
+
+    async def _rewarm_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            # Only idle pools need it; live traffic keeps busy ones warm
+            idle = [
+                vendor for vendor in HTTP_VENDORS
+                if time.monotonic() - self.limiters[vendor].last_used >= interval
+            ]
+            if idle:
+                await self._warm_connections(idle)
+
+    def start_rewarming(self, interval: float = VENDOR_REWARM_INTERVAL):
+        """Periodically re-warm idle pools before their keep-alive connections expire."""
+        if interval > 0 and (self._rewarm_task is None or self._rewarm_task.done()):
+            self._rewarm_task = asyncio.create_task(self._rewarm_loop(interval))
+
+    def get_elevenlabs_client(self) -> httpx.AsyncClient:
+        """Get pre-warmed ElevenLabs pool (for direct HTTP calls)"""
+        return self.get_async_http_client("elevenlabs")
+
+    def get_openai_client(self) -> httpx.AsyncClient:
+        """Get pre-warmed OpenAI pool"""
+        return self.get_async_http_client("openai")
+
+    def status(self) -> Dict[str, Any]:
+        """Pool saturation per vendor (in flight vs cap, queued requests, errors, latency)."""
+        return {
+            "initialized": self._initialized,
+            "warmups": self.warmups,
+            "vendors": {name: limiter.status() for name, limiter in self.limiters.items()},
+        }
+
+    def export_metrics(self):
+        """Scrape-time collector: copy live slot usage into the vendor gauges."""
+        for name, limiter in self.limiters.items():
+            VENDOR_IN_FLIGHT.set(limiter.in_flight, vendor=name)
+            VENDOR_WAITING.set(limiter.waiting, vendor=name)
+
     async def close(self):
         """Close all connections (call on server shutdown)"""
-        if self.elevenlabs_client:
-            await self.elevenlabs_client.close()
-        if self.openai_client:
-            await self.openai_client.aclose()
+        if self._rewarm_task is not None:
+            self._rewarm_task.cancel()
+            self._rewarm_task = None
+        loop_id = id(asyncio.get_running_loop())
+        for clients in self._async_clients.values():
+            client = clients.pop(loop_id, None)
+            if client is not None:
+                await client.aclose()
+        for client in self._sync_clients.values():
+            client.close()
+        self._sync_clients.clear()
         self._initialized = False
         print("🔌 [CONN_POOL] All connections closed")
 
 # Global instance
 connection_pool = PreWarmedConnections()
-
+metrics_registry.add_collector(connection_pool.export_metrics)
@@ -0,0 +1,162 @@
+"""
+Bounded Conversation Memory
+
+Keeps prompt size flat as tutoring sessions grow:
+- The last N messages are kept verbatim
+- Older messages are folded into a rolling summary, updated incrementally
+  (previous summary + newly aged-out messages) off the critical path
+- A token budget caps summary + verbatim messages; the oldest verbatim
+  messages are dropped first when the budget is exceeded
+
+The memory itself is stateless; callers keep the small summary state
+({"summary": str, "summarized_count": int}) next to their history, so it
+works for roleplay (Redis sessions), English-only (websocket state) and
+realtime modes alike.
+
+Environment:
+- CONVERSATION_MEMORY_RECENT: messages kept verbatim (default: 8)
+- CONVERSATION_MEMORY_TOKEN_BUDGET: max tokens for summary + history (default: 1200)
+"""
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.vendor_clients import LazyClient, get_openai_client
+
+CONVERSATION_MEMORY_RECENT = int(os.getenv("CONVERSATION_MEMORY_RECENT", "8"))
+CONVERSATION_MEMORY_TOKEN_BUDGET = int(os.getenv("CONVERSATION_MEMORY_TOKEN_BUDGET", "1200"))
+SUMMARY_MODEL = "gpt-4o-mini"
+SUMMARY_MAX_TOKENS = 200
+
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
+
+# Summaries are written in the background so they never delay a turn
+summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summary")
+
+SUMMARY_PROMPT = """
+You maintain the running summary of an English tutoring conversation.
+Update the summary with the new messages. Keep facts the student shared, what
+was asked or agreed, mistakes worth remembering and anything still pending.
+Write at most 80 words, third person, no preamble.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def empty_memory_state() -> Dict[str, Any]:
+    return {"summary": "", "summarized_count": 0}
+
+
+@dataclass
+class MemoryView:
+    summary: str
+    messages: List[Dict[str, Any]]  # verbatim, oldest first
+    omitted: int = 0  # older messages covered only by the summary (or dropped)
+    tokens: int = 0
+    pending: List[Dict[str, Any]] = field(default_factory=list)  # aged out but not yet summarized
+
+
+class ConversationMemory:
+    """Last N messages verbatim plus a rolling summary of older ones, under a token budget"""
+
+    def __init__(self, max_recent_messages: int = CONVERSATION_MEMORY_RECENT,
+                 token_budget: int = CONVERSATION_MEMORY_TOKEN_BUDGET,
+                 summarizer: Optional[Callable[[str, List[Dict[str, Any]]], str]] = None):
+        self.max_recent_messages = max_recent_messages
+        self.token_budget = token_budget
+        self.summarizer = summarizer or self._summarize_with_gpt
+
+    @staticmethod
+    def _line(message: Dict[str, Any], user_label: str, ai_label: str) -> str:
+        role = user_label if message.get("role") == "user" else ai_label
+        return f"{role}: {message.get('content', '')}"
+
+    def view(self, history: List[Dict[str, Any]], state: Optional[Dict[str, Any]] = None) -> MemoryView:
+        """What fits in the prompt: summary plus the newest messages within the token budget."""
+        state = state or empty_memory_state()
+        summary = state.get("summary", "")
+        summarized = min(state.get("summarized_count", 0), len(history))
+
+        # Everything the summary doesn't cover yet stays verbatim (that is more than
+        # the recent window only while a summary update is still in flight)
+        candidates = history[summarized:]
+        pending = history[summarized:max(summarized, len(history) - self.max_recent_messages)]
+
+        tokens = estimate_tokens(summary)
+        kept: List[Dict[str, Any]] = []
+        for message in reversed(candidates):
+            cost = estimate_tokens(str(message.get("content", ""))) + 2
+            if kept and tokens + cost > self.token_budget:
+                break
+            kept.append(message)
+            tokens += cost
+        kept.reverse()
+        return MemoryView(summary, kept, len(history) - len(kept), tokens, pending)
+
+    def format(self, history: List[Dict[str, Any]], state: Optional[Dict[str, Any]] = None,
+               user_label: str = "Student", ai_label: str = "AI") -> str:
+        """Prompt-ready transcript: summary of earlier turns, then the recent messages."""
+        view = self.view(history, state)
+        lines = []
+        if view.summary:
+            lines.append(f"Summary of earlier conversation: {view.summary}")
+        lines.extend(self._line(message, user_label, ai_label) for message in view.messages)
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def needs_summary(self, history: List[Dict[str, Any]], state: Optional[Dict[str, Any]] = None) -> bool:
+        state = state or empty_memory_state()
+        return len(history) - self.max_recent_messages > state.get("summarized_count", 0)
+
+    def summarize(self, history: List[Dict[str, Any]], state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fold messages that aged out of the verbatim window into the summary (blocking)."""
+        state = dict(state or empty_memory_state())
+        target = len(history) - self.max_recent_messages
+        start = state.get("summarized_count", 0)
+        if target <= start:
+            return state
+        state["summary"] = self.summarizer(state.get("summary", ""), history[start:target])
+        state["summarized_count"] = target
+        return state
+
+    def summarize_in_background(self, history: List[Dict[str, Any]], state: Optional[Dict[str, Any]],
+                                on_done: Callable[[Dict[str, Any]], None]) -> Optional[Future]:
+        """Run summarize() on the memory executor and hand the new state to on_done."""
+        if not self.needs_summary(history, state):
+            return None
+        history = list(history)
+
+        def run():
+            try:
+                on_done(self.summarize(history, state))
+            except Exception as e:
+                print(f"❌ [MEMORY] Summary update failed: {e}")
+
+        return summary_executor.submit(run)
+
+    def _summarize_with_gpt(self, summary: str, messages: List[Dict[str, Any]]) -> str:
+        transcript = "\n".join(self._line(message, "Student", "Tutor") for message in messages)
+        response = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[{"role": "user", "content": SUMMARY_PROMPT.format(summary=summary or "(none)", messages=transcript)}],
+            temperature=0.2,
+            max_tokens=SUMMARY_MAX_TOKENS,
+        )
+        new_summary = (response.choices[0].message.content or "").strip()
+        print(f"🧠 [MEMORY] Summarized {len(messages)} messages ({estimate_tokens(new_summary)} tokens)")
+        return new_summary or summary
+
+
+# Global instance
+conversation_memory = ConversationMemory()
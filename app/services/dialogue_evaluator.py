@@ -1,7 +1,8 @@
 import json
-from openai import OpenAI
+from app.services.vendor_clients import LazyClient, get_openai_client
 
-client = OpenAI()
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
 
 def evaluate_dialogue_with_gpt(ai_prompt: str, expected_keywords: str, user_response: str) -> dict:
     prompt = f"""
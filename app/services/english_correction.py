@@ -11,12 +11,12 @@ This service provides sophisticated English language correction and accent detec
 Uses OpenAI GPT-4 for advanced language understanding and correction.
 """
 
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
+from app.services.vendor_clients import LazyClient, get_openai_client
 import re
 import json
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
 
 def correct_english_text(text: str) -> dict:
     """
@@ -1,18 +1,37 @@
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
+from app.services.vendor_clients import LazyClient, get_openai_client
 import json
-import re
+import logging
 import asyncio
-from app.services.settings_manager import get_ai_settings
+from app.services.settings_manager import get_ai_settings, get_cached_ai_settings
 from app.schemas.settings import AISettings
-from app.services.safety_manager import get_ai_safety_settings
+from app.services.safety_manager import get_ai_safety_settings, get_cached_ai_safety_settings
 from app.schemas.safety import AISafetyEthicsSettings
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
+from app.services.prompt_registry import prompt_registry
+from app.services.json_stream import JsonStringFieldStreamer
+from app.services.local_scoring import (
+    score_repeat_after_me, score_quick_response,
+    build_repeat_after_me_result, build_quick_response_result,
+)
+from app.services.structured_output import run_structured_evaluation
+from app.services.conversation_memory import conversation_memory
+from app.schemas.evaluation import (
+    RepeatAfterMeEvaluation, QuickResponseEvaluation, ListenAndReplyEvaluation,
+    DailyRoutineNarrationEvaluation, QuickAnswerEvaluation, RoleplayEvaluation, StorytellingEvaluation,
+    GroupDialogueEvaluation, ProblemSolvingEvaluation, AbstractTopicEvaluation, MockInterviewEvaluation,
+    NewsSummaryEvaluation, CriticalThinkingEvaluation, AcademicPresentationEvaluation,
+    InDepthInterviewEvaluation, SpontaneousSpeechEvaluation, SensitiveScenarioEvaluation,
+    CriticalOpinionEvaluation,
+)
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
 
 # Global variable to hold the event loop passed from the main thread
 main_thread_loop = None
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
 
 
 # --- Dynamic System Prompt Builder for AI Tutor Settings ---
@@ -65,26 +84,12 @@ def _apply_safety_guidelines(prompt: str, safety_settings: AISafetyEthicsSetting
     
     return "\n".join(prompt_parts)
 
-def analyze_english_input_eng_only(user_text: str, conversation_stage: str, topic: Optional[str] = None, loop: Optional[asyncio.AbstractEventLoop] = None) -> dict:
-    """
-    Enhanced multi-stage conversational AI for English learning with consistent Urdu correction
-    and specialized logic flows for different learning areas.
-    
-    Features:
-    - Consistent Urdu-to-English correction for every response
-    - Separate logic flows for Vocabulary, Sentence Structure, and Topics
-    - Fallback to normal NLP conversation outside learning areas
-    - Professional error handling and edge case management
-    """
-    global main_thread_loop
-    if loop:
-        main_thread_loop = loop
-
-    print(f"🔍 [ENGLISH_ONLY] Analyzing input for stage: {conversation_stage} with topic: {topic}")
-    print(f"📝 User input: '{user_text}'")
+# --- English-Only Tutor Prompts ---
+# Static instructions go first (system message, compiled once per settings/safety
+# version by the prompt registry); the learner's text, stage and topic follow as
+# the user message so the provider can reuse the cached prefix.
 
-    # Enhanced base prompt with consistent Urdu correction
-    base_prompt = f"""
+ENGLISH_ONLY_BASE_INSTRUCTIONS = """
 You are a professional, friendly English tutor AI designed to help learners improve their English skills. 
 Your role is to engage in real conversations while providing consistent, gentle corrections.
 
@@ -94,10 +99,7 @@ If the user speaks in Urdu, Hindi, or any non-English language:
 2. Then, ALWAYS add: "By the way, in English you could say, \\"<the English translation of the user's sentence>\\"."
 3. This correction must happen EVERY TIME, not just once
 
-**User's spoken text:** "{user_text}"
-
-**Current Conversation Stage:** {conversation_stage}
-**Current Topic:** {topic if topic else 'None'}
+The user's spoken text, the current conversation stage and the current topic are given in the user message.
 
 **Response Format Requirements:**
 - Always respond in a warm, encouraging tone
@@ -106,45 +108,15 @@ If the user speaks in Urdu, Hindi, or any non-English language:
 - Use the exact JSON format specified for each stage
 """
 
-    try:
-        # Stage-specific logic implementation
-        if conversation_stage == "greeting":
-            return _handle_greeting_stage(user_text, base_prompt)
-        elif conversation_stage == "intent_detection":
-            return _handle_intent_detection_stage(user_text, base_prompt)
-        elif conversation_stage == "option_selection":
-            return _handle_option_selection_stage(user_text, base_prompt)
-        elif conversation_stage == "vocabulary_learning":
-            return _handle_vocabulary_learning_stage(user_text, base_prompt, topic)
-        elif conversation_stage == "sentence_practice":
-            return _handle_sentence_practice_stage(user_text, base_prompt, topic)
-        elif conversation_stage == "topic_discussion_prompt":
-            return _handle_topic_discussion_prompt_stage(user_text, base_prompt)
-        elif conversation_stage == "topic_discussion":
-            return _handle_topic_discussion_stage(user_text, base_prompt, topic)
-        elif conversation_stage == "grammar_focus":
-            return _handle_grammar_focus_stage(user_text, base_prompt, topic)
-        else:
-            # Fallback to normal NLP conversation for unknown stages
-            return _handle_fallback_conversation(user_text, base_prompt, conversation_stage)
+ENGLISH_ONLY_LEARNER_CONTEXT = """
+**User's spoken text:** "{user_text}"
 
-    except Exception as e:
-        print(f"❌ [ENGLISH_ONLY] Critical error during analysis: {str(e)}")
-        # Professional fallback response with error logging
-        return {
-            "conversation_text": f"I'm experiencing a technical difficulty at the moment, but I understood: '{user_text}'. Let's continue our conversation!",
-            "next_stage": conversation_stage,
-            "needs_correction": False,
-            "corrected_sentence": "",
-            "correction_type": "none",
-            "error_occurred": True,
-            "error_message": str(e)
-        }
+**Current Conversation Stage:** {conversation_stage}
+**Current Topic:** {topic}
+"""
 
-def _handle_greeting_stage(user_text: str, base_prompt: str) -> dict:
-    """Handle the initial greeting stage with enhanced Urdu correction"""
-    prompt = base_prompt + """
-**Task:** This is the user's first response after your greeting. Your goal is to understand their intent and guide them.
+ENGLISH_ONLY_STAGE_TASKS = {
+    "greeting": """**Task:** This is the user's first response after your greeting. Your goal is to understand their intent and guide them.
 
 **Requirements:**
 1. **Language Detection:** Check if the user is speaking in Urdu, Hindi, or English
@@ -169,14 +141,8 @@ def _handle_greeting_stage(user_text: str, base_prompt: str) -> dict:
     "detected_language": "<english|urdu|hindi|mixed>",
     "user_intent": "<vocabulary|grammar|speaking|general|unknown>"
 }
-"""
-    
-    return _execute_ai_analysis(prompt, "greeting")
-
-def _handle_intent_detection_stage(user_text: str, base_prompt: str) -> dict:
-    """Handle intent detection with enhanced analysis"""
-    prompt = base_prompt + """
-**Task:** Analyze the user's response to understand their specific learning needs and preferences.
+""",
+    "intent_detection": """**Task:** Analyze the user's response to understand their specific learning needs and preferences.
 
 **Analysis Requirements:**
 1. **Language Assessment:** Determine if they're speaking English, Urdu, or mixed
@@ -200,14 +166,8 @@ def _handle_intent_detection_stage(user_text: str, base_prompt: str) -> dict:
     "learning_path": "<vocabulary|grammar|conversation|mixed>",
     "skill_assessment": "<beginner|intermediate|advanced>"
 }
-"""
-    
-    return _execute_ai_analysis(prompt, "intent_detection")
-
-def _handle_option_selection_stage(user_text: str, base_prompt: str) -> dict:
-    """Handle learning option selection with intelligent routing"""
-    prompt = base_prompt + """
-**Task:** The user has been offered learning options. Analyze their choice and transition to the appropriate learning path.
+""",
+    "option_selection": """**Task:** The user has been offered learning options. Analyze their choice and transition to the appropriate learning path.
 
 **Option Detection:**
 1. **Vocabulary Building:** Words, definitions, usage examples
@@ -233,17 +193,8 @@ def _handle_option_selection_stage(user_text: str, base_prompt: str) -> dict:
     "selected_option": "<vocabulary|grammar|topic|pronunciation|unclear>",
     "transition_message": "<Specific transition text>"
 }
-"""
-    
-    return _execute_ai_analysis(prompt, "option_selection")
-
-def _handle_vocabulary_learning_stage(user_text: str, base_prompt: str, current_topic: str = None) -> dict:
-    """Handle vocabulary learning with specialized logic"""
-    # Fix the f-string formatting issue by properly escaping curly braces
-    topic_context = current_topic if current_topic else 'General Vocabulary'
-    
-    prompt = base_prompt + f"""
-**Task:** You are in a specialized vocabulary building session. This is NOT general conversation.
+""",
+    "vocabulary_learning": """**Task:** You are in a specialized vocabulary building session. This is NOT general conversation.
 
 **Vocabulary Learning Requirements:**
 1. **Word Introduction:** Introduce new vocabulary words relevant to the context
@@ -252,7 +203,6 @@ def _handle_vocabulary_learning_stage(user_text: str, base_prompt: str, current_
 4. **Consistent Correction:** ALWAYS correct any non-English input with English translations
 5. **Progressive Difficulty:** Gradually increase word complexity based on user progress
 
-**Current Topic Context:** {topic_context}
 
 **Vocabulary Session Flow:**
 - Introduce 1-2 new words per interaction
@@ -262,7 +212,7 @@ def _handle_vocabulary_learning_stage(user_text: str, base_prompt: str, current_
 - Maintain vocabulary focus throughout
 
 **JSON Output:**
-{{
+{
     "conversation_text": "<Vocabulary-focused response with new words and exercises>",
     "next_stage": "vocabulary_learning",
     "needs_correction": <true/false>,
@@ -271,18 +221,9 @@ def _handle_vocabulary_learning_stage(user_text: str, base_prompt: str, current_
     "vocabulary_words": ["<word1>", "<word2>"],
     "learning_activity": "<word_introduction|sentence_practice|definition_review|pronunciation_practice>",
     "session_progress": "<beginning|middle|advanced>"
-}}
-"""
-    
-    return _execute_ai_analysis(prompt, "vocabulary_learning")
-
-def _handle_sentence_practice_stage(user_text: str, base_prompt: str, current_topic: str = None) -> dict:
-    """Handle sentence practice with grammar focus"""
-    # Fix the f-string formatting issue by properly escaping curly braces
-    topic_context = current_topic if current_topic else 'General Grammar'
-    
-    prompt = base_prompt + f"""
-**Task:** You are in a specialized sentence structure and grammar practice session. This is NOT general conversation.
+}
+""",
+    "sentence_practice": """**Task:** You are in a specialized sentence structure and grammar practice session. This is NOT general conversation.
 
 **Sentence Practice Requirements:**
 1. **Grammar Analysis:** Evaluate sentence structure, verb tense, word order
@@ -291,7 +232,6 @@ def _handle_sentence_practice_stage(user_text: str, base_prompt: str, current_to
 4. **Practice Reinforcement:** Ask follow-up questions to reinforce correct usage
 5. **Consistent Urdu Correction:** ALWAYS translate any non-English input
 
-**Current Topic Context:** {topic_context}
 
 **Grammar Focus Areas:**
 - Subject-verb agreement
@@ -301,7 +241,7 @@ def _handle_sentence_practice_stage(user_text: str, base_prompt: str, current_to
 - Sentence structure
 
 **JSON Output:**
-{{
+{
     "conversation_text": "<Grammar-focused response with corrections and practice>",
     "next_stage": "sentence_practice",
     "needs_correction": <true/false>,
@@ -309,15 +249,9 @@ def _handle_sentence_practice_stage(user_text: str, base_prompt: str, current_to
     "correction_type": "<grammar|tense|structure|article|preposition|none>",
     "grammar_rule": "<Specific grammar rule being practiced>",
     "practice_suggestion": "<Next practice activity>"
-}}
-"""
-    
-    return _execute_ai_analysis(prompt, "sentence_practice")
-
-def _handle_topic_discussion_prompt_stage(user_text: str, base_prompt: str) -> dict:
-    """Handle topic selection prompt"""
-    prompt = base_prompt + """
-**Task:** The user wants to discuss a topic. Extract their topic choice and confirm it.
+}
+""",
+    "topic_discussion_prompt": """**Task:** The user wants to discuss a topic. Extract their topic choice and confirm it.
 
 **Topic Extraction Requirements:**
 1. **Identify Topic:** Extract the specific topic from user's response
@@ -342,17 +276,11 @@ def _handle_topic_discussion_prompt_stage(user_text: str, base_prompt: str) -> d
     "extracted_topic": "<The specific topic identified>",
     "discussion_approach": "<How we'll approach this topic>"
 }
-"""
-    
-    return _execute_ai_analysis(prompt, "topic_discussion_prompt")
-
-def _handle_topic_discussion_stage(user_text: str, base_prompt: str, current_topic: str) -> dict:
-    """Handle ongoing topic discussion with learning focus"""
-    prompt = base_prompt + f"""
-**Task:** You are in a topic-based discussion about "{current_topic}". This is a learning-focused conversation.
+""",
+    "topic_discussion": """**Task:** You are in a topic-based discussion about the learner's Current Topic. This is a learning-focused conversation.
 
 **Topic Discussion Requirements:**
-1. **Stay on Topic:** Keep conversation focused on "{current_topic}"
+1. **Stay on Topic:** Keep conversation focused on the Current Topic
 2. **Language Learning:** Use the topic to teach English vocabulary and expressions
 3. **Consistent Correction:** ALWAYS correct any non-English input with English translations
 4. **Engaging Questions:** Ask relevant follow-up questions to maintain interest
@@ -366,7 +294,7 @@ def _handle_topic_discussion_stage(user_text: str, base_prompt: str, current_top
 - Provide gentle corrections when needed
 
 **JSON Output:**
-{{
+{
     "conversation_text": "<Topic-focused response with learning elements>",
     "next_stage": "topic_discussion",
     "needs_correction": <true/false>,
@@ -375,18 +303,9 @@ def _handle_topic_discussion_stage(user_text: str, base_prompt: str, current_top
     "topic_vocabulary": ["<relevant_word1>", "<relevant_word2>"],
     "discussion_progress": "<beginning|middle|advanced>",
     "next_question": "<Follow-up question to maintain engagement>"
-}}
-"""
-    
-    return _execute_ai_analysis(prompt, "topic_discussion")
-
-def _handle_grammar_focus_stage(user_text: str, base_prompt: str, current_topic: str = None) -> dict:
-    """Handle grammar-focused learning sessions"""
-    # Fix the f-string formatting issue by properly escaping curly braces
-    topic_context = current_topic if current_topic else 'General Grammar'
-    
-    prompt = base_prompt + f"""
-**Task:** You are in a specialized grammar learning session. Focus on specific grammar rules and structures.
+}
+""",
+    "grammar_focus": """**Task:** You are in a specialized grammar learning session. Focus on specific grammar rules and structures.
 
 **Grammar Learning Requirements:**
 1. **Rule Explanation:** Clearly explain grammar rules being practiced
@@ -395,7 +314,6 @@ def _handle_grammar_focus_stage(user_text: str, base_prompt: str, current_topic:
 4. **Progressive Learning:** Build complexity gradually
 5. **Consistent Urdu Correction:** ALWAYS translate any non-English input
 
-**Current Topic Context:** {topic_context}
 
 **Grammar Focus Areas:**
 - Parts of speech
@@ -405,7 +323,7 @@ def _handle_grammar_focus_stage(user_text: str, base_prompt: str, current_topic:
 - Punctuation rules
 
 **JSON Output:**
-{{
+{
     "conversation_text": "<Grammar-focused response with rule explanation>",
     "next_stage": "grammar_focus",
     "needs_correction": <true/false>,
@@ -413,15 +331,9 @@ def _handle_grammar_focus_stage(user_text: str, base_prompt: str, current_topic:
     "correction_type": "<grammar|tense|structure|punctuation|none>",
     "grammar_rule": "<Specific grammar rule being taught>",
     "practice_examples": ["<example1>", "<example2>"]
-}}
-"""
-    
-    return _execute_ai_analysis(prompt, "grammar_focus")
-
-def _handle_fallback_conversation(user_text: str, base_prompt: str, conversation_stage: str) -> dict:
-    """Handle unknown stages with fallback to normal NLP conversation"""
-    prompt = base_prompt + f"""
-**Task:** You are in an unknown conversation stage: "{conversation_stage}". Provide a natural, helpful response.
+}
+""",
+    "fallback": """**Task:** You are in an unknown conversation stage (see Current Conversation Stage). Provide a natural, helpful response.
 
 **Fallback Requirements:**
 1. **Natural Response:** Engage in normal conversation
@@ -447,61 +359,163 @@ def _handle_fallback_conversation(user_text: str, base_prompt: str, conversation
     "fallback_reason": "<Why fallback was triggered>",
     "recovery_suggestion": "<How to return to structured learning>"
 }
-"""
+""",
+}
+
+# Topic label used when the learner has not chosen a topic yet
+ENGLISH_ONLY_DEFAULT_TOPICS = {
+    "vocabulary_learning": "General Vocabulary",
+    "sentence_practice": "General Grammar",
+    "grammar_focus": "General Grammar",
+}
+
+def _decorate_with_tutor_settings(prompt: str, settings: AISettings, safety_settings: AISafetyEthicsSettings) -> str:
+    """Behaviour settings first, then the mandatory safety layer (same order as before)."""
+    return _apply_safety_guidelines(_build_system_prompt_from_settings(prompt, settings), safety_settings)
+
+for _stage_name, _stage_task in ENGLISH_ONLY_STAGE_TASKS.items():
+    prompt_registry.register(
+        _stage_name, "english_only",
+        ENGLISH_ONLY_BASE_INSTRUCTIONS + "\n" + _stage_task,
+        ENGLISH_ONLY_LEARNER_CONTEXT,
+        decorate=_decorate_with_tutor_settings,
+    )
+
+def analyze_english_input_eng_only(user_text: str, conversation_stage: str, topic: Optional[str] = None, loop: Optional[asyncio.AbstractEventLoop] = None, on_text_delta: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Enhanced multi-stage conversational AI for English learning with consistent Urdu correction
+    and specialized logic flows for different learning areas.
     
-    return _execute_ai_analysis(prompt, "fallback")
+    Features:
+    - Consistent Urdu-to-English correction for every response
+    - Separate logic flows for Vocabulary, Sentence Structure, and Topics
+    - Fallback to normal NLP conversation outside learning areas
+    - Professional error handling and edge case management
+
+    When `on_text_delta` is given, the completion is streamed and the callback
+    receives `conversation_text` piece by piece (from this worker thread) as it
+    is generated; the full parsed result is still returned at the end.
+    """
+    global main_thread_loop
+    if loop:
+        main_thread_loop = loop
+
+    logger.debug("english_only.analysis.start", stage=conversation_stage, topic=topic, input_chars=len(user_text))
+
+    stage_name = conversation_stage if conversation_stage in ENGLISH_ONLY_STAGE_TASKS else "fallback"
+    learner_context = {
+        "user_text": user_text,
+        "conversation_stage": conversation_stage,
+        "topic": topic or ENGLISH_ONLY_DEFAULT_TOPICS.get(conversation_stage, "None"),
+    }
+
+    try:
+        # Stage-specific instructions come from the precompiled prompt registry
+        return _execute_ai_analysis(stage_name, learner_context, on_text_delta)
+
+    except Exception as e:
+        logger.exception("english_only.analysis.failed", stage=conversation_stage)
+        # Professional fallback response with error logging
+        return {
+            "conversation_text": f"I'm experiencing a technical difficulty at the moment, but I understood: '{user_text}'. Let's continue our conversation!",
+            "next_stage": conversation_stage,
+            "needs_correction": False,
+            "corrected_sentence": "",
+            "correction_type": "none",
+            "error_occurred": True,
+            "error_message": str(e)
+        }
+
+def _stream_completion_output(messages: List[Dict[str, str]], max_tokens: int, on_text_delta: Callable[[str], None]) -> str:
+    """
+    Stream the JSON completion, forwarding `conversation_text` deltas as they
+    are decoded, and return the full raw output for normal parsing.
+    """
+    stream = client.chat.completions.create(
+        model="gpt-4o",
+        messages=messages,
+        response_format={"type": "json_object"},
+        temperature=0.7,
+        max_tokens=max_tokens,
+        timeout=30,
+        stream=True
+    )
+    streamer = JsonStringFieldStreamer("conversation_text")
+    output_parts = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+        output_parts.append(delta)
+        text = streamer.feed(delta)
+        if text:
+            try:
+                on_text_delta(text)
+            except Exception as callback_error:
+                logger.throttled(logging.WARNING, "gpt.analysis.delta_callback_failed", error=str(callback_error))
+    return "".join(output_parts).strip()
+
+def _get_tutor_settings() -> Tuple[AISettings, AISafetyEthicsSettings]:
+    """
+    AI behaviour and safety settings for the worker thread. Fresh cached values are
+    read directly; only a cold or expired cache hops to the main event loop.
+    """
+    settings = get_cached_ai_settings()
+    safety_settings = get_cached_ai_safety_settings()
+    if settings is not None and safety_settings is not None:
+        return settings, safety_settings
 
+    if not main_thread_loop:
+        raise RuntimeError("Event loop not available in thread.")
 
-def _execute_ai_analysis(prompt: str, stage_name: str) -> dict:
+    # Schedule the coroutines on the main event loop from the current thread
+    future_settings = asyncio.run_coroutine_threadsafe(get_ai_settings(), main_thread_loop)
+    future_safety_settings = asyncio.run_coroutine_threadsafe(get_ai_safety_settings(), main_thread_loop)
+    return future_settings.result(), future_safety_settings.result()
+
+def _execute_ai_analysis(stage_name: str, learner_context: Dict[str, str], on_text_delta: Optional[Callable[[str], None]] = None) -> dict:
     """
     Execute AI analysis with professional error handling and dynamic settings.
     This is the core function that communicates with the OpenAI API for the
     'English Only' feature, now enhanced to respect dynamic AI Tutor Settings.
+    The system prompt (stage instructions + settings + safety) is precompiled per
+    settings/safety version; only the learner context is rendered per call.
+    With `on_text_delta`, the completion is streamed (see _stream_completion_output).
     """
     try:
-        print(f"🤖 [ENGLISH_ONLY] Executing AI analysis for stage: {stage_name}")
-
-        if not main_thread_loop:
-            raise RuntimeError("Event loop not available in thread.")
+        logger.debug("gpt.analysis.start", stage=stage_name, streaming=on_text_delta is not None)
 
         # --- Professional Integration of AI Tutor Settings & Safety ---
-        # 1. Fetch both AI behavior and safety settings concurrently for efficiency.
-        
-        # Schedule the coroutines on the main event loop from the current thread
-        future_settings = asyncio.run_coroutine_threadsafe(get_ai_settings(), main_thread_loop)
-        future_safety_settings = asyncio.run_coroutine_threadsafe(get_ai_safety_settings(), main_thread_loop)
-
-        # Wait for the results
-        settings = future_settings.result()
-        safety_settings = future_safety_settings.result()
+        settings, safety_settings = _get_tutor_settings()
+        compiled_prompt = prompt_registry.get(stage_name, "english_only", settings, safety_settings)
+        messages = compiled_prompt.messages(**learner_context)
         
-        # 2. Build the behavioral prompt using the original, unchanged flow.
-        behavioral_prompt = _build_system_prompt_from_settings(prompt, settings)
-        
-        # 3. Layer the mandatory safety guidelines on top of the behavioral prompt.
-        final_prompt = _apply_safety_guidelines(behavioral_prompt, safety_settings)
-        
-        # 4. Calculate max_tokens from settings. 1 word is roughly 1.5 tokens.
+        # Calculate max_tokens from settings. 1 word is roughly 1.5 tokens.
         max_tokens = int(settings.max_response_length * 1.5)
-        print(f"⚙️ [SETTINGS] Applying max_response_length: {settings.max_response_length} words (~{max_tokens} tokens)")
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": final_prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            max_tokens=max_tokens,  # Apply dynamic token limit
-            timeout=30  # 30 second timeout
-        )
         
-        output = response.choices[0].message.content.strip()
-        print(f"✅ [ENGLISH_ONLY] GPT Raw Output for {stage_name}: {output}")
+        if on_text_delta:
+            output = _stream_completion_output(messages, max_tokens, on_text_delta)
+        else:
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                response_format={"type": "json_object"},
+                temperature=0.7,
+                max_tokens=max_tokens,  # Apply dynamic token limit
+                timeout=30  # 30 second timeout
+            )
+            output = response.choices[0].message.content.strip()
+        # The raw output echoes the learner's words; log its size, not its content
+        logger.debug("gpt.analysis.output", stage=stage_name, output_chars=len(output), max_tokens=max_tokens)
         
         # Parse JSON response with error handling
         try:
             result = json.loads(output)
         except json.JSONDecodeError as json_error:
-            print(f"❌ [ENGLISH_ONLY] JSON parsing error for {stage_name}: {json_error}")
+            logger.error("gpt.analysis.invalid_json", stage=stage_name, error=str(json_error),
+                         output_chars=len(output))
             # Return fallback response with error information
             return {
                 "conversation_text": f"I'm having trouble processing that response. Let's continue our conversation!",
@@ -527,18 +541,18 @@ def _execute_ai_analysis(prompt: str, stage_name: str) -> dict:
         for field, default_value in required_fields.items():
             if field not in result:
                 result[field] = default_value
-                print(f"⚠️ [ENGLISH_ONLY] Missing field '{field}' for {stage_name}, using default: {default_value}")
+                logger.warning("gpt.analysis.missing_field", stage=stage_name, field=field)
         
         # Validate and sanitize the response
         result["conversation_text"] = str(result["conversation_text"]).strip()
         if not result["conversation_text"]:
             result["conversation_text"] = "Let's continue our conversation!"
         
-        print(f"✅ [ENGLISH_ONLY] Successfully processed {stage_name} response")
+        logger.debug("gpt.analysis.done", stage=stage_name, next_stage=result["next_stage"])
         return result
         
     except Exception as e:
-        print(f"❌ [ENGLISH_ONLY] Critical error during AI analysis for {stage_name}: {str(e)}")
+        logger.exception("gpt.analysis.failed", stage=stage_name)
         # Return comprehensive fallback response
         return {
             "conversation_text": f"I'm experiencing a technical difficulty at the moment. Let's continue our conversation!",
@@ -611,7 +625,7 @@ Remember:
         )
 
         output = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-        print("GPT raw output:\n", output)
+        logger.debug("fluency.feedback.output", output_chars=len(output))
 
         # Robust parsing
         result = {}
@@ -631,11 +645,11 @@ Remember:
         if not result.get("pronunciation_score") or not result.get("feedback"):
             raise ValueError("Invalid GPT response format")
 
-        print("Parsed result: ", result)
+        logger.debug("fluency.feedback.parsed", pronunciation_score=result["pronunciation_score"])
         return result
 
-    except Exception as e:
-        print("❌ Error during fluency evaluation:", str(e))
+    except Exception:
+        logger.exception("fluency.feedback.failed")
         return {
             "pronunciation_score": "0%",
             "tone_intonation": "کمزور",
@@ -698,7 +712,7 @@ Remember:
         )
 
         output = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-        print("GPT raw output:\n", output)
+        logger.debug("fluency.feedback.output", output_chars=len(output))
 
         # Robust parsing
         result = {}
@@ -718,11 +732,11 @@ Remember:
         if not result.get("pronunciation_score") or not result.get("feedback"):
             raise ValueError("Invalid GPT response format")
 
-        print("Parsed result: ", result)
+        logger.debug("fluency.feedback.parsed", pronunciation_score=result["pronunciation_score"])
         return result
 
-    except Exception as e:
-        print("❌ Error during fluency evaluation:", str(e))
+    except Exception:
+        logger.exception("fluency.feedback.failed")
         return {
             "pronunciation_score": "0%",
             "tone_intonation": "کمزور",
@@ -739,10 +753,7 @@ def evaluate_response(expected: str, actual: str) -> dict:
         "tone_intonation": str
     }
     """
-    print("evaluate_response: ")
-    print("Actual: ",actual)
-    print("Expected: ",expected)
-    print("================================")
+    logger.debug("fluency.evaluation.start", actual_chars=len(actual), expected_chars=len(expected))
     feedback = get_fluency_feedback(actual, expected)
 
     try:
@@ -766,7 +777,7 @@ def evaluate_response(expected: str, actual: str) -> dict:
             feedback_text += " اگلے جملے کے لیے اردو میں کچھ کہیں۔"
 
 
-    print("✅ is_correct: ", is_correct)
+    logger.debug("fluency.evaluation.done", score=score, is_correct=is_correct)
 
     return {
         "feedback_text": feedback_text,
@@ -785,10 +796,7 @@ def evaluate_response_eng(expected: str, actual: str) -> dict:
         "tone_intonation": str
     }
     """
-    print("evaluate_response: ")
-    print("Actual: ",actual)
-    print("Expected: ",expected)
-    print("================================")
+    logger.debug("fluency.evaluation.start", actual_chars=len(actual), expected_chars=len(expected))
     feedback = get_fluency_feedback_eng(actual, expected)
 
     try:
@@ -813,7 +821,7 @@ def evaluate_response_eng(expected: str, actual: str) -> dict:
             feedback_text += " Please say something in Urdu"
 
     
-    print("✅ is_correct: ", is_correct)
+    logger.debug("fluency.evaluation.done", score=score, is_correct=is_correct)
 
     return {
         "feedback_text": feedback_text,
@@ -822,27 +830,12 @@ def evaluate_response_eng(expected: str, actual: str) -> dict:
         "tone_intonation": feedback["tone_intonation"]
     }
 
-def evaluate_response_ex1_stage1(expected_phrase: str, user_response: str) -> dict:
-    """
-    Evaluate the student's response to the expected phrase.
-    Returns a structured JSON:
-    {
-      "feedback": "...",
-      "score": int 0-100,
-      "is_correct": bool,
-      "urdu_used": bool,
-      "completed": bool
-    }
-    """
-
-    prompt = f"""
+EX1_STAGE1_INSTRUCTIONS = """
 You are an expert English evaluator for a language learning app.
 
 Your task is to compare the student's response with the expected phrase and return feedback in JSON format only.
 
-📥 Inputs:
-- Expected: "{expected_phrase}"
-- Student: "{user_response}"
+📥 The inputs are given in the user message.
 
 🎯 Evaluate on:
 - Accuracy (match in meaning/form)
@@ -850,13 +843,13 @@ Your task is to compare the student's response with the expected phrase and retu
 - Relevance
 
 🎯 Output JSON format:
-{{
+{
   "feedback": "Constructive 1-line feedback",
   "score": integer (0–100),
   "is_correct": true if score >= 80 else false,
   "urdu_used": false,
   "completed": true if score >= 80 else false
-}}
+}
 
 📌 Rules:
 - Respond ONLY with valid JSON (no commentary or explanation).
@@ -864,68 +857,56 @@ Your task is to compare the student's response with the expected phrase and retu
 - Feedback must be helpful and 1 line only.
 """
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3
-    )
-
-    # Extract the response
-    raw_content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-    print(f"🔍 [FEEDBACK] Raw GPT response: {raw_content}")
-
-    # Try to extract JSON object even if GPT adds comments
-    try:
-        # Use regex to extract JSON part only
-        json_match = re.search(r"\{.*\}", raw_content, re.DOTALL)
-        json_str = json_match.group(0) if json_match else raw_content
-        result = json.loads(json_str)
-
-        # Validation fallback
-        required_keys = {"feedback", "score", "is_correct", "urdu_used", "completed"}
-        if not required_keys.issubset(result.keys()):
-            raise ValueError("Missing keys in GPT response")
-
-        print(f"✅ [FEEDBACK] Parsed result: {result}")
-        return result
-
-    except Exception as e:
-        print(f"❌ [FEEDBACK] Error: {e}")
-        print(f"❌ [FEEDBACK] Raw content: {raw_content}")
-
-        # Fallback default response
-        return {
-            "feedback": "Good try, but let's improve the accuracy.",
-            "score": 50,
-            "is_correct": False,
-            "urdu_used": False,
-            "completed": False
-        }
-    
+EX1_STAGE1_INPUTS = """
+📥 Inputs:
+- Expected: "{expected_phrase}"
+- Student: "{user_response}"
+"""
 
+prompt_registry.register(1, 1, EX1_STAGE1_INSTRUCTIONS, EX1_STAGE1_INPUTS)
 
-def evaluate_response_ex2_stage1(expected_answers: list, user_response: str) -> dict:
+def evaluate_response_ex1_stage1(expected_phrase: str, user_response: str, use_local_scorer: bool = True) -> dict:
     """
-    Evaluate the student's response to quick response prompts.
+    Evaluate the student's response to the expected phrase.
+    Clear passes/failures are scored locally (see local_scoring.py); only the
+    ambiguous band is sent to GPT unless use_local_scorer is False.
     Returns a structured JSON:
     {
       "feedback": "...",
       "score": int 0-100,
       "is_correct": bool,
       "urdu_used": bool,
-      "completed": bool,
-      "suggested_improvement": "..."
+      "completed": bool
     }
     """
+    if use_local_scorer:
+        local = score_repeat_after_me(expected_phrase, user_response)
+        if local.is_decisive:
+            logger.debug("feedback.local_score.decisive", evaluator="ex1_stage1", decision=local.decision, score=local.score)
+            return build_repeat_after_me_result(local, expected_phrase)
+        logger.debug("feedback.local_score.ambiguous", evaluator="ex1_stage1", score=local.score)
+
+    # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+    prompt_messages = prompt_registry.get(1, 1).messages(expected_phrase=expected_phrase, user_response=user_response)
+
+    # Fallback default response (only used for fields GPT never produced)
+    fallback = {
+        "feedback": "Good try, but let's improve the accuracy.",
+        "score": 50,
+        "is_correct": False,
+        "urdu_used": False,
+        "completed": False
+    }
+    return run_structured_evaluation(client, "ex1_stage1", RepeatAfterMeEvaluation, prompt_messages, fallback)
 
-    prompt = f"""
+
+
+EX2_STAGE1_INSTRUCTIONS = """
 You are an expert English evaluator for a language learning app specializing in quick response exercises.
 
 Your task is to evaluate the student's response against multiple acceptable answers and provide constructive feedback.
 
-📥 Inputs:
-- Expected Answers: {expected_answers}
-- Student Response: "{user_response}"
+📥 The inputs are given in the user message.
 
 🎯 Evaluation Criteria:
 1. **Accuracy**: Does the response match any of the expected answers in meaning?
@@ -934,14 +915,14 @@ Your task is to evaluate the student's response against multiple acceptable answ
 4. **Relevance**: Does the response appropriately answer the question?
 
 🎯 Output JSON format:
-{{
+{
   "feedback": "Constructive 1-2 line feedback in English",
   "score": integer (0–100),
   "is_correct": true if score >= 70 else false,
   "urdu_used": false (always false for this exercise),
   "completed": true if score >= 70 else false,
   "suggested_improvement": "One specific suggestion for improvement"
-}}
+}
 
 📌 Scoring Guide:
 - 90-100: Perfect or near-perfect response
@@ -958,49 +939,19 @@ Your task is to evaluate the student's response against multiple acceptable answ
 -- Feedback must be encouraging and constructive.
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-
-        # Extract the response
-        raw_content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-        print(f"🔍 [FEEDBACK] Raw GPT response for ex2: {raw_content}")
-
-        # Try to extract JSON object even if GPT adds comments
-        json_match = re.search(r"\{.*\}", raw_content, re.DOTALL)
-        json_str = json_match.group(0) if json_match else raw_content
-        result = json.loads(json_str)
-
-        # Validation fallback
-        required_keys = {"feedback", "score", "is_correct", "urdu_used", "completed", "suggested_improvement"}
-        if not required_keys.issubset(result.keys()):
-            raise ValueError("Missing keys in GPT response")
-
-        print(f"✅ [FEEDBACK] Parsed result for ex2: {result}")
-        return result
-
-    except Exception as e:
-        print(f"❌ [FEEDBACK] Error in ex2 evaluation: {e}")
-        print(f"❌ [FEEDBACK] Raw content: {raw_content}")
-
-        # Fallback default response
-        return {
-            "feedback": "Good effort! Let's practice more to improve your response.",
-            "score": 50,
-            "is_correct": False,
-            "urdu_used": False,
-            "completed": False,
-            "suggested_improvement": "Try to match the expected answer more closely."
-        }
-    
+EX2_STAGE1_INPUTS = """
+📥 Inputs:
+- Expected Answers: {expected_answers}
+- Student Response: "{user_response}"
+"""
 
+prompt_registry.register(1, 2, EX2_STAGE1_INSTRUCTIONS, EX2_STAGE1_INPUTS)
 
-def evaluate_response_ex3_stage1(expected_keywords: list, user_response: str, ai_prompt: str) -> dict:
+def evaluate_response_ex2_stage1(expected_answers: list, user_response: str, use_local_scorer: bool = True) -> dict:
     """
-    Evaluate the student's response to listen and reply prompts.
+    Evaluate the student's response to quick response prompts.
+    Near-verbatim matches and clear failures are scored locally (see
+    local_scoring.py); everything else is sent to GPT unless use_local_scorer is False.
     Returns a structured JSON:
     {
       "feedback": "...",
@@ -1008,21 +959,43 @@ def evaluate_response_ex3_stage1(expected_keywords: list, user_response: str, ai
       "is_correct": bool,
       "urdu_used": bool,
       "completed": bool,
-      "suggested_improvement": "...",
-      "keyword_matches": int,
-      "total_keywords": int
+      "suggested_improvement": "..."
     }
     """
+    if use_local_scorer:
+        local = score_quick_response(expected_answers, user_response)
+        if local.is_decisive:
+            logger.debug("feedback.local_score.decisive", evaluator="ex2_stage1", decision=local.decision, score=local.score)
+            return build_quick_response_result(local)
+        logger.debug("feedback.local_score.ambiguous", evaluator="ex2_stage1", score=local.score)
+
+    # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+    prompt_messages = prompt_registry.get(1, 2).messages(expected_answers=expected_answers, user_response=user_response)
+
+    # Fallback default response (only used for fields GPT never produced)
+    fallback = {
+        "feedback": "Good effort! Let's practice more to improve your response.",
+        "score": 50,
+        "is_correct": False,
+        "urdu_used": False,
+        "completed": False,
+        "suggested_improvement": "Try to match the expected answer more closely."
+    }
 
-    prompt = f"""
+    try:
+        return run_structured_evaluation(client, "ex2_stage1", QuickResponseEvaluation, prompt_messages, fallback)
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex2_stage1")
+        return fallback
+
+
+
+EX3_STAGE1_INSTRUCTIONS = """
 You are an expert English evaluator for a language learning app specializing in listen and reply exercises.
 
 Your task is to evaluate the student's response against expected keywords and provide constructive feedback.
 
-📥 Inputs:
-- AI Prompt: "{ai_prompt}"
-- Expected Keywords: {expected_keywords}
-- Student Response: "{user_response}"
+📥 The inputs are given in the user message.
 
 🎯 Evaluation Criteria:
 1. **Keyword Recognition**: How many expected keywords are present in the response?
@@ -1031,7 +1004,7 @@ Your task is to evaluate the student's response against expected keywords and pr
 4. **Communication Effectiveness**: Can the response be understood clearly?
 
 🎯 Output JSON format:
-{{
+{
   "feedback": "Constructive 1-2 line feedback in English",
   "score": integer (0–100),
   "is_correct": true if score >= 70 else false,
@@ -1040,7 +1013,7 @@ Your task is to evaluate the student's response against expected keywords and pr
   "suggested_improvement": "One specific suggestion for improvement",
   "keyword_matches": integer (number of keywords found),
   "total_keywords": integer (total number of expected keywords)
-}}
+}
 
 📌 Scoring Guide:
 - 90-100: Perfect response with all or most keywords and excellent communication
@@ -1064,51 +1037,18 @@ Your task is to evaluate the student's response against expected keywords and pr
 - Focus on communication effectiveness over perfect grammar.
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-
-        # Extract the response
-        raw_content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-        print(f"🔍 [FEEDBACK] Raw GPT response for ex3: {raw_content}")
-
-        # Try to extract JSON object even if GPT adds comments
-        json_match = re.search(r"\{.*\}", raw_content, re.DOTALL)
-        json_str = json_match.group(0) if json_match else raw_content
-        result = json.loads(json_str)
-
-        # Validation fallback
-        required_keys = {"feedback", "score", "is_correct", "urdu_used", "completed", "suggested_improvement", "keyword_matches", "total_keywords"}
-        if not required_keys.issubset(result.keys()):
-            raise ValueError("Missing keys in GPT response")
-
-        print(f"✅ [FEEDBACK] Parsed result for ex3: {result}")
-        return result
-
-    except Exception as e:
-        print(f"❌ [FEEDBACK] Error in ex3 evaluation: {e}")
-        print(f"❌ [FEEDBACK] Raw content: {raw_content}")
-
-        # Fallback default response
-        return {
-            "feedback": "Good effort! Let's practice more to improve your response.",
-            "score": 50,
-            "is_correct": False,
-            "urdu_used": False,
-            "completed": False,
-            "suggested_improvement": "Try to include more of the expected keywords in your response.",
-            "keyword_matches": 0,
-            "total_keywords": len(expected_keywords)
-        }
-
+EX3_STAGE1_INPUTS = """
+📥 Inputs:
+- AI Prompt: "{ai_prompt}"
+- Expected Keywords: {expected_keywords}
+- Student Response: "{user_response}"
+"""
 
+prompt_registry.register(1, 3, EX3_STAGE1_INSTRUCTIONS, EX3_STAGE1_INPUTS)
 
-def evaluate_response_ex1_stage2(expected_keywords: list, user_response: str, phrase: str, example: str) -> dict:
+def evaluate_response_ex3_stage1(expected_keywords: list, user_response: str, ai_prompt: str) -> dict:
     """
-    Evaluate the student's response to daily routine narration prompts.
+    Evaluate the student's response to listen and reply prompts.
     Returns a structured JSON:
     {
       "feedback": "...",
@@ -1118,22 +1058,39 @@ def evaluate_response_ex1_stage2(expected_keywords: list, user_response: str, ph
       "completed": bool,
       "suggested_improvement": "...",
       "keyword_matches": int,
-      "total_keywords": int,
-      "fluency_score": int,
-      "grammar_score": int
+      "total_keywords": int
     }
     """
 
-    prompt = f"""
-You are an expert English evaluator for a language learning app specializing in daily routine narration exercises.
+    # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+    prompt_messages = prompt_registry.get(1, 3).messages(ai_prompt=ai_prompt, expected_keywords=expected_keywords, user_response=user_response)
+
+    # Fallback default response (only used for fields GPT never produced)
+    fallback = {
+        "feedback": "Good effort! Let's practice more to improve your response.",
+        "score": 50,
+        "is_correct": False,
+        "urdu_used": False,
+        "completed": False,
+        "suggested_improvement": "Try to include more of the expected keywords in your response.",
+        "keyword_matches": 0,
+        "total_keywords": len(expected_keywords)
+    }
 
-Your task is to evaluate the student's response against expected keywords and provide comprehensive feedback.
+    try:
+        return run_structured_evaluation(client, "ex3_stage1", ListenAndReplyEvaluation, prompt_messages, fallback)
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex3_stage1")
+        return fallback
 
-📥 Inputs:
-- Phrase: "{phrase}"
-- Example: "{example}"
-- Expected Keywords: {expected_keywords}
-- Student Response: "{user_response}"
+
+
+EX1_STAGE2_INSTRUCTIONS = """
+You are an expert English evaluator for a language learning app specializing in daily routine narration exercises.
+
+Your task is to evaluate the student's response against expected keywords and provide comprehensive feedback.
+
+📥 The inputs are given in the user message.
 
 🎯 Evaluation Criteria:
 1. **Keyword Recognition**: How many expected keywords are present in the response?
@@ -1143,7 +1100,7 @@ Your task is to evaluate the student's response against expected keywords and pr
 5. **Content Completeness**: Does the response provide sufficient detail about daily routines?
 
 🎯 Output JSON format:
-{{
+{
   "feedback": "Constructive 2-3 line feedback in English",
   "score": integer (0–100),
   "is_correct": true if score >= 75 else false,
@@ -1154,7 +1111,7 @@ Your task is to evaluate the student's response against expected keywords and pr
   "total_keywords": integer (total number of expected keywords),
   "fluency_score": integer (0-100, based on naturalness and flow),
   "grammar_score": integer (0-100, based on grammatical accuracy)
-}}
+}
 
 📌 Scoring Guide:
 - 90-100: Excellent response with all keywords, perfect grammar, and natural fluency
@@ -1186,53 +1143,19 @@ Your task is to evaluate the student's response against expected keywords and pr
 - Reward natural, conversational responses.
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-
-        # Extract the response
-        raw_content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-        print(f"🔍 [FEEDBACK] Raw GPT response for ex1_stage2: {raw_content}")
-
-        # Try to extract JSON object even if GPT adds comments
-        json_match = re.search(r"\{.*\}", raw_content, re.DOTALL)
-        json_str = json_match.group(0) if json_match else raw_content
-        result = json.loads(json_str)
-
-        # Validation fallback
-        required_keys = {"feedback", "score", "is_correct", "urdu_used", "completed", "suggested_improvement", "keyword_matches", "total_keywords", "fluency_score", "grammar_score"}
-        if not required_keys.issubset(result.keys()):
-            raise ValueError("Missing keys in GPT response")
-
-        print(f"✅ [FEEDBACK] Parsed result for ex1_stage2: {result}")
-        return result
-
-    except Exception as e:
-        print(f"❌ [FEEDBACK] Error in ex1_stage2 evaluation: {e}")
-        print(f"❌ [FEEDBACK] Raw content: {raw_content}")
-
-        # Fallback default response
-        return {
-            "feedback": "Good effort! Try to include more details about your daily routine and use the suggested keywords.",
-            "score": 50,
-            "is_correct": False,
-            "urdu_used": False,
-            "completed": False,
-            "suggested_improvement": "Try to include more of the expected keywords in your response.",
-            "keyword_matches": 0,
-            "total_keywords": len(expected_keywords),
-            "fluency_score": 50,
-            "grammar_score": 50
-        }
-
+EX1_STAGE2_INPUTS = """
+📥 Inputs:
+- Phrase: "{phrase}"
+- Example: "{example}"
+- Expected Keywords: {expected_keywords}
+- Student Response: "{user_response}"
+"""
 
+prompt_registry.register(2, 1, EX1_STAGE2_INSTRUCTIONS, EX1_STAGE2_INPUTS)
 
-def evaluate_response_ex2_stage2(expected_answers: list, user_response: str, question: str, question_urdu: str) -> dict:
+def evaluate_response_ex1_stage2(expected_keywords: list, user_response: str, phrase: str, example: str) -> dict:
     """
-    Evaluate the student's response to quick answer prompts in Stage 2.
+    Evaluate the student's response to daily routine narration prompts.
     Returns a structured JSON:
     {
       "feedback": "...",
@@ -1241,22 +1164,44 @@ def evaluate_response_ex2_stage2(expected_answers: list, user_response: str, que
       "urdu_used": bool,
       "completed": bool,
       "suggested_improvement": "...",
-      "answer_accuracy": int,
-      "grammar_score": int,
-      "fluency_score": int
+      "keyword_matches": int,
+      "total_keywords": int,
+      "fluency_score": int,
+      "grammar_score": int
     }
     """
 
-    prompt = f"""
+    # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+    prompt_messages = prompt_registry.get(2, 1).messages(phrase=phrase, example=example, expected_keywords=expected_keywords, user_response=user_response)
+
+    # Fallback default response (only used for fields GPT never produced)
+    fallback = {
+        "feedback": "Good effort! Try to include more details about your daily routine and use the suggested keywords.",
+        "score": 50,
+        "is_correct": False,
+        "urdu_used": False,
+        "completed": False,
+        "suggested_improvement": "Try to include more of the expected keywords in your response.",
+        "keyword_matches": 0,
+        "total_keywords": len(expected_keywords),
+        "fluency_score": 50,
+        "grammar_score": 50
+    }
+
+    try:
+        return run_structured_evaluation(client, "ex1_stage2", DailyRoutineNarrationEvaluation, prompt_messages, fallback)
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex1_stage2")
+        return fallback
+
+
+
+EX2_STAGE2_INSTRUCTIONS = """
 You are an expert English evaluator for a language learning app specializing in quick answer exercises for Stage 2 learners.
 
 Your task is to evaluate the student's response against multiple acceptable answers and provide comprehensive feedback.
 
-📥 Inputs:
-- Question: "{question}"
-- Question (Urdu): "{question_urdu}"
-- Expected Answers: {expected_answers}
-- Student Response: "{user_response}"
+📥 The inputs are given in the user message.
 
 🎯 Evaluation Criteria:
 1. **Answer Accuracy**: Does the response match any of the expected answers in meaning and content?
@@ -1266,7 +1211,7 @@ Your task is to evaluate the student's response against multiple acceptable answ
 5. **Completeness**: Does the response provide sufficient information?
 
 🎯 Output JSON format:
-{{
+{
   "feedback": "Constructive 2-3 line feedback in English",
   "score": integer (0–100),
   "is_correct": true if score >= 75 else false,
@@ -1276,7 +1221,7 @@ Your task is to evaluate the student's response against multiple acceptable answ
   "answer_accuracy": integer (0-100, based on how well the answer matches expected responses),
   "grammar_score": integer (0-100, based on grammatical accuracy),
   "fluency_score": integer (0-100, based on naturalness and flow)
-}}
+}
 
 📌 Scoring Guide:
 - 90-100: Excellent response that perfectly matches expected answers with natural fluency
@@ -1309,86 +1254,72 @@ Your task is to evaluate the student's response against multiple acceptable answ
 - Consider cultural and personal variations in responses.
 """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
+EX2_STAGE2_INPUTS = """
+📥 Inputs:
+- Question: "{question}"
+- Question (Urdu): "{question_urdu}"
+- Expected Answers: {expected_answers}
+- Student Response: "{user_response}"
+"""
 
-        # Extract the response
-        raw_content = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-        print(f"🔍 [FEEDBACK] Raw GPT response for ex2_stage2: {raw_content}")
+prompt_registry.register(2, 2, EX2_STAGE2_INSTRUCTIONS, EX2_STAGE2_INPUTS)
 
-        # Try to extract JSON object even if GPT adds comments
-        json_match = re.search(r"\{.*\}", raw_content, re.DOTALL)
-        json_str = json_match.group(0) if json_match else raw_content
-        result = json.loads(json_str)
+def evaluate_response_ex2_stage2(expected_answers: list, user_response: str, question: str, question_urdu: str) -> dict:
+    """
+    Evaluate the student's response to quick answer prompts in Stage 2.
+    Returns a structured JSON:
+    {
+      "feedback": "...",
+      "score": int 0-100,
+      "is_correct": bool,
+      "urdu_used": bool,
+      "completed": bool,
+      "suggested_improvement": "...",
+      "answer_accuracy": int,
+      "grammar_score": int,
+      "fluency_score": int
+    }
+    """
 
-        # Validation fallback
-        required_keys = {"feedback", "score", "is_correct", "urdu_used", "completed", "suggested_improvement", "answer_accuracy", "grammar_score", "fluency_score"}
-        if not required_keys.issubset(result.keys()):
-            raise ValueError("Missing keys in GPT response")
+    # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+    prompt_messages = prompt_registry.get(2, 2).messages(question=question, question_urdu=question_urdu, expected_answers=expected_answers, user_response=user_response)
+
+    # Fallback default response (only used for fields GPT never produced)
+    fallback = {
+        "feedback": "Good effort! Try to answer the question more completely and naturally.",
+        "score": 50,
+        "is_correct": False,
+        "urdu_used": False,
+        "completed": False,
+        "suggested_improvement": "Try to match the expected answer format more closely.",
+        "answer_accuracy": 50,
+        "grammar_score": 50,
+        "fluency_score": 50
+    }
 
-        print(f"✅ [FEEDBACK] Parsed result for ex2_stage2: {result}")
-        return result
+    try:
+        return run_structured_evaluation(client, "ex2_stage2", QuickAnswerEvaluation, prompt_messages, fallback)
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex2_stage2")
+        return fallback
 
-    except Exception as e:
-        print(f"❌ [FEEDBACK] Error in ex2_stage2 evaluation: {e}")
-        print(f"❌ [FEEDBACK] Raw content: {raw_content}")
 
-        # Fallback default response
-        return {
-            "feedback": "Good effort! Try to answer the question more completely and naturally.",
-            "score": 50,
-            "is_correct": False,
-            "urdu_used": False,
-            "completed": False,
-            "suggested_improvement": "Try to match the expected answer format more closely.",
-            "answer_accuracy": 50,
-            "grammar_score": 50,
-            "fluency_score": 50
-        }
-    
 
-def evaluate_response_ex3_stage2(conversation_history: list, scenario_context: str, expected_keywords: list, ai_character: str) -> dict:
-    """
-    Evaluate roleplay simulation conversation for Stage 2, Exercise 3
-    Uses GPT-4o to analyze conversation quality, keyword usage, and learning progress
-    """
-    try:
-        # Format conversation history for analysis
-        conversation_text = ""
-        user_messages = []
-        
-        for message in conversation_history:
-            if message.get("role") == "user":
-                user_messages.append(message.get("content", ""))
-                conversation_text += f"User: {message.get('content', '')}\n"
-            elif message.get("role") == "assistant":
-                conversation_text += f"AI ({ai_character}): {message.get('content', '')}\n"
-        
-        # Create comprehensive evaluation prompt
-        evaluation_prompt = f"""
-You are an expert English language tutor evaluating a roleplay simulation conversation. 
-The student is practicing English through a realistic scenario: {scenario_context}
+EX3_STAGE2_INSTRUCTIONS = """
+You are an expert English language tutor specializing in roleplay simulations and conversation evaluation.
+You are evaluating a roleplay simulation conversation in which the student practices English through a realistic scenario.
 
-CONVERSATION HISTORY:
-{conversation_text}
+📥 The scenario, AI character, expected keywords and conversation history are given in the user message.
 
 EVALUATION CRITERIA:
 1. **Conversation Flow**: Natural dialogue progression, appropriate responses
-2. **Keyword Usage**: Student should use expected keywords: {', '.join(expected_keywords)}
+2. **Keyword Usage**: Student should use the expected keywords
 3. **Grammar & Fluency**: Correct sentence structure, natural expression
 4. **Cultural Appropriateness**: Responses fit the scenario context
 5. **Learning Engagement**: Active participation, meaningful interaction
 
-EXPECTED KEYWORDS: {expected_keywords}
-AI CHARACTER: {ai_character}
-SCENARIO: {scenario_context}
-
 Please provide a detailed evaluation in the following JSON format:
-{{
+{
     "overall_score": <score_0_100>,
     "is_correct": <true_if_score_above_70>,
     "completed": <true_if_conversation_has_natural_ending>,
@@ -1408,7 +1339,7 @@ Please provide a detailed evaluation in the following JSON format:
     "conversation_quality": <"excellent"|"good"|"fair"|"needs_improvement">,
     "learning_progress": <"significant"|"moderate"|"minimal"|"none">,
     "recommendations": <list_of_next_steps>
-}}
+}
 
 Focus on:
 - Natural conversation flow and appropriate responses
@@ -1418,91 +1349,72 @@ Focus on:
 - Overall learning engagement and progress
 """
 
-        print(f"🔄 [FEEDBACK] Evaluating roleplay conversation for scenario: {scenario_context}")
-        print(f"📊 [FEEDBACK] Conversation length: {len(conversation_history)} messages")
-        print(f"🎯 [FEEDBACK] Expected keywords: {expected_keywords}")
-        
-        # Call OpenAI GPT-4o
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert English language tutor specializing in roleplay simulations and conversation evaluation. Provide detailed, constructive feedback in the exact JSON format requested."
-                },
-                {
-                    "role": "user", 
-                    "content": evaluation_prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=2000
+EX3_STAGE2_INPUTS = """
+📥 Inputs:
+- Scenario: {scenario_context}
+- AI Character: {ai_character}
+- Expected Keywords: {expected_keywords}
+
+CONVERSATION HISTORY:
+{conversation_text}
+"""
+
+prompt_registry.register(2, 3, EX3_STAGE2_INSTRUCTIONS, EX3_STAGE2_INPUTS)
+
+def evaluate_response_ex3_stage2(conversation_history: list, scenario_context: str, expected_keywords: list, ai_character: str,
+                                 memory_state: Optional[dict] = None) -> dict:
+    """
+    Evaluate roleplay simulation conversation for Stage 2, Exercise 3
+    Uses GPT-4o to analyze conversation quality, keyword usage, and learning progress.
+    Long conversations are bounded by conversation_memory: recent turns verbatim plus
+    the session's rolling summary (memory_state) of older turns.
+    """
+    # Fallback evaluation (only used for fields GPT never produced)
+    fallback = {
+        "overall_score": 60,
+        "is_correct": False,
+        "completed": len(conversation_history) >= 4,
+        "conversation_flow_score": 60,
+        "keyword_usage_score": 50,
+        "grammar_fluency_score": 60,
+        "cultural_appropriateness_score": 70,
+        "engagement_score": 65,
+        "keyword_matches": [],
+        "total_keywords_expected": len(expected_keywords),
+        "keywords_used_count": 0,
+        "grammar_errors": ["Evaluation parsing error"],
+        "fluency_issues": ["Unable to analyze"],
+        "strengths": ["Conversation attempted"],
+        "areas_for_improvement": ["Please try again"],
+        "suggested_improvement": "Please try the roleplay again for better evaluation.",
+        "conversation_quality": "needs_improvement",
+        "learning_progress": "minimal",
+        "recommendations": ["Retry the conversation"]
+    }
+
+    try:
+        # Format conversation history for analysis
+        conversation_text = conversation_memory.format(
+            conversation_history, memory_state, user_label="User", ai_label=f"AI ({ai_character})"
         )
+        logger.debug("feedback.evaluation.start", evaluator="ex3_stage2", messages=len(conversation_history),
+                     keywords=len(expected_keywords))
 
-        # Parse the response
-        evaluation_text = response.choices[0].message.content.strip()
-        print(f"✅ [FEEDBACK] Raw evaluation response received: {len(evaluation_text)} characters")
-        
-        # Extract JSON from response
-        try:
-            # Find JSON content in the response
-            start_idx = evaluation_text.find('{')
-            end_idx = evaluation_text.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != 0:
-                json_content = evaluation_text[start_idx:end_idx]
-                evaluation = json.loads(json_content)
-            else:
-                raise ValueError("No JSON content found in response")
-                
-        except json.JSONDecodeError as e:
-            print(f"❌ [FEEDBACK] JSON parsing error: {str(e)}")
-            print(f"📝 [FEEDBACK] Raw response: {evaluation_text}")
-            
-            # Fallback evaluation
-            evaluation = {
-                "overall_score": 60,
-                "is_correct": False,
-                "completed": len(conversation_history) >= 4,
-                "conversation_flow_score": 60,
-                "keyword_usage_score": 50,
-                "grammar_fluency_score": 60,
-                "cultural_appropriateness_score": 70,
-                "engagement_score": 65,
-                "keyword_matches": [],
-                "total_keywords_expected": len(expected_keywords),
-                "keywords_used_count": 0,
-                "grammar_errors": ["Evaluation parsing error"],
-                "fluency_issues": ["Unable to analyze"],
-                "strengths": ["Conversation attempted"],
-                "areas_for_improvement": ["Please try again"],
-                "suggested_improvement": "Please try the roleplay again for better evaluation.",
-                "conversation_quality": "needs_improvement",
-                "learning_progress": "minimal",
-                "recommendations": ["Retry the conversation"]
-            }
+        # Static rubric first (system), per-conversation inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(2, 3).messages(
+            scenario_context=scenario_context, ai_character=ai_character,
+            expected_keywords=expected_keywords, conversation_text=conversation_text,
+        )
+        evaluation = run_structured_evaluation(client, "ex3_stage2", RoleplayEvaluation, prompt_messages, fallback,
+                                               max_tokens=2000)
 
-        # Validate and normalize scores
-        # The original code had a validate_and_normalize_evaluation function,
-        # but it was not defined in the provided context.
-        # Assuming a simple validation and normalization for now.
-        evaluation["overall_score"] = min(100, max(0, evaluation.get("overall_score", 0)))
-        evaluation["conversation_flow_score"] = min(100, max(0, evaluation.get("conversation_flow_score", 0)))
-        evaluation["keyword_usage_score"] = min(100, max(0, evaluation.get("keyword_usage_score", 0)))
-        evaluation["grammar_fluency_score"] = min(100, max(0, evaluation.get("grammar_fluency_score", 0)))
-        evaluation["cultural_appropriateness_score"] = min(100, max(0, evaluation.get("cultural_appropriateness_score", 0)))
-        evaluation["engagement_score"] = min(100, max(0, evaluation.get("engagement_score", 0)))
-
-        print(f"✅ [FEEDBACK] Evaluation completed successfully")
-        print(f"📊 [FEEDBACK] Overall score: {evaluation.get('overall_score', 0)}")
-        print(f"🎯 [FEEDBACK] Keywords used: {evaluation.get('keywords_used_count', 0)}/{evaluation.get('total_keywords_expected', 0)}")
-        print(f"✅ [FEEDBACK] Is correct: {evaluation.get('is_correct', False)}")
-        print(f"🏁 [FEEDBACK] Completed: {evaluation.get('completed', False)}")
-        
+        logger.info("feedback.evaluation.done", evaluator="ex3_stage2", score=evaluation["overall_score"],
+                    keywords_used=evaluation["keywords_used_count"], is_correct=evaluation["is_correct"],
+                    completed=evaluation["completed"])
         return evaluation
 
     except Exception as e:
-        print(f"❌ [FEEDBACK] Error in evaluate_response_ex3_stage2: {str(e)}")
+        logger.exception("feedback.evaluation.failed", evaluator="ex3_stage2")
         return {
             "overall_score": 50,
             "is_correct": False,
@@ -1527,26 +1439,25 @@ Focus on:
 
 
 
-def evaluate_response_ex1_stage3(expected_keywords: list, user_response: str, prompt: str, prompt_urdu: str, model_answer: str) -> dict:
+def _scored_evaluation(evaluator: str, schema, prompt_messages: List[Dict[str, str]], fallback: dict,
+                       score_fields: Tuple[str, ...] = ("overall_score",), **kwargs) -> Optional[dict]:
     """
-    Evaluate user's storytelling response for Stage 3 Exercise 1
-    Uses ChatGPT to provide comprehensive feedback on narrative structure, past tense usage, and fluency
+    run_structured_evaluation for evaluators whose pass/fail is derived from the
+    model's scores. Score fields are never taken from `fallback`, so a reply that
+    never produced them returns None instead of a made-up passing score.
     """
-    print(f"🔄 [EVAL] Evaluating Stage 3 Exercise 1 response")
-    print(f"📝 [EVAL] User response: '{user_response}'")
-    print(f"🎯 [EVAL] Expected keywords: {expected_keywords}")
-    print(f"📖 [EVAL] Prompt: '{prompt}'")
-    print(f"📖 [EVAL] Model answer: '{model_answer}'")
-    
-    try:
-        # Create comprehensive evaluation prompt
-        evaluation_prompt = f"""
-You are an expert English language tutor evaluating a student's storytelling response. The student is learning to tell personal stories in English.
+    defaults = {field: value for field, value in fallback.items() if field not in score_fields}
+    evaluation = run_structured_evaluation(client, evaluator, schema, prompt_messages, defaults, **kwargs)
+    if not all(field in evaluation for field in score_fields):
+        logger.warning("feedback.evaluation.unscored", evaluator=evaluator)
+        return None
+    return evaluation
 
-**STUDENT'S PROMPT:** {prompt}
-**STUDENT'S RESPONSE:** "{user_response}"
-**MODEL ANSWER FOR REFERENCE:** "{model_answer}"
-**EXPECTED KEYWORDS TO INCLUDE:** {expected_keywords}
+
+EX1_STAGE3_INSTRUCTIONS = """
+You are an expert English language tutor specializing in storytelling and narrative skills, evaluating a student's storytelling response. The student is learning to tell personal stories in English.
+
+📥 The prompt, student's response, model answer and expected keywords are given in the user message.
 
 **EVALUATION CRITERIA:**
 1. **Past Tense Usage (25 points):** Check if the student correctly uses past tense verbs (was, were, had, went, felt, etc.)
@@ -1565,7 +1476,7 @@ You are an expert English language tutor evaluating a student's storytelling res
 **TASK:** Provide a comprehensive evaluation with specific feedback and suggestions for improvement.
 
 **REQUIRED JSON OUTPUT FORMAT:**
-{{
+{
     "score": <number between 0-100>,
     "is_correct": <boolean - true if score >= 35>,
     "completed": <boolean - true if score >= 35>,
@@ -1573,122 +1484,80 @@ You are an expert English language tutor evaluating a student's storytelling res
     "total_keywords": <total number of expected keywords>,
     "fluency_score": <number between 0-100>,
     "grammar_score": <number between 0-100>,
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "past_tense_usage": "<specific feedback on past tense usage>",
         "narrative_structure": "<feedback on story structure and flow>",
         "keyword_integration": "<feedback on keyword usage>",
         "fluency_coherence": "<feedback on overall fluency>",
         "descriptive_language": "<feedback on descriptive elements>"
-    }},
+    },
     "suggested_improvement": "<specific suggestions for improvement>",
     "strengths": ["<list of strengths in the response>"],
     "areas_for_improvement": ["<list of areas that need work>"]
-}}
+}
 """
 
-        print(f"🤖 [EVAL] Sending evaluation request to ChatGPT...")
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert English language tutor specializing in storytelling and narrative skills. Provide detailed, constructive feedback in JSON format."
-                },
-                {
-                    "role": "user",
-                    "content": evaluation_prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
-        
-        print(f"✅ [EVAL] Received ChatGPT response")
-        
-        # Extract and parse the response
-        evaluation_text = response.choices[0].message.content.strip()
-        print(f"📄 [EVAL] Raw evaluation response: {evaluation_text}")
-        
-        # Try to extract JSON from the response
-        try:
-            # Look for JSON in the response
-            json_start = evaluation_text.find('{')
-            json_end = evaluation_text.rfind('}') + 1
-            
-            if json_start != -1 and json_end != 0:
-                json_content = evaluation_text[json_start:json_end]
-                evaluation_result = json.loads(json_content)
-                print(f"✅ [EVAL] Successfully parsed JSON evaluation")
-            else:
-                raise ValueError("No JSON found in response")
-                
-        except json.JSONDecodeError as e:
-            print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-            print(f"📄 [EVAL] Attempted to parse: {evaluation_text}")
-            
-            # Fallback evaluation
-            evaluation_result = {
-                "score": 50,
-                "is_correct": False,
-                "completed": False,
-                "keyword_matches": 0,
-                "total_keywords": len(expected_keywords),
-                "fluency_score": 50,
-                "grammar_score": 50,
-                "detailed_feedback": {
-                    "past_tense_usage": "Unable to evaluate due to processing error",
-                    "narrative_structure": "Unable to evaluate due to processing error",
-                    "keyword_integration": "Unable to evaluate due to processing error",
-                    "fluency_coherence": "Unable to evaluate due to processing error",
-                    "descriptive_language": "Unable to evaluate due to processing error"
-                },
-                "suggested_improvement": "Please try again. Make sure to use past tense verbs and tell a complete story with beginning, middle, and end.",
-                "strengths": ["Response provided"],
-                "areas_for_improvement": ["Evaluation processing error"]
-            }
-        
-        # Validate and sanitize the evaluation result
-        score = evaluation_result.get("score", 50)
-        if not isinstance(score, (int, float)) or score < 0 or score > 100:
-            score = 50
-            evaluation_result["score"] = score
-        
-        is_correct = evaluation_result.get("is_correct", score >= 35)
-        completed = evaluation_result.get("completed", score >= 35)
+EX1_STAGE3_INPUTS = """
+📥 Inputs:
+**STUDENT'S PROMPT:** {prompt}
+**STUDENT'S RESPONSE:** "{user_response}"
+**MODEL ANSWER FOR REFERENCE:** "{model_answer}"
+**EXPECTED KEYWORDS TO INCLUDE:** {expected_keywords}
+"""
 
-        print("✅ is_correct: ", is_correct)
-        print("✅ completed: ", completed)
-        
-        # Ensure keyword matches is valid
-        keyword_matches = evaluation_result.get("keyword_matches", 0)
-        total_keywords = evaluation_result.get("total_keywords", len(expected_keywords))
-        
-        if not isinstance(keyword_matches, int) or keyword_matches < 0:
-            keyword_matches = 0
-        if not isinstance(total_keywords, int) or total_keywords <= 0:
-            total_keywords = len(expected_keywords)
-        
-        evaluation_result.update({
-            "is_correct": is_correct,
-            "completed": completed,
-            "keyword_matches": keyword_matches,
-            "total_keywords": total_keywords
-        })
-        
-        print(f"📊 [EVAL] Final evaluation result:")
-        print(f"   - Score: {score}")
-        print(f"   - Is correct: {is_correct}")
-        print(f"   - Completed: {completed}")
-        print(f"   - Keyword matches: {keyword_matches}/{total_keywords}")
-        print(f"   - Fluency score: {evaluation_result.get('fluency_score', 0)}")
-        print(f"   - Grammar score: {evaluation_result.get('grammar_score', 0)}")
-        
+prompt_registry.register(3, 1, EX1_STAGE3_INSTRUCTIONS, EX1_STAGE3_INPUTS)
+
+def evaluate_response_ex1_stage3(expected_keywords: list, user_response: str, prompt: str, prompt_urdu: str, model_answer: str) -> dict:
+    """
+    Evaluate user's storytelling response for Stage 3 Exercise 1
+    Uses ChatGPT to provide comprehensive feedback on narrative structure, past tense usage, and fluency
+    """
+    logger.debug("feedback.evaluation.start", evaluator="ex1_stage3", response_chars=len(user_response),
+                 keywords=len(expected_keywords))
+
+    # Fallback evaluation (only used for fields GPT never produced)
+    fallback = {
+        "score": 50,
+        "is_correct": False,
+        "completed": False,
+        "keyword_matches": 0,
+        "total_keywords": len(expected_keywords),
+        "fluency_score": 50,
+        "grammar_score": 50,
+        "detailed_feedback": {
+            "past_tense_usage": "Unable to evaluate due to processing error",
+            "narrative_structure": "Unable to evaluate due to processing error",
+            "keyword_integration": "Unable to evaluate due to processing error",
+            "fluency_coherence": "Unable to evaluate due to processing error",
+            "descriptive_language": "Unable to evaluate due to processing error"
+        },
+        "suggested_improvement": "Please try again. Make sure to use past tense verbs and tell a complete story with beginning, middle, and end.",
+        "strengths": ["Response provided"],
+        "areas_for_improvement": ["Evaluation processing error"]
+    }
+
+    try:
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(3, 1).messages(
+            prompt=prompt, user_response=user_response, model_answer=model_answer, expected_keywords=expected_keywords,
+        )
+        evaluation_result = run_structured_evaluation(client, "ex1_stage3", StorytellingEvaluation, prompt_messages,
+                                                      fallback, max_tokens=1000)
+
+        # The model counts keywords; an impossible total falls back to the real one
+        evaluation_result["keyword_matches"] = max(0, evaluation_result["keyword_matches"])
+        if evaluation_result["total_keywords"] <= 0:
+            evaluation_result["total_keywords"] = len(expected_keywords)
+
+        logger.info("feedback.evaluation.done", evaluator="ex1_stage3", score=evaluation_result["score"],
+                    is_correct=evaluation_result["is_correct"], completed=evaluation_result["completed"],
+                    keyword_matches=evaluation_result["keyword_matches"],
+                    total_keywords=evaluation_result["total_keywords"])
         return evaluation_result
-        
-    except Exception as e:
-        print(f"❌ [EVAL] Error in evaluate_response_ex1_stage3: {str(e)}")
-        
+
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex1_stage3")
+
         # Return fallback evaluation
         return {
             "score": 50,
@@ -1711,42 +1580,15 @@ You are an expert English language tutor evaluating a student's storytelling res
         }
 
 
-def evaluate_response_ex2_stage3(expected_responses: list, user_response: str, context: str, initial_prompt: str, follow_up_turns: list) -> dict:
-    """
-    Evaluate user's response for Stage 3 Exercise 2 (Group Dialogue) using OpenAI GPT-4.
-    Focuses on conversational flow, agreement/disagreement expressions, and group decision-making.
-    """
-    print(f"🔍 [EVAL] Evaluating group dialogue response: {user_response[:50]}...")
-    
-    # Extract expected response types and keywords
-    expected_types = [resp.get("type", "") for resp in expected_responses]
-    all_keywords = []
-    for resp in expected_responses:
-        all_keywords.extend(resp.get("keywords", []))
-    
-    # Create conversation context
-    conversation_context = f"""
-**Initial Prompt:** {initial_prompt}
-"""
-    for turn in follow_up_turns:
-        conversation_context += f"""
-**{turn['speaker']}:** {turn['message']}"""
-    
-    prompt_template = f"""
-You are an expert English language tutor evaluating a student's group dialogue response for Stage 3 (B1 Intermediate level).
+EX2_STAGE3_INSTRUCTIONS = """
+You are an expert English language tutor specializing in B1 intermediate level conversational assessment, evaluating a student's group dialogue response for Stage 3 (B1 Intermediate level).
 
 **Context:**
 - Exercise: Group Dialogue with AI Personas
 - Student Level: B1 Intermediate
 - Focus: Conversational flow, agreement/disagreement, group decision-making
 
-**Conversation Context:**
-{conversation_context}
-
-**Student's Response:** "{user_response}"
-
-**Expected Response Types:** {expected_types}
-**Expected Keywords:** {all_keywords}
+📥 The conversation context, student's response, expected response types and expected keywords are given in the user message.
 
 **Evaluation Criteria:**
 1. **Relevance to Conversation (25%):** Response directly addresses the question and maintains conversation flow
@@ -1766,7 +1608,7 @@ Analyze the student's response comprehensively and provide detailed feedback.
 Focus on conversational skills and group interaction abilities.
 
 **Output Format (JSON):**
-{{
+{
     "overall_score": <0-100>,
     "relevance_score": <0-25>,
     "expressions_score": <0-25>,
@@ -1777,13 +1619,13 @@ Focus on conversational skills and group interaction abilities.
     "total_keywords": <total number of expected keywords>,
     "matched_keywords_count": <number of matched keywords>,
     "response_type_detected": "<agreement/disagreement/compromise/etc>",
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "relevance_feedback": "<specific feedback on conversation relevance>",
         "expressions_feedback": "<feedback on agreement/disagreement expressions>",
         "fluency_feedback": "<feedback on fluency and tone>",
         "timing_feedback": "<feedback on conversation timing>",
         "decision_language_feedback": "<feedback on group decision language>"
-    }},
+    },
     "suggested_improvements": [
         "<specific improvement suggestion 1>",
         "<specific improvement suggestion 2>",
@@ -1791,135 +1633,73 @@ Focus on conversational skills and group interaction abilities.
     ],
     "encouragement": "<positive encouragement message>",
     "next_steps": "<what to focus on next>"
-}}
+}
 """
 
-    try:
-        print("🔄 [EVAL] Sending evaluation request to OpenAI...")
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert English language tutor specializing in B1 intermediate level conversational assessment."},
-                {"role": "user", "content": prompt_template}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
-        
-        result_text = response.choices[0].message.content
-        print(f"📊 [EVAL] Raw OpenAI response: {result_text[:200]}...")
-        
-        # Clean the response text to extract JSON
-        result_text = result_text.strip()
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {result_text[:200]}...")
-        
-        # Parse JSON response
-        evaluation_result = json.loads(result_text)
-        
-        # Calculate success based on overall score
-        success = evaluation_result.get("overall_score", 0) >= 35
-        
-        print(f"✅ [EVAL] Evaluation completed. Score: {evaluation_result.get('overall_score', 0)}%")
-        
-        return {
-            "success": success,
-            "evaluation": evaluation_result,
-            "suggested_improvement": evaluation_result.get("suggested_improvements", [""])[0] if evaluation_result.get("suggested_improvements") else "",
-            "keyword_matches": evaluation_result.get("keyword_matches", []),
-            "total_keywords": evaluation_result.get("total_keywords", 0),
-            "matched_keywords_count": evaluation_result.get("matched_keywords_count", 0),
-            "fluency_score": evaluation_result.get("fluency_score", 0),
-            "grammar_score": evaluation_result.get("expressions_score", 0) + evaluation_result.get("decision_language_score", 0),
-            "response_type": evaluation_result.get("response_type_detected", ""),
-            "score": evaluation_result.get("overall_score", 0),
-            "is_correct": success,
-            "completed": success
-        }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-        print(f"📊 [EVAL] Failed to parse response: {result_text}")
-        fallback_evaluation = {
-            "overall_score": 50,
-            "relevance_score": 12,
-            "expressions_score": 12,
-            "fluency_score": 10,
-            "timing_score": 8,
-            "decision_language_score": 8,
-            "keyword_matches": [],
-            "total_keywords": len(all_keywords),
-            "matched_keywords_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "relevance_feedback": "Response was received but could not be fully evaluated.",
-                "expressions_feedback": "Please try to use clear agreement or disagreement phrases.",
-                "fluency_feedback": "Speak clearly and naturally.",
-                "timing_feedback": "Respond appropriately to the conversation flow.",
-                "decision_language_feedback": "Use collaborative language when making decisions."
-            },
-            "suggested_improvements": [
-                "Try to be more specific in your response",
-                "Use clear agreement or disagreement phrases",
-                "Practice natural conversation flow"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your conversational skills.",
-            "next_steps": "Focus on using appropriate expressions for group discussions."
-        }
-        
-        return {
-            "success": False,
-            "error": "Failed to parse evaluation response",
-            "suggested_improvement": "Please try again with a clearer response.",
-            "evaluation": fallback_evaluation,
-            "score": 50,
-            "is_correct": False,
-            "completed": False,
-            "keyword_matches": [],
-            "total_keywords": len(all_keywords),
-            "matched_keywords_count": 0,
-            "fluency_score": 10,
-            "grammar_score": 20,
-            "response_type": "unknown"
-        }
-    except Exception as e:
-        print(f"❌ [EVAL] OpenAI API error: {str(e)}")
-        fallback_evaluation = {
-            "overall_score": 50,
-            "relevance_score": 12,
-            "expressions_score": 12,
-            "fluency_score": 10,
-            "timing_score": 8,
-            "decision_language_score": 8,
-            "keyword_matches": [],
-            "total_keywords": len(all_keywords),
-            "matched_keywords_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "relevance_feedback": "Response was received but could not be fully evaluated.",
-                "expressions_feedback": "Please try to use clear agreement or disagreement phrases.",
-                "fluency_feedback": "Speak clearly and naturally.",
-                "timing_feedback": "Respond appropriately to the conversation flow.",
-                "decision_language_feedback": "Use collaborative language when making decisions."
-            },
-            "suggested_improvements": [
-                "Try to be more specific in your response",
-                "Use clear agreement or disagreement phrases",
-                "Practice natural conversation flow"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your conversational skills.",
-            "next_steps": "Focus on using appropriate expressions for group discussions."
-        }
-        
+EX2_STAGE3_INPUTS = """
+📥 Inputs:
+**Conversation Context:**
+{conversation_context}
+
+**Student's Response:** "{user_response}"
+
+**Expected Response Types:** {expected_types}
+**Expected Keywords:** {all_keywords}
+"""
+
+prompt_registry.register(3, 2, EX2_STAGE3_INSTRUCTIONS, EX2_STAGE3_INPUTS)
+
+def evaluate_response_ex2_stage3(expected_responses: list, user_response: str, context: str, initial_prompt: str, follow_up_turns: list) -> dict:
+    """
+    Evaluate user's response for Stage 3 Exercise 2 (Group Dialogue) using OpenAI GPT-4.
+    Focuses on conversational flow, agreement/disagreement expressions, and group decision-making.
+    """
+    # Extract expected response types and keywords
+    expected_types = [resp.get("type", "") for resp in expected_responses]
+    all_keywords = []
+    for resp in expected_responses:
+        all_keywords.extend(resp.get("keywords", []))
+
+    logger.debug("feedback.evaluation.start", evaluator="ex2_stage3", response_chars=len(user_response),
+                 turns=len(follow_up_turns), keywords=len(all_keywords))
+
+    # Create conversation context
+    conversation_context = f"**Initial Prompt:** {initial_prompt}\n"
+    for turn in follow_up_turns:
+        conversation_context += f"\n**{turn['speaker']}:** {turn['message']}"
+
+    fallback_evaluation = {
+        "overall_score": 50,
+        "relevance_score": 12,
+        "expressions_score": 12,
+        "fluency_score": 10,
+        "timing_score": 8,
+        "decision_language_score": 8,
+        "keyword_matches": [],
+        "total_keywords": len(all_keywords),
+        "matched_keywords_count": 0,
+        "response_type_detected": "unknown",
+        "detailed_feedback": {
+            "relevance_feedback": "Response was received but could not be fully evaluated.",
+            "expressions_feedback": "Please try to use clear agreement or disagreement phrases.",
+            "fluency_feedback": "Speak clearly and naturally.",
+            "timing_feedback": "Respond appropriately to the conversation flow.",
+            "decision_language_feedback": "Use collaborative language when making decisions."
+        },
+        "suggested_improvements": [
+            "Try to be more specific in your response",
+            "Use clear agreement or disagreement phrases",
+            "Practice natural conversation flow"
+        ],
+        "encouragement": "Good effort! Keep practicing to improve your conversational skills.",
+        "next_steps": "Focus on using appropriate expressions for group discussions."
+    }
+
+    def failure(error: str, suggested_improvement: str) -> dict:
         return {
             "success": False,
-            "error": f"Evaluation service error: {str(e)}",
-            "suggested_improvement": "Please try again later.",
+            "error": error,
+            "suggested_improvement": suggested_improvement,
             "evaluation": fallback_evaluation,
             "score": 50,
             "is_correct": False,
@@ -1932,35 +1712,47 @@ Focus on conversational skills and group interaction abilities.
             "response_type": "unknown"
         }
 
+    try:
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(3, 2).messages(
+            conversation_context=conversation_context, user_response=user_response,
+            expected_types=expected_types, all_keywords=all_keywords,
+        )
+        evaluation_result = _scored_evaluation("ex2_stage3", GroupDialogueEvaluation, prompt_messages,
+                                               fallback_evaluation, max_tokens=1000)
+        if evaluation_result is None:
+            return failure("Failed to parse evaluation response", "Please try again with a clearer response.")
 
-def evaluate_response_ex3_stage3(expected_keywords: list, user_response: str, problem_description: str, context: str, polite_phrases: list, sample_responses: list) -> dict:
-    """
-    Evaluate user's response for Stage 3 Exercise 3 (Problem-Solving Simulations) using OpenAI GPT-4o.
-    Focuses on polite problem-solving language, clarity, and functional English usage.
-    """
-    print(f"🔍 [EVAL] Evaluating problem-solving response: {user_response[:50]}...")
-    
-    # Create comprehensive prompt for evaluation
-    prompt_template = f"""
-You are an expert English language tutor specializing in B1 intermediate level problem-solving assessment. You are a well experienced prompt engineer.
+        # Calculate success based on overall score
+        success = evaluation_result["overall_score"] >= 35
 
-**Problem Scenario:**
-{problem_description}
+        logger.info("feedback.evaluation.done", evaluator="ex2_stage3", score=evaluation_result["overall_score"],
+                    is_correct=success)
 
-**Context:**
-{context}
+        return {
+            "success": success,
+            "evaluation": evaluation_result,
+            "suggested_improvement": evaluation_result["suggested_improvements"][0] if evaluation_result["suggested_improvements"] else "",
+            "keyword_matches": evaluation_result["keyword_matches"],
+            "total_keywords": evaluation_result["total_keywords"],
+            "matched_keywords_count": evaluation_result["matched_keywords_count"],
+            "fluency_score": evaluation_result["fluency_score"],
+            "grammar_score": evaluation_result["expressions_score"] + evaluation_result["decision_language_score"],
+            "response_type": evaluation_result["response_type_detected"],
+            "score": evaluation_result["overall_score"],
+            "is_correct": success,
+            "completed": success
+        }
 
-**User's Response:**
-"{user_response}"
+    except Exception as e:
+        logger.exception("feedback.evaluation.failed", evaluator="ex2_stage3")
+        return failure(f"Evaluation service error: {str(e)}", "Please try again later.")
 
-**Expected Keywords (should be included):**
-{', '.join(expected_keywords)}
 
-**Polite Phrases to Use:**
-{', '.join(polite_phrases)}
+EX3_STAGE3_INSTRUCTIONS = """
+You are an expert English language tutor specializing in B1 intermediate level problem-solving assessment. You are a well experienced prompt engineer.
 
-**Sample Good Responses:**
-{', '.join(sample_responses)}
+📥 The problem scenario, context, user's response, expected keywords, polite phrases and sample good responses are given in the user message.
 
 **Evaluation Criteria:**
 1. **Clarity (20 points):** Clear description of the problem and situation
@@ -1972,7 +1764,7 @@ You are an expert English language tutor specializing in B1 intermediate level p
 **Task:** Evaluate the user's response based on the criteria above. Provide detailed feedback and scoring.
 
 **JSON Output Format:**
-{{
+{
     "overall_score": <0-100>,
     "clarity_score": <0-20>,
     "politeness_score": <0-25>,
@@ -1983,13 +1775,13 @@ You are an expert English language tutor specializing in B1 intermediate level p
     "total_keywords": <number>,
     "matched_keywords_count": <number>,
     "response_type_detected": "<apology|request|complaint|notification>",
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "clarity_feedback": "<feedback on clarity>",
         "politeness_feedback": "<feedback on politeness>",
         "request_structure_feedback": "<feedback on request structure>",
         "specificity_feedback": "<feedback on specificity>",
         "solution_orientation_feedback": "<feedback on solution orientation>"
-    }},
+    },
     "suggested_improvements": [
         "<specific improvement suggestion 1>",
         "<specific improvement suggestion 2>",
@@ -1997,93 +1789,74 @@ You are an expert English language tutor specializing in B1 intermediate level p
     ],
     "encouragement": "<positive encouragement message>",
     "next_steps": "<what to focus on next>"
-}}
+}
 
 Provide only the JSON output, no additional text.
 """
-    
-    try:
-        print("🔄 [EVAL] Sending evaluation request to OpenAI...")
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert English language tutor specializing in B1 intermediate level problem-solving assessment."},
-                {"role": "user", "content": prompt_template}
-            ],
-            temperature=0.3,
-            max_tokens=1000
-        )
-        
-        result_text = response.choices[0].message.content
-        print(f"📊 [EVAL] Raw OpenAI response: {result_text[:200]}...")
-        
-        # Clean the response text to extract JSON
-        result_text = result_text.strip()
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {result_text[:200]}...")
-        
-        # Parse JSON response
-        evaluation_result = json.loads(result_text)
-        
-        # Calculate success based on overall score (adjusted for B1 intermediate level)
-        success = evaluation_result.get("overall_score", 0) >= 35
-        
-        print(f"✅ [EVAL] Evaluation completed. Score: {evaluation_result.get('overall_score', 0)}%")
-        
-        return {
-            "success": success,
-            "evaluation": evaluation_result,
-            "suggested_improvement": evaluation_result.get("suggested_improvements", [""])[0] if evaluation_result.get("suggested_improvements") else "",
-            "keyword_matches": evaluation_result.get("keyword_matches", []),
-            "total_keywords": evaluation_result.get("total_keywords", 0),
-            "matched_keywords_count": evaluation_result.get("matched_keywords_count", 0),
-            "fluency_score": evaluation_result.get("clarity_score", 0) + evaluation_result.get("politeness_score", 0),
-            "grammar_score": evaluation_result.get("request_structure_score", 0) + evaluation_result.get("specificity_score", 0) + evaluation_result.get("solution_orientation_score", 0),
-            "response_type": evaluation_result.get("response_type_detected", ""),
-            "score": evaluation_result.get("overall_score", 0),
-            "is_correct": success,
-            "completed": success
-        }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-        print(f"📊 [EVAL] Failed to parse response: {result_text}")
-        fallback_evaluation = {
-            "overall_score": 50,
-            "clarity_score": 10,
-            "politeness_score": 12,
-            "request_structure_score": 10,
-            "specificity_score": 8,
-            "solution_orientation_score": 10,
-            "keyword_matches": [],
-            "total_keywords": len(expected_keywords),
-            "matched_keywords_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "clarity_feedback": "Response was received but could not be fully evaluated.",
-                "politeness_feedback": "Please try to use polite phrases and respectful tone.",
-                "request_structure_feedback": "Make sure to ask for help clearly and appropriately.",
-                "specificity_feedback": "Provide specific details about your problem.",
-                "solution_orientation_feedback": "Ask for specific solutions or next steps."
-            },
-            "suggested_improvements": [
-                "Try to be more specific in your response",
-                "Use polite phrases when asking for help",
-                "Practice clear problem description"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your problem-solving skills.",
-            "next_steps": "Focus on using appropriate polite language for problem-solving."
-        }
-        
+
+EX3_STAGE3_INPUTS = """
+📥 Inputs:
+**Problem Scenario:**
+{problem_description}
+
+**Context:**
+{context}
+
+**User's Response:**
+"{user_response}"
+
+**Expected Keywords (should be included):**
+{expected_keywords}
+
+**Polite Phrases to Use:**
+{polite_phrases}
+
+**Sample Good Responses:**
+{sample_responses}
+"""
+
+prompt_registry.register(3, 3, EX3_STAGE3_INSTRUCTIONS, EX3_STAGE3_INPUTS)
+
+def evaluate_response_ex3_stage3(expected_keywords: list, user_response: str, problem_description: str, context: str, polite_phrases: list, sample_responses: list) -> dict:
+    """
+    Evaluate user's response for Stage 3 Exercise 3 (Problem-Solving Simulations) using OpenAI GPT-4o.
+    Focuses on polite problem-solving language, clarity, and functional English usage.
+    """
+    logger.debug("feedback.evaluation.start", evaluator="ex3_stage3", response_chars=len(user_response),
+                 keywords=len(expected_keywords))
+
+    fallback_evaluation = {
+        "overall_score": 50,
+        "clarity_score": 10,
+        "politeness_score": 12,
+        "request_structure_score": 10,
+        "specificity_score": 8,
+        "solution_orientation_score": 10,
+        "keyword_matches": [],
+        "total_keywords": len(expected_keywords),
+        "matched_keywords_count": 0,
+        "response_type_detected": "unknown",
+        "detailed_feedback": {
+            "clarity_feedback": "Response was received but could not be fully evaluated.",
+            "politeness_feedback": "Please try to use polite phrases and respectful tone.",
+            "request_structure_feedback": "Make sure to ask for help clearly and appropriately.",
+            "specificity_feedback": "Provide specific details about your problem.",
+            "solution_orientation_feedback": "Ask for specific solutions or next steps."
+        },
+        "suggested_improvements": [
+            "Try to be more specific in your response",
+            "Use polite phrases when asking for help",
+            "Practice clear problem description"
+        ],
+        "encouragement": "Good effort! Keep practicing to improve your problem-solving skills.",
+        "next_steps": "Focus on using appropriate polite language for problem-solving."
+    }
+
+    def failure(error: str, suggested_improvement: str) -> dict:
         return {
             "success": False,
-            "error": "Failed to parse evaluation response",
-            "suggested_improvement": "Please try again with a clearer response.",
+            "error": error,
+            "suggested_improvement": suggested_improvement,
             "evaluation": fallback_evaluation,
             "score": 50,
             "is_correct": False,
@@ -2095,87 +1868,49 @@ Provide only the JSON output, no additional text.
             "grammar_score": 28,
             "response_type": "unknown"
         }
-    except Exception as e:
-        print(f"❌ [EVAL] OpenAI API error: {str(e)}")
-        fallback_evaluation = {
-            "overall_score": 50,
-            "clarity_score": 10,
-            "politeness_score": 12,
-            "request_structure_score": 10,
-            "specificity_score": 8,
-            "solution_orientation_score": 10,
-            "keyword_matches": [],
-            "total_keywords": len(expected_keywords),
-            "matched_keywords_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "clarity_feedback": "Response was received but could not be fully evaluated.",
-                "politeness_feedback": "Please try to use polite phrases and respectful tone.",
-                "request_structure_feedback": "Make sure to ask for help clearly and appropriately.",
-                "specificity_feedback": "Provide specific details about your problem.",
-                "solution_orientation_feedback": "Ask for specific solutions or next steps."
-            },
-            "suggested_improvements": [
-                "Try to be more specific in your response",
-                "Use polite phrases when asking for help",
-                "Practice clear problem description"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your problem-solving skills.",
-            "next_steps": "Focus on using appropriate polite language for problem-solving."
-        }
-        
+
+    try:
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(3, 3).messages(
+            problem_description=problem_description, context=context, user_response=user_response,
+            expected_keywords=", ".join(expected_keywords), polite_phrases=", ".join(polite_phrases),
+            sample_responses=", ".join(sample_responses),
+        )
+        evaluation_result = _scored_evaluation("ex3_stage3", ProblemSolvingEvaluation, prompt_messages,
+                                               fallback_evaluation, max_tokens=1000)
+        if evaluation_result is None:
+            return failure("Failed to parse evaluation response", "Please try again with a clearer response.")
+
+        # Calculate success based on overall score (adjusted for B1 intermediate level)
+        success = evaluation_result["overall_score"] >= 35
+
+        logger.info("feedback.evaluation.done", evaluator="ex3_stage3", score=evaluation_result["overall_score"],
+                    is_correct=success)
+
         return {
-            "success": False,
-            "error": f"Evaluation service error: {str(e)}",
-            "suggested_improvement": "Please try again later.",
-            "evaluation": fallback_evaluation,
-            "score": 50,
-            "is_correct": False,
-            "completed": False,
-            "keyword_matches": [],
-            "total_keywords": len(expected_keywords),
-            "matched_keywords_count": 0,
-            "fluency_score": 22,
-            "grammar_score": 28,
-            "response_type": "unknown"
+            "success": success,
+            "evaluation": evaluation_result,
+            "suggested_improvement": evaluation_result["suggested_improvements"][0] if evaluation_result["suggested_improvements"] else "",
+            "keyword_matches": evaluation_result["keyword_matches"],
+            "total_keywords": evaluation_result["total_keywords"],
+            "matched_keywords_count": evaluation_result["matched_keywords_count"],
+            "fluency_score": evaluation_result["clarity_score"] + evaluation_result["politeness_score"],
+            "grammar_score": evaluation_result["request_structure_score"] + evaluation_result["specificity_score"] + evaluation_result["solution_orientation_score"],
+            "response_type": evaluation_result["response_type_detected"],
+            "score": evaluation_result["overall_score"],
+            "is_correct": success,
+            "completed": success
         }
 
+    except Exception as e:
+        logger.exception("feedback.evaluation.failed", evaluator="ex3_stage3")
+        return failure(f"Evaluation service error: {str(e)}", "Please try again later.")
 
-def evaluate_response_ex1_stage4(user_response: str, topic: str, key_connectors: list, vocabulary_focus: list, model_response: str) -> dict:
-    """
-    Evaluate Stage 4 Exercise 1 (Abstract Topic Monologue) responses using OpenAI GPT-4o.
-    
-    This function evaluates B2 Upper Intermediate level abstract topic monologues based on:
-    - Opinion clarity and balanced viewpoints
-    - Effective use of transitional phrases and connectors
-    - Fluency in extended monologue speaking
-    - Grammar accuracy and lexical richness
-    - Coherence and logical structure
-    
-    Args:
-        user_response (str): The user's recorded monologue response
-        topic (str): The abstract topic they were asked to speak about
-        key_connectors (list): Expected transitional phrases and connectors
-        vocabulary_focus (list): Domain-specific vocabulary to evaluate
-        model_response (str): Example of a well-structured response for comparison
-    
-    Returns:
-        dict: Comprehensive evaluation results with scores and detailed feedback
-    """
-    print(f"🔍 [EVAL] Evaluating Stage 4 Exercise 1 response: {user_response[:100]}...")
-    
-    try:
-        # Create comprehensive evaluation prompt for B2 level abstract topic monologue
-        evaluation_prompt = f"""
-You are an expert English language assessor evaluating a B2 Upper Intermediate level abstract topic monologue. 
-
-TOPIC: "{topic}"
 
-USER RESPONSE: "{user_response}"
+EX1_STAGE4_INSTRUCTIONS = """
+You are an expert English language assessor specializing in B2 Upper Intermediate level evaluation, evaluating a B2 Upper Intermediate level abstract topic monologue. Provide detailed, constructive feedback in JSON format.
 
-EXPECTED CONNECTORS: {key_connectors}
-EXPECTED VOCABULARY: {vocabulary_focus}
-MODEL RESPONSE EXAMPLE: "{model_response}"
+📥 The topic, user response, expected connectors, expected vocabulary and a model response example are given in the user message.
 
 Evaluate the response based on B2 Upper Intermediate criteria:
 
@@ -2185,7 +1920,7 @@ Evaluate the response based on B2 Upper Intermediate criteria:
    - Personal insight and nuanced thinking
 
 2. CONNECTOR USAGE (20 points):
-   - Effective use of transitional phrases: {key_connectors}
+   - Effective use of the expected transitional phrases
    - Logical flow between ideas
    - Appropriate discourse markers
 
@@ -2215,7 +1950,7 @@ Evaluate the response based on B2 Upper Intermediate criteria:
 
 Provide your evaluation in the following JSON format:
 
-{{
+{
     "overall_score": <0-100>,
     "opinion_clarity_score": <0-20>,
     "connector_usage_score": <0-20>,
@@ -2229,14 +1964,14 @@ Provide your evaluation in the following JSON format:
     "total_vocabulary": <number>,
     "matched_vocabulary_count": <number>,
     "response_type_detected": "opinion_essay|balanced_argument|personal_reflection",
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "opinion_clarity_feedback": "Detailed feedback on opinion expression",
         "connector_feedback": "Feedback on transitional phrase usage",
         "fluency_feedback": "Feedback on speaking fluency and flow",
         "grammar_feedback": "Feedback on grammatical accuracy",
         "lexical_feedback": "Feedback on vocabulary usage and richness",
         "structure_feedback": "Feedback on overall organization and coherence"
-    }},
+    },
     "suggested_improvements": [
         "Specific improvement suggestion 1",
         "Specific improvement suggestion 2",
@@ -2244,7 +1979,7 @@ Provide your evaluation in the following JSON format:
     ],
     "encouragement": "Motivational message for the learner",
     "next_steps": "Recommended focus areas for improvement"
-}}
+}
 
 Scoring Guidelines:
 - 80-100: Excellent B2 level performance
@@ -2255,104 +1990,79 @@ Scoring Guidelines:
 Focus on B2 Upper Intermediate standards for abstract topic discussion and extended monologue speaking.
 """
 
-        print(f"🔄 [EVAL] Sending evaluation request to OpenAI...")
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert English language assessor specializing in B2 Upper Intermediate level evaluation. Provide detailed, constructive feedback in JSON format."
-                },
-                {
-                    "role": "user",
-                    "content": evaluation_prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=1500
-        )
-        
-        result_text = response.choices[0].message.content
-        print(f"📊 [EVAL] Raw OpenAI response: {result_text[:200]}...")
-        
-        # Clean the response text to extract JSON
-        result_text = result_text.strip()
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {result_text[:200]}...")
-        
-        # Parse JSON response
-        evaluation_result = json.loads(result_text)
-        
-        # Calculate success based on overall score (B2 level requires 80%+)
-        success = evaluation_result.get("overall_score", 0) >= 35
-        
-        print(f"✅ [EVAL] Evaluation completed. Score: {evaluation_result.get('overall_score', 0)}%")
-        
-        return {
-            "success": success,
-            "evaluation": evaluation_result,
-            "suggested_improvement": evaluation_result.get("suggested_improvements", [""])[0] if evaluation_result.get("suggested_improvements") else "",
-            "connector_matches": evaluation_result.get("connector_matches", []),
-            "total_connectors": evaluation_result.get("total_connectors", len(key_connectors)),
-            "matched_connectors_count": evaluation_result.get("matched_connectors_count", 0),
-            "vocabulary_matches": evaluation_result.get("vocabulary_matches", []),
-            "total_vocabulary": evaluation_result.get("total_vocabulary", len(vocabulary_focus)),
-            "matched_vocabulary_count": evaluation_result.get("matched_vocabulary_count", 0),
-            "fluency_score": evaluation_result.get("fluency_score", 0),
-            "grammar_score": evaluation_result.get("grammar_score", 0),
-            "lexical_richness_score": evaluation_result.get("lexical_richness_score", 0),
-            "opinion_clarity_score": evaluation_result.get("opinion_clarity_score", 0),
-            "connector_usage_score": evaluation_result.get("connector_usage_score", 0),
-            "response_type": evaluation_result.get("response_type_detected", ""),
-            "score": evaluation_result.get("overall_score", 0),
-            "is_correct": success,
-            "completed": success
-        }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-        print(f"📊 [EVAL] Failed to parse response: {result_text}")
-        fallback_evaluation = {
-            "overall_score": 60,
-            "opinion_clarity_score": 12,
-            "connector_usage_score": 12,
-            "fluency_score": 12,
-            "grammar_score": 12,
-            "lexical_richness_score": 12,
-            "connector_matches": [],
-            "vocabulary_matches": [],
-            "total_connectors": len(key_connectors),
-            "matched_connectors_count": 0,
-            "total_vocabulary": len(vocabulary_focus),
-            "matched_vocabulary_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "opinion_clarity_feedback": "Response was received but could not be fully evaluated.",
-                "connector_feedback": "Please try to use transitional phrases effectively.",
-                "fluency_feedback": "Focus on speaking smoothly and naturally.",
-                "grammar_feedback": "Pay attention to grammatical accuracy.",
-                "lexical_feedback": "Use a variety of vocabulary and expressions.",
-                "structure_feedback": "Organize your thoughts logically."
-            },
-            "suggested_improvements": [
-                "Practice using transitional phrases like 'however', 'although', 'furthermore'",
-                "Work on expressing balanced opinions with supporting arguments",
-                "Focus on speaking fluently for extended periods"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your abstract topic discussion skills.",
-            "next_steps": "Focus on using connectors and expressing complex opinions clearly."
-        }
-        
+EX1_STAGE4_INPUTS = """
+📥 Inputs:
+TOPIC: "{topic}"
+
+USER RESPONSE: "{user_response}"
+
+EXPECTED CONNECTORS: {key_connectors}
+EXPECTED VOCABULARY: {vocabulary_focus}
+MODEL RESPONSE EXAMPLE: "{model_response}"
+"""
+
+prompt_registry.register(4, 1, EX1_STAGE4_INSTRUCTIONS, EX1_STAGE4_INPUTS)
+
+def evaluate_response_ex1_stage4(user_response: str, topic: str, key_connectors: list, vocabulary_focus: list, model_response: str) -> dict:
+    """
+    Evaluate Stage 4 Exercise 1 (Abstract Topic Monologue) responses using OpenAI GPT-4o.
+
+    This function evaluates B2 Upper Intermediate level abstract topic monologues based on:
+    - Opinion clarity and balanced viewpoints
+    - Effective use of transitional phrases and connectors
+    - Fluency in extended monologue speaking
+    - Grammar accuracy and lexical richness
+    - Coherence and logical structure
+
+    Args:
+        user_response (str): The user's recorded monologue response
+        topic (str): The abstract topic they were asked to speak about
+        key_connectors (list): Expected transitional phrases and connectors
+        vocabulary_focus (list): Domain-specific vocabulary to evaluate
+        model_response (str): Example of a well-structured response for comparison
+
+    Returns:
+        dict: Comprehensive evaluation results with scores and detailed feedback
+    """
+    logger.debug("feedback.evaluation.start", evaluator="ex1_stage4", response_chars=len(user_response),
+                 connectors=len(key_connectors), vocabulary=len(vocabulary_focus))
+
+    fallback_evaluation = {
+        "overall_score": 60,
+        "opinion_clarity_score": 12,
+        "connector_usage_score": 12,
+        "fluency_score": 12,
+        "grammar_score": 12,
+        "lexical_richness_score": 12,
+        "connector_matches": [],
+        "vocabulary_matches": [],
+        "total_connectors": len(key_connectors),
+        "matched_connectors_count": 0,
+        "total_vocabulary": len(vocabulary_focus),
+        "matched_vocabulary_count": 0,
+        "response_type_detected": "unknown",
+        "detailed_feedback": {
+            "opinion_clarity_feedback": "Response was received but could not be fully evaluated.",
+            "connector_feedback": "Please try to use transitional phrases effectively.",
+            "fluency_feedback": "Focus on speaking smoothly and naturally.",
+            "grammar_feedback": "Pay attention to grammatical accuracy.",
+            "lexical_feedback": "Use a variety of vocabulary and expressions.",
+            "structure_feedback": "Organize your thoughts logically."
+        },
+        "suggested_improvements": [
+            "Practice using transitional phrases like 'however', 'although', 'furthermore'",
+            "Work on expressing balanced opinions with supporting arguments",
+            "Focus on speaking fluently for extended periods"
+        ],
+        "encouragement": "Good effort! Keep practicing to improve your abstract topic discussion skills.",
+        "next_steps": "Focus on using connectors and expressing complex opinions clearly."
+    }
+
+    def failure(error: str, suggested_improvement: str) -> dict:
         return {
             "success": False,
-            "error": "Failed to parse evaluation response",
-            "suggested_improvement": "Please try again with a clearer response.",
+            "error": error,
+            "suggested_improvement": suggested_improvement,
             "evaluation": fallback_evaluation,
             "score": 60,
             "is_correct": False,
@@ -2370,99 +2080,56 @@ Focus on B2 Upper Intermediate standards for abstract topic discussion and exten
             "connector_usage_score": 12,
             "response_type": "unknown"
         }
-    except Exception as e:
-        print(f"❌ [EVAL] OpenAI API error: {str(e)}")
-        fallback_evaluation = {
-            "overall_score": 60,
-            "opinion_clarity_score": 12,
-            "connector_usage_score": 12,
-            "fluency_score": 12,
-            "grammar_score": 12,
-            "lexical_richness_score": 12,
-            "connector_matches": [],
-            "vocabulary_matches": [],
-            "total_connectors": len(key_connectors),
-            "matched_connectors_count": 0,
-            "total_vocabulary": len(vocabulary_focus),
-            "matched_vocabulary_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "opinion_clarity_feedback": "Response was received but could not be fully evaluated.",
-                "connector_feedback": "Please try to use transitional phrases effectively.",
-                "fluency_feedback": "Focus on speaking smoothly and naturally.",
-                "grammar_feedback": "Pay attention to grammatical accuracy.",
-                "lexical_feedback": "Use a variety of vocabulary and expressions.",
-                "structure_feedback": "Organize your thoughts logically."
-            },
-            "suggested_improvements": [
-                "Practice using transitional phrases like 'however', 'although', 'furthermore'",
-                "Work on expressing balanced opinions with supporting arguments",
-                "Focus on speaking fluently for extended periods"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your abstract topic discussion skills.",
-            "next_steps": "Focus on using connectors and expressing complex opinions clearly."
-        }
-        
+
+    try:
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(4, 1).messages(
+            topic=topic, user_response=user_response, key_connectors=key_connectors,
+            vocabulary_focus=vocabulary_focus, model_response=model_response,
+        )
+        evaluation_result = _scored_evaluation("ex1_stage4", AbstractTopicEvaluation, prompt_messages,
+                                               fallback_evaluation, max_tokens=1500)
+        if evaluation_result is None:
+            return failure("Failed to parse evaluation response", "Please try again with a clearer response.")
+
+        # Calculate success based on overall score
+        success = evaluation_result["overall_score"] >= 35
+
+        logger.info("feedback.evaluation.done", evaluator="ex1_stage4", score=evaluation_result["overall_score"],
+                    is_correct=success)
+
         return {
-            "success": False,
-            "error": f"Evaluation service error: {str(e)}",
-            "suggested_improvement": "Please try again later.",
-            "evaluation": fallback_evaluation,
-            "score": 60,
-            "is_correct": False,
-            "completed": False,
-            "connector_matches": [],
-            "total_connectors": len(key_connectors),
-            "matched_connectors_count": 0,
-            "vocabulary_matches": [],
-            "total_vocabulary": len(vocabulary_focus),
-            "matched_vocabulary_count": 0,
-            "fluency_score": 12,
-            "grammar_score": 12,
-            "lexical_richness_score": 12,
-            "opinion_clarity_score": 12,
-            "connector_usage_score": 12,
-            "response_type": "unknown"
+            "success": success,
+            "evaluation": evaluation_result,
+            "suggested_improvement": evaluation_result["suggested_improvements"][0] if evaluation_result["suggested_improvements"] else "",
+            "connector_matches": evaluation_result["connector_matches"],
+            "total_connectors": evaluation_result["total_connectors"],
+            "matched_connectors_count": evaluation_result["matched_connectors_count"],
+            "vocabulary_matches": evaluation_result["vocabulary_matches"],
+            "total_vocabulary": evaluation_result["total_vocabulary"],
+            "matched_vocabulary_count": evaluation_result["matched_vocabulary_count"],
+            "fluency_score": evaluation_result["fluency_score"],
+            "grammar_score": evaluation_result["grammar_score"],
+            "lexical_richness_score": evaluation_result["lexical_richness_score"],
+            "opinion_clarity_score": evaluation_result["opinion_clarity_score"],
+            "connector_usage_score": evaluation_result["connector_usage_score"],
+            "response_type": evaluation_result["response_type_detected"],
+            "score": evaluation_result["overall_score"],
+            "is_correct": success,
+            "completed": success
         }
 
+    except Exception as e:
+        logger.exception("feedback.evaluation.failed", evaluator="ex1_stage4")
+        return failure(f"Evaluation service error: {str(e)}", "Please try again later.")
 
 
 
-def evaluate_response_ex2_stage4(user_response: str, question: str, expected_keywords: list, vocabulary_focus: list, model_response: str) -> dict:
-    """
-    Evaluate Stage 4 Exercise 2 (Mock Interview Practice) responses using OpenAI GPT-4o.
-    
-    This function evaluates B2 Upper Intermediate level interview responses based on:
-    - Answer relevance and depth
-    - Professional confidence and tone
-    - Grammar accuracy and fluency
-    - Interview-specific vocabulary usage
-    - Structured response organization
-    
-    Args:
-        user_response (str): The user's recorded interview response
-        question (str): The interview question they were asked
-        expected_keywords (list): Expected keywords to include in response
-        vocabulary_focus (list): Professional interview vocabulary to evaluate
-        model_response (str): Example of a well-structured interview response
-    
-    Returns:
-        dict: Comprehensive evaluation results with scores and detailed feedback
-    """
-    print(f"🔍 [EVAL] Evaluating Stage 4 Exercise 2 response: {user_response[:100]}...")
-    
-    try:
-        # Create comprehensive evaluation prompt for B2 level interview practice
-        evaluation_prompt = f"""
-You are an expert English language assessor evaluating a B2 Upper Intermediate level mock interview response. 
 
-INTERVIEW QUESTION: "{question}"
+EX2_STAGE4_INSTRUCTIONS = """
+You are an expert English language assessor specializing in B2 Upper Intermediate level interview evaluation, evaluating a B2 Upper Intermediate level mock interview response. Provide detailed, constructive feedback in JSON format.
 
-USER RESPONSE: "{user_response}"
-
-EXPECTED KEYWORDS: {expected_keywords}
-EXPECTED VOCABULARY: {vocabulary_focus}
-MODEL RESPONSE EXAMPLE: "{model_response}"
+📥 The interview question, user response, expected keywords, expected vocabulary and a model response example are given in the user message.
 
 Evaluate the response based on B2 Upper Intermediate interview criteria:
 
@@ -2488,7 +2155,7 @@ Evaluate the response based on B2 Upper Intermediate interview criteria:
    - Use of professional interview language
    - Appropriate industry-specific terminology
    - Sophisticated vocabulary choices
-   - Effective use of expected keywords: {expected_keywords}
+   - Effective use of the expected keywords
 
 5. STRUCTURE & ORGANIZATION:
    - Clear beginning, middle, and end
@@ -2498,7 +2165,7 @@ Evaluate the response based on B2 Upper Intermediate interview criteria:
 
 Provide your evaluation in the following JSON format:
 
-{{
+{
     "overall_score": <0-100>,
     "answer_relevance_score": <0-25>,
     "confidence_tone_score": <0-25>,
@@ -2511,13 +2178,13 @@ Provide your evaluation in the following JSON format:
     "total_vocabulary": <number>,
     "matched_vocabulary_count": <number>,
     "response_type_detected": "self_introduction|motivation|strengths_weaknesses|problem_solving|career_planning",
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "relevance_feedback": "Detailed feedback on question relevance",
         "confidence_feedback": "Feedback on professional tone and confidence",
         "grammar_feedback": "Feedback on grammatical accuracy and fluency",
         "vocabulary_feedback": "Feedback on interview vocabulary usage",
         "structure_feedback": "Feedback on response organization and flow"
-    }},
+    },
     "suggested_improvements": [
         "Specific improvement suggestion 1",
         "Specific improvement suggestion 2",
@@ -2525,7 +2192,7 @@ Provide your evaluation in the following JSON format:
     ],
     "encouragement": "Motivational message for the learner",
     "next_steps": "Recommended focus areas for improvement"
-}}
+}
 
 Scoring Guidelines:
 - 80-100: Excellent B2 level interview performance
@@ -2536,154 +2203,77 @@ Scoring Guidelines:
 Focus on B2 Upper Intermediate standards for professional interview communication and self-presentation.
 """
 
-        print(f"🔄 [EVAL] Sending evaluation request to OpenAI...")
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert English language assessor specializing in B2 Upper Intermediate level interview evaluation. Provide detailed, constructive feedback in JSON format."
-                },
-                {
-                    "role": "user",
-                    "content": evaluation_prompt
-                }
-            ],
-            temperature=0.3,
-            max_tokens=1500
-        )
-        
-        result_text = response.choices[0].message.content
-        print(f"📊 [EVAL] Raw OpenAI response: {result_text[:200]}...")
-        
-        # Clean the response text to extract JSON
-        result_text = result_text.strip()
-        if result_text.startswith('```json'):
-            result_text = result_text[7:]
-        if result_text.endswith('```'):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {result_text[:200]}...")
-        
-        # Parse JSON response
-        evaluation_result = json.loads(result_text)
-        
-        # Calculate success based on overall score (B2 level requires 80%+)
-        success = evaluation_result.get("overall_score", 0) >= 35
-        
-        print(f"✅ [EVAL] Evaluation completed. Score: {evaluation_result.get('overall_score', 0)}%")
-        
-        return {
-            "success": success,
-            "evaluation": evaluation_result,
-            "suggested_improvement": evaluation_result.get("suggested_improvements", [""])[0] if evaluation_result.get("suggested_improvements") else "",
-            "keyword_matches": evaluation_result.get("keyword_matches", []),
-            "total_keywords": evaluation_result.get("total_keywords", len(expected_keywords)),
-            "matched_keywords_count": evaluation_result.get("matched_keywords_count", 0),
-            "vocabulary_matches": evaluation_result.get("vocabulary_matches", []),
-            "total_vocabulary": evaluation_result.get("total_vocabulary", len(vocabulary_focus)),
-            "matched_vocabulary_count": evaluation_result.get("matched_vocabulary_count", 0),
-            "fluency_score": evaluation_result.get("grammar_fluency_score", 0),
-            "grammar_score": evaluation_result.get("grammar_fluency_score", 0),
-            "answer_relevance_score": evaluation_result.get("answer_relevance_score", 0),
-            "confidence_tone_score": evaluation_result.get("confidence_tone_score", 0),
-            "interview_vocabulary_score": evaluation_result.get("interview_vocabulary_score", 0),
-            "response_type": evaluation_result.get("response_type_detected", ""),
-            "score": evaluation_result.get("overall_score", 0),
-            "is_correct": success,
-            "completed": success
-        }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-        print(f"📊 [EVAL] Failed to parse response: {result_text}")
-        fallback_evaluation = {
-            "overall_score": 60,
-            "answer_relevance_score": 15,
-            "confidence_tone_score": 15,
-            "grammar_fluency_score": 15,
-            "interview_vocabulary_score": 15,
-            "keyword_matches": [],
-            "vocabulary_matches": [],
-            "total_keywords": len(expected_keywords),
-            "matched_keywords_count": 0,
-            "total_vocabulary": len(vocabulary_focus),
-            "matched_vocabulary_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "relevance_feedback": "Response was received but could not be fully evaluated.",
-                "confidence_feedback": "Please try to maintain a confident and professional tone.",
-                "grammar_feedback": "Focus on grammatical accuracy and fluency.",
-                "vocabulary_feedback": "Use professional interview vocabulary and expected keywords.",
-                "structure_feedback": "Organize your response with clear structure and flow."
-            },
-            "suggested_improvements": [
-                "Practice using professional interview vocabulary",
-                "Work on maintaining confident and clear communication",
-                "Focus on directly addressing the interview question"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your interview skills.",
-            "next_steps": "Focus on professional vocabulary and confident self-presentation."
-        }
-        
-        return {
-            "success": False,
-            "error": "Failed to parse evaluation response",
-            "suggested_improvement": "Please try again with a clearer response.",
-            "evaluation": fallback_evaluation,
-            "score": 60,
-            "is_correct": False,
-            "completed": False,
-            "keyword_matches": [],
-            "total_keywords": len(expected_keywords),
-            "matched_keywords_count": 0,
-            "vocabulary_matches": [],
-            "total_vocabulary": len(vocabulary_focus),
-            "matched_vocabulary_count": 0,
-            "fluency_score": 15,
-            "grammar_score": 15,
-            "answer_relevance_score": 15,
-            "confidence_tone_score": 15,
-            "interview_vocabulary_score": 15,
-            "response_type": "unknown"
-        }
-    except Exception as e:
-        print(f"❌ [EVAL] OpenAI API error: {str(e)}")
-        fallback_evaluation = {
-            "overall_score": 60,
-            "answer_relevance_score": 15,
-            "confidence_tone_score": 15,
-            "grammar_fluency_score": 15,
-            "interview_vocabulary_score": 15,
-            "keyword_matches": [],
-            "vocabulary_matches": [],
-            "total_keywords": len(expected_keywords),
-            "matched_keywords_count": 0,
-            "total_vocabulary": len(vocabulary_focus),
-            "matched_vocabulary_count": 0,
-            "response_type_detected": "unknown",
-            "detailed_feedback": {
-                "relevance_feedback": "Response was received but could not be fully evaluated.",
-                "confidence_feedback": "Please try to maintain a confident and professional tone.",
-                "grammar_feedback": "Focus on grammatical accuracy and fluency.",
-                "vocabulary_feedback": "Use professional interview vocabulary and expected keywords.",
-                "structure_feedback": "Organize your response with clear structure and flow."
-            },
-            "suggested_improvements": [
-                "Practice using professional interview vocabulary",
-                "Work on maintaining confident and clear communication",
-                "Focus on directly addressing the interview question"
-            ],
-            "encouragement": "Good effort! Keep practicing to improve your interview skills.",
-            "next_steps": "Focus on professional vocabulary and confident self-presentation."
-        }
-        
+EX2_STAGE4_INPUTS = """
+📥 Inputs:
+INTERVIEW QUESTION: "{question}"
+
+USER RESPONSE: "{user_response}"
+
+EXPECTED KEYWORDS: {expected_keywords}
+EXPECTED VOCABULARY: {vocabulary_focus}
+MODEL RESPONSE EXAMPLE: "{model_response}"
+"""
+
+prompt_registry.register(4, 2, EX2_STAGE4_INSTRUCTIONS, EX2_STAGE4_INPUTS)
+
+def evaluate_response_ex2_stage4(user_response: str, question: str, expected_keywords: list, vocabulary_focus: list, model_response: str) -> dict:
+    """
+    Evaluate Stage 4 Exercise 2 (Mock Interview Practice) responses using OpenAI GPT-4o.
+
+    This function evaluates B2 Upper Intermediate level interview responses based on:
+    - Answer relevance and depth
+    - Professional confidence and tone
+    - Grammar accuracy and fluency
+    - Interview-specific vocabulary usage
+    - Structured response organization
+
+    Args:
+        user_response (str): The user's recorded interview response
+        question (str): The interview question they were asked
+        expected_keywords (list): Expected keywords to include in response
+        vocabulary_focus (list): Professional interview vocabulary to evaluate
+        model_response (str): Example of a well-structured interview response
+
+    Returns:
+        dict: Comprehensive evaluation results with scores and detailed feedback
+    """
+    logger.debug("feedback.evaluation.start", evaluator="ex2_stage4", response_chars=len(user_response),
+                 keywords=len(expected_keywords), vocabulary=len(vocabulary_focus))
+
+    fallback_evaluation = {
+        "overall_score": 60,
+        "answer_relevance_score": 15,
+        "confidence_tone_score": 15,
+        "grammar_fluency_score": 15,
+        "interview_vocabulary_score": 15,
+        "keyword_matches": [],
+        "vocabulary_matches": [],
+        "total_keywords": len(expected_keywords),
+        "matched_keywords_count": 0,
+        "total_vocabulary": len(vocabulary_focus),
+        "matched_vocabulary_count": 0,
+        "response_type_detected": "unknown",
+        "detailed_feedback": {
+            "relevance_feedback": "Response was received but could not be fully evaluated.",
+            "confidence_feedback": "Please try to maintain a confident and professional tone.",
+            "grammar_feedback": "Focus on grammatical accuracy and fluency.",
+            "vocabulary_feedback": "Use professional interview vocabulary and expected keywords.",
+            "structure_feedback": "Organize your response with clear structure and flow."
+        },
+        "suggested_improvements": [
+            "Practice using professional interview vocabulary",
+            "Work on maintaining confident and clear communication",
+            "Focus on directly addressing the interview question"
+        ],
+        "encouragement": "Good effort! Keep practicing to improve your interview skills.",
+        "next_steps": "Focus on professional vocabulary and confident self-presentation."
+    }
+
+    def failure(error: str, suggested_improvement: str) -> dict:
         return {
             "success": False,
-            "error": f"Evaluation service error: {str(e)}",
-            "suggested_improvement": "Please try again later.",
+            "error": error,
+            "suggested_improvement": suggested_improvement,
             "evaluation": fallback_evaluation,
             "score": 60,
             "is_correct": False,
@@ -2702,37 +2292,53 @@ Focus on B2 Upper Intermediate standards for professional interview communicatio
             "response_type": "unknown"
         }
 
+    try:
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(4, 2).messages(
+            question=question, user_response=user_response, expected_keywords=expected_keywords,
+            vocabulary_focus=vocabulary_focus, model_response=model_response,
+        )
+        evaluation_result = _scored_evaluation("ex2_stage4", MockInterviewEvaluation, prompt_messages,
+                                               fallback_evaluation, max_tokens=1500)
+        if evaluation_result is None:
+            return failure("Failed to parse evaluation response", "Please try again with a clearer response.")
 
+        # Calculate success based on overall score
+        success = evaluation_result["overall_score"] >= 35
 
-def evaluate_response_ex3_stage4(user_response: str, news_title: str, summary_text: str, expected_keywords: list, vocabulary_focus: list, model_summary: str) -> dict:
-    """
-    Evaluate user's news summary response for Stage 4 Exercise 3 (News Summary Challenge)
-    
-    Args:
-        user_response: User's recorded summary
-        news_title: Title of the news article
-        summary_text: Original news text
-        expected_keywords: List of expected keywords
-        vocabulary_focus: List of vocabulary words to focus on
-        model_summary: Example model summary
-    
-    Returns:
-        Dictionary with evaluation results
-    """
-    try:
-        print(f"🔍 [EVAL] Evaluating news summary response: {user_response[:50]}...")
-        
-        # Create comprehensive evaluation prompt
-        prompt = f"""
-You are an expert English language evaluator specializing in B2 Upper Intermediate level assessments. 
-Evaluate the following news summary response based on the criteria below.
+        logger.info("feedback.evaluation.done", evaluator="ex2_stage4", score=evaluation_result["overall_score"],
+                    is_correct=success)
+
+        return {
+            "success": success,
+            "evaluation": evaluation_result,
+            "suggested_improvement": evaluation_result["suggested_improvements"][0] if evaluation_result["suggested_improvements"] else "",
+            "keyword_matches": evaluation_result["keyword_matches"],
+            "total_keywords": evaluation_result["total_keywords"],
+            "matched_keywords_count": evaluation_result["matched_keywords_count"],
+            "vocabulary_matches": evaluation_result["vocabulary_matches"],
+            "total_vocabulary": evaluation_result["total_vocabulary"],
+            "matched_vocabulary_count": evaluation_result["matched_vocabulary_count"],
+            "fluency_score": evaluation_result["grammar_fluency_score"],
+            "grammar_score": evaluation_result["grammar_fluency_score"],
+            "answer_relevance_score": evaluation_result["answer_relevance_score"],
+            "confidence_tone_score": evaluation_result["confidence_tone_score"],
+            "interview_vocabulary_score": evaluation_result["interview_vocabulary_score"],
+            "response_type": evaluation_result["response_type_detected"],
+            "score": evaluation_result["overall_score"],
+            "is_correct": success,
+            "completed": success
+        }
+
+    except Exception as e:
+        logger.exception("feedback.evaluation.failed", evaluator="ex2_stage4")
+        return failure(f"Evaluation service error: {str(e)}", "Please try again later.")
 
-NEWS TITLE: {news_title}
-ORIGINAL NEWS TEXT: {summary_text}
-USER'S SUMMARY: {user_response}
-MODEL SUMMARY: {model_summary}
-EXPECTED KEYWORDS: {', '.join(expected_keywords)}
-VOCABULARY FOCUS: {', '.join(vocabulary_focus)}
+
+
+EX3_STAGE4_INSTRUCTIONS = """
+You are an expert English language evaluator specializing in B2 Upper Intermediate level assessments.
+Evaluate the news summary response given in the user message (with the news title, original news text, model summary, expected keywords and vocabulary focus) based on the criteria below.
 
 EVALUATION CRITERIA (Total: 100 points):
 1. Main Points Coverage (30 points): Does the summary cover the key facts, events, and important details from the original news?
@@ -2741,7 +2347,7 @@ EVALUATION CRITERIA (Total: 100 points):
 4. Neutral Tone (20 points): Is the tone objective and journalistic, avoiding personal opinions?
 
 Provide your evaluation in the following JSON format:
-{{
+{
     "overall_score": <0-100>,
     "main_points_coverage_score": <0-30>,
     "grammar_structure_score": <0-25>,
@@ -2751,98 +2357,118 @@ Provide your evaluation in the following JSON format:
     "total_keywords": <total_number_of_expected_keywords>,
     "matched_keywords_count": <number_of_matched_keywords>,
     "summary_type_detected": "<summary/paraphrase/copy>",
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "main_points_feedback": "<feedback on main points coverage>",
         "grammar_feedback": "<feedback on grammar and structure>",
         "paraphrasing_feedback": "<feedback on paraphrasing skills>",
         "tone_feedback": "<feedback on neutral tone>"
-    }},
+    },
     "suggested_improvements": ["improvement1", "improvement2", "improvement3"],
     "encouragement": "<positive encouragement message>",
     "next_steps": "<specific next steps for improvement>"
-}}
+}
 
 Focus on B2 Upper Intermediate level expectations. Be encouraging but honest in your assessment.
 """
 
-        print("🔄 [EVAL] Sending evaluation request to OpenAI...")
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert English language evaluator for B2 Upper Intermediate level. Provide evaluations in the exact JSON format requested."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500
+EX3_STAGE4_INPUTS = """
+📥 Inputs:
+NEWS TITLE: {news_title}
+ORIGINAL NEWS TEXT: {summary_text}
+USER'S SUMMARY: {user_response}
+MODEL SUMMARY: {model_summary}
+EXPECTED KEYWORDS: {expected_keywords}
+VOCABULARY FOCUS: {vocabulary_focus}
+"""
+
+prompt_registry.register(4, 3, EX3_STAGE4_INSTRUCTIONS, EX3_STAGE4_INPUTS)
+
+def evaluate_response_ex3_stage4(user_response: str, news_title: str, summary_text: str, expected_keywords: list, vocabulary_focus: list, model_summary: str) -> dict:
+    """
+    Evaluate user's news summary response for Stage 4 Exercise 3 (News Summary Challenge)
+
+    Args:
+        user_response: User's recorded summary
+        news_title: Title of the news article
+        summary_text: Original news text
+        expected_keywords: List of expected keywords
+        vocabulary_focus: List of vocabulary words to focus on
+        model_summary: Example model summary
+
+    Returns:
+        Dictionary with evaluation results
+    """
+    # Fallback values (only used for fields GPT never produced; the score must come from GPT)
+    fallback = {
+        "main_points_coverage_score": 0,
+        "grammar_structure_score": 0,
+        "paraphrasing_skills_score": 0,
+        "neutral_tone_score": 0,
+        "keyword_matches": [],
+        "total_keywords": len(expected_keywords),
+        "matched_keywords_count": 0,
+        "summary_type_detected": "summary",
+        "detailed_feedback": {
+            "main_points_feedback": "",
+            "grammar_feedback": "",
+            "paraphrasing_feedback": "",
+            "tone_feedback": ""
+        },
+        "suggested_improvements": [],
+        "encouragement": "",
+        "next_steps": ""
+    }
+
+    try:
+        logger.debug("feedback.evaluation.start", evaluator="ex3_stage4", response_chars=len(user_response),
+                     article_chars=len(summary_text), keywords=len(expected_keywords))
+
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(4, 3).messages(
+            news_title=news_title, summary_text=summary_text, user_response=user_response, model_summary=model_summary,
+            expected_keywords=", ".join(expected_keywords), vocabulary_focus=", ".join(vocabulary_focus),
         )
-        
-        print("📊 [EVAL] Raw OpenAI response received")
-        
-        # Extract and clean the response
-        raw_response = response.choices[0].message.content.strip()
-        print(f"📊 [EVAL] Raw response: {raw_response[:200]}...")
-        
-        # Clean the response to extract JSON
-        cleaned_response = raw_response
-        if "```json" in raw_response:
-            cleaned_response = raw_response.split("```json")[1].split("```")[0].strip()
-        elif "```" in raw_response:
-            cleaned_response = raw_response.split("```")[1].strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {cleaned_response[:200]}...")
-        
-        # Parse JSON response
-        evaluation_data = json.loads(cleaned_response)
-        
-        # Calculate overall score
-        overall_score = evaluation_data.get("overall_score", 0)
-        
-        # Determine if the response meets the success threshold (80% for B2 level)
+        evaluation_data = _scored_evaluation("ex3_stage4", NewsSummaryEvaluation, prompt_messages, fallback,
+                                             max_tokens=1500)
+        if evaluation_data is None:
+            return {
+                "success": False,
+                "error": "json_parsing_error",
+                "message": "Failed to parse evaluation response"
+            }
+
+        overall_score = evaluation_data["overall_score"]
+
+        # Determine if the response meets the success threshold
         success_threshold = 35
         is_successful = overall_score >= success_threshold
-        
-        # Count keyword matches
-        keyword_matches = evaluation_data.get("keyword_matches", [])
-        total_keywords = evaluation_data.get("total_keywords", len(expected_keywords))
-        matched_count = evaluation_data.get("matched_keywords_count", len(keyword_matches))
-        
-        # Determine summary type
-        summary_type = evaluation_data.get("summary_type_detected", "summary")
-        
+
         # Calculate fluency and grammar scores (scaled down for consistency)
-        fluency_score = min(50, evaluation_data.get("grammar_structure_score", 0) * 2)
-        grammar_score = min(50, evaluation_data.get("grammar_structure_score", 0) * 2)
-        
-        print(f"✅ [EVAL] Evaluation completed. Score: {overall_score}%")
-        
+        fluency_score = min(50, evaluation_data["grammar_structure_score"] * 2)
+        grammar_score = min(50, evaluation_data["grammar_structure_score"] * 2)
+
+        logger.info("feedback.evaluation.done", evaluator="ex3_stage4", score=overall_score, is_correct=is_successful)
+
         return {
             "success": True,
             "news_title": news_title,
             "expected_keywords": expected_keywords,
             "user_text": user_response,
             "evaluation": evaluation_data,
-            "suggested_improvement": evaluation_data.get("suggested_improvements", [""])[0] if evaluation_data.get("suggested_improvements") else "",
-            "keyword_matches": keyword_matches,
-            "total_keywords": total_keywords,
-            "matched_keywords_count": matched_count,
+            "suggested_improvement": evaluation_data["suggested_improvements"][0] if evaluation_data["suggested_improvements"] else "",
+            "keyword_matches": evaluation_data["keyword_matches"],
+            "total_keywords": evaluation_data["total_keywords"],
+            "matched_keywords_count": evaluation_data["matched_keywords_count"],
             "fluency_score": fluency_score,
             "grammar_score": grammar_score,
-            "summary_type": summary_type,
+            "summary_type": evaluation_data["summary_type_detected"],
             "score": overall_score,
             "is_correct": is_successful,
             "completed": is_successful
         }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {e}")
-        return {
-            "success": False,
-            "error": "json_parsing_error",
-            "message": "Failed to parse evaluation response"
-        }
+
     except Exception as e:
-        print(f"❌ [EVAL] Evaluation error: {e}")
+        logger.exception("feedback.evaluation.failed", evaluator="ex3_stage4")
         return {
             "success": False,
             "error": "evaluation_error",
@@ -2850,22 +2476,43 @@ Focus on B2 Upper Intermediate level expectations. Be encouraging but honest in
         }
 
 
-def evaluate_response_ex1_stage5(user_response: str, topic: str, ai_position: str, expected_keywords: list, vocabulary_focus: list, model_response: str) -> dict:
-    """
-    Evaluate critical thinking dialogue responses for Stage 5 Exercise 1.
-    Focuses on argument structure, critical thinking, vocabulary range, fluency, and discourse markers.
-    """
-    print(f"🔍 [EVAL] Evaluating critical thinking response: {user_response[:50]}...")
-    
-    prompt = f"""
-You are an expert English language evaluator specializing in C1 Advanced level critical thinking and philosophical discussions. Evaluate the user's response to a complex philosophical debate topic.
+# Stage 5 evaluators pass at this score; completed/is_correct are never left to the model
+STAGE5_PASS_SCORE = 35
+
+STAGE5_FAILURE = {
+    "success": False,
+    "error": "evaluation_failed",
+    "score": 0,
+    "is_correct": False,
+    "completed": False
+}
+
+
+def _stage5_result(evaluation: dict, **fields) -> dict:
+    """Stage 5 route payload: the evaluation plus the fields the routes read directly"""
+    passed = evaluation["overall_score"] >= STAGE5_PASS_SCORE
+    evaluation.update(score=evaluation["overall_score"], completed=passed, is_correct=passed)
+    return {
+        "success": True,
+        "evaluation": evaluation,
+        "suggested_improvement": evaluation["suggested_improvements"][0] if evaluation["suggested_improvements"] else "",
+        "keyword_matches": evaluation["keyword_matches"],
+        "total_keywords": evaluation["total_keywords"],
+        "matched_keywords_count": evaluation["matched_keywords_count"],
+        "vocabulary_matches": evaluation["vocabulary_matches"],
+        "total_vocabulary": evaluation["total_vocabulary"],
+        "matched_vocabulary_count": evaluation["matched_vocabulary_count"],
+        **fields,
+        "score": evaluation["score"],
+        "is_correct": passed,
+        "completed": passed
+    }
 
-**Topic:** {topic}
-**AI Position:** {ai_position}
-**User Response:** {user_response}
-**Expected Keywords:** {', '.join(expected_keywords)}
-**Vocabulary Focus:** {', '.join(vocabulary_focus)}
-**Model Response:** {model_response}
+
+EX1_STAGE5_INSTRUCTIONS = """
+You are an expert English language evaluator for C1 Advanced level critical thinking exercises, specializing in critical thinking and philosophical discussions. Evaluate the user's response to a complex philosophical debate topic and provide detailed, constructive feedback in JSON format.
+
+📥 The topic, AI position, user response, expected keywords, vocabulary focus and a model response are given in the user message.
 
 **Evaluation Criteria (Total: 100 points):**
 1. **Argument Structure (25 points):** Logical organization, clear introduction, main arguments, counter-arguments, evidence, and conclusion
@@ -2881,14 +2528,9 @@ You are an expert English language evaluator specializing in C1 Advanced level c
 - **35-69:** Adequate C1 level with noticeable gaps
 - **Below 35:** Needs significant improvement to reach C1 level
 
-**Success Threshold:** 35 points (C1 Advanced level)
-
-**IMPORTANT:** Set "completed" and "is_correct" to true ONLY if the overall_score is 35 or higher.
-
 Analyze the response and provide detailed feedback in the following JSON format:
 
-{{
-    "success": true/false,
+{
     "overall_score": <0-100>,
     "argument_structure_score": <0-25>,
     "critical_thinking_score": <0-25>,
@@ -2902,129 +2544,101 @@ Analyze the response and provide detailed feedback in the following JSON format:
     "total_vocabulary": <number>,
     "matched_vocabulary_count": <number>,
     "argument_type_detected": "balanced/one-sided/undeveloped",
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "argument_structure_feedback": "<detailed feedback on argument organization>",
         "critical_thinking_feedback": "<detailed feedback on analysis depth>",
         "vocabulary_feedback": "<detailed feedback on word choice>",
         "fluency_feedback": "<detailed feedback on flow and grammar>",
         "discourse_feedback": "<detailed feedback on connectors>"
-    }},
+    },
     "suggested_improvements": [
         "<specific improvement suggestion 1>",
         "<specific improvement suggestion 2>",
         "<specific improvement suggestion 3>"
     ],
     "encouragement": "<motivational message>",
-    "next_steps": "<specific guidance for improvement>",
-    "score": <0-100>
-}}
+    "next_steps": "<specific guidance for improvement>"
+}
 
-Note: Do NOT include "completed" or "is_correct" fields in your response. These will be calculated automatically based on the score threshold.
+Ensure all scores are numerical values.
+"""
 
-Ensure the response is valid JSON and all scores are numerical values.
+EX1_STAGE5_INPUTS = """
+📥 Inputs:
+**Topic:** {topic}
+**AI Position:** {ai_position}
+**User Response:** {user_response}
+**Expected Keywords:** {expected_keywords}
+**Vocabulary Focus:** {vocabulary_focus}
+**Model Response:** {model_response}
 """
 
+prompt_registry.register(5, 1, EX1_STAGE5_INSTRUCTIONS, EX1_STAGE5_INPUTS)
+
+def evaluate_response_ex1_stage5(user_response: str, topic: str, ai_position: str, expected_keywords: list, vocabulary_focus: list, model_response: str) -> dict:
+    """
+    Evaluate critical thinking dialogue responses for Stage 5 Exercise 1.
+    Focuses on argument structure, critical thinking, vocabulary range, fluency, and discourse markers.
+    """
+    logger.debug("feedback.evaluation.start", evaluator="ex1_stage5", response_chars=len(user_response),
+                 keywords=len(expected_keywords), vocabulary=len(vocabulary_focus))
+
+    # Fallback values (only used for fields GPT never produced; the score must come from GPT)
+    fallback = {
+        "argument_structure_score": 0,
+        "critical_thinking_score": 0,
+        "vocabulary_range_score": 0,
+        "fluency_grammar_score": 0,
+        "discourse_markers_score": 0,
+        "keyword_matches": [],
+        "total_keywords": len(expected_keywords),
+        "matched_keywords_count": 0,
+        "vocabulary_matches": [],
+        "total_vocabulary": len(vocabulary_focus),
+        "matched_vocabulary_count": 0,
+        "argument_type_detected": "undeveloped",
+        "detailed_feedback": {
+            "argument_structure_feedback": "",
+            "critical_thinking_feedback": "",
+            "vocabulary_feedback": "",
+            "fluency_feedback": "",
+            "discourse_feedback": ""
+        },
+        "suggested_improvements": [],
+        "encouragement": "",
+        "next_steps": ""
+    }
+
     try:
-        print("🔄 [EVAL] Sending evaluation request to OpenAI...")
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert English language evaluator for C1 Advanced level critical thinking exercises. Provide detailed, constructive feedback in JSON format."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(5, 1).messages(
+            topic=topic, ai_position=ai_position, user_response=user_response, model_response=model_response,
+            expected_keywords=", ".join(expected_keywords), vocabulary_focus=", ".join(vocabulary_focus),
         )
-        
-        print("📊 [EVAL] Raw OpenAI response received")
-        raw_response = response.choices[0].message.content.strip()
-        print(f"📊 [EVAL] Raw response: {raw_response[:200]}...")
-        
-        # Clean the response to ensure valid JSON
-        cleaned_response = raw_response
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-        cleaned_response = cleaned_response.strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {cleaned_response[:200]}...")
-        
-        evaluation = json.loads(cleaned_response)
-        
-        # Validate and set default values
-        if not isinstance(evaluation.get("overall_score"), (int, float)):
-            evaluation["overall_score"] = 0
-        if not isinstance(evaluation.get("score"), (int, float)):
-            evaluation["score"] = evaluation.get("overall_score", 0)
-        
-        # Force correct completion logic based on score threshold (35 for Stage 5)
-        score = evaluation.get("score", 0)
-        evaluation["completed"] = score >= 35
-        evaluation["is_correct"] = score >= 35
-            
-        print(f"✅ [EVAL] Evaluation completed. Score: {evaluation.get('score', 0)}%")
-        
-        return {
-            "success": True,
-            "evaluation": evaluation,
-            "suggested_improvement": evaluation.get("suggested_improvements", [""])[0] if evaluation.get("suggested_improvements") else "",
-            "keyword_matches": evaluation.get("keyword_matches", []),
-            "total_keywords": evaluation.get("total_keywords", 0),
-            "matched_keywords_count": evaluation.get("matched_keywords_count", 0),
-            "vocabulary_matches": evaluation.get("vocabulary_matches", []),
-            "total_vocabulary": evaluation.get("total_vocabulary", 0),
-            "matched_vocabulary_count": evaluation.get("matched_vocabulary_count", 0),
-            "fluency_score": evaluation.get("fluency_grammar_score", 0),
-            "grammar_score": evaluation.get("fluency_grammar_score", 0),
-            "argument_type": evaluation.get("argument_type_detected", ""),
-            "score": evaluation.get("score", 0),
-            "is_correct": evaluation.get("is_correct", False),
-            "completed": evaluation.get("completed", False)
-        }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-        return {
-            "success": False,
-            "error": "evaluation_failed",
-            "message": "Failed to parse evaluation response. Please try again.",
-            "score": 0,
-            "is_correct": False,
-            "completed": False
-        }
-    except Exception as e:
-        print(f"❌ [EVAL] Evaluation error: {str(e)}")
-        return {
-            "success": False,
-            "error": "evaluation_failed",
-            "message": "Failed to evaluate response. Please try again.",
-            "score": 0,
-            "is_correct": False,
-            "completed": False
-        }
+        evaluation = _scored_evaluation("ex1_stage5", CriticalThinkingEvaluation, prompt_messages, fallback,
+                                        model="gpt-4o", max_tokens=2000)
+        if evaluation is None:
+            return {**STAGE5_FAILURE, "message": "Failed to parse evaluation response. Please try again."}
+
+        result = _stage5_result(
+            evaluation,
+            fluency_score=evaluation["fluency_grammar_score"],
+            grammar_score=evaluation["fluency_grammar_score"],
+            argument_type=evaluation["argument_type_detected"],
+        )
+        logger.info("feedback.evaluation.done", evaluator="ex1_stage5", score=result["score"],
+                    is_correct=result["is_correct"])
+        return result
 
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex1_stage5")
+        return {**STAGE5_FAILURE, "message": "Failed to evaluate response. Please try again."}
 
-def evaluate_response_ex2_stage5(user_response: str, topic: str, expected_keywords: list, vocabulary_focus: list, model_response: str, expected_structure: str) -> dict:
-    """
-    Evaluate Stage 5 Exercise 2 (Academic Presentation) responses.
-    Focuses on academic presentation skills, argument structure, evidence usage, and formal tone.
-    """
-    print(f"🔄 [EVAL] Evaluating Stage 5 Exercise 2 (Academic Presentation)")
-    print(f"📝 [EVAL] Topic: {topic}")
-    print(f"📝 [EVAL] User response: {user_response[:100]}...")
-    print(f"📝 [EVAL] Expected keywords: {expected_keywords}")
-    print(f"📝 [EVAL] Expected structure: {expected_structure}")
-    
-    prompt = f"""
-You are an expert English language evaluator for C1 Advanced level academic presentations. Evaluate the user's 3-minute academic presentation based on the following criteria:
 
-**Topic:** {topic}
-**User's Presentation:** {user_response}
-**Expected Keywords:** {expected_keywords}
-**Expected Structure:** {expected_structure}
-**Vocabulary Focus:** {vocabulary_focus}
-**Model Response:** {model_response}
+EX2_STAGE5_INSTRUCTIONS = """
+You are an expert English language evaluator for C1 Advanced level academic presentations. Evaluate the user's 3-minute academic presentation based on the following criteria and provide detailed, constructive feedback in JSON format.
+
+📥 The topic, user's presentation, expected keywords, expected structure, vocabulary focus and a model response are given in the user message.
 
 **Evaluation Criteria (100 points total):**
 1. **Argument Structure (25 points):** Introduction, thesis statement, supporting evidence, counter-arguments, conclusion
@@ -3041,152 +2655,124 @@ You are an expert English language evaluator for C1 Advanced level academic pres
 5. **Overall Assessment:** Provide a comprehensive score and detailed feedback
 
 **Response Format (JSON only):**
-{{
+{
     "overall_score": <0-100>,
     "argument_structure_score": <0-25>,
     "evidence_usage_score": <0-25>,
     "academic_tone_score": <0-20>,
     "fluency_pacing_score": <0-15>,
     "vocabulary_range_score": <0-15>,
-    "keyword_matches": {expected_keywords},
+    "keyword_matches": [<expected keywords that were used>],
     "matched_keywords_count": <number of keywords used>,
-    "total_keywords": {len(expected_keywords)},
-    "vocabulary_matches": {vocabulary_focus},
+    "vocabulary_matches": [<vocabulary focus words that were used>],
     "matched_vocabulary_count": <number of vocabulary words used>,
-    "total_vocabulary": {len(vocabulary_focus)},
     "structure_followed": <true/false>,
     "evidence_provided": <true/false>,
     "academic_tone_maintained": <true/false>,
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "argument_structure_feedback": "<detailed feedback on structure>",
         "evidence_usage_feedback": "<detailed feedback on evidence>",
         "academic_tone_feedback": "<detailed feedback on tone>",
         "fluency_feedback": "<detailed feedback on delivery>",
         "vocabulary_feedback": "<detailed feedback on word choice>"
-    }},
+    },
     "suggested_improvements": [
         "<specific improvement suggestion 1>",
         "<specific improvement suggestion 2>",
         "<specific improvement suggestion 3>"
     ],
     "encouragement": "<motivational message>",
-    "next_steps": "<specific guidance for improvement>",
-    "score": <0-100>
-}}
+    "next_steps": "<specific guidance for improvement>"
+}
 
-Note: Do NOT include "completed" or "is_correct" fields in your response. These will be calculated automatically based on the score threshold of 35.
+Ensure all scores are numerical values.
+"""
 
-Ensure the response is valid JSON and all scores are numerical values.
+EX2_STAGE5_INPUTS = """
+📥 Inputs:
+**Topic:** {topic}
+**User's Presentation:** {user_response}
+**Expected Keywords:** {expected_keywords}
+**Expected Structure:** {expected_structure}
+**Vocabulary Focus:** {vocabulary_focus}
+**Model Response:** {model_response}
 """
 
+prompt_registry.register(5, 2, EX2_STAGE5_INSTRUCTIONS, EX2_STAGE5_INPUTS)
+
+def evaluate_response_ex2_stage5(user_response: str, topic: str, expected_keywords: list, vocabulary_focus: list, model_response: str, expected_structure: str) -> dict:
+    """
+    Evaluate Stage 5 Exercise 2 (Academic Presentation) responses.
+    Focuses on academic presentation skills, argument structure, evidence usage, and formal tone.
+    """
+    logger.debug("feedback.evaluation.start", evaluator="ex2_stage5", response_chars=len(user_response),
+                 keywords=len(expected_keywords), vocabulary=len(vocabulary_focus))
+
+    # Fallback values (only used for fields GPT never produced; the score must come from GPT)
+    fallback = {
+        "argument_structure_score": 0,
+        "evidence_usage_score": 0,
+        "academic_tone_score": 0,
+        "fluency_pacing_score": 0,
+        "vocabulary_range_score": 0,
+        "keyword_matches": [],
+        "matched_keywords_count": 0,
+        "vocabulary_matches": [],
+        "matched_vocabulary_count": 0,
+        "structure_followed": False,
+        "evidence_provided": False,
+        "academic_tone_maintained": False,
+        "detailed_feedback": {
+            "argument_structure_feedback": "",
+            "evidence_usage_feedback": "",
+            "academic_tone_feedback": "",
+            "fluency_feedback": "",
+            "vocabulary_feedback": ""
+        },
+        "suggested_improvements": [],
+        "encouragement": "",
+        "next_steps": ""
+    }
+
     try:
-        print("🔄 [EVAL] Sending evaluation request to OpenAI...")
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert English language evaluator for C1 Advanced level academic presentations. Provide detailed, constructive feedback in JSON format."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(5, 2).messages(
+            topic=topic, user_response=user_response, expected_keywords=expected_keywords,
+            expected_structure=expected_structure, vocabulary_focus=vocabulary_focus, model_response=model_response,
         )
-        
-        print("📊 [EVAL] Raw OpenAI response received")
-        raw_response = response.choices[0].message.content.strip()
-        print(f"📊 [EVAL] Raw response: {raw_response[:200]}...")
-        
-        # Clean the response to ensure valid JSON
-        cleaned_response = raw_response
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-        cleaned_response = cleaned_response.strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {cleaned_response[:200]}...")
-        
-        evaluation = json.loads(cleaned_response)
-        
-        # Validate and set default values
-        if not isinstance(evaluation.get("overall_score"), (int, float)):
-            evaluation["overall_score"] = 0
-        if not isinstance(evaluation.get("score"), (int, float)):
-            evaluation["score"] = evaluation.get("overall_score", 0)
-        
-        # Force correct completion logic based on score threshold (35 for Stage 5)
-        score = evaluation.get("score", 0)
-        evaluation["completed"] = score >= 35
-        evaluation["is_correct"] = score >= 35
-            
-        print(f"✅ [EVAL] Evaluation completed. Score: {evaluation.get('score', 0)}%")
-        
-        return {
-            "success": True,
-            "evaluation": evaluation,
-            "suggested_improvement": evaluation.get("suggested_improvements", [""])[0] if evaluation.get("suggested_improvements") else "",
-            "keyword_matches": evaluation.get("keyword_matches", []),
-            "total_keywords": evaluation.get("total_keywords", 0),
-            "matched_keywords_count": evaluation.get("matched_keywords_count", 0),
-            "vocabulary_matches": evaluation.get("vocabulary_matches", []),
-            "total_vocabulary": evaluation.get("total_vocabulary", 0),
-            "matched_vocabulary_count": evaluation.get("matched_vocabulary_count", 0),
-            "fluency_score": evaluation.get("fluency_pacing_score", 0),
-            "grammar_score": evaluation.get("academic_tone_score", 0),
-            "argument_structure_score": evaluation.get("argument_structure_score", 0),
-            "academic_tone_score": evaluation.get("academic_tone_score", 0),
-            "evidence_usage_score": evaluation.get("evidence_usage_score", 0),
-            "vocabulary_range_score": evaluation.get("vocabulary_range_score", 0),
-            "structure_followed": evaluation.get("structure_followed", False),
-            "evidence_provided": evaluation.get("evidence_provided", False),
-            "academic_tone_maintained": evaluation.get("academic_tone_maintained", False),
-            "score": evaluation.get("score", 0),
-            "is_correct": evaluation.get("is_correct", False),
-            "completed": evaluation.get("completed", False)
-        }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-        return {
-            "success": False,
-            "error": "evaluation_failed",
-            "message": "Failed to parse evaluation response. Please try again.",
-            "score": 0,
-            "is_correct": False,
-            "completed": False
-        }
-    except Exception as e:
-        print(f"❌ [EVAL] Evaluation error: {str(e)}")
-        return {
-            "success": False,
-            "error": "evaluation_failed",
-            "message": "Failed to evaluate response. Please try again.",
-            "score": 0,
-            "is_correct": False,
-            "completed": False
-        }
+        evaluation = _scored_evaluation("ex2_stage5", AcademicPresentationEvaluation, prompt_messages, fallback,
+                                        model="gpt-4o", max_tokens=2000)
+        if evaluation is None:
+            return {**STAGE5_FAILURE, "message": "Failed to parse evaluation response. Please try again."}
+
+        # The totals are known here; the model only counts matches
+        evaluation.update(total_keywords=len(expected_keywords), total_vocabulary=len(vocabulary_focus))
+        result = _stage5_result(
+            evaluation,
+            fluency_score=evaluation["fluency_pacing_score"],
+            grammar_score=evaluation["academic_tone_score"],
+            argument_structure_score=evaluation["argument_structure_score"],
+            academic_tone_score=evaluation["academic_tone_score"],
+            evidence_usage_score=evaluation["evidence_usage_score"],
+            vocabulary_range_score=evaluation["vocabulary_range_score"],
+            structure_followed=evaluation["structure_followed"],
+            evidence_provided=evaluation["evidence_provided"],
+            academic_tone_maintained=evaluation["academic_tone_maintained"],
+        )
+        logger.info("feedback.evaluation.done", evaluator="ex2_stage5", score=result["score"],
+                    is_correct=result["is_correct"])
+        return result
 
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex2_stage5")
+        return {**STAGE5_FAILURE, "message": "Failed to evaluate response. Please try again."}
 
 
-def evaluate_response_ex3_stage5(user_response: str, question: str, expected_keywords: list, vocabulary_focus: list, model_answer: str, expected_structure: str) -> dict:
-    """
-    Evaluate in-depth interview responses for Stage 5 Exercise 3.
-    Focuses on professional communication, STAR method usage, vocabulary sophistication, and interview skills.
-    """
-    print(f"🔄 [EVAL] Evaluating Stage 5 Exercise 3 (In-Depth Interview)")
-    print(f"📝 [EVAL] Question: {question}")
-    print(f"📝 [EVAL] User response: {user_response[:100]}...")
-    print(f"📝 [EVAL] Expected keywords: {expected_keywords}")
-    print(f"📝 [EVAL] Expected structure: {expected_structure}")
-    
-    prompt = f"""
-You are an expert English language evaluator for C1 Advanced level in-depth interview responses. Evaluate the user's response to a professional interview question based on the following criteria:
 
-**Interview Question:** {question}
-**User's Response:** {user_response}
-**Expected Keywords:** {expected_keywords}
-**Vocabulary Focus:** {vocabulary_focus}
-**Expected Structure:** {expected_structure}
-**Model Answer:** {model_answer}
+EX3_STAGE5_INSTRUCTIONS = """
+You are an expert English language evaluator for C1 Advanced level in-depth interview responses. Evaluate the user's response to a professional interview question based on the following criteria and provide detailed, constructive feedback in JSON format.
+
+📥 The interview question, user's response, expected keywords, vocabulary focus, expected structure and a model answer are given in the user message.
 
 **Evaluation Criteria (100 points total):**
 1. **STAR Method Usage (25 points):** Situation, Task, Action, Result structure with clear examples
@@ -3203,178 +2789,132 @@ You are an expert English language evaluator for C1 Advanced level in-depth inte
 5. **Overall Impact:** Assess the effectiveness of the response
 
 **Response Format (JSON only):**
-{{
+{
     "overall_score": <0-100>,
     "star_method_score": <0-25>,
     "professional_communication_score": <0-25>,
     "vocabulary_sophistication_score": <0-20>,
     "fluency_articulation_score": <0-15>,
     "content_relevance_score": <0-15>,
-    "keyword_matches": {expected_keywords},
+    "keyword_matches": [<expected keywords that were used>],
     "matched_keywords_count": <number of keywords used>,
-    "total_keywords": {len(expected_keywords)},
-    "vocabulary_matches": {vocabulary_focus},
+    "vocabulary_matches": [<vocabulary focus words that were used>],
     "matched_vocabulary_count": <number of vocabulary words used>,
-    "total_vocabulary": {len(vocabulary_focus)},
     "star_structure_followed": <true/false>,
     "professional_tone_maintained": <true/false>,
     "relevant_examples_provided": <true/false>,
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "star_method_feedback": "<detailed feedback on STAR structure>",
         "professional_communication_feedback": "<detailed feedback on communication style>",
         "vocabulary_feedback": "<detailed feedback on word choice>",
         "fluency_feedback": "<detailed feedback on delivery>",
         "content_feedback": "<detailed feedback on relevance>"
-    }},
+    },
     "suggested_improvements": [
         "<specific improvement suggestion 1>",
         "<specific improvement suggestion 2>",
         "<specific improvement suggestion 3>"
     ],
     "encouragement": "<motivational message>",
-    "next_steps": "<specific guidance for improvement>",
-    "score": <0-100>
-}}
+    "next_steps": "<specific guidance for improvement>"
+}
 
-Note: Do NOT include "completed" or "is_correct" fields in your response. These will be calculated automatically based on the score threshold.
+Ensure all scores are numerical values.
+"""
 
-Ensure the response is valid JSON and all scores are numerical values.
+EX3_STAGE5_INPUTS = """
+📥 Inputs:
+**Interview Question:** {question}
+**User's Response:** {user_response}
+**Expected Keywords:** {expected_keywords}
+**Vocabulary Focus:** {vocabulary_focus}
+**Expected Structure:** {expected_structure}
+**Model Answer:** {model_answer}
 """
 
-    try:
-        print("🔄 [EVAL] Sending evaluation request to OpenAI...")
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert English language evaluator for C1 Advanced level in-depth interview responses. Provide detailed, constructive feedback in JSON format."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=2000
-        )
-        
-        print("📊 [EVAL] Raw OpenAI response received")
-        raw_response = response.choices[0].message.content.strip()
-        print(f"📊 [EVAL] Raw response: {raw_response[:200]}...")
-        
-        # Clean the response to ensure valid JSON
-        cleaned_response = raw_response
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-        cleaned_response = cleaned_response.strip()
-        
-        print(f"📊 [EVAL] Cleaned response: {cleaned_response[:200]}...")
-        
-        evaluation = json.loads(cleaned_response)
-        
-        # Validate and set default values
-        if not isinstance(evaluation.get("overall_score"), (int, float)):
-            evaluation["overall_score"] = 0
-        if not isinstance(evaluation.get("score"), (int, float)):
-            evaluation["score"] = evaluation.get("overall_score", 0)
-        
-        # Force correct completion logic based on score threshold (35 for Stage 5)
-        score = evaluation.get("score", 0)
-        evaluation["completed"] = score >= 35
-        evaluation["is_correct"] = score >= 35
-            
-        print(f"✅ [EVAL] Evaluation completed. Score: {evaluation.get('score', 0)}%")
-        
-        return {
-            "success": True,
-            "evaluation": evaluation,
-            "suggested_improvement": evaluation.get("suggested_improvements", [""])[0] if evaluation.get("suggested_improvements") else "",
-            "keyword_matches": evaluation.get("keyword_matches", []),
-            "total_keywords": evaluation.get("total_keywords", 0),
-            "matched_keywords_count": evaluation.get("matched_keywords_count", 0),
-            "vocabulary_matches": evaluation.get("vocabulary_matches", []),
-            "total_vocabulary": evaluation.get("total_vocabulary", 0),
-            "matched_vocabulary_count": evaluation.get("matched_vocabulary_count", 0),
-            "fluency_score": evaluation.get("fluency_articulation_score", 0),
-            "grammar_score": evaluation.get("professional_communication_score", 0),
-            "star_method_score": evaluation.get("star_method_score", 0),
-            "professional_communication_score": evaluation.get("professional_communication_score", 0),
-            "vocabulary_sophistication_score": evaluation.get("vocabulary_sophistication_score", 0),
-            "content_relevance_score": evaluation.get("content_relevance_score", 0),
-            "star_structure_followed": evaluation.get("star_structure_followed", False),
-            "professional_tone_maintained": evaluation.get("professional_tone_maintained", False),
-            "relevant_examples_provided": evaluation.get("relevant_examples_provided", False),
-            "score": evaluation.get("score", 0),
-            "is_correct": evaluation.get("is_correct", False),
-            "completed": evaluation.get("completed", False)
-        }
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-        return {
-            "success": False,
-            "error": "evaluation_failed",
-            "message": "Failed to parse evaluation response. Please try again.",
-            "score": 0,
-            "is_correct": False,
-            "completed": False
-        }
-    except Exception as e:
-        print(f"❌ [EVAL] Evaluation error: {str(e)}")
-        return {
-            "success": False,
-            "error": "evaluation_failed",
-            "message": "Failed to evaluate response. Please try again.",
-            "score": 0,
-            "is_correct": False,
-            "completed": False
-        }
+prompt_registry.register(5, 3, EX3_STAGE5_INSTRUCTIONS, EX3_STAGE5_INPUTS)
 
-def evaluate_response_ex1_stage6(expected_keywords, user_text, topic_text, model_response, evaluation_criteria):
+def evaluate_response_ex3_stage5(user_response: str, question: str, expected_keywords: list, vocabulary_focus: list, model_answer: str, expected_structure: str) -> dict:
     """
-    Evaluate Stage 6 Exercise 1 (AI-Guided Spontaneous Speech) responses using ChatGPT.
-    
-    Args:
-        expected_keywords: List of expected keywords from the topic
-        user_text: Transcribed user response
-        topic_text: The spontaneous speech topic
-        model_response: Expected model response for comparison
-        evaluation_criteria: Dictionary with evaluation weights
-    
-    Returns:
-        Dictionary with evaluation results
+    Evaluate in-depth interview responses for Stage 5 Exercise 3.
+    Focuses on professional communication, STAR method usage, vocabulary sophistication, and interview skills.
     """
-    try:
-        print(f"🔄 [EVAL] Starting Stage 6 Exercise 1 evaluation")
-        print(f"📝 [EVAL] Topic: {topic_text}")
-        print(f"🎤 [EVAL] User response: {user_text}")
-        print(f"🔑 [EVAL] Expected keywords: {expected_keywords}")
-        
-        # Extract evaluation criteria weights
-        spontaneous_fluency_weight = evaluation_criteria.get("spontaneous_fluency", 30)
-        depth_of_thought_weight = evaluation_criteria.get("depth_of_thought", 25)
-        advanced_vocabulary_weight = evaluation_criteria.get("advanced_vocabulary", 25)
-        structural_coherence_weight = evaluation_criteria.get("structural_coherence", 20)
-        
-        # Create sophisticated evaluation prompt
-        evaluation_prompt = f"""
-You are an expert English language evaluator for C2-level spontaneous speech exercises. Evaluate the following response based on the given criteria.
+    logger.debug("feedback.evaluation.start", evaluator="ex3_stage5", response_chars=len(user_response),
+                 keywords=len(expected_keywords), vocabulary=len(vocabulary_focus))
+
+    # Fallback values (only used for fields GPT never produced; the score must come from GPT)
+    fallback = {
+        "star_method_score": 0,
+        "professional_communication_score": 0,
+        "vocabulary_sophistication_score": 0,
+        "fluency_articulation_score": 0,
+        "content_relevance_score": 0,
+        "keyword_matches": [],
+        "matched_keywords_count": 0,
+        "vocabulary_matches": [],
+        "matched_vocabulary_count": 0,
+        "star_structure_followed": False,
+        "professional_tone_maintained": False,
+        "relevant_examples_provided": False,
+        "detailed_feedback": {
+            "star_method_feedback": "",
+            "professional_communication_feedback": "",
+            "vocabulary_feedback": "",
+            "fluency_feedback": "",
+            "content_feedback": ""
+        },
+        "suggested_improvements": [],
+        "encouragement": "",
+        "next_steps": ""
+    }
 
-TOPIC: {topic_text}
+    try:
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(5, 3).messages(
+            question=question, user_response=user_response, expected_keywords=expected_keywords,
+            vocabulary_focus=vocabulary_focus, expected_structure=expected_structure, model_answer=model_answer,
+        )
+        evaluation = _scored_evaluation("ex3_stage5", InDepthInterviewEvaluation, prompt_messages, fallback,
+                                        model="gpt-4o", max_tokens=2000)
+        if evaluation is None:
+            return {**STAGE5_FAILURE, "message": "Failed to parse evaluation response. Please try again."}
+
+        # The totals are known here; the model only counts matches
+        evaluation.update(total_keywords=len(expected_keywords), total_vocabulary=len(vocabulary_focus))
+        result = _stage5_result(
+            evaluation,
+            fluency_score=evaluation["fluency_articulation_score"],
+            grammar_score=evaluation["professional_communication_score"],
+            star_method_score=evaluation["star_method_score"],
+            professional_communication_score=evaluation["professional_communication_score"],
+            vocabulary_sophistication_score=evaluation["vocabulary_sophistication_score"],
+            content_relevance_score=evaluation["content_relevance_score"],
+            star_structure_followed=evaluation["star_structure_followed"],
+            professional_tone_maintained=evaluation["professional_tone_maintained"],
+            relevant_examples_provided=evaluation["relevant_examples_provided"],
+        )
+        logger.info("feedback.evaluation.done", evaluator="ex3_stage5", score=result["score"],
+                    is_correct=result["is_correct"])
+        return result
 
-USER RESPONSE: {user_text}
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex3_stage5")
+        return {**STAGE5_FAILURE, "message": "Failed to evaluate response. Please try again."}
 
-EXPECTED KEYWORDS: {', '.join(expected_keywords)}
+EX1_STAGE6_INSTRUCTIONS = """
+You are an expert English language evaluator for C2-level spontaneous speech exercises. Evaluate the response given in the user message based on the given criteria and provide detailed, professional evaluations in the exact JSON format requested.
 
-MODEL RESPONSE (for reference): {model_response}
+📥 The topic, user response, expected keywords, model response and the weight of each criterion are given in the user message.
 
 EVALUATION CRITERIA:
-1. Spontaneous Fluency (Weight: {spontaneous_fluency_weight}%): Natural flow, minimal hesitation, confident delivery
-2. Depth of Thought (Weight: {depth_of_thought_weight}%): Sophisticated analysis, nuanced perspectives, intellectual depth
-3. Advanced Vocabulary (Weight: {advanced_vocabulary_weight}%): C2-level terminology, precise word choice, academic language
-4. Structural Coherence (Weight: {structural_coherence_weight}%): Logical organization, clear progression, well-structured arguments
+1. Spontaneous Fluency: Natural flow, minimal hesitation, confident delivery
+2. Depth of Thought: Sophisticated analysis, nuanced perspectives, intellectual depth
+3. Advanced Vocabulary: C2-level terminology, precise word choice, academic language
+4. Structural Coherence: Logical organization, clear progression, well-structured arguments
 
 Please provide a comprehensive evaluation in the following JSON format:
 
-{{
-    "overall_score": <0-100>,
+{
     "spontaneous_fluency_score": <0-100>,
     "depth_of_thought_score": <0-100>,
     "advanced_vocabulary_score": <0-100>,
@@ -3387,49 +2927,82 @@ Please provide a comprehensive evaluation in the following JSON format:
     "coherence_analysis": "<detailed analysis of structural coherence>",
     "strengths": ["<list of key strengths>"],
     "areas_for_improvement": ["<list of specific improvement areas>"],
-    "suggested_improvement": "<comprehensive improvement suggestion>",
-    "is_correct": <true/false based on overall quality>,
-    "completed": <true if score >= 80, false otherwise>
-}}
+    "suggested_improvement": "<comprehensive improvement suggestion>"
+}
 
 Focus on C2-level expectations: sophisticated language, complex ideas, nuanced arguments, and native-like fluency.
 """
 
-        print(f"🔄 [EVAL] Sending evaluation request to ChatGPT")
-        
-        # Get ChatGPT response
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert English language evaluator for C2-level spontaneous speech exercises. Provide detailed, professional evaluations in the exact JSON format requested."},
-                {"role": "user", "content": evaluation_prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500
+EX1_STAGE6_INPUTS = """
+📥 Inputs:
+TOPIC: {topic_text}
+
+USER RESPONSE: {user_text}
+
+EXPECTED KEYWORDS: {expected_keywords}
+
+MODEL RESPONSE (for reference): {model_response}
+
+CRITERIA WEIGHTS: Spontaneous Fluency {spontaneous_fluency_weight}%, Depth of Thought {depth_of_thought_weight}%, Advanced Vocabulary {advanced_vocabulary_weight}%, Structural Coherence {structural_coherence_weight}%
+"""
+
+prompt_registry.register(6, 1, EX1_STAGE6_INSTRUCTIONS, EX1_STAGE6_INPUTS)
+
+SPONTANEOUS_SPEECH_SCORES = ("spontaneous_fluency_score", "depth_of_thought_score",
+                             "advanced_vocabulary_score", "structural_coherence_score")
+
+def evaluate_response_ex1_stage6(expected_keywords, user_text, topic_text, model_response, evaluation_criteria):
+    """
+    Evaluate Stage 6 Exercise 1 (AI-Guided Spontaneous Speech) responses using ChatGPT.
+
+    Args:
+        expected_keywords: List of expected keywords from the topic
+        user_text: Transcribed user response
+        topic_text: The spontaneous speech topic
+        model_response: Expected model response for comparison
+        evaluation_criteria: Dictionary with evaluation weights
+
+    Returns:
+        Dictionary with evaluation results
+    """
+    try:
+        logger.debug("feedback.evaluation.start", evaluator="ex1_stage6", response_chars=len(user_text),
+                     keywords=len(expected_keywords))
+
+        # Extract evaluation criteria weights
+        spontaneous_fluency_weight = evaluation_criteria.get("spontaneous_fluency", 30)
+        depth_of_thought_weight = evaluation_criteria.get("depth_of_thought", 25)
+        advanced_vocabulary_weight = evaluation_criteria.get("advanced_vocabulary", 25)
+        structural_coherence_weight = evaluation_criteria.get("structural_coherence", 20)
+
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(6, 1).messages(
+            topic_text=topic_text, user_text=user_text, expected_keywords=", ".join(expected_keywords),
+            model_response=model_response, spontaneous_fluency_weight=spontaneous_fluency_weight,
+            depth_of_thought_weight=depth_of_thought_weight, advanced_vocabulary_weight=advanced_vocabulary_weight,
+            structural_coherence_weight=structural_coherence_weight,
         )
-        
-        # Extract and parse the response
-        evaluation_text = response.choices[0].message.content.strip()
-        print(f"📊 [EVAL] ChatGPT response received: {evaluation_text[:200]}...")
-        
-        # Parse JSON response
-        try:
-            evaluation_data = json.loads(evaluation_text)
-            print(f"✅ [EVAL] JSON parsed successfully")
-        except json.JSONDecodeError as e:
-            print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-            # Fallback evaluation
+        fallback = {
+            "keyword_matches": 0,
+            "total_keywords": len(expected_keywords),
+            "fluency_analysis": "",
+            "thought_analysis": "",
+            "vocabulary_analysis": "",
+            "coherence_analysis": "",
+            "strengths": [],
+            "areas_for_improvement": [],
+            "suggested_improvement": ""
+        }
+        evaluation_data = _scored_evaluation("ex1_stage6", SpontaneousSpeechEvaluation, prompt_messages, fallback,
+                                             score_fields=SPONTANEOUS_SPEECH_SCORES, model="gpt-4o", max_tokens=1500)
+        if evaluation_data is None:
             return create_fallback_evaluation(user_text, expected_keywords, topic_text)
-        
-        # Validate and process the evaluation data
-        overall_score = evaluation_data.get("overall_score", 0)
-        spontaneous_fluency_score = evaluation_data.get("spontaneous_fluency_score", 0)
-        depth_of_thought_score = evaluation_data.get("depth_of_thought_score", 0)
-        advanced_vocabulary_score = evaluation_data.get("advanced_vocabulary_score", 0)
-        structural_coherence_score = evaluation_data.get("structural_coherence_score", 0)
-        keyword_matches = evaluation_data.get("keyword_matches", 0)
-        total_keywords = evaluation_data.get("total_keywords", len(expected_keywords))
-        
+
+        spontaneous_fluency_score = evaluation_data["spontaneous_fluency_score"]
+        depth_of_thought_score = evaluation_data["depth_of_thought_score"]
+        advanced_vocabulary_score = evaluation_data["advanced_vocabulary_score"]
+        structural_coherence_score = evaluation_data["structural_coherence_score"]
+
         # Calculate weighted score
         weighted_score = (
             (spontaneous_fluency_score * spontaneous_fluency_weight / 100) +
@@ -3437,59 +3010,54 @@ Focus on C2-level expectations: sophisticated language, complex ideas, nuanced a
             (advanced_vocabulary_score * advanced_vocabulary_weight / 100) +
             (structural_coherence_score * structural_coherence_weight / 100)
         )
-        
+
         # Determine completion status
         is_correct = weighted_score >= 35
         completed = weighted_score >= 35
-        
-        print(f"📊 [EVAL] Evaluation results:")
-        print(f"   Overall Score: {weighted_score:.1f}")
-        print(f"   Spontaneous Fluency: {spontaneous_fluency_score}")
-        print(f"   Depth of Thought: {depth_of_thought_score}")
-        print(f"   Advanced Vocabulary: {advanced_vocabulary_score}")
-        print(f"   Structural Coherence: {structural_coherence_score}")
-        print(f"   Keyword Matches: {keyword_matches}/{total_keywords}")
-        print(f"   Completed: {completed}")
-        
+
+        logger.info("feedback.evaluation.done", evaluator="ex1_stage6", score=round(weighted_score, 1),
+                    keyword_matches=evaluation_data["keyword_matches"], total_keywords=evaluation_data["total_keywords"],
+                    completed=completed)
+
         return {
             "score": round(weighted_score, 1),
             "spontaneous_fluency_score": spontaneous_fluency_score,
             "depth_of_thought_score": depth_of_thought_score,
             "advanced_vocabulary_score": advanced_vocabulary_score,
             "structural_coherence_score": structural_coherence_score,
-            "keyword_matches": keyword_matches,
-            "total_keywords": total_keywords,
+            "keyword_matches": evaluation_data["keyword_matches"],
+            "total_keywords": evaluation_data["total_keywords"],
             "fluency_score": spontaneous_fluency_score,  # For compatibility
             "grammar_score": structural_coherence_score,  # For compatibility
             "is_correct": is_correct,
             "completed": completed,
-            "suggested_improvement": evaluation_data.get("suggested_improvement", ""),
-            "strengths": evaluation_data.get("strengths", []),
-            "areas_for_improvement": evaluation_data.get("areas_for_improvement", []),
-            "fluency_analysis": evaluation_data.get("fluency_analysis", ""),
-            "thought_analysis": evaluation_data.get("thought_analysis", ""),
-            "vocabulary_analysis": evaluation_data.get("vocabulary_analysis", ""),
-            "coherence_analysis": evaluation_data.get("coherence_analysis", "")
+            "suggested_improvement": evaluation_data["suggested_improvement"],
+            "strengths": evaluation_data["strengths"],
+            "areas_for_improvement": evaluation_data["areas_for_improvement"],
+            "fluency_analysis": evaluation_data["fluency_analysis"],
+            "thought_analysis": evaluation_data["thought_analysis"],
+            "vocabulary_analysis": evaluation_data["vocabulary_analysis"],
+            "coherence_analysis": evaluation_data["coherence_analysis"]
         }
-        
-    except Exception as e:
-        print(f"❌ [EVAL] Error in Stage 6 Exercise 1 evaluation: {str(e)}")
+
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex1_stage6")
         return create_fallback_evaluation(user_text, expected_keywords, topic_text)
 
 def create_fallback_evaluation(user_text, expected_keywords, topic_text):
     """Create a fallback evaluation when ChatGPT fails"""
-    print(f"🔄 [EVAL] Creating fallback evaluation")
-    
+    logger.warning("feedback.evaluation.keyword_fallback", evaluator="ex1_stage6")
+
     # Simple keyword matching
     user_words = set(user_text.lower().split())
     keyword_matches = sum(1 for keyword in expected_keywords if keyword.lower() in user_words)
     total_keywords = len(expected_keywords)
-    
+
     # Basic scoring
     keyword_score = (keyword_matches / total_keywords) * 100 if total_keywords > 0 else 0
     length_score = min(len(user_text.split()) / 50 * 100, 100)  # Target: 50+ words
     overall_score = (keyword_score * 0.4) + (length_score * 0.6)
-    
+
     return {
         "score": round(overall_score, 1),
         "spontaneous_fluency_score": 60,
@@ -3513,54 +3081,20 @@ def create_fallback_evaluation(user_text, expected_keywords, topic_text):
 
 
 
-def evaluate_response_ex2_stage6(expected_keywords, user_text, scenario_text, model_response, evaluation_criteria):
-    """
-    Evaluate Stage 6 Exercise 2 (Roleplay - Handle a Sensitive Scenario) responses using ChatGPT.
-    
-    Args:
-        expected_keywords: List of expected keywords from the scenario
-        user_text: Transcribed user response
-        scenario_text: The sensitive scenario description
-        model_response: Expected model response for comparison
-        evaluation_criteria: Dictionary with evaluation weights
-    
-    Returns:
-        Dictionary with evaluation results
-    """
-    try:
-        print(f"🔄 [EVAL] Starting Stage 6 Exercise 2 evaluation")
-        print(f"📝 [EVAL] Scenario: {scenario_text}")
-        print(f"🎤 [EVAL] User response: {user_text}")
-        print(f"🔑 [EVAL] Expected keywords: {expected_keywords}")
-        
-        # Extract evaluation criteria weights
-        tone_control_weight = evaluation_criteria.get("tone_control", 30)
-        empathy_authority_balance_weight = evaluation_criteria.get("empathy_authority_balance", 25)
-        clarity_communication_weight = evaluation_criteria.get("clarity_communication", 25)
-        conflict_resolution_weight = evaluation_criteria.get("conflict_resolution", 20)
-        
-        # Create sophisticated evaluation prompt
-        evaluation_prompt = f"""
-You are an expert English language evaluator for C2-level sensitive scenario roleplay exercises. Evaluate the following response based on the given criteria.
-
-SCENARIO: {scenario_text}
-
-USER RESPONSE: {user_text}
-
-EXPECTED KEYWORDS: {', '.join(expected_keywords)}
+EX2_STAGE6_INSTRUCTIONS = """
+You are an expert English language evaluator for C2-level sensitive scenario roleplay exercises. Evaluate the response given in the user message based on the given criteria and provide detailed, professional evaluations in the exact JSON format requested.
 
-MODEL RESPONSE (for reference): {model_response}
+📥 The scenario, user response, expected keywords, model response and the weight of each criterion are given in the user message.
 
 EVALUATION CRITERIA:
-1. Tone Control (Weight: {tone_control_weight}%): Appropriate emotional tone, diplomatic language, professional demeanor
-2. Empathy vs Authority Balance (Weight: {empathy_authority_balance_weight}%): Balancing understanding with assertiveness, showing care while maintaining position
-3. Clarity & Communication (Weight: {clarity_communication_weight}%): Clear, precise language, effective message delivery, professional articulation
-4. Conflict Resolution (Weight: {conflict_resolution_weight}%): Problem-solving approach, constructive dialogue, resolution-oriented communication
+1. Tone Control: Appropriate emotional tone, diplomatic language, professional demeanor
+2. Empathy vs Authority Balance: Balancing understanding with assertiveness, showing care while maintaining position
+3. Clarity & Communication: Clear, precise language, effective message delivery, professional articulation
+4. Conflict Resolution: Problem-solving approach, constructive dialogue, resolution-oriented communication
 
 Please provide a comprehensive evaluation in the following JSON format:
 
-{{
-    "overall_score": <0-100>,
+{
     "tone_control_score": <0-100>,
     "empathy_authority_balance_score": <0-100>,
     "clarity_communication_score": <0-100>,
@@ -3573,49 +3107,83 @@ Please provide a comprehensive evaluation in the following JSON format:
     "conflict_resolution_analysis": "<detailed analysis of conflict resolution approach>",
     "strengths": ["<list of key strengths>"],
     "areas_for_improvement": ["<list of specific improvement areas>"],
-    "suggested_improvement": "<comprehensive improvement suggestion>",
-    "is_correct": <true/false based on overall quality>,
-    "completed": <true if score >= 80, false otherwise>
-}}
+    "suggested_improvement": "<comprehensive improvement suggestion>"
+}
 
 Focus on C2-level expectations: sophisticated diplomatic language, emotional intelligence, professional communication, and effective conflict resolution strategies.
 """
 
-        print(f"🔄 [EVAL] Sending evaluation request to ChatGPT")
-        
-        # Get ChatGPT response
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert English language evaluator for C2-level sensitive scenario roleplay exercises. Provide detailed, professional evaluations in the exact JSON format requested."},
-                {"role": "user", "content": evaluation_prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500
+EX2_STAGE6_INPUTS = """
+📥 Inputs:
+SCENARIO: {scenario_text}
+
+USER RESPONSE: {user_text}
+
+EXPECTED KEYWORDS: {expected_keywords}
+
+MODEL RESPONSE (for reference): {model_response}
+
+CRITERIA WEIGHTS: Tone Control {tone_control_weight}%, Empathy vs Authority Balance {empathy_authority_balance_weight}%, Clarity & Communication {clarity_communication_weight}%, Conflict Resolution {conflict_resolution_weight}%
+"""
+
+prompt_registry.register(6, 2, EX2_STAGE6_INSTRUCTIONS, EX2_STAGE6_INPUTS)
+
+SENSITIVE_SCENARIO_SCORES = ("tone_control_score", "empathy_authority_balance_score",
+                             "clarity_communication_score", "conflict_resolution_score")
+
+def evaluate_response_ex2_stage6(expected_keywords, user_text, scenario_text, model_response, evaluation_criteria):
+    """
+    Evaluate Stage 6 Exercise 2 (Roleplay - Handle a Sensitive Scenario) responses using ChatGPT.
+
+    Args:
+        expected_keywords: List of expected keywords from the scenario
+        user_text: Transcribed user response
+        scenario_text: The sensitive scenario description
+        model_response: Expected model response for comparison
+        evaluation_criteria: Dictionary with evaluation weights
+
+    Returns:
+        Dictionary with evaluation results
+    """
+    try:
+        logger.debug("feedback.evaluation.start", evaluator="ex2_stage6", response_chars=len(user_text),
+                     keywords=len(expected_keywords))
+
+        # Extract evaluation criteria weights
+        tone_control_weight = evaluation_criteria.get("tone_control", 30)
+        empathy_authority_balance_weight = evaluation_criteria.get("empathy_authority_balance", 25)
+        clarity_communication_weight = evaluation_criteria.get("clarity_communication", 25)
+        conflict_resolution_weight = evaluation_criteria.get("conflict_resolution", 20)
+
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(6, 2).messages(
+            scenario_text=scenario_text, user_text=user_text, expected_keywords=", ".join(expected_keywords),
+            model_response=model_response, tone_control_weight=tone_control_weight,
+            empathy_authority_balance_weight=empathy_authority_balance_weight,
+            clarity_communication_weight=clarity_communication_weight,
+            conflict_resolution_weight=conflict_resolution_weight,
         )
-        
-        # Extract and parse the response
-        evaluation_text = response.choices[0].message.content.strip()
-        print(f"📊 [EVAL] ChatGPT response received: {evaluation_text[:200]}...")
-        
-        # Parse JSON response
-        try:
-            evaluation_data = json.loads(evaluation_text)
-            print(f"✅ [EVAL] JSON parsed successfully")
-        except json.JSONDecodeError as e:
-            print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-            # Fallback evaluation
+        fallback = {
+            "keyword_matches": 0,
+            "total_keywords": len(expected_keywords),
+            "tone_analysis": "",
+            "empathy_authority_analysis": "",
+            "clarity_analysis": "",
+            "conflict_resolution_analysis": "",
+            "strengths": [],
+            "areas_for_improvement": [],
+            "suggested_improvement": ""
+        }
+        evaluation_data = _scored_evaluation("ex2_stage6", SensitiveScenarioEvaluation, prompt_messages, fallback,
+                                             score_fields=SENSITIVE_SCENARIO_SCORES, model="gpt-4o", max_tokens=1500)
+        if evaluation_data is None:
             return create_fallback_evaluation_sensitive_scenario(user_text, expected_keywords, scenario_text)
-        
-        # Validate and process the evaluation data
-        overall_score = evaluation_data.get("overall_score", 0)
-        tone_control_score = evaluation_data.get("tone_control_score", 0)
-        empathy_authority_balance_score = evaluation_data.get("empathy_authority_balance_score", 0)
-        clarity_communication_score = evaluation_data.get("clarity_communication_score", 0)
-        conflict_resolution_score = evaluation_data.get("conflict_resolution_score", 0)
-        keyword_matches = evaluation_data.get("keyword_matches", 0)
-        total_keywords = evaluation_data.get("total_keywords", len(expected_keywords))
-        
+
+        tone_control_score = evaluation_data["tone_control_score"]
+        empathy_authority_balance_score = evaluation_data["empathy_authority_balance_score"]
+        clarity_communication_score = evaluation_data["clarity_communication_score"]
+        conflict_resolution_score = evaluation_data["conflict_resolution_score"]
+
         # Calculate weighted score
         weighted_score = (
             (tone_control_score * tone_control_weight / 100) +
@@ -3623,59 +3191,54 @@ Focus on C2-level expectations: sophisticated diplomatic language, emotional int
             (clarity_communication_score * clarity_communication_weight / 100) +
             (conflict_resolution_score * conflict_resolution_weight / 100)
         )
-        
+
         # Determine completion status
         is_correct = weighted_score >= 35
         completed = weighted_score >= 35
-        
-        print(f"📊 [EVAL] Evaluation results:")
-        print(f"   Overall Score: {weighted_score:.1f}")
-        print(f"   Tone Control: {tone_control_score}")
-        print(f"   Empathy vs Authority Balance: {empathy_authority_balance_score}")
-        print(f"   Clarity & Communication: {clarity_communication_score}")
-        print(f"   Conflict Resolution: {conflict_resolution_score}")
-        print(f"   Keyword Matches: {keyword_matches}/{total_keywords}")
-        print(f"   Completed: {completed}")
-        
+
+        logger.info("feedback.evaluation.done", evaluator="ex2_stage6", score=round(weighted_score, 1),
+                    keyword_matches=evaluation_data["keyword_matches"], total_keywords=evaluation_data["total_keywords"],
+                    completed=completed)
+
         return {
             "score": round(weighted_score, 1),
             "tone_control_score": tone_control_score,
             "empathy_authority_balance_score": empathy_authority_balance_score,
             "clarity_communication_score": clarity_communication_score,
             "conflict_resolution_score": conflict_resolution_score,
-            "keyword_matches": keyword_matches,
-            "total_keywords": total_keywords,
+            "keyword_matches": evaluation_data["keyword_matches"],
+            "total_keywords": evaluation_data["total_keywords"],
             "fluency_score": tone_control_score,  # For compatibility
             "grammar_score": clarity_communication_score,  # For compatibility
             "is_correct": is_correct,
             "completed": completed,
-            "suggested_improvement": evaluation_data.get("suggested_improvement", ""),
-            "strengths": evaluation_data.get("strengths", []),
-            "areas_for_improvement": evaluation_data.get("areas_for_improvement", []),
-            "tone_analysis": evaluation_data.get("tone_analysis", ""),
-            "empathy_authority_analysis": evaluation_data.get("empathy_authority_analysis", ""),
-            "clarity_analysis": evaluation_data.get("clarity_analysis", ""),
-            "conflict_resolution_analysis": evaluation_data.get("conflict_resolution_analysis", "")
+            "suggested_improvement": evaluation_data["suggested_improvement"],
+            "strengths": evaluation_data["strengths"],
+            "areas_for_improvement": evaluation_data["areas_for_improvement"],
+            "tone_analysis": evaluation_data["tone_analysis"],
+            "empathy_authority_analysis": evaluation_data["empathy_authority_analysis"],
+            "clarity_analysis": evaluation_data["clarity_analysis"],
+            "conflict_resolution_analysis": evaluation_data["conflict_resolution_analysis"]
         }
-        
-    except Exception as e:
-        print(f"❌ [EVAL] Error in Stage 6 Exercise 2 evaluation: {str(e)}")
+
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex2_stage6")
         return create_fallback_evaluation_sensitive_scenario(user_text, expected_keywords, scenario_text)
 
 def create_fallback_evaluation_sensitive_scenario(user_text, expected_keywords, scenario_text):
     """Create a fallback evaluation when ChatGPT fails for sensitive scenarios"""
-    print(f"🔄 [EVAL] Creating fallback evaluation for sensitive scenario")
-    
+    logger.warning("feedback.evaluation.keyword_fallback", evaluator="ex2_stage6")
+
     # Simple keyword matching
     user_words = set(user_text.lower().split())
     keyword_matches = sum(1 for keyword in expected_keywords if keyword.lower() in user_words)
     total_keywords = len(expected_keywords)
-    
+
     # Basic scoring
     keyword_score = (keyword_matches / total_keywords) * 100 if total_keywords > 0 else 0
     length_score = min(len(user_text.split()) / 40 * 100, 100)  # Target: 40+ words for sensitive scenarios
     overall_score = (keyword_score * 0.4) + (length_score * 0.6)
-    
+
     return {
         "score": round(overall_score, 1),
         "tone_control_score": 60,
@@ -3697,48 +3260,10 @@ def create_fallback_evaluation_sensitive_scenario(user_text, expected_keywords,
         "conflict_resolution_analysis": "Basic conflict resolution attempt"
     }
 
-def evaluate_response_ex3_stage6(user_response: str, topic: str, expected_keywords: list, vocabulary_focus: list, academic_expressions: list, model_response: str, expected_structure: str) -> dict:
-    """
-    Evaluate Stage 6 Exercise 3 (Critical Opinion Builder) responses using OpenAI GPT-4o.
-    
-    This function evaluates C2 Advanced level critical opinion building based on:
-    - Argument structure and logical flow
-    - Academic expression usage
-    - Critical thinking depth
-    - Vocabulary sophistication
-    - Balanced viewpoint presentation
-    
-    Args:
-        user_response (str): The user's written opinion response
-        topic (str): The controversial topic they were asked to discuss
-        expected_keywords (list): Expected keywords to include
-        vocabulary_focus (list): Domain-specific vocabulary to evaluate
-        academic_expressions (list): Expected academic expressions to use
-        model_response (str): Example of a well-structured response for comparison
-        expected_structure (str): Expected argument structure
-    
-    Returns:
-        dict: Comprehensive evaluation results with scores and detailed feedback
-    """
-    print(f"🔍 [EVAL] Evaluating Stage 6 Exercise 3 response: {user_response[:100]}...")
-    print(f"📝 [EVAL] Topic: {topic}")
-    print(f"📝 [EVAL] Expected keywords: {expected_keywords}")
-    print(f"📝 [EVAL] Vocabulary focus: {vocabulary_focus}")
-    print(f"📝 [EVAL] Academic expressions: {academic_expressions}")
-    print(f"📝 [EVAL] Expected structure: {expected_structure}")
-    
-    try:
-        # Create comprehensive evaluation prompt
-        evaluation_prompt = f"""
+EX3_STAGE6_INSTRUCTIONS = """
 You are an expert English language evaluator for C2 Advanced level critical opinion building. You are a well experienced prompt engineer.
 
-**TOPIC:** {topic}
-**USER'S RESPONSE:** "{user_response}"
-**MODEL ANSWER FOR REFERENCE:** "{model_response}"
-**EXPECTED STRUCTURE:** {expected_structure}
-**EXPECTED KEYWORDS:** {expected_keywords}
-**VOCABULARY FOCUS:** {vocabulary_focus}
-**ACADEMIC EXPRESSIONS TO USE:** {academic_expressions}
+📥 The topic, user's response, model answer, expected structure, expected keywords, vocabulary focus and academic expressions are given in the user message.
 
 **EVALUATION CRITERIA:**
 1. **Argument Structure (30 points):** How well does the response follow the expected structure (Thesis → Supporting Arguments → Counterpoint → Conclusion)?
@@ -3767,7 +3292,7 @@ You are an expert English language evaluator for C2 Advanced level critical opin
 **TASK:** Provide a comprehensive evaluation with specific feedback and suggestions for improvement.
 
 **REQUIRED JSON OUTPUT FORMAT:**
-{{
+{
     "score": <number between 0-100>,
     "is_correct": <boolean - true if score >= 35>,
     "completed": <boolean - true if score >= 35>,
@@ -3775,132 +3300,118 @@ You are an expert English language evaluator for C2 Advanced level critical opin
     "total_keywords": <total number of expected keywords>,
     "academic_expressions_used": <number of academic expressions found>,
     "total_academic_expressions": <total number of expected academic expressions>,
-    "detailed_feedback": {{
+    "detailed_feedback": {
         "argument_structure": "<specific feedback on argument structure>",
         "logical_flow": "<feedback on logical progression and coherence>",
         "academic_expressions": "<feedback on academic language usage>",
         "critical_thinking": "<feedback on critical analysis depth>",
         "vocabulary_usage": "<feedback on vocabulary sophistication>"
-    }},
+    },
     "suggested_improvement": "<specific suggestions for improvement>",
     "strengths": ["<list of strengths in the response>"],
     "areas_for_improvement": ["<list of areas that need work>"],
-    "structure_analysis": {{
+    "structure_analysis": {
         "thesis_present": <boolean>,
         "supporting_arguments": <number>,
         "counterpoint_addressed": <boolean>,
         "conclusion_present": <boolean>
-    }}
-}}
+    }
+}
 """
 
-        print(f"🤖 [EVAL] Sending evaluation request to ChatGPT...")
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert English language evaluator for C2 Advanced level critical opinion building."},
-                {"role": "user", "content": evaluation_prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500
+EX3_STAGE6_INPUTS = """
+📥 Inputs:
+**TOPIC:** {topic}
+**USER'S RESPONSE:** "{user_response}"
+**MODEL ANSWER FOR REFERENCE:** "{model_response}"
+**EXPECTED STRUCTURE:** {expected_structure}
+**EXPECTED KEYWORDS:** {expected_keywords}
+**VOCABULARY FOCUS:** {vocabulary_focus}
+**ACADEMIC EXPRESSIONS TO USE:** {academic_expressions}
+"""
+
+prompt_registry.register(6, 3, EX3_STAGE6_INSTRUCTIONS, EX3_STAGE6_INPUTS)
+
+def evaluate_response_ex3_stage6(user_response: str, topic: str, expected_keywords: list, vocabulary_focus: list, academic_expressions: list, model_response: str, expected_structure: str) -> dict:
+    """
+    Evaluate Stage 6 Exercise 3 (Critical Opinion Builder) responses using OpenAI GPT-4o.
+
+    This function evaluates C2 Advanced level critical opinion building based on:
+    - Argument structure and logical flow
+    - Academic expression usage
+    - Critical thinking depth
+    - Vocabulary sophistication
+    - Balanced viewpoint presentation
+
+    Args:
+        user_response (str): The user's written opinion response
+        topic (str): The controversial topic they were asked to discuss
+        expected_keywords (list): Expected keywords to include
+        vocabulary_focus (list): Domain-specific vocabulary to evaluate
+        academic_expressions (list): Expected academic expressions to use
+        model_response (str): Example of a well-structured response for comparison
+        expected_structure (str): Expected argument structure
+
+    Returns:
+        dict: Comprehensive evaluation results with scores and detailed feedback
+    """
+    logger.debug("feedback.evaluation.start", evaluator="ex3_stage6", response_chars=len(user_response),
+                 keywords=len(expected_keywords), academic_expressions=len(academic_expressions))
+
+    # Fallback evaluation (only used for fields GPT never produced)
+    fallback = {
+        "score": 50,
+        "is_correct": False,
+        "completed": False,
+        "keyword_matches": 0,
+        "total_keywords": len(expected_keywords),
+        "academic_expressions_used": 0,
+        "total_academic_expressions": len(academic_expressions),
+        "detailed_feedback": {
+            "argument_structure": "Unable to evaluate due to processing error",
+            "logical_flow": "Unable to evaluate due to processing error",
+            "academic_expressions": "Unable to evaluate due to processing error",
+            "critical_thinking": "Unable to evaluate due to processing error",
+            "vocabulary_usage": "Unable to evaluate due to processing error"
+        },
+        "suggested_improvement": "Please try again. Make sure to follow the expected structure and use academic expressions naturally.",
+        "strengths": ["Response provided"],
+        "areas_for_improvement": ["Evaluation processing error"],
+        "structure_analysis": {
+            "thesis_present": False,
+            "supporting_arguments": 0,
+            "counterpoint_addressed": False,
+            "conclusion_present": False
+        }
+    }
+
+    try:
+        # Static rubric first (system), per-attempt inputs last (user) for prompt caching
+        prompt_messages = prompt_registry.get(6, 3).messages(
+            topic=topic, user_response=user_response, model_response=model_response,
+            expected_structure=expected_structure, expected_keywords=expected_keywords,
+            vocabulary_focus=vocabulary_focus, academic_expressions=academic_expressions,
         )
-        
-        evaluation_text = response.choices[0].message.content.strip()
-        print(f"📄 [EVAL] Raw ChatGPT response: {evaluation_text[:200]}...")
-        
-        # Try to extract JSON from the response
-        try:
-            # Look for JSON in the response
-            json_start = evaluation_text.find('{')
-            json_end = evaluation_text.rfind('}') + 1
-            
-            if json_start != -1 and json_end != 0:
-                json_content = evaluation_text[json_start:json_end]
-                evaluation_result = json.loads(json_content)
-                print(f"✅ [EVAL] Successfully parsed JSON evaluation")
-            else:
-                raise ValueError("No JSON found in response")
-                
-        except json.JSONDecodeError as e:
-            print(f"❌ [EVAL] JSON parsing error: {str(e)}")
-            print(f"📄 [EVAL] Attempted to parse: {evaluation_text}")
-            
-            # Fallback evaluation
-            evaluation_result = {
-                "score": 50,
-                "is_correct": False,
-                "completed": False,
-                "keyword_matches": 0,
-                "total_keywords": len(expected_keywords),
-                "academic_expressions_used": 0,
-                "total_academic_expressions": len(academic_expressions),
-                "detailed_feedback": {
-                    "argument_structure": "Unable to evaluate due to processing error",
-                    "logical_flow": "Unable to evaluate due to processing error",
-                    "academic_expressions": "Unable to evaluate due to processing error",
-                    "critical_thinking": "Unable to evaluate due to processing error",
-                    "vocabulary_usage": "Unable to evaluate due to processing error"
-                },
-                "suggested_improvement": "Please try again. Make sure to follow the expected structure and use academic expressions naturally.",
-                "strengths": ["Response provided"],
-                "areas_for_improvement": ["Evaluation processing error"],
-                "structure_analysis": {
-                    "thesis_present": False,
-                    "supporting_arguments": 0,
-                    "counterpoint_addressed": False,
-                    "conclusion_present": False
-                }
-            }
-        
-        # Validate and sanitize the evaluation result
-        score = evaluation_result.get("score", 50)
-        if not isinstance(score, (int, float)) or score < 0 or score > 100:
-            score = 50
-            evaluation_result["score"] = score
-        
-        is_correct = evaluation_result.get("is_correct", score >= 35)
-        completed = evaluation_result.get("completed", score >= 35)
-        
-        # Ensure keyword matches is valid
-        keyword_matches = evaluation_result.get("keyword_matches", 0)
-        total_keywords = evaluation_result.get("total_keywords", len(expected_keywords))
-        
-        if not isinstance(keyword_matches, int) or keyword_matches < 0:
-            keyword_matches = 0
-        if not isinstance(total_keywords, int) or total_keywords <= 0:
-            total_keywords = len(expected_keywords)
-        
-        # Ensure academic expressions count is valid
-        academic_expressions_used = evaluation_result.get("academic_expressions_used", 0)
-        total_academic_expressions = evaluation_result.get("total_academic_expressions", len(academic_expressions))
-        
-        if not isinstance(academic_expressions_used, int) or academic_expressions_used < 0:
-            academic_expressions_used = 0
-        if not isinstance(total_academic_expressions, int) or total_academic_expressions <= 0:
-            total_academic_expressions = len(academic_expressions)
-        
-        evaluation_result.update({
-            "is_correct": is_correct,
-            "completed": completed,
-            "keyword_matches": keyword_matches,
-            "total_keywords": total_keywords,
-            "academic_expressions_used": academic_expressions_used,
-            "total_academic_expressions": total_academic_expressions
-        })
-        
-        print(f"📊 [EVAL] Final evaluation result:")
-        print(f"   - Score: {score}")
-        print(f"   - Is correct: {is_correct}")
-        print(f"   - Completed: {completed}")
-        print(f"   - Keyword matches: {keyword_matches}/{total_keywords}")
-        print(f"   - Academic expressions: {academic_expressions_used}/{total_academic_expressions}")
-        
+        evaluation_result = run_structured_evaluation(client, "ex3_stage6", CriticalOpinionEvaluation, prompt_messages,
+                                                      fallback, model="gpt-4o", max_tokens=1500)
+
+        # The model counts matches; an impossible total falls back to the real one
+        evaluation_result["keyword_matches"] = max(0, evaluation_result["keyword_matches"])
+        if evaluation_result["total_keywords"] <= 0:
+            evaluation_result["total_keywords"] = len(expected_keywords)
+        evaluation_result["academic_expressions_used"] = max(0, evaluation_result["academic_expressions_used"])
+        if evaluation_result["total_academic_expressions"] <= 0:
+            evaluation_result["total_academic_expressions"] = len(academic_expressions)
+
+        logger.info("feedback.evaluation.done", evaluator="ex3_stage6", score=evaluation_result["score"],
+                    is_correct=evaluation_result["is_correct"], completed=evaluation_result["completed"],
+                    keyword_matches=evaluation_result["keyword_matches"],
+                    academic_expressions_used=evaluation_result["academic_expressions_used"])
         return evaluation_result
-        
-    except Exception as e:
-        print(f"❌ [EVAL] Error in evaluate_response_ex3_stage6: {str(e)}")
-        
+
+    except Exception:
+        logger.exception("feedback.evaluation.failed", evaluator="ex3_stage6")
+
         # Return fallback evaluation
         return {
             "score": 50,
@@ -3927,4 +3438,3 @@ You are an expert English language evaluator for C2 Advanced level critical opin
                 "conclusion_present": False
             }
         }
-
@@ -1,9 +1,10 @@
 # Stage 2 - Exercise 2 (Questions & Answers Practice - Responding to WH-questions)
 
-from openai import OpenAI
+from app.services.vendor_clients import LazyClient, get_openai_client
 from typing import List, Dict
 
-client = OpenAI()
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
 
 def evaluate_wh_response(transcript: str, expected_answers: List[str], keywords: List[str], tense: str) -> Dict:
     """
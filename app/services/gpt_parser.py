@@ -3,9 +3,13 @@ import json
 import re
 from app.schemas.pdf_quiz import QuizItem
 from typing import List, Dict
-from openai import OpenAI
+from app.services.vendor_clients import LazyClient, get_async_openai_client, get_openai_client
     
-client = OpenAI()
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
+
+QUIZ_MODEL = "gpt-4o-mini"
+QUIZ_SYSTEM_MESSAGE = "You are a helpful assistant that extracts quiz questions."
 
 def extract_json_from_response(content: str) -> Dict:
     """
@@ -23,8 +27,8 @@ def extract_json_from_response(content: str) -> Dict:
         print("❌ No JSON found in GPT response")
         return {"error": "No JSON found in response"}
 
-def extract_quiz_from_text_using_gpt(text: str) -> Dict:
-    prompt = f"""
+def build_quiz_prompt(text: str) -> str:
+    return f"""
 You are an AI quiz generator trained to extract quiz questions from educational text. Your output must follow LearnDash-compatible question types and return in the following structured JSON format:
 
 {{
@@ -63,12 +67,17 @@ Here is the educational text to process:
 """
 
 
+def _quiz_messages(text: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": QUIZ_SYSTEM_MESSAGE},
+        {"role": "user", "content": build_quiz_prompt(text)}
+    ]
+
+
+def extract_quiz_from_text_using_gpt(text: str) -> Dict:
     response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant that extracts quiz questions."},
-            {"role": "user", "content": prompt}
-        ],
+        model=QUIZ_MODEL,
+        messages=_quiz_messages(text),
         temperature=0.7
     )
    
@@ -77,3 +86,17 @@ Here is the educational text to process:
     print("🧠 GPT Response:\n", content)
 
     return extract_json_from_response(content)
+
+
+async def extract_quiz_from_text_using_gpt_async(text: str) -> Dict:
+    """Async variant used by the PDF quiz pipeline (one call per page chunk)."""
+    response = await get_async_openai_client().chat.completions.create(
+        model=QUIZ_MODEL,
+        messages=_quiz_messages(text),
+        temperature=0.7
+    )
+
+    content = response.choices[0].message.content.strip()
+    print(f"🧠 GPT Response ({len(content)} chars)")
+
+    return extract_json_from_response(content)
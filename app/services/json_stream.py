@@ -0,0 +1,80 @@
+"""
+Incremental JSON String Field Extraction
+
+Pulls the value of one string field out of a JSON object while the object is
+still being streamed token by token, e.g. `conversation_text` from a
+GPT `json_object` response, so the text can be spoken before the full
+response has arrived.
+"""
+
+import re
+
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonStringFieldStreamer:
+    """
+    Feed raw JSON chunks with `feed()`; each call returns the newly decoded
+    characters of the target field's value (empty until the field is reached).
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self._key_pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos = 0
+        self._in_value = False
+        self.value = ""
+        self.complete = False
+
+    def feed(self, chunk: str) -> str:
+        if self.complete or not chunk:
+            return ""
+        self._buffer += chunk
+
+        if not self._in_value:
+            match = self._key_pattern.search(self._buffer)
+            if not match:
+                return ""
+            self._in_value = True
+            self._pos = match.end()
+
+        decoded = []
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self.complete = True
+                pos += 1
+                break
+            if char != "\\":
+                decoded.append(char)
+                pos += 1
+                continue
+            # Escape sequence: wait for the rest of it if it was split across chunks
+            if pos + 1 >= len(buffer):
+                break
+            code = buffer[pos + 1]
+            if code != "u":
+                decoded.append(_SIMPLE_ESCAPES.get(code, code))
+                pos += 2
+                continue
+            if pos + 6 > len(buffer):
+                break
+            codepoint = int(buffer[pos + 2:pos + 6], 16)
+            if 0xD800 <= codepoint <= 0xDBFF:
+                # High surrogate: needs the following \uXXXX low surrogate
+                if pos + 12 > len(buffer):
+                    break
+                low = int(buffer[pos + 8:pos + 12], 16) if buffer[pos + 6:pos + 8] == "\\u" else 0
+                if 0xDC00 <= low <= 0xDFFF:
+                    decoded.append(chr(0x10000 + ((codepoint - 0xD800) << 10) + (low - 0xDC00)))
+                    pos += 12
+                    continue
+            decoded.append(chr(codepoint))
+            pos += 6
+
+        self._pos = pos
+        text = "".join(decoded)
+        self.value += text
+        return text
@@ -0,0 +1,87 @@
+"""
+Local Language Guard for Tutor Output
+
+Lightweight, network-free helpers used to keep spoken tutor replies in English:
+- Script detection (Arabic/Urdu and Devanagari blocks)
+- Roman Urdu detection via a small function-word lexicon
+- Incremental sentence splitting for streamed model text
+
+Detection runs on every streamed sentence, so everything here is pure
+Python with precompiled patterns and no model or API calls.
+"""
+
+import re
+from typing import List, Tuple
+
+# Arabic / Urdu (incl. presentation forms) and Devanagari (Hindi) blocks
+NON_ENGLISH_SCRIPT_PATTERN = re.compile(
+    r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF\u0900-\u097F]"
+)
+
+# Sentence boundary: terminator (Latin or Urdu) followed by whitespace, or a line break.
+# Requiring trailing whitespace keeps decimals like "3.5" from splitting while streaming.
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?\u06D4\u061F])\s+|\n+")
+
+_WORD_PATTERN = re.compile(r"[a-zA-Z']+")
+
+# High-frequency Roman Urdu / Hindi function words that are not English words.
+# Deliberately excludes loanwords tutors use in English sentences (chai, roti, cricket...)
+# and English homographs or names ("tab", "hum", "jab", "mere", "yeh", "woh", "wala", "wali").
+ROMAN_URDU_MARKERS = frozenset({
+    "hai", "hain", "tha", "thi", "thay", "kya", "kyun", "kyu", "nahi", "nahin",
+    "mein", "mujhe", "mera", "meri", "aap", "aapka", "aapki", "tum",
+    "tumhara", "hamara", "kaise", "kaisa", "kaisi", "acha", "achha",
+    "bohat", "bahut", "karo", "karna", "karta", "karti", "raha", "rahi", "rahe",
+    "gaya", "gayi", "kuch", "bhi", "sirf", "abhi",
+    "lekin", "magar", "kyunke", "agar", "phir", "bilkul", "shukriya",
+})
+
+# A sentence is flagged as Roman Urdu only when distinct markers are both frequent and
+# dense, so a single quoted or repeated word ("we call it 'acha'") does not trigger a rewrite.
+ROMAN_URDU_MIN_MARKERS = 2
+ROMAN_URDU_MIN_RATIO = 0.25
+
+
+def contains_non_english_script(text: str) -> bool:
+    """Return True if the text contains any Urdu/Arabic/Devanagari characters."""
+    if not text:
+        return False
+    return bool(NON_ENGLISH_SCRIPT_PATTERN.search(text))
+
+
+def looks_like_roman_urdu(text: str) -> bool:
+    """Heuristically detect Roman Urdu / Hinglish written in Latin script."""
+    if not text:
+        return False
+    words = [w.lower() for w in _WORD_PATTERN.findall(text)]
+    if not words:
+        return False
+    hits = len(ROMAN_URDU_MARKERS.intersection(words))
+    return hits >= ROMAN_URDU_MIN_MARKERS and hits / len(words) >= ROMAN_URDU_MIN_RATIO
+
+
+def is_english_sentence(text: str) -> bool:
+    """Classify a single sentence as safe to speak in an English-only reply."""
+    return not contains_non_english_script(text) and not looks_like_roman_urdu(text)
+
+
+def split_completed_sentences(buffer: str) -> Tuple[List[str], str]:
+    """
+    Split streamed text into completed sentences and the unfinished remainder.
+
+    Returns:
+        (sentences, remainder) where sentences are stripped and non-empty and
+        remainder is the text after the last boundary (still being streamed).
+    """
+    if not buffer:
+        return [], ""
+
+    last_end = 0
+    sentences: List[str] = []
+    for match in SENTENCE_BOUNDARY_PATTERN.finditer(buffer):
+        sentence = buffer[last_end:match.start()].strip()
+        if sentence:
+            sentences.append(sentence)
+        last_end = match.end()
+
+    return sentences, buffer[last_end:]
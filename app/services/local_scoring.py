@@ -0,0 +1,167 @@
+"""
+Local Fast-Path Scoring for Stage 1 Exercises
+
+Deterministic scorer used in front of GPT for Repeat After Me (stage 1,
+exercise 1) and Quick Response (stage 1, exercise 2):
+- Word alignment against the expected phrase/answers (see word_alignment.py)
+- Keyword coverage of the closest expected answer
+- Urdu detection (Urdu/Arabic script or Roman Urdu)
+
+Clear passes and clear failures are answered locally; everything in between
+is "ambiguous" and still goes to GPT. Thresholds can be tuned with
+app/scripts/compare_local_scoring.py against recorded attempts.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from app.services.language_guard import contains_non_english_script, looks_like_roman_urdu
+from app.services.word_alignment import AlignmentResult, align_words, normalize_words
+
+DECISION_PASS = "pass"
+DECISION_FAIL = "fail"
+DECISION_AMBIGUOUS = "ambiguous"
+
+# Repeat After Me: alignment score bands (GPT passes at >= 80)
+REPEAT_PASS_SCORE = 90.0
+REPEAT_FAIL_SCORE = 40.0
+
+# Quick Response: expected answers are examples, so only near-verbatim matches pass locally
+QUICK_PASS_SCORE = 90.0
+QUICK_FAIL_SCORE = 25.0
+QUICK_FAIL_MAX_COVERAGE = 0.0
+
+_STOPWORDS = {
+    "a", "an", "the", "is", "am", "are", "was", "were", "be", "to", "of", "and", "or", "in", "on", "at",
+    "for", "with", "it", "i", "you", "he", "she", "we", "they", "my", "your", "do", "does", "did", "not",
+    "this", "that", "me", "so", "very", "too", "please",
+}
+
+
+@dataclass
+class LocalScore:
+    decision: str  # "pass", "fail" or "ambiguous"
+    score: int  # 0-100
+    urdu_used: bool = False
+    keyword_coverage: float = 0.0
+    matched_answer: Optional[str] = None
+    problem_words: List[str] = field(default_factory=list)
+    alignment: Optional[AlignmentResult] = None
+
+    @property
+    def is_decisive(self) -> bool:
+        return self.decision != DECISION_AMBIGUOUS
+
+
+def detect_urdu(text: str) -> bool:
+    return contains_non_english_script(text) or looks_like_roman_urdu(text)
+
+
+def keyword_coverage(expected_text: str, spoken_text: str) -> float:
+    """Share of the expected content words (stopwords removed) that appear in the spoken text."""
+    keywords = {w for w in normalize_words(expected_text) if w not in _STOPWORDS}
+    if not keywords:
+        return 1.0
+    spoken = set(normalize_words(spoken_text))
+    return len(keywords & spoken) / len(keywords)
+
+
+def _problem_words(alignment: AlignmentResult) -> List[str]:
+    return [w.expected for w in alignment.words if w.expected and w.status != "correct"]
+
+
+def score_repeat_after_me(expected_phrase: str, user_response: str) -> LocalScore:
+    """Score a Repeat After Me attempt; ambiguous results should be sent to GPT."""
+    if not normalize_words(user_response):
+        urdu_used = detect_urdu(user_response)
+        return LocalScore(DECISION_FAIL if urdu_used or not (user_response or "").strip() else DECISION_AMBIGUOUS,
+                          0, urdu_used=urdu_used)
+
+    alignment = align_words(expected_phrase, user_response)
+    score = int(round(alignment.score))
+    urdu_used = detect_urdu(user_response)
+    coverage = keyword_coverage(expected_phrase, user_response)
+
+    if urdu_used and score < REPEAT_PASS_SCORE:
+        decision = DECISION_FAIL
+    elif score >= REPEAT_PASS_SCORE:
+        decision = DECISION_PASS
+    elif score < REPEAT_FAIL_SCORE:
+        decision = DECISION_FAIL
+    else:
+        decision = DECISION_AMBIGUOUS
+
+    return LocalScore(decision, score, urdu_used=urdu_used, keyword_coverage=coverage,
+                      matched_answer=expected_phrase, problem_words=_problem_words(alignment),
+                      alignment=alignment)
+
+
+def score_quick_response(expected_answers: List[str], user_response: str) -> LocalScore:
+    """Score a Quick Response attempt against the closest expected answer."""
+    answers = [a for a in (expected_answers or []) if isinstance(a, str) and a.strip()]
+    urdu_used = detect_urdu(user_response)
+    if not answers or not normalize_words(user_response):
+        decision = DECISION_FAIL if urdu_used or not (user_response or "").strip() else DECISION_AMBIGUOUS
+        return LocalScore(decision, 0, urdu_used=urdu_used)
+
+    best_answer, best_alignment = max(
+        ((answer, align_words(answer, user_response)) for answer in answers),
+        key=lambda pair: pair[1].score,
+    )
+    score = int(round(best_alignment.score))
+    coverage = max(keyword_coverage(answer, user_response) for answer in answers)
+
+    if urdu_used and score < QUICK_PASS_SCORE:
+        decision = DECISION_FAIL
+    elif score >= QUICK_PASS_SCORE:
+        decision = DECISION_PASS
+    elif score < QUICK_FAIL_SCORE and coverage <= QUICK_FAIL_MAX_COVERAGE:
+        decision = DECISION_FAIL
+    else:
+        decision = DECISION_AMBIGUOUS
+
+    return LocalScore(decision, score, urdu_used=urdu_used, keyword_coverage=coverage,
+                      matched_answer=best_answer, problem_words=_problem_words(best_alignment),
+                      alignment=best_alignment)
+
+
+def build_repeat_after_me_result(local: LocalScore, expected_phrase: str) -> dict:
+    """evaluate_response_ex1_stage1-shaped result for a decisive local score."""
+    passed = local.decision == DECISION_PASS
+    if passed and local.problem_words:
+        feedback = f"Great job! Pay a little attention to: {', '.join(local.problem_words[:3])}."
+    elif passed:
+        feedback = "Excellent! You said the phrase perfectly."
+    elif local.urdu_used:
+        feedback = f"Please say the phrase in English: \"{expected_phrase}\"."
+    else:
+        feedback = f"Let's try again. Listen carefully and say: \"{expected_phrase}\"."
+    return {
+        "feedback": feedback,
+        "score": local.score,
+        "is_correct": passed,
+        "urdu_used": local.urdu_used,
+        "completed": passed,
+    }
+
+
+def build_quick_response_result(local: LocalScore) -> dict:
+    """evaluate_response_ex2_stage1-shaped result for a decisive local score."""
+    passed = local.decision == DECISION_PASS
+    if passed:
+        feedback = "Great answer! That was clear and correct."
+        suggestion = "Keep practicing to answer even more quickly and naturally."
+    elif local.urdu_used:
+        feedback = "Good effort! Please try answering in English."
+        suggestion = f"You could say: \"{local.matched_answer}\"" if local.matched_answer else "Answer in a short English sentence."
+    else:
+        feedback = "Let's try again. Listen to the question and answer in a full sentence."
+        suggestion = f"You could say: \"{local.matched_answer}\"" if local.matched_answer else "Answer in a short English sentence."
+    return {
+        "feedback": feedback,
+        "score": local.score,
+        "is_correct": passed,
+        "urdu_used": local.urdu_used,
+        "completed": passed,
+        "suggested_improvement": suggestion,
+    }
@@ -3,21 +3,61 @@ Multi-Level Cache Service for AI English Tutor
 
 Implements a three-tier caching strategy:
 - L1: Exact phrase matches with pre-generated audio (100ms response)
-- L2: Pattern-based matches with pre-generated audio (500ms response)
+- L2: Pattern-based matches with pre-generated audio (500ms response).
+  In the intent detection and option selection stages an exact L2 miss
+  falls back to the nearest cached utterance of the same stage and topic by
+  similarity (services/semantic_index.py), so paraphrases of a common
+  intent are served with the audio already generated for it. The cache is
+  shared by all learners, so greetings (names, places) are left out and
+  negation, numbers and any word outside the known intent vocabulary
+  must match too. A sampled share
+  of those hits is checked against GPT to measure their precision; an
+  entry GPT disagrees with stops matching by similarity
 - L3: Stage templates with on-demand generation (fallback)
 
 This service extends the predictive cache with audio pre-generation
-and intelligent cache warming for optimal performance.
+and intelligent cache warming for optimal performance. Responses depend on
+the admin-managed tutor settings, so L1/L2 are dropped whenever the
+settings version (version_fn) changes. Hits, misses and lookup latency are
+exported to /metrics under the cache's name.
+
+Each L2 entry also remembers the stage and topic its turn led to, so a hit
+can move the conversation on exactly as the original reply did.
+
+Environment:
+- MULTI_CACHE_SEMANTIC_STAGES: stages matched by similarity (default: intent_detection,option_selection)
+- MULTI_CACHE_SEMANTIC_THRESHOLD: minimum cosine similarity for a hit (default: 0.82)
+- MULTI_CACHE_SEMANTIC_VERIFY_RATE: share of similarity hits checked against GPT (default: 0.1)
 """
 
 import asyncio
 import hashlib
+import os
+import random
 import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from collections import defaultdict
 
 from app.services.predictive_cache import StageAwareCache, PredictiveResult, _normalize_text
+from app.services.semantic_index import SemanticIndex, Signature, embed, signature
+from app.utils.metrics import (
+    CACHE_HITS,
+    CACHE_LOOKUP_SECONDS,
+    CACHE_MISSES,
+    SEMANTIC_CACHE_LOOKUPS,
+    SEMANTIC_CACHE_SIMILARITY,
+    SEMANTIC_CACHE_VERIFICATIONS,
+)
+from app.utils.tracing import tracer
+
+SEMANTIC_STAGES = [
+    stage.strip()
+    for stage in os.getenv("MULTI_CACHE_SEMANTIC_STAGES", "intent_detection,option_selection").split(",")
+    if stage.strip()
+]
+SEMANTIC_THRESHOLD = float(os.getenv("MULTI_CACHE_SEMANTIC_THRESHOLD", "0.82"))
+SEMANTIC_VERIFY_RATE = float(os.getenv("MULTI_CACHE_SEMANTIC_VERIFY_RATE", "0.1"))
 
 
 @dataclass
@@ -31,6 +71,19 @@ class CachedResponse:
     cache_time: float
     hit_count: int = 0
     topic: Optional[str] = None
+    next_stage: Optional[str] = None  # where the turn that produced this reply led
+    next_topic: Optional[str] = None
+    similarity: Optional[float] = None  # set when L2 matched by similarity rather than exactly
+    cache_key: Optional[str] = None
+
+
+@dataclass
+class L2Entry:
+    """What an L2 reply was cached under, beyond its pattern hash."""
+    partition: Tuple[str, str]  # (stage, normalized topic)
+    signature: Signature
+    next_stage: Optional[str] = None
+    next_topic: Optional[str] = None
 
 
 @dataclass
@@ -44,6 +97,11 @@ class CacheStats:
     avg_response_time_l1: float = 0.0
     avg_response_time_l2: float = 0.0
     avg_response_time_l3: float = 0.0
+    semantic_hits: int = 0
+    semantic_misses: int = 0
+    semantic_rejected: int = 0  # nearest match was close enough but failed a guardrail
+    semantic_agreed: int = 0
+    semantic_disagreed: int = 0
 
 
 class MultiLevelCache:
@@ -66,12 +124,20 @@ class MultiLevelCache:
         max_l2_entries: int = 1000,
         l1_audio_cache_size: int = 200,
         l2_audio_cache_size: int = 500,
+        version_fn: Optional[Callable[[], str]] = None,  # e.g. settings_cache_version
+        name: str = "multi_level",  # metrics label
+        semantic_stages: Iterable[str] = SEMANTIC_STAGES,
+        semantic_threshold: float = SEMANTIC_THRESHOLD,
+        semantic_verify_rate: float = SEMANTIC_VERIFY_RATE,
     ):
+        self.name = name
         self.ttl_seconds = ttl_seconds
         self.max_l1_entries = max_l1_entries
         self.max_l2_entries = max_l2_entries
         self.l1_audio_cache_size = l1_audio_cache_size
         self.l2_audio_cache_size = l2_audio_cache_size
+        self.version_fn = version_fn
+        self._version: Optional[str] = None
         
         # L1: Exact phrase cache with audio
         # Key: normalized user input, Value: (response_text, audio_bytes, expiry, hit_count)
@@ -80,20 +146,24 @@ class MultiLevelCache:
         # L2: Pattern-based cache with audio
         # Key: pattern_hash, Value: (response_text, audio_bytes, expiry, hit_count, pattern)
         self.l2_cache: Dict[str, Tuple[str, bytes, float, int, str]] = {}
+        self.l2_entries: Dict[str, L2Entry] = {}
+        
+        # L2 similarity fallback: one index of utterance vectors per (stage, topic)
+        self.semantic_stages = set(semantic_stages)
+        self.semantic_threshold = semantic_threshold
+        self.semantic_verify_rate = semantic_verify_rate
+        self.semantic_indexes: Dict[Tuple[str, str], SemanticIndex] = {}
         
         # L3: Stage-aware predictive cache (delegates to existing cache)
-        self.predictive_cache = StageAwareCache(ttl_seconds=ttl_seconds)
+        self.predictive_cache = StageAwareCache(ttl_seconds=ttl_seconds, name=f"{name}_l3")
         
         # Statistics tracking
         self.stats = CacheStats()
         self._lock = asyncio.Lock()
-        
-        # Response time tracking for each level
-        self._response_times: Dict[str, List[float]] = {
-            "l1": [],
-            "l2": [],
-            "l3": [],
-        }
+
+    @staticmethod
+    def _partition(stage: str, topic: Optional[str]) -> Tuple[str, str]:
+        return stage, _normalize_text(topic or "general")
 
     def _pattern_hash(self, stage: str, user_input: str, topic: Optional[str]) -> str:
         """Generate a consistent hash for pattern-based caching."""
@@ -104,6 +174,29 @@ class MultiLevelCache:
         combined = f"{stage}:{topic_part}:{pattern_text}"
         return hashlib.md5(combined.encode()).hexdigest()
 
+    def _check_version(self) -> None:
+        """Drop L1/L2 responses generated under older settings (lock held)."""
+        if self.version_fn is None:
+            return
+        version = self.version_fn()
+        if version != self._version:
+            if self._version is not None and (self.l1_cache or self.l2_cache):
+                print(f"🧹 [MULTI_CACHE] Settings changed ({self._version} -> {version}), clearing L1/L2")
+                self.l1_cache.clear()
+                self._clear_l2()
+            self._version = version
+
+    def _drop_l2(self, key: str) -> None:
+        self.l2_cache.pop(key, None)
+        entry = self.l2_entries.pop(key, None)
+        if entry and entry.partition in self.semantic_indexes:
+            self.semantic_indexes[entry.partition].remove(key)
+
+    def _clear_l2(self) -> None:
+        self.l2_cache.clear()
+        self.l2_entries.clear()
+        self.semantic_indexes.clear()
+
     def _purge_expired_entries(self) -> None:
         """Remove expired entries from L1 and L2 caches.
         Optimized to only purge every 100 requests to reduce overhead.
@@ -130,7 +223,7 @@ class MultiLevelCache:
                 if expiry < now
             ]
             for key in expired_l2:
-                self.l2_cache.pop(key, None)
+                self._drop_l2(key)
 
     def _evict_lru_if_needed(self) -> None:
         """Evict least recently used entries if cache is full."""
@@ -156,7 +249,7 @@ class MultiLevelCache:
             )
             evict_count = max(1, self.max_l2_entries // 10)
             for key, _ in sorted_l2[:evict_count]:
-                self.l2_cache.pop(key, None)
+                self._drop_l2(key)
 
     async def get_cached_response(
         self,
@@ -177,6 +270,7 @@ class MultiLevelCache:
         self.stats.total_requests += 1
         
         async with self._lock:
+            self._check_version()
             self._purge_expired_entries()
             now = time.time()
             normalized_input = _normalize_text(user_input)
@@ -190,9 +284,7 @@ class MultiLevelCache:
                         response_text, audio, expiry, hit_count + 1
                     )
                     self.stats.l1_hits += 1
-                    response_time = (time.perf_counter() - start_time) * 1000
-                    self._response_times["l1"].append(response_time)
-                    self._update_avg_response_time("l1", response_time)
+                    self._record_hit("l1", start_time)
                     
                     return CachedResponse(
                         text=response_text,
@@ -208,33 +300,24 @@ class MultiLevelCache:
             # L2: Pattern-based match (medium - 500ms)
             pattern_hash = self._pattern_hash(stage, user_input, topic)
             if pattern_hash in self.l2_cache:
-                response_text, audio, expiry, hit_count, pattern = self.l2_cache[pattern_hash]
-                if expiry >= now:
-                    # Update hit count
-                    self.l2_cache[pattern_hash] = (
-                        response_text, audio, expiry, hit_count + 1, pattern
-                    )
+                _, audio, expiry, _, _ = self.l2_cache[pattern_hash]
+                if expiry >= now and audio:  # entries still waiting for TTS can't be served
                     self.stats.l2_hits += 1
-                    response_time = (time.perf_counter() - start_time) * 1000
-                    self._response_times["l2"].append(response_time)
-                    self._update_avg_response_time("l2", response_time)
-                    
-                    return CachedResponse(
-                        text=response_text,
-                        audio=audio,
-                        stage=stage,
-                        source="l2",
-                        confidence=0.85,
-                        cache_time=now,
-                        hit_count=hit_count + 1,
-                        topic=topic,
-                    )
+                    self._record_hit("l2", start_time)
+                    return self._l2_response(pattern_hash, stage=stage, topic=topic, now=now)
+            
+            # L2 by similarity: paraphrases of a common request
+            cached = self._semantic_lookup(stage=stage, user_input=user_input, topic=topic,
+                                           now=now, start_time=start_time)
+            if cached:
+                return cached
             
             # Don't check L3 here - it's too slow (generates audio synchronously)
             # L3 will be handled separately if needed
             
             # Cache miss
             self.stats.misses += 1
+            CACHE_MISSES.inc(cache=self.name)
             return None
     
     async def get_cached_response_fast(
@@ -248,10 +331,23 @@ class MultiLevelCache:
         Fast cache lookup for L1/L2 only (no L3, no audio generation).
         This is optimized for speed and runs in parallel with other operations.
         """
+        with tracer.span("cache.lookup", cache=self.name, stage=stage) as span:
+            cached = await self._lookup_fast(stage=stage, user_input=user_input, topic=topic)
+            span.set_attribute("result", cached.source if cached else "miss")
+            return cached
+
+    async def _lookup_fast(
+        self,
+        *,
+        stage: str,
+        user_input: str,
+        topic: Optional[str],
+    ) -> Optional[CachedResponse]:
         start_time = time.perf_counter()
         
         # Use a shorter lock scope - only lock during dictionary access
         async with self._lock:
+            self._check_version()
             now = time.time()
             normalized_input = _normalize_text(user_input)
             
@@ -264,9 +360,7 @@ class MultiLevelCache:
                     )
                     self.stats.l1_hits += 1
                     self.stats.total_requests += 1
-                    response_time = (time.perf_counter() - start_time) * 1000
-                    self._response_times["l1"].append(response_time)
-                    self._update_avg_response_time("l1", response_time)
+                    self._record_hit("l1", start_time)
                     
                     return CachedResponse(
                         text=response_text,
@@ -282,33 +376,137 @@ class MultiLevelCache:
             # L2: Pattern-based match (medium - 500ms)
             pattern_hash = self._pattern_hash(stage, user_input, topic)
             if pattern_hash in self.l2_cache:
-                response_text, audio, expiry, hit_count, pattern = self.l2_cache[pattern_hash]
-                if expiry >= now:
-                    self.l2_cache[pattern_hash] = (
-                        response_text, audio, expiry, hit_count + 1, pattern
-                    )
+                _, audio, expiry, _, _ = self.l2_cache[pattern_hash]
+                if expiry >= now and audio:  # entries still waiting for TTS can't be served
                     self.stats.l2_hits += 1
                     self.stats.total_requests += 1
-                    response_time = (time.perf_counter() - start_time) * 1000
-                    self._response_times["l2"].append(response_time)
-                    self._update_avg_response_time("l2", response_time)
-                    
-                    return CachedResponse(
-                        text=response_text,
-                        audio=audio,
-                        stage=stage,
-                        source="l2",
-                        confidence=0.85,
-                        cache_time=now,
-                        hit_count=hit_count + 1,
-                        topic=topic,
-                    )
+                    self._record_hit("l2", start_time)
+                    return self._l2_response(pattern_hash, stage=stage, topic=topic, now=now)
+            
+            # L2 by similarity: paraphrases of a common request
+            cached = self._semantic_lookup(stage=stage, user_input=user_input, topic=topic,
+                                           now=now, start_time=start_time)
+            if cached:
+                self.stats.total_requests += 1
+                return cached
         
         # Cache miss - return None quickly
         self.stats.misses += 1
         self.stats.total_requests += 1
+        CACHE_MISSES.inc(cache=self.name)
         return None
 
+    def _l2_response(
+        self,
+        key: str,
+        *,
+        stage: str,
+        topic: Optional[str],
+        now: float,
+        similarity: Optional[float] = None,
+    ) -> CachedResponse:
+        """Count a use of an L2 entry and wrap it for the caller (lock held)."""
+        response_text, audio, expiry, hit_count, pattern = self.l2_cache[key]
+        self.l2_cache[key] = (response_text, audio, expiry, hit_count + 1, pattern)
+        entry = self.l2_entries.get(key)
+        return CachedResponse(
+            text=response_text,
+            audio=audio,
+            stage=stage,
+            source="l2",
+            confidence=0.85 if similarity is None else round(0.85 * similarity, 3),
+            cache_time=now,
+            hit_count=hit_count + 1,
+            topic=topic,
+            next_stage=entry.next_stage if entry else None,
+            next_topic=entry.next_topic if entry else None,
+            similarity=similarity,
+            cache_key=key,
+        )
+
+    def _semantic_lookup(
+        self,
+        *,
+        stage: str,
+        user_input: str,
+        topic: Optional[str],
+        now: float,
+        start_time: float,
+    ) -> Optional[CachedResponse]:
+        """
+        Nearest cached utterance of the same stage and topic, if it is similar
+        enough, agrees on negation and numbers, and has its audio (lock held).
+        """
+        if stage not in self.semantic_stages:
+            return None
+        index = self.semantic_indexes.get(self._partition(stage, topic))
+        vector = embed(user_input) if index else None
+        neighbours = index.search(vector) if vector is not None else []
+        if neighbours:
+            SEMANTIC_CACHE_SIMILARITY.observe(neighbours[0][1], cache=self.name, stage=stage)
+        
+        result = "miss"
+        query = signature(user_input)
+        for key, similarity in neighbours:
+            if similarity < self.semantic_threshold:
+                break
+            cached = self.l2_cache.get(key)
+            if cached is None or cached[2] < now:
+                self._drop_l2(key)
+                continue
+            if not cached[1]:
+                continue  # audio not generated yet
+            if self.l2_entries[key].signature != query:
+                result = "rejected"
+                continue
+            self.stats.l2_hits += 1
+            self.stats.semantic_hits += 1
+            SEMANTIC_CACHE_LOOKUPS.inc(cache=self.name, stage=stage, result="hit")
+            self._record_hit("l2", start_time)
+            return self._l2_response(key, stage=stage, topic=topic, now=now, similarity=similarity)
+        
+        if result == "rejected":
+            self.stats.semantic_rejected += 1
+        else:
+            self.stats.semantic_misses += 1
+        SEMANTIC_CACHE_LOOKUPS.inc(cache=self.name, stage=stage, result=result)
+        return None
+
+    def should_verify(self, cached: CachedResponse) -> bool:
+        """Whether to let GPT answer a similarity hit anyway, to measure precision."""
+        return cached.similarity is not None and random.random() < self.semantic_verify_rate
+
+    async def record_verification(
+        self,
+        cached: CachedResponse,
+        *,
+        next_stage: Optional[str],
+        next_topic: Optional[str],
+    ) -> bool:
+        """
+        Compare a similarity hit with where GPT took the same utterance.
+        On disagreement the entry stops matching by similarity; exact
+        repeats of its own utterance still hit.
+        """
+        agreed = (
+            cached.next_stage == next_stage
+            and _normalize_text(cached.next_topic or "") == _normalize_text(next_topic or "")
+        )
+        SEMANTIC_CACHE_VERIFICATIONS.inc(
+            cache=self.name, stage=cached.stage, result="agree" if agreed else "disagree"
+        )
+        async with self._lock:
+            if agreed:
+                self.stats.semantic_agreed += 1
+            else:
+                self.stats.semantic_disagreed += 1
+                entry = self.l2_entries.get(cached.cache_key)
+                if entry and entry.partition in self.semantic_indexes:
+                    self.semantic_indexes[entry.partition].remove(cached.cache_key)
+                print(f"⚠️ [MULTI_CACHE] Similarity hit disagreed with GPT "
+                      f"({cached.next_stage}/{cached.next_topic} vs {next_stage}/{next_topic}), unindexed")
+        return agreed
+
     async def cache_response(
         self,
         *,
@@ -318,17 +516,22 @@ class MultiLevelCache:
         audio: Optional[bytes],  # Can be None if audio not ready yet
         topic: Optional[str],
         cache_level: str = "l2",  # "l1" or "l2"
+        next_stage: Optional[str] = None,
+        next_topic: Optional[str] = None,
     ) -> None:
         """
         Cache a response with audio at the specified level.
         This is non-blocking and can be called asynchronously.
         
         Args:
+            stage, topic: the conversation state the input was said in (the lookup key)
             cache_level: "l1" for exact phrase, "l2" for pattern-based
             audio: Can be None if audio generation is still in progress
+            next_stage, next_topic: where the turn led, replayed on L2 hits
         """
         try:
             async with self._lock:
+                self._check_version()
                 self._purge_expired_entries()
                 self._evict_lru_if_needed()
                 
@@ -349,6 +552,16 @@ class MultiLevelCache:
                     # L2: Pattern-based
                     pattern_hash = self._pattern_hash(stage, user_input, topic)
                     pattern_text = normalized_input[:100]
+                    partition = self._partition(stage, topic)
+                    self.l2_entries[pattern_hash] = L2Entry(
+                        partition=partition,
+                        signature=signature(user_input),
+                        next_stage=next_stage,
+                        next_topic=next_topic,
+                    )
+                    vector = embed(user_input) if stage in self.semantic_stages else None
+                    if vector is not None:
+                        self.semantic_indexes.setdefault(partition, SemanticIndex()).add(pattern_hash, vector)
                     if audio:
                         self.l2_cache[pattern_hash] = (response_text, audio, expiry, 0, pattern_text)
                         print(f"💾 [MULTI_CACHE] Cached L2: pattern '{pattern_text[:50]}...' → '{response_text[:50]}...'")
@@ -388,27 +601,25 @@ class MultiLevelCache:
         except Exception as e:
             print(f"⚠️ [MULTI_CACHE] Error updating cached audio: {e}")
 
-    def _update_avg_response_time(self, level: str, new_time: float) -> None:
-        """Update rolling average response time for a cache level."""
-        times = self._response_times[level]
-        if len(times) > 100:
-            times.pop(0)  # Keep last 100 measurements
-        
-        if level == "l1":
-            self.stats.avg_response_time_l1 = sum(times) / len(times) if times else 0.0
-        elif level == "l2":
-            self.stats.avg_response_time_l2 = sum(times) / len(times) if times else 0.0
-        elif level == "l3":
-            self.stats.avg_response_time_l3 = sum(times) / len(times) if times else 0.0
+    def _record_hit(self, level: str, start_time: float) -> None:
+        """Count a hit and its lookup time (fixed-size histogram, not a growing list)."""
+        CACHE_HITS.inc(cache=self.name, level=level)
+        CACHE_LOOKUP_SECONDS.observe(time.perf_counter() - start_time, cache=self.name, level=level)
+
+    def _avg_response_time_ms(self, level: str) -> float:
+        return CACHE_LOOKUP_SECONDS.snapshot(cache=self.name, level=level)["avg"] * 1000
 
     def get_cache_stats(self) -> Dict[str, any]:
         """Get comprehensive cache statistics."""
         total_hits = self.stats.l1_hits + self.stats.l2_hits + self.stats.l3_hits
+        verified = self.stats.semantic_agreed + self.stats.semantic_disagreed
         hit_rate = (
             (total_hits / self.stats.total_requests * 100)
             if self.stats.total_requests > 0
             else 0.0
         )
+        for level in ("l1", "l2", "l3"):
+            setattr(self.stats, f"avg_response_time_{level}", self._avg_response_time_ms(level))
         
         return {
             "l1": {
@@ -421,6 +632,18 @@ class MultiLevelCache:
                 "entries": len(self.l2_cache),
                 "avg_response_time_ms": round(self.stats.avg_response_time_l2, 2),
             },
+            "l2_semantic": {
+                "stages": sorted(self.semantic_stages),
+                "threshold": self.semantic_threshold,
+                "indexed": sum(len(index) for index in self.semantic_indexes.values()),
+                "hits": self.stats.semantic_hits,
+                "misses": self.stats.semantic_misses,
+                "rejected": self.stats.semantic_rejected,
+                "verified": verified,
+                "precision_percent": (
+                    round(self.stats.semantic_agreed / verified * 100, 2) if verified else None
+                ),
+            },
             "l3": {
                 "hits": self.stats.l3_hits,
                 "avg_response_time_ms": round(self.stats.avg_response_time_l3, 2),
@@ -468,7 +691,7 @@ class MultiLevelCache:
         if level == "l1" or level is None:
             self.l1_cache.clear()
         if level == "l2" or level is None:
-            self.l2_cache.clear()
+            self._clear_l2()
         if level == "l3" or level is None:
             self.predictive_cache.pattern_cache.clear()
             self.predictive_cache.phrase_cache.clear()
@@ -1,9 +1,10 @@
-import fitz  # PyMuPDF
 import re
 from typing import List
 from app.schemas.pdf_quiz import QuizItem
 
 def extract_text_from_pdf(file_path: str) -> str:
+    import fitz  # PyMuPDF, imported on first use (slow to import)
+
     text = ""
     doc = fitz.open(file_path)
     for page in doc:
@@ -0,0 +1,243 @@
+"""
+PDF Quiz Extraction Pipeline
+
+Async pipeline behind the AI quiz parser routes:
+- PDFs are opened from memory (no temp files) and pages are extracted in a
+  process pool so PyMuPDF never blocks the event loop
+- URL sources are downloaded with an async HTTP client
+- Pages are grouped into chunks that go to GPT concurrently, and the
+  per-chunk quizzes are merged with duplicate questions removed
+- Results are cached by a hash of the PDF bytes, so re-uploads are free;
+  quizzes missing a failed chunk are returned but not cached
+- Long extractions can run as background jobs with a pollable status
+
+Environment:
+    PDF_QUIZ_CHUNK_CHARS       target characters per GPT chunk (default 12000)
+    PDF_QUIZ_GPT_CONCURRENCY   max concurrent GPT chunk calls per PDF (default 4)
+    PDF_EXTRACT_WORKERS        process pool size for page extraction (default 2)
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from app.cache import cache_manager
+from app.services.gpt_parser import extract_quiz_from_text_using_gpt_async
+
+PDF_QUIZ_CHUNK_CHARS = int(os.getenv("PDF_QUIZ_CHUNK_CHARS", "12000"))
+PDF_QUIZ_GPT_CONCURRENCY = int(os.getenv("PDF_QUIZ_GPT_CONCURRENCY", "4"))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "2"))
+
+PDF_DOWNLOAD_TIMEOUT_SECONDS = 60
+PDF_QUIZ_CACHE_TTL_SECONDS = 7 * 24 * 3600
+PDF_QUIZ_JOB_TTL_SECONDS = 24 * 3600
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+_NON_WORD_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+class PDFQuizError(Exception):
+    """Raised when a PDF cannot be downloaded or read."""
+
+
+def extract_pages_from_bytes(pdf_bytes: bytes) -> List[str]:
+    """Extract per-page text from an in-memory PDF (runs inside the process pool)."""
+    import fitz  # PyMuPDF, imported on first use (slow to import)
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [page.get_text() for page in doc]
+
+
+def chunk_pages(pages: List[str], max_chars: int = PDF_QUIZ_CHUNK_CHARS) -> List[str]:
+    """Group whole pages into chunks of roughly max_chars so no question is split mid-page."""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for page in pages:
+        page = page.strip()
+        if not page:
+            continue
+        if current and current_len + len(page) > max_chars:
+            chunks.append("\n".join(current))
+            current, current_len = [], 0
+        current.append(page)
+        current_len += len(page) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _question_key(question: Dict[str, Any]) -> str:
+    return _NON_WORD_PATTERN.sub(" ", str(question.get("question", "")).lower()).strip()
+
+
+def merge_quiz_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-chunk quizzes in page order: first title wins, duplicate questions are dropped."""
+    title = None
+    questions: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
+    for result in results:
+        if not isinstance(result, dict) or "error" in result:
+            continue
+        if title is None and result.get("title"):
+            title = result["title"]
+        for question in result.get("questions") or []:
+            if not isinstance(question, dict):
+                continue
+            key = _question_key(question)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            questions.append(question)
+    return {"title": title, "questions": questions}
+
+
+class PDFQuizPipeline:
+    """Shared pipeline state: process pool, result cache and background jobs."""
+
+    def __init__(
+        self,
+        chunk_chars: int = PDF_QUIZ_CHUNK_CHARS,
+        gpt_concurrency: int = PDF_QUIZ_GPT_CONCURRENCY,
+        extract_workers: int = PDF_EXTRACT_WORKERS,
+    ):
+        self.chunk_chars = chunk_chars
+        self.gpt_concurrency = max(1, gpt_concurrency)
+        self.extract_workers = max(1, extract_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, asyncio.Task] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.extract_workers)
+        return self._executor
+
+    async def download_pdf(self, url: str) -> bytes:
+        try:
+            async with httpx.AsyncClient(timeout=PDF_DOWNLOAD_TIMEOUT_SECONDS, follow_redirects=True) as http:
+                response = await http.get(url)
+        except httpx.HTTPError as e:
+            raise PDFQuizError(f"Failed to download the PDF file from the URL: {e}")
+        if response.status_code != 200:
+            raise PDFQuizError("Failed to download the PDF file from the URL.")
+        return response.content
+
+    async def extract_pages(self, pdf_bytes: bytes) -> List[str]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), extract_pages_from_bytes, pdf_bytes)
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool; rebuild it for later requests and finish this one in a thread
+            print("⚠️ [PDF QUIZ] Process pool broken, recreating it")
+            self._executor = None
+            return await asyncio.to_thread(extract_pages_from_bytes, pdf_bytes)
+        except Exception as e:
+            raise PDFQuizError(f"Could not read PDF: {e}")
+
+    async def extract_quiz(self, pdf_bytes: bytes, job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Extract a merged quiz from PDF bytes, using the content-hash cache when possible."""
+        content_hash = hashlib.sha256(pdf_bytes).hexdigest()
+        cache_key = f"pdf_quiz:{content_hash}"
+        cached = await cache_manager.get(cache_key)
+        if cached:
+            print(f"✅ [PDF QUIZ] Cache hit for {content_hash[:12]}")
+            return cached
+
+        start = time.perf_counter()
+        pages = await self.extract_pages(pdf_bytes)
+        chunks = chunk_pages(pages, self.chunk_chars)
+        print(f"📄 [PDF QUIZ] {len(pages)} pages -> {len(chunks)} chunks ({time.perf_counter() - start:.2f}s)")
+        if not chunks:
+            return {"title": None, "questions": []}
+
+        if job_id:
+            await self._update_job(job_id, status=JOB_RUNNING, chunks_total=len(chunks), chunks_done=0)
+
+        semaphore = asyncio.Semaphore(self.gpt_concurrency)
+        done = 0
+
+        async def run_chunk(chunk: str) -> Dict[str, Any]:
+            nonlocal done
+            async with semaphore:
+                try:
+                    result = await extract_quiz_from_text_using_gpt_async(chunk)
+                except Exception as e:
+                    print(f"❌ [PDF QUIZ] Chunk extraction failed: {e}")
+                    result = {"error": str(e)}
+            done += 1
+            if job_id:
+                await self._update_job(job_id, chunks_done=done)
+            return result
+
+        results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        if all("error" in result for result in results):
+            raise PDFQuizError(results[0]["error"])
+
+        quiz = merge_quiz_results(results)
+        print(f"✅ [PDF QUIZ] {len(quiz['questions'])} questions from {len(chunks)} chunks in {time.perf_counter() - start:.2f}s")
+        failed = sum(1 for result in results if "error" in result)
+        if failed:
+            # Partial quiz: don't let the gap be served from cache for a week; a re-upload retries
+            print(f"⚠️ [PDF QUIZ] {failed}/{len(chunks)} chunks failed, not caching {content_hash[:12]}")
+        else:
+            await cache_manager.set(cache_key, quiz, ttl=PDF_QUIZ_CACHE_TTL_SECONDS)
+        return quiz
+
+    async def extract_quiz_from_url(self, url: str) -> Dict[str, Any]:
+        return await self.extract_quiz(await self.download_pdf(url))
+
+    # Background jobs -------------------------------------------------------
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"pdf_quiz_job:{job_id}"
+
+    async def _update_job(self, job_id: str, **fields):
+        job = await cache_manager.get(self._job_key(job_id), use_near_cache=False) or {"job_id": job_id}
+        job.update(fields, updated_at=time.time())
+        await cache_manager.set(self._job_key(job_id), job, ttl=PDF_QUIZ_JOB_TTL_SECONDS)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Status is polled from any worker; always read the shared copy
+        return await cache_manager.get(self._job_key(job_id), use_near_cache=False)
+
+    async def submit_job(self, pdf_bytes: Optional[bytes] = None, url: Optional[str] = None) -> str:
+        """Start extraction in the background and return a job id to poll."""
+        job_id = uuid.uuid4().hex
+        await self._update_job(job_id, status=JOB_QUEUED, chunks_total=0, chunks_done=0, result=None, error=None)
+        task = asyncio.create_task(self._run_job(job_id, pdf_bytes, url))
+        self._jobs[job_id] = task
+        task.add_done_callback(lambda _: self._jobs.pop(job_id, None))
+        return job_id
+
+    async def _run_job(self, job_id: str, pdf_bytes: Optional[bytes], url: Optional[str]):
+        try:
+            await self._update_job(job_id, status=JOB_RUNNING)
+            if pdf_bytes is None:
+                pdf_bytes = await self.download_pdf(url)
+            quiz = await self.extract_quiz(pdf_bytes, job_id=job_id)
+            await self._update_job(job_id, status=JOB_COMPLETED, result=quiz)
+        except Exception as e:
+            print(f"❌ [PDF QUIZ] Job {job_id} failed: {e}")
+            await self._update_job(job_id, status=JOB_FAILED, error=str(e))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance (process pool starts on first PDF)
+pdf_quiz_pipeline = PDFQuizPipeline()
@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 
+from app.utils.metrics import CACHE_HITS, CACHE_MISSES
+
 
 def _normalize_text(value: str) -> str:
     """Lowercase, trim, and strip punctuation to make comparison resilient."""
@@ -35,9 +37,12 @@ class StageAwareCache:
     - Stage templates: curated responses per learning stage
     - Pattern cache: stores exact responses for repeated utterances
     - Phrase cache: quick responses for globally common phrases
+
+    Hits (per level) and misses are exported to /metrics under `name`.
     """
 
-    def __init__(self, ttl_seconds: int = 600):
+    def __init__(self, ttl_seconds: int = 600, name: str = "stage_aware"):
+        self.name = name
         self.ttl_seconds = ttl_seconds
         self.stage_templates: Dict[str, List[str]] = {
             "greeting": [
@@ -130,6 +135,7 @@ class StageAwareCache:
                 if expiry >= now:
                     self.stats["hits"] += 1
                     self.stats["pattern_hits"] += 1
+                    CACHE_HITS.inc(cache=self.name, level="pattern")
                     return PredictiveResult(
                         text=cached_text,
                         stage=stage,
@@ -144,6 +150,7 @@ class StageAwareCache:
                 cached_text, expiry = self.phrase_cache[normalized_input]
                 if expiry >= now:
                     self.stats["hits"] += 1
+                    CACHE_HITS.inc(cache=self.name, level="phrase")
                     return PredictiveResult(
                         text=cached_text,
                         stage=stage,
@@ -157,6 +164,7 @@ class StageAwareCache:
             if template_text:
                 self.stats["misses"] += 1
                 self.stats["template_hits"] += 1
+                CACHE_MISSES.inc(cache=self.name)
                 return PredictiveResult(
                     text=template_text,
                     stage=stage,
@@ -167,6 +175,7 @@ class StageAwareCache:
                 )
 
             self.stats["misses"] += 1
+            CACHE_MISSES.inc(cache=self.name)
             return None
 
     async def record_result(
@@ -1,5 +1,4 @@
-import os
-from openai import OpenAI
+from app.services.vendor_clients import LazyClient, get_openai_client
 import json
 import logging
 
@@ -7,8 +6,8 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
 
 async def assess_english_proficiency(text: str) -> int:
     """
@@ -0,0 +1,110 @@
+"""
+Prompt Template Registry
+
+Precompiled prompts for the feedback evaluators and the English-only tutor.
+Each template is split into:
+- a static prefix (instructions, rubric, JSON format, AI settings and safety
+  rules) that is compiled once per (stage, exercise, settings version,
+  safety version) and sent first as the system message, so identical
+  prefixes hit provider-side prompt caching
+- a small per-learner suffix (transcript, expected answers, topic) that is
+  formatted per call and sent as the user message
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# (static_text, settings, safety_settings) -> compiled system prompt
+PrefixDecorator = Callable[[str, Any, Any], str]
+
+
+# Settings managers hand out the same cached model instance until it is refreshed,
+# so fingerprints are memoized per instance (holding a reference keeps the id unique)
+_VERSION_MEMO_SIZE = 16
+_version_memo: "OrderedDict[int, Tuple[Any, str]]" = OrderedDict()
+_version_lock = threading.Lock()
+
+
+def settings_version(settings: Any) -> Optional[str]:
+    """Short fingerprint of a settings model, so edits in the admin panel get a new compiled prefix."""
+    if settings is None:
+        return None
+    memo = _version_memo.get(id(settings))
+    if memo is not None and memo[0] is settings:
+        return memo[1]
+    dumped = settings.model_dump_json() if hasattr(settings, "model_dump_json") else repr(settings)
+    version = hashlib.sha1(dumped.encode("utf-8")).hexdigest()[:12]
+    with _version_lock:
+        _version_memo[id(settings)] = (settings, version)
+        while len(_version_memo) > _VERSION_MEMO_SIZE:
+            _version_memo.popitem(last=False)
+    return version
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    static_prefix: str
+    suffix_template: str  # str.format() template for the per-learner part
+    decorate: Optional[PrefixDecorator] = None
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    key: Tuple[Hashable, ...]
+    system_prompt: str
+    suffix_template: str
+
+    def render_suffix(self, **fields: Any) -> str:
+        return self.suffix_template.format(**fields)
+
+    def messages(self, **fields: Any) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": self.render_suffix(**fields)},
+        ]
+
+
+class PromptRegistry:
+    """Registered templates plus a cache of compiled prefixes keyed by settings/safety version."""
+
+    def __init__(self):
+        self._templates: Dict[Tuple[Hashable, Hashable], PromptTemplate] = {}
+        self._compiled: Dict[Tuple[Hashable, ...], CompiledPrompt] = {}
+        self._lock = threading.Lock()
+        self.stats = {"compiled": 0, "hits": 0}
+
+    def register(self, stage: Hashable, exercise: Hashable, static_prefix: str, suffix_template: str,
+                 decorate: Optional[PrefixDecorator] = None):
+        self._templates[(stage, exercise)] = PromptTemplate(static_prefix.strip("\n"), suffix_template.strip("\n"), decorate)
+        # Drop stale compilations of a re-registered template
+        with self._lock:
+            for key in [k for k in self._compiled if k[:2] == (stage, exercise)]:
+                del self._compiled[key]
+
+    def has(self, stage: Hashable, exercise: Hashable) -> bool:
+        return (stage, exercise) in self._templates
+
+    def get(self, stage: Hashable, exercise: Hashable, settings: Any = None, safety_settings: Any = None) -> CompiledPrompt:
+        """Return the compiled prompt for this template and settings/safety version."""
+        key = (stage, exercise, settings_version(settings), settings_version(safety_settings))
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self.stats["hits"] += 1
+            return compiled
+
+        template = self._templates[(stage, exercise)]
+        system_prompt = template.static_prefix
+        if template.decorate is not None:
+            system_prompt = template.decorate(system_prompt, settings, safety_settings)
+        compiled = CompiledPrompt(key, system_prompt, template.suffix_template)
+        with self._lock:
+            self._compiled[key] = compiled
+        self.stats["compiled"] += 1
+        return compiled
+
+
+# Global registry (templates are registered by the modules that own them)
+prompt_registry = PromptRegistry()
@@ -1,13 +1,15 @@
 import json
 import uuid
+import asyncio
 from typing import Dict, List, Optional, Tuple
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
-from app.redis_client import redis_client
+from app.services.vendor_clients import LazyClient, get_openai_client
+from app.redis_client import async_redis
 import base64
 from app.services.tts import synthesize_speech_exercises
+from app.services.conversation_memory import conversation_memory, empty_memory_state
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
 
 class RoleplayAgent:
     def __init__(self):
@@ -31,7 +33,7 @@ class RoleplayAgent:
         """Get all available scenarios"""
         return list(self.scenarios.values())
     
-    def create_session(self, scenario: Dict) -> Tuple[str, str]:
+    async def create_session(self, scenario: Dict) -> Tuple[str, str]:
         """Create a new roleplay session and return session ID and initial prompt"""
         session_id = f"roleplay_{uuid.uuid4().hex}"
         
@@ -55,20 +57,19 @@ class RoleplayAgent:
         }
         
         # Store in Redis
-        redis_client.setex(session_id, 3600, json.dumps(initial_state))  # 1 hour expiry
+        await async_redis.set_json(session_id, initial_state, ex=3600)  # 1 hour expiry
         
         print(f"✅ [ROLEPLAY] Created session {session_id} for scenario {scenario['id']}")
         return session_id, scenario["initial_prompt"]
     
-    def update_session(self, session_id: str, user_input: str) -> Tuple[str, str, Optional[str]]:
+    async def update_session(self, session_id: str, user_input: str) -> Tuple[str, str, Optional[str]]:
         """Update session with user input and return AI response"""
         try:
             # Get session data from Redis
-            session_data_json = redis_client.get(session_id)
-            if not session_data_json:
+            session_data = await async_redis.get_json(session_id)
+            if not session_data:
                 return "", "error", "Session not found"
             
-            session_data = json.loads(session_data_json)
             scenario = self.get_scenario_by_id(session_data["scenario_id"])
             if not scenario:
                 return "", "error", "Scenario not found"
@@ -80,8 +81,9 @@ class RoleplayAgent:
                 "timestamp": "user_input"
             })
             
-            # Generate AI response
-            ai_response = self._generate_ai_response(session_data, user_input, scenario)
+            # Generate AI response (recent turns verbatim + summary of older ones)
+            memory_state = await self.get_memory_state(session_id)
+            ai_response = await asyncio.to_thread(self._generate_ai_response, session_data, user_input, scenario, memory_state)
             
             # Add AI response to history
             session_data["history"].append({
@@ -94,7 +96,14 @@ class RoleplayAgent:
             conversation_status = self._check_conversation_end(session_data, ai_response)
             
             # Update session in Redis
-            redis_client.setex(session_id, 3600, json.dumps(session_data))
+            await async_redis.set_json(session_id, session_data, ex=3600)
+            
+            # Fold aged-out turns into the summary off the critical path
+            loop = asyncio.get_running_loop()
+            conversation_memory.summarize_in_background(
+                session_data["history"], memory_state,
+                lambda new_state: asyncio.run_coroutine_threadsafe(self._save_memory_state(session_id, new_state), loop)
+            )
             
             print(f"✅ [ROLEPLAY] Updated session {session_id}, status: {conversation_status}")
             return ai_response, conversation_status, None
@@ -103,7 +112,8 @@ class RoleplayAgent:
             print(f"❌ [ROLEPLAY] Error updating session: {str(e)}")
             return "", "error", str(e)
     
-    def _generate_ai_response(self, session_data: Dict, user_input: str, scenario: Dict) -> str:
+    def _generate_ai_response(self, session_data: Dict, user_input: str, scenario: Dict,
+                              memory_state: Optional[Dict] = None) -> str:
         """Generate AI response based on scenario context and conversation history"""
         try:
             # Check if this is the first response to the user to make it brief and conclusive
@@ -138,7 +148,7 @@ Your role: {scenario['ai_character']}
 Expected keywords for the student to use: {', '.join(scenario['expected_keywords'])}
 
 Previous conversation:
-{self._format_conversation_history(session_data['history'])}
+{self._format_conversation_history(session_data['history'], memory_state)}
 
 Student's latest response: "{user_input}"
 
@@ -177,13 +187,29 @@ Respond as the {scenario['ai_character']}:
             print(f"❌ [ROLEPLAY] Error generating AI response: {str(e)}")
             return "I'm sorry, could you please repeat that?"
     
-    def _format_conversation_history(self, history: List[Dict]) -> str:
-        """Format conversation history for AI prompt"""
-        formatted = ""
-        for message in history[-6:]:  # Last 6 messages for context
-            role = "Student" if message["role"] == "user" else "AI"
-            formatted += f"{role}: {message['content']}\n"
-        return formatted
+    def _format_conversation_history(self, history: List[Dict], memory_state: Optional[Dict] = None) -> str:
+        """Format conversation history for AI prompt (bounded: summary + recent turns)"""
+        return conversation_memory.format(history, memory_state, user_label="Student", ai_label="AI")
+    
+    @staticmethod
+    def _memory_key(session_id: str) -> str:
+        return f"{session_id}:memory"
+    
+    async def get_memory_state(self, session_id: str) -> Dict:
+        """Rolling summary state for a session (kept under its own key so turns never overwrite it)"""
+        try:
+            memory_state = await async_redis.get_json(self._memory_key(session_id))
+            if memory_state:
+                return memory_state
+        except Exception as e:
+            print(f"⚠️ [ROLEPLAY] Error loading conversation memory: {str(e)}")
+        return empty_memory_state()
+    
+    async def _save_memory_state(self, session_id: str, memory_state: Dict):
+        # A slower, older summary update must not replace a newer one
+        if memory_state["summarized_count"] <= (await self.get_memory_state(session_id))["summarized_count"]:
+            return
+        await async_redis.set_json(self._memory_key(session_id), memory_state, ex=3600)
     
     def _check_conversation_end(self, session_data: Dict, ai_response: str) -> str:
         """Check if the conversation should end naturally"""
@@ -211,24 +237,23 @@ Respond as the {scenario['ai_character']}:
         
         return "continue"
     
-    def get_session_history(self, session_id: str) -> Optional[List[Dict]]:
+    async def get_session_history(self, session_id: str) -> Optional[List[Dict]]:
         """Get conversation history for a session"""
         try:
-            session_data_json = redis_client.get(session_id)
-            if not session_data_json:
+            session_data = await async_redis.get_json(session_id)
+            if not session_data:
                 return None
             
-            session_data = json.loads(session_data_json)
             return session_data.get("history", [])
             
         except Exception as e:
             print(f"❌ [ROLEPLAY] Error getting session history: {str(e)}")
             return None
     
-    def delete_session(self, session_id: str) -> bool:
+    async def delete_session(self, session_id: str) -> bool:
         """Delete a session from Redis"""
         try:
-            redis_client.delete(session_id)
+            await async_redis.delete(session_id, self._memory_key(session_id))
             print(f"✅ [ROLEPLAY] Deleted session {session_id}")
             return True
         except Exception as e:
@@ -0,0 +1,188 @@
+"""
+Semantic Index for Cached Tutor Replies
+
+Finds cached learner utterances that mean the same as a new one
+("I want to learn grammar" / "grammar please") without downloading a model:
+- embed(): signed feature hashing of the content words of an utterance and
+  their character trigrams into a fixed-size, unit-length float32 vector.
+  Filler words ("I", "want", "please", ...) are dropped so short and long
+  phrasings of one intent land close together; trigrams give partial
+  credit to inflections and STT misspellings. Cosine similarity is a dot
+  product
+- SemanticIndex: random-hyperplane LSH (several tables of a few bits each)
+  for candidate lookup, re-ranked by exact cosine. Indexes smaller than
+  LSH_SCAN_BELOW rows are scanned directly, which is cheaper than hashing
+- Signature: what must agree before a neighbour counts as the same
+  request - negation ("I don't want grammar"), numbers ("option 2" /
+  "option 3") and every word outside the tutor's intent vocabulary
+  (names, places, pronouns such as "my" / "your"). Cached replies are
+  shared between learners, so anything personal has to match exactly
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.services.predictive_cache import _normalize_text
+
+EMBED_DIM = 256
+LSH_TABLES = 8
+LSH_BITS = 6
+LSH_SCAN_BELOW = 256
+
+FILLER_WORDS = frozenset("""
+a about am an and are be can could do for go i i'd i'm id im in is it just know let let's lets like
+maybe me of ok okay on please really so some that the this to uh um want wanna would
+learn study practice talk start help with teach tell show explain
+""".split())
+# Words a learner uses to pick an activity; any other word (a name, a place, a
+# pronoun, an unusual subject) is personal and goes into the Signature
+INTENT_WORDS = frozenset("""
+grammar vocabulary word words new sentence sentences tense tenses verb verbs noun nouns adjective adjectives
+pronunciation speaking speak conversation conversations topic topics english listening reading writing
+lesson lessons exercise exercises easy easier hard harder simple basic beginner intermediate advanced level
+more something different another other next again repeat continue stop one yes yeah yep sure fine good
+great thanks thank option options choose choice pick select
+""".split())
+NEGATIONS = frozenset("""
+no not never nothing nope don't dont doesn't doesnt didn't didnt can't cant cannot won't wont
+isn't isnt aren't arent wasn't wasnt shouldn't wouldn't
+""".split())
+NUMBER_WORDS = {
+    "two": "2", "three": "3", "four": "4", "five": "5", "six": "6", "seven": "7", "eight": "8",
+    "nine": "9", "ten": "10", "first": "1", "second": "2", "third": "3", "fourth": "4", "fifth": "5",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+@dataclass(frozen=True)
+class Signature:
+    """Features two utterances must share to be treated as the same request"""
+    negated: bool
+    numbers: FrozenSet[str]
+    specific: FrozenSet[str]  # words outside FILLER_WORDS / INTENT_WORDS
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized words, with number words as digits ("the second option" -> the, 2, option)"""
+    return [NUMBER_WORDS.get(token, token) for token in _TOKEN_RE.findall(_normalize_text(text))]
+
+
+def signature(text: str) -> Signature:
+    tokens = tokenize(text)
+    return Signature(
+        negated=any(token in NEGATIONS for token in tokens),
+        numbers=frozenset(token for token in tokens if token.isdigit()),
+        specific=frozenset(token for token in tokens
+                           if token not in FILLER_WORDS and token not in INTENT_WORDS
+                           and token not in NEGATIONS and not token.isdigit()),
+    )
+
+
+def _hashed(feature: str, dim: int) -> Tuple[int, float]:
+    digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+def embed(text: str, dim: int = EMBED_DIM) -> Optional[np.ndarray]:
+    """Unit vector for text, or None when it has no content words to compare on"""
+    words = dict.fromkeys(token for token in tokenize(text)
+                          if (token not in FILLER_WORDS and len(token) > 1) or token.isdigit())
+    if not words:
+        return None
+    vector = np.zeros(dim, dtype=np.float32)
+    for word in words:
+        # The word itself and its trigrams carry equal weight, whatever the word's length
+        index, sign = _hashed(f"w:{word}", dim)
+        vector[index] += sign
+        padded = f"<{word}>"
+        trigrams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        for trigram in trigrams:
+            index, sign = _hashed(f"c:{trigram}", dim)
+            vector[index] += sign / len(trigrams) ** 0.5
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+@lru_cache(maxsize=4)
+def _hyperplanes(dim: int, tables: int, bits: int) -> np.ndarray:
+    # Fixed seed: every index (and every worker) hashes the same way
+    return np.random.default_rng(0).standard_normal((tables, bits, dim)).astype(np.float32)
+
+
+class SemanticIndex:
+    """Approximate nearest neighbours by cosine similarity over embed() vectors"""
+
+    def __init__(self, dim: int = EMBED_DIM, tables: int = LSH_TABLES, bits: int = LSH_BITS,
+                 scan_below: int = LSH_SCAN_BELOW):
+        self.dim = dim
+        self.scan_below = scan_below
+        self._planes = _hyperplanes(dim, tables, bits)
+        self._weights = 1 << np.arange(bits)
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._codes: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[int, Set[str]]] = [dict() for _ in range(tables)]
+        self._matrix: Optional[Tuple[List[str], np.ndarray]] = None  # rebuilt lazily after changes
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._vectors
+
+    def _bucket_codes(self, vector: np.ndarray) -> np.ndarray:
+        return ((self._planes @ vector) > 0).astype(np.int64) @ self._weights
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        self.remove(key)
+        codes = self._bucket_codes(vector)
+        self._vectors[key] = vector
+        self._codes[key] = codes
+        for table, code in zip(self._buckets, codes):
+            table.setdefault(int(code), set()).add(key)
+        self._matrix = None
+
+    def remove(self, key: str) -> None:
+        if self._vectors.pop(key, None) is None:
+            return
+        for table, code in zip(self._buckets, self._codes.pop(key)):
+            bucket = table.get(int(code))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[int(code)]
+        self._matrix = None
+
+    def clear(self) -> None:
+        self._vectors.clear()
+        self._codes.clear()
+        for table in self._buckets:
+            table.clear()
+        self._matrix = None
+
+    def search(self, vector: np.ndarray, k: int = 3) -> List[Tuple[str, float]]:
+        """Up to k nearest keys with their cosine similarity, best first"""
+        if not self._vectors:
+            return []
+        if len(self._vectors) < self.scan_below:
+            if self._matrix is None:
+                keys = list(self._vectors)
+                self._matrix = (keys, np.stack([self._vectors[key] for key in keys]))
+            keys, matrix = self._matrix
+        else:
+            candidates: Set[str] = set()
+            for table, code in zip(self._buckets, self._bucket_codes(vector)):
+                candidates |= table.get(int(code), set())
+            if not candidates:
+                return []
+            keys = list(candidates)
+            matrix = np.stack([self._vectors[key] for key in keys])
+        scores = matrix @ vector
+        best = np.argsort(-scores)[:k]
+        return [(keys[i], float(scores[i])) for i in best]
@@ -0,0 +1,160 @@
+"""
+Resumable Session State Store
+
+Keeps conversation websocket state outside the worker so a client that
+reconnects (common on mobile) can resume where it left off on any worker:
+- One Redis hash per session (one field per state key, JSON-encoded) with a
+  sliding TTL, written with a single pipeline per snapshot
+- In-memory fallback with the same TTL when Redis is unavailable
+- Opaque, URL-safe session tokens issued by the server
+- Fire-and-forget snapshots that are applied in order per session
+
+Environment:
+- SESSION_STATE_TTL: seconds a session stays resumable after its last turn (default: 1800)
+"""
+
+import asyncio
+import json
+import os
+import re
+import secrets
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.redis_client import RedisUnavailable, async_redis
+
+SESSION_STATE_TTL = int(os.getenv("SESSION_STATE_TTL", "1800"))
+MAX_MEMORY_SESSIONS = 5000
+
+_TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+def is_valid_token(token: Optional[str]) -> bool:
+    return bool(token) and bool(_TOKEN_PATTERN.match(token))
+
+
+class SessionStore:
+    """Session state keyed by (namespace, token): Redis hash with TTL, in-memory fallback"""
+
+    def __init__(self, ttl_seconds: int = SESSION_STATE_TTL, max_memory_sessions: int = MAX_MEMORY_SESSIONS):
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_sessions = max_memory_sessions
+        self._memory: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def new_token() -> str:
+        return secrets.token_urlsafe(24)
+
+    @staticmethod
+    def _key(namespace: str, token: str) -> str:
+        return f"session:{namespace}:{token}"
+
+    # --- Redis (shared async pool, one round trip per operation) ---
+
+    async def _redis_save(self, key: str, state: Dict[str, Any]):
+        def build(pipe):
+            pipe.delete(key)
+            if state:
+                pipe.hset(key, mapping={field: json.dumps(value) for field, value in state.items()})
+            pipe.expire(key, self.ttl_seconds)
+        await async_redis.pipeline(build, transaction=True)
+
+    async def _redis_load(self, key: str) -> Optional[Dict[str, Any]]:
+        def build(pipe):
+            pipe.hgetall(key)
+            pipe.expire(key, self.ttl_seconds)
+        fields, _ = await async_redis.pipeline(build)
+        if not fields:
+            return None
+        return {field: json.loads(value) for field, value in fields.items()}
+
+    # --- In-memory fallback ---
+
+    def _memory_save(self, key: str, state: Dict[str, Any]):
+        self._memory.pop(key, None)
+        self._memory[key] = (time.monotonic() + self.ttl_seconds, state)
+        while len(self._memory) > self.max_memory_sessions:
+            self._memory.pop(next(iter(self._memory)))
+
+    def _memory_load(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, state = entry
+        if expires_at < time.monotonic():
+            self._memory.pop(key, None)
+            return None
+        self._memory_save(key, state)
+        return dict(state)
+
+    # --- Public API ---
+
+    async def save(self, namespace: str, token: str, state: Dict[str, Any]):
+        key = self._key(namespace, token)
+        try:
+            await self._redis_save(key, state)
+            self._memory.pop(key, None)
+            return
+        except RedisUnavailable:
+            pass
+        except Exception as e:
+            print(f"⚠️ [SESSION] Redis error, keeping session in memory: {e}")
+        self._memory_save(key, state)
+
+    async def load(self, namespace: str, token: str) -> Optional[Dict[str, Any]]:
+        if not is_valid_token(token):
+            return None
+        key = self._key(namespace, token)
+        pending = self._pending.get(key)
+        if pending is not None:
+            # A snapshot from this worker is still in flight; read after it lands
+            await asyncio.wait([pending])
+        try:
+            state = await self._redis_load(key)
+            if state is not None:
+                return state
+        except RedisUnavailable:
+            pass
+        except Exception as e:
+            print(f"⚠️ [SESSION] Redis error, checking memory: {e}")
+        return self._memory_load(key)
+
+    async def delete(self, namespace: str, token: str):
+        key = self._key(namespace, token)
+        self._memory.pop(key, None)
+        await async_redis.delete(key)
+
+    def snapshot(self, namespace: str, token: str, state: Dict[str, Any],
+                 fields: Optional[Iterable[str]] = None) -> asyncio.Task:
+        """
+        Save a copy of state (optionally only `fields`) without blocking the turn.
+        Snapshots of the same session are chained so the last one always wins.
+        """
+        if fields is not None:
+            state = {field: state.get(field) for field in fields}
+        state = json.loads(json.dumps(state, default=str))  # detach from the live dict
+        key = self._key(namespace, token)
+        previous = self._pending.get(key)
+
+        async def run():
+            if previous is not None:
+                await asyncio.wait([previous])
+            try:
+                await self.save(namespace, token, state)
+            except Exception as e:
+                print(f"❌ [SESSION] Failed to snapshot {namespace} session: {e}")
+
+        task = asyncio.create_task(run())
+        self._pending[key] = task
+
+        def _done(finished: asyncio.Task):
+            if self._pending.get(key) is finished:
+                self._pending.pop(key, None)
+
+        task.add_done_callback(_done)
+        return task
+
+
+# Global instance
+session_store = SessionStore()
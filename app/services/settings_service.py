@@ -0,0 +1,218 @@
+"""
+Settings Service (stale-while-revalidate with push invalidation)
+
+Serves admin-managed settings rows (AI tutor settings, safety & ethics
+settings) without ever blocking a request on the database once warm:
+- Values are refreshed in the background shortly before they expire
+  (refresh-ahead), and expired values keep being served while one refresh
+  runs (stale-while-revalidate, single-flight)
+- Changes are pushed across workers over Redis pub/sub: publishing on
+  SETTINGS_CHANNEL makes every worker refetch immediately instead of
+  waiting for its TTL
+- Every accepted change bumps a per-service version number; downstream
+  caches use settings_cache_version() as part of their keys
+
+Environment:
+- SETTINGS_REFRESH_SECONDS: age at which settings are considered expired (default: 300)
+- SETTINGS_MAX_STALE_SECONDS: how long expired settings may still be served (default: 600)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Callable, Dict, Generic, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.redis_client import async_redis
+from app.supabase_client import supabase
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_REFRESH_SECONDS = float(os.getenv("SETTINGS_REFRESH_SECONDS", "300"))
+SETTINGS_MAX_STALE_SECONDS = float(os.getenv("SETTINGS_MAX_STALE_SECONDS", "600"))
+SETTINGS_CHANNEL = "settings:changed"
+REFRESH_AHEAD_RATIO = 0.8  # refresh in the background at 80% of the TTL
+LISTENER_RETRY_SECONDS = 5
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class SettingsService(Generic[M]):
+    """One settings row (first row of `table`) cached with refresh-ahead, stale serving and a version."""
+
+    def __init__(self, name: str, table: str, model: Type[M], default_factory: Callable[[], M],
+                 refresh_seconds: float = SETTINGS_REFRESH_SECONDS,
+                 max_stale_seconds: float = SETTINGS_MAX_STALE_SECONDS):
+        self.name = name
+        self.table = table
+        self.model = model
+        self.default_factory = default_factory
+        self.refresh_seconds = refresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.version = 0
+        self._value: Optional[M] = None
+        self._fingerprint: Optional[str] = None
+        self._fetched_at = 0.0
+        self._flight = SingleFlight(f"settings:{name}")
+        self.stats: Dict[str, int] = {"hits": 0, "stale_served": 0, "fetches": 0, "fetch_errors": 0,
+                                      "invalidations": 0, "changes": 0}
+
+    # --- Reads ---
+
+    def _age(self) -> float:
+        return time.monotonic() - self._fetched_at
+
+    def peek(self) -> Optional[M]:
+        """Current value without I/O while it may still be served, otherwise None."""
+        if self._value is not None and self._age() < self.refresh_seconds + self.max_stale_seconds:
+            return self._value
+        return None
+
+    async def get(self) -> M:
+        """Settings for this request; only the very first (or long-expired) read waits on the database."""
+        value = self.peek()
+        if value is None:
+            logger.info(f"Cache miss for {self.name} settings, fetching from the database...")
+            return await self._flight.do(self.name, self._refresh)
+
+        age = self._age()
+        if age < self.refresh_seconds * REFRESH_AHEAD_RATIO:
+            self.stats["hits"] += 1
+            return value
+        # Near or past expiry: hand out the current value while one refresh runs
+        if age >= self.refresh_seconds:
+            self.stats["stale_served"] += 1
+        return await self._flight.do(self.name, self._refresh, stale=value)
+
+    # --- Refresh ---
+
+    async def _refresh(self) -> M:
+        """Fetch the row off the event loop; database errors return defaults without caching them."""
+        self.stats["fetches"] += 1
+        try:
+            # The supabase-python execute() method is synchronous; run it in a worker thread
+            query = supabase.from_(self.table).select("*").limit(1)
+            response = await asyncio.to_thread(query.execute)
+        except Exception as e:
+            self.stats["fetch_errors"] += 1
+            logger.critical(f"Database error fetching {self.name} settings: {e}. Falling back to defaults for this request.")
+            return self._value if self._value is not None else self.default_factory()
+
+        if not response.data:
+            logger.warning(f"`{self.table}` table is empty. Caching and using default settings.")
+            return self._store(self.default_factory())
+        try:
+            return self._store(self.model.model_validate(response.data[0]))
+        except ValidationError as e:
+            # Don't cache invalid rows so a fix in the admin panel is picked up on the next read
+            self.stats["fetch_errors"] += 1
+            logger.error(f"Data validation error for {self.name} settings from DB: {e}. Falling back to defaults.")
+            return self._value if self._value is not None else self.default_factory()
+
+    def _store(self, value: M) -> M:
+        fingerprint = value.model_dump_json()
+        if fingerprint != self._fingerprint:
+            self.version += 1
+            self.stats["changes"] += 1
+            self._fingerprint = fingerprint
+            self._value = value
+            logger.info(f"Loaded {self.name} settings (version {self.version}).")
+        self._fetched_at = time.monotonic()
+        return self._value
+
+    async def invalidate(self) -> M:
+        """
+        Refetch now (e.g. after a change notification). Reads keep getting the
+        old value until it lands, and keep getting it up to max-stale if the
+        refetch fails.
+        """
+        self.stats["invalidations"] += 1
+        return await self._flight.do(self.name, self._refresh)
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "version": self.version,
+            "age_seconds": round(self._age(), 1) if self._value is not None else None,
+            **self.stats,
+        }
+
+
+# --- Cross-worker invalidation ---
+
+async def publish_settings_change(name: Optional[str] = None) -> bool:
+    """Tell every worker to refetch settings `name` (or all of them). Returns False if Redis is unavailable."""
+    try:
+        await async_redis.call(lambda client: client.publish(SETTINGS_CHANNEL, name or "*"))
+        return True
+    except Exception as e:
+        print(f"⚠️ [SETTINGS] Could not publish settings change, other workers will refresh on TTL: {e}")
+        return False
+
+
+async def refresh_local_settings(name: Optional[str] = None):
+    """Refetch settings `name` (or all of them) on this worker."""
+    targets = [s for s in _services.values() if (name or "*") in ("*", s.name)]
+    for service in targets:
+        await service.invalidate()
+        print(f"🔄 [SETTINGS] {service.name} settings invalidated (version {service.version})")
+
+
+async def _listen_for_changes():
+    while True:
+        if not async_redis.breaker.allow():
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+            continue
+        pubsub = async_redis.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(SETTINGS_CHANNEL)
+            async_redis.breaker.record_success()
+            async for message in pubsub.listen():
+                data = message.get("data")
+                await refresh_local_settings(data.decode() if isinstance(data, bytes) else str(data))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            async_redis.breaker.record_failure()
+            logger.warning(f"Settings change listener disconnected: {e}")
+        finally:
+            await pubsub.aclose()
+        await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+
+_services: Dict[str, SettingsService] = {}
+_listener_task: Optional[asyncio.Task] = None
+
+
+def register_settings_service(service: SettingsService) -> SettingsService:
+    _services[service.name] = service
+    return service
+
+
+def start_settings_listener():
+    """Subscribe to change notifications (call once the event loop is running)."""
+    global _listener_task
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.create_task(_listen_for_changes())
+
+
+async def stop_settings_listener():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _listener_task = None
+
+
+def settings_status() -> Dict[str, Dict[str, object]]:
+    return {name: service.status() for name, service in _services.items()}
+
+
+def settings_cache_version() -> str:
+    """Combined version of all settings services, for use in downstream cache keys."""
+    return ".".join(f"{name}{service.version}" for name, service in sorted(_services.items()))
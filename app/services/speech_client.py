@@ -0,0 +1,193 @@
+"""
+Shared Google Cloud Speech Clients
+
+Keeps one Speech client (and therefore one gRPC channel and one credential load)
+per process instead of constructing a new `speech.SpeechClient()` per request:
+- Sync client for thread-pool callers (legacy unary `recognize` helpers)
+- Async client per event loop for unary and streaming recognition
+- GoogleStreamingSession: streaming recognition fed directly from websocket
+  audio frames, emitting interim transcripts while the learner is still talking
+"""
+
+import asyncio
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from google.cloud import speech
+
+from app.services.vendor_clients import google_client_kwargs
+
+# Google rejects StreamingRecognizeRequest audio payloads above ~25KB
+STREAMING_MAX_CHUNK_BYTES = 25 * 1024
+# Google caps a single streaming recognition at ~5 minutes; a learner turn is far shorter
+STREAMING_TIMEOUT_SECONDS = 120
+ENGLISH_LANGUAGE_PREFIX = "en"
+
+_sync_client: Optional[speech.SpeechClient] = None
+_sync_client_lock = threading.Lock()
+
+# grpc.aio channels are bound to the loop that created them, so keep one client per loop
+_async_clients: Dict[int, speech.SpeechAsyncClient] = {}
+
+
+def get_speech_client() -> speech.SpeechClient:
+    """Return the process-wide sync Speech client (thread-safe, created on first use)."""
+    global _sync_client
+    if _sync_client is None:
+        with _sync_client_lock:
+            if _sync_client is None:
+                print("🔥 [SPEECH] Creating shared Google Speech client")
+                from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+                _sync_client = speech.SpeechClient(**google_client_kwargs(SpeechGrpcTransport))
+    return _sync_client
+
+
+def get_async_speech_client() -> speech.SpeechAsyncClient:
+    """Return the shared async Speech client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(id(loop))
+    if client is None:
+        print("🔥 [SPEECH] Creating shared async Google Speech client")
+        from google.cloud.speech_v1.services.speech.transports import SpeechGrpcAsyncIOTransport
+        client = speech.SpeechAsyncClient(**google_client_kwargs(SpeechGrpcAsyncIOTransport, aio=True))
+        _async_clients[id(loop)] = client
+    return client
+
+
+async def close_speech_clients():
+    """Close shared channels (call on server shutdown)."""
+    global _sync_client
+    loop = asyncio.get_running_loop()
+    client = _async_clients.pop(id(loop), None)
+    if client is not None:
+        await client.transport.close()
+    if _sync_client is not None:
+        _sync_client.transport.close()
+        _sync_client = None
+    print("🔌 [SPEECH] Google Speech clients closed")
+
+
+def build_recognition_config(
+    language_code: str,
+    sample_rate_hertz: int,
+    alternative_language_codes: Optional[List[str]] = None,
+    encoding: speech.RecognitionConfig.AudioEncoding = speech.RecognitionConfig.AudioEncoding.LINEAR16,
+) -> speech.RecognitionConfig:
+    """Build a RecognitionConfig shared by unary and streaming recognition."""
+    return speech.RecognitionConfig(
+        encoding=encoding,
+        language_code=language_code,
+        sample_rate_hertz=sample_rate_hertz,
+        alternative_language_codes=alternative_language_codes or [],
+    )
+
+
+class GoogleStreamingSession:
+    """
+    Streaming recognition for one learner turn.
+
+    Audio frames are pushed as they arrive from the websocket (raw LINEAR16 PCM
+    by default); interim transcripts are delivered through `on_interim` and the
+    final transcript is returned by `finish()`.
+    """
+
+    def __init__(
+        self,
+        *,
+        language_code: str = "ur-PK",
+        sample_rate_hertz: int = 16000,
+        alternative_language_codes: Optional[List[str]] = None,
+        encoding: speech.RecognitionConfig.AudioEncoding = speech.RecognitionConfig.AudioEncoding.LINEAR16,
+        on_interim: Optional[Callable[[str], Awaitable[None]]] = None,
+    ):
+        self.config = build_recognition_config(
+            language_code=language_code,
+            sample_rate_hertz=sample_rate_hertz,
+            alternative_language_codes=alternative_language_codes,
+            encoding=encoding,
+        )
+        self.default_language_code = language_code
+        self.on_interim = on_interim
+        self._audio_queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._final_segments: List[str] = []
+        self._detected_language: Optional[str] = None
+        self.bytes_received = 0
+
+    async def start(self):
+        """Open the stream on the shared async client."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def push_audio(self, frame: bytes):
+        """Feed one websocket audio frame into the recognizer."""
+        if not frame:
+            return
+        self.bytes_received += len(frame)
+        for offset in range(0, len(frame), STREAMING_MAX_CHUNK_BYTES):
+            self._audio_queue.put_nowait(frame[offset:offset + STREAMING_MAX_CHUNK_BYTES])
+
+    async def finish(self) -> dict:
+        """
+        Close the audio stream and wait for the final transcript.
+
+        Returns:
+            dict: {"text", "language_code", "is_english"} (same keys as the ElevenLabs helpers)
+        """
+        self._audio_queue.put_nowait(None)
+        if self._task is not None:
+            await self._task
+        language_code = self._detected_language or self.default_language_code
+        return {
+            "text": " ".join(self._final_segments).strip(),
+            "language_code": language_code,
+            "is_english": language_code.lower().startswith(ENGLISH_LANGUAGE_PREFIX),
+        }
+
+    async def abort(self):
+        """Cancel the stream without waiting for results (client went away)."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _requests(self) -> AsyncIterator[speech.StreamingRecognizeRequest]:
+        yield speech.StreamingRecognizeRequest(
+            streaming_config=speech.StreamingRecognitionConfig(
+                config=self.config,
+                interim_results=True,
+            )
+        )
+        while True:
+            chunk = await self._audio_queue.get()
+            if chunk is None:
+                return
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    async def _run(self):
+        client = get_async_speech_client()
+        responses = await client.streaming_recognize(
+            requests=self._requests(),
+            timeout=STREAMING_TIMEOUT_SECONDS,
+        )
+        async for response in responses:
+            pending_segments: List[str] = []
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                transcript = result.alternatives[0].transcript.strip()
+                if result.language_code:
+                    self._detected_language = result.language_code
+                if result.is_final:
+                    self._final_segments.append(transcript)
+                else:
+                    pending_segments.append(transcript)
+
+            interim_text = " ".join(self._final_segments + pending_segments).strip()
+            if self.on_interim and interim_text:
+                try:
+                    await self.on_interim(interim_text)
+                except Exception as e:
+                    print(f"⚠️ [SPEECH] Interim transcript callback failed: {e}")
@@ -0,0 +1,109 @@
+"""
+Startup State and Background Warm-up
+
+Lets a worker accept traffic as soon as its essentials are loaded and warm
+everything else in the background:
+- "starting": the startup hook is still running (readiness probe fails)
+- "accepting": essentials are loaded; requests are served, some of them may
+  pay a first-use cost (SDK import, cold connection, model load)
+- "warm": every background warm-up task has finished
+
+Heavy dependencies are imported on first use (see vendor_clients.LazyClient);
+warm-up tasks registered here just make that first use happen before a
+learner's request does. Failed warm-ups are reported but never block
+traffic, since each component also initializes lazily.
+
+Environment:
+- STARTUP_WARM_WHISPER: also load the Whisper scoring model in the background (default: false)
+"""
+
+import asyncio
+import inspect
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+STARTUP_WARM_WHISPER = os.getenv("STARTUP_WARM_WHISPER", "false").lower() == "true"
+
+WarmUp = Callable[[], Union[Awaitable[Any], Any]]
+
+
+class StartupState:
+    """Readiness phases plus the status of each background warm-up task"""
+
+    def __init__(self):
+        self.created_at = time.monotonic()
+        self.accepting_at: Optional[float] = None
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def accepting(self) -> bool:
+        return self.accepting_at is not None
+
+    @property
+    def warm(self) -> bool:
+        return self.accepting and all(c["status"] != "pending" for c in self.components.values())
+
+    @property
+    def phase(self) -> str:
+        if not self.accepting:
+            return "starting"
+        return "warm" if self.warm else "accepting"
+
+    def mark_accepting(self):
+        if self.accepting_at is None:
+            self.accepting_at = time.monotonic()
+            print(f"✅ [STARTUP] Accepting traffic after {self.accepting_at - self.created_at:.2f}s")
+
+    async def _run(self, name: str, fn: WarmUp):
+        component = self.components[name]
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(fn):
+                await fn()
+            else:
+                # Sync warm-ups import SDKs or do blocking I/O; keep them off the event loop
+                await asyncio.to_thread(fn)
+            component["status"] = "ok"
+        except Exception as e:
+            component["status"] = "failed"
+            component["error"] = str(e)
+            print(f"⚠️ [STARTUP] Warm-up '{name}' failed (will initialize on first use): {e}")
+        finally:
+            component["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            if self.warm:
+                print(f"🔥 [STARTUP] Fully warm after {time.monotonic() - self.created_at:.2f}s")
+
+    def warm_in_background(self, name: str, fn: WarmUp) -> asyncio.Task:
+        """Run fn (async, or sync in a worker thread) without holding up startup."""
+        self.components[name] = {"status": "pending"}
+        task = asyncio.create_task(self._run(name, fn))
+        self._tasks[name] = task
+        return task
+
+    async def wait_until_warm(self, timeout: Optional[float] = None) -> bool:
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        return self.warm
+
+    def readiness(self) -> Dict[str, Any]:
+        accepting_after = (self.accepting_at - self.created_at) if self.accepting else None
+        return {
+            "status": self.phase,
+            "accepting": self.accepting,
+            "warm": self.warm,
+            "accepting_after_seconds": round(accepting_after, 2) if accepting_after is not None else None,
+            "uptime_seconds": round(time.monotonic() - self.created_at, 1),
+            "components": self.components,
+        }
+
+    async def shutdown(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+
+# Global instance
+startup_state = StartupState()
@@ -0,0 +1,261 @@
+"""
+Structured Output Layer for GPT Evaluators
+
+One parsing path for evaluator replies instead of per-evaluator regex +
+json.loads + key checks:
+- Requests a strict JSON schema (OpenAI structured outputs) generated from
+  the evaluator's Pydantic model
+- Validates the reply into that model (scores are rounded and clamped)
+- Salvages truncated or wrapped JSON (code fences, trailing commentary,
+  replies cut off by max_tokens) down to the last complete field
+- Re-asks only for the fields that are still missing or invalid, then
+  falls back to the evaluator's defaults for whatever is left
+- Counts outcomes per evaluator (see get_parse_stats)
+
+Environment:
+- STRUCTURED_OUTPUT_MODE: "json_schema" (default), "json_object" or "off"
+- STRUCTURED_OUTPUT_RETRY: re-ask for missing fields (default: true)
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+STRUCTURED_OUTPUT_MODE = os.getenv("STRUCTURED_OUTPUT_MODE", "json_schema").lower()
+STRUCTURED_OUTPUT_RETRY = os.getenv("STRUCTURED_OUTPUT_RETRY", "true").lower() == "true"
+RETRY_MAX_TOKENS = 400
+
+# Outcome counters: ok / salvaged / retried / partial / failed
+_parse_stats: Dict[str, Counter] = {}
+_stats_lock = threading.Lock()
+_schema_cache: Dict[Tuple[Type[BaseModel], Optional[Tuple[str, ...]]], Dict[str, Any]] = {}
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _record(evaluator: str, outcome: str):
+    with _stats_lock:
+        _parse_stats.setdefault(evaluator, Counter())[outcome] += 1
+
+
+def get_parse_stats() -> Dict[str, Dict[str, int]]:
+    """Snapshot of parse outcomes per evaluator."""
+    with _stats_lock:
+        return {name: dict(counts) for name, counts in _parse_stats.items()}
+
+
+def reset_parse_stats():
+    with _stats_lock:
+        _parse_stats.clear()
+
+
+# --- Schema generation ---
+
+def _make_strict(node: Any) -> Any:
+    """Strict mode needs every property required, no extra keys and no defaults."""
+    if isinstance(node, dict):
+        node = {k: _make_strict(v) for k, v in node.items() if k != "default"}
+        if node.get("type") == "object" and "properties" in node:
+            node["required"] = list(node["properties"].keys())
+            node["additionalProperties"] = False
+    elif isinstance(node, list):
+        node = [_make_strict(v) for v in node]
+    return node
+
+
+def strict_json_schema(schema: Type[BaseModel], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Strict JSON schema for a model, optionally limited to a subset of its fields."""
+    key = (schema, tuple(fields) if fields else None)
+    cached = _schema_cache.get(key)
+    if cached is None:
+        cached = _make_strict(schema.model_json_schema())
+        if fields:
+            cached["properties"] = {k: v for k, v in cached["properties"].items() if k in fields}
+            cached["required"] = list(cached["properties"].keys())
+        _schema_cache[key] = cached
+    return cached
+
+
+def response_format_for(schema: Type[BaseModel], fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    if STRUCTURED_OUTPUT_MODE == "off":
+        return None
+    if STRUCTURED_OUTPUT_MODE == "json_object":
+        return {"type": "json_object"}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__ + ("_fields" if fields else ""),
+            "strict": True,
+            "schema": deepcopy(strict_json_schema(schema, fields)),
+        },
+    }
+
+
+# --- Parsing and salvage ---
+
+def salvage_json(text: str) -> Tuple[Optional[dict], bool]:
+    """
+    Parse the first JSON object in text. Returns (data, salvaged).
+
+    Complete objects are decoded as-is (ignoring anything around them). A
+    truncated object is cut back to its last complete member and closed, so
+    '{"score": 80, "feedback": "Good jo' yields {"score": 80}.
+    """
+    if not text:
+        return None, False
+    start = text.find("{")
+    if start == -1:
+        return None, False
+
+    try:
+        data, _ = json.JSONDecoder().raw_decode(text, start)
+        if isinstance(data, dict):
+            return data, False
+    except json.JSONDecodeError:
+        pass
+
+    # Walk the text once, remembering where a cut leaves a valid prefix
+    cuts: List[Tuple[int, str]] = []  # (end index, closers needed)
+    stack: List[str] = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+            cuts.append((i + 1, "".join(reversed(stack))))
+        elif ch in "}]":
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                break
+            cuts.append((i + 1, "".join(reversed(stack))))
+        elif ch == ",":
+            cuts.append((i, "".join(reversed(stack))))
+
+    for end, closers in reversed(cuts):
+        try:
+            data = json.loads(text[start:end] + closers)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and data:
+            return data, True
+    return None, False
+
+
+def validate_partial(schema: Type[BaseModel], data: dict) -> Tuple[Optional[BaseModel], dict, List[str]]:
+    """
+    Validate data into schema. Returns (model or None, valid fields, fields to re-ask).
+    Invalid fields are dropped so a retry only has to supply them.
+    """
+    try:
+        return schema.model_validate(data), data, []
+    except ValidationError as e:
+        bad = []
+        for error in e.errors():
+            if error["loc"] and error["loc"][0] not in bad:
+                bad.append(error["loc"][0])
+        valid = {k: v for k, v in data.items() if k in schema.model_fields and k not in bad}
+        return None, valid, [f for f in schema.model_fields if f in bad]
+
+
+def _content_of(response) -> Tuple[str, Optional[str]]:
+    choice = response.choices[0]
+    message = choice.message
+    if getattr(message, "refusal", None):
+        return "", "refusal"
+    return (message.content or "").strip(), getattr(choice, "finish_reason", None)
+
+
+def _create(client, model: str, messages: List[Dict[str, str]], temperature: float,
+            max_tokens: Optional[int], response_format: Optional[Dict[str, Any]]):
+    kwargs: Dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+    if max_tokens:
+        kwargs["max_tokens"] = max_tokens
+    if response_format:
+        kwargs["response_format"] = response_format
+    return client.chat.completions.create(**kwargs)
+
+
+def _retry_missing_fields(client, evaluator: str, schema: Type[BaseModel], messages: List[Dict[str, str]],
+                          raw_content: str, fields: List[str], model: str, temperature: float) -> dict:
+    """Ask only for the missing/invalid fields, continuing the original conversation."""
+    retry_messages = list(messages) + [
+        {"role": "assistant", "content": raw_content or "{}"},
+        {"role": "user", "content": (
+            "Your JSON was incomplete or invalid. Reply with ONLY a JSON object "
+            f"containing these keys: {', '.join(fields)}"
+        )},
+    ]
+    try:
+        response = _create(client, model, retry_messages, temperature, RETRY_MAX_TOKENS,
+                           response_format_for(schema, fields))
+        retry_content, _ = _content_of(response)
+        data, _ = salvage_json(retry_content)
+        return {k: v for k, v in (data or {}).items() if k in fields}
+    except Exception:
+        logger.exception("structured.retry.failed", evaluator=evaluator)
+        return {}
+
+
+def run_structured_evaluation(client, evaluator: str, schema: Type[BaseModel], messages: List[Dict[str, str]],
+                              fallback: dict, model: str = "gpt-4o-mini", temperature: float = 0.3,
+                              max_tokens: Optional[int] = None) -> dict:
+    """
+    Run an evaluator prompt and return its validated result as a dict.
+
+    API errors on the main request propagate to the caller. Parse problems
+    never do: the reply is salvaged, missing fields are re-asked once, and
+    fields that are still missing come from `fallback`.
+    """
+    response = _create(client, model, messages, temperature, max_tokens, response_format_for(schema))
+    raw_content, finish_reason = _content_of(response)
+    logger.debug("structured.response", evaluator=evaluator, output_chars=len(raw_content),
+                 finish_reason=finish_reason)
+
+    data, salvaged = salvage_json(raw_content)
+    result, valid, missing = validate_partial(schema, data or {})
+    if result is not None:
+        _record(evaluator, "salvaged" if salvaged else "ok")
+        logger.debug("structured.parsed", evaluator=evaluator, salvaged=salvaged)
+        return result.model_dump()
+
+    logger.warning("structured.incomplete", evaluator=evaluator, missing=missing, finish_reason=finish_reason)
+    if STRUCTURED_OUTPUT_RETRY and finish_reason != "refusal":
+        merged = {**valid, **_retry_missing_fields(client, evaluator, schema, messages, raw_content,
+                                                   missing, model, temperature)}
+        result, valid, missing = validate_partial(schema, merged)
+        if result is not None:
+            _record(evaluator, "retried")
+            logger.info("structured.retried", evaluator=evaluator)
+            return result.model_dump()
+
+    # Keep whatever the model did answer; defaults only fill the gaps
+    result, _, _ = validate_partial(schema, {**fallback, **valid})
+    if valid and result is not None:
+        _record(evaluator, "partial")
+        logger.warning("structured.partial", evaluator=evaluator, defaulted=missing)
+        return result.model_dump()
+
+    _record(evaluator, "failed")
+    logger.error("structured.failed", evaluator=evaluator, output_chars=len(raw_content))
+    return dict(fallback)
@@ -1,14 +1,18 @@
-from elevenlabs import ElevenLabs
 from google.cloud import speech
 from pydub import AudioSegment
+import asyncio
 import base64
 import io
 from fastapi import HTTPException
-from app.config import ELEVEN_API_KEY
-from elevenlabs import ElevenLabs
+from app.services.speech_client import (
+    build_recognition_config,
+    get_async_speech_client,
+    get_speech_client,
+)
+from app.services.vendor_clients import LazyClient, get_elevenlabs_client, google_slot, google_sync_slot
 import re
-#api key
-elevenlabs = ElevenLabs(api_key=ELEVEN_API_KEY)
+# Shared client on the pre-warmed ElevenLabs pool (see vendor_clients.py)
+elevenlabs = LazyClient(get_elevenlabs_client)
 
 def transcribe_audio_bytes_eng_only(audio_bytes: bytes) -> dict:
     """
@@ -138,7 +142,8 @@ def is_english_input(transcription_result: dict) -> bool:
     return transcription_result.get("is_english", False)
 
 
-def transcribe_audio_bytes(audio_bytes: bytes, language_code: str = "ur-PK") -> str:
+def _convert_to_linear16_wav(audio_bytes: bytes) -> tuple[bytes, int]:
+    """Convert any supported upload to mono 16-bit WAV for Google Speech; returns (wav_bytes, frame_rate)."""
     try:
         # Allow pydub to auto-detect format
         audio_segment = AudioSegment.from_file(io.BytesIO(audio_bytes))
@@ -149,29 +154,35 @@ def transcribe_audio_bytes(audio_bytes: bytes, language_code: str = "ur-PK") ->
         buffer = io.BytesIO()
         # Export as WAV for Google Speech API, as it's a widely supported format
         mono_audio_segment.export(buffer, format="wav")
-        mono_audio_bytes = buffer.getvalue()
+        return buffer.getvalue(), mono_audio_segment.frame_rate
 
     except Exception as e:
         print(f"❌ Pydub Error converting audio: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Failed to process audio file: {str(e)}")
 
+
+def _extract_google_transcript(response) -> str:
+    if not response.results or not response.results[0].alternatives:
+        print("❌ Google Speech API: No transcription results.")
+        raise HTTPException(status_code=400, detail="No transcription received from speech API.")
+    return response.results[0].alternatives[0].transcript
+
+
+def transcribe_audio_bytes(audio_bytes: bytes, language_code: str = "ur-PK") -> str:
+    mono_audio_bytes, frame_rate = _convert_to_linear16_wav(audio_bytes)
+
     try:
-        client = speech.SpeechClient()
+        # Shared client: reuses one gRPC channel instead of reconnecting per call
+        client = get_speech_client()
         audio = speech.RecognitionAudio(content=mono_audio_bytes)
-        config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16, # This matches WAV format
+        config = build_recognition_config(
             language_code=language_code, # Use the provided language_code parameter
-            sample_rate_hertz=mono_audio_segment.frame_rate # Use frame rate from converted audio
+            sample_rate_hertz=frame_rate # Use frame rate from converted audio
         )
 
-        response = client.recognize(config=config, audio=audio)
-        
-        if not response.results or not response.results[0].alternatives:
-            print("❌ Google Speech API: No transcription results.")
-            raise HTTPException(status_code=400, detail="No transcription received from speech API.")
-            
-        transcript = response.results[0].alternatives[0].transcript
-        return transcript
+        with google_sync_slot():
+            response = client.recognize(config=config, audio=audio)
+        return _extract_google_transcript(response)
         
     except HTTPException as e: # Re-raise HTTPException
         raise e
@@ -179,6 +190,32 @@ def transcribe_audio_bytes(audio_bytes: bytes, language_code: str = "ur-PK") ->
         print(f"❌ Google Speech API Error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Speech-to-text service error: {str(e)}")
 
+
+async def transcribe_audio_bytes_async(audio_bytes: bytes, language_code: str = "ur-PK") -> str:
+    """
+    Async variant of transcribe_audio_bytes for use directly in async routes.
+    Audio conversion runs in a worker thread; recognition uses the shared async client.
+    """
+    mono_audio_bytes, frame_rate = await asyncio.to_thread(_convert_to_linear16_wav, audio_bytes)
+
+    try:
+        client = get_async_speech_client()
+        audio = speech.RecognitionAudio(content=mono_audio_bytes)
+        config = build_recognition_config(
+            language_code=language_code,
+            sample_rate_hertz=frame_rate
+        )
+
+        async with google_slot():
+            response = await client.recognize(config=config, audio=audio)
+        return _extract_google_transcript(response)
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        print(f"❌ Google Speech API Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Speech-to-text service error: {str(e)}")
+
 def transcribe_audio_bytes_user_repeat(audio_bytes: bytes) -> dict:
     """
     Transcribe audio using ElevenLabs STT with language detection
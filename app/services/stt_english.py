@@ -3,6 +3,7 @@
 from google.cloud import speech
 from pydub import AudioSegment
 import io
+from app.services.speech_client import get_speech_client
 
 def transcribe_english_audio(audio_bytes: bytes) -> str:
     """
@@ -25,8 +26,8 @@ def transcribe_english_audio(audio_bytes: bytes) -> str:
     wav_io.seek(0)
     mono_audio_bytes = wav_io.read()
 
-    # Setup Google STT client
-    client = speech.SpeechClient()
+    # Shared Google STT client (one gRPC channel per process)
+    client = get_speech_client()
     audio = speech.RecognitionAudio(content=mono_audio_bytes)
     config = speech.RecognitionConfig(
         encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
@@ -1,10 +1,57 @@
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
+"""
+Translation Service (Urdu <-> English)
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+Async translation shared by the translator routes and the learn websocket:
+- Precomputed table of every Urdu/English pair in the content hierarchy
+- In-process LRU in front of a Redis-backed cache (keyed on normalized text;
+  punctuation is kept, so a question and the matching statement stay apart)
+- Request coalescing (SingleFlight) so identical in-flight inputs share one model call
 
-def translate_urdu_to_english(text: str) -> str:
-    prompt = (
+The sync helpers at the bottom are kept for thread-pool callers and scripts.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.services.vendor_clients import LazyClient, get_async_openai_client, get_openai_client
+from app.cache import cache_manager
+from app.utils.single_flight import SingleFlight
+
+# Shared client on the pre-warmed OpenAI pool (see vendor_clients.py)
+client = LazyClient(get_openai_client)
+
+TRANSLATION_MODEL = os.getenv("TRANSLATION_MODEL", "gpt-4-turbo")
+TRANSLATION_CACHE_TTL_SECONDS = 30 * 24 * 3600  # Translations of the same text don't go stale
+TRANSLATION_LRU_SIZE = 2000
+
+URDU_TO_ENGLISH = "ur-en"
+ENGLISH_TO_URDU = "en-ur"
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+# (english_key, urdu_key) pairs found in content hierarchy rows, topic_data and data/*.json
+CONTENT_TRANSLATION_FIELDS = (
+    ("title", "title_urdu"),
+    ("description", "description_urdu"),
+    ("phrase", "urdu_meaning"),
+    ("question", "question_urdu"),
+    ("sentence", "sentence_urdu"),
+    ("prompt", "prompt_urdu"),
+    ("scenario", "scenario_urdu"),
+)
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_EDGE_QUOTES = " \t\n\"'“”‘’"
+
+
+def _build_urdu_to_english_prompt(text: str) -> str:
+    return (
         "You are a professional English teacher and translator.\n"
         "Your task is to take any sentence given to you — whether it is in Urdu, Hindi, or any other language — "
         "and convert it into a natural, fluent, grammatically correct English sentence.\n\n"
@@ -16,18 +63,9 @@ def translate_urdu_to_english(text: str) -> str:
         "Output:"
     )
 
-    response = client.chat.completions.create(
-        model="gpt-4-turbo",
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    result = response.choices[0].message.content.strip()
-    print("response of the english sentence:", result)
-    return result
-
 
-def translate_to_urdu(text: str) -> str:
-    prompt = (
+def _build_to_urdu_prompt(text: str) -> str:
+    return (
         "You are an expert Pakistani Urdu translator and linguistic consultant.\n"
         "Your task is to take the provided sentence — which can be in English, Roman Urdu, Hindi, or any other language — "
         "and output the most accurate, natural, and properly written **Pakistani Urdu script** equivalent.\n\n"
@@ -40,11 +78,218 @@ def translate_to_urdu(text: str) -> str:
         "Output:"
     )
 
+
+PROMPT_BUILDERS = {
+    URDU_TO_ENGLISH: _build_urdu_to_english_prompt,
+    ENGLISH_TO_URDU: _build_to_urdu_prompt,
+}
+
+
+def normalize_translation_text(text: str) -> str:
+    """
+    Normalize text for cache lookups (unicode form, case, whitespace, surrounding
+    quotes). Punctuation stays: "aap theek hain?" and "aap theek hain" translate
+    differently.
+    """
+    normalized = unicodedata.normalize("NFKC", text or "")
+    normalized = _WHITESPACE_PATTERN.sub(" ", normalized).strip(_EDGE_QUOTES)
+    return normalized.lower()
+
+
+class TranslationService:
+    """
+    Async translation with a three-tier lookup:
+    precomputed content table -> in-process LRU -> Redis -> model (coalesced).
+    """
+
+    def __init__(self, lru_size: int = TRANSLATION_LRU_SIZE, ttl_seconds: int = TRANSLATION_CACHE_TTL_SECONDS):
+        self.lru_size = lru_size
+        self.ttl_seconds = ttl_seconds
+        self._lru: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._flight = SingleFlight("translation")
+        self._table: Dict[str, Dict[str, str]] = {URDU_TO_ENGLISH: {}, ENGLISH_TO_URDU: {}}
+        self.stats: Dict[str, int] = {
+            "table_hits": 0,
+            "memory_hits": 0,
+            "redis_hits": 0,
+            "coalesced": 0,
+            "model_calls": 0,
+        }
+
+    async def translate(self, text: str, direction: str) -> str:
+        """Translate text in the given direction (URDU_TO_ENGLISH or ENGLISH_TO_URDU)."""
+        normalized = normalize_translation_text(text)
+        if not normalized:
+            return ""
+
+        table_hit = self._table[direction].get(normalized)
+        if table_hit:
+            self.stats["table_hits"] += 1
+            return table_hit
+
+        key = (direction, normalized)
+        cached = self._lru_get(key)
+        if cached is not None:
+            self.stats["memory_hits"] += 1
+            return cached
+
+        if self._flight.in_flight(key):
+            self.stats["coalesced"] += 1
+        return await self._flight.do(key, lambda: self._translate_uncached(text.strip(), key))
+
+    async def urdu_to_english(self, text: str) -> str:
+        return await self.translate(text, URDU_TO_ENGLISH)
+
+    async def to_urdu(self, text: str) -> str:
+        return await self.translate(text, ENGLISH_TO_URDU)
+
+    async def _translate_uncached(self, text: str, key: Tuple[str, str]) -> str:
+        direction, normalized = key
+        redis_key = self._redis_key(direction, normalized)
+
+        cached = await cache_manager.get(redis_key)
+        if cached:
+            self.stats["redis_hits"] += 1
+            self._lru_set(key, cached)
+            return cached
+
+        self.stats["model_calls"] += 1
+        response = await get_async_openai_client().chat.completions.create(
+            model=TRANSLATION_MODEL,
+            messages=[{"role": "user", "content": PROMPT_BUILDERS[direction](text)}]
+        )
+        result = response.choices[0].message.content.strip()
+        print(f"🌐 [TRANSLATION] {direction} model translation ({len(text)} chars): {result}")
+
+        self._lru_set(key, result)
+        await cache_manager.set(redis_key, result, ttl=self.ttl_seconds)
+        return result
+
+    @staticmethod
+    def _redis_key(direction: str, normalized: str) -> str:
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        # v2: keys before it ignored punctuation, so questions and statements shared entries
+        return f"translation:v2:{direction}:{digest}"
+
+    def _lru_get(self, key: Tuple[str, str]) -> Optional[str]:
+        value = self._lru.get(key)
+        if value is not None:
+            self._lru.move_to_end(key)
+        return value
+
+    def _lru_set(self, key: Tuple[str, str], value: str):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def add_pair(self, english: Optional[str], urdu: Optional[str]):
+        """Register a known English/Urdu pair in both directions of the precomputed table."""
+        if not english or not urdu or not isinstance(english, str) or not isinstance(urdu, str):
+            return
+        english, urdu = english.strip(), urdu.strip()
+        self._table[URDU_TO_ENGLISH].setdefault(normalize_translation_text(urdu), english)
+        self._table[ENGLISH_TO_URDU].setdefault(normalize_translation_text(english), urdu)
+
+    def add_pairs_from_record(self, record: Dict[str, Any]):
+        """Collect pairs from a content row or JSON item, descending into nested topic_data."""
+        for english_key, urdu_key in CONTENT_TRANSLATION_FIELDS:
+            self.add_pair(record.get(english_key), record.get(urdu_key))
+
+        answers, answers_urdu = record.get("expected_answers"), record.get("expected_answers_urdu")
+        if isinstance(answers, list) and isinstance(answers_urdu, list) and len(answers) == len(answers_urdu):
+            for english, urdu in zip(answers, answers_urdu):
+                self.add_pair(english, urdu)
+
+        topic_data = record.get("topic_data")
+        if isinstance(topic_data, str):
+            try:
+                topic_data = json.loads(topic_data)
+            except json.JSONDecodeError:
+                topic_data = None
+        if isinstance(topic_data, dict):
+            self.add_pairs_from_record(topic_data)
+
+    def _load_local_content(self) -> int:
+        count = 0
+        if not os.path.isdir(DATA_DIR):
+            return count
+        for filename in sorted(os.listdir(DATA_DIR)):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(DATA_DIR, filename), "r", encoding="utf-8") as f:
+                    content = json.load(f)
+            except Exception as e:
+                print(f"⚠️ [TRANSLATION] Could not read {filename}: {e}")
+                continue
+            for record in _iter_records(content):
+                self.add_pairs_from_record(record)
+                count += 1
+        return count
+
+    async def load_translation_table(self, progress_tracker=None):
+        """
+        Build the precomputed translation table from the content hierarchy
+        (and the bundled data/*.json). Call once on application startup.
+        """
+        print("🔄 [TRANSLATION] Building precomputed translation table...")
+        local_records = await asyncio.to_thread(self._load_local_content)
+
+        db_records = 0
+        if progress_tracker is not None:
+            rows = await progress_tracker.get_content_translation_rows_from_db()
+            for row in rows:
+                self.add_pairs_from_record(row)
+            db_records = len(rows)
+
+        print(
+            f"✅ [TRANSLATION] Translation table ready: {len(self._table[URDU_TO_ENGLISH])} ur→en, "
+            f"{len(self._table[ENGLISH_TO_URDU])} en→ur entries "
+            f"({db_records} content rows, {local_records} local records)"
+        )
+
+
+def _iter_records(content: Any) -> Iterable[Dict[str, Any]]:
+    if isinstance(content, dict):
+        yield content
+        for value in content.values():
+            if isinstance(value, (list, dict)):
+                yield from _iter_records(value)
+    elif isinstance(content, list):
+        for item in content:
+            yield from _iter_records(item)
+
+
+# Global instance
+translation_service = TranslationService()
+
+
+async def translate_urdu_to_english_async(text: str) -> str:
+    return await translation_service.urdu_to_english(text)
+
+
+async def translate_to_urdu_async(text: str) -> str:
+    return await translation_service.to_urdu(text)
+
+
+def translate_urdu_to_english(text: str) -> str:
+    response = client.chat.completions.create(
+        model=TRANSLATION_MODEL,
+        messages=[{"role": "user", "content": _build_urdu_to_english_prompt(text)}]
+    )
+
+    result = response.choices[0].message.content.strip()
+    print("response of the english sentence:", result)
+    return result
+
+
+def translate_to_urdu(text: str) -> str:
     response = client.chat.completions.create(
-        model="gpt-4-turbo",
-        messages=[{"role": "user", "content": prompt}]
+        model=TRANSLATION_MODEL,
+        messages=[{"role": "user", "content": _build_to_urdu_prompt(text)}]
     )
 
     result = response.choices[0].message.content.strip()
     print("response of the urdu sentence:", result)
-    return result
\ No newline at end of file
+    return result
@@ -1,29 +1,14 @@
-from google.cloud import texttospeech
+from functools import partial
 from io import BytesIO
-import httpx
 from fastapi.responses import StreamingResponse
 from app.config import ELEVEN_API_KEY, ELEVEN_VOICE_ID
+from app.services.tts_facade import elevenlabs_tts as _convert_async, tts_facade
+from app.services.vendor_clients import get_tts_client, google_slot
 
-from elevenlabs.client import ElevenLabs
 
-# Create a reusable ElevenLabs client instance
-client = ElevenLabs(api_key=ELEVEN_API_KEY)
-
-def synthesize_speech_with_elevenlabs_exercises(text: str):
-    print(f"🔑 Using API Key: {ELEVEN_API_KEY[:6]}...")
-    print(f"🗣️ Voice ID: {ELEVEN_VOICE_ID}")
-
-    # Get audio bytes
-    audio_bytes = client.text_to_speech.convert(
-        voice_id=ELEVEN_VOICE_ID,
-        model_id="eleven_multilingual_v2",
-        text=text,
-        voice_settings={
-            "stability": 0.7,
-            "similarity_boost": 0.8,
-            "speed": 0.8
-        }
-    )
+async def synthesize_speech_with_elevenlabs_exercises(text: str):
+    """Exercise prompt audio through the TTS facade (cached, with provider fallback)"""
+    audio_bytes = await tts_facade.synthesize(text)
 
     # Wrap in BytesIO and prepare response
     audio_stream = BytesIO(audio_bytes)
@@ -31,8 +16,8 @@ def synthesize_speech_with_elevenlabs_exercises(text: str):
 
     return StreamingResponse(
         content=audio_stream,
-        media_type="audio/wav",  # or "audio/mpeg" if ElevenLabs gives mp3
-        headers={"Content-Disposition": 'inline; filename="output.wav"'}
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": 'inline; filename="output.mp3"'}
     )
 
 
@@ -40,37 +25,13 @@ async def synthesize_speech_bytes(text: str) -> bytes:
     print(f"🔑 Using API Key: {ELEVEN_API_KEY[:6]}...")
     print(f"🗣️ Voice ID: {ELEVEN_VOICE_ID}")
 
-    audio_chunks = client.text_to_speech.convert(
-        voice_id=ELEVEN_VOICE_ID,
-        model_id="eleven_multilingual_v2",
-        text=text,
-        voice_settings={
-            "stability": 0.7,
-            "similarity_boost": 0.8,
-            "speed": 0.8
-        }
-    )
-    # If it's a normal (not async) generator:
-    audio_bytes = b"".join(audio_chunks)
-    return audio_bytes
+    return await _convert_async(text)
 
 async def synthesize_speech_bytes_slow(text: str) -> bytes:
     print(f"🔑 Using API Key: {ELEVEN_API_KEY[:6]}...")
     print(f"🗣️ Voice ID: {ELEVEN_VOICE_ID}")
 
-    audio_chunks = client.text_to_speech.convert(
-        voice_id=ELEVEN_VOICE_ID,
-        model_id="eleven_multilingual_v2",
-        text=text,
-        voice_settings={
-            "stability": 0.7,
-            "similarity_boost": 0.8,
-            "speed": 0.8
-        }
-    )
-    # If it's a normal (not async) generator:
-    audio_bytes = b"".join(audio_chunks)
-    return audio_bytes
+    return await _convert_async(text)
 
 
 async def synthesize_speech_with_elevenlabs(text: str):
@@ -86,7 +47,10 @@ async def synthesize_speech_with_elevenlabs(text: str):
 
 
 async def synthesize_speech(text: str) -> bytes:
-    client = texttospeech.TextToSpeechClient()
+    from google.cloud import texttospeech
+
+    # Shared client: one gRPC channel instead of a new one per call
+    tts_client = get_tts_client()
 
     synthesis_input = texttospeech.SynthesisInput(text=text)
     voice = texttospeech.VoiceSelectionParams(
@@ -97,17 +61,21 @@ async def synthesize_speech(text: str) -> bytes:
         audio_encoding=texttospeech.AudioEncoding.LINEAR16  # WAV format
     )
 
-    response = client.synthesize_speech(
-        input=synthesis_input, voice=voice, audio_config=audio_config
-    )
+    # Blocking gRPC call on the bounded TTS pool
+    async with google_slot():
+        response = await tts_facade.run_blocking(partial(
+            tts_client.synthesize_speech,
+            input=synthesis_input, voice=voice, audio_config=audio_config
+        ))
 
     return response.audio_content  # This is bytes
 
 
 async def synthesize_speech_exercises(text: str) -> bytes:
     """
-    Main TTS function that uses ElevenLabs instead of Google TTS
-    This function maintains the same interface as before but uses ElevenLabs
+    Main TTS function for exercises: ElevenLabs through the TTS facade, so
+    repeated prompts come from the cache and Google/gTTS step in when
+    ElevenLabs is down or slow. Same interface as before (MP3 bytes).
     """
     print(f"🔄 Starting ElevenLabs TTS for text: '{text}'")
     try:
@@ -115,21 +83,8 @@ async def synthesize_speech_exercises(text: str) -> bytes:
         print(f"🗣️ Using ElevenLabs Voice ID: {ELEVEN_VOICE_ID}")
         print(f"📝 Text to synthesize: '{text}'")
 
-        # Use ElevenLabs instead of Google TTS
-        audio_generator = client.text_to_speech.convert(
-            voice_id=ELEVEN_VOICE_ID,
-            model_id="eleven_multilingual_v2",
-            text=text,
-            voice_settings={
-                "stability": 0.7,
-                "similarity_boost": 0.8,
-                "speed": 0.8
-            }
-        )
-        
-        # Convert generator to bytes
-        audio_bytes = b''.join(audio_generator)
-        print(f"✅ ElevenLabs TTS successful, audio size: {len(audio_bytes)} bytes")
+        audio_bytes = await tts_facade.synthesize(text)
+        print(f"✅ TTS successful, audio size: {len(audio_bytes)} bytes")
 
         return audio_bytes  # Return bytes for compatibility
     except Exception as e:
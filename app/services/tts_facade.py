@@ -0,0 +1,266 @@
+"""
+Async TTS Facade
+
+One awaitable entry point for text-to-speech that never blocks the event loop:
+- Providers form a fallback chain, ElevenLabs -> Google Text-to-Speech -> gTTS.
+  ElevenLabs runs on the async SDK; the Google gRPC client and gTTS (blocking
+  HTTP) run on a bounded worker pool instead of the default executor
+- Each provider keeps an exponentially weighted latency and a failure
+  circuit: after TTS_FAILURE_THRESHOLD failures in a row it is skipped for
+  TTS_COOLDOWN_SECONDS. Healthy providers are tried fastest first, with each
+  step down the chain weighted by TTS_PREFERENCE_PENALTY so the preferred
+  voice keeps serving unless a fallback is clearly faster. A provider ranked
+  below a less preferred one is re-measured every TTS_PROBE_SECONDS, so it
+  takes over again once it is fast again
+- Audio is cached by a content hash of the normalized text; concurrent
+  requests for the same text share one synthesis. Fallback audio is cached
+  briefly so the preferred voice takes over again once it recovers
+
+All providers return MP3.
+
+Environment:
+- TTS_PROVIDERS: chain order (default: elevenlabs,google,gtts)
+- TTS_EXECUTOR_WORKERS: threads for the blocking providers (default: 8)
+- TTS_PROVIDER_TIMEOUT: seconds before a provider counts as failed (default: 15)
+- TTS_CACHE_MAX_ENTRIES / TTS_CACHE_MAX_MB: cache bounds (default: 2000 / 128)
+- TTS_CACHE_TTL / TTS_FALLBACK_CACHE_TTL: seconds (default: 86400 / 600)
+- TTS_PREFERENCE_PENALTY: latency weight per step down the chain (default: 2)
+- TTS_PROBE_SECONDS: how often a demoted provider is tried first again (default: 30)
+- TTS_FAILURE_THRESHOLD / TTS_COOLDOWN_SECONDS: circuit settings (default: 3 / 30)
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from app.config import ELEVEN_API_KEY, ELEVEN_VOICE_ID, GOOGLE_APPLICATION_CREDENTIALS, GOOGLE_EMULATOR_HOST
+from app.services.vendor_clients import get_async_elevenlabs_client, get_tts_client, google_sync_slot
+from app.utils.bounded_cache import BoundedTTLCache
+from app.utils.logging_config import get_logger
+from app.utils.metrics import CACHE_HITS, CACHE_MISSES, TTS_SECONDS
+from app.utils.single_flight import SingleFlight
+from app.utils.tracing import tracer
+
+logger = get_logger(__name__)
+
+TTS_PROVIDERS = [name.strip() for name in os.getenv("TTS_PROVIDERS", "elevenlabs,google,gtts").split(",") if name.strip()]
+TTS_EXECUTOR_WORKERS = int(os.getenv("TTS_EXECUTOR_WORKERS", "8"))
+TTS_PROVIDER_TIMEOUT = float(os.getenv("TTS_PROVIDER_TIMEOUT", "15"))
+TTS_CACHE_MAX_ENTRIES = int(os.getenv("TTS_CACHE_MAX_ENTRIES", "2000"))
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "128"))
+TTS_CACHE_TTL = float(os.getenv("TTS_CACHE_TTL", "86400"))
+TTS_FALLBACK_CACHE_TTL = float(os.getenv("TTS_FALLBACK_CACHE_TTL", "600"))
+TTS_PREFERENCE_PENALTY = float(os.getenv("TTS_PREFERENCE_PENALTY", "2"))
+TTS_PROBE_SECONDS = float(os.getenv("TTS_PROBE_SECONDS", "30"))
+TTS_FAILURE_THRESHOLD = int(os.getenv("TTS_FAILURE_THRESHOLD", "3"))
+TTS_COOLDOWN_SECONDS = float(os.getenv("TTS_COOLDOWN_SECONDS", "30"))
+LATENCY_SMOOTHING = 0.2  # weight of the newest sample in the moving average
+
+# ElevenLabs voice used across the exercises
+ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
+ELEVENLABS_VOICE_SETTINGS = {"stability": 0.7, "similarity_boost": 0.8, "speed": 0.8}
+
+
+class TTSUnavailableError(RuntimeError):
+    """Every provider in the chain failed or is unavailable"""
+
+
+async def elevenlabs_tts(text: str) -> bytes:
+    """ElevenLabs synthesis on the shared async pool (MP3)"""
+    # The span ends at the last byte; first_byte marks when audio started arriving
+    with tracer.span("tts.elevenlabs", characters=len(text)) as span:
+        audio_chunks = get_async_elevenlabs_client().text_to_speech.convert(
+            voice_id=ELEVEN_VOICE_ID,
+            model_id=ELEVENLABS_MODEL_ID,
+            text=text,
+            voice_settings=ELEVENLABS_VOICE_SETTINGS,
+        )
+        chunks = []
+        async for chunk in audio_chunks:
+            if not chunks:
+                span.add_event("first_byte")
+            chunks.append(chunk)
+        audio = b"".join(chunks)
+        span.set_attribute("audio_bytes", len(audio))
+        return audio
+
+
+def _google_tts_blocking(text: str) -> bytes:
+    from google.cloud import texttospeech
+
+    with google_sync_slot():
+        response = get_tts_client().synthesize_speech(
+            input=texttospeech.SynthesisInput(text=text),
+            voice=texttospeech.VoiceSelectionParams(
+                language_code="en-US", ssml_gender=texttospeech.SsmlVoiceGender.FEMALE),
+            audio_config=texttospeech.AudioConfig(audio_encoding=texttospeech.AudioEncoding.MP3),
+        )
+    return response.audio_content
+
+
+def _gtts_blocking(text: str) -> bytes:
+    from gtts import gTTS
+
+    buffer = io.BytesIO()
+    gTTS(text=text, lang="en").write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+@dataclass
+class TTSProvider:
+    """One link of the chain; synthesize(facade, text) returns MP3 bytes"""
+    name: str
+    synthesize: Callable[["TTSFacade", str], Awaitable[bytes]]
+    available: Callable[[], bool]
+    expected_seconds: float  # prior for the latency average before any measurement
+    latency: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    last_attempt: float = 0.0
+
+    def __post_init__(self):
+        self.latency = self.latency or self.expected_seconds
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.open_until
+
+    def record(self, seconds: float, ok: bool):
+        self.last_attempt = time.monotonic()
+        self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+        if ok:
+            self.successes += 1
+            self.consecutive_failures = 0
+            return
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= TTS_FAILURE_THRESHOLD:
+            self.open_until = time.monotonic() + TTS_COOLDOWN_SECONDS
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "available": self.available(),
+            "healthy": self.healthy(time.monotonic()),
+            "latency_ms": round(self.latency * 1000, 1),
+            "successes": self.successes,
+            "failures": self.failures,
+        }
+
+
+PROVIDERS = {
+    "elevenlabs": lambda: TTSProvider(
+        "elevenlabs", lambda facade, text: elevenlabs_tts(text),
+        available=lambda: bool(ELEVEN_API_KEY), expected_seconds=0.8),
+    "google": lambda: TTSProvider(
+        "google", lambda facade, text: facade.run_blocking(_google_tts_blocking, text),
+        available=lambda: bool(GOOGLE_APPLICATION_CREDENTIALS or GOOGLE_EMULATOR_HOST), expected_seconds=0.5),
+    "gtts": lambda: TTSProvider(
+        "gtts", lambda facade, text: facade.run_blocking(_gtts_blocking, text),
+        available=lambda: importlib.util.find_spec("gtts") is not None, expected_seconds=1.5),
+}
+
+
+def content_key(text: str) -> str:
+    """Cache key: hash of the text with whitespace normalized, tied to the voice in use"""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{ELEVEN_VOICE_ID}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+class TTSFacade:
+    """Cached, non-blocking synthesis over a latency- and health-ranked provider chain"""
+
+    def __init__(self, providers: Sequence[TTSProvider], workers: int = TTS_EXECUTOR_WORKERS,
+                 cache: Optional[BoundedTTLCache] = None):
+        self.providers = list(providers)
+        self.workers = workers
+        self.cache = cache if cache is not None else BoundedTTLCache(
+            max_entries=TTS_CACHE_MAX_ENTRIES, max_bytes=TTS_CACHE_MAX_MB * 1024 * 1024, default_ttl=TTS_CACHE_TTL)
+        self._flight = SingleFlight("tts")
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run_blocking(self, fn: Callable, *args):
+        """Run a blocking call on the bounded TTS pool (created on first use)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tts")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def ranked(self) -> List[TTSProvider]:
+        """Healthy providers fastest first (weighted by chain position), then open circuits as a last resort"""
+        now = time.monotonic()
+        candidates = [(position, provider) for position, provider in enumerate(self.providers) if provider.available()]
+        healthy = sorted((pair for pair in candidates if pair[1].healthy(now)),
+                         key=lambda pair: pair[1].latency * TTS_PREFERENCE_PENALTY ** pair[0])
+        return [provider for _, provider in healthy] + [provider for _, provider in candidates
+                                                         if not provider.healthy(now)]
+
+    def _with_probe(self, chain: List[TTSProvider]) -> List[TTSProvider]:
+        """Move a demoted provider whose latency figure is stale to the front, once per probe interval"""
+        if not chain:
+            return chain
+        now = time.monotonic()
+        leader = self.providers.index(chain[0])
+        for provider in self.providers[:leader]:
+            if provider in chain and provider.healthy(now) and now - provider.last_attempt >= TTS_PROBE_SECONDS:
+                provider.last_attempt = now  # concurrent requests don't all probe
+                return [provider] + [other for other in chain if other is not provider]
+        return chain
+
+    async def synthesize(self, text: str) -> bytes:
+        """MP3 audio for text, from the cache or the best available provider"""
+        if not text or not text.strip():
+            raise ValueError("text is empty")
+        key = content_key(text)
+        audio = self.cache.get(key)
+        if audio is not None:
+            CACHE_HITS.inc(cache="tts", level="memory")
+            return audio
+        CACHE_MISSES.inc(cache="tts")
+        return await self._flight.do(key, lambda: self._synthesize_uncached(key, text))
+
+    async def _synthesize_uncached(self, key: str, text: str) -> bytes:
+        chain = self._with_probe(self.ranked())
+        errors = []
+        for provider in chain:
+            started = time.perf_counter()
+            try:
+                with TTS_SECONDS.time(route="facade", vendor=provider.name), \
+                        tracer.span("tts", vendor=provider.name, characters=len(text)):
+                    audio = await asyncio.wait_for(provider.synthesize(self, text), TTS_PROVIDER_TIMEOUT)
+                if not audio:
+                    raise RuntimeError("empty audio")
+            except Exception as e:
+                provider.record(time.perf_counter() - started, ok=False)
+                errors.append(f"{provider.name}: {type(e).__name__}: {e}")
+                logger.warning("tts.provider_failed", provider=provider.name, error=str(e) or type(e).__name__)
+                continue
+            provider.record(time.perf_counter() - started, ok=True)
+            preferred = provider is next((p for p in self.providers if p.available()), None)
+            self.cache.set(key, audio, ttl=TTS_CACHE_TTL if preferred else TTS_FALLBACK_CACHE_TTL)
+            if not preferred:
+                logger.info("tts.fallback", provider=provider.name)
+            return audio
+        raise TTSUnavailableError("; ".join(errors) or "no TTS provider is configured")
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "order": [provider.name for provider in self.ranked()],
+            "providers": {provider.name: provider.status() for provider in self.providers},
+            "cache": self.cache.stats(),
+            "workers": self.workers,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global instance
+tts_facade = TTSFacade([PROVIDERS[name]() for name in TTS_PROVIDERS if name in PROVIDERS])
@@ -0,0 +1,172 @@
+"""
+Vendor Client Registry
+
+Hands out vendor SDK clients bound to the shared, pre-warmed pools in
+connection_pool.py, so every outbound call reuses warm connections and is
+counted against the vendor's concurrency cap:
+- OpenAI: sync client (thread-pool callers) and async client (per event loop)
+- ElevenLabs: sync and async clients
+- Google: shared Text-to-Speech client; Speech clients live in speech_client.py.
+  gRPC traffic doesn't go through httpx, so callers wrap it in google_slot()
+
+Endpoints come from OPENAI_BASE_URL, ELEVENLABS_BASE_URL and
+GOOGLE_EMULATOR_HOST (see config.py), so the load tests can point every
+client at local stand-ins.
+
+SDKs are imported on first use, and LazyClient lets modules keep a
+module-level `client` without paying for the import (or the client) at
+application import time.
+
+Usage:
+    client = LazyClient(get_openai_client)       # module level, replaces OpenAI(api_key=...)
+    response = await get_async_openai_client().chat.completions.create(...)
+    async with google_slot():
+        await speech_client.recognize(...)
+"""
+
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from app.config import ELEVEN_API_KEY, ELEVENLABS_BASE_URL, GOOGLE_EMULATOR_HOST, OPENAI_API_KEY, OPENAI_BASE_URL
+from app.services.connection_pool import connection_pool
+
+if TYPE_CHECKING:
+    # Imported on first use to keep application import fast
+    from elevenlabs.client import AsyncElevenLabs, ElevenLabs
+    from google.cloud import texttospeech
+    from openai import AsyncOpenAI, OpenAI
+
+OPENAI_MAX_RETRIES = 2
+
+_lock = threading.Lock()
+_sync_clients: Dict[str, object] = {}
+# Async SDK clients wrap loop-bound pools, so keep one per loop
+_async_clients: Dict[str, Dict[int, object]] = {"openai": {}, "elevenlabs": {}}
+_tts_client: Optional["texttospeech.TextToSpeechClient"] = None
+
+
+def _shared(name: str, factory):
+    client = _sync_clients.get(name)
+    if client is None:
+        with _lock:
+            client = _sync_clients.get(name)
+            if client is None:
+                client = _sync_clients[name] = factory()
+    return client
+
+
+def _per_loop(name: str, factory):
+    clients = _async_clients[name]
+    loop_id = id(asyncio.get_running_loop())
+    client = clients.get(loop_id)
+    if client is None:
+        client = clients[loop_id] = factory()
+    return client
+
+
+class LazyClient:
+    """Module-level stand-in for a vendor client, built on first attribute access."""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._factory(), name)
+
+
+def get_openai_client() -> "OpenAI":
+    """Process-wide sync OpenAI client on the shared OpenAI pool."""
+    from openai import OpenAI
+    return _shared("openai", lambda: OpenAI(
+        api_key=OPENAI_API_KEY,
+        base_url=OPENAI_BASE_URL,
+        http_client=connection_pool.get_http_client("openai"),
+        max_retries=OPENAI_MAX_RETRIES,
+    ))
+
+
+def get_async_openai_client() -> "AsyncOpenAI":
+    """Async OpenAI client on the shared pool of the running event loop."""
+    from openai import AsyncOpenAI
+    return _per_loop("openai", lambda: AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        base_url=OPENAI_BASE_URL,
+        http_client=connection_pool.get_async_http_client("openai"),
+        max_retries=OPENAI_MAX_RETRIES,
+    ))
+
+
+def get_elevenlabs_client() -> "ElevenLabs":
+    """Process-wide sync ElevenLabs client on the shared ElevenLabs pool."""
+    from elevenlabs.client import ElevenLabs
+    return _shared("elevenlabs", lambda: ElevenLabs(
+        api_key=ELEVEN_API_KEY,
+        environment=elevenlabs_environment(),
+        httpx_client=connection_pool.get_http_client("elevenlabs"),
+    ))
+
+
+def get_async_elevenlabs_client() -> "AsyncElevenLabs":
+    """Async ElevenLabs client on the shared pool of the running event loop."""
+    from elevenlabs.client import AsyncElevenLabs
+    return _per_loop("elevenlabs", lambda: AsyncElevenLabs(
+        api_key=ELEVEN_API_KEY,
+        environment=elevenlabs_environment(),
+        httpx_client=connection_pool.get_async_http_client("elevenlabs"),
+    ))
+
+
+def elevenlabs_environment():
+    """ElevenLabs SDK environment for ELEVENLABS_BASE_URL (the SDK's base_url keeps only the host and forces https)"""
+    from elevenlabs.environment import ElevenLabsEnvironment
+    return ElevenLabsEnvironment(base=ELEVENLABS_BASE_URL, wss=ELEVENLABS_BASE_URL.replace("http", "ws", 1))
+
+
+def get_tts_client() -> "texttospeech.TextToSpeechClient":
+    """Process-wide Google Text-to-Speech client (one gRPC channel, created on first use)."""
+    global _tts_client
+    if _tts_client is None:
+        from google.cloud import texttospeech
+        with _lock:
+            if _tts_client is None:
+                print("🔥 [VENDOR] Creating shared Google Text-to-Speech client")
+                from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
+                _tts_client = texttospeech.TextToSpeechClient(**google_client_kwargs(TextToSpeechGrpcTransport))
+    return _tts_client
+
+
+def google_client_kwargs(transport_class, aio: bool = False) -> Dict[str, Any]:
+    """
+    Constructor arguments for a Google client: a plaintext channel to
+    GOOGLE_EMULATOR_HOST when it is set, otherwise none (public endpoint,
+    application default credentials).
+    """
+    if not GOOGLE_EMULATOR_HOST:
+        return {}
+    import grpc
+    channel = (grpc.aio if aio else grpc).insecure_channel(GOOGLE_EMULATOR_HOST)
+    return {"transport": transport_class(channel=channel)}
+
+
+def google_slot():
+    """Async context manager holding one Google concurrency slot."""
+    return connection_pool.get_limiter("google").slot()
+
+
+def google_sync_slot():
+    """Context manager holding one Google concurrency slot from a worker thread."""
+    return connection_pool.get_limiter("google").sync_slot()
+
+
+def warm_vendor_clients():
+    """Import the SDKs and build the sync clients (run in a worker thread during startup)."""
+    get_openai_client()
+    get_elevenlabs_client()
+    get_tts_client()
+
+
+def reset_async_clients():
+    """Forget per-loop async clients (their pools are closed by connection_pool.close())."""
+    for clients in _async_clients.values():
+        clients.clear()
@@ -1,35 +1,213 @@
-import whisper
-import tempfile
+"""
+Local Whisper Scoring Engine
+
+Offline ASR and pronunciation scoring on CPU:
+- Model is loaded lazily on first use (importing this module stays cheap)
+- Audio is decoded in memory (no temp files)
+- Concurrent requests are batched into one Whisper decode pass
+- CPU threads, model size and int8 dynamic quantization are configurable
+- Pronunciation is scored by word alignment (see word_alignment.py)
+
+Environment:
+    WHISPER_MODEL            model name, e.g. "tiny.en", "base" (default "base")
+    WHISPER_CPU_THREADS      torch intra-op threads (default: torch default)
+    WHISPER_QUANTIZE         "true" to apply int8 dynamic quantization to Linear layers
+    WHISPER_BATCH_SIZE       max clips per decode pass (default 4)
+    WHISPER_BATCH_WAIT_MS    how long to wait for more clips before decoding (default 25)
+"""
+
+import asyncio
+import io
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydub import AudioSegment
+
+from app.services.word_alignment import align_words
+
+WHISPER_SAMPLE_RATE = 16000
+# Whisper's decoder works on 30 second windows; longer clips go through model.transcribe
+WHISPER_WINDOW_SECONDS = 30
+
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+WHISPER_QUANTIZE = os.getenv("WHISPER_QUANTIZE", "false").lower() == "true"
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "4"))
+WHISPER_BATCH_WAIT_MS = int(os.getenv("WHISPER_BATCH_WAIT_MS", "25"))
+
+
+def decode_audio_bytes(audio_bytes: bytes) -> np.ndarray:
+    """Decode any supported audio container to 16kHz mono float32 in memory."""
+    segment = AudioSegment.from_file(io.BytesIO(audio_bytes))
+    segment = segment.set_frame_rate(WHISPER_SAMPLE_RATE).set_channels(1).set_sample_width(2)
+    samples = np.frombuffer(segment.raw_data, dtype=np.int16)
+    return samples.astype(np.float32) / 32768.0
+
+
+class WhisperScoringEngine:
+    """Shared, lazily-loaded Whisper model with request batching."""
+
+    def __init__(
+        self,
+        model_name: str = WHISPER_MODEL,
+        cpu_threads: int = WHISPER_CPU_THREADS,
+        quantize: bool = WHISPER_QUANTIZE,
+        batch_size: int = WHISPER_BATCH_SIZE,
+        batch_wait_ms: int = WHISPER_BATCH_WAIT_MS,
+    ):
+        self.model_name = model_name
+        self.cpu_threads = cpu_threads
+        self.quantize = quantize
+        self.batch_size = max(1, batch_size)
+        self.batch_wait_seconds = batch_wait_ms / 1000
+        self._model = None
+        self._load_lock = threading.Lock()
+        # Whisper inference is not thread-safe; one worker owns the model
+        self._inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+        self._queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def _ensure_model(self):
+        if self._model is not None:
+            return self._model
+        with self._load_lock:
+            if self._model is None:
+                import torch
+                import whisper
+
+                if self.cpu_threads > 0:
+                    torch.set_num_threads(self.cpu_threads)
+                print(f"🔄 [WHISPER] Loading model '{self.model_name}' (threads={torch.get_num_threads()}, quantize={self.quantize})")
+                model = whisper.load_model(self.model_name, device="cpu")
+                if self.quantize:
+                    model = self._quantize(model)
+                model.eval()
+                self._model = model
+                print(f"✅ [WHISPER] Model '{self.model_name}' ready")
+        return self._model
+
+    @staticmethod
+    def _quantize(model):
+        """Apply int8 dynamic quantization to Linear layers (large CPU speedup, small accuracy cost)."""
+        import torch
+        import whisper
+
+        try:
+            # Whisper wraps nn.Linear in a dtype-casting subclass that quantize_dynamic won't convert;
+            # swap in plain nn.Linear (same weights) first, which is equivalent for fp32 CPU inference
+            for parent in model.modules():
+                for name, child in list(parent.named_children()):
+                    if isinstance(child, whisper.model.Linear):
+                        plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                        plain.weight = child.weight
+                        plain.bias = child.bias
+                        setattr(parent, name, plain)
+            return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as e:
+            print(f"⚠️ [WHISPER] Quantization failed, using float model: {e}")
+            return model
+
+    def warm_up(self):
+        """Load the model ahead of the first request (e.g. from a background task)."""
+        self._ensure_model()
+
+    def _transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        """Run one batched decode for clips up to 30s; longer clips are transcribed individually."""
+        import torch
+        import whisper
+
+        model = self._ensure_model()
+        results: List[Optional[str]] = [None] * len(audios)
+        window_samples = WHISPER_WINDOW_SECONDS * WHISPER_SAMPLE_RATE
+
+        short_indices = [i for i, audio in enumerate(audios) if len(audio) <= window_samples]
+        if short_indices:
+            mels = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(audios[i]), n_mels=model.dims.n_mels)
+                for i in short_indices
+            ])
+            options = whisper.DecodingOptions(language="en", without_timestamps=True, fp16=False)
+            with torch.inference_mode():
+                decoded = whisper.decode(model, mels, options)
+            for index, result in zip(short_indices, decoded):
+                results[index] = result.text.strip()
+
+        for i, audio in enumerate(audios):
+            if results[i] is None:
+                results[i] = model.transcribe(audio, language="en", fp16=False)["text"].strip()
+        return results
+
+    async def transcribe(self, audio_bytes: bytes) -> str:
+        """Transcribe one clip; concurrent callers are batched into the same decode pass."""
+        audio = await asyncio.to_thread(decode_audio_bytes, audio_bytes)
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._batcher_task = asyncio.create_task(self._batch_loop())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((audio, future))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[np.ndarray, asyncio.Future]] = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            audios = [audio for audio, _ in batch]
+            try:
+                texts = await loop.run_in_executor(self._inference_executor, self._transcribe_batch, audios)
+                if len(batch) > 1:
+                    print(f"⚡ [WHISPER] Batched {len(batch)} clips in one decode pass")
+                for (_, future), text in zip(batch, texts):
+                    if not future.done():
+                        future.set_result(text)
+            except Exception as e:
+                print(f"❌ [WHISPER] Batch transcription failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def transcribe_sync(self, audio_bytes: bytes) -> str:
+        """Blocking single-clip transcription for thread-pool callers."""
+        audio = decode_audio_bytes(audio_bytes)
+        return self._inference_executor.submit(self._transcribe_batch, [audio]).result()[0]
+
+    async def score(self, audio_bytes: bytes, expected_text: str) -> dict:
+        """Transcribe once and return the transcript with alignment-based scoring."""
+        transcript = await self.transcribe(audio_bytes)
+        alignment = align_words(expected_text, transcript)
+        return {"transcript": transcript, **alignment.to_dict()}
+
+
+# Global instance (model loads on first use)
+whisper_engine = WhisperScoringEngine()
 
-model = whisper.load_model("base")
 
 def transcribe_with_whisper(audio_bytes: bytes) -> str:
-    # Save audio bytes to a temporary .wav file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as f:
-        f.write(audio_bytes)
-        f.flush()
-        os.fsync(f.fileno())
-        temp_file_path = f.name
-
-    try:
-        result = model.transcribe(temp_file_path)
-        transcript = result["text"]
-        return transcript.strip()
-    finally:
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+    return whisper_engine.transcribe_sync(audio_bytes)
 
-def score_pronunciation(audio_bytes: bytes, expected_text: str) -> float:
-    # Transcribe the audio
-    transcript = transcribe_with_whisper(audio_bytes)
 
-    # Basic word-match scoring
-    expected_words = set(expected_text.lower().split())
-    transcript_words = set(transcript.lower().split())
+def score_transcript(transcript: str, expected_text: str) -> float:
+    """Alignment-based word score (0-100) for an existing transcript."""
+    return align_words(expected_text, transcript).score
 
-    if not expected_words:
-        return 0.0
 
-    accuracy = len(transcript_words & expected_words) / len(expected_words)
-    return round(accuracy * 100, 2)
+def score_pronunciation(audio_bytes: bytes, expected_text: str) -> float:
+    # Transcribe the audio
+    transcript = transcribe_with_whisper(audio_bytes)
+    return score_transcript(transcript, expected_text)
@@ -0,0 +1,152 @@
+"""
+Word Alignment Scoring
+
+Aligns a learner transcript against the expected text with a word-level
+edit-distance (Levenshtein) alignment. Substitutions get partial credit by
+character similarity, so "tree" for "three" scores better than "car".
+
+Pure Python with no model calls; shared by the local Whisper scorer and the
+fast-path exercise evaluators.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import List, Optional
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Common spoken/written variants that should not count as mistakes
+_CONTRACTIONS = {
+    "i'm": ["i", "am"], "you're": ["you", "are"], "he's": ["he", "is"], "she's": ["she", "is"],
+    "it's": ["it", "is"], "we're": ["we", "are"], "they're": ["they", "are"], "that's": ["that", "is"],
+    "what's": ["what", "is"], "there's": ["there", "is"], "don't": ["do", "not"], "doesn't": ["does", "not"],
+    "didn't": ["did", "not"], "can't": ["can", "not"], "won't": ["will", "not"], "isn't": ["is", "not"],
+    "aren't": ["are", "not"], "i've": ["i", "have"], "i'll": ["i", "will"], "let's": ["let", "us"],
+}
+
+# Substitutions at or above this similarity are treated as a mispronounced (not missing) word
+PARTIAL_MATCH_THRESHOLD = 0.6
+
+
+@dataclass
+class WordResult:
+    expected: Optional[str]
+    spoken: Optional[str]
+    status: str  # "correct", "mispronounced", "substituted", "missing", "extra"
+    similarity: float
+
+
+@dataclass
+class AlignmentResult:
+    score: float  # 0-100
+    expected_words: List[str]
+    spoken_words: List[str]
+    words: List[WordResult] = field(default_factory=list)
+    correct: int = 0
+    mispronounced: int = 0
+    substituted: int = 0
+    missing: int = 0
+    extra: int = 0
+
+    @property
+    def word_error_rate(self) -> float:
+        if not self.expected_words:
+            return 0.0 if not self.spoken_words else 1.0
+        errors = self.substituted + self.mispronounced + self.missing + self.extra
+        return errors / len(self.expected_words)
+
+    def to_dict(self) -> dict:
+        return {
+            "score": self.score,
+            "word_error_rate": round(self.word_error_rate, 3),
+            "correct": self.correct,
+            "mispronounced": self.mispronounced,
+            "substituted": self.substituted,
+            "missing": self.missing,
+            "extra": self.extra,
+            "words": [w.__dict__ for w in self.words],
+        }
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase, strip punctuation and expand contractions into comparable tokens."""
+    normalized = unicodedata.normalize("NFKC", text or "").lower().replace("’", "'")
+    tokens: List[str] = []
+    for token in _TOKEN_PATTERN.findall(normalized):
+        tokens.extend(_CONTRACTIONS.get(token, [token.strip("'")]))
+    return [t for t in tokens if t]
+
+
+def word_similarity(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def align_words(expected_text: str, spoken_text: str, insertion_penalty: float = 0.5) -> AlignmentResult:
+    """
+    Align spoken words to expected words and score 0-100.
+
+    Each expected word earns its similarity credit when aligned (1.0 exact,
+    partial for near misses); missing words earn nothing and each extra word
+    costs `insertion_penalty` of a word.
+    """
+    expected = normalize_words(expected_text)
+    spoken = normalize_words(spoken_text)
+    n, m = len(expected), len(spoken)
+
+    if n == 0:
+        return AlignmentResult(score=0.0, expected_words=expected, spoken_words=spoken, extra=m)
+
+    # DP over (expected, spoken) with substitution cost = 1 - similarity
+    cost = [[0.0] * (m + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        cost[i][0] = float(i)
+    for j in range(1, m + 1):
+        cost[0][j] = j * insertion_penalty
+    sim_cache = {}
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            sim = word_similarity(expected[i - 1], spoken[j - 1])
+            sim_cache[(i, j)] = sim
+            cost[i][j] = min(
+                cost[i - 1][j - 1] + (1.0 - sim),
+                cost[i - 1][j] + 1.0,
+                cost[i][j - 1] + insertion_penalty,
+            )
+
+    # Backtrace into per-word results
+    words: List[WordResult] = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and abs(cost[i][j] - (cost[i - 1][j - 1] + 1.0 - sim_cache[(i, j)])) < 1e-9:
+            sim = sim_cache[(i, j)]
+            if sim == 1.0:
+                status = "correct"
+            elif sim >= PARTIAL_MATCH_THRESHOLD:
+                status = "mispronounced"
+            else:
+                status = "substituted"
+            words.append(WordResult(expected[i - 1], spoken[j - 1], status, round(sim, 3)))
+            i, j = i - 1, j - 1
+        elif i > 0 and abs(cost[i][j] - (cost[i - 1][j] + 1.0)) < 1e-9:
+            words.append(WordResult(expected[i - 1], None, "missing", 0.0))
+            i -= 1
+        else:
+            words.append(WordResult(None, spoken[j - 1], "extra", 0.0))
+            j -= 1
+    words.reverse()
+
+    result = AlignmentResult(score=0.0, expected_words=expected, spoken_words=spoken, words=words)
+    credit = 0.0
+    for word in words:
+        setattr(result, word.status, getattr(result, word.status) + 1)
+        if word.status == "correct":
+            credit += 1.0
+        elif word.status == "mispronounced":
+            credit += word.similarity
+    credit -= result.extra * insertion_penalty
+    result.score = round(max(0.0, min(1.0, credit / n)) * 100, 2)
+    return result
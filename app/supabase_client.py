@@ -1,17 +1,22 @@
 import os
+import time
 import asyncio
 from datetime import date, datetime, timedelta
 from supabase.client import create_client, Client
 from dotenv import load_dotenv
 import logging
 from typing import Dict, List, Optional, Tuple
+from app.utils.logging_config import get_logger
+from app.utils.single_flight import SingleFlight
+from app.utils.metrics import DB_SECONDS, VENDOR_ERRORS
+from app.utils.tracing import tracer
 
 # Load environment variables
 load_dotenv(override=True)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -26,9 +31,42 @@ if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
 # Create Supabase client with connection pooling
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
+def _db_table(request) -> str:
+    # /rest/v1/<table> or /rest/v1/rpc/<function>: bounded label values, unlike the query string
+    return request.url.path.split("/rest/v1/", 1)[-1] or "unknown"
+
+def _db_request_started(request):
+    request.extensions["db_started_at"] = time.perf_counter()
+    request.extensions["db_span"] = tracer.start_span("db", table=_db_table(request), method=request.method)
+
+def _db_response_received(response):
+    request = response.request
+    started_at = request.extensions.get("db_started_at")
+    if started_at is None:
+        return
+    DB_SECONDS.observe(time.perf_counter() - started_at, table=_db_table(request), method=request.method)
+    if response.status_code >= 500:
+        VENDOR_ERRORS.inc(vendor="supabase")
+    span = request.extensions.get("db_span")
+    if span is not None:
+        span.set_attribute("status_code", response.status_code)
+        span.end()
+
+def instrument_database_client(client: Client) -> None:
+    """Time and trace every PostgREST round trip of client (httpx event hooks on its session)."""
+    hooks = client.postgrest.session.event_hooks
+    hooks["request"].append(_db_request_started)
+    hooks["response"].append(_db_response_received)
+
+instrument_database_client(supabase)
+
 # Connection warmup function
 async def warmup_database_connections():
     """Warm up database connections to reduce cold start time"""
+    # The supabase-python execute() method is synchronous; keep the queries off the event loop
+    await asyncio.to_thread(_warmup_database_connections)
+
+def _warmup_database_connections():
     print("🔥 [WARMUP] Warming up database connections...")
     try:
         # Test basic connection
@@ -61,15 +99,20 @@ class SupabaseProgressTracker:
     
     def __init__(self):
         self.client = supabase
+        self._content_flight = SingleFlight("content")
         print("🔧 [SUPABASE] Progress Tracker initialized")
         print(f"🔧 [SUPABASE] Connected to: {SUPABASE_URL}")
         logger.info("Supabase Progress Tracker initialized")
     
     async def get_all_stages(self) -> List[Dict]:
-        """Fetches all stages from the content hierarchy."""
+        """Fetches all stages from the content hierarchy (concurrent callers share one query)."""
+        return await self._content_flight.do("all_stages", self._fetch_all_stages)
+
+    async def _fetch_all_stages(self) -> List[Dict]:
         try:
             print("🔄 [CONTENT] Fetching all stages...")
-            result = self.client.rpc('get_all_stages_with_counts').execute()
+            query = self.client.rpc('get_all_stages_with_counts')
+            result = await asyncio.to_thread(query.execute)
             if result.data:
                 print(f"✅ [CONTENT] Found {len(result.data)} stages.")
                 return result.data
@@ -99,7 +142,7 @@ class SupabaseProgressTracker:
         Returns: (current_streak, longest_streak)
         """
         try:
-            print(f"🔄 [STREAK] Calculating streak for user: {user_id}")
+            logger.debug("Calculating streak for user: %s", user_id)
             
             # Get daily analytics for the last 30 days to calculate streak
             thirty_days_ago = current_date - timedelta(days=30)
@@ -108,10 +151,10 @@ class SupabaseProgressTracker:
                 'analytics_date, total_time_minutes, exercises_completed'
             ).eq('user_id', user_id).gte('analytics_date', thirty_days_ago.isoformat()).order('analytics_date', desc=False).execute()
             
-            print(f"📊 [STREAK] Found {len(daily_analytics.data)} daily records")
+            logger.debug(f"Found {len(daily_analytics.data)} daily records")
             
             if not daily_analytics.data:
-                print(f"ℹ️ [STREAK] No daily analytics found, returning 0 streak")
+                logger.debug("No daily analytics found, returning 0 streak")
                 return 0, 0
             
             # Create a set of active dates (where user had activity)
@@ -120,7 +163,7 @@ class SupabaseProgressTracker:
                 if record.get('total_time_minutes', 0) > 0 or record.get('exercises_completed', 0) > 0:
                     active_dates.add(record['analytics_date'])
             
-            print(f"📊 [STREAK] Active dates: {sorted(active_dates)}")
+            logger.debug(f"Active dates: {sorted(active_dates)}")
             
             # Calculate current streak (consecutive days from today backwards)
             current_streak = 0
@@ -134,7 +177,7 @@ class SupabaseProgressTracker:
                 else:
                     break
             
-            print(f"📊 [STREAK] Current streak: {current_streak} days")
+            logger.debug(f"Current streak: {current_streak} days")
             
             # Calculate longest streak from historical data
             longest_streak = 0
@@ -159,11 +202,11 @@ class SupabaseProgressTracker:
             # Check the last streak
             longest_streak = max(longest_streak, temp_streak)
             
-            print(f"📊 [STREAK] Longest streak: {longest_streak} days")
+            logger.debug(f"Longest streak: {longest_streak} days")
             return current_streak, longest_streak
             
         except Exception as e:
-            print(f"❌ [STREAK] Error calculating streak: {str(e)}")
+            logger.error(f"Error calculating streak: {str(e)}")
             logger.error(f"Error calculating streak for user {user_id}: {str(e)}")
             return 0, 0
     
@@ -176,7 +219,7 @@ class SupabaseProgressTracker:
             current_date_iso = date.today().isoformat()
             time_spent_minutes = int(time_spent_seconds / 60)
             
-            print(f"🔄 [DAILY] Updating daily analytics for user: {user_id}, date: {current_date_iso}")
+            logger.debug(f"Updating daily analytics for user: {user_id}, date: {current_date_iso}")
             
             # Get existing daily analytics for today
             existing = self.client.table('ai_tutor_daily_learning_analytics').select('*').eq('user_id', user_id).eq('analytics_date', current_date_iso).execute()
@@ -205,7 +248,7 @@ class SupabaseProgressTracker:
                 }
                 
                 self.client.table('ai_tutor_daily_learning_analytics').update(update_data).eq('user_id', user_id).eq('analytics_date', current_date_iso).execute()
-                print(f"✅ [DAILY] Updated existing daily analytics")
+                logger.debug("Updated existing daily analytics")
                 
             else:
                 # Create new record
@@ -221,10 +264,10 @@ class SupabaseProgressTracker:
                 }
                 
                 self.client.table('ai_tutor_daily_learning_analytics').insert(new_record).execute()
-                print(f"✅ [DAILY] Created new daily analytics record")
+                logger.debug("Created new daily analytics record")
                 
         except Exception as e:
-            print(f"❌ [DAILY] Error updating daily analytics: {str(e)}")
+            logger.error(f"Error updating daily analytics: {str(e)}")
             logger.error(f"Error updating daily analytics for user {user_id}: {str(e)}")
     
     async def _calculate_session_metrics(self, user_id: str) -> Dict[str, float]:
@@ -233,7 +276,7 @@ class SupabaseProgressTracker:
         Returns: total_time_spent_minutes, average_session_duration, weekly_hours, monthly_hours
         """
         try:
-            print(f"🔄 [SESSION] Calculating session metrics for user: {user_id}")
+            logger.debug("Calculating session metrics for user: %s", user_id)
             
             # Get daily analytics for the last 30 days
             thirty_days_ago = date.today() - timedelta(days=30)
@@ -263,11 +306,7 @@ class SupabaseProgressTracker:
             # Calculate monthly hours (last 30 days)
             monthly_hours = total_time_minutes / 60.0
             
-            print(f"📊 [SESSION] Metrics calculated:")
-            print(f"   - Total time (minutes): {total_time_minutes}")
-            print(f"   - Average session: {average_session_duration:.2f} minutes")
-            print(f"   - Weekly hours: {weekly_hours:.2f}")
-            print(f"   - Monthly hours: {monthly_hours:.2f}")
+            logger.debug(f"Metrics calculated: Total time (minutes): {total_time_minutes}, Average session: {average_session_duration:.2f} minutes, Weekly hours: {weekly_hours:.2f}, Monthly hours: {monthly_hours:.2f}")
                 
             return {
                 'total_time_spent_minutes': total_time_minutes,
@@ -277,7 +316,7 @@ class SupabaseProgressTracker:
             }
             
         except Exception as e:
-            print(f"❌ [SESSION] Error calculating session metrics: {str(e)}")
+            logger.error(f"Error calculating session metrics: {str(e)}")
             logger.error(f"Error calculating session metrics for user {user_id}: {str(e)}")
             return {
                 'average_session_duration_minutes': 0.0,
@@ -288,7 +327,7 @@ class SupabaseProgressTracker:
     async def _calculate_total_learning_time(self, user_id: str) -> int:
         """Calculates the user's all-time total learning time from daily analytics."""
         try:
-            print(f"🔄 [SESSION] Calculating ALL-TIME learning time for user: {user_id}")
+            logger.debug("Calculating ALL-TIME learning time for user: %s", user_id)
             # Get all daily analytics records for the user
             analytics_result = self.client.table('ai_tutor_daily_learning_analytics').select(
                 'total_time_minutes'
@@ -299,11 +338,11 @@ class SupabaseProgressTracker:
                 
             # Sum up the total time spent
             total_time = sum(record.get('total_time_minutes', 0) for record in analytics_result.data)
-            print(f"📊 [SESSION] All-time learning time: {total_time} minutes")
+            logger.debug(f"All-time learning time: {total_time} minutes")
             return total_time
             
         except Exception as e:
-            print(f"❌ [SESSION] Error calculating all-time learning time: {str(e)}")
+            logger.error(f"Error calculating all-time learning time: {str(e)}")
             logger.error(f"Error calculating all-time learning time for {user_id}: {str(e)}")
             return 0
     
@@ -315,17 +354,15 @@ class SupabaseProgressTracker:
         If an `assigned_start_stage` is provided, the user starts from that stage, 
         and all previous stages are marked as completed. Stage 0 is treated as Stage 1 for progress.
         """
-        print(f"🔄 [INIT] Starting progress initialization for user: {user_id}")
-        print(f"🚀 [INIT] Assigned Start Stage: {assigned_start_stage}")
+        logger.debug("progress_init.start", user_id=user_id, start_stage=assigned_start_stage)
         try:
             # Step 1: Fetch dynamic curriculum structure
-            print("🔄 [INIT] Fetching dynamic curriculum structure...")
             all_stages = await self.get_all_stages()
             if not all_stages:
                 raise ValueError("Could not fetch curriculum stages from the database.")
             
             total_stages_count = len(all_stages)
-            print(f"📚 [INIT] Found {total_stages_count} stages in the curriculum.")
+            logger.debug("progress_init.curriculum", stages=total_stages_count)
 
             # Step 2: Prepare all the data needed for initialization
             current_date = date.today()
@@ -370,12 +407,9 @@ class SupabaseProgressTracker:
                 "first_activity_date": current_date.isoformat(),
             }
 
-            print(f"📝 [INIT] Upserting progress summary...")
             summary_result = self.client.table('ai_tutor_user_progress_summary').upsert(progress_summary_payload).execute()
-            print(f"✅ [INIT] Progress summary upserted successfully.")
 
             # Step 4: Create/Update stage progress records
-            print("🔍 [INIT] Checking for existing stage progress records...")
             existing_stages_res = self.client.table('ai_tutor_user_stage_progress').select('*').eq('user_id', user_id).execute()
             existing_stages = {s['stage_id']: s for s in existing_stages_res.data}
             
@@ -393,7 +427,6 @@ class SupabaseProgressTracker:
                         "completed_at": current_timestamp, "completed": True,
                         "progress_percentage": 100.0, "exercises_completed": len(exercises_in_stage)
                     })
-                    print(f"📝 [INIT] Will create completed stage progress for stage {stage_id}")
                 else:
                     # Update existing stage progress record to mark as completed
                     existing_stage = existing_stages[stage_id]
@@ -405,21 +438,16 @@ class SupabaseProgressTracker:
                             "progress_percentage": 100.0,
                             "exercises_completed": len(exercises_in_stage)
                         })
-                        print(f"📝 [INIT] Will update stage {stage_id} to completed")
             
             # Handle current stage (starting stage)
             if start_stage not in existing_stages:
                 stage_progress_to_create.append({"user_id": user_id, "stage_id": start_stage, "started_at": current_timestamp})
-                print(f"📝 [INIT] Will create stage progress for starting stage {start_stage}")
             
             # Execute stage progress operations
             if stage_progress_to_create:
-                print(f"📝 [INIT] Creating {len(stage_progress_to_create)} new stage progress records...")
                 self.client.table('ai_tutor_user_stage_progress').insert(stage_progress_to_create).execute()
-                print("✅ [INIT] Stage progress records created.")
             
             if stage_progress_to_update:
-                print(f"📝 [INIT] Updating {len(stage_progress_to_update)} existing stage progress records...")
                 for update_data in stage_progress_to_update:
                     self.client.table('ai_tutor_user_stage_progress').update({
                         "completed": update_data["completed"],
@@ -427,13 +455,8 @@ class SupabaseProgressTracker:
                         "progress_percentage": update_data["progress_percentage"],
                         "exercises_completed": update_data["exercises_completed"]
                     }).eq('user_id', user_id).eq('stage_id', update_data["stage_id"]).execute()
-                print("✅ [INIT] Stage progress records updated.")
-            
-            if not stage_progress_to_create and not stage_progress_to_update:
-                print("✅ [INIT] No stage progress records needed.")
 
             # Step 5: Create exercise progress records for completed stages
-            print("🔍 [INIT] Creating exercise progress records for completed stages...")
             existing_exercises_res = self.client.table('ai_tutor_user_exercise_progress').select('stage_id, exercise_id').eq('user_id', user_id).execute()
             existing_exercises = {(e['stage_id'], e['exercise_id']) for e in existing_exercises_res.data}
             
@@ -460,17 +483,11 @@ class SupabaseProgressTracker:
                             "time_spent_minutes": 0,
                             "current_topic_id": 1
                         })
-                        print(f"📝 [INIT] Will create completed exercise progress for stage {stage_id}, exercise {exercise_id}")
             
             if exercise_progress_to_create:
-                print(f"📝 [INIT] Creating {len(exercise_progress_to_create)} exercise progress records...")
                 self.client.table('ai_tutor_user_exercise_progress').insert(exercise_progress_to_create).execute()
-                print("✅ [INIT] Exercise progress records created.")
-            else:
-                print("✅ [INIT] No exercise progress records needed.")
 
             # Step 6: Create topic progress records for completed stages
-            print("🔍 [INIT] Creating topic progress records for completed stages...")
             existing_topics_res = self.client.table('ai_tutor_user_topic_progress').select('stage_id, exercise_id, topic_id').eq('user_id', user_id).execute()
             existing_topics = {(t['stage_id'], t['exercise_id'], t['topic_id']) for t in existing_topics_res.data}
             
@@ -497,17 +514,11 @@ class SupabaseProgressTracker:
                                     "completed": True,
                                     "total_time_seconds": 0
                                 })
-                                print(f"📝 [INIT] Will create completed topic progress for stage {stage_id}, exercise {exercise_id}, topic {topic_id}")
             
             if topic_progress_to_create:
-                print(f"📝 [INIT] Creating {len(topic_progress_to_create)} topic progress records...")
                 self.client.table('ai_tutor_user_topic_progress').insert(topic_progress_to_create).execute()
-                print("✅ [INIT] Topic progress records created.")
-            else:
-                print("✅ [INIT] No topic progress records needed.")
 
             # Step 7: Create/Update learning unlock records
-            print("🔍 [INIT] Checking for existing learning unlock records...")
             existing_unlocks_res = self.client.table('ai_tutor_learning_unlocks').select('*').eq('user_id', user_id).execute()
             existing_unlocks = {(u['stage_id'], u['exercise_id']): u for u in existing_unlocks_res.data}
 
@@ -535,7 +546,6 @@ class SupabaseProgressTracker:
                             "unlocked_at": current_timestamp if should_be_unlocked else None,
                             "unlocked_by_criteria": "Initial assignment" if should_be_unlocked else None
                         })
-                        print(f"📝 [INIT] Will update stage {stage_id} unlock to: {should_be_unlocked}")
                 else:
                     unlocks_to_create.append({
                         "user_id": user_id, 
@@ -546,7 +556,6 @@ class SupabaseProgressTracker:
                         "unlocked_at": current_timestamp if should_be_unlocked else None, 
                         "unlocked_by_criteria": "Initial assignment" if should_be_unlocked else None
                     })
-                    print(f"📝 [INIT] Will create stage {stage_id} unlock: {should_be_unlocked}")
                 
                 # Exercise unlock records for this stage
                 exercises_in_stage = await self.get_exercises_for_stage(stage_id)
@@ -574,7 +583,6 @@ class SupabaseProgressTracker:
                                 "unlocked_at": current_timestamp if exercise_should_be_unlocked else None,
                                 "unlocked_by_criteria": "Initial assignment" if exercise_should_be_unlocked else None
                             })
-                            print(f"📝 [INIT] Will update stage {stage_id}, exercise {exercise_id} unlock to: {exercise_should_be_unlocked}")
                     else:
                         unlocks_to_create.append({
                             "user_id": user_id,
@@ -585,16 +593,12 @@ class SupabaseProgressTracker:
                             "unlocked_at": current_timestamp if exercise_should_be_unlocked else None,
                             "unlocked_by_criteria": "Initial assignment" if exercise_should_be_unlocked else None
                         })
-                        print(f"📝 [INIT] Will create stage {stage_id}, exercise {exercise_id} unlock: {exercise_should_be_unlocked}")
 
             # Execute unlock operations
             if unlocks_to_create:
-                print(f"📝 [INIT] Creating {len(unlocks_to_create)} new learning unlock records...")
                 self.client.table('ai_tutor_learning_unlocks').insert(unlocks_to_create).execute()
-                print("✅ [INIT] Learning unlock records created.")
             
             if unlocks_to_update:
-                print(f"📝 [INIT] Updating {len(unlocks_to_update)} existing learning unlock records...")
                 for update_data in unlocks_to_update:
                     # Handle None exercise_id properly for stage-level unlocks
                     query = self.client.table('ai_tutor_learning_unlocks').update({
@@ -611,27 +615,22 @@ class SupabaseProgressTracker:
                         query = query.eq('exercise_id', update_data["exercise_id"])
                     
                     query.execute()
-                print("✅ [INIT] Learning unlock records updated.")
-            
-            if not unlocks_to_create and not unlocks_to_update:
-                print("✅ [INIT] No learning unlock records needed.")
 
-            print(f"🎉 [INIT] Successfully initialized progress for user: {user_id}")
+            logger.info("progress_init.done", user_id=user_id, start_stage=start_stage,
+                        stages_created=len(stage_progress_to_create), stages_updated=len(stage_progress_to_update),
+                        exercises_created=len(exercise_progress_to_create), topics_created=len(topic_progress_to_create),
+                        unlocks_created=len(unlocks_to_create), unlocks_updated=len(unlocks_to_update))
             return {"success": True, "message": "User progress initialized successfully", "data": summary_result.data[0] if summary_result.data else None}
             
         except Exception as e:
-            import traceback
-            print(f"❌ [INIT] Error initializing user progress for {user_id}: {str(e)}")
-            print(f"Traceback: {traceback.format_exc()}")
-            logger.error(f"Error initializing user progress for {user_id}: {str(e)}")
+            logger.exception("progress_init.failed", user_id=user_id)
             return {"success": False, "error": str(e)}
     
     async def record_topic_attempt(self, user_id: str, stage_id: int, exercise_id: int, topic_id: int, 
                                  score: float, urdu_used: bool, time_spent_seconds: int, completed: bool) -> dict:
         """Record a topic attempt with detailed metrics"""
-        print(f"🔄 [TOPIC] Recording topic attempt for user {user_id}")
-        print(f"📊 [TOPIC] Details: stage={stage_id}, exercise={exercise_id}, topic={topic_id}")
-        print(f"📊 [TOPIC] Metrics: score={score}, urdu_used={urdu_used}, time_spent={time_spent_seconds}s, completed={completed}")
+        logger.debug("topic_attempt.start", user_id=user_id, stage=stage_id, exercise=exercise_id, topic=topic_id,
+                     score=score, urdu_used=urdu_used, time_spent_seconds=time_spent_seconds, completed=completed)
         
         try:
             # Validate input parameters
@@ -653,11 +652,10 @@ class SupabaseProgressTracker:
                 raise ValueError(f"Invalid score: {score}. Must be between 0 and 100")
             
             if not (1 <= time_spent_seconds <= 3600):  # Max 1 hour per attempt
-                print(f"⚠️ [TOPIC] Time spent {time_spent_seconds}s exceeds normal range, capping at 3600s")
+                logger.warning("topic_attempt.time_capped", user_id=user_id, time_spent_seconds=time_spent_seconds)
                 time_spent_seconds = min(time_spent_seconds, 3600)
             
             # Check if topic attempt already exists for this user and topic
-            print(f"🔍 [TOPIC] Checking if topic attempt already exists for user {user_id}, topic {topic_id}...")
             existing_attempt = self.client.table('ai_tutor_user_topic_progress').select('*').eq('user_id', user_id).eq('stage_id', stage_id).eq('exercise_id', exercise_id).eq('topic_id', topic_id).execute()
             
             if existing_attempt.data:
@@ -666,8 +664,7 @@ class SupabaseProgressTracker:
                 current_attempt_num = existing_record.get('attempt_num', 1)
                 new_attempt_num = current_attempt_num + 1
                 
-                print(f"📝 [TOPIC] Topic attempt exists. Current attempt: {current_attempt_num}, new attempt: {new_attempt_num}")
-                print(f"📊 [TOPIC] Existing record: {existing_record}")
+                logger.debug("topic_attempt.update", user_id=user_id, topic=topic_id, attempt=new_attempt_num)
                 
                 # Prepare update data
                 update_data = {
@@ -678,13 +675,11 @@ class SupabaseProgressTracker:
                     "total_time_seconds": time_spent_seconds
                 }
                 
-                print(f"📝 [TOPIC] Updating existing topic progress record: {update_data}")
                 result = self.client.table('ai_tutor_user_topic_progress').update(update_data).eq('user_id', user_id).eq('stage_id', stage_id).eq('exercise_id', exercise_id).eq('topic_id', topic_id).execute()
-                print(f"✅ [TOPIC] Topic progress updated: {result.data[0] if result.data else 'No data'}")
                 
             else:
                 # Topic attempt doesn't exist - insert new record
-                print(f"📝 [TOPIC] No existing topic attempt found. Creating new record with attempt_num=1")
+                logger.debug("topic_attempt.insert", user_id=user_id, topic=topic_id, attempt=1)
                 
                 topic_progress = {
                     "user_id": user_id,
@@ -698,43 +693,39 @@ class SupabaseProgressTracker:
                     "total_time_seconds": time_spent_seconds
                 }
                 
-                print(f"📝 [TOPIC] Creating new topic progress record: {topic_progress}")
                 result = self.client.table('ai_tutor_user_topic_progress').insert(topic_progress).execute()
-                print(f"✅ [TOPIC] Topic progress created: {result.data[0] if result.data else 'No data'}")
             
             # Update daily analytics
             await self._update_daily_analytics(user_id, time_spent_seconds, score, urdu_used, completed)
             
             # Update exercise progress
-            print(f"🔄 [TOPIC] Updating exercise progress...")
             await self._update_exercise_progress(user_id, stage_id, exercise_id, score, urdu_used, time_spent_seconds, topic_id, completed)
             
             # Update user progress summary
-            print(f"🔄 [TOPIC] Updating user progress summary...")
             await self._update_user_progress_summary(user_id, stage_id, exercise_id, topic_id, time_spent_seconds)
             
-            print(f"✅ [TOPIC] Successfully recorded topic attempt for user {user_id}")
-            logger.info(f"Successfully recorded topic attempt for user {user_id}")
+            logger.info("topic_attempt.recorded", user_id=user_id, stage=stage_id, exercise=exercise_id,
+                        topic=topic_id, score=score, completed=completed)
             return {"success": True, "data": result.data[0] if result.data else None}
             
         except Exception as e:
-            print(f"❌ [TOPIC] Error recording topic attempt for {user_id}: {str(e)}")
-            logger.error(f"Error recording topic attempt for {user_id}: {str(e)}")
+            logger.error("topic_attempt.failed", user_id=user_id, stage=stage_id, exercise=exercise_id,
+                         topic=topic_id, error=str(e))
             return {"success": False, "error": str(e)}
     
     async def _update_exercise_progress(self, user_id: str, stage_id: int, exercise_id: int, 
                                       score: float, urdu_used: bool, time_spent_seconds: int, 
                                       topic_id: int, completed: bool):
         """Update exercise-level progress metrics"""
-        print(f"🔄 [EXERCISE] Updating exercise progress for user {user_id}, stage {stage_id}, exercise {exercise_id}")
+        logger.debug(f"Updating exercise progress for user {user_id}, stage {stage_id}, exercise {exercise_id}")
         try:
             # Get current exercise progress
-            print(f"🔍 [EXERCISE] Fetching current exercise progress...")
+            logger.debug("Fetching current exercise progress...")
             current = self.client.table('ai_tutor_user_exercise_progress').select('*').eq('user_id', user_id).eq('stage_id', stage_id).eq('exercise_id', exercise_id).execute()
             
             if not current.data:
-                print(f"⚠️ [EXERCISE] No exercise progress found for user {user_id}, stage {stage_id}, exercise {exercise_id}")
-                print(f"🆕 [EXERCISE] Creating new exercise progress record...")
+                logger.warning(f"No exercise progress found for user {user_id}, stage {stage_id}, exercise {exercise_id}")
+                logger.debug("Creating new exercise progress record...")
                 
                 # Create new exercise progress record
                 current_timestamp = datetime.now().isoformat()
@@ -773,24 +764,24 @@ class SupabaseProgressTracker:
                     "last_attempt_at": current_timestamp
                 }
                 
-                print(f"📝 [EXERCISE] Creating new exercise progress: {new_exercise_data}")
+                logger.debug("Creating new exercise progress: %s", new_exercise_data)
                 create_result = self.client.table('ai_tutor_user_exercise_progress').insert(new_exercise_data).execute()
-                print(f"✅ [EXERCISE] New exercise progress created: {create_result.data[0] if create_result.data else 'No data'}")
+                logger.debug(f"New exercise progress created: {create_result.data[0] if create_result.data else 'No data'}")
                 return
             
             exercise_data = current.data[0]
-            print(f"📊 [EXERCISE] Current exercise data: {exercise_data}")
+            logger.debug("Current exercise data: %s", exercise_data)
             
             # Update arrays and metrics
             scores = exercise_data.get('scores', []) + [score]
             urdu_used_array = exercise_data.get('urdu_used', []) + [urdu_used]
             
-            print(f"📊 [EXERCISE] Updated scores array: {scores}")
-            print(f"📊 [EXERCISE] Updated urdu_used array: {urdu_used_array}")
+            logger.debug("Updated scores array: %s", scores)
+            logger.debug("Updated urdu_used array: %s", urdu_used_array)
             
             # Keep only last 5 scores for recent performance
             last_5_scores = scores[-5:] if len(scores) > 5 else scores
-            print(f"📊 [EXERCISE] Last 5 scores: {last_5_scores}")
+            logger.debug("Last 5 scores: %s", last_5_scores)
             
             # Calculate new metrics
             total_score = sum(scores)
@@ -799,19 +790,15 @@ class SupabaseProgressTracker:
             # Convert to integer for database compatibility
             time_spent_minutes = int(exercise_data.get('time_spent_minutes', 0) + (time_spent_seconds / 60))
             
-            print(f"📊 [EXERCISE] Calculated metrics:")
-            print(f"   - Total score: {total_score}")
-            print(f"   - Average score: {average_score:.2f}")
-            print(f"   - Best score: {best_score}")
-            print(f"   - Time spent: {time_spent_minutes} minutes")
+            logger.debug(f"Calculated metrics: Total score: {total_score}, Average score: {average_score:.2f}, Best score: {best_score}, Time spent: {time_spent_minutes} minutes")
             
             # Check if exercise is mature (average score >= threshold)
             if exercise_id == 3:  # Problem-solving exercise
                 mature = average_score >= 60  # 60% threshold for problem-solving
-                print(f"📊 [EXERCISE] Exercise mature: {mature} (average >= 60)")
+                logger.debug(f"Exercise mature: {mature} (average >= 60)")
             else:
                 mature = average_score >= 80  # 80% threshold for other exercises
-                print(f"📊 [EXERCISE] Exercise mature: {mature} (average >= 80)")
+                logger.debug(f"Exercise mature: {mature} (average >= 80)")
             
             # --- BEGIN FIX: Correct Exercise Completion Logic ---
             # An exercise is complete only when ALL of its topics are marked as complete.
@@ -852,11 +839,11 @@ class SupabaseProgressTracker:
                 # Increment topic_id for next topic when current topic is completed
                 next_topic_id = topic_number + 1
                 update_data["current_topic_id"] = next_topic_id
-                print(f"🎉 [EXERCISE] Topic {topic_number} completed! Moving to topic {next_topic_id}")
+                logger.debug(f"Topic {topic_number} completed! Moving to topic {next_topic_id}")
             elif topic_id and topic_number > current_topic_id:
                 # Update topic_id if user is working on a higher topic
                 update_data["current_topic_id"] = topic_number
-                print(f"📝 [EXERCISE] Updated current_topic_id to {topic_number}")
+                logger.debug("Updated current_topic_id to %s", topic_number)
             
             # Check if exercise is completed - only when ALL topics are completed
             # We need to check if all topics in this exercise have been completed
@@ -871,48 +858,46 @@ class SupabaseProgressTracker:
                         completed_topics_result = self.client.table('ai_tutor_user_topic_progress').select('topic_id').eq('user_id', user_id).eq('stage_id', stage_id).eq('exercise_id', exercise_id).eq('completed', True).execute()
                         completed_topics_count = len(completed_topics_result.data) if completed_topics_result.data else 0
                         
-                        print(f"🔍 [EXERCISE] Exercise completion check:")
-                        print(f"   - Total topics in exercise: {total_topics_in_exercise}")
-                        print(f"   - Completed topics: {completed_topics_count}")
+                        logger.debug(f"Exercise completion check: Total topics in exercise: {total_topics_in_exercise}, Completed topics: {completed_topics_count}")
                         
                         # Exercise is completed only when ALL topics are completed
                         if completed_topics_count >= total_topics_in_exercise:
                             update_data["completed_at"] = current_timestamp
-                            print(f"🎉 [EXERCISE] Exercise marked as completed! ({completed_topics_count}/{total_topics_in_exercise} topics)")
+                            logger.debug(f"Exercise marked as completed! ({completed_topics_count}/{total_topics_in_exercise} topics)")
                         else:
-                            print(f"📝 [EXERCISE] Exercise not yet completed ({completed_topics_count}/{total_topics_in_exercise} topics)")
+                            logger.debug(f"Exercise not yet completed ({completed_topics_count}/{total_topics_in_exercise} topics)")
                     else:
-                        print(f"⚠️ [EXERCISE] Could not determine total topics for exercise {stage_id}-{exercise_id}")
+                        logger.warning(f"Could not determine total topics for exercise {stage_id}-{exercise_id}")
                 except Exception as e:
-                    print(f"❌ [EXERCISE] Error checking exercise completion: {str(e)}")
+                    logger.error(f"Error checking exercise completion: {str(e)}")
                     # Don't mark as completed if we can't verify
             
-            print(f"📝 [EXERCISE] Updating exercise with data: {update_data}")
+            logger.debug("Updating exercise with data: %s", update_data)
             update_result = self.client.table('ai_tutor_user_exercise_progress').update(update_data).eq('user_id', user_id).eq('stage_id', stage_id).eq('exercise_id', exercise_id).execute()
-            print(f"✅ [EXERCISE] Exercise progress updated successfully")
+            logger.debug("Exercise progress updated successfully")
             
             logger.info(f"Updated exercise progress for user {user_id}, stage {stage_id}, exercise {exercise_id}")
             
         except Exception as e:
-            print(f"❌ [EXERCISE] Error updating exercise progress: {str(e)}")
+            logger.error(f"Error updating exercise progress: {str(e)}")
             logger.error(f"Error updating exercise progress: {str(e)}")
     
     async def _update_user_progress_summary(self, user_id: str, stage_id: int, exercise_id: int, 
                                           topic_id: int, time_spent_seconds: int):
         """Update user progress summary with latest activity"""
-        print(f"🔄 [SUMMARY] Updating user progress summary for user {user_id}")
+        logger.debug("Updating user progress summary for user %s", user_id)
         try:
             # Get current progress summary
-            print(f"🔍 [SUMMARY] Fetching current progress summary...")
+            logger.debug("Fetching current progress summary...")
             current = self.client.table('ai_tutor_user_progress_summary').select('*').eq('user_id', user_id).execute()
             
             if not current.data:
-                print(f"⚠️ [SUMMARY] No progress summary found for user {user_id}")
+                logger.warning(f"No progress summary found for user {user_id}")
                 logger.warning(f"No progress summary found for user {user_id}")
                 return
             
             summary = current.data[0]
-            print(f"📊 [SUMMARY] Current summary: {summary}")
+            logger.debug("Current summary: %s", summary)
             
             # Update current position
             current_date = date.today()
@@ -930,59 +915,56 @@ class SupabaseProgressTracker:
                 "updated_at": current_timestamp
             }
             
-            print(f"📝 [SUMMARY] Updating current position: stage={stage_id}, exercise={exercise_id}, topic={topic_id}")
+            logger.debug(f"Updating current position: stage={stage_id}, exercise={exercise_id}, topic={topic_id}")
             
             # Calculate total exercises completed - use completed_at IS NOT NULL instead of completed column
-            print(f"🔍 [SUMMARY] Calculating total exercises completed...")
+            logger.debug("Calculating total exercises completed...")
             completed_exercises = self.client.table('ai_tutor_user_exercise_progress').select('*').eq('user_id', user_id).not_.is_('completed_at', 'null').execute()
             update_data["total_exercises_completed"] = len(completed_exercises.data)
-            print(f"📊 [SUMMARY] Total exercises completed: {len(completed_exercises.data)}")
+            logger.debug(f"Total exercises completed: {len(completed_exercises.data)}")
             
             # Calculate overall progress percentage
             total_stages = 6
-            print(f"🔍 [SUMMARY] Calculating overall progress percentage...")
+            logger.debug("Calculating overall progress percentage...")
             completed_stages = self.client.table('ai_tutor_user_stage_progress').select('*').eq('user_id', user_id).not_.is_('completed_at', 'null').execute()
             overall_progress = (len(completed_stages.data) / total_stages) * 100
             update_data["overall_progress_percentage"] = overall_progress
-            print(f"📊 [SUMMARY] Overall progress: {overall_progress:.2f}% ({len(completed_stages.data)}/{total_stages} stages)")
+            logger.debug(f"Overall progress: {overall_progress:.2f}% ({len(completed_stages.data)}/{total_stages} stages)")
             
             # Calculate proper streak
             current_streak, longest_streak = await self._calculate_streak(user_id, current_date)
             update_data["streak_days"] = current_streak
             update_data["longest_streak"] = max(summary.get('longest_streak', 0), longest_streak)
-            print(f"📊 [SUMMARY] Updated streak: current={current_streak}, longest={update_data['longest_streak']}")
+            logger.debug(f"Updated streak: current={current_streak}, longest={update_data['longest_streak']}")
             
             # Calculate session metrics
             session_metrics = await self._calculate_session_metrics(user_id)
             update_data.update(session_metrics)
-            print(f"📊 [SUMMARY] Session metrics updated: {session_metrics}")
+            logger.debug("Session metrics updated: %s", session_metrics)
             
-            print(f"📝 [SUMMARY] Final update data: {update_data}")
+            logger.debug("Final update data: %s", update_data)
             update_result = self.client.table('ai_tutor_user_progress_summary').update(update_data).eq('user_id', user_id).execute()
-            print(f"✅ [SUMMARY] User progress summary updated successfully")
+            logger.debug("User progress summary updated successfully")
             
             logger.info(f"Updated progress summary for user {user_id}")
             
         except Exception as e:
-            print(f"❌ [SUMMARY] Error updating user progress summary: {str(e)}")
+            logger.error(f"Error updating user progress summary: {str(e)}")
             logger.error(f"Error updating user progress summary: {str(e)}")
     
     async def get_user_progress(self, user_id: str) -> dict:
         """Get comprehensive user progress data"""
-        print(f"🔄 [GET] Getting comprehensive user progress for user {user_id}")
+        logger.debug("user_progress.get", user_id=user_id)
         try:
             # Validate user_id
             if not user_id or not user_id.strip():
                 raise ValueError("User ID is required")
             
             # Get progress summary
-            print(f"🔍 [GET] Fetching progress summary...")
             summary_res = self.client.table('ai_tutor_user_progress_summary').select('*').eq('user_id', user_id).execute()
             summary = summary_res.data[0] if summary_res.data else {}
-            print(f"📊 [GET] Initial progress summary from DB: {summary}")
 
             # Always calculate fresh statistics to ensure data is up-to-date
-            print(f"🔄 [GET] Recalculating latest statistics for user {user_id}...")
             current_date = date.today()
             
             # Calculate all-time total learning time from the source of truth
@@ -999,7 +981,6 @@ class SupabaseProgressTracker:
             summary.update(session_metrics)
             
             # --- BEGIN FIX: Recalculate current_stage from exercise completion data ---
-            print(f"🔄 [GET] Recalculating current stage from exercise completion data for user {user_id}...")
             try:
                 # Get all exercises for this user with a completion date
                 user_exercises_res = self.client.table('ai_tutor_user_exercise_progress').select('stage_id, exercise_id, completed_at').eq('user_id', user_id).not_.is_('completed_at', 'null').execute()
@@ -1038,28 +1019,21 @@ class SupabaseProgressTracker:
                         max_stage_num = sorted_stages[-1]['stage_number']
                         recalculated_current_stage = min(recalculated_current_stage, max_stage_num)
 
-                        print(f"📊 [GET] Recalculated current stage is: {recalculated_current_stage}. DB summary value was: {summary.get('current_stage')}")
+                        logger.debug("user_progress.stage_recalculated", user_id=user_id, stage=recalculated_current_stage,
+                                     stored_stage=summary.get('current_stage'))
                         summary['current_stage'] = recalculated_current_stage
             except Exception as e:
-                print(f"❌ [GET] Error recalculating current stage: {str(e)}. Using value from summary.")
+                logger.warning("user_progress.stage_recalculation_failed", user_id=user_id, error=str(e))
             # --- END FIX ---
             
-            print(f"📊 [GET] Final updated summary with fresh stats: {summary}")
-            
             # Get stage progress
-            print(f"🔍 [GET] Fetching stage progress...")
             stages = self.client.table('ai_tutor_user_stage_progress').select('*').eq('user_id', user_id).execute()
-            print(f"📊 [GET] Stage progress: {len(stages.data)} stages")
             
             # Get exercise progress
-            print(f"🔍 [GET] Fetching exercise progress...")
             exercises = self.client.table('ai_tutor_user_exercise_progress').select('*').eq('user_id', user_id).execute()
-            print(f"📊 [GET] Exercise progress: {len(exercises.data)} exercises")
             
             # Get learning unlocks
-            print(f"🔍 [GET] Fetching learning unlocks...")
             unlocks = self.client.table('ai_tutor_learning_unlocks').select('*').eq('user_id', user_id).execute()
-            print(f"📊 [GET] Learning unlocks: {len(unlocks.data)} unlocks")
             
             result_data = {
                 "summary": summary,
@@ -1068,15 +1042,15 @@ class SupabaseProgressTracker:
                 "unlocks": unlocks.data
             }
             
-            print(f"✅ [GET] Successfully retrieved user progress data")
+            logger.debug("user_progress.done", user_id=user_id, stages=len(stages.data), exercises=len(exercises.data),
+                         unlocks=len(unlocks.data))
             return {
                 "success": True,
                 "data": result_data
             }
             
         except Exception as e:
-            print(f"❌ [GET] Error getting user progress for {user_id}: {str(e)}")
-            logger.error(f"Error getting user progress for {user_id}: {str(e)}")
+            logger.exception("user_progress.failed", user_id=user_id)
             return {"success": False, "error": str(e)}
     
     async def get_topics_for_exercise(self, stage_id: int, exercise_id: int) -> dict:
@@ -1306,16 +1280,14 @@ class SupabaseProgressTracker:
     
     async def check_and_unlock_content(self, user_id: str) -> dict:
         """Check if user should unlock new content based on progress"""
-        print(f"🔄 [UNLOCK] Checking content unlocks for user {user_id}")
         try:
             # Validate user_id
             if not user_id or not user_id.strip():
                 raise ValueError("User ID is required")
             
             # Get current exercise progress - use completed_at IS NOT NULL instead of completed column
-            print(f"🔍 [UNLOCK] Fetching completed exercises...")
             completed_exercises_res = self.client.table('ai_tutor_user_exercise_progress').select('*').eq('user_id', user_id).not_.is_('completed_at', 'null').execute()
-            print(f"📊 [UNLOCK] Found {len(completed_exercises_res.data)} completed exercises")
+            logger.debug("unlock_check.start", user_id=user_id, completed_exercises=len(completed_exercises_res.data))
             
             unlocked_content = []
             current_timestamp = datetime.now().isoformat()
@@ -1330,14 +1302,12 @@ class SupabaseProgressTracker:
             
             all_stages_list = await self.get_all_stages()
             if not all_stages_list:
-                print("⚠️ [UNLOCK] Could not fetch stage list for unlocking logic.")
+                logger.warning("unlock_check.no_stages", user_id=user_id)
                 return {"success": False, "error": "Could not fetch stages."}
 
             max_stage_num = max(s['stage_number'] for s in all_stages_list)
 
             for stage_id, completed_ids in completed_by_stage.items():
-                print(f"🔍 [UNLOCK] Processing stage {stage_id} with completed exercises: {completed_ids}")
-                
                 all_exercises_in_stage = await self.get_exercises_for_stage(stage_id)
                 if not all_exercises_in_stage:
                     continue
@@ -1352,7 +1322,7 @@ class SupabaseProgressTracker:
                     # Unlock the next stage if it's not the final stage
                     if stage_id < max_stage_num:
                         next_stage_id = stage_id + 1
-                        print(f"✅ [UNLOCK] All exercises in stage {stage_id} completed. Unlocking stage {next_stage_id}.")
+                        logger.info("unlock_check.stage_unlocked", user_id=user_id, completed_stage=stage_id, stage=next_stage_id)
                         
                         # Unlock the next stage itself
                         await self.unlock_stage_for_user(user_id, next_stage_id, f"Completed all exercises in stage {stage_id}", unlocked_content)
@@ -1361,7 +1331,6 @@ class SupabaseProgressTracker:
                         await self.unlock_first_exercise_of_stage(user_id, next_stage_id, unlocked_content)
 
                         # --- BEGIN FIX: Update user's current stage AND unlocked stages list in the summary table ---
-                        print(f"🔄 [UNLOCK] Updating user's summary: current stage to {next_stage_id} and adding to unlocked list.")
                         try:
                             # Fetch current summary to get unlocked_stages list
                             summary_res = self.client.table('ai_tutor_user_progress_summary').select('unlocked_stages').eq('user_id', user_id).single().execute()
@@ -1376,10 +1345,8 @@ class SupabaseProgressTracker:
                                 'current_stage': next_stage_id,
                                 'unlocked_stages': current_unlocked
                             }).eq('user_id', user_id).execute()
-                            print(f"✅ [UNLOCK] Successfully updated summary for user {user_id}")
-                        except Exception as e:
-                            print(f"❌ [UNLOCK] Failed to update summary for user {user_id}: {str(e)}")
-                            logger.error(f"Failed to update summary for user {user_id}: {str(e)}")
+                        except Exception:
+                            logger.exception("unlock_check.summary_update_failed", user_id=user_id, stage=next_stage_id)
                         # --- END FIX ---
 
                 # Unlock the next exercise WITHIN the current stage if applicable
@@ -1393,7 +1360,6 @@ class SupabaseProgressTracker:
                         
                         if not existing_unlock.data:
                             # Record doesn't exist, create it - THIS IS NEWLY UNLOCKED
-                            print(f"🔓 [UNLOCK] Creating unlock record for exercise {next_exercise_id} in stage {stage_id}")
                             unlock_data = {
                                 "user_id": user_id,
                                 "stage_id": stage_id,
@@ -1403,10 +1369,9 @@ class SupabaseProgressTracker:
                             }
                             self.client.table('ai_tutor_learning_unlocks').insert(unlock_data).execute()
                             unlocked_content.append(f"Stage {stage_id}, Exercise {next_exercise_id}")
-                            print(f"🎉 [UNLOCK] NEWLY UNLOCKED: Stage {stage_id}, Exercise {next_exercise_id}")
+                            logger.info("unlock_check.exercise_unlocked", user_id=user_id, stage=stage_id, exercise=next_exercise_id)
                         elif not existing_unlock.data[0]['is_unlocked']:
                             # Record exists but is locked, update it - THIS IS NEWLY UNLOCKED
-                            print(f"🔓 [UNLOCK] Updating unlock record for exercise {next_exercise_id} in stage {stage_id}")
                             update_data = {
                                 "is_unlocked": True, 
                                 "unlock_criteria_met": True, 
@@ -1415,17 +1380,14 @@ class SupabaseProgressTracker:
                             }
                             self.client.table('ai_tutor_learning_unlocks').update(update_data).eq('user_id', user_id).eq('stage_id', stage_id).eq('exercise_id', next_exercise_id).execute()
                             unlocked_content.append(f"Stage {stage_id}, Exercise {next_exercise_id}")
-                            print(f"🎉 [UNLOCK] NEWLY UNLOCKED: Stage {stage_id}, Exercise {next_exercise_id}")
-                        else:
-                            print(f"⚠️ [UNLOCK] Exercise {next_exercise_id} in stage {stage_id} already unlocked - NOT adding to unlocked_content")
+                            logger.info("unlock_check.exercise_unlocked", user_id=user_id, stage=stage_id, exercise=next_exercise_id)
             
-            print(f"📊 [UNLOCK] Total unlocked content: {unlocked_content}")
+            logger.debug("unlock_check.done", user_id=user_id, unlocked=len(unlocked_content))
             # TEMPORARY FIX: Always return empty unlocked_content to disable "New Content Unlocked!" messages
             return {"success": True, "unlocked_content": []}
             
         except Exception as e:
-            print(f"❌ [UNLOCK] Error checking content unlocks for {user_id}: {str(e)}")
-            logger.error(f"Error checking content unlocks for {user_id}: {str(e)}")
+            logger.exception("unlock_check.failed", user_id=user_id)
             return {"success": False, "error": str(e)}
 
     async def get_all_stages_from_db(self) -> List[Dict]:
@@ -1456,6 +1418,28 @@ class SupabaseProgressTracker:
             logger.error(f"Error fetching exercises for cache: {str(e)}")
             return []
 
+    async def get_content_translation_rows_from_db(self, page_size: int = 1000) -> List[Dict]:
+        """Fetches English/Urdu text fields of every content hierarchy row for the translation table."""
+        rows: List[Dict] = []
+        try:
+            print("🔄 [DB CACHE] Fetching content hierarchy text for translation table...")
+            offset = 0
+            while True:
+                result = self.client.table('ai_tutor_content_hierarchy').select(
+                    'title, title_urdu, description, description_urdu, topic_data'
+                ).order('id').range(offset, offset + page_size - 1).execute()
+                batch = result.data or []
+                rows.extend(batch)
+                if len(batch) < page_size:
+                    break
+                offset += page_size
+            print(f"✅ [DB CACHE] Found {len(rows)} content rows for translation table.")
+            return rows
+        except Exception as e:
+            print(f"❌ [DB CACHE] Error fetching content translation rows: {str(e)}")
+            logger.error(f"Error fetching content translation rows: {str(e)}")
+            return rows
+
     async def unlock_stage_for_user(self, user_id: str, stage_id: int, unlock_reason: str, unlocked_content: List[str]):
         """Unlocks a specific stage for a user."""
         print(f"🔓 [UNLOCK] Unlocking stage {stage_id} for user {user_id} due to {unlock_reason}")
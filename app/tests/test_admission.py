@@ -0,0 +1,130 @@
+"""
+Tests for pipeline admission control
+
+Global per-vendor slots, per-user caps, the deadline queue and priority of
+ongoing conversations over new ones.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.admission import (
+    PRIORITY_NEW,
+    PRIORITY_ONGOING,
+    AdmissionController,
+    AdmissionRejected,
+    PrioritySlots,
+)
+
+
+class TestPrioritySlots:
+    """Prioritized counting semaphore"""
+
+    def test_ongoing_admitted_before_new(self):
+        async def scenario():
+            slots = PrioritySlots("openai", capacity=1)
+            await slots.acquire()
+            order = []
+
+            async def waiter(name, priority):
+                await slots.acquire(priority, timeout=1)
+                order.append(name)
+                slots.release()
+
+            tasks = [asyncio.create_task(waiter("new-1", PRIORITY_NEW)),
+                     asyncio.create_task(waiter("new-2", PRIORITY_NEW))]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.create_task(waiter("ongoing", PRIORITY_ONGOING)))
+            await asyncio.sleep(0)
+            slots.release()
+            await asyncio.gather(*tasks)
+            return order, slots.in_use
+
+        order, in_use = asyncio.run(scenario())
+        assert order == ["ongoing", "new-1", "new-2"]
+        assert in_use == 0
+
+    def test_deadline_and_queue_bound(self):
+        async def scenario():
+            slots = PrioritySlots("elevenlabs", capacity=1, max_queue=1)
+            await slots.acquire()
+            waiting = asyncio.create_task(slots.acquire(timeout=0.05))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as full:
+                await slots.acquire(timeout=1)
+            with pytest.raises(AdmissionRejected) as late:
+                await waiting
+            return full.value.reason, late.value.reason, slots.status()
+
+        full, late, status = asyncio.run(scenario())
+        assert (full, late) == ("queue_full", "timeout")
+        assert status == {"capacity": 1, "in_use": 1, "waiting": 0}
+
+    def test_cancelled_waiter_gives_slot_back(self):
+        async def scenario():
+            slots = PrioritySlots("google", capacity=1)
+            await slots.acquire()
+            waiter = asyncio.create_task(slots.acquire(timeout=1))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            slots.release()
+            return slots.in_use
+
+        assert asyncio.run(scenario()) == 0
+
+
+class TestAdmissionController:
+    """Pipelines across vendors and users"""
+
+    def test_per_user_cap_rejects_fast(self):
+        async def scenario():
+            controller = AdmissionController({"openai": 10, "google": 10}, per_user=1)
+            ticket = await controller.acquire("user:1", ("openai", "google"))
+            with pytest.raises(AdmissionRejected) as busy:
+                await controller.acquire("user:1", ("openai",))
+            other = await controller.acquire("user:2", ("openai",))
+            ticket.release()
+            ticket.release()  # idempotent
+            again = await controller.acquire("user:1", ("openai",))
+            other.release()
+            again.release()
+            return busy.value, controller.status()
+
+        busy, status = asyncio.run(scenario())
+        assert busy.user_limited
+        assert status["admitted"] == 3 and status["user_busy"] == 1
+        assert status["active_users"] == 0
+        assert all(v["in_use"] == 0 for v in status["vendors"].values())
+
+    def test_unverified_clients_skip_the_per_user_cap(self):
+        async def scenario():
+            controller = AdmissionController({"openai": 10}, per_user=1)
+            tickets = [await controller.acquire(None, ("openai",)) for _ in range(3)]
+            in_use = controller.status()["vendors"]["openai"]["in_use"]
+            for ticket in tickets:
+                ticket.release()
+            return in_use, controller.status()
+
+        in_use, status = asyncio.run(scenario())
+        assert in_use == 3 and status["user_busy"] == 0
+        assert status["active_users"] == 0 and status["vendors"]["openai"]["in_use"] == 0
+
+    def test_partial_acquire_is_rolled_back(self):
+        async def scenario():
+            controller = AdmissionController({"elevenlabs": 1, "openai": 5}, queue_timeout=0.05)
+            holder = await controller.acquire("user:1", ("elevenlabs",))
+            with pytest.raises(AdmissionRejected) as timeout:
+                await controller.acquire("user:2", ("openai", "elevenlabs"))
+            holder.release()
+            return timeout.value, controller.status()
+
+        timeout, status = asyncio.run(scenario())
+        assert timeout.reason == "timeout" and timeout.vendor == "elevenlabs"
+        assert status["vendors"]["openai"]["in_use"] == 0
+        assert status["timeout"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
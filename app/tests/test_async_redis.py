@@ -0,0 +1,68 @@
+"""
+Tests for the async Redis layer
+
+Covers the circuit breaker and falling back to memory when Redis is
+unreachable (points the pool at a closed local port).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.redis_client import AsyncRedis, CircuitBreaker, RedisUnavailable
+
+
+class TestCircuitBreaker:
+    """Open after repeated failures, single trial call when half-open"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(threshold=3, cooldown=60)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == "closed" and breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open" and not breaker.allow()
+
+    def test_half_open_allows_one_trial(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(threshold=1, cooldown=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+
+class TestAsyncRedisFallback:
+    """Unreachable Redis: helpers fall back to memory, breaker stops further calls"""
+
+    def test_unreachable_redis_uses_fallback(self, monkeypatch):
+        monkeypatch.setenv("REDIS_HOST", "127.0.0.1")
+        monkeypatch.setenv("REDIS_PORT", "1")
+        layer = AsyncRedis(op_timeout=0.5, breaker=CircuitBreaker(threshold=2, cooldown=60))
+
+        async def run():
+            assert await layer.set_json("k", {"v": 1}, ex=60) is False
+            assert await layer.get_json("k") == {"v": 1}
+            assert layer.breaker.state == "open"
+            with pytest.raises(RedisUnavailable):
+                await layer.pipeline(lambda pipe: pipe.get("k"))
+            await layer.close()
+
+        asyncio.run(run())
+        assert layer.stats["rejected"] >= 1
+        assert layer.stats["fallback_writes"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,95 @@
+"""
+Tests for the bounded in-process cache
+
+Covers TTL expiry, LRU eviction by entry count and byte budget, overwrite
+accounting and the statistics used by CacheManager.
+"""
+
+import time
+
+import pytest
+
+from app.utils.bounded_cache import BoundedTTLCache, estimate_size
+
+
+class TestExpiry:
+    """TTL handling"""
+
+    def test_expired_entries_are_misses(self):
+        cache = BoundedTTLCache()
+        cache.set("a", "1", ttl=0.01)
+        cache.set("b", "2")
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.get("b") == "2"
+        assert cache.stats()["expirations"] == 1
+
+    def test_default_ttl_and_sweep_on_write(self):
+        cache = BoundedTTLCache(default_ttl=0.01)
+        for i in range(5):
+            cache.set(f"k{i}", "v")
+        time.sleep(0.02)
+        cache.set("fresh", "v", ttl=60)
+        assert len(cache) == 1 and "fresh" in cache
+
+    def test_overwrite_keeps_new_deadline(self):
+        cache = BoundedTTLCache()
+        cache.set("a", "1", ttl=0.01)
+        cache.set("a", "2", ttl=60)
+        time.sleep(0.02)
+        cache.set("b", "3")  # triggers a sweep of the old deadline
+        assert cache.get("a") == "2"
+
+
+class TestEviction:
+    """LRU eviction bounded by entries and bytes"""
+
+    def test_lru_by_entry_count(self):
+        cache = BoundedTTLCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        assert "a" in cache and "b" not in cache and "c" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_budget(self):
+        cache = BoundedTTLCache(max_bytes=10)
+        cache.set("a", "x" * 6)
+        cache.set("b", "y" * 6)
+        assert "a" not in cache and cache.get("b") == "y" * 6
+        assert cache.size_bytes == 6
+
+    def test_oversized_value_is_rejected(self):
+        cache = BoundedTTLCache(max_bytes=4)
+        assert cache.set("a", "too large") is False
+        assert len(cache) == 0 and cache.size_bytes == 0
+
+    def test_delete_and_overwrite_accounting(self):
+        cache = BoundedTTLCache()
+        cache.set("a", "1234")
+        cache.set("a", "12")
+        assert cache.size_bytes == 2
+        assert cache.delete("a") is True and cache.delete("a") is False
+        assert cache.size_bytes == 0
+
+
+class TestStats:
+    """Hit/miss counters"""
+
+    def test_hit_rate(self):
+        cache = BoundedTTLCache()
+        cache.set("a", "1")
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+
+    def test_estimate_size(self):
+        assert estimate_size("abc") == 3
+        assert estimate_size("ہیلو") == len("ہیلو".encode("utf-8"))
+        assert estimate_size(b"\x00\x01") == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,160 @@
+"""
+Tests for the vendor connection pools
+
+Per-vendor concurrency caps and counters on the limited httpx transports,
+using httpx.MockTransport instead of real vendor endpoints.
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.services.connection_pool import LimitedAsyncTransport, LimitedTransport, VendorLimiter
+
+
+class TestLimitedAsyncTransport:
+    """Async requests through a capped vendor pool"""
+
+    def test_cap_and_counters(self):
+        limiter = VendorLimiter("test", max_concurrency=2)
+        active = {"now": 0, "peak": 0}
+
+        async def handler(request):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.02)
+            active["now"] -= 1
+            return httpx.Response(200, json={"ok": True})
+
+        async def run():
+            transport = LimitedAsyncTransport(limiter, httpx.MockTransport(handler))
+            async with httpx.AsyncClient(transport=transport) as client:
+                responses = await asyncio.gather(*(client.get("https://vendor.test/") for _ in range(6)))
+            return responses
+
+        responses = asyncio.run(run())
+        assert all(r.json() == {"ok": True} for r in responses)
+        assert active["peak"] == 2
+        status = limiter.status()
+        assert status["requests"] == 6 and status["in_flight"] == 0 and status["waiting"] == 0
+        assert status["peak_in_flight"] == 2 and status["saturated"] >= 4
+
+    def test_streamed_body_holds_slot_until_closed(self):
+        limiter = VendorLimiter("test", max_concurrency=1)
+
+        async def run():
+            transport = LimitedAsyncTransport(limiter, httpx.MockTransport(lambda r: httpx.Response(200, content=b"audio")))
+            async with httpx.AsyncClient(transport=transport) as client:
+                async with client.stream("GET", "https://vendor.test/") as response:
+                    assert limiter.in_flight == 1
+                    await response.aread()
+                return limiter.in_flight
+
+        assert asyncio.run(run()) == 0
+
+    def test_errors_are_counted(self):
+        limiter = VendorLimiter("test", max_concurrency=4)
+
+        def handler(request):
+            if request.url.path == "/fail":
+                raise httpx.ConnectError("refused")
+            return httpx.Response(503)
+
+        async def run():
+            transport = LimitedAsyncTransport(limiter, httpx.MockTransport(handler))
+            async with httpx.AsyncClient(transport=transport) as client:
+                await client.get("https://vendor.test/busy")
+                with pytest.raises(httpx.ConnectError):
+                    await client.get("https://vendor.test/fail")
+
+        asyncio.run(run())
+        assert limiter.errors == 2 and limiter.in_flight == 0
+
+
+class TestLimitedTransport:
+    """Sync requests from worker threads"""
+
+    def test_thread_callers_share_the_cap(self):
+        limiter = VendorLimiter("test", max_concurrency=2)
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def handler(request):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            threading.Event().wait(0.02)
+            with lock:
+                active["now"] -= 1
+            return httpx.Response(200)
+
+        client = httpx.Client(transport=LimitedTransport(limiter, httpx.MockTransport(handler)))
+        threads = [threading.Thread(target=lambda: client.get("https://vendor.test/")) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert active["peak"] <= 2 and limiter.requests == 6 and limiter.in_flight == 0
+
+
+class TestSharedBudget:
+    """One cap per vendor across threads and event loops"""
+
+    def test_threads_and_async_callers_share_one_cap(self):
+        limiter = VendorLimiter("test", max_concurrency=2)
+        lock = threading.Lock()
+        active = {"now": 0, "peak": 0}
+
+        def enter():
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+
+        def leave():
+            with lock:
+                active["now"] -= 1
+
+        def thread_call():
+            with limiter.sync_slot():
+                enter()
+                threading.Event().wait(0.03)
+                leave()
+
+        async def async_call():
+            async with limiter.slot():
+                enter()
+                await asyncio.sleep(0.03)
+                leave()
+
+        async def run():
+            await asyncio.gather(*(async_call() for _ in range(4)))
+
+        threads = [threading.Thread(target=thread_call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        asyncio.run(run())
+        for thread in threads:
+            thread.join()
+        assert active["peak"] == 2 and limiter.requests == 8 and limiter.in_flight == 0
+
+    def test_cancelled_waiter_does_not_leak_a_slot(self):
+        limiter = VendorLimiter("test", max_concurrency=1)
+
+        async def run():
+            started_at = await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            limiter.release(started_at)
+            waiter.cancel()  # the slot was already handed over; it must be passed on
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+        asyncio.run(run())
+        assert limiter.waiting == 0 and limiter.in_flight == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,73 @@
+"""
+Tests for bounded conversation memory
+
+Uses a fake summarizer: verbatim window, incremental summaries, token
+budget and background updates.
+"""
+
+import pytest
+
+from app.services.conversation_memory import ConversationMemory, empty_memory_state
+
+
+def make_history(count: int, words: int = 3):
+    return [
+        {"role": "user" if i % 2 else "assistant", "content": " ".join([f"m{i}"] * words)}
+        for i in range(count)
+    ]
+
+
+def fake_summarizer(summary, messages):
+    covered = [m["content"].split()[0] for m in messages]
+    return (summary + " " if summary else "") + ",".join(covered)
+
+
+class TestConversationMemory:
+    """Recent window, rolling summary and token budget"""
+
+    def test_short_history_is_verbatim(self):
+        memory = ConversationMemory(max_recent_messages=4, summarizer=fake_summarizer)
+        history = make_history(3)
+        assert not memory.needs_summary(history)
+        assert memory.format(history) == "AI: m0 m0 m0\nStudent: m1 m1 m1\nAI: m2 m2 m2\n"
+
+    def test_summary_is_incremental(self):
+        calls = []
+        memory = ConversationMemory(max_recent_messages=4, summarizer=lambda s, m: calls.append(len(m)) or fake_summarizer(s, m))
+        history = make_history(7)
+        state = memory.summarize(history, empty_memory_state())
+        assert state == {"summary": "m0,m1,m2", "summarized_count": 3}
+
+        history += make_history(9)[7:]
+        state = memory.summarize(history, state)
+        assert state == {"summary": "m0,m1,m2 m3,m4", "summarized_count": 5}
+        assert calls == [3, 2]
+
+        view = memory.view(history, state)
+        assert [m["content"].split()[0] for m in view.messages] == ["m5", "m6", "m7", "m8"]
+        assert memory.format(history, state).startswith("Summary of earlier conversation: m0,m1,m2 m3,m4\n")
+
+    def test_unsummarized_messages_stay_until_summary_lands(self):
+        memory = ConversationMemory(max_recent_messages=2, summarizer=fake_summarizer)
+        view = memory.view(make_history(5))
+        assert len(view.messages) == 5
+        assert len(view.pending) == 3
+
+    def test_token_budget_drops_oldest_first(self):
+        memory = ConversationMemory(max_recent_messages=50, token_budget=30, summarizer=fake_summarizer)
+        view = memory.view(make_history(20, words=10))
+        assert view.tokens <= 30
+        assert view.messages[-1]["content"].startswith("m19")
+        assert view.omitted == 20 - len(view.messages)
+
+    def test_background_update(self):
+        memory = ConversationMemory(max_recent_messages=2, summarizer=fake_summarizer)
+        results = []
+        future = memory.summarize_in_background(make_history(4), None, results.append)
+        future.result(timeout=5)
+        assert results == [{"summary": "m0,m1", "summarized_count": 2}]
+        assert memory.summarize_in_background(make_history(2), None, results.append) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
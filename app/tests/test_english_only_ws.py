@@ -0,0 +1,106 @@
+"""
+Tests for the English-only websocket turn handling
+
+Which tutor replies may enter the shared L2 cache, and what a streamed turn
+reports and caches once the analysis finishes.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.routes import english_only_ws as ws_module
+from app.routes.english_only_ws import _is_cacheable_reply, _stream_analysis_reply
+from app.utils.profiler import Profiler
+
+
+class FakeCache:
+    """Records the L2 writes a turn makes"""
+
+    def __init__(self):
+        self.entries = []
+
+    async def cache_response(self, **kwargs):
+        self.entries.append(kwargs)
+
+
+@pytest.fixture
+def turn(monkeypatch):
+    sent = SimpleNamespace(json=[], audio=[], cache=FakeCache())
+
+    async def send_json(websocket, data):
+        sent.json.append(data)
+
+    async def send_bytes(websocket, data):
+        sent.audio.append(data)
+
+    async def tts(text, use_slow_tts=False):
+        return f"<{text}>".encode()
+
+    monkeypatch.setattr(ws_module, "safe_send_json", send_json)
+    monkeypatch.setattr(ws_module, "safe_send_bytes", send_bytes)
+    monkeypatch.setattr(ws_module, "get_cached_or_generate_tts", tts)
+    monkeypatch.setattr(ws_module, "multi_level_cache", sent.cache)
+    return sent
+
+
+def stream_turn(deltas, analysis_result):
+    """Run one streamed turn whose analysis emits `deltas` and then returns `analysis_result`"""
+    async def scenario():
+        delta_queue = asyncio.Queue()
+
+        async def analysis():
+            for delta in deltas:
+                delta_queue.put_nowait(delta)
+            return analysis_result
+
+        state = {"stage": "intent_detection", "topic": None, "learning_path": None, "skill_level": None}
+        warmup = asyncio.create_task(asyncio.sleep(0))
+        await _stream_analysis_reply(None, asyncio.create_task(analysis()), delta_queue, warmup,
+                                     state, "I want to learn grammar", "Ali", Profiler("test"))
+        await asyncio.sleep(0)  # let the background cache write run
+        return state
+
+    return asyncio.run(scenario())
+
+
+class TestCacheableReplies:
+    """Fallback replies stay out of the shared cache"""
+
+    def test_tutor_reply_is_cacheable(self):
+        assert _is_cacheable_reply({"next_stage": "grammar_focus"}, "Great, let's practise grammar!")
+
+    def test_failed_analysis_is_not_cached(self):
+        reply = "I'm experiencing a technical difficulty at the moment, but I understood: 'my name is Ali'."
+        assert not _is_cacheable_reply({"error_occurred": True}, reply)
+
+    def test_generic_fallback_text_is_not_cached(self):
+        assert not _is_cacheable_reply({}, "Let's continue our conversation!")
+        assert not _is_cacheable_reply({}, "Let's continue.")
+
+
+class TestStreamedReplies:
+    """The final message and the L2 entry match what the learner heard"""
+
+    def test_streamed_reply_is_reported_and_cached(self, turn):
+        reply = "Great choice! Let's start with tenses."
+        stream_turn(["Great choice! ", "Let's start with tenses."],
+                    {"conversation_text": reply, "next_stage": "grammar_focus"})
+        assert turn.json[-1]["conversation_text"] == reply
+        assert len(turn.cache.entries) == 1
+        entry = turn.cache.entries[0]
+        assert entry["response_text"] == reply and entry["audio"] == b"".join(turn.audio)
+
+    def test_parse_failure_after_speaking_reports_the_spoken_text(self, turn):
+        state = stream_turn(["Great choice! ", "Let's start with"],
+                            {"conversation_text": "I'm having trouble processing that response. "
+                                                  "Let's continue our conversation!",
+                             "next_stage": "option_selection", "error_occurred": True})
+        assert turn.json[-1]["conversation_text"] == "Great choice! Let's start with"
+        assert state["recent_messages"][-1]["content"] == "Great choice! Let's start with"
+        assert turn.cache.entries == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,48 @@
+"""
+Tests for incremental JSON string field extraction
+
+Covers chunk boundaries inside keys and escape sequences, and stopping at
+the end of the field value.
+"""
+
+import json
+
+import pytest
+
+from app.services.json_stream import JsonStringFieldStreamer
+
+
+class TestJsonStringFieldStreamer:
+    """Streaming extraction of one field from a partial JSON object"""
+
+    def _feed_all(self, raw: str, size: int) -> JsonStringFieldStreamer:
+        streamer = JsonStringFieldStreamer("conversation_text")
+        pieces = [streamer.feed(raw[i:i + size]) for i in range(0, len(raw), size)]
+        assert "".join(pieces) == streamer.value
+        return streamer
+
+    def test_matches_json_loads_for_any_chunk_size(self):
+        payload = {
+            "conversation_text": 'Great job! You said "hello".\nNow try: café \U0001F600 \\ done.',
+            "next_stage": "option_selection",
+        }
+        raw = json.dumps(payload)
+        for size in (1, 2, 3, 7, len(raw)):
+            streamer = self._feed_all(raw, size)
+            assert streamer.complete
+            assert streamer.value == payload["conversation_text"]
+
+    def test_field_after_other_keys_and_stops_at_closing_quote(self):
+        raw = '{"needs_correction": false, "conversation_text": "Hi there.", "corrected_sentence": "x"}'
+        streamer = self._feed_all(raw, 4)
+        assert streamer.value == "Hi there."
+
+    def test_returns_nothing_before_field_starts(self):
+        streamer = JsonStringFieldStreamer("conversation_text")
+        assert streamer.feed('{"conversation_te') == ""
+        assert streamer.feed('xt": "Hel') == "Hel"
+        assert not streamer.complete
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,64 @@
+"""
+Tests for the local English-only language guard
+
+Covers script detection, Roman Urdu detection and streamed sentence splitting
+used by the OpenAI Realtime bridge before text is sent to TTS.
+"""
+
+import pytest
+
+from app.services.language_guard import (
+    contains_non_english_script,
+    looks_like_roman_urdu,
+    is_english_sentence,
+    split_completed_sentences,
+)
+
+
+class TestLanguageDetection:
+    """Sentence classification tests"""
+
+    def test_english_sentence_is_clean(self):
+        assert is_english_sentence("Great job! Let's practice with chai and cricket.")
+
+    def test_urdu_script_is_flagged(self):
+        assert contains_non_english_script("آپ کیسے ہیں")
+        assert not is_english_sentence("Well done, شاباش!")
+
+    def test_roman_urdu_is_flagged(self):
+        assert looks_like_roman_urdu("Mujhe chai bohat pasand hai")
+        assert not is_english_sentence("Aap kya kar rahe ho?")
+
+    def test_single_quoted_marker_is_not_flagged(self):
+        assert not looks_like_roman_urdu("In Urdu we say 'acha' when we agree with someone.")
+        assert not looks_like_roman_urdu("Acha, acha!")
+
+    def test_english_homographs_are_not_flagged(self):
+        assert is_english_sentence("Press tab, then hum the tune and jab at the bell.")
+        assert is_english_sentence("It is a mere formality, yeh?")
+
+    def test_roman_urdu_without_homographs_is_still_flagged(self):
+        assert looks_like_roman_urdu("Hum jab bhi milte hain")
+
+
+class TestSentenceSplitting:
+    """Incremental sentence splitting tests"""
+
+    def test_splits_completed_sentences_and_keeps_tail(self):
+        sentences, tail = split_completed_sentences("Hello Ali. How are you? I am")
+        assert sentences == ["Hello Ali.", "How are you?"]
+        assert tail == "I am"
+
+    def test_urdu_full_stop_is_a_boundary(self):
+        sentences, tail = split_completed_sentences("آپ کیسے ہیں۔ Now")
+        assert sentences == ["آپ کیسے ہیں۔"]
+        assert tail == "Now"
+
+    def test_decimal_does_not_split(self):
+        sentences, tail = split_completed_sentences("The score is 3.5 today")
+        assert sentences == []
+        assert tail == "The score is 3.5 today"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
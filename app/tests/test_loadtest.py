@@ -0,0 +1,152 @@
+"""
+Tests for the load-test suite
+
+Latency model parsing and quantiles, the in-memory PostgREST the Supabase
+stand-in serves, structured-output examples and the baseline comparison.
+"""
+
+import os
+import random
+import statistics
+import sys
+
+import pytest
+
+from app.loadtest.fakes import example_from_schema
+from app.loadtest.latency import DEFAULT_LATENCY, LatencyModel, build_models, parse_latency_spec
+from app.loadtest.postgrest import SINGLE_OBJECT, PostgrestStore, parse_query
+from app.loadtest.scenarios import Recorder, percentile
+from app.loadtest.seed import build_dataset
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from load_test import compare  # noqa: E402
+
+
+class TestLatencyModel:
+    """Spec parsing and the shape of the sampled distribution"""
+
+    def test_parse_spec(self):
+        parsed = parse_latency_spec("openai.chat=100:300, supabase.rest=5:20:0.01")
+        assert parsed == {"openai.chat": (100.0, 300.0, 0.0), "supabase.rest": (5.0, 20.0, 0.01)}
+
+    def test_parse_rejects_unknown_and_malformed(self):
+        with pytest.raises(ValueError):
+            parse_latency_spec("nope=1:2")
+        with pytest.raises(ValueError):
+            parse_latency_spec("openai.chat=100")
+
+    def test_samples_match_median_and_p95(self):
+        model = LatencyModel(200, 600, rng=random.Random(1))
+        samples = sorted(model.sample() * 1000 for _ in range(20000))
+        assert statistics.median(samples) == pytest.approx(200, rel=0.05)
+        assert percentile(samples, 0.95) == pytest.approx(600, rel=0.08)
+
+    def test_seeded_models_replay(self):
+        first, second = build_models(seed=3)["openai.chat"], build_models(seed=3)["openai.chat"]
+        assert [first.sample() for _ in range(5)] == [second.sample() for _ in range(5)]
+        assert set(build_models()) == set(DEFAULT_LATENCY)
+
+    def test_zero_latency(self):
+        assert LatencyModel(0, 0).sample() == 0.0
+
+
+class TestPostgrestStore:
+    """Filters, projections and the Prefer/Accept headers supabase-py relies on"""
+
+    def setup_method(self):
+        self.store = PostgrestStore({
+            "profiles": [{"id": "u1", "role": "student", "first_name": "Ali"},
+                         {"id": "u2", "role": "teacher", "first_name": "Sara"}],
+            "scores": [{"user_id": "u1", "score": 70, "done": True},
+                       {"user_id": "u1", "score": 90, "done": False},
+                       {"user_id": "u2", "score": 50, "done": True}],
+        })
+
+    def get(self, table, query, headers=None):
+        return self.store.handle("GET", table, parse_query(query), headers or {}, None)
+
+    def test_filters_and_order(self):
+        status, _, rows = self.get("scores", "select=score&user_id=eq.u1&score=gte.80&order=score.desc")
+        assert status == 200 and rows == [{"score": 90}]
+        _, _, rows = self.get("scores", "select=score&or=(done.is.false,score.lt.60)&order=score")
+        assert [row["score"] for row in rows] == [50, 90]
+        _, _, rows = self.get("profiles", "select=id&role=in.(student,admin)")
+        assert rows == [{"id": "u1"}]
+
+    def test_count_and_limit(self):
+        status, headers, rows = self.get("scores", "select=*&limit=1", {"prefer": "count=exact"})
+        assert len(rows) == 1 and headers["content-range"] == "0-0/3"
+
+    def test_single_object(self):
+        status, _, row = self.get("profiles", "select=first_name&id=eq.u2", {"accept": SINGLE_OBJECT})
+        assert status == 200 and row == {"first_name": "Sara"}
+        status, _, error = self.get("profiles", "select=*&id=eq.nobody", {"accept": SINGLE_OBJECT})
+        assert status == 406 and error["code"] == "PGRST116"
+
+    def test_embed_many_to_one(self):
+        _, _, rows = self.get("scores", "select=score,profiles!scores_user_id_fkey(first_name)&user_id=eq.u2")
+        assert rows == [{"score": 50, "profiles": {"first_name": "Sara"}}]
+
+    def test_upsert_merges_on_conflict(self):
+        prefer = {"prefer": "resolution=merge-duplicates,return=representation"}
+        status, _, rows = self.store.handle("POST", "scores", parse_query("on_conflict=user_id"), prefer,
+                                           {"user_id": "u2", "score": 65})
+        assert status == 201 and rows[0]["score"] == 65
+        assert len(self.store.tables["scores"]) == 3
+
+    def test_insert_fills_ids(self):
+        _, _, rows = self.store.handle("POST", "messages", [], {"prefer": "return=representation"}, [{"content": "hi"}])
+        assert isinstance(rows[0]["id"], str) and rows[0]["created_at"]
+
+    def test_unknown_rpc(self):
+        assert self.store.rpc("missing", {})[0] == 404
+
+
+class TestSeedAndFakes:
+    """The seeded dataset and structured-output examples"""
+
+    def test_dataset_is_deterministic(self):
+        first, second = build_dataset(students=5), build_dataset(students=5)
+        assert [user.id for user in first.users] == [user.id for user in second.users]
+        student = first.by_role("student")[0]
+        assert first.user_for_token(student.token) == student
+        assert student.id in first.conversations
+
+    def test_example_from_schema(self):
+        schema = {
+            "type": "object",
+            "properties": {
+                "score": {"type": "integer", "minimum": 0, "maximum": 10},
+                "level": {"enum": ["A1", "A2"]},
+                "note": {"anyOf": [{"type": "null"}, {"$ref": "#/$defs/Note"}]},
+                "tags": {"type": "array", "items": {"type": "string"}},
+            },
+            "$defs": {"Note": {"type": "object", "properties": {"text": {"type": "string"}}}},
+        }
+        example = example_from_schema(schema)
+        assert example["score"] == 10 and example["level"] == "A1"
+        assert isinstance(example["note"]["text"], str) and len(example["tags"]) == 1
+
+
+class TestReport:
+    """Percentiles and baseline comparison"""
+
+    def test_recorder_summary(self):
+        recorder = Recorder()
+        for ms in range(1, 101):
+            recorder.record("op", ms / 1000)
+        recorder.record("op", 0.0, "boom")
+        row = recorder.summary(wall_seconds=10)["op"]
+        assert (row["count"], row["errors"], row["p50_ms"], row["p99_ms"]) == (101, 1, 50.0, 99.0)
+        assert row["throughput"] == 10.0
+
+    def test_compare_flags_regressions(self):
+        base = {"op": {"count": 100, "errors": 0, "p95_ms": 100.0, "throughput": 10.0}}
+        ok = {"op": {"count": 100, "errors": 0, "p95_ms": 110.0, "throughput": 9.0}}
+        bad = {"op": {"count": 100, "errors": 5, "p95_ms": 200.0, "throughput": 5.0}}
+        assert compare(ok, base, tolerance=0.25) == []
+        assert len(compare(bad, base, tolerance=0.25)) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+"""
+Tests for the stage 1 local fast-path scorer
+
+Covers clear passes, clear failures, Urdu detection and the ambiguous band
+that is still sent to GPT.
+"""
+
+import pytest
+
+from app.services.local_scoring import (
+    DECISION_AMBIGUOUS, DECISION_FAIL, DECISION_PASS,
+    build_quick_response_result, build_repeat_after_me_result,
+    score_quick_response, score_repeat_after_me,
+)
+
+
+class TestRepeatAfterMeScoring:
+    """Local scoring for stage 1, exercise 1"""
+
+    def test_exact_match_passes_locally(self):
+        local = score_repeat_after_me("Good morning, how are you?", "good morning how are you")
+        assert local.decision == DECISION_PASS
+        result = build_repeat_after_me_result(local, "Good morning, how are you?")
+        assert result["is_correct"] and result["completed"] and result["score"] == 100
+
+    def test_unrelated_response_fails_locally(self):
+        local = score_repeat_after_me("Good morning, how are you?", "I like cricket")
+        assert local.decision == DECISION_FAIL
+
+    def test_urdu_script_fails_and_is_flagged(self):
+        local = score_repeat_after_me("Thank you", "شکریہ")
+        assert local.decision == DECISION_FAIL and local.urdu_used
+        assert build_repeat_after_me_result(local, "Thank you")["urdu_used"] is True
+
+    def test_partial_attempt_is_ambiguous(self):
+        local = score_repeat_after_me("Could you please open the window", "could you open window")
+        assert local.decision == DECISION_AMBIGUOUS
+
+
+class TestQuickResponseScoring:
+    """Local scoring for stage 1, exercise 2"""
+
+    def test_matches_closest_expected_answer(self):
+        local = score_quick_response(["I am fine, thank you.", "I'm good."], "I'm good")
+        assert local.decision == DECISION_PASS
+        assert local.matched_answer == "I'm good."
+        assert build_quick_response_result(local)["suggested_improvement"]
+
+    def test_personal_details_go_to_gpt(self):
+        local = score_quick_response(["My name is Sara."], "my name is Ali")
+        assert local.decision == DECISION_AMBIGUOUS
+
+    def test_empty_response_fails(self):
+        assert score_quick_response(["Yes, I do."], "  ").decision == DECISION_FAIL
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,146 @@
+"""
+Tests for structured logging
+
+Fields and formats, per-module levels, throttled per-chunk events, PII
+redaction, the trace id on records and the non-blocking queue.
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from app.utils.logging_config import (
+    NonBlockingQueueHandler,
+    configure_logging,
+    get_logger,
+    parse_levels,
+    redact,
+    shutdown_logging,
+)
+from app.utils.tracing import LocalSpanExporter, tracer
+
+
+@pytest.fixture
+def capture():
+    """Configure logging into a buffer; restores the root logger afterwards"""
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    buffer = io.StringIO()
+
+    def setup(**kwargs):
+        configure_logging(stream=buffer, **kwargs)
+        return buffer
+
+    yield setup
+    shutdown_logging()
+    root.handlers[:] = saved[0]
+    root.setLevel(saved[1])
+    for name in ("test.app", "test.app.noisy"):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+def lines(buffer: io.StringIO):
+    shutdown_logging()  # drains the queue into the buffer
+    return buffer.getvalue().splitlines()
+
+
+class TestStructuredLogger:
+    """Events, fields and levels"""
+
+    def test_json_fields_and_module_levels(self, capture):
+        buffer = capture(level="INFO", levels="test.app.noisy=WARNING", fmt="json")
+        log = get_logger("test.app")
+        log.info("topic_attempt.recorded", stage=2, score=82.5)
+        log.debug("topic_attempt.start", stage=2)  # below INFO
+        get_logger("test.app.noisy").info("chatty")  # module raised to WARNING
+
+        (record,) = [json.loads(line) for line in lines(buffer)]
+        assert record["event"] == "topic_attempt.recorded"
+        assert record["logger"] == "test.app"
+        assert (record["stage"], record["score"]) == (2, 82.5)
+
+    def test_text_format_and_plain_messages(self, capture):
+        buffer = capture(level="DEBUG")
+        log = get_logger("test.app")
+        log.warning("realtime.audio.append_failed", code="buffer_too_small", error="too short")
+        logging.getLogger("test.app").info("Loaded %s settings", "ai")
+
+        output = lines(buffer)
+        assert output[0].endswith('WARNING test.app: realtime.audio.append_failed code=buffer_too_small error="too short"')
+        assert output[1].endswith("INFO test.app: Loaded ai settings")
+
+    def test_throttled_counts_suppressed(self, capture, monkeypatch):
+        buffer = capture(level="DEBUG")
+        log = get_logger("test.app")
+        clock = iter([0.0, 0.1, 0.2, 0.3, 1.5])
+        monkeypatch.setattr("app.utils.logging_config.time.monotonic", lambda: next(clock))
+        for size in range(5):
+            log.throttled(logging.DEBUG, "elevenlabs.stream.audio_chunk", bytes=size)
+
+        output = lines(buffer)
+        assert len(output) == 2
+        assert output[0].endswith("audio_chunk bytes=0")
+        assert output[1].endswith("audio_chunk bytes=4 suppressed=3")
+
+    def test_parse_levels_skips_malformed(self):
+        assert parse_levels("app.routes=debug, bad, x=NOPE,") == {"app.routes": "DEBUG"}
+
+
+class TestRedaction:
+    """PII and credentials never reach the output"""
+
+    def test_patterns(self):
+        text = redact("user ali@example.com sent Bearer abc.def token sk-proj-1234567890abcdefgh from +92 300 1234567")
+        assert text == "user <email> sent Bearer <redacted> token <api-key> from <phone>"
+        # Ids and ordinary numbers are left alone
+        assert redact("user 550e8400-e29b-41d4-a716-446655440000 spent 3600s") == \
+            "user 550e8400-e29b-41d4-a716-446655440000 spent 3600s"
+
+    def test_sensitive_fields_and_messages(self, capture):
+        buffer = capture(level="INFO", fmt="json")
+        get_logger("test.app").info("Login for ali@example.com", email="ali@example.com",
+                                    data={"password": "hunter2", "stage": 1})
+
+        (record,) = [json.loads(line) for line in lines(buffer)]
+        assert record["event"] == "Login for <email>"
+        assert record["email"] == "<redacted>"
+        assert record["data"] == {"password": "<redacted>", "stage": 1}
+
+
+class TestQueue:
+    """Non-blocking hand-off and trace correlation"""
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingQueueHandler(maxsize=2)
+        logger = logging.getLogger("test.app.queue")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for i in range(5):
+                logger.warning("event %s", i)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_records_carry_the_sampled_trace_id(self, capture):
+        buffer = capture(level="INFO", fmt="json")
+        saved = (tracer.sample_ratio, tracer.exporters, tracer.enabled)
+        tracer.configure(sample_ratio=1.0, exporters=[LocalSpanExporter()])
+        tracer.enabled = True
+        try:
+            with tracer.span("ws.turn") as turn:
+                get_logger("test.app").info("gpt.analysis.done")
+        finally:
+            tracer.configure(sample_ratio=saved[0], exporters=saved[1])
+            tracer.enabled = saved[2]
+
+        (record,) = [json.loads(line) for line in lines(buffer)]
+        assert record["trace_id"] == turn.trace_id
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
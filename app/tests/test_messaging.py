@@ -470,14 +470,8 @@ class TestRateLimiting:
         mock_redis = AsyncMock()
         rate_limiter = RateLimiter(mock_redis)
         
-        # Mock Redis pipeline
-        mock_pipe = AsyncMock()
-        mock_redis.pipeline.return_value.__aenter__.return_value = mock_pipe
-        mock_pipe.zremrangebyscore.return_value = None
-        mock_pipe.zadd.return_value = None
-        mock_pipe.expire.return_value = None
-        mock_pipe.zcard.return_value = 5  # Current count
-        mock_pipe.execute.return_value = [None, None, None, 5]  # zcard result
+        # Mock the GCRA script result: [limited, remaining, retry_after_ms, reset_after_ms]
+        mock_redis.call.return_value = [0, 5, 0, 30000]
         
         is_limited, info = await rate_limiter.is_rate_limited("test-user", "message_send")
         
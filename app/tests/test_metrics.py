@@ -0,0 +1,98 @@
+"""
+Tests for the Prometheus metrics registry
+
+Exposition format, fixed-bucket histograms and their quantile estimates,
+label validation, scrape-time collectors and the cache counters.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.multi_level_cache import MultiLevelCache
+from app.utils.metrics import CACHE_HITS, CACHE_MISSES, MetricsRegistry
+
+
+class TestHistogram:
+    """Fixed-bucket distributions"""
+
+    def test_exposition_is_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("tts_seconds", "TTS latency", ("vendor",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            latency.observe(value, vendor="elevenlabs")
+
+        text = registry.render()
+        assert "# TYPE tts_seconds histogram" in text
+        assert 'tts_seconds_bucket{vendor="elevenlabs",le="0.1"} 1' in text
+        assert 'tts_seconds_bucket{vendor="elevenlabs",le="1.0"} 3' in text
+        assert 'tts_seconds_bucket{vendor="elevenlabs",le="+Inf"} 4' in text
+        assert 'tts_seconds_count{vendor="elevenlabs"} 4' in text
+        assert 'tts_seconds_sum{vendor="elevenlabs"} 4.25' in text
+
+    def test_memory_is_fixed_and_quantiles_interpolate(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("stt_seconds", "STT latency", buckets=(1.0, 2.0, 3.0))
+        for i in range(10_000):
+            latency.observe(1.0 + (i % 100) / 100)  # uniform in [1, 2)
+
+        state = latency._values[()]
+        assert len(state.buckets) == 4 and state.count == 10_000
+        assert latency.quantile(0.5) == pytest.approx(1.5, abs=0.01)
+        assert latency.snapshot()["avg"] == pytest.approx(1.495)
+
+    def test_time_observes_on_error(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("gpt_seconds", "GPT latency", ("stage",))
+        with pytest.raises(RuntimeError):
+            with latency.time(stage="greeting"):
+                raise RuntimeError("vendor down")
+        assert latency.snapshot(stage="greeting")["count"] == 1
+
+    def test_labels_must_match(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("db_seconds", "DB latency", ("table", "method"))
+        with pytest.raises(ValueError):
+            latency.observe(0.1, table="profiles")
+
+
+class TestRegistry:
+    """Counters, gauges and collectors"""
+
+    def test_collectors_and_escaping(self):
+        registry = MetricsRegistry()
+        in_flight = registry.gauge("vendor_in_flight", "In flight", ("vendor",))
+        errors = registry.counter("vendor_errors_total", "Errors", ("vendor",))
+        registry.add_collector(lambda: in_flight.set(3, vendor="openai"))
+        errors.inc(vendor='a"b')
+
+        text = registry.render()
+        assert 'vendor_in_flight{vendor="openai"} 3' in text
+        assert 'vendor_errors_total{vendor="a\\"b"} 1' in text
+        with pytest.raises(ValueError):
+            errors.inc(-1, vendor="openai")
+        with pytest.raises(ValueError):
+            registry.counter("vendor_errors_total", "Duplicate")
+
+
+class TestCacheMetrics:
+    """MultiLevelCache exports hits, misses and lookup latency"""
+
+    def test_hits_and_misses(self):
+        async def scenario():
+            cache = MultiLevelCache(name="test_metrics_cache")
+            await cache.cache_response(stage="greeting", user_input="hello there", response_text="Hi!",
+                                       audio=b"audio", topic=None, cache_level="l1")
+            await cache.get_cached_response_fast(stage="greeting", user_input="Hello there", topic=None)
+            await cache.get_cached_response_fast(stage="greeting", user_input="something else", topic=None)
+            return cache.get_cache_stats()
+
+        stats = asyncio.run(scenario())
+        assert CACHE_HITS.value(cache="test_metrics_cache", level="l1") == 1
+        assert CACHE_MISSES.value(cache="test_metrics_cache") == 1
+        assert stats["l1"]["hits"] == 1
+        assert stats["l1"]["avg_response_time_ms"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
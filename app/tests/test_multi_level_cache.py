@@ -0,0 +1,213 @@
+"""
+Tests for the similarity-matched L2 cache
+
+Utterance vectors and the LSH index, paraphrase hits within a stage and
+topic, the negation/number guardrails, and precision tracking from sampled
+verification.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.multi_level_cache import SEMANTIC_STAGES, MultiLevelCache
+from app.services.semantic_index import SemanticIndex, embed, signature
+from app.utils.metrics import SEMANTIC_CACHE_LOOKUPS
+
+
+def make_cache(name, **kwargs):
+    return MultiLevelCache(name=name, semantic_threshold=0.82, semantic_verify_rate=0.0, **kwargs)
+
+
+async def store(cache, user_input, response_text="Great, let's practise grammar!", stage="intent_detection",
+                topic=None, audio=b"mp3", next_stage="grammar_focus", next_topic="grammar"):
+    await cache.cache_response(stage=stage, user_input=user_input, response_text=response_text, audio=audio,
+                               topic=topic, cache_level="l2", next_stage=next_stage, next_topic=next_topic)
+
+
+def lookup(cache, user_input, stage="intent_detection", topic=None):
+    return cache.get_cached_response_fast(stage=stage, user_input=user_input, topic=topic)
+
+
+class TestSemanticIndex:
+    """Vectors and nearest-neighbour search"""
+
+    def test_paraphrases_embed_close(self):
+        assert float(embed("I want to learn grammar") @ embed("grammar please")) > 0.95
+        assert float(embed("I want to learn grammar") @ embed("vocabulary please")) < 0.3
+        assert embed("I want to, um, please") is None  # nothing but filler
+
+    def test_signature_tracks_negation_and_numbers(self):
+        assert signature("option 2") == signature("the second option")
+        assert signature("option 2") != signature("option 3")
+        assert signature("I don't want grammar").negated and not signature("grammar please").negated
+
+    def test_signature_keeps_personal_words(self):
+        assert signature("I want to learn grammar") == signature("grammar please")
+        assert signature("teach me about my family") != signature("teach me about your family")
+        ali = "Hello, my name is Ali Khan and I am from Lahore"
+        assert signature(ali) != signature(ali.replace("Ali", "Sara"))
+        assert float(embed(ali) @ embed(ali.replace("Ali", "Sara"))) > 0.82  # only the signature keeps them apart
+
+    def test_lsh_finds_neighbour_in_large_index(self):
+        index = SemanticIndex(scan_below=0)
+        rng = np.random.default_rng(7)
+        for i in range(2000):
+            vector = rng.standard_normal(index.dim).astype(np.float32)
+            index.add(f"noise{i}", vector / np.linalg.norm(vector))
+        index.add("grammar", embed("grammar please"))
+        assert index.search(embed("I'd like to learn grammar"))[0][0] == "grammar"
+        index.remove("grammar")
+        assert "grammar" not in index and len(index) == 2000
+
+
+class TestSimilarityHits:
+    """Paraphrases served from L2 with the original audio and state change"""
+
+    def test_paraphrase_hits_with_audio_and_next_stage(self):
+        async def scenario():
+            cache = make_cache("test_semantic_hit")
+            await store(cache, "I want to learn grammar")
+            return await lookup(cache, "grammar please"), cache.get_cache_stats()
+
+        cached, stats = asyncio.run(scenario())
+        assert cached.source == "l2" and cached.audio == b"mp3"
+        assert cached.similarity > 0.95 and cached.confidence <= 0.85
+        assert (cached.next_stage, cached.next_topic) == ("grammar_focus", "grammar")
+        assert stats["l2_semantic"]["hits"] == 1 and stats["l2"]["hits"] == 1
+        assert SEMANTIC_CACHE_LOOKUPS.value(cache="test_semantic_hit", stage="intent_detection", result="hit") == 1
+
+    def test_other_intents_stages_and_topics_miss(self):
+        async def scenario():
+            cache = make_cache("test_semantic_scope")
+            await store(cache, "I want to learn grammar", topic="daily life")
+            await store(cache, "I want to learn grammar", stage="topic_discussion", topic="daily life")
+            return [
+                await lookup(cache, "vocabulary please", topic="daily life"),
+                await lookup(cache, "grammar please", topic="travel"),
+                await lookup(cache, "grammar please", stage="topic_discussion", topic="daily life"),
+                await lookup(cache, "grammar please", topic="Daily life"),
+            ]
+
+        results = asyncio.run(scenario())
+        assert results[:3] == [None, None, None]
+        assert results[3] is not None
+
+    def test_exact_repeats_keep_exact_confidence(self):
+        async def scenario():
+            cache = make_cache("test_semantic_exact")
+            await store(cache, "grammar please")
+            return await lookup(cache, "Grammar please")
+
+        cached = asyncio.run(scenario())
+        assert cached.similarity is None and cached.confidence == 0.85
+        assert cached.next_stage == "grammar_focus"
+
+    def test_entries_without_audio_are_not_served(self):
+        async def scenario():
+            cache = make_cache("test_semantic_audio")
+            await store(cache, "I want to learn grammar", audio=None)
+            before = await lookup(cache, "grammar please")
+            await cache.update_cached_audio(stage="intent_detection", user_input="I want to learn grammar",
+                                            audio=b"mp3", topic=None)
+            return before, await lookup(cache, "grammar please")
+
+        before, after = asyncio.run(scenario())
+        assert before is None and after.audio == b"mp3"
+
+
+class TestGuardrails:
+    """Near neighbours that must not be served"""
+
+    def test_negation_and_numbers_are_rejected(self):
+        async def scenario():
+            cache = make_cache("test_semantic_guard")
+            await store(cache, "I want grammar, tenses and verbs")
+            await store(cache, "option 2", stage="option_selection", next_stage="sentence_practice")
+            return (
+                await lookup(cache, "I don't want grammar, tenses and verbs"),
+                await lookup(cache, "option 3", stage="option_selection"),
+                await lookup(cache, "the second option", stage="option_selection"),
+                cache.get_cache_stats()["l2_semantic"],
+            )
+
+        negated, other_option, same_option, stats = asyncio.run(scenario())
+        assert negated is None and other_option is None
+        assert same_option is not None and same_option.next_stage == "sentence_practice"
+        assert stats["rejected"] == 1
+
+    def test_other_learners_details_are_not_served(self):
+        async def scenario():
+            cache = make_cache("test_semantic_personal", semantic_stages=["greeting", "intent_detection"])
+            ali = "Hello, my name is Ali Khan and I am from Lahore"
+            await store(cache, ali, response_text="Nice to meet you, Ali!", stage="greeting")
+            await store(cache, "teach me about my family")
+            return (
+                await lookup(cache, ali.replace("Ali", "Sara"), stage="greeting"),
+                await lookup(cache, "teach me about your family"),
+                await lookup(cache, "my family please"),
+            )
+
+        other_name, other_family, same_family = asyncio.run(scenario())
+        assert other_name is None and other_family is None
+        assert same_family is not None
+
+    def test_greeting_is_not_matched_by_default(self):
+        assert "greeting" not in SEMANTIC_STAGES
+
+    def test_only_configured_stages_match_by_similarity(self):
+        async def scenario():
+            cache = make_cache("test_semantic_stages", semantic_stages=["greeting"])
+            await store(cache, "I want to learn grammar")
+            return await lookup(cache, "grammar please"), cache.get_cache_stats()["l2_semantic"]["indexed"]
+
+        cached, indexed = asyncio.run(scenario())
+        assert cached is None and indexed == 0
+
+    def test_clearing_l2_empties_the_index(self):
+        async def scenario():
+            cache = make_cache("test_semantic_clear")
+            await store(cache, "I want to learn grammar")
+            cache.clear_cache("l2")
+            return await lookup(cache, "grammar please"), cache.get_cache_stats()["l2_semantic"]["indexed"]
+
+        assert asyncio.run(scenario()) == (None, 0)
+
+
+class TestVerification:
+    """Precision from similarity hits checked against GPT"""
+
+    def test_disagreement_unindexes_entry(self):
+        async def scenario():
+            cache = make_cache("test_semantic_verify")
+            await store(cache, "I want to learn grammar")
+            first = await lookup(cache, "grammar please")
+            assert await cache.record_verification(first, next_stage="grammar_focus", next_topic="Grammar")
+            second = await lookup(cache, "I'd like grammar")
+            assert not await cache.record_verification(second, next_stage="vocabulary_learning", next_topic=None)
+            return (
+                await lookup(cache, "grammar please"),
+                await lookup(cache, "I want to learn grammar"),
+                cache.get_cache_stats()["l2_semantic"],
+            )
+
+        paraphrase, exact, stats = asyncio.run(scenario())
+        assert paraphrase is None
+        assert exact is not None  # exact repeats still hit
+        assert stats["verified"] == 2 and stats["precision_percent"] == 50.0
+
+    def test_only_similarity_hits_are_sampled(self):
+        cache = MultiLevelCache(name="test_semantic_sample", semantic_verify_rate=1.0)
+
+        async def scenario():
+            await store(cache, "I want to learn grammar")
+            return await lookup(cache, "I want to learn grammar"), await lookup(cache, "grammar please")
+
+        exact, similar = asyncio.run(scenario())
+        assert not cache.should_verify(exact)
+        assert cache.should_verify(similar)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
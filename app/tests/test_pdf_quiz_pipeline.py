@@ -0,0 +1,102 @@
+"""
+Tests for the PDF quiz pipeline helpers
+
+Covers in-memory page extraction, page chunking, merging of per-chunk
+quiz results and caching of complete (not partial) quizzes.
+"""
+
+import asyncio
+
+import fitz
+import pytest
+
+from app.services import pdf_quiz_pipeline as pipeline_module
+from app.services.pdf_quiz_pipeline import PDFQuizPipeline, chunk_pages, extract_pages_from_bytes, merge_quiz_results
+
+
+class FakeCache:
+    """Stands in for cache_manager.get/set"""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get(self, key, **kwargs):
+        return self.entries.get(key)
+
+    async def set(self, key, value, ttl=None, **kwargs):
+        self.entries[key] = value
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Pipeline with two one-page chunks; GPT fails on pages mentioning broken"""
+    cache = FakeCache()
+    monkeypatch.setattr(pipeline_module, "cache_manager", cache)
+
+    async def fake_gpt(chunk):
+        if "broken" in chunk:
+            raise RuntimeError("GPT timeout")
+        return {"title": "Unit 1", "questions": [{"question": f"About {chunk}?", "options": []}]}
+
+    monkeypatch.setattr(pipeline_module, "extract_quiz_from_text_using_gpt_async", fake_gpt)
+    quiz_pipeline = PDFQuizPipeline(chunk_chars=10)
+    quiz_pipeline.pages = []
+
+    async def fake_pages(pdf_bytes):
+        return quiz_pipeline.pages
+
+    quiz_pipeline.extract_pages = fake_pages
+    quiz_pipeline.cache = cache
+    return quiz_pipeline
+
+
+class TestPDFQuizPipeline:
+    """Pure helpers of the PDF quiz pipeline"""
+
+    def test_extracts_pages_from_bytes(self):
+        doc = fitz.open()
+        for text in ["First page", "Second page"]:
+            doc.new_page().insert_text((72, 72), text)
+        pages = extract_pages_from_bytes(doc.tobytes())
+        assert [p.strip() for p in pages] == ["First page", "Second page"]
+
+    def test_chunks_keep_whole_pages(self):
+        chunks = chunk_pages(["a" * 40, "b" * 40, "", "c" * 40], max_chars=90)
+        assert chunks == ["a" * 40 + "\n" + "b" * 40, "c" * 40]
+
+    def test_merge_keeps_first_title_and_drops_duplicates(self):
+        merged = merge_quiz_results([
+            {"title": "Unit 1", "questions": [{"question": "What is 2+2?", "options": ["4"]}]},
+            {"error": "Invalid JSON format from GPT"},
+            {"title": "Ignored", "questions": [
+                {"question": "what is 2 + 2", "options": ["4"]},
+                {"question": "Name a colour.", "options": []},
+            ]},
+        ])
+        assert merged["title"] == "Unit 1"
+        assert [q["question"] for q in merged["questions"]] == ["What is 2+2?", "Name a colour."]
+
+
+class TestQuizCaching:
+    """Only complete quizzes are cached"""
+
+    def test_complete_quiz_is_cached(self, pipeline):
+        pipeline.pages = ["verbs", "nouns"]
+        quiz = asyncio.run(pipeline.extract_quiz(b"pdf"))
+        assert len(quiz["questions"]) == 2
+        assert list(pipeline.cache.entries.values()) == [quiz]
+
+    def test_partial_quiz_is_returned_but_not_cached(self, pipeline):
+        pipeline.pages = ["verbs", "broken"]
+        quiz = asyncio.run(pipeline.extract_quiz(b"pdf"))
+        assert [q["question"] for q in quiz["questions"]] == ["About verbs?"]
+        assert pipeline.cache.entries == {}
+
+    def test_all_chunks_failing_raises(self, pipeline):
+        pipeline.pages = ["broken 1", "broken 2"]
+        with pytest.raises(pipeline_module.PDFQuizError):
+            asyncio.run(pipeline.extract_quiz(b"pdf"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,42 @@
+"""
+Tests for the prompt template registry
+
+Covers static-prefix-first message layout, compilation caching and
+recompilation when settings change.
+"""
+
+import pytest
+
+from app.schemas.settings import AISettings
+from app.services.prompt_registry import PromptRegistry
+
+
+def _decorate(prompt, settings, safety_settings):
+    return f"{prompt}\nPersonality: {settings.personality_type}"
+
+
+class TestPromptRegistry:
+    """Compiled prompt registry"""
+
+    def test_static_prefix_comes_first_and_suffix_is_formatted(self):
+        registry = PromptRegistry()
+        registry.register(1, 1, "Rubric with JSON {\"score\": 0}", "Student: \"{user_response}\"")
+        messages = registry.get(1, 1).messages(user_response="I am {fine}")
+        assert messages[0] == {"role": "system", "content": "Rubric with JSON {\"score\": 0}"}
+        assert messages[1] == {"role": "user", "content": "Student: \"I am {fine}\""}
+
+    def test_compiled_prefix_is_reused_until_settings_change(self):
+        registry = PromptRegistry()
+        registry.register("greeting", "english_only", "Base", "{user_text}", decorate=_decorate)
+        settings = AISettings()
+        first = registry.get("greeting", "english_only", settings, None)
+        assert registry.get("greeting", "english_only", settings, None) is first
+        assert registry.stats == {"compiled": 1, "hits": 1}
+
+        changed = registry.get("greeting", "english_only", AISettings(personality_type="Strict"), None)
+        assert changed is not first
+        assert changed.system_prompt.endswith("Personality: Strict")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,173 @@
+"""
+Tests for the GCRA rate limiter
+
+Local pre-check buckets, per-role limits, the Redis-down fallback and the
+shape of the Lua script call, using an in-memory stand-in for the script
+instead of a real Redis server.
+"""
+
+import asyncio
+import math
+import time
+
+import jwt
+import pytest
+
+from app.middleware import rate_limiter as rate_limiter_module
+from app.middleware.rate_limiter import (
+    LocalGCRA,
+    RateLimitConfig,
+    RateLimiter,
+    client_identity,
+)
+from app.redis_client import AsyncRedis, CircuitBreaker
+
+
+class FakeScriptRedis:
+    """Runs the GCRA script's logic in Python and counts round trips"""
+
+    def __init__(self):
+        self.tats = {}
+        self.calls = 0
+
+    def register_script(self, script):
+        async def run(keys, args):
+            now = time.time() * 1000
+            interval, burst, cost = float(args[0]), float(args[1]), float(args[2])
+            tat = max(self.tats.get(keys[0], now), now)
+            new_tat = tat + interval * cost
+            allow_at = new_tat - interval * burst
+            if allow_at > now:
+                return [1, 0, math.ceil(allow_at - now), math.ceil(tat - now)]
+            if cost > 0:
+                self.tats[keys[0]] = new_tat
+            return [0, math.floor((now - allow_at) / interval), 0, math.ceil(new_tat - now)]
+        return run
+
+    async def call(self, operation):
+        self.calls += 1
+        return await operation(self)
+
+
+def down_redis() -> AsyncRedis:
+    breaker = CircuitBreaker(threshold=1, cooldown=3600)
+    breaker.record_failure()
+    return AsyncRedis(breaker=breaker)
+
+
+class TestLocalGCRA:
+    """In-process buckets"""
+
+    def test_burst_then_refill(self):
+        bucket = LocalGCRA(max_keys=10)
+        decisions = [bucket.check("k", requests=5, window=0.5)[0] for _ in range(6)]
+        assert decisions == [False] * 5 + [True]
+        time.sleep(0.12)
+        assert bucket.check("k", requests=5, window=0.5)[0] is False
+
+    def test_refund(self):
+        bucket = LocalGCRA(max_keys=10)
+        for _ in range(3):
+            bucket.check("k", requests=3, window=60)
+        assert bucket.check("k", requests=3, window=60)[0] is True
+        bucket.refund("k", requests=3, window=60)
+        assert bucket.check("k", requests=3, window=60)[0] is False
+
+
+class TestRateLimiter:
+    """Distributed checks with local pre-check"""
+
+    def test_same_second_burst_is_counted(self):
+        # The old sorted-set log keyed entries by the current second, so a burst counted once
+        async def scenario():
+            limiter = RateLimiter(FakeScriptRedis(), local_precheck=False)
+            return [(await limiter.is_rate_limited("user-1", "message_send"))[0] for _ in range(12)]
+
+        decisions = asyncio.run(scenario())
+        assert decisions.count(False) == 10
+        assert decisions[-2:] == [True, True]
+
+    def test_local_precheck_sheds_without_redis(self):
+        async def scenario():
+            redis = FakeScriptRedis()
+            limiter = RateLimiter(redis)
+            for _ in range(30):
+                await limiter.is_rate_limited("abuser", "file_upload")
+            return redis.calls, limiter.stats
+
+        calls, stats = asyncio.run(scenario())
+        assert calls == 3
+        assert stats["shed_locally"] == 27
+
+    def test_role_limits(self):
+        async def scenario():
+            limiter = RateLimiter(FakeScriptRedis())
+            allowed = 0
+            for _ in range(25):
+                is_limited, info = await limiter.is_rate_limited("teacher-1", "message_send", "Teacher")
+                allowed += not is_limited
+            return allowed, info
+
+        allowed, info = asyncio.run(scenario())
+        assert allowed == RateLimitConfig().role_limits["teacher"]["message_send"]["requests"]
+        assert info["limit"] == 20
+        assert info["retry_after"] > 0
+
+    def test_peek_does_not_consume(self):
+        async def scenario():
+            limiter = RateLimiter(FakeScriptRedis())
+            await limiter.is_rate_limited("user-1", "file_upload")
+            first = await limiter.get_rate_limit_info("user-1", "file_upload")
+            second = await limiter.get_rate_limit_info("user-1", "file_upload")
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert first["remaining"] == second["remaining"] == 2
+
+    def test_redis_down_enforces_local_limit(self):
+        async def scenario():
+            limiter = RateLimiter(down_redis())
+            return [(await limiter.is_rate_limited("user-1", "file_upload"))[0] for _ in range(5)]
+
+        assert asyncio.run(scenario()) == [False, False, False, True, True]
+
+    def test_unknown_limit_type_is_not_limited(self):
+        limiter = RateLimiter(FakeScriptRedis())
+        assert asyncio.run(limiter.is_rate_limited("user-1", "no_such_limit")) == (False, {})
+
+
+class TestClientIdentity:
+    """Bucket keys for HTTP and websocket clients"""
+
+    @pytest.fixture(autouse=True)
+    def settings(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter_module, "SUPABASE_JWT_SECRET", "secret")
+        monkeypatch.setattr(rate_limiter_module, "RATE_LIMIT_TRUSTED_PROXIES", 1)
+
+    def test_verified_token_claims(self):
+        token = jwt.encode({"sub": "abc", "user_metadata": {"role": "Admin"}}, "secret", algorithm="HS256")
+        assert client_identity(token, None, "10.0.0.1") == ("user:abc", "admin")
+
+    def test_forged_and_opaque_tokens_are_bucketed_by_ip(self):
+        forged = jwt.encode({"sub": "abc", "user_metadata": {"role": "admin"}}, "guess", algorithm="HS256")
+        assert client_identity(forged, None, "10.0.0.1") == ("ip:10.0.0.1", "student")
+        assert client_identity("not-a-jwt", None, "10.0.0.1") == ("ip:10.0.0.1", "student")
+
+    def test_unverifiable_without_secret(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter_module, "SUPABASE_JWT_SECRET", None)
+        token = jwt.encode({"sub": "abc"}, "secret", algorithm="HS256")
+        assert client_identity(token, None, "10.0.0.1") == ("ip:10.0.0.1", "student")
+
+    def test_ip_comes_from_the_trusted_proxy_hop(self, monkeypatch):
+        # The client controls everything left of what our proxy appended
+        assert client_identity(None, "6.6.6.6, 1.2.3.4", "10.0.0.1") == ("ip:1.2.3.4", "student")
+        assert client_identity(None, "7.7.7.7, 1.2.3.4", "10.0.0.1") == ("ip:1.2.3.4", "student")
+        monkeypatch.setattr(rate_limiter_module, "RATE_LIMIT_TRUSTED_PROXIES", 2)
+        assert client_identity(None, "6.6.6.6, 1.2.3.4, 172.16.0.5", "10.0.0.1") == ("ip:1.2.3.4", "student")
+        monkeypatch.setattr(rate_limiter_module, "RATE_LIMIT_TRUSTED_PROXIES", 0)
+        assert client_identity(None, "6.6.6.6", "10.0.0.1") == ("ip:10.0.0.1", "student")
+        assert client_identity(None, None, None) == ("ip:unknown", "student")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""
+Tests for the resumable session state store
+
+Runs against the in-memory fallback (no Redis needed): round trips, TTL
+expiry, ordered background snapshots and token validation.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.redis_client import AsyncRedis, CircuitBreaker
+from app.services import session_store as session_store_module
+from app.services.session_store import SessionStore, is_valid_token
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    # Breaker held open: every Redis call is rejected without touching the network
+    breaker = CircuitBreaker(threshold=1, cooldown=3600)
+    breaker.opened_at = time.monotonic()
+    monkeypatch.setattr(session_store_module, "async_redis", AsyncRedis(breaker=breaker))
+
+
+class TestSessionStore:
+    """Save, load and snapshot session state"""
+
+    def test_round_trip(self):
+        store = SessionStore(ttl_seconds=60)
+        token = store.new_token()
+
+        async def run():
+            await store.save("english_only", token, {"stage": "vocabulary_learning", "topic": "Travel"})
+            return await store.load("english_only", token)
+
+        assert asyncio.run(run()) == {"stage": "vocabulary_learning", "topic": "Travel"}
+
+    def test_expired_sessions_are_not_resumed(self):
+        store = SessionStore(ttl_seconds=-1)
+        token = store.new_token()
+
+        async def run():
+            await store.save("learn", token, {"step": "practice"})
+            return await store.load("learn", token)
+
+        assert asyncio.run(run()) is None
+
+    def test_snapshots_apply_in_order(self):
+        store = SessionStore(ttl_seconds=60)
+        token = store.new_token()
+        state = {"stage": "greeting", "interaction_count": 0, "transient": object()}
+
+        async def run():
+            for count, stage in enumerate(["intent_detection", "vocabulary_learning", "sentence_practice"], 1):
+                state.update(stage=stage, interaction_count=count)
+                store.snapshot("english_only", token, state, fields=("stage", "interaction_count"))
+            return await store.load("english_only", token)
+
+        assert asyncio.run(run()) == {"stage": "sentence_practice", "interaction_count": 3}
+
+    def test_invalid_tokens_are_rejected(self):
+        store = SessionStore()
+        assert is_valid_token(store.new_token())
+        assert not is_valid_token("short")
+        assert not is_valid_token("a" * 20 + ":*")
+        assert asyncio.run(store.load("learn", "bad token")) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
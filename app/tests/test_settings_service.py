@@ -0,0 +1,146 @@
+"""
+Tests for the settings service
+
+Uses a fake Supabase table: stale-while-revalidate, refresh-ahead, version
+bumps only on real changes, invalidation and error fallbacks.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.settings import AISettings
+from app.services import settings_service as settings_module
+from app.services.settings_service import SettingsService
+
+
+class FakeTable:
+    """Stands in for supabase.from_(table).select("*").limit(1).execute()"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = 0
+        self.fail = False
+        self.delay = 0.01
+
+    def from_(self, table):
+        return self
+
+    def select(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+    def execute(self):
+        self.reads += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        return SimpleNamespace(data=list(self.rows))
+
+
+@pytest.fixture
+def table(monkeypatch):
+    fake = FakeTable([AISettings().model_dump()])
+    monkeypatch.setattr(settings_module, "supabase", fake)
+    return fake
+
+
+def make_service(refresh_seconds=60.0, max_stale_seconds=60.0):
+    return SettingsService("test", "ai_tutor_settings", AISettings, AISettings,
+                           refresh_seconds=refresh_seconds, max_stale_seconds=max_stale_seconds)
+
+
+class TestSettingsService:
+    """Reads, refreshes and versions"""
+
+    def test_concurrent_first_reads_share_one_query(self, table):
+        async def run():
+            service = make_service()
+            results = await asyncio.gather(*(service.get() for _ in range(10)))
+            return service, results
+
+        service, results = asyncio.run(run())
+        assert table.reads == 1 and service.version == 1
+        assert all(r is results[0] for r in results)
+
+    def test_expired_value_served_while_refreshing(self, table):
+        async def run():
+            service = make_service()
+            first = await service.get()
+            service._fetched_at -= 61  # past expiry, within the stale window
+            stale = await service.get()
+            await asyncio.sleep(0.05)
+            return service, first, stale
+
+        service, first, stale = asyncio.run(run())
+        assert stale is first and table.reads == 2
+        assert service.stats["stale_served"] == 1 and service.version == 1  # unchanged row
+
+    def test_version_bumps_on_change(self, table):
+        async def run():
+            service = make_service()
+            await service.get()
+            await service.invalidate()
+            unchanged = service.version
+            table.rows = [{**table.rows[0], "cultural_sensitivity": False}]
+            await service.invalidate()
+            return unchanged, service.version
+
+        unchanged, changed = asyncio.run(run())
+        assert unchanged == 1 and changed == 2
+
+    def test_database_error_keeps_last_good_value(self, table):
+        async def run():
+            service = make_service()
+            good = await service.get()
+            table.fail = True
+            after_error = await service.invalidate()
+            return service, good, after_error
+
+        service, good, after_error = asyncio.run(run())
+        assert after_error is good and service.stats["fetch_errors"] == 1
+
+    def test_reads_do_not_wait_on_invalidation(self, table):
+        async def run():
+            service = make_service()
+            old = await service.get()
+            table.delay = 0.3
+            table.rows = [{**table.rows[0], "cultural_sensitivity": False}]
+            invalidation = asyncio.create_task(service.invalidate())
+            await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            during = await service.get()
+            waited = time.perf_counter() - started
+            new = await invalidation
+            return old, during, waited, new
+
+        old, during, waited, new = asyncio.run(run())
+        assert during is old and waited < 0.05
+        assert new is not old and new.cultural_sensitivity is False
+
+    def test_failed_invalidation_keeps_serving_without_queries(self, table):
+        async def run():
+            service = make_service()
+            good = await service.get()
+            table.fail = True
+            await service.invalidate()
+            reads = table.reads
+            served = [await service.get() for _ in range(5)]
+            return good, served, table.reads - reads
+
+        good, served, extra_reads = asyncio.run(run())
+        assert all(value is good for value in served) and extra_reads == 0
+
+    def test_peek_without_io(self, table):
+        service = make_service(refresh_seconds=0.0, max_stale_seconds=0.0)
+        assert service.peek() is None
+        asyncio.run(service.get())
+        assert service.peek() is None  # nothing may be served once fully expired
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+"""
+Tests for single-flight request coalescing
+
+Concurrent callers share one call, errors reach every waiter without being
+cached, stale-while-revalidate returns at once, and a cancelled caller does
+not cancel the shared call.
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+def make_backend(delay: float = 0.01, fail: bool = False):
+    calls = {"count": 0}
+
+    async def fetch():
+        calls["count"] += 1
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("backend down")
+        return calls["count"]
+
+    return fetch, calls
+
+
+class TestSingleFlight:
+    """Coalescing behaviour"""
+
+    def test_concurrent_callers_share_one_call(self):
+        async def run():
+            flight = SingleFlight("test")
+            fetch, calls = make_backend()
+            results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(20)))
+            return flight, calls, results
+
+        flight, calls, results = asyncio.run(run())
+        assert calls["count"] == 1 and set(results) == {1}
+        assert flight.stats["coalesced"] == 19 and flight.get_stats()["in_flight"] == 0
+
+    def test_different_keys_run_separately(self):
+        async def run():
+            flight = SingleFlight("test")
+            fetch, calls = make_backend()
+            await asyncio.gather(flight.do("a", fetch), flight.do("b", fetch))
+            return calls
+
+        assert asyncio.run(run())["count"] == 2
+
+    def test_errors_propagate_and_are_not_cached(self):
+        async def run():
+            flight = SingleFlight("test")
+            fetch, calls = make_backend(fail=True)
+            results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(3)), return_exceptions=True)
+            with pytest.raises(RuntimeError):
+                await flight.do("k", fetch)
+            return flight, calls, results
+
+        flight, calls, results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert calls["count"] == 2 and flight.stats["errors"] == 2
+
+    def test_stale_while_revalidate(self):
+        async def run():
+            flight = SingleFlight("test")
+            fetch, calls = make_backend()
+            stale = await asyncio.gather(*(flight.do("k", fetch, stale="old") for _ in range(5)))
+            assert flight.in_flight("k")
+            await asyncio.sleep(0.05)
+            return flight, calls, stale
+
+        flight, calls, stale = asyncio.run(run())
+        assert stale == ["old"] * 5 and calls["count"] == 1
+        assert flight.stats["stale_served"] == 5
+
+    def test_cancelled_caller_does_not_cancel_shared_call(self):
+        async def run():
+            flight = SingleFlight("test")
+            fetch, calls = make_backend(delay=0.05)
+            first = asyncio.create_task(flight.do("k", fetch))
+            second = asyncio.create_task(flight.do("k", fetch))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second, calls
+
+        result, calls = asyncio.run(run())
+        assert result == 1 and calls["count"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
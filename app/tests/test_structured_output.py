@@ -0,0 +1,165 @@
+"""
+Tests for the structured output layer used by the GPT evaluators
+
+Covers salvage of wrapped and truncated JSON, validation into the evaluator
+models, the minimal-field retry and the per-evaluator parse counters.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.schemas.evaluation import QuickResponseEvaluation
+from app.services import feedback, structured_output
+from app.services.prompt_registry import prompt_registry
+from app.services.structured_output import (
+    get_parse_stats, reset_parse_stats, run_structured_evaluation,
+    salvage_json, strict_json_schema, validate_partial,
+)
+
+FALLBACK = {
+    "feedback": "fallback",
+    "score": 50,
+    "is_correct": False,
+    "urdu_used": False,
+    "completed": False,
+    "suggested_improvement": "fallback",
+}
+
+
+class FakeCompletions:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        content, finish_reason = self.replies.pop(0)
+        message = SimpleNamespace(content=content, refusal=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+
+
+def fake_client(*replies):
+    return SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(replies)))
+
+
+class TestSalvageJson:
+    """Extracting the first JSON object from model output"""
+
+    def test_complete_object_with_surrounding_text(self):
+        data, salvaged = salvage_json('```json\n{"score": 80, "note": "a } b"}\n```')
+        assert data == {"score": 80, "note": "a } b"}
+        assert not salvaged
+
+    def test_truncated_string_is_dropped(self):
+        data, salvaged = salvage_json('{"score": 80, "is_correct": true, "feedback": "Good jo')
+        assert data == {"score": 80, "is_correct": True}
+        assert salvaged
+
+    def test_truncated_nested_values(self):
+        data, salvaged = salvage_json('{"score": 70, "tips": ["one", "two", "thr')
+        assert data == {"score": 70, "tips": ["one", "two"]}
+        assert salvaged
+
+    def test_no_object(self):
+        assert salvage_json("Sorry, I can't help") == (None, False)
+        assert salvage_json("") == (None, False)
+
+
+class TestValidation:
+    """Validation into the evaluator models"""
+
+    def test_scores_are_coerced_and_clamped(self):
+        result, _, missing = validate_partial(QuickResponseEvaluation, {**FALLBACK, "score": "104.6"})
+        assert missing == []
+        assert result.score == 100
+
+    def test_reports_missing_and_invalid_fields(self):
+        data = {"feedback": "ok", "score": 80, "is_correct": "maybe", "urdu_used": False}
+        result, valid, missing = validate_partial(QuickResponseEvaluation, data)
+        assert result is None
+        assert missing == ["is_correct", "completed", "suggested_improvement"]
+        assert "is_correct" not in valid
+
+    def test_strict_schema_requires_every_field(self):
+        schema = strict_json_schema(QuickResponseEvaluation)
+        assert schema["additionalProperties"] is False
+        assert set(schema["required"]) == set(QuickResponseEvaluation.model_fields)
+        subset = strict_json_schema(QuickResponseEvaluation, ["completed"])
+        assert subset["required"] == ["completed"]
+
+
+class TestRunStructuredEvaluation:
+    """End-to-end flow with a fake OpenAI client"""
+
+    def setup_method(self):
+        reset_parse_stats()
+
+    def test_valid_reply(self):
+        client = fake_client(('{"feedback": "Nice", "score": 88, "is_correct": true, "urdu_used": false, '
+                              '"completed": true, "suggested_improvement": "More detail"}', "stop"))
+        result = run_structured_evaluation(client, "test_eval", QuickResponseEvaluation, [], FALLBACK)
+        assert result["score"] == 88
+        assert client.chat.completions.calls[0]["response_format"]["type"] == "json_schema"
+        assert get_parse_stats() == {"test_eval": {"ok": 1}}
+
+    def test_truncated_reply_retries_only_missing_fields(self, monkeypatch):
+        monkeypatch.setattr(structured_output, "STRUCTURED_OUTPUT_RETRY", True)
+        client = fake_client(
+            ('{"feedback": "Nice", "score": 88, "is_correct": true, "urdu_used": false, "completed": tr', "length"),
+            ('{"completed": true, "suggested_improvement": "More detail"}', "stop"),
+        )
+        result = run_structured_evaluation(client, "test_eval", QuickResponseEvaluation, [], FALLBACK)
+        assert result["score"] == 88 and result["completed"] is True
+        retry_schema = client.chat.completions.calls[1]["response_format"]["json_schema"]["schema"]
+        assert retry_schema["required"] == ["completed", "suggested_improvement"]
+        assert get_parse_stats() == {"test_eval": {"retried": 1}}
+
+    def test_garbage_reply_uses_fallback(self, monkeypatch):
+        monkeypatch.setattr(structured_output, "STRUCTURED_OUTPUT_RETRY", False)
+        client = fake_client(("not json at all", "stop"))
+        result = run_structured_evaluation(client, "test_eval", QuickResponseEvaluation, [], FALLBACK)
+        assert result == FALLBACK
+        assert get_parse_stats() == {"test_eval": {"failed": 1}}
+
+
+class TestEvaluators:
+    """Stage 2-6 evaluators on the registry prompts and structured output"""
+
+    GROUP_DIALOGUE_ARGS = ([{"type": "agreement", "keywords": ["agree"]}], "I agree with Ali", "Class trip",
+                           "Where should we go?", [{"speaker": "Ali", "message": "The museum"}])
+
+    def test_every_exercise_has_a_template(self):
+        missing = [(stage, exercise) for stage in range(1, 7) for exercise in (1, 2, 3)
+                   if not prompt_registry.has(stage, exercise)]
+        assert missing == []
+
+    def test_learner_inputs_stay_out_of_the_system_prompt(self, monkeypatch):
+        monkeypatch.setattr(structured_output, "STRUCTURED_OUTPUT_RETRY", False)
+        client = fake_client(("not json", "stop"))
+        monkeypatch.setattr(feedback, "client", client)
+        feedback.evaluate_response_ex2_stage3(*self.GROUP_DIALOGUE_ARGS)
+        system, user = client.chat.completions.calls[0]["messages"]
+        assert "Ali" not in system["content"] and "I agree with Ali" in user["content"]
+
+    def test_unscored_reply_is_not_a_pass(self, monkeypatch):
+        monkeypatch.setattr(structured_output, "STRUCTURED_OUTPUT_RETRY", False)
+        monkeypatch.setattr(feedback, "client", fake_client(('{"relevance_score": 25}', "stop")))
+        result = feedback.evaluate_response_ex2_stage3(*self.GROUP_DIALOGUE_ARGS)
+        assert result["success"] is False and result["error"] == "Failed to parse evaluation response"
+        assert result["is_correct"] is False
+
+    def test_stage6_weights_the_sub_scores(self, monkeypatch):
+        reply = ('{"spontaneous_fluency_score": 80, "depth_of_thought_score": 70, "advanced_vocabulary_score": 60, '
+                 '"structural_coherence_score": 50, "keyword_matches": 2, "total_keywords": 3, "fluency_analysis": "a", '
+                 '"thought_analysis": "b", "vocabulary_analysis": "c", "coherence_analysis": "d", "strengths": [], '
+                 '"areas_for_improvement": [], "suggested_improvement": "x"}')
+        client = fake_client((reply, "stop"))
+        monkeypatch.setattr(feedback, "client", client)
+        result = feedback.evaluate_response_ex1_stage6(["a", "b", "c"], "text", "topic", "model", {})
+        assert result["score"] == 66.5 and result["completed"] is True
+        assert client.chat.completions.calls[0]["model"] == "gpt-4o"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
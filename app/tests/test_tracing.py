@@ -0,0 +1,128 @@
+"""
+Tests for request tracing
+
+Span nesting through the contextvar, head sampling, error status, spans
+that start and end in different callbacks, and the cache lookup span.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.multi_level_cache import MultiLevelCache
+from app.utils.tracing import LocalSpanExporter, Tracer, tracer
+
+
+def make_tracer(sample_ratio: float = 1.0):
+    exporter = LocalSpanExporter()
+    return Tracer(sample_ratio=sample_ratio, exporters=[exporter], enabled=True), exporter
+
+
+class TestSpans:
+    """Nesting, status and manual spans"""
+
+    def test_children_nest_across_tasks_and_threads(self):
+        test_tracer, exporter = make_tracer()
+
+        def tts_in_thread():
+            with test_tracer.span("tts"):
+                pass
+
+        async def scenario():
+            with test_tracer.span("ws.turn", route="english_only") as turn:
+                with test_tracer.span("stt"):
+                    await asyncio.sleep(0)
+
+                async def gpt():
+                    with test_tracer.span("gpt.analysis"):
+                        await asyncio.sleep(0)
+
+                await asyncio.create_task(gpt())
+                await asyncio.to_thread(tts_in_thread)
+            return turn
+
+        turn = asyncio.run(scenario())
+        spans = {span.name: span for span in exporter.get_finished_spans(turn.trace_id)}
+        assert set(spans) == {"ws.turn", "stt", "gpt.analysis", "tts"}
+        assert spans["ws.turn"].parent_id is None
+        assert all(spans[name].parent_id == turn.span_id for name in ("stt", "gpt.analysis", "tts"))
+        assert spans["ws.turn"].attributes == {"route": "english_only"}
+        assert test_tracer.current_span() is None
+
+    def test_exception_is_recorded_and_reraised(self):
+        test_tracer, exporter = make_tracer()
+        with pytest.raises(TimeoutError):
+            with test_tracer.span("gpt.evaluation"):
+                raise TimeoutError("openai slow")
+
+        (span,) = exporter.get_finished_spans()
+        assert span.status == "error"
+        assert "TimeoutError" in span.status_message
+        assert span.events[0][0] == "exception"
+
+    def test_manual_span_with_attach(self):
+        test_tracer, exporter = make_tracer()
+        turn = test_tracer.start_span("ws.turn", route="realtime")
+        token = test_tracer.attach(turn)
+        with test_tracer.span("redis"):
+            pass
+        test_tracer.detach(token)
+        turn.add_event("tts.first_byte")
+        turn.end()
+        turn.end()  # idempotent
+
+        spans = exporter.get_finished_spans()
+        assert [span.name for span in spans] == ["redis", "ws.turn"]
+        assert spans[0].parent_id == turn.span_id
+        assert turn.events[0][0] == "tts.first_byte"
+
+
+class TestSampling:
+    """Head sampling per trace"""
+
+    def test_unsampled_traces_record_nothing(self):
+        test_tracer, exporter = make_tracer(sample_ratio=0.0)
+        with test_tracer.span("ws.turn") as turn:
+            with test_tracer.span("stt") as child:
+                child.set_attribute("vendor", "google")
+        assert not turn.recording and not child.recording
+        assert child.trace_id == turn.trace_id
+        assert child.attributes == {}
+        assert exporter.get_finished_spans() == []
+
+    def test_no_exporters_means_no_recording(self):
+        test_tracer = Tracer(sample_ratio=1.0, exporters=[], enabled=True)
+        with test_tracer.span("ws.turn") as turn:
+            pass
+        assert not turn.recording
+
+
+class TestCacheSpan:
+    """MultiLevelCache lookups appear as cache.lookup spans"""
+
+    def test_lookup_span_carries_result(self):
+        exporter = LocalSpanExporter()
+        saved = (tracer.sample_ratio, tracer.exporters, tracer.enabled)
+        tracer.configure(sample_ratio=1.0, exporters=[exporter])
+        tracer.enabled = True
+
+        async def scenario():
+            cache = MultiLevelCache(name="test_tracing_cache")
+            await cache.cache_response(stage="greeting", user_input="hello there", response_text="Hi!",
+                                       audio=b"audio", topic=None, cache_level="l1")
+            await cache.get_cached_response_fast(stage="greeting", user_input="hello there", topic=None)
+            await cache.get_cached_response_fast(stage="greeting", user_input="unknown", topic=None)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            tracer.configure(sample_ratio=saved[0], exporters=saved[1])
+            tracer.enabled = saved[2]
+
+        lookups = [span for span in exporter.get_finished_spans() if span.name == "cache.lookup"]
+        assert [span.attributes["result"] for span in lookups] == ["l1", "miss"]
+        assert lookups[0].attributes["cache"] == "test_tracing_cache"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""
+Tests for the translation service
+
+Cache-key normalization and the lookup order: precomputed content table,
+in-process LRU, Redis, then one (coalesced) model call per distinct text.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import translation as translation_module
+from app.services.translation import (
+    ENGLISH_TO_URDU,
+    URDU_TO_ENGLISH,
+    TranslationService,
+    normalize_translation_text,
+)
+
+
+class FakeCache:
+    """Stands in for cache_manager.get/set"""
+
+    def __init__(self):
+        self.entries = {}
+
+    async def get(self, key, **kwargs):
+        return self.entries.get(key)
+
+    async def set(self, key, value, ttl=None, **kwargs):
+        self.entries[key] = value
+
+
+class FakeOpenAI:
+    """Answers chat completions with a numbered translation and records the prompts"""
+
+    def __init__(self):
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages):
+        self.prompts.append(messages[0]["content"])
+        await asyncio.sleep(0.01)
+        content = f"translation {len(self.prompts)}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def vendors(monkeypatch):
+    cache, model = FakeCache(), FakeOpenAI()
+    monkeypatch.setattr(translation_module, "cache_manager", cache)
+    monkeypatch.setattr(translation_module, "get_async_openai_client", lambda: model)
+    return SimpleNamespace(cache=cache, model=model)
+
+
+class TestNormalization:
+    """What counts as the same text"""
+
+    def test_whitespace_case_and_quotes_are_ignored(self):
+        assert normalize_translation_text('  "Aap   theek\nhain?" ') == "aap theek hain?"
+        assert normalize_translation_text("“Shukriya”") == "shukriya"
+        assert normalize_translation_text(None) == ""
+
+    def test_punctuation_is_kept(self):
+        assert normalize_translation_text("aap theek hain?") != normalize_translation_text("aap theek hain")
+        assert normalize_translation_text("آپ ٹھیک ہیں؟") != normalize_translation_text("آپ ٹھیک ہیں۔")
+        assert normalize_translation_text("Stop!") != normalize_translation_text("Stop")
+
+
+class TestLookups:
+    """Table, LRU and Redis hits before the model"""
+
+    def test_table_hit_skips_the_model(self, vendors):
+        service = TranslationService()
+        service.add_pair("How are you?", "آپ کیسے ہیں؟")
+        assert asyncio.run(service.translate("آپ کیسے ہیں؟", URDU_TO_ENGLISH)) == "How are you?"
+        assert asyncio.run(service.translate(" how are you? ", ENGLISH_TO_URDU)) == "آپ کیسے ہیں؟"
+        assert vendors.model.prompts == [] and service.stats["table_hits"] == 2
+
+    def test_repeats_hit_the_cache_and_questions_do_not_share_statements(self, vendors):
+        service = TranslationService()
+
+        async def run():
+            first = await asyncio.gather(*(service.urdu_to_english("aap theek hain?") for _ in range(3)))
+            again = await service.urdu_to_english("Aap theek hain?")
+            statement = await service.urdu_to_english("aap theek hain")
+            return first, again, statement
+
+        first, again, statement = asyncio.run(run())
+        assert len(set(first)) == 1 and again == first[0]
+        assert statement != first[0]
+        assert len(vendors.model.prompts) == 2
+        assert service.stats["memory_hits"] == 1 and service.stats["coalesced"] == 2
+
+    def test_redis_hit_fills_the_lru(self, vendors):
+        warm, cold = TranslationService(), TranslationService()
+        asyncio.run(warm.urdu_to_english("shukriya"))
+        assert asyncio.run(cold.urdu_to_english("shukriya")) == "translation 1"
+        assert cold.stats["redis_hits"] == 1 and len(vendors.model.prompts) == 1
+        asyncio.run(cold.urdu_to_english("shukriya"))
+        assert cold.stats["memory_hits"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,174 @@
+"""
+Tests for the async TTS facade
+
+Provider ranking by measured latency, fallback and circuit breaking,
+content-hash caching and coalescing, using in-process stand-in providers.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import tts_facade as facade_module
+from app.services.tts_facade import TTSFacade, TTSProvider, TTSUnavailableError, content_key
+from app.utils.bounded_cache import BoundedTTLCache
+
+
+def make_provider(name, audio=b"mp3", delay=0.0, fail=False, expected=0.5, available=True, calls=None):
+    async def synthesize(facade, text):
+        if calls is not None:
+            calls.append(name)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} down")
+        return audio + b":" + text.encode()
+    return TTSProvider(name, synthesize, available=lambda: available, expected_seconds=expected)
+
+
+def make_facade(*providers):
+    return TTSFacade(providers, workers=2, cache=BoundedTTLCache(max_entries=100))
+
+
+class TestRanking:
+    """Which provider is tried first"""
+
+    def test_preferred_provider_wins_when_latencies_are_close(self):
+        facade = make_facade(make_provider("elevenlabs", expected=0.8), make_provider("google", expected=0.6))
+        assert [p.name for p in facade.ranked()] == ["elevenlabs", "google"]
+
+    def test_much_faster_fallback_is_tried_first(self):
+        facade = make_facade(make_provider("elevenlabs", expected=3.0), make_provider("google", expected=0.5))
+        assert [p.name for p in facade.ranked()] == ["google", "elevenlabs"]
+
+    def test_demoted_provider_is_probed_again(self, monkeypatch):
+        monkeypatch.setattr(facade_module, "TTS_PROBE_SECONDS", 0.05)
+        calls = []
+        primary = make_provider("elevenlabs", expected=3.0, calls=calls)
+        facade = make_facade(primary, make_provider("google", expected=0.5, calls=calls))
+        primary.last_attempt = time.monotonic()
+
+        async def run():
+            await facade.synthesize("one")
+            await asyncio.sleep(0.06)
+            await facade.synthesize("two")  # stale figure: elevenlabs goes first, and is fast now
+            await facade.synthesize("three")
+
+        asyncio.run(run())
+        assert calls == ["google", "elevenlabs", "google"]
+        assert primary.latency < 3.0
+
+    def test_unavailable_providers_are_skipped(self):
+        facade = make_facade(make_provider("elevenlabs", available=False), make_provider("gtts"))
+        assert [p.name for p in facade.ranked()] == ["gtts"]
+
+
+class TestFallback:
+    """Failures fall through the chain and open the circuit"""
+
+    def test_falls_back_and_opens_circuit(self, monkeypatch):
+        monkeypatch.setattr(facade_module, "TTS_FAILURE_THRESHOLD", 2)
+        calls = []
+        primary = make_provider("elevenlabs", fail=True, calls=calls)
+        facade = make_facade(primary, make_provider("google", audio=b"g", calls=calls))
+
+        async def run():
+            return [await facade.synthesize(f"phrase {i}") for i in range(3)]
+
+        results = asyncio.run(run())
+        assert all(audio.startswith(b"g:") for audio in results)
+        # Third request skips the open circuit
+        assert calls == ["elevenlabs", "google", "elevenlabs", "google", "google"]
+        assert not primary.healthy(time.monotonic())
+        assert facade.ranked()[-1] is primary
+
+    def test_all_failing_raises(self):
+        facade = make_facade(make_provider("elevenlabs", fail=True), make_provider("gtts", fail=True))
+        with pytest.raises(TTSUnavailableError, match="elevenlabs.*gtts"):
+            asyncio.run(facade.synthesize("hello"))
+
+    def test_timeout_counts_as_failure(self, monkeypatch):
+        monkeypatch.setattr(facade_module, "TTS_PROVIDER_TIMEOUT", 0.05)
+        slow = make_provider("elevenlabs", delay=1.0)
+        facade = make_facade(slow, make_provider("google", audio=b"g"))
+        assert asyncio.run(facade.synthesize("hello")).startswith(b"g:")
+        assert slow.failures == 1
+
+    def test_empty_text_rejected(self):
+        with pytest.raises(ValueError):
+            asyncio.run(make_facade(make_provider("gtts")).synthesize("   "))
+
+
+class TestCaching:
+    """Content-hash cache and coalescing of identical requests"""
+
+    def test_same_text_is_synthesized_once(self):
+        calls = []
+        facade = make_facade(make_provider("elevenlabs", delay=0.02, calls=calls))
+
+        async def run():
+            first = await asyncio.gather(*(facade.synthesize("Hello there") for _ in range(5)))
+            second = await facade.synthesize("Hello   there")  # same text after normalization
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert calls == ["elevenlabs"]
+        assert len(set(first)) == 1 and second == first[0]
+
+    def test_fallback_audio_is_cached_briefly(self, monkeypatch):
+        monkeypatch.setattr(facade_module, "TTS_FALLBACK_CACHE_TTL", 0.01)
+        facade = make_facade(make_provider("elevenlabs", fail=True), make_provider("google", audio=b"g"))
+        asyncio.run(facade.synthesize("hello"))
+        time.sleep(0.05)
+        assert facade.cache.get(content_key("hello")) is None
+
+    def test_content_key_normalizes_whitespace(self):
+        assert content_key(" a  b\n") == content_key("a b")
+        assert content_key("a b") != content_key("a c")
+
+
+class TestExecutor:
+    """Blocking providers run on the bounded pool"""
+
+    def test_run_blocking_keeps_loop_responsive(self):
+        facade = make_facade()
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            thread_name = await facade.run_blocking(lambda: (time.sleep(0.2), threading.current_thread().name)[1])
+            task.cancel()
+            return ticks, thread_name
+
+        ticks, thread_name = asyncio.run(run())
+        facade.shutdown()
+        assert ticks >= 5
+        assert thread_name.startswith("tts")
+
+
+class TestRoutes:
+    """Exhausted providers surface as 503"""
+
+    def test_dialogue_prompt_audio_maps_unavailable_to_503(self, monkeypatch):
+        from app.routes import functional_dialogue
+
+        async def unavailable(text):
+            raise TTSUnavailableError("elevenlabs: down; gtts: down")
+
+        monkeypatch.setattr(facade_module.tts_facade, "synthesize", unavailable)
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(functional_dialogue.get_dialogue_prompt_audio(1))
+        assert error.value.status_code == 503
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
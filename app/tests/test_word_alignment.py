@@ -0,0 +1,42 @@
+"""
+Tests for word alignment scoring
+
+Covers normalization, partial credit for near-miss words and penalties for
+missing and extra words.
+"""
+
+import pytest
+
+from app.services.word_alignment import align_words, normalize_words
+
+
+class TestWordAlignment:
+    """Alignment-based pronunciation scoring tests"""
+
+    def test_exact_match_ignores_case_and_punctuation(self):
+        result = align_words("I am fine, thank you.", "i am fine thank you")
+        assert result.score == 100.0
+        assert result.correct == 5
+
+    def test_contractions_are_expanded(self):
+        assert normalize_words("I'm here") == ["i", "am", "here"]
+        assert align_words("I am here", "I'm here").score == 100.0
+
+    def test_near_miss_gets_partial_credit(self):
+        result = align_words("three trees", "tree trees")
+        assert result.mispronounced == 1
+        assert 50.0 < result.score < 100.0
+
+    def test_missing_and_extra_words_lower_score(self):
+        missing = align_words("I like to read books", "I like books")
+        extra = align_words("I like books", "I really really like books")
+        assert missing.missing == 2
+        assert extra.extra == 2
+        assert missing.score < 100.0 and extra.score < 100.0
+
+    def test_empty_expected_text_scores_zero(self):
+        assert align_words("", "hello").score == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,160 @@
+"""
+Bounded In-Process Cache
+
+TTL + LRU cache with hard limits, used as the Redis fallback and as the
+near-cache in front of Redis:
+- Expiry through a min-heap of deadlines (expired entries are swept on
+  writes and skipped on reads), so TTLs are honoured without a timer thread
+- LRU eviction bounded by entry count and by approximate size in bytes
+- Hit/miss/eviction/expiration counters for monitoring
+- Thread-safe (a single lock; all operations are O(log n) or better)
+
+Values are stored as given; callers that need isolation from mutation
+should store serialized values (CacheManager stores JSON strings, so the
+byte accounting is exact there).
+"""
+
+import heapq
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: Optional[float]
+    size: int
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate payload size in bytes (exact for str/bytes)."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) if not value.isascii() else len(value)
+    return sys.getsizeof(value)
+
+
+class BoundedTTLCache:
+    """In-process cache with TTL expiry and LRU eviction by entry count and byte budget"""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024,
+                 default_ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._deadlines: List[Tuple[float, str]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> bool:
+        """Store value; returns False if it alone exceeds the byte budget."""
+        size = estimate_size(value) if size is None else size
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+            now = time.monotonic()
+            expires_at = now + ttl if ttl is not None else None
+            self._data[key] = _Entry(value, expires_at, size)
+            self._bytes += size
+            self.sets += 1
+            if expires_at is not None:
+                heapq.heappush(self._deadlines, (expires_at, key))
+            self._sweep_expired(now)
+            self._evict()
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._deadlines.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    # --- Internals (lock held) ---
+
+    def _remove(self, key: str):
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+
+    def _sweep_expired(self, now: float):
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            expires_at, key = heapq.heappop(deadlines)
+            entry = self._data.get(key)
+            # Skip heap records left behind by overwrites/deletes
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self.expirations += 1
+        # Stale heap records from overwrites can pile up; rebuild when they dominate
+        if len(deadlines) > 2 * len(self._data) + 64:
+            self._deadlines = [(e.expires_at, k) for k, e in self._data.items() if e.expires_at is not None]
+            heapq.heapify(self._deadlines)
+
+    def _evict(self):
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            key, entry = self._data.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+
+_MISSING = object()
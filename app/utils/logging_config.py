@@ -0,0 +1,257 @@
+"""
+Structured Logging
+
+Non-blocking, structured logs for the request hot paths, in place of
+synchronous print() calls:
+- configure_logging(): a single QueueHandler on the root logger. Callers only
+  enqueue the record; a QueueListener thread formats, redacts and writes it,
+  so a slow stdout or log shipper never stalls the event loop. When the queue
+  is full, records are dropped (and counted) rather than waited on
+- Per-module levels from LOG_LEVEL and LOG_LEVELS; disabled levels cost one
+  level check at the call site
+- get_logger(name): logger adapter for structured events, e.g.
+  log.info("topic_attempt.recorded", stage=1, score=82.5). Keyword arguments
+  become fields, rendered as key=value (text) or JSON keys, together with the
+  trace id of the current sampled span (see tracing.py)
+- log.throttled(...): at most one record per interval for per-chunk and
+  per-frame events, with the number suppressed in between
+- Redaction: emails, bearer tokens, JWTs, API keys and international phone
+  numbers are masked in messages and fields, and fields with sensitive names
+  (password, token, email, ...) are dropped to "<redacted>", before anything
+  is written
+
+Environment:
+- LOG_LEVEL: root level (default: INFO)
+- LOG_LEVELS: per-logger levels, e.g. "app.routes.openai_realtime_ws=DEBUG,app.routes.teacher_dashboard=WARNING"
+- LOG_FORMAT: text or json (default: text)
+- LOG_QUEUE_SIZE: records buffered for the writer thread (default: 10000)
+- LOG_REDACT: mask PII and credentials in log output (default: true)
+"""
+
+import json
+import logging
+import logging.handlers
+import math
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+from app.utils.tracing import tracer
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_REDACT = os.getenv("LOG_REDACT", "true").lower() == "true"
+
+# Chatty server internals (websocket frames, per-request access lines)
+DEFAULT_LEVELS = {
+    "websockets": "WARNING",
+    "uvicorn.protocols.websockets": "WARNING",
+    "uvicorn.protocols.http.h11_impl": "WARNING",
+    "uvicorn.protocols.websocket": "WARNING",
+    "uvicorn.protocols.http": "WARNING",
+    "uvicorn.lifespan": "WARNING",
+    "uvicorn.error": "WARNING",
+    "uvicorn.access": "WARNING",
+}
+
+SENSITIVE_FIELDS = frozenset({
+    "password", "token", "access_token", "refresh_token", "api_key", "authorization",
+    "secret", "email", "phone", "phone_number",
+})
+
+_REDACTIONS = (
+    (re.compile(r"(?i)\bbearer\s+[A-Za-z0-9._~+/=-]+"), "Bearer <redacted>"),
+    (re.compile(r"\beyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+"), "<jwt>"),
+    (re.compile(r"\b(?:sk|pk|xi|rk)[-_][A-Za-z0-9_-]{16,}"), "<api-key>"),
+    (re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"), "<email>"),
+    (re.compile(r"\+\d{1,3}[\s-]?\d[\d\s-]{7,}\d"), "<phone>"),
+)
+
+# LoggerAdapter keyword arguments that are not fields
+_LOGGING_KWARGS = frozenset({"exc_info", "stack_info", "stacklevel", "extra"})
+
+
+def redact(value: Any) -> Any:
+    """Mask PII and credentials in strings, recursing into dicts and lists"""
+    if isinstance(value, str):
+        for pattern, replacement in _REDACTIONS:
+            value = pattern.sub(replacement, value)
+        return value
+    if isinstance(value, dict):
+        return redact_fields(value)
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return value
+
+
+def redact_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: "<redacted>" if str(key).lower() in SENSITIVE_FIELDS else redact(value)
+            for key, value in fields.items()}
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """"a.b=DEBUG,c=WARNING" -> {"a.b": "DEBUG", "c": "WARNING"}; malformed entries are skipped"""
+    levels = {}
+    for entry in spec.split(","):
+        name, _, level = entry.strip().partition("=")
+        level = level.strip().upper()
+        if name.strip() and isinstance(logging.getLevelName(level), int):
+            levels[name.strip()] = level
+        elif entry.strip():
+            print(f"⚠️ [LOGGING] Ignoring LOG_LEVELS entry '{entry.strip()}'")
+    return levels
+
+
+class _StructuredFormatter(logging.Formatter):
+    """Shared message/field extraction; runs on the writer thread"""
+
+    def __init__(self, redact_output: bool = LOG_REDACT):
+        super().__init__()
+        self.redact_output = redact_output
+
+    def _payload(self, record: logging.LogRecord) -> Tuple[str, Dict[str, Any]]:
+        message = record.getMessage()
+        fields = dict(getattr(record, "fields", None) or {})
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            fields["trace_id"] = trace_id
+        if self.redact_output:
+            message, fields = redact(message), redact_fields(fields)
+        return message, fields
+
+
+class TextFormatter(_StructuredFormatter):
+    """2026-01-01 12:00:00,000 INFO app.services.feedback: gpt.analysis stage=greeting output_chars=212"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message, fields = self._payload(record)
+        first_line, newline, traceback = message.partition("\n")  # fields go before any traceback
+        rendered = "".join(f" {key}={self._value(value)}" for key, value in fields.items())
+        return f"{self.formatTime(record)} {record.levelname} {record.name}: {first_line}{rendered}{newline}{traceback}"
+
+    @staticmethod
+    def _value(value: Any) -> str:
+        if isinstance(value, str) and value and " " not in value and "=" not in value:
+            return value
+        return json.dumps(value, default=str, ensure_ascii=False)
+
+
+class JsonFormatter(_StructuredFormatter):
+    """One JSON object per line for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message, fields = self._payload(record)
+        payload = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "event": message,
+            **fields,
+        }
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never waits: a full queue drops the record"""
+
+    def __init__(self, maxsize: int = LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        # The span lives in a contextvar, so it has to be read on the caller's side
+        span = tracer.current_span()
+        if span is not None and span.recording:
+            record.trace_id = span.trace_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger whose keyword arguments become structured fields"""
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+        self._throttle: Dict[str, Tuple[float, int]] = {}  # event -> (last emitted, suppressed since)
+        self._lock = threading.Lock()
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in _LOGGING_KWARGS}
+        if fields:
+            kwargs["extra"] = {**kwargs.get("extra", {}), "fields": fields}
+        return msg, kwargs
+
+    def throttled(self, level: int, event: str, interval: float = 1.0, **fields):
+        """Log event at most once per interval seconds; the next record carries the suppressed count."""
+        if not self.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            last, suppressed = self._throttle.get(event, (-math.inf, 0))
+            if now - last < interval:
+                self._throttle[event] = (last, suppressed + 1)
+                return
+            self._throttle[event] = (now, 0)
+        if suppressed:
+            fields["suppressed"] = suppressed
+        self.log(level, event, **fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    return StructuredLogger(logging.getLogger(name))
+
+
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(level: str = LOG_LEVEL, levels: str = LOG_LEVELS, fmt: str = LOG_FORMAT,
+                      stream: Optional[TextIO] = None, redact_output: bool = LOG_REDACT) -> NonBlockingQueueHandler:
+    """
+    Route all logging through the queue and its writer thread, replacing any
+    root handlers (e.g. from basicConfig). Calling it again reconfigures.
+    """
+    global _queue_handler, _listener
+    shutdown_logging()
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter(redact_output) if fmt == "json" else TextFormatter(redact_output))
+    _queue_handler = NonBlockingQueueHandler()
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, output)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.handlers[:] = [_queue_handler]
+    root.setLevel(level)
+    for name, module_level in {**DEFAULT_LEVELS, **parse_levels(levels)}.items():
+        logging.getLogger(name).setLevel(module_level)
+    return _queue_handler
+
+
+def shutdown_logging():
+    """Write out queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_status() -> Dict[str, Any]:
+    if _queue_handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+    }
@@ -0,0 +1,334 @@
+"""
+Prometheus Metrics
+
+In-process counters, gauges and histograms, rendered in the Prometheus text
+exposition format (0.0.4) by GET /metrics:
+- Fixed-bucket histograms: constant memory however many observations, with
+  count/sum/avg and bucket-interpolated quantiles for the JSON status views
+- Label sets per metric (route, stage, exercise, vendor, cache, ...); label
+  values must come from small known sets, never from user input
+- Collectors: callbacks run at scrape time that refresh gauges from
+  components which already keep their own counters (vendor pools, admission)
+- Thread-safe: vendor SDK calls are timed from worker threads
+
+prometheus_client isn't a dependency; the text format is small enough to
+render here, and the histograms double as the in-process latency stats.
+
+Environment:
+- METRICS_ENABLED: expose GET /metrics (default: true)
+"""
+
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers cache lookups through slow GPT evaluations
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# In-process lookups (cache levels, local checks)
+FAST_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    """Base for a named metric holding one value per label set"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        if len(labels) != len(self.labelnames) or any(name not in labels for name in self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _lines(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._lines(),
+        ]
+
+
+class _Value(_Metric):
+    """Single number per label set"""
+
+    def _add(self, amount: float, labels: Dict[str, object]):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Counter(_Value):
+    """Monotonic count per label set"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._add(amount, labels)
+
+
+class Gauge(_Value):
+    """Value that goes up and down per label set"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class _HistogramState:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size  # per bucket, not cumulative; the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """Fixed-bucket distribution per label set: memory doesn't grow with observations"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.bounds, value)  # first bucket with bound >= value
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = _HistogramState(len(self.bounds) + 1)
+            state.buckets[index] += 1
+            state.count += 1
+            state.sum += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the block in seconds (also when it raises)"""
+        self._key(labels)  # fail before the block runs, not after
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _state(self, labels: Dict[str, object]) -> Optional[_HistogramState]:
+        return self._values.get(self._key(labels))
+
+    def quantile(self, q: float, **labels) -> float:
+        """Estimate of the q-quantile, interpolated within its bucket like PromQL's histogram_quantile"""
+        state = self._state(labels)
+        if state is None or not state.count:
+            return 0.0
+        with self._lock:
+            counts = list(state.buckets)
+            total = state.count
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1] if self.bounds else 0.0
+                lower = self.bounds[index - 1] if index else 0.0
+                return lower + (self.bounds[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1] if self.bounds else 0.0
+
+    def snapshot(self, **labels) -> Dict[str, float]:
+        """count, sum, avg and p50/p95/p99 (seconds) for one label set"""
+        state = self._state(labels)
+        if state is None:
+            return {"count": 0, "sum": 0.0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+        return {
+            "count": state.count,
+            "sum": state.sum,
+            "avg": state.sum / state.count if state.count else 0.0,
+            "p50": self.quantile(0.5, **labels),
+            "p95": self.quantile(0.95, **labels),
+            "p99": self.quantile(0.99, **labels),
+        }
+
+    def _lines(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(s.buckets), s.count, s.sum) for key, s in self._values.items())
+        bucket_names = self.labelnames + ("le",)
+        lines = []
+        for key, buckets, count, total in items:
+            cumulative = 0
+            for bound, bucket in zip(self.bounds + (math.inf,), buckets):
+                cumulative += bucket
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_names, key + (_format_value(bound),))} "
+                             f"{cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics plus scrape-time collectors, rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run collector before every render (e.g. to copy pool counters into gauges)"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                print(f"⚠️ [METRICS] Collector {getattr(collector, '__name__', collector)} failed: {e}")
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+metrics_registry = MetricsRegistry()
+
+# Pipeline latencies (seconds)
+STT_SECONDS = metrics_registry.histogram(
+    "ai_tutor_stt_seconds", "Speech-to-text latency", ("route", "vendor"))
+GPT_SECONDS = metrics_registry.histogram(
+    "ai_tutor_gpt_seconds", "GPT analysis and evaluation latency", ("route", "stage"))
+TTS_SECONDS = metrics_registry.histogram(
+    "ai_tutor_tts_seconds", "Text-to-speech synthesis latency", ("route", "vendor"))
+DB_SECONDS = metrics_registry.histogram(
+    "ai_tutor_db_seconds", "Database (PostgREST) round-trip latency", ("table", "method"))
+WS_TURN_SECONDS = metrics_registry.histogram(
+    "ai_tutor_ws_turn_seconds", "Websocket conversation turn latency, end to end", ("route", "stage"))
+EVALUATION_SECONDS = metrics_registry.histogram(
+    "ai_tutor_evaluation_seconds", "Exercise evaluation request latency", ("exercise",))
+VENDOR_REQUEST_SECONDS = metrics_registry.histogram(
+    "ai_tutor_vendor_request_seconds", "Outbound vendor request latency, per pooled request", ("vendor",))
+STEP_SECONDS = metrics_registry.histogram(
+    "ai_tutor_step_seconds", "Pipeline step durations recorded by PerformanceMonitor and Profiler",
+    ("source", "step"))
+
+# Caches
+CACHE_HITS = metrics_registry.counter(
+    "ai_tutor_cache_hits_total", "Cache hits by cache and level", ("cache", "level"))
+CACHE_MISSES = metrics_registry.counter(
+    "ai_tutor_cache_misses_total", "Cache misses by cache", ("cache",))
+CACHE_LOOKUP_SECONDS = metrics_registry.histogram(
+    "ai_tutor_cache_lookup_seconds", "Cache lookup latency for hits", ("cache", "level"), FAST_BUCKETS)
+SEMANTIC_CACHE_LOOKUPS = metrics_registry.counter(
+    "ai_tutor_semantic_cache_lookups_total",
+    "Similarity lookups after an exact miss: hit, miss, or rejected by a guardrail", ("cache", "stage", "result"))
+SEMANTIC_CACHE_SIMILARITY = metrics_registry.histogram(
+    "ai_tutor_semantic_cache_similarity", "Cosine similarity of the nearest cached utterance", ("cache", "stage"),
+    (0.3, 0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 0.99))
+SEMANTIC_CACHE_VERIFICATIONS = metrics_registry.counter(
+    "ai_tutor_semantic_cache_verifications_total",
+    "Sampled similarity hits checked against GPT: agree or disagree on next stage and topic", ("cache", "stage", "result"))
+
+# Load and errors
+IN_FLIGHT = metrics_registry.gauge(
+    "ai_tutor_in_flight", "Websocket turns and evaluations being processed", ("route",))
+VENDOR_IN_FLIGHT = metrics_registry.gauge(
+    "ai_tutor_vendor_in_flight", "Vendor requests holding a pool slot", ("vendor",))
+VENDOR_WAITING = metrics_registry.gauge(
+    "ai_tutor_vendor_waiting", "Vendor requests waiting for a pool slot", ("vendor",))
+VENDOR_ERRORS = metrics_registry.counter(
+    "ai_tutor_vendor_errors_total", "Failed vendor requests (exceptions, 429 and 5xx)", ("vendor",))
+ADMISSION_IN_USE = metrics_registry.gauge(
+    "ai_tutor_admission_in_use", "Admitted pipelines holding a vendor slot", ("vendor",))
+ADMISSION_WAITING = metrics_registry.gauge(
+    "ai_tutor_admission_waiting", "Pipelines queued for admission", ("vendor",))
@@ -2,19 +2,23 @@
 Enhanced Performance Monitor
 
 Tracks detailed metrics for each pipeline step with thresholds and alerts.
-Helps identify bottlenecks and measure optimization impact.
+Helps identify bottlenecks and measure optimization impact. Durations go into
+fixed-bucket histograms: one per step for the summary percentiles, and the
+process-wide ai_tutor_step_seconds histogram exported on /metrics.
 """
 
 import time
 from collections import defaultdict
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 from dataclasses import dataclass, field
 
+from app.utils.metrics import STEP_SECONDS, Histogram
+
 @dataclass
 class StepMetrics:
     """Metrics for a single pipeline step"""
     name: str
-    durations: List[float] = field(default_factory=list)
+    histogram: Histogram = field(default_factory=lambda: Histogram("step_seconds", "Step durations"))
     count: int = 0
     total_time: float = 0.0
     avg_time: float = 0.0
@@ -24,17 +28,14 @@ class StepMetrics:
     
     def add_duration(self, duration: float):
         """Add a new duration measurement"""
-        self.durations.append(duration)
+        self.histogram.observe(duration)
+        STEP_SECONDS.observe(duration, source="performance_monitor", step=self.name)
         self.count += 1
         self.total_time += duration
         self.avg_time = self.total_time / self.count
         self.min_time = min(self.min_time, duration)
         self.max_time = max(self.max_time, duration)
         
-        # Keep only last 100 samples to prevent memory growth
-        if len(self.durations) > 100:
-            self.durations.pop(0)
-        
         # Alert if exceeds threshold
         if duration > self.threshold:
             print(f"⚠️ [PERF] {self.name} took {duration:.2f}s (threshold: {self.threshold}s)")
@@ -105,6 +106,7 @@ class PerformanceMonitor:
                     "avg_ms": round(metrics.avg_time * 1000, 2),
                     "min_ms": round(metrics.min_time * 1000, 2),
                     "max_ms": round(metrics.max_time * 1000, 2),
+                    "p95_ms": round(metrics.histogram.quantile(0.95) * 1000, 2),
                     "total_ms": round(metrics.total_time * 1000, 2),
                     "threshold_ms": round(metrics.threshold * 1000, 2),
                 }
@@ -138,6 +140,7 @@ class PerformanceMonitor:
                   f"Avg: {data['avg_ms']:7.2f}ms | "
                   f"Min: {data['min_ms']:7.2f}ms | "
                   f"Max: {data['max_ms']:7.2f}ms | "
+                  f"P95: {data['p95_ms']:7.2f}ms | "
                   f"Count: {data['count']:4d}")
         
         if summary["bottlenecks"]:
@@ -3,12 +3,16 @@ Performance Profiler Utility
 
 This module provides performance tracking and profiling capabilities for the AI Tutor backend.
 It helps monitor execution times and identify performance bottlenecks in real-time operations.
+Every mark is also recorded in the ai_tutor_step_seconds histogram (source = profiler name)
+so the per-session printouts add up to fleet-wide percentiles on /metrics.
 """
 
 import time
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from app.utils.metrics import STEP_SECONDS
+
 class Profiler:
     """
     Performance profiler for tracking execution times and bottlenecks.
@@ -50,6 +54,7 @@ class Profiler:
         
         self.marks.append(mark_data)
         self.last_mark_time = current_time
+        STEP_SECONDS.observe(elapsed_since_last / 1000, source=self.name, step=label)
         
         # Log the mark
         print(f"⏱️ [{self.name}] {label}: {elapsed_since_last:.2f}ms (total: {elapsed_since_start:.2f}ms)")
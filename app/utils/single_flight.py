@@ -0,0 +1,77 @@
+"""
+Single-Flight Request Coalescing
+
+Collapses concurrent lookups of the same key into one backend call:
+- The first caller for a key starts the call; everyone arriving while it is
+  in flight awaits the same task (N simultaneous misses cost one call)
+- Callers are shielded from each other: one caller being cancelled (e.g. a
+  websocket disconnect) never cancels the shared call
+- Optional stale-while-revalidate: callers holding a stale value get it back
+  immediately while a single background refresh runs
+- Counters per group for monitoring (see stats)
+
+Usage:
+    flight = SingleFlight("settings")
+    settings = await flight.do("ai_settings", fetch_settings)
+    settings = await flight.do("ai_settings", fetch_settings, stale=cached)  # returns at once
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Keyed in-flight tasks shared by concurrent callers on the same event loop"""
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "stale_served": 0,
+            "errors": 0,
+        }
+
+    def _task_for(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        # Tasks belong to one loop; a caller on another loop starts its own call
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.stats["coalesced"] += 1
+            return task
+
+        self.stats["executions"] += 1
+        task = loop.create_task(fn())
+        self._inflight[key] = task
+
+        def _done(finished: asyncio.Task):
+            if self._inflight.get(key) is finished:
+                self._inflight.pop(key, None)
+            if not finished.cancelled() and finished.exception() is not None:
+                self.stats["errors"] += 1
+
+        task.add_done_callback(_done)
+        return task
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], stale: Optional[T] = None) -> T:
+        """
+        Return the result of fn() for key, sharing one call among concurrent callers.
+        With `stale`, return it immediately and refresh in the background instead.
+        """
+        self.stats["calls"] += 1
+        task = self._task_for(key, fn)
+        if stale is not None:
+            self.stats["stale_served"] += 1
+            return stale
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Hashable) -> bool:
+        task = self._inflight.get(key)
+        return task is not None and not task.done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "in_flight": len(self._inflight), **self.stats}
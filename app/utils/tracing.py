@@ -0,0 +1,298 @@
+"""
+Request Tracing
+
+Spans for websocket turns and the vendor calls inside them, so a slow turn's
+time can be attributed (audio decode, STT, cache lookups, GPT, TTS first and
+last byte, Supabase and Redis calls):
+- tracer.span(name, **attributes): context manager for sync and async code.
+  The current span lives in a contextvar, so child spans nest by themselves
+  across awaits, asyncio tasks and asyncio.to_thread (run_in_executor does
+  not copy the context; wrap the await instead of the thread function)
+- tracer.start_span() / span.end() for spans that start and finish in
+  different callbacks (realtime turns, HTTP event hooks); attach()/detach()
+  make such a span current for a stretch of code
+- Head sampling per trace: a root span is sampled with probability
+  OTEL_TRACES_SAMPLER_ARG and its children follow that decision; unsampled
+  and exporter-less spans record nothing
+- Exporters: LocalSpanExporter keeps finished spans in memory (tests,
+  debugging), ConsoleSpanExporter prints one line per span, and
+  OTLPSpanExporter hands batches to the OpenTelemetry OTLP exporter from a
+  background thread, so exporting never blocks the event loop
+
+Spans are recorded in-process (W3C-sized trace/span ids, nanosecond
+timestamps); the OpenTelemetry SDK is only needed for OTLP export
+(opentelemetry-sdk and opentelemetry-exporter-otlp, pinned in requirements.txt).
+
+Environment:
+- OTEL_SDK_DISABLED: "true" turns tracing off
+- OTEL_SERVICE_NAME: service.name on exported spans (default: ai-tutor-backend)
+- OTEL_TRACES_EXPORTER: otlp, console or none (default: none)
+- OTEL_TRACES_SAMPLER_ARG: fraction of turns traced, 0..1 (default: 0.1)
+- OTEL_EXPORTER_OTLP_ENDPOINT / OTEL_EXPORTER_OTLP_PROTOCOL: read by the OTLP exporter (grpc or http/protobuf)
+"""
+
+import contextvars
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+TRACING_ENABLED = os.getenv("OTEL_SDK_DISABLED", "false").lower() != "true"
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "ai-tutor-backend")
+TRACES_EXPORTER = os.getenv("OTEL_TRACES_EXPORTER", "none").lower()
+SAMPLE_RATIO = float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "0.1"))
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation; non-recording spans (unsampled) only carry the trace identity"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], recording: bool,
+                 tracer: Optional["Tracer"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.recording = recording
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {}) if recording else {}
+        self.events: List[Tuple[str, int, Dict[str, Any]]] = []
+        self.status = "unset"
+        self.status_message = ""
+        self._tracer = tracer
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        if self.recording:
+            self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes):
+        """Point in time within the span (e.g. first byte of a streamed response)"""
+        if self.recording:
+            self.events.append((name, time.time_ns(), attributes))
+
+    def record_exception(self, exc: BaseException):
+        if self.recording:
+            self.status = "error"
+            self.status_message = f"{type(exc).__name__}: {exc}"[:500]
+            self.add_event("exception", type=type(exc).__name__, message=str(exc)[:500])
+
+    def end(self):
+        """Finish the span and export it (idempotent)"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.recording and self._tracer is not None:
+            self._tracer._export(self)
+
+
+class SpanExporter:
+    """Receives finished, sampled spans"""
+
+    def export(self, spans: Sequence[Span]):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class LocalSpanExporter(SpanExporter):
+    """Keeps the most recent finished spans in memory"""
+
+    def __init__(self, max_spans: int = 10_000):
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]):
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_finished_spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            return [s for s in self._spans if trace_id is None or s.trace_id == trace_id]
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """One line per span, for local debugging"""
+
+    def export(self, spans: Sequence[Span]):
+        for span in spans:
+            marker = "❌" if span.status == "error" else "🔭"
+            print(f"{marker} [TRACE] {span.name} {span.duration_ms:.1f}ms "
+                  f"trace={span.trace_id[:8]} span={span.span_id[:8]} parent={(span.parent_id or '-')[:8]} "
+                  f"{span.attributes}")
+
+
+class OTLPSpanExporter(SpanExporter):
+    """
+    Batches spans on a queue and ships them with the OpenTelemetry OTLP exporter
+    from a daemon thread. Full queues drop spans rather than slow down turns.
+    """
+
+    def __init__(self, service_name: str = SERVICE_NAME, max_queue: int = 2048,
+                 max_batch: int = 256, flush_interval: float = 2.0):
+        from opentelemetry.sdk.resources import Resource  # optional dependency
+
+        if os.getenv("OTEL_EXPORTER_OTLP_PROTOCOL", "grpc") == "grpc":
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter as Exporter
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter as Exporter
+        self._exporter = Exporter()
+        self._resource = Resource.create({"service.name": service_name})
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=max_queue)
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="otlp-span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: Sequence[Span]):
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self._flush_interval))
+                while len(batch) < self._max_batch:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            self._ship(batch)
+
+    def _ship(self, batch: List[Span]):
+        if batch:
+            try:
+                self._exporter.export([self._to_readable(span) for span in batch])
+            except Exception as e:
+                print(f"⚠️ [TRACE] OTLP export failed: {e}")
+
+    def _to_readable(self, span: Span):
+        from opentelemetry.sdk.trace import Event, ReadableSpan
+        from opentelemetry.trace import SpanContext, Status, StatusCode, TraceFlags
+
+        def context(span_id: str) -> SpanContext:
+            return SpanContext(int(span.trace_id, 16), int(span_id, 16), is_remote=False,
+                               trace_flags=TraceFlags(TraceFlags.SAMPLED))
+
+        status = Status(StatusCode.ERROR, span.status_message) if span.status == "error" else Status(StatusCode.UNSET)
+        return ReadableSpan(
+            name=span.name,
+            context=context(span.span_id),
+            parent=context(span.parent_id) if span.parent_id else None,
+            resource=self._resource,
+            attributes=span.attributes,
+            events=[Event(name, attributes, timestamp) for name, timestamp, attributes in span.events],
+            status=status,
+            start_time=span.start_ns,
+            end_time=span.end_ns,
+        )
+
+    def shutdown(self):
+        """Export what is still queued, then close the exporter"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._ship(batch)
+        self._exporter.shutdown()
+
+
+class Tracer:
+    """Creates spans, makes sampling decisions and hands finished spans to the exporters"""
+
+    def __init__(self, sample_ratio: float = SAMPLE_RATIO, exporters: Optional[List[SpanExporter]] = None,
+                 enabled: bool = TRACING_ENABLED):
+        self.sample_ratio = sample_ratio
+        self.exporters: List[SpanExporter] = list(exporters or [])
+        self.enabled = enabled
+
+    def configure(self, sample_ratio: Optional[float] = None, exporters: Optional[List[SpanExporter]] = None):
+        """Swap sampling or exporters at runtime (e.g. a LocalSpanExporter in tests)"""
+        if sample_ratio is not None:
+            self.sample_ratio = sample_ratio
+        if exporters is not None:
+            self.exporters = list(exporters)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """Start a span without making it current; call end() on it when done."""
+        parent = parent if parent is not None else _current_span.get()
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, parent.recording, self, attributes)
+        recording = self.enabled and bool(self.exporters) and random.random() < self.sample_ratio
+        return Span(name, f"{random.getrandbits(128):032x}", None, recording, self, attributes)
+
+    def attach(self, span: Span) -> contextvars.Token:
+        """Make span current until detach(token); for spans that don't fit a with block."""
+        return _current_span.set(span)
+
+    def detach(self, token: contextvars.Token):
+        _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attributes):
+        """Run the block in a new current span; exceptions are recorded and re-raised."""
+        span = self.start_span(name, parent, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export([span])
+            except Exception as e:
+                print(f"⚠️ [TRACE] Exporter {type(exporter).__name__} failed: {e}")
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+def _default_exporters() -> List[SpanExporter]:
+    if not TRACING_ENABLED or TRACES_EXPORTER == "none":
+        return []
+    if TRACES_EXPORTER == "console":
+        return [ConsoleSpanExporter()]
+    if TRACES_EXPORTER == "otlp":
+        try:
+            return [OTLPSpanExporter()]
+        except ImportError:
+            print("⚠️ [TRACE] OTEL_TRACES_EXPORTER=otlp but opentelemetry-exporter-otlp is not installed; "
+                  "tracing disabled")
+            return []
+    print(f"⚠️ [TRACE] Unknown OTEL_TRACES_EXPORTER '{TRACES_EXPORTER}'; tracing disabled")
+    return []
+
+
+# Global instance
+tracer = Tracer(exporters=_default_exporters())